@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import datetime as dt
+import os
 import subprocess
 import time
 from collections import deque
@@ -25,8 +26,12 @@ def run_command_stream(
     stop_event: Optional[Event] = None,
     on_line: Optional[Callable[[str], None]] = None,
     on_detached: Optional[Callable[[], None]] = None,
+    env: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
-    """Run a command, streaming output lines to callbacks while collecting tail."""
+    """Run a command, streaming output lines to callbacks while collecting tail.
+
+    ``env`` entries are layered over the current environment for the child.
+    """
     started = time.monotonic()
     tail = deque(maxlen=250)
     command_list = list(command)
@@ -39,6 +44,7 @@ def run_command_stream(
             stderr=subprocess.STDOUT,
             text=True,
             bufsize=1,
+            env={**os.environ, **env} if env else None,
         )
     except FileNotFoundError:
         signature = f"Command not found: {command_list[0]}"
@@ -143,6 +149,7 @@ def run_command(
     print_prefix: str = "",
     cwd: Optional[Path] = None,
     emit_output: bool = True,
+    env: Optional[Dict[str, str]] = None,
 ) -> Dict[str, Any]:
     started_at = now_utc()
     with log_path.open("a", encoding="utf-8") as log_handle:
@@ -158,6 +165,7 @@ def run_command(
             command,
             cwd=(cwd or root),
             on_line=_handle_line,
+            env=env,
         )
 
     duration = float(stream_result["duration_seconds"])
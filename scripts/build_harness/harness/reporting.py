@@ -6,6 +6,10 @@ from typing import Any, Dict, List
 from scripts.build_harness.harness.io import load_json, load_jsonl, now_utc, write_json
 
 
+TRANSPORT_TOP_ENDPOINTS = 5
+SFDMU_TOP_OBJECTS = 10
+
+
 def estimate_optimization_heuristics(target_type: str, target_name: str, avg_seconds: float) -> Dict[str, str]:
     if avg_seconds >= 600:
         impact = "high"
@@ -35,6 +39,8 @@ def build_run_analysis(run_dir: Path, run_summary: Dict[str, Any]) -> Dict[str,
     flag_index: Dict[str, Dict[str, Any]] = {}
     step_index: Dict[str, Dict[str, Any]] = {}
     failure_dependencies: List[Dict[str, Any]] = []
+    transport_steps: List[Dict[str, Any]] = []
+    sfdmu_steps: List[Dict[str, Any]] = []
 
     for scenario_result in run_summary.get("scenario_results", []):
         scenario_id = scenario_result.get("scenario_id")
@@ -104,6 +110,9 @@ def build_run_analysis(run_dir: Path, run_summary: Dict[str, Any]) -> Dict[str,
                     "total_duration_seconds": 0.0,
                     "samples": 0,
                     "failure_signatures": [],
+                    "transport_calls": 0,
+                    "transport_seconds": 0.0,
+                    "transport_spawn_seconds": 0.0,
                 },
             )
             status = event.get("status")
@@ -120,6 +129,16 @@ def build_run_analysis(run_dir: Path, run_summary: Dict[str, Any]) -> Dict[str,
             sig = str(event.get("failure_signature") or "").strip()
             if sig:
                 row["failure_signatures"].append(sig)
+            transport = event.get("transport_metrics") or {}
+            if transport:
+                row["transport_calls"] += int(transport.get("calls") or 0)
+                row["transport_seconds"] += float(transport.get("total_seconds") or 0)
+                row["transport_spawn_seconds"] += float(transport.get("spawn_seconds") or 0)
+                transport_steps.append(
+                    build_transport_step(scenario_id, scenario_dir, event, target_key, transport)
+                )
+            if event.get("sfdmu_profiles"):
+                sfdmu_steps.append(build_sfdmu_step(scenario_id, scenario_dir, event, target_key))
 
         if first_failed:
             previous_success = None
@@ -181,6 +200,85 @@ def build_run_analysis(run_dir: Path, run_summary: Dict[str, Any]) -> Dict[str,
             "generated_at": now_utc(),
             "top_slowest_steps": top_slowest_steps,
         },
+        "transport_summary": {
+            "generated_at": now_utc(),
+            "steps": sorted(transport_steps, key=lambda row: row["total_seconds"], reverse=True),
+        },
+        "sfdmu_profile_summary": {
+            "generated_at": now_utc(),
+            "steps": sfdmu_steps,
+            "top_objects": sorted(
+                (obj for step in sfdmu_steps for obj in step["top_objects"]),
+                key=lambda row: row["seconds"],
+                reverse=True,
+            )[:SFDMU_TOP_OBJECTS],
+        },
+    }
+
+
+def build_transport_step(
+    scenario_id: Any, scenario_dir: Path, event: Dict[str, Any], target_key: str, transport: Dict[str, Any]
+) -> Dict[str, Any]:
+    """One step's Salesforce request profile (from ``scripts/sf_transport/metrics.py``)."""
+    endpoints: List[Dict[str, Any]] = []
+    summary_path = scenario_dir / str(transport.get("summary_path") or "")
+    if transport.get("summary_path") and summary_path.exists():
+        for endpoint in (load_json(summary_path).get("endpoints") or [])[:TRANSPORT_TOP_ENDPOINTS]:
+            endpoints.append({k: v for k, v in endpoint.items() if k != "buckets"})
+    return {
+        "scenario_id": scenario_id,
+        "step_number": event.get("step_number"),
+        "target": target_key,
+        "calls": int(transport.get("calls") or 0),
+        "total_seconds": round(float(transport.get("total_seconds") or 0), 3),
+        "spawn_seconds": round(float(transport.get("spawn_seconds") or 0), 3),
+        "top_endpoints": endpoints,
+    }
+
+
+def build_sfdmu_step(scenario_id: Any, scenario_dir: Path, event: Dict[str, Any], target_key: str) -> Dict[str, Any]:
+    """One step's SFDMU plan profiles (from ``tasks/rlm_sfdmu_profile.py``), slowest objects first."""
+    plans: List[Dict[str, Any]] = []
+    objects: List[Dict[str, Any]] = []
+    for rel in event.get("sfdmu_profiles") or []:
+        path = scenario_dir / str(rel)
+        if not path.exists():
+            continue
+        profile = load_json(path)
+        plan = profile.get("plan") or path.stem
+        plans.append(
+            {
+                "plan": plan,
+                "engine": profile.get("engine"),
+                "operation": profile.get("operation"),
+                "seconds": profile.get("seconds"),
+            }
+        )
+        for sfdmu_pass in profile.get("passes") or []:
+            for obj in sfdmu_pass.get("objects") or []:
+                objects.append(
+                    {
+                        "scenario_id": scenario_id,
+                        "step_number": event.get("step_number"),
+                        "target": target_key,
+                        "plan": plan,
+                        "pass": sfdmu_pass.get("index"),
+                        "sobject": obj.get("sobject"),
+                        "seconds": float(obj.get("seconds") or 0),
+                        "rows": obj.get("rows"),
+                        "phases": {
+                            name: {k: phase.get(k) for k in ("seconds", "rows", "rows_per_second")}
+                            for name, phase in (obj.get("phases") or {}).items()
+                        },
+                    }
+                )
+    objects.sort(key=lambda row: row["seconds"], reverse=True)
+    return {
+        "scenario_id": scenario_id,
+        "step_number": event.get("step_number"),
+        "target": target_key,
+        "plans": plans,
+        "top_objects": objects[:SFDMU_TOP_OBJECTS],
     }
 
 
@@ -189,6 +287,8 @@ def write_analysis_artifacts(run_dir: Path, run_summary: Dict[str, Any]) -> Dict
     write_json(run_dir / "compatibility_summary.json", analysis["compatibility_summary"])
     write_json(run_dir / "dependency_summary.json", analysis["dependency_summary"])
     write_json(run_dir / "optimization_recommendations.json", analysis["optimization_recommendations"])
+    write_json(run_dir / "transport_summary.json", analysis["transport_summary"])
+    write_json(run_dir / "sfdmu_profile_summary.json", analysis["sfdmu_profile_summary"])
     return analysis
 
 
@@ -246,9 +346,13 @@ def render_report(run_dir: Path, run_summary: Dict[str, Any]) -> str:
     compatibility_path = run_dir / "compatibility_summary.json"
     dependency_path = run_dir / "dependency_summary.json"
     optimization_path = run_dir / "optimization_recommendations.json"
+    transport_path = run_dir / "transport_summary.json"
     compatibility = load_json(compatibility_path) if compatibility_path.exists() else {}
     dependency = load_json(dependency_path) if dependency_path.exists() else {}
     optimization = load_json(optimization_path) if optimization_path.exists() else {}
+    transport = load_json(transport_path) if transport_path.exists() else {}
+    sfdmu_path = run_dir / "sfdmu_profile_summary.json"
+    sfdmu = load_json(sfdmu_path) if sfdmu_path.exists() else {}
 
     lines.append("")
     lines.append("## Compatibility and Dependencies")
@@ -300,4 +404,43 @@ def render_report(run_dir: Path, run_summary: Dict[str, Any]) -> str:
                 f"`{row.get('total_duration_seconds')}`s (impact `{row.get('impact')}`, effort `{row.get('effort')}`)"
             )
             lines.append(f"  - {row.get('note')}")
+
+    lines.append("")
+    lines.append("## Salesforce Request Latency")
+    lines.append("")
+    transport_steps = transport.get("steps", [])
+    if not transport_steps:
+        lines.append("- No transport metrics recorded.")
+    else:
+        for row in transport_steps:
+            lines.append(
+                f"- `{row.get('scenario_id')}` step `{row.get('step_number')}` `{row.get('target')}`: "
+                f"{row.get('calls')} call(s), `{row.get('total_seconds')}`s in requests "
+                f"(`{row.get('spawn_seconds')}`s CLI spawn)"
+            )
+            for endpoint in row.get("top_endpoints", []):
+                lines.append(
+                    f"  - `{endpoint.get('method')} {endpoint.get('endpoint')}` ({endpoint.get('transport')}) "
+                    f"x{endpoint.get('calls')} p50 `{endpoint.get('p50_seconds')}`s "
+                    f"p95 `{endpoint.get('p95_seconds')}`s p99 `{endpoint.get('p99_seconds')}`s"
+                )
+
+    lines.append("")
+    lines.append("## SFDMU Object Timings")
+    lines.append("")
+    sfdmu_objects = sfdmu.get("top_objects", [])
+    if not sfdmu_objects:
+        lines.append("- No SFDMU profiles recorded.")
+    else:
+        for row in sfdmu_objects:
+            phases = ", ".join(
+                f"{name} `{phase.get('seconds')}`s"
+                + (f" ({phase.get('rows_per_second')} rows/s)" if phase.get("rows_per_second") else "")
+                for name, phase in (row.get("phases") or {}).items()
+            )
+            lines.append(
+                f"- `{row.get('scenario_id')}` step `{row.get('step_number')}` `{row.get('plan')}` "
+                f"pass {row.get('pass')} `{row.get('sobject')}`: `{row.get('seconds')}`s, "
+                f"{row.get('rows')} row(s)" + (f" — {phases}" if phases else "")
+            )
     return "\n".join(lines) + "\n"
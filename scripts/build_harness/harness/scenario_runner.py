@@ -15,6 +15,11 @@ from scripts.build_harness.harness.config import (
 from scripts.build_harness.harness.execution import org_exists, run_command
 from scripts.build_harness.harness.io import append_jsonl, now_utc, write_json
 from scripts.build_harness.harness.provenance import write_build_provenance
+from scripts.sf_transport import metrics as transport_metrics
+
+# SFDMU load/extract tasks drop their per-object profiles into the step's
+# metrics dir under this prefix (tasks/rlm_sfdmu_profile.py METRICS_PREFIX).
+SFDMU_PROFILE_PREFIX = "sfdmu_profile-"
 
 
 def summarize_policy(
@@ -298,6 +303,9 @@ def run_single_scenario(
                 continue
 
             base_cmd = ["cci", step.target_type, "run", step.target_name, "--org", org_alias]
+            # Instrumented Salesforce transports in the step's processes write
+            # their request samples here; reporting attributes them per step.
+            metrics_dir = scenario_dir / "transport_metrics" / f"step-{step.step_number:03d}"
             attempt = 0
             step_completed = False
             latest_result: Dict[str, Any] = {}
@@ -310,6 +318,7 @@ def run_single_scenario(
                     print_prefix=f"[{scenario_id}] ",
                     cwd=project_root,
                     emit_output=stream_output,
+                    env={transport_metrics.ENV_VAR: str(metrics_dir)},
                 )
                 total_attempt_duration += float(latest_result.get("duration_seconds") or 0.0)
                 failure_class = latest_result["failure_class"]
@@ -340,6 +349,18 @@ def run_single_scenario(
             }
             if step.target_name == "stamp_git_commit":
                 event_payload["tail"] = latest_result.get("tail", [])
+            if metrics_dir.is_dir():
+                step_transport = transport_metrics.write_summary(metrics_dir)
+                if step_transport["calls"]:
+                    event_payload["transport_metrics"] = {
+                        "calls": step_transport["calls"],
+                        "total_seconds": step_transport["total_seconds"],
+                        "spawn_seconds": step_transport["spawn_seconds"],
+                        "summary_path": str(metrics_dir.relative_to(scenario_dir) / transport_metrics.SUMMARY_JSON),
+                    }
+                profiles = sorted(metrics_dir.glob(f"{SFDMU_PROFILE_PREFIX}*.json"))
+                if profiles:
+                    event_payload["sfdmu_profiles"] = [str(p.relative_to(scenario_dir)) for p in profiles]
             record_event(event_payload)
 
             if step_completed:
@@ -2,16 +2,23 @@
 """
 Compare SFDMU extractions: main datasets vs qb-extractdata and qb-migrate.
 Reports row counts per object CSV and highlights differences.
+
+Each tree is fingerprinted with tasks/rlm_sfdmu_fingerprint.py (cached under
+.cci/sfdmu_fingerprint/, so only CSVs that changed since the last run are
+read). Plans whose content matches across all three trees are reported on
+one line and skipped.
 """
-import os
-import csv
+import sys
 from pathlib import Path
-from collections import defaultdict
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from tasks import rlm_sfdmu_fingerprint as fingerprint  # noqa: E402
+
 MAIN = ROOT / "datasets/sfdmu/qb/en-US"
 EXTRACT = ROOT / "datasets/sfdmu/reconcile/qb-extractdata/en-US"
 MIGRATE = ROOT / "datasets/sfdmu/reconcile/qb-migrate/en-US"
+CACHE_DIR = ROOT / fingerprint.DEFAULT_CACHE_DIR
 
 # Plans we extracted (present in both reconcile dirs)
 PLANS = [
@@ -20,39 +27,19 @@ PLANS = [
     "qb-constraints-product", "qb-constraints-component",
 ]
 
-SKIP_FILES = {"MissingParentRecordsReport.csv"}
-SKIP_SUBDIRS = {"target", "source", "objectset_source", "reports", "logs"}
 
-
-def root_csvs(plan_path: Path) -> set[str]:
-    """Return set of root-level CSV names (object data), excluding subdirs and skip list."""
+def plan_fingerprint(plan_path: Path) -> dict | None:
+    """Fingerprint of one plan directory (None if missing)."""
     if not plan_path.is_dir():
-        return set()
-    out = set()
-    for f in plan_path.iterdir():
-        if f.is_file() and f.suffix.lower() == ".csv" and f.name not in SKIP_FILES:
-            out.add(f.name)
-    return out
-
-
-def count_rows(csv_path: Path) -> int | None:
-    """Return number of data rows (lines - 1 for header), or None if missing/unreadable."""
-    if not csv_path.is_file():
-        return None
-    try:
-        with open(csv_path, "rb") as f:
-            lines = sum(1 for _ in f)
-        return max(0, lines - 1)
-    except Exception:
         return None
+    return fingerprint.cached_manifest(str(plan_path), str(CACHE_DIR))["plans"].get(".")
 
 
-def all_object_csvs_for_plan(plan: str) -> set[str]:
-    """Union of root-level object CSVs across main, extract, migrate for this plan."""
-    a = root_csvs(MAIN / plan)
-    b = root_csvs(EXTRACT / plan)
-    c = root_csvs(MIGRATE / plan)
-    return a | b | c
+def root_files(plan: dict | None) -> dict[str, dict]:
+    """{csv name: file fingerprint} for the root-level object CSVs of a plan fingerprint."""
+    if not plan:
+        return {}
+    return {rel: entry for obj in plan["objects"].values() for rel, entry in obj["files"].items() if "/" not in rel}
 
 
 def main():
@@ -71,9 +58,14 @@ def main():
         if not ext_dir.is_dir() and not mig_dir.is_dir():
             continue
 
-        objects = sorted(all_object_csvs_for_plan(plan))
+        fp_main, fp_ext, fp_mig = plan_fingerprint(main_dir), plan_fingerprint(ext_dir), plan_fingerprint(mig_dir)
+        files_main, files_ext, files_mig = root_files(fp_main), root_files(fp_ext), root_files(fp_mig)
+        objects = sorted(set(files_main) | set(files_ext) | set(files_mig))
         if not objects:
             continue
+        if fp_main and fp_ext and fp_mig and fp_main["root"] == fp_ext["root"] == fp_mig["root"]:
+            print(f"\n## {plan}: content identical in main, extract and migrate ({len(objects)} CSVs)")
+            continue
 
         print(f"\n## {plan}")
         print("-" * 100)
@@ -82,9 +74,10 @@ def main():
         print("-" * 100)
 
         for obj in objects:
-            r_main = count_rows(main_dir / obj)
-            r_ext = count_rows(ext_dir / obj)
-            r_mig = count_rows(mig_dir / obj)
+            f_main, f_ext, f_mig = files_main.get(obj), files_ext.get(obj), files_mig.get(obj)
+            r_main = f_main["rows"] if f_main else None
+            r_ext = f_ext["rows"] if f_ext else None
+            r_mig = f_mig["rows"] if f_mig else None
 
             notes = []
             if r_main is None and (r_ext is not None or r_mig is not None):
@@ -99,6 +92,12 @@ def main():
                 notes.append(f"main≠mig ({r_main - r_mig:+d})")
             if r_ext is not None and r_mig is not None and r_ext != r_mig:
                 notes.append(f"ext≠mig ({r_ext - r_mig:+d})")
+            if r_main is not None and r_main == r_ext and f_main["hash"] != f_ext["hash"]:
+                notes.append("main≠ext (content)")
+            if r_main is not None and r_main == r_mig and f_main["hash"] != f_mig["hash"]:
+                notes.append("main≠mig (content)")
+            if r_ext is not None and r_ext == r_mig and f_ext["hash"] != f_mig["hash"]:
+                notes.append("ext≠mig (content)")
 
             main_s = str(r_main) if r_main is not None else "-"
             ext_s = str(r_ext) if r_ext is not None else "-"
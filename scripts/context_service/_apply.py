@@ -18,6 +18,8 @@ IsTransient, traversal hydration) go through ``Transport.sobject`` /
 
 from typing import Any, Callable, Dict, List, Optional
 
+from scripts.sf_transport.composite import batch_for
+
 from . import _client
 from . import _endpoints as ep
 from . import _payload
@@ -196,11 +198,18 @@ class ContextApplier:
             by_node.setdefault(node_id, []).append(
                 {k: v for k, v in attr.items() if k != "contextNodeId"}
             )
-        for node_id, attrs in by_node.items():
-            self.t.request(
-                "POST", ep.ATTRIBUTE_COLLECTION.format(context_node_id=node_id),
-                {"contextAttributes": attrs},
-            )
+        # One POST per node, independent of each other: queue them into
+        # /composite/batch round trips; the first failed node raises as before.
+        with batch_for(self.t) as batch:
+            calls = [
+                batch.request(
+                    "POST", ep.ATTRIBUTE_COLLECTION.format(context_node_id=node_id),
+                    {"contextAttributes": attrs},
+                )
+                for node_id, attrs in by_node.items()
+            ]
+        for call in calls:
+            call.result()
 
     def _post_tags(self, context_id: str, tags: List[Dict[str, Any]]) -> None:
         self.t.request(
@@ -209,13 +218,17 @@ class ContextApplier:
         )
 
     def _sync_transient(self, updates: List[Dict[str, Any]]) -> None:
-        for u in updates:
-            self.log(f"Updating ContextAttribute {u['node_name']}.{u['name']} "
-                     f"IsTransient={u['is_transient']}")
-            self.t.sobject(
-                "PATCH", ep.SOBJECT_CONTEXT_ATTRIBUTE, u["context_attribute_id"],
-                {"IsTransient": u["is_transient"]},
-            )
+        calls = []
+        with batch_for(self.t) as batch:
+            for u in updates:
+                self.log(f"Updating ContextAttribute {u['node_name']}.{u['name']} "
+                         f"IsTransient={u['is_transient']}")
+                calls.append(batch.sobject(
+                    "PATCH", ep.SOBJECT_CONTEXT_ATTRIBUTE, u["context_attribute_id"],
+                    {"IsTransient": u["is_transient"]},
+                ))
+        for call in calls:
+            call.result()
 
     def _apply_mapping_updates(
         self, context_id: str, payload: Dict[str, Any],
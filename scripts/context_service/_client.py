@@ -19,14 +19,28 @@ non-zero and prints the Salesforce error array (``[{errorCode, message}]``) to
 stdout; :class:`ContextClientError` captures the parsed ``error_codes`` so
 callers can implement DUPLICATE_VALUE / UNKNOWN_EXCEPTION recovery the way
 ``tasks/rlm_extend_stdctx.py`` does.
+
+Set ``RLM_SF_TRANSPORT=http`` (or pass ``--transport http`` where an entry
+script offers it) to send the same requests through the in-process pooled
+backend in ``scripts/sf_transport/pooled.py`` instead: the token is read out of
+the ``sf`` CLI once per org and held in memory only, and each call reuses a
+keep-alive connection rather than spawning Node.
 """
 
 import json
 import subprocess
 import sys
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from urllib.parse import quote
 
+from scripts.sf_transport import aio as _aio
+from scripts.sf_transport import cassette as _cassette
+from scripts.sf_transport import composite as _composite
+from scripts.sf_transport import metrics as _metrics
+from scripts.sf_transport import paging as _paging
+from scripts.sf_transport import pooled as _pooled
+from scripts.sf_transport import read_cache as _read_cache
+
 DEFAULT_API_VERSION = "67.0"
 _REQUEST_TIMEOUT = 120  # seconds — reads
 # Context-definition create/extend calls can take 5-10 minutes server-side
@@ -93,6 +107,76 @@ def _run_sf(
         ) from exc
 
 
+def _send(method: str, full_path: str, args: List[str], input_text: Optional[str],
+          *, target_org: str, timeout: int) -> subprocess.CompletedProcess:
+    """Dispatch one request to the selected backend (``RLM_SF_TRANSPORT``).
+
+    ``cli`` (default) spawns ``sf api request rest``; ``http`` reuses the
+    in-process pooled session from ``scripts/sf_transport/pooled.py``. Both
+    return a CLI-shaped result, so ``connect_request``'s error handling is shared.
+    Each call is timed by ``scripts/sf_transport/metrics.py`` when
+    ``RLM_SF_METRICS_DIR`` is set, and recorded or replayed through
+    ``scripts/sf_transport/cassette.py`` when ``RLM_SF_CASSETTE`` is set.
+    """
+    backend = _pooled.resolve_backend(error_cls=ContextClientError)
+    cassette = _cassette.active(error_cls=ContextClientError)
+
+    def live() -> subprocess.CompletedProcess:
+        if backend == _pooled.BACKEND_HTTP:
+            return _pooled.send(method, full_path, input_text, target_org=target_org,
+                                timeout=timeout, error_cls=ContextClientError)
+        return _run_sf(args, input_text=input_text, timeout=timeout)
+
+    replaying = cassette is not None and cassette.replaying
+    with _metrics.track("replay" if replaying else backend, method, full_path, input_text,
+                        spawn=backend == _pooled.BACKEND_CLI and not replaying) as sample:
+        if cassette is None:
+            result = live()
+        else:
+            result = cassette.send(method, full_path, input_text, live,
+                                   error_cls=ContextClientError)
+        sample.complete(result)
+    return result
+
+
+def _request_error(method: str, path: str, target_org: str, stdout: str, *,
+                   stderr: str = "", returncode: Optional[int] = 1) -> ContextClientError:
+    """Build the client error for a failed request (direct or composite sub-request)."""
+    error_codes = _extract_error_codes(stdout)
+    detail = stdout or (stderr or "").strip()
+    code_note = f" [{', '.join(error_codes)}]" if error_codes else ""
+    return ContextClientError(
+        f"sf api request {method} '{path}' failed for org '{target_org}'"
+        f"{code_note}:\n{detail}\n\n"
+        f"Confirm the SF CLI alias is correct (this is the *sf* alias, e.g. "
+        f"'rlm-base__beta', not the CCI alias 'beta') and that you are "
+        f"authenticated (`sf org login web --alias {target_org}`).",
+        error_codes=error_codes,
+        body=stdout,
+        returncode=returncode,
+    )
+
+
+# Context definitions expose no documented stamp that moves on node / attribute /
+# mapping edits, so these entries are TTL-only; any context mutation drops them.
+_READ_CACHE_RULES = _read_cache.Rules(
+    related=(("connect/context-", "sobjects/Context"),),
+)
+
+
+def _read_cache_for(target_org: str, api_version: str) -> Optional[_read_cache.OrgCache]:
+    """The opt-in read cache for this org (``RLM_SF_READ_CACHE``), else ``None``.
+
+    See ``scripts/sf_transport/read_cache.py``: GETs are served or revalidated
+    from disk, and mutations drop the related entries.
+    """
+    return _read_cache.for_org(
+        target_org, api_version, _READ_CACHE_RULES,
+        lambda path: connect_request("GET", path, target_org=target_org,
+                                     api_version=api_version),
+    )
+
+
 def connect_request(
     method: str,
     path: str,
@@ -132,6 +216,15 @@ def connect_request(
         log(f"[dry-run] {method} {full_path} {body_repr}")
         return {}
 
+    cache = _read_cache_for(target_org, api_version)
+    if cache is not None:
+        if method == "GET":
+            return cache.read(path, lambda: connect_request(
+                method, path, body, target_org=target_org, api_version=api_version,
+                logger=logger, timeout=timeout,
+            ))
+        cache.invalidate(method, path, body)
+
     args = ["api", "request", "rest", full_path, "-X", method, "--target-org", target_org]
     input_text: Optional[str] = None
     if body is not None:
@@ -149,22 +242,12 @@ def connect_request(
     if timeout is None:
         timeout = _REQUEST_TIMEOUT if method in ("GET", "HEAD") else _MUTATION_TIMEOUT
 
-    result = _run_sf(args, input_text=input_text, timeout=timeout)
+    result = _send(method, full_path, args, input_text,
+                   target_org=target_org, timeout=timeout)
     stdout = (result.stdout or "").strip()
     if result.returncode != 0:
-        error_codes = _extract_error_codes(stdout)
-        detail = stdout or (result.stderr or "").strip()
-        code_note = f" [{', '.join(error_codes)}]" if error_codes else ""
-        raise ContextClientError(
-            f"sf api request {method} '{path}' failed for org '{target_org}'"
-            f"{code_note}:\n{detail}\n\n"
-            f"Confirm the SF CLI alias is correct (this is the *sf* alias, e.g. "
-            f"'rlm-base__beta', not the CCI alias 'beta') and that you are "
-            f"authenticated (`sf org login web --alias {target_org}`).",
-            error_codes=error_codes,
-            body=stdout,
-            returncode=result.returncode,
-        )
+        raise _request_error(method, path, target_org, stdout,
+                             stderr=result.stderr, returncode=result.returncode)
     if not stdout:
         return {}
     try:
@@ -227,21 +310,33 @@ def soql_literal(value: Any) -> str:
     return str(value).replace("\\", "\\\\").replace("'", "\\'")
 
 
-def soql_query(
-    soql: str, *, target_org: str, api_version: str = DEFAULT_API_VERSION
-) -> List[Dict[str, Any]]:
-    """Run a SOQL query and return its ``records`` list (always executes — reads
-    are non-mutating, so this ignores dry-run, matching the CCI task's
-    traversal-hydration idempotency check)."""
-    resp = connect_request(
+def iter_soql_query(
+    soql: str, *, target_org: str, api_version: str = DEFAULT_API_VERSION,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Yield a SOQL query's records page by page, following ``nextRecordsUrl``
+    (the next page is prefetched while the caller consumes the current one; see
+    ``scripts/sf_transport/paging.py``). Reads always execute, even under dry-run."""
+    first = connect_request(
         "GET", f"query?q={quote(soql)}", None,
         target_org=target_org, api_version=api_version,
     )
-    if isinstance(resp, dict):
-        records = resp.get("records")
-        if isinstance(records, list):
-            return records
-    return []
+    yield from _paging.iter_records(
+        first,
+        lambda nurl: connect_request("GET", _paging.relative_next_url(nurl), None,
+                                     target_org=target_org, api_version=api_version),
+        prefetch=prefetch,
+    )
+
+
+def soql_query(
+    soql: str, *, target_org: str, api_version: str = DEFAULT_API_VERSION
+) -> List[Dict[str, Any]]:
+    """Run a SOQL query and return its ``records`` list, following
+    ``nextRecordsUrl`` (always executes — reads are non-mutating, so this ignores
+    dry-run, matching the CCI task's traversal-hydration idempotency check)."""
+    return list(iter_soql_query(soql, target_org=target_org, api_version=api_version,
+                                prefetch=False))
 
 
 def normalize_definition_list(response: Any) -> List[Dict[str, Any]]:
@@ -489,3 +584,38 @@ class Transport:
         return soql_query(
             query, target_org=self.target_org, api_version=self.api_version
         )
+
+    def iter_soql(self, query: str, *, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        return iter_soql_query(
+            query, target_org=self.target_org, api_version=self.api_version,
+            prefetch=prefetch,
+        )
+
+    def aio(self, **kwargs: Any) -> _aio.AsyncTransport:
+        """An asyncio transport for fan-out reads/writes against this org.
+
+        Sends through the pooled ``http`` credentials under the org's shared
+        throttle (``scripts/sf_transport/aio.py``), whatever ``RLM_SF_TRANSPORT``
+        says; errors carry this toolkit's ``error_codes`` as usual.
+        """
+        return _aio.AsyncTransport(
+            self.target_org, self.api_version,
+            error_factory=lambda method, path, text: _request_error(
+                method, path, self.target_org, text),
+            error_cls=ContextClientError, dry_run=self.dry_run, logger=self.logger, **kwargs,
+        )
+
+    def batch(self, *, max_batch: int = _composite.MAX_SUBREQUESTS) -> _composite.CompositeBatch:
+        """Queue independent calls into ``/composite[/batch]`` round trips.
+
+        See ``scripts/sf_transport/composite.py``: sub-responses raise this
+        toolkit's client error with the usual ``error_codes``; under dry-run,
+        mutations are still logged and skipped while reads are batched.
+        """
+        return _composite.CompositeBatch(
+            self.request, api_version=self.api_version,
+            error_factory=lambda method, path, text: _request_error(
+                method, path, self.target_org, text),
+            dry_run=self.dry_run, logger=self.logger, max_batch=max_batch,
+            cache=_read_cache_for(self.target_org, self.api_version),
+        )
@@ -47,6 +47,14 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 from scripts.context_service._apply import ContextApplier, Transport  # noqa: E402
 from scripts.context_service._client import ContextClientError, DEFAULT_API_VERSION, eprint  # noqa: E402
 from scripts.context_service.definition.validate_context_plan import validate_manifest  # noqa: E402
+from scripts.sf_transport.cassette import (  # noqa: E402
+    add_cassette_argument,
+    apply_cassette_argument,
+)
+from scripts.sf_transport.pooled import (  # noqa: E402
+    add_transport_argument,
+    apply_transport_argument,
+)
 
 
 def _load_manifest_plans(manifest_path: Path):
@@ -178,7 +186,11 @@ def main(argv=None) -> int:
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--skip-lint", action="store_true",
                         help="Skip the offline validator preflight (not recommended).")
+    add_transport_argument(parser)
+    add_cassette_argument(parser)
     args = parser.parse_args(argv)
+    apply_transport_argument(args)
+    apply_cassette_argument(args)
 
     eprint("apply_context_plan.py — one-off plan apply. The org-build path is "
            "`cci task run manage_context_definition`.")
@@ -37,6 +37,10 @@ from scripts.context_service._client import (  # noqa: E402
     node_attributes,
 )
 from scripts.context_service._resolve import resolve_definition_id  # noqa: E402
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 
 def _resolve_id(developer_name: str, target_org: str, api_version: str):
@@ -140,7 +144,9 @@ def main(argv=None) -> int:
         help=f"Salesforce API version (default {DEFAULT_API_VERSION})."
     )
     parser.add_argument("--json", action="store_true", help="Emit raw normalized JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     try:
         context_id = args.context_id
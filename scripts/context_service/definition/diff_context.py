@@ -56,6 +56,10 @@ from scripts.context_service._client import (  # noqa: E402
     normalize_definition_list,
 )
 from scripts.context_service._model import normalize_definition, normalize_plan  # noqa: E402
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 
 # ---- fetch helpers ---------------------------------------------------------
@@ -472,7 +476,9 @@ def main(argv=None) -> int:
     parser.add_argument("--api-version", default=DEFAULT_API_VERSION,
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true", help="Emit structured JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     if bool(args.source_org) == bool(args.plan_file):
         parser.error("choose exactly one mode: --source-org (org-vs-org) OR "
@@ -98,6 +98,10 @@ from scripts.context_service._client import (  # noqa: E402
     node_attributes,
 )
 from scripts.context_service._resolve import resolve_definition_id  # noqa: E402
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 # fieldType read/write eligibility (Core UDD enum). INPUT is hydration-only,
 # OUTPUT is persist-only, INPUTOUTPUT is both, AGGREGATE is computed (rollup) —
@@ -572,7 +576,9 @@ def main(argv=None) -> int:
                         help=f"Salesforce API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--verbose", action="store_true", help="List every attribute in --unmapped.")
     parser.add_argument("--json", action="store_true", help="Emit the query result as JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     try:
         context_id = args.context_id
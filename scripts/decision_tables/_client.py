@@ -4,15 +4,30 @@
 Tooling handles setup objects, Connect handles CSV data/version resources, and
 normal REST handles source rows and recipe mappings. Request bodies travel on
 stdin; this module never handles access tokens.
+
+Set ``RLM_SF_TRANSPORT=http`` (or pass ``--transport http`` where an entry
+script offers it) to send the same requests through the in-process pooled
+backend in ``scripts/sf_transport/pooled.py`` instead: the token is read out of
+the ``sf`` CLI once per org and held in memory only, and each call reuses a
+keep-alive connection rather than spawning Node.
 """
 
 import base64
 import json
 import subprocess
 import sys
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from urllib.parse import quote
 
+from scripts.sf_transport import bulk as _bulk
+from scripts.sf_transport import aio as _aio
+from scripts.sf_transport import cassette as _cassette
+from scripts.sf_transport import composite as _composite
+from scripts.sf_transport import metrics as _metrics
+from scripts.sf_transport import paging as _paging
+from scripts.sf_transport import pooled as _pooled
+from scripts.sf_transport import read_cache as _read_cache
+
 DEFAULT_API_VERSION = "67.0"
 _REQUEST_TIMEOUT = 120  # seconds — reads
 # A REST/Metadata mutation that (de)activates or rebuilds a table can take
@@ -71,6 +86,38 @@ def _run_sf(
         ) from exc
 
 
+def _send(method: str, full_path: str, args: List[str], input_text: Optional[str],
+          *, target_org: str, timeout: int) -> subprocess.CompletedProcess:
+    """Dispatch one request to the selected backend (``RLM_SF_TRANSPORT``).
+
+    ``cli`` (default) spawns ``sf api request rest``; ``http`` reuses the
+    in-process pooled session from ``scripts/sf_transport/pooled.py``. Both
+    return a CLI-shaped result, so ``connect_request``'s error handling is shared.
+    Each call is timed by ``scripts/sf_transport/metrics.py`` when
+    ``RLM_SF_METRICS_DIR`` is set, and recorded or replayed through
+    ``scripts/sf_transport/cassette.py`` when ``RLM_SF_CASSETTE`` is set.
+    """
+    backend = _pooled.resolve_backend(error_cls=DecisionTableClientError)
+    cassette = _cassette.active(error_cls=DecisionTableClientError)
+
+    def live() -> subprocess.CompletedProcess:
+        if backend == _pooled.BACKEND_HTTP:
+            return _pooled.send(method, full_path, input_text, target_org=target_org,
+                                timeout=timeout, error_cls=DecisionTableClientError)
+        return _run_sf(args, input_text=input_text, timeout=timeout)
+
+    replaying = cassette is not None and cassette.replaying
+    with _metrics.track("replay" if replaying else backend, method, full_path, input_text,
+                        spawn=backend == _pooled.BACKEND_CLI and not replaying) as sample:
+        if cassette is None:
+            result = live()
+        else:
+            result = cassette.send(method, full_path, input_text, live,
+                                   error_cls=DecisionTableClientError)
+        sample.complete(result)
+    return result
+
+
 def _summarize_body(body: Any) -> str:
     """A compact one-line shape summary of a mutation body for dry-run logs.
 
@@ -97,6 +144,53 @@ def _summarize_body(body: Any) -> str:
     return f"<{len(raw)} bytes>"
 
 
+def _request_error(method: str, path: str, target_org: str, stdout: str, *,
+                   stderr: str = "") -> DecisionTableClientError:
+    """Build the client error for a failed request (direct or composite sub-request)."""
+    error_codes = _extract_error_codes(stdout)
+    detail = stdout or (stderr or "").strip()
+    if error_codes:
+        # Salesforce returned a structured platform error. Preserve it exactly;
+        # callers already know which action they attempted, and speculative auth
+        # advice only obscures the authoritative failure.
+        message = detail
+    else:
+        message = (
+            f"sf api request {method} '{path}' failed for org '{target_org}':\n"
+            f"{detail}\n\nConfirm the SF CLI alias is correct (this is the *sf* "
+            f"alias or username, not the CCI alias) and that you are "
+            f"authenticated (`sf org login web --alias {target_org}`)."
+        )
+    return DecisionTableClientError(message, error_codes=error_codes, body=stdout)
+
+
+_READ_CACHE_RULES = _read_cache.Rules(
+    validators=(
+        _read_cache.Validator(
+            r"^tooling/sobjects/DecisionTable/(?P<id>[A-Za-z0-9]{15,18})$",
+            "SELECT LastModifiedDate FROM DecisionTable WHERE Id = '{id}'",
+            tooling=True,
+        ),
+    ),
+    related=(
+        ("tooling/sobjects/DecisionT", CONNECT_BASE),
+    ),
+)
+
+
+def _read_cache_for(target_org: str, api_version: str) -> Optional[_read_cache.OrgCache]:
+    """The opt-in read cache for this org (``RLM_SF_READ_CACHE``), else ``None``.
+
+    See ``scripts/sf_transport/read_cache.py``: GETs are served or revalidated
+    from disk, and mutations drop the related entries.
+    """
+    return _read_cache.for_org(
+        target_org, api_version, _READ_CACHE_RULES,
+        lambda path: connect_request("GET", path, target_org=target_org,
+                                     api_version=api_version),
+    )
+
+
 def connect_request(
     method: str,
     path: str,
@@ -131,6 +225,15 @@ def connect_request(
         log(f"[dry-run] {method} {full_path} {_summarize_body(body)}")
         return {}
 
+    cache = _read_cache_for(target_org, api_version)
+    if cache is not None:
+        if method == "GET":
+            return cache.read(path, lambda: connect_request(
+                method, path, body, target_org=target_org, api_version=api_version,
+                logger=logger, timeout=timeout,
+            ))
+        cache.invalidate(method, path, body)
+
     args = ["api", "request", "rest", full_path, "-X", method, "--target-org", target_org]
     input_text: Optional[str] = None
     if body is not None:
@@ -145,28 +248,11 @@ def connect_request(
     if timeout is None:
         timeout = _REQUEST_TIMEOUT if method in ("GET", "HEAD") else _MUTATION_TIMEOUT
 
-    result = _run_sf(args, input_text=input_text, timeout=timeout)
+    result = _send(method, full_path, args, input_text,
+                   target_org=target_org, timeout=timeout)
     stdout = (result.stdout or "").strip()
     if result.returncode != 0:
-        error_codes = _extract_error_codes(stdout)
-        detail = stdout or (result.stderr or "").strip()
-        if error_codes:
-            # Salesforce returned a structured platform error. Preserve it exactly;
-            # callers already know which action they attempted, and speculative auth
-            # advice only obscures the authoritative failure.
-            message = detail
-        else:
-            message = (
-                f"sf api request {method} '{path}' failed for org '{target_org}':\n"
-                f"{detail}\n\nConfirm the SF CLI alias is correct (this is the *sf* "
-                f"alias or username, not the CCI alias) and that you are "
-                f"authenticated (`sf org login web --alias {target_org}`)."
-            )
-        raise DecisionTableClientError(
-            message,
-            error_codes=error_codes,
-            body=stdout,
-        )
+        raise _request_error(method, path, target_org, stdout, stderr=result.stderr)
     if not stdout:
         return {}
     try:
@@ -356,38 +442,33 @@ def soql_literal(value: Any) -> str:
     return str(value).replace("\\", "\\\\").replace("'", "\\'")
 
 
-def _paginated_query(
-    initial_path: str, *, target_org: str, api_version: str
-) -> List[Dict[str, Any]]:
+def _iter_query(
+    initial_path: str, *, target_org: str, api_version: str, prefetch: bool = True
+) -> Iterator[Dict[str, Any]]:
     """Shared pagination for normal-REST and Tooling query endpoints.
 
     ``nextRecordsUrl`` from the Tooling endpoint is a versioned absolute path
     (``/services/data/vXX.0/tooling/query/01g…``); strip the versioned prefix so
-    ``connect_request`` rebuilds it, preserving the ``tooling/`` segment.
+    ``connect_request`` rebuilds it, preserving the ``tooling/`` segment. With
+    ``prefetch`` the next page is fetched while the caller consumes this one
+    (``scripts/sf_transport/paging.py``).
     """
-    resp = connect_request(
+    first = connect_request(
         "GET", initial_path, None, target_org=target_org, api_version=api_version
     )
-    records: List[Dict[str, Any]] = []
-    if isinstance(resp, dict):
-        records.extend(r for r in resp.get("records", []) if isinstance(r, dict))
-        while not resp.get("done", True) and resp.get("nextRecordsUrl"):
-            nurl = resp["nextRecordsUrl"]
-            marker = "/services/data/"
-            if nurl.startswith(marker):
-                # Drop "/services/data/vXX.0/" so connect_request rebuilds it;
-                # any remaining "tooling/" segment is preserved.
-                rel = nurl.split("/", 4)[-1]
-            else:
-                rel = nurl.lstrip("/")
-            resp = connect_request(
-                "GET", rel, None, target_org=target_org, api_version=api_version
-            )
-            if isinstance(resp, dict):
-                records.extend(r for r in resp.get("records", []) if isinstance(r, dict))
-            else:
-                break
-    return records
+    yield from _paging.iter_records(
+        first,
+        lambda nurl: connect_request("GET", _paging.relative_next_url(nurl), None,
+                                     target_org=target_org, api_version=api_version),
+        prefetch=prefetch,
+    )
+
+
+def _paginated_query(
+    initial_path: str, *, target_org: str, api_version: str
+) -> List[Dict[str, Any]]:
+    return list(_iter_query(initial_path, target_org=target_org,
+                            api_version=api_version, prefetch=False))
 
 
 def soql_query(
@@ -403,6 +484,24 @@ def soql_query(
     )
 
 
+def iter_soql_query(
+    soql: str, *, target_org: str, api_version: str = DEFAULT_API_VERSION,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Streaming :func:`soql_query`: yield records page by page (next page prefetched)."""
+    return _iter_query(f"query?q={quote(soql)}", target_org=target_org,
+                       api_version=api_version, prefetch=prefetch)
+
+
+def iter_tooling_query(
+    soql: str, *, target_org: str, api_version: str = DEFAULT_API_VERSION,
+    prefetch: bool = True,
+) -> Iterator[Dict[str, Any]]:
+    """Streaming :func:`tooling_query`: yield records page by page (next page prefetched)."""
+    return _iter_query(f"tooling/query?q={quote(soql)}", target_org=target_org,
+                       api_version=api_version, prefetch=prefetch)
+
+
 def eprint(*args, **kwargs):
     """Print to stderr (so --json stdout stays clean)."""
     print(*args, file=sys.stderr, **kwargs)
@@ -475,6 +574,58 @@ class Transport:
             query, target_org=self.target_org, api_version=self.api_version
         )
 
+    def iter_soql(self, query: str, *, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        return iter_soql_query(
+            query, target_org=self.target_org, api_version=self.api_version,
+            prefetch=prefetch,
+        )
+
+    def iter_tooling_query(self, query: str, *, prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        return iter_tooling_query(
+            query, target_org=self.target_org, api_version=self.api_version,
+            prefetch=prefetch,
+        )
+
+    def bulk(self) -> Optional[_bulk.BulkClient]:
+        """A Bulk API 2.0 client for this org, or None on the ``cli`` backend.
+
+        Bulk jobs need the token in-process, so only the ``http`` backend (which
+        already holds it) offers one; cassette sessions stay on REST too.
+        """
+        backend = _pooled.resolve_backend(error_cls=DecisionTableClientError)
+        if backend != _pooled.BACKEND_HTTP or _cassette.active(error_cls=DecisionTableClientError):
+            return None
+        return _bulk.BulkClient.for_org(self.target_org, self.api_version)
+
+    def aio(self, **kwargs: Any) -> _aio.AsyncTransport:
+        """An asyncio transport for fan-out reads/writes against this org.
+
+        Sends through the pooled ``http`` credentials under the org's shared
+        throttle (``scripts/sf_transport/aio.py``), whatever ``RLM_SF_TRANSPORT``
+        says; errors carry this toolkit's ``error_codes`` as usual.
+        """
+        return _aio.AsyncTransport(
+            self.target_org, self.api_version,
+            error_factory=lambda method, path, text: _request_error(
+                method, path, self.target_org, text),
+            error_cls=DecisionTableClientError, dry_run=self.dry_run, logger=self.logger, **kwargs,
+        )
+
+    def batch(self, *, max_batch: int = _composite.MAX_SUBREQUESTS) -> _composite.CompositeBatch:
+        """Queue independent calls into ``/composite[/batch]`` round trips.
+
+        See ``scripts/sf_transport/composite.py``: sub-responses raise this
+        toolkit's client error with the usual ``error_codes``; under dry-run,
+        mutations are still logged and skipped while reads are batched.
+        """
+        return _composite.CompositeBatch(
+            self.connect, api_version=self.api_version,
+            error_factory=lambda method, path, text: _request_error(
+                method, path, self.target_org, text),
+            dry_run=self.dry_run, logger=self.logger, max_batch=max_batch,
+            cache=_read_cache_for(self.target_org, self.api_version),
+        )
+
     # -- CSV Based Decision Table data layer (dataSourceType == CsvUpload) --
 
     def content_version_insert(self, title: str, csv_text: str,
@@ -8,6 +8,7 @@
 from typing import Any, Dict, List, Optional
 
 from scripts.decision_tables._client import soql_literal
+from scripts.sf_transport.composite import batch_for
 
 
 class ResolveError(RuntimeError):
@@ -115,25 +116,31 @@ def get_decision_table_metadata(transport, record_id: str) -> Dict[str, Any]:
     return resp
 
 
-def list_parameters(transport, decision_table_id: str) -> List[Dict[str, Any]]:
-    """The columns (``DecisionTableParameter`` ``0lP``) for a table, in sequence."""
-    return _tooling(
-        transport,
+def _parameters_soql(decision_table_id: str) -> str:
+    return (
         f"SELECT {', '.join(_PARAM_COLUMNS)} FROM DecisionTableParameter "
         f"WHERE DecisionTableId = '{soql_literal(decision_table_id)}' "
-        f"ORDER BY Usage, Sequence NULLS LAST",
+        f"ORDER BY Usage, Sequence NULLS LAST"
     )
 
 
-def list_dataset_links(transport, decision_table_id: str) -> List[Dict[str, Any]]:
-    """Dataset links (``DecisionTableDatasetLink`` ``0lX``) for a MultipleSobjects table."""
-    return _tooling(
-        transport,
+def list_parameters(transport, decision_table_id: str) -> List[Dict[str, Any]]:
+    """The columns (``DecisionTableParameter`` ``0lP``) for a table, in sequence."""
+    return _tooling(transport, _parameters_soql(decision_table_id))
+
+
+def _dataset_links_soql(decision_table_id: str) -> str:
+    return (
         f"SELECT {', '.join(_DATASET_LINK_COLUMNS)} FROM DecisionTableDatasetLink "
-        f"WHERE DecisionTableId = '{soql_literal(decision_table_id)}'",
+        f"WHERE DecisionTableId = '{soql_literal(decision_table_id)}'"
     )
 
 
+def list_dataset_links(transport, decision_table_id: str) -> List[Dict[str, Any]]:
+    """Dataset links (``DecisionTableDatasetLink`` ``0lX``) for a MultipleSobjects table."""
+    return _tooling(transport, _dataset_links_soql(decision_table_id))
+
+
 def list_dataset_parameters(transport, dataset_link_ids: List[str]) -> List[Dict[str, Any]]:
     """Join layer (``DecisionTblDatasetParameter`` ``0lZ``) for the given links.
 
@@ -150,16 +157,19 @@ def list_dataset_parameters(transport, dataset_link_ids: List[str]) -> List[Dict
     )
 
 
-def list_source_criteria(transport, decision_table_id: str) -> List[Dict[str, Any]]:
-    """Row-filter criteria (``DecisionTableSourceCriteria`` ``0VT``, v59.0+) for a table."""
-    return _tooling(
-        transport,
+def _source_criteria_soql(decision_table_id: str) -> str:
+    return (
         f"SELECT {', '.join(_SOURCE_CRITERIA_COLUMNS)} FROM DecisionTableSourceCriteria "
         f"WHERE DecisionTableId = '{soql_literal(decision_table_id)}' "
-        f"ORDER BY SequenceNumber NULLS LAST",
+        f"ORDER BY SequenceNumber NULLS LAST"
     )
 
 
+def list_source_criteria(transport, decision_table_id: str) -> List[Dict[str, Any]]:
+    """Row-filter criteria (``DecisionTableSourceCriteria`` ``0VT``, v59.0+) for a table."""
+    return _tooling(transport, _source_criteria_soql(decision_table_id))
+
+
 def load_definition(transport, developer_name: str, *, with_metadata: bool = True) -> Dict[str, Any]:
     """Assemble a full definition view for one table across the 5 setup objects.
 
@@ -176,21 +186,34 @@ def load_definition(transport, developer_name: str, *, with_metadata: bool = Tru
 
     ``with_metadata=False`` skips the per-record Tooling GET (the columns/criteria
     child queries alone are enough for a structural diff and are cheaper).
+
+    Once the id is resolved, the child queries and the Metadata GET are
+    independent: on a batching transport they share one
+    ``tooling/composite/batch`` round trip. The dataset-parameter join needs the
+    link ids, so it follows.
     """
     table = resolve_decision_table(transport, developer_name)
     dt_id = table["Id"]
-    dataset_links = list_dataset_links(transport, dt_id)
+    with batch_for(transport) as batch:
+        links_call = batch.tooling_query(_dataset_links_soql(dt_id))
+        record_call = (batch.tooling_sobject("GET", "DecisionTable", dt_id)
+                       if with_metadata else None)
+        params_call = batch.tooling_query(_parameters_soql(dt_id))
+        criteria_call = batch.tooling_query(_source_criteria_soql(dt_id))
+    dataset_links = links_call.result()
     metadata = None
-    if with_metadata:
-        record = get_decision_table_metadata(transport, dt_id)
+    if record_call is not None:
+        record = record_call.result()
+        if not isinstance(record, dict):
+            raise ResolveError(f"Unexpected Tooling GET response for DecisionTable/{dt_id}.")
         metadata = record.get("Metadata")
     return {
         "table": table,
         "metadata": metadata,
-        "parameters": list_parameters(transport, dt_id),
+        "parameters": params_call.result(),
         "datasetLinks": dataset_links,
         "datasetParameters": list_dataset_parameters(
             transport, [d.get("Id") for d in dataset_links]
         ),
-        "sourceCriteria": list_source_criteria(transport, dt_id),
+        "sourceCriteria": criteria_call.result(),
     }
@@ -18,6 +18,10 @@ from scripts.decision_tables._resolve import (  # noqa: E402
     load_definition,
     tristate_bool,
 )
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 
 def _print_definition(defn):
@@ -106,7 +110,9 @@ def main(argv=None) -> int:
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true",
                         help="Emit the assembled definition as JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     transport = Transport(args.target_org, api_version=args.api_version)
     try:
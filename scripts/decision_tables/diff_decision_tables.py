@@ -18,6 +18,10 @@ from scripts.decision_tables._resolve import (  # noqa: E402
     ResolveError,
     load_definition,
 )
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 # Table-level attributes worth diffing, taken from the head record. Runtime
 # observations such as lastSyncDate / refreshStatus / uploadStatus are
@@ -232,7 +236,9 @@ def main(argv=None) -> int:
     parser.add_argument("--api-version", default=DEFAULT_API_VERSION,
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true", help="Emit the delta as JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     org_a = args.target_org
     org_b = args.other_org or args.target_org
@@ -3,6 +3,9 @@
 
 SObject-backed tables are queried through REST, CSV tables through Connect, and
 runtime-hydrated ContextDefinition tables are reported without a static sample.
+A ``--limit`` at or above ``--bulk-threshold`` (``RLM_SF_BULK_THRESHOLD``) reads
+SObject rows through a Bulk API 2.0 query job instead, on the ``http`` backend;
+Bulk rows carry string values.
 """
 
 import argparse
@@ -21,6 +24,7 @@ from scripts.decision_tables._resolve import (  # noqa: E402
     ResolveError,
     load_definition,
 )
+from scripts.sf_transport import bulk as _bulk  # noqa: E402
 
 # The CsvUpload data GET is degraded to a note (rather than raised) only for the
 # two error codes that genuinely mean "no rows to read here", not a real failure:
@@ -43,10 +47,16 @@ def _projection_fields(defn):
     return fields
 
 
-def _sample_sobject(transport, sobject, fields, limit):
+def _sample_sobject(transport, sobject, fields, limit, bulk_threshold=None):
     """Query source rows; returns (rows, fallback_note_or_None)."""
     field_list = ", ".join(fields) if fields else "Id"
     soql = f"SELECT {field_list} FROM {sobject} LIMIT {int(limit)}"
+    bulk = transport.bulk() if _bulk.prefer_bulk(int(limit), bulk_threshold) else None
+    if bulk is not None:
+        try:
+            return list(bulk.iter_query(soql)), None
+        except _bulk.BulkError as exc:
+            eprint(f"  (bulk query failed, retrying through REST: {exc})")
     try:
         return transport.soql(soql), None
     except DecisionTableClientError as exc:
@@ -125,11 +135,12 @@ def _dump_csv_upload(transport, table, out, limit, row_filter=None):
     out["samples"]["CSV (uploaded rows)"] = samples
 
 
-def dump_data(transport, defn, limit, row_filter=None):
+def dump_data(transport, defn, limit, row_filter=None, bulk_threshold=None):
     """Return a dict describing the data-layer sample for a loaded definition.
 
     ``row_filter`` applies only to the CsvUpload branch; other source types ignore
-    it with a note."""
+    it with a note. ``bulk_threshold`` overrides ``RLM_SF_BULK_THRESHOLD`` for
+    the SObject branches."""
     table = defn["table"]
     meta = defn.get("metadata") or {}
     source_type = meta.get("dataSourceType")
@@ -148,7 +159,8 @@ def dump_data(transport, defn, limit, row_filter=None):
             out["notes"].append("No sourceObject on a SingleSobject table — nothing to sample.")
             return out
         fields = _projection_fields(defn)
-        rows, fallback_note = _sample_sobject(transport, source_object, fields, limit)
+        rows, fallback_note = _sample_sobject(transport, source_object, fields, limit,
+                                              bulk_threshold)
         out["samples"][source_object] = rows
         if fallback_note:
             out["notes"].append(fallback_note)
@@ -162,7 +174,7 @@ def dump_data(transport, defn, limit, row_filter=None):
             so = lk.get("SourceObject")
             if not so:
                 continue
-            rows, fallback_note = _sample_sobject(transport, so, ["Id"], limit)
+            rows, fallback_note = _sample_sobject(transport, so, ["Id"], limit, bulk_threshold)
             out["samples"][so] = rows
             if fallback_note:
                 out["notes"].append(fallback_note)
@@ -213,12 +225,19 @@ def main(argv=None) -> int:
     parser.add_argument("--api-version", default=DEFAULT_API_VERSION,
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true", help="Emit the dump as JSON.")
+    parser.add_argument(
+        "--bulk-threshold", type=int, default=None, metavar="ROWS",
+        help=f"Read SObject rows through Bulk API 2.0 when --limit is at least ROWS "
+             f"(RLM_SF_TRANSPORT=http only; 0 disables). Default: ${_bulk.THRESHOLD_ENV_VAR}, "
+             f"else {_bulk.DEFAULT_THRESHOLD}.",
+    )
     args = parser.parse_args(argv)
 
     transport = Transport(args.target_org, api_version=args.api_version)
     try:
         defn = load_definition(transport, args.developer_name)
-        dump = dump_data(transport, defn, args.limit, row_filter=args.row_filter)
+        dump = dump_data(transport, defn, args.limit, row_filter=args.row_filter,
+                         bulk_threshold=args.bulk_threshold)
     except (DecisionTableClientError, ResolveError) as exc:
         eprint(f"Error: {exc}")
         return 1
@@ -29,6 +29,14 @@ from scripts.decision_tables._resolve import (  # noqa: E402
     resolve_decision_table,
     tristate_bool,
 )
+from scripts.sf_transport.cassette import (  # noqa: E402
+    add_cassette_argument,
+    apply_cassette_argument,
+)
+from scripts.sf_transport.pooled import (  # noqa: E402
+    add_transport_argument,
+    apply_transport_argument,
+)
 
 
 def main(argv=None) -> int:
@@ -56,7 +64,11 @@ def main(argv=None) -> int:
     parser.add_argument("--api-version", default=DEFAULT_API_VERSION,
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true", help="Emit a result summary as JSON.")
+    add_transport_argument(parser)
+    add_cassette_argument(parser)
     args = parser.parse_args(argv)
+    apply_transport_argument(args)
+    apply_cassette_argument(args)
 
     preview = not args.confirm
     transport = Transport(args.target_org, api_version=args.api_version,
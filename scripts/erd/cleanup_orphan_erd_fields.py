@@ -50,11 +50,17 @@ Usage:
     python scripts/erd/cleanup_orphan_erd_fields.py --org rlm-base__ent-sb0 \\
         --include-custom --dry-run
 
+    # Describe over REST with asyncio (token read once per org; hundreds of
+    # describes in flight under the org's API-limit-aware throttle)
+    python scripts/erd/cleanup_orphan_erd_fields.py --orgs ent-r1,rlm-base__ent-sb0 \\
+        --transport http --concurrency 100 --dry-run
+
 Outputs a candidates.md report listing every orphan and its classification.
 """
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import subprocess
 import sys
@@ -64,6 +70,10 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
 REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+from scripts.sf_transport import aio as _aio  # noqa: E402
+
+API_VERSION = "67.0"
 ERD_DATA = REPO_ROOT / "docs" / "erds" / "erd-data.json"
 
 # System fields described by every org — should NEVER be in erd-data.json
@@ -112,18 +122,66 @@ def get_org_fields(org_alias: str, object_name: str,
     describe = describe_sobject(org_alias, object_name)
     if describe is None:
         return None
-    fields = set()
-    for f in describe.get("fields", []):
-        name = f["name"]
-        if skip_custom and name.endswith("__c"):
-            continue
-        fields.add(name)
-    return fields
+    return _field_names(describe, skip_custom)
+
+
+def _field_names(describe: dict, skip_custom: bool) -> Set[str]:
+    return {f["name"] for f in describe.get("fields", [])
+            if not (skip_custom and f["name"].endswith("__c"))}
+
+
+class _DescribeError(RuntimeError):
+    def __init__(self, status_text: str):
+        super().__init__(status_text)
+        self.not_found = "NOT_FOUND" in status_text
+
+
+async def _collect_org_fields_http(org_aliases: List[str], object_names: List[str],
+                                   concurrency: int, verbose: bool, skip_custom: bool
+                                   ) -> Dict[str, Dict[str, Optional[Set[str]]]]:
+    """REST describes for every (org, object) pair, all in flight at once.
+
+    Each org gets its own throttle capped at ``concurrency`` requests in flight;
+    an unknown object (``NOT_FOUND``) maps to None like the CLI path.
+    """
+    result: Dict[str, Dict[str, Optional[Set[str]]]] = {alias: {} for alias in org_aliases}
+    done = 0
+    total = len(org_aliases) * len(object_names)
+
+    async def one(transport: _aio.AsyncTransport, alias: str, obj: str) -> None:
+        nonlocal done
+        try:
+            describe = await transport.connect("GET", f"sobjects/{obj}/describe")
+            result[alias][obj] = _field_names(describe, skip_custom)
+        except _DescribeError as e:
+            if not e.not_found:
+                print(f"  ERROR {alias}/{obj}: {e}", file=sys.stderr)
+            result[alias][obj] = None
+        except Exception as e:
+            print(f"  ERROR {alias}/{obj}: {e}", file=sys.stderr)
+            result[alias][obj] = None
+        done += 1
+        if verbose or done % 50 == 0:
+            print(f"  {done}/{total} pairs processed...", flush=True)
+
+    transports = [
+        _aio.AsyncTransport(alias, API_VERSION,
+                            error_factory=lambda method, path, text: _DescribeError(text),
+                            throttle=_aio.ApiThrottle(max_concurrency=concurrency))
+        for alias in org_aliases
+    ]
+    try:
+        await asyncio.gather(*(one(t, t.target_org, obj)
+                               for t in transports for obj in object_names))
+    finally:
+        for t in transports:
+            await t.aclose()
+    return result
 
 
 def collect_org_fields(org_aliases: List[str], object_names: List[str],
                        concurrency: int = 10, verbose: bool = False,
-                       skip_custom: bool = True
+                       skip_custom: bool = True, transport: str = "cli"
                        ) -> Dict[str, Dict[str, Optional[Set[str]]]]:
     """Collect field sets per (org, object) pair.
 
@@ -131,6 +189,9 @@ def collect_org_fields(org_aliases: List[str], object_names: List[str],
     function for the contract. Defaults to True so the orphan workflow stays
     aligned with the canonical-platform-schema rule.
 
+    ``transport="http"`` describes over REST with asyncio
+    (:func:`_collect_org_fields_http`) instead of one ``sf`` process per pair.
+
     Returns: { org_alias: { object_name: {field_set} or None } }
     """
     # Plan: parallelize across (org, object) pairs
@@ -140,9 +201,15 @@ def collect_org_fields(org_aliases: List[str], object_names: List[str],
     pairs = [(alias, obj) for alias in org_aliases for obj in object_names]
     print(f"Querying {len(pairs)} (org, object) pairs across "
           f"{len(org_aliases)} orgs (concurrency={concurrency}, "
-          f"skip_custom={skip_custom})...")
+          f"skip_custom={skip_custom}, transport={transport})...")
     start = time.time()
 
+    if transport == "http":
+        result = asyncio.run(_collect_org_fields_http(
+            org_aliases, object_names, concurrency, verbose, skip_custom))
+        print(f"  Completed in {time.time() - start:.1f}s")
+        return result
+
     with ThreadPoolExecutor(max_workers=concurrency) as executor:
         futures = {
             executor.submit(get_org_fields, alias, obj, skip_custom): (alias, obj)
@@ -372,6 +439,10 @@ def main():
                         help="Output markdown report path (relative to repo root)")
     parser.add_argument("--concurrency", type=int, default=10,
                         help="Parallel describe calls (default: 10)")
+    parser.add_argument("--transport", choices=("cli", "http"), default="cli",
+                        help="'cli' runs `sf sobject describe` per object; 'http' "
+                             "describes over REST with asyncio under an API-limit-aware "
+                             "throttle (token read once per org). Default: cli.")
     parser.add_argument(
         "--include-custom",
         action="store_true",
@@ -412,7 +483,7 @@ def main():
     org_data = collect_org_fields(
         org_aliases, object_names,
         concurrency=args.concurrency, verbose=args.verbose,
-        skip_custom=not args.include_custom,
+        skip_custom=not args.include_custom, transport=args.transport,
     )
 
     # Find orphans
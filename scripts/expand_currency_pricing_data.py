@@ -45,12 +45,22 @@ Usage
     python scripts/expand_currency_pricing_data.py --apply
     python scripts/expand_currency_pricing_data.py --plan datasets/sfdmu/qb/ja/qb-pricing --apply
     python scripts/expand_currency_pricing_data.py --currencies GBP,EUR,AUD,CAD,CHF,JPY --round 0.5
+    python scripts/expand_currency_pricing_data.py --benchmark 1000000 --benchmark-currencies 30
+
+Two engines write the same bytes: ``columns`` (the default) rewrites only the
+currency-bearing columns, once per target over all base rows, and is the one
+to use for dozens of currencies or very large plans; ``rows`` is the original
+row-at-a-time loop, kept as the reference ``--benchmark`` checks it against.
 """
 import argparse
 import csv
 import io
+import json
 import os
+import random
+import string
 import sys
+import time
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
 
 DEFAULT_PLAN = "datasets/sfdmu/qb/en-US/qb-pricing"
@@ -164,17 +174,17 @@ def make_variant(row, ccy, base, fieldnames, money_col, pred, rates, whole, step
     return v
 
 
-def process(plan, fname, money_col, pred, base, targets, rates, whole, step, apply):
-    path = os.path.join(plan, fname)
-    if not os.path.isfile(path):
-        print(f"  {fname:34s} (absent — skipped)")
-        return 0
-    raw = open(path, newline="").read().splitlines()
+def expand_rows(text, money_col, pred, base, targets, rates, whole, step, fname):
+    """Expand one CSV a row at a time.
+
+    The reference implementation: ``expand_columns`` must produce the same bytes.
+    Returns (output text, base row count, output row count, sample conversions).
+    """
+    raw = text.splitlines()
     header_line, data_raw = raw[0], [l for l in raw[1:] if l != ""]
-    with open(path, newline="") as fh:
-        reader = csv.DictReader(fh)
-        fieldnames = reader.fieldnames
-        rows = list(reader)
+    reader = csv.DictReader(io.StringIO(text, newline=""))
+    fieldnames = reader.fieldnames
+    rows = list(reader)
     if len(rows) != len(data_raw):
         sys.exit(f"{fname}: line/row misalignment ({len(rows)} vs {len(data_raw)}) — embedded newline?")
 
@@ -191,17 +201,172 @@ def process(plan, fname, money_col, pred, base, targets, rates, whole, step, app
                 out.append(serialize(v, fieldnames))
                 if money_col and len(sample) < 2 and t in ("GBP", "JPY"):
                     sample.append((row.get(money_col), t, v[money_col]))
-    if apply:
-        open(path, "w", newline="").write("\n".join(out) + "\n")
-    added = base_count * len(targets)
     # Count the actual output rows: with a --currencies subset, non-target rows are
     # preserved in `out` and a base*(targets+1) formula silently undercounts them.
-    total = len(out) - 1  # out[0] is the header
+    return "\n".join(out) + "\n", base_count, len(out) - 1, sample
+
+
+def expand_columns(text, money_col, pred, base, targets, rates, whole, step, fname):
+    """Expand one CSV a column at a time — same output as ``expand_rows``, byte for byte.
+
+    Only the ``CurrencyIsoCode`` column, the ``$$`` columns that carry it and the
+    money column differ between a base row and its variants. Each of those is
+    built once per target over all base rows (a money value is converted once
+    per distinct amount and currency); every other cell is shared with the base
+    row and quoted once for all of that row's variants.
+    """
+    raw = text.splitlines()
+    header_line, data_raw = raw[0], [l for l in raw[1:] if l != ""]
+    reader = csv.reader(io.StringIO(text, newline=""))
+    fieldnames = next(reader)
+    width = len(fieldnames)
+    rows = [(r + [""] * (width - len(r)))[:width] for r in reader if r]
+    if len(rows) != len(data_raw):
+        sys.exit(f"{fname}: line/row misalignment ({len(rows)} vs {len(data_raw)}) — embedded newline?")
+
+    cur = fieldnames.index("CurrencyIsoCode")
+    drop = set(targets)
+    kept = [i for i, row in enumerate(rows) if row[cur] not in drop]
+    base_rows = [rows[i] for i in kept if rows[i][cur] == base]
+
+    # (column, {target: values over base rows}) for every $$ column holding the currency.
+    swapped = []
+    for j, fn in enumerate(fieldnames):
+        toks = _tokens(fn)
+        if not toks or "CurrencyIsoCode" not in toks or not targets:
+            continue
+        after = len(toks) - 1 - toks.index("CurrencyIsoCode")
+        located = []
+        for row in base_rows:
+            value = row[j]
+            if value == "":
+                located.append(None)
+                continue
+            parts = value.split(";")
+            idx = len(parts) - 1 - after
+            if idx < 0 or parts[idx] != row[cur]:
+                raise ValueError(
+                    f"currency segment not found: header={fn!r} value={value!r} "
+                    f"idx={idx} expected={row[cur]!r}"
+                )
+            located.append((parts[:idx], parts[idx + 1:]))
+        swapped.append((j, {t: ["" if loc is None else _quote(";".join(loc[0] + [t] + loc[1]))
+                                for loc in located] for t in targets}))
+
+    money = fieldnames.index(money_col) if money_col in fieldnames else None
+    converted = {}  # target -> converted amount per base row (None: copied unchanged)
+    if money is not None:
+        memo = {}
+        values = {t: [] for t in targets}
+        for row in base_rows:
+            raw_value = row[money].strip()
+            if raw_value and (pred is _always or pred(dict(zip(fieldnames, row)))):
+                if raw_value not in memo:
+                    d = Decimal(raw_value)
+                    memo[raw_value] = (None if d == 0 else
+                                       {t: fmt(round_amount(d, t, base, rates, whole, step)) for t in targets})
+                by_target = memo[raw_value]
+            else:
+                by_target = None
+            for t in targets:
+                values[t].append(None if by_target is None else by_target[t])
+        converted = values
+
+    quoted = {t: _quote(t) for t in targets}
+    out, sample, b = [header_line], [], 0
+    for i in kept:
+        row = rows[i]
+        out.append(data_raw[i])
+        if row[cur] != base:
+            continue
+        cells = [_quote(cell) for cell in row]  # shared by every variant of this row
+        for t in targets:
+            v = cells[:]
+            v[cur] = quoted[t]
+            for j, by_target in swapped:
+                v[j] = by_target[t][b]
+            if money is not None:
+                amount = converted[t][b]
+                if amount is not None:
+                    v[money] = amount
+                if len(sample) < 2 and t in ("GBP", "JPY"):
+                    sample.append((row[money], t, row[money] if amount is None else amount))
+            out.append(",".join(v))
+        b += 1
+    return "\n".join(out) + "\n", len(base_rows), len(out) - 1, sample
+
+
+def _quote(cell):
+    """Quote one cell exactly as ``csv.writer`` does for these files.
+
+    Cells never hold a line break (``splitlines`` and the reader would disagree
+    on the row count), so only a delimiter or quote character needs quoting.
+    """
+    return '"' + cell.replace('"', '""') + '"' if "," in cell or '"' in cell else cell
+
+
+ENGINES = {"columns": expand_columns, "rows": expand_rows}
+
+
+def process(plan, fname, money_col, pred, base, targets, rates, whole, step, apply, engine="columns"):
+    path = os.path.join(plan, fname)
+    if not os.path.isfile(path):
+        print(f"  {fname:34s} (absent — skipped)")
+        return 0
+    text = open(path, newline="").read()
+    out, base_count, total, sample = ENGINES[engine](
+        text, money_col, pred, base, targets, rates, whole, step, fname)
+    if apply:
+        open(path, "w", newline="").write(out)
+    added = base_count * len(targets)
     tag = f"   e.g. {sample}" if sample else ("   (currency-only copy)" if money_col is None else "")
     print(f"  {fname:34s} base={base_count:4d}  +{added:4d} -> {total:5d} total{tag}")
     return added
 
 
+def _synthetic_pricebook(base_rows, seed=1):
+    """A PricebookEntry.csv of ``base_rows`` USD rows, shaped like the qb-pricing one."""
+    rng = random.Random(seed)
+    header = ["$$Product2.StockKeepingUnit$ProductSellingModel.Name$CurrencyIsoCode", "CurrencyIsoCode",
+              "IsActive", "IsDerived", "Name", "Pricebook2.$$Name$IsStandard", "Product2.StockKeepingUnit",
+              "ProductSellingModel.$$Name$SellingModelType", "UnitPrice"]
+    models = [("Evergreen Monthly", "Evergreen"), ("Term Annual", "TermDefined"), ("One Time", "OneTime")]
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(header)
+    for n in range(base_rows):
+        sku, (model, kind) = f"SKU-{n:07d}", models[n % len(models)]
+        price = "" if n % 50 == 0 else str(rng.choice([rng.randint(1, 5000), rng.randint(100, 999999) / 100]))
+        writer.writerow([f"{sku};{model};USD", "USD", "true", "false", f"Product {n}, \"{kind}\"",
+                         "Standard Price Book;true", sku, f"{model};{kind}", price])
+    return buf.getvalue()
+
+
+def benchmark(rows, currencies, log=print):
+    """Expand a synthetic PricebookEntry.csv to ~``rows`` output rows across ``currencies`` targets.
+
+    Times both engines on the same input and checks their output is byte-identical.
+    """
+    rng = random.Random(2)
+    targets = [f"X{a}{b}" for a in string.ascii_uppercase for b in string.ascii_uppercase][:currencies]
+    rates = {"USD": Decimal(1)}
+    rates.update((t, Decimal(str(round(rng.uniform(0.05, 200), 6)))) for t in targets)
+    whole = set(targets[::7])
+    text = _synthetic_pricebook(max(1, rows // (len(targets) + 1)))
+    args = ("UnitPrice", _always, "USD", targets, rates, whole, Decimal(DEFAULT_ROUND), "PricebookEntry.csv")
+    result, outputs = {"currencies": len(targets)}, []
+    for name in ("columns", "rows"):
+        started = time.perf_counter()
+        out, base_count, total, _ = ENGINES[name](text, *args)
+        result[f"{name}_seconds"] = round(time.perf_counter() - started, 2)
+        outputs.append(out)
+    result.update(base_rows=base_count, output_rows=total, output_mb=round(len(outputs[0]) / 1e6, 1),
+                  speedup=round(result["rows_seconds"] / max(result["columns_seconds"], 0.01), 1),
+                  identical=outputs[0] == outputs[1])
+    log(json.dumps(result, indent=2))
+    return result
+
+
 def main(argv=None):
     ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     ap.add_argument("--plan", default=DEFAULT_PLAN, help=f"SFDMU plan dir (default: {DEFAULT_PLAN})")
@@ -211,8 +376,18 @@ def main(argv=None):
     ap.add_argument("--round", dest="step", default=DEFAULT_ROUND,
                     help=f"Rounding step for non-whole currencies (default: {DEFAULT_ROUND})")
     ap.add_argument("--apply", action="store_true", help="Write changes (default: dry-run)")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="columns",
+                    help="Expansion engine; both write identical bytes (default: columns)")
+    ap.add_argument("--benchmark", type=int, default=None, metavar="ROWS",
+                    help="Time both engines on a synthetic CSV of ~ROWS output rows and exit")
+    ap.add_argument("--benchmark-currencies", type=int, default=30, metavar="N",
+                    help="Target currencies for --benchmark (default: 30)")
     args = ap.parse_args(argv)
 
+    if args.benchmark:
+        result = benchmark(args.benchmark, args.benchmark_currencies)
+        return 0 if result["identical"] else 1
+
     base = args.base.strip().upper()
     targets = [c.strip().upper() for c in args.currencies.split(",") if c.strip()]
     # --round must be a positive, finite number: round_amount divides by the step,
@@ -245,7 +420,7 @@ def main(argv=None):
     print("Rates: " + ", ".join(f"{c}={rates[c]}{' [whole]' if c in whole else ''}" for c in targets))
     print(f"{'APPLYING' if args.apply else 'DRY-RUN'} (base={base}, round={step}):")
     total = sum(
-        process(args.plan, fname, mc, pr, base, targets, rates, whole, step, args.apply)
+        process(args.plan, fname, mc, pr, base, targets, rates, whole, step, args.apply, args.engine)
         for fname, (mc, pr) in CONFIG.items()
     )
     print(f"Total generated rows: {total}")
@@ -254,4 +429,4 @@ def main(argv=None):
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -35,14 +35,26 @@ preserving old rows silently ships stale rates the moment
 missing (product, rate card, usage resource, currency) combinations and leave
 existing rows untouched; anything preserved that way must then be added to
 ``ALLOWED_RATE_DEVIATIONS`` or the suite fails.
+
+Two engines write the same bytes: ``columns`` (the default) builds each
+rewritten column once per target over all base rows, and is the one to use for
+dozens of currencies or very large rate cards; ``rows`` is the original
+row-at-a-time loop, kept as the reference ``--benchmark ROWS`` checks it
+against.
 """
 
 import argparse
 import csv
 import io
+import json
 import os
+import random
+import string
 import sys
+import tempfile
+import time
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from itertools import islice
 
 DEFAULT_RATES_PLAN = "datasets/sfdmu/qb/en-US/qb-rates"
 DEFAULT_RATING_PLAN = "datasets/sfdmu/qb/en-US/qb-rating"
@@ -125,6 +137,44 @@ def write_csv(path, fieldnames, rows):
         fh.write(buf.getvalue())
 
 
+def read_table(path):
+    """``read_csv`` for the columnar engine: rows as lists, padded like ``DictReader`` pads them."""
+    with open(path, newline="") as fh:
+        rd = csv.reader(fh)
+        fields = next(rd)
+        width, rows = len(fields), []
+        for r in rd:
+            if not r:
+                continue
+            if len(r) > width:
+                # DictReader files the extras under None, which DictWriter then refuses.
+                raise ValueError("dict contains fields not in fieldnames: None")
+            rows.append(r + [""] * (width - len(r)))
+        return fields, rows
+
+
+def write_table(path, fields, lines):
+    """``write_csv`` for the columnar engine, whose rows are already serialized — the same bytes."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(fields)
+    for line in lines:
+        buf.write(line)
+        buf.write("\n")
+    with open(path, "w", newline="") as fh:
+        fh.write(buf.getvalue())
+
+
+def _quote(cell):
+    """One cell as ``write_csv`` writes it: bare unless it holds a delimiter, quote or line break."""
+    if "," not in cell and '"' not in cell and "\n" not in cell and "\r" not in cell:
+        return cell
+    if "\n" not in cell and "\r" not in cell:
+        return '"' + cell.replace('"', '""') + '"'
+    buf = io.StringIO()  # line breaks: let csv decide, its rule moved between Python versions
+    csv.writer(buf, lineterminator="\n").writerow([cell])
+    return buf.getvalue()[:-1]
+
+
 def swap_segment(composite, index, value):
     """Replace one ';'-delimited segment of an SFDMU composite key."""
     parts = composite.split(";")
@@ -134,9 +184,8 @@ def swap_segment(composite, index, value):
     return ";".join(parts)
 
 
-def expand_rate_card_entries(plan, base, targets, rates, decimals, regenerate):
-    path = os.path.join(plan, RCE_FILE)
-    fields, rows = read_csv(path)
+def rate_card_rows(fields, rows, base, targets, rates, decimals, regenerate):
+    """Expand RateCardEntry dict rows a row at a time (the reference for ``rate_card_columns``)."""
     key_col = fields[0]  # $$Product$RateCard.Name$UsageResource.Code$RateUoM.UnitCode
     if regenerate:
         rows = [r for r in rows if r["RateUnitOfMeasure.UnitCode"] not in targets]
@@ -156,13 +205,11 @@ def expand_rate_card_entries(plan, base, targets, rates, decimals, regenerate):
             existing.add(new[key_col])
     rows.extend(added)
     rows.sort(key=lambda r: r[key_col])
-    write_csv(path, fields, rows)
-    return len(base_rows), added, len(rows)
+    return len(base_rows), added, rows
 
 
-def expand_rate_adjustments(plan, base, targets, rates, decimals, regenerate):
-    path = os.path.join(plan, RABT_FILE)
-    fields, rows = read_csv(path)
+def rate_adjustment_rows(fields, rows, base, targets, rates, decimals, regenerate):
+    """Expand RateAdjustmentByTier dict rows a row at a time (the reference for ``rate_adjustment_columns``)."""
     key_col = fields[0]   # $$Product$RateCard.Name$RateUoM.UnitCode$Resource$LB$UB
     rce_col = fields[8]   # RateCardEntry.$$Product$RateCard.Name$Resource$RateUoM.UnitCode
     if regenerate:
@@ -188,8 +235,203 @@ def expand_rate_adjustments(plan, base, targets, rates, decimals, regenerate):
             existing.add(new[key_col])
     rows.extend(added)
     rows.sort(key=lambda r: r[key_col])
-    write_csv(path, fields, rows)
-    return len(base_rows), added, len(rows)
+    return len(base_rows), added, rows
+
+
+def _expand_columns(fields, rows, unit_col, key_segment, segments, unit_cols, money_col, money_if,
+                    base, targets, rates, decimals, regenerate):
+    """Column-at-a-time expansion of list rows; the shared body of the ``*_columns`` engines.
+
+    ``segments`` maps further composite columns to the segment holding the
+    currency, ``unit_cols`` are set to the currency, and ``money_col`` is
+    converted where ``money_if`` (a (column, value) pair, or None) holds.
+    Each rewritten column is built once per target over all base rows, a money
+    value is converted once per distinct amount and currency, and a base row's
+    cells are quoted once for all of its variants. Rows come back serialized
+    and sorted by key, the way ``write_csv`` would write them.
+    """
+    unit = fields.index(unit_col)
+    if regenerate:
+        drop = set(targets)
+        rows = [r for r in rows if r[unit] not in drop]
+    keys = [r[0] for r in rows]
+    lines = [",".join(map(_quote, r)) for r in rows]
+    existing = set(keys)
+    base_rows = [r for r in rows if r[unit] == base]
+
+    new_keys = {}
+    columns = {t: [] for t in targets}  # target -> [(column, quoted values over base rows)]
+    for j, index in [(0, key_segment)] + [(fields.index(col), index) for col, index in segments]:
+        split = [r[j].split(";") for r in base_rows]
+        for t in targets:
+            values = []
+            for parts in split:
+                if index < len(parts):
+                    parts = parts[:]
+                    parts[index] = t
+                values.append(";".join(parts))
+            if j == 0:
+                new_keys[t] = values
+            columns[t].append((j, [_quote(v) for v in values]))
+    money = fields.index(money_col)
+    if money_if:
+        gate, wanted = fields.index(money_if[0]), money_if[1]
+        convert = [r[gate] == wanted for r in base_rows]
+    else:
+        convert = [True] * len(base_rows)
+    memo = {}
+    for t in targets:
+        values = []
+        for r, wanted in zip(base_rows, convert):
+            raw = r[money]
+            if wanted:
+                if (raw, t) not in memo:
+                    memo[raw, t] = convert_money(raw, t, base, rates, decimals)
+                raw = memo[raw, t]
+            values.append(_quote(raw))
+        columns[t].append((money, values))
+    for j in (fields.index(col) for col in unit_cols):
+        for t in targets:
+            columns[t].append((j, None))
+
+    # Each base row becomes a %-template with a slot per rewritten column, so a
+    # variant is one format call over that target's column values.
+    changed = sorted(j for j, _ in columns[targets[0]]) if targets else []
+    slots = set(changed)
+    templates = [",".join("%s" if j in slots else _quote(c).replace("%", "%%") for j, c in enumerate(src))
+                 for src in base_rows]
+    generated = []  # per target: the variant line of each base row, or None where the key exists
+    for t in targets:
+        by_column = {j: values for j, values in columns[t]}
+        unit_cell = [_quote(t)] * len(base_rows)
+        cells = zip(*(by_column[j] or unit_cell for j in changed))
+        variants = []
+        for key, template, args in zip(new_keys[t], templates, cells):
+            if key in existing:
+                variants.append(None)
+                continue
+            existing.add(key)
+            variants.append(template % args)
+        generated.append(variants)
+    # A key is only ever claimed by one target (the currency segment differs),
+    # so the skips above match a row-major walk; put the rows back in that order.
+    added = []
+    for group, group_keys in zip(zip(*generated), zip(*(new_keys[t] for t in targets))):
+        for line, key in zip(group, group_keys):
+            if line is not None:
+                added.append(line)
+                keys.append(key)
+    lines.extend(added)
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return len(base_rows), added, [lines[i] for i in order]
+
+
+def rate_card_columns(fields, rows, base, targets, rates, decimals, regenerate):
+    """Expand RateCardEntry list rows a column at a time; writes what ``rate_card_rows`` writes."""
+    return _expand_columns(fields, rows, "RateUnitOfMeasure.UnitCode", 3, [],
+                           ["RateUnitOfMeasure.UnitCode", "RateUnitOfMeasure.Name"], "Rate", None,
+                           base, targets, rates, decimals, regenerate)
+
+
+def rate_adjustment_columns(fields, rows, base, targets, rates, decimals, regenerate):
+    """Expand RateAdjustmentByTier list rows a column at a time; writes what ``rate_adjustment_rows`` writes."""
+    return _expand_columns(fields, rows, "RateUnitOfMeasure.Name", 2, [(fields[8], 3)],
+                           ["RateUnitOfMeasure.Name", "RateUnitOfMeasureName"], "AdjustmentValue",
+                           ("AdjustmentType", "Override"), base, targets, rates, decimals, regenerate)
+
+
+# engine -> (reader, writer, RateCardEntry expansion, RateAdjustmentByTier expansion)
+ENGINES = {
+    "columns": (read_table, write_table, rate_card_columns, rate_adjustment_columns),
+    "rows": (read_csv, write_csv, rate_card_rows, rate_adjustment_rows),
+}
+
+
+def _expand(plan, fname, which, base, targets, rates, decimals, regenerate, engine):
+    read, write, *expanders = ENGINES[engine]
+    path = os.path.join(plan, fname)
+    fields, rows = read(path)
+    n_base, added, rows = expanders[which](fields, rows, base, targets, rates, decimals, regenerate)
+    write(path, fields, rows)
+    return n_base, added, len(rows), fields
+
+
+def _dicts(fields, rows):
+    """Rows of either engine as dicts, lazily — only the handful printed get parsed."""
+    return (r if isinstance(r, dict) else dict(zip(fields, next(csv.reader([r])))) for r in rows)
+
+
+def expand_rate_card_entries(plan, base, targets, rates, decimals, regenerate, engine="columns"):
+    return _expand(plan, RCE_FILE, 0, base, targets, rates, decimals, regenerate, engine)
+
+
+def expand_rate_adjustments(plan, base, targets, rates, decimals, regenerate, engine="columns"):
+    return _expand(plan, RABT_FILE, 1, base, targets, rates, decimals, regenerate, engine)
+
+
+def _synthetic_rates(work, base_rows, seed=1):
+    """Write a RateCardEntry.csv and RateAdjustmentByTier.csv of ``base_rows`` USD rows each."""
+    rng = random.Random(seed)
+    rce = ["$$Product.StockKeepingUnit$RateCard.Name$UsageResource.Code$RateUnitOfMeasure.UnitCode",
+           "DefaultUnitOfMeasure.Name", "EffectiveFrom", "Product.StockKeepingUnit", "Rate",
+           "RateCard.$$Name$Type", "RateUnitOfMeasure.Name", "RateUnitOfMeasure.UnitCode", "UsageResource.Code"]
+    rabt = ["$$Product.StockKeepingUnit$RateCardEntry.RateCard.Name$RateUnitOfMeasure.UnitCode"
+            "$UsageResource.Code$LowerBound$UpperBound", "AdjustmentType", "AdjustmentValue", "EffectiveFrom",
+            "EffectiveTo", "LowerBound", "Product.StockKeepingUnit", "ProductSellingModel.Name",
+            "RateCardEntry.$$Product.StockKeepingUnit$RateCard.Name$UsageResource.Code$RateUnitOfMeasure.UnitCode",
+            "RateUnitOfMeasure.Name", "RateUnitOfMeasureName", "UpperBound"]
+    with open(os.path.join(work, RCE_FILE), "w", newline="") as fh:
+        w = csv.writer(fh, lineterminator="\n")
+        w.writerow(rce)
+        for n in range(base_rows):
+            sku, resource = f"SKU-{n // 4:07d}", f"RES-{n % 4}"
+            rate = "" if n % 10 == 0 else str(rng.choice([rng.randint(1, 90) / 100, rng.randint(1, 9000) / 1000]))
+            w.writerow([f"{sku};Rate Card, Tiered;{resource};USD", "Minutes", "2023-01-01T20:00:00.000+0000",
+                        sku, rate, "Rate Card, Tiered;Tier", "USD", "USD", resource])
+    with open(os.path.join(work, RABT_FILE), "w", newline="") as fh:
+        w = csv.writer(fh, lineterminator="\n")
+        w.writerow(rabt)
+        for n in range(base_rows):
+            sku, resource, lower = f"SKU-{n // 8:07d}", f"RES-{n // 2 % 4}", str(n % 2 * 1000)
+            upper = "1000" if n % 2 == 0 else ""
+            kind = "Override" if n % 3 else "Percentage"
+            value = str(rng.randint(1, 500) / 100) if kind == "Override" else str(rng.randint(0, 30))
+            w.writerow([f"{sku};Rate Card, Tiered;USD;{resource};{lower};{upper}", kind, value,
+                        "2023-01-01T20:00:00.000+0000", "", lower, sku, "Term Annual",
+                        f"{sku};Rate Card, Tiered;{resource};USD", "USD", "USD", upper])
+
+
+def benchmark(rows, currencies, log=print):
+    """Expand synthetic rate files to ~``rows`` output rows across ``currencies`` targets.
+
+    Times both engines (read, expand, sort, write) on the same input and checks
+    that they write byte-identical files.
+    """
+    rng = random.Random(2)
+    targets = [f"X{a}{b}" for a in string.ascii_uppercase for b in string.ascii_uppercase][:currencies]
+    rates, decimals = {"USD": Decimal(1)}, {"USD": 2}
+    for n, t in enumerate(targets):
+        rates[t] = Decimal(str(round(rng.uniform(0.05, 200), 6)))
+        decimals[t] = 0 if n % 7 == 0 else 2
+    base_rows = max(1, rows // (2 * (len(targets) + 1)))
+    result, outputs = {"currencies": len(targets)}, []
+    with tempfile.TemporaryDirectory(prefix="expand_rates_bench_") as work:
+        _synthetic_rates(work, base_rows)
+        source = {name: open(os.path.join(work, name), newline="").read() for name in (RCE_FILE, RABT_FILE)}
+        for engine in ("columns", "rows"):
+            for name, text in source.items():
+                with open(os.path.join(work, name), "w", newline="") as fh:
+                    fh.write(text)
+            started = time.perf_counter()
+            _, _, rce_total, _ = expand_rate_card_entries(work, "USD", targets, rates, decimals, True, engine)
+            _, _, rabt_total, _ = expand_rate_adjustments(work, "USD", targets, rates, decimals, True, engine)
+            result[f"{engine}_seconds"] = round(time.perf_counter() - started, 2)
+            outputs.append([open(os.path.join(work, name), newline="").read() for name in source])
+    result.update(base_rows=2 * base_rows, output_rows=rce_total + rabt_total,
+                  speedup=round(result["rows_seconds"] / max(result["columns_seconds"], 0.01), 1),
+                  identical=outputs[0] == outputs[1])
+    log(json.dumps(result, indent=2))
+    return result
 
 
 def main(argv=None):
@@ -211,8 +453,18 @@ def main(argv=None):
     ap.add_argument("--regenerate", action="store_true",
                     help=argparse.SUPPRESS)  # back-compat no-op; regeneration is now the default
     ap.add_argument("--apply", action="store_true", help="Write changes (default: dry-run)")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="columns",
+                    help="Expansion engine; both write identical bytes (default: columns)")
+    ap.add_argument("--benchmark", type=int, default=None, metavar="ROWS",
+                    help="Time both engines on synthetic rate files of ~ROWS output rows and exit")
+    ap.add_argument("--benchmark-currencies", type=int, default=30, metavar="N",
+                    help="Target currencies for --benchmark (default: 30)")
     args = ap.parse_args(argv)
 
+    if args.benchmark:
+        result = benchmark(args.benchmark, args.benchmark_currencies)
+        return 0 if result["identical"] else 1
+
     base = args.base.strip().upper()
     targets = [c.strip().upper() for c in args.currencies.split(",") if c.strip()]
     if base in targets:
@@ -257,19 +509,19 @@ def main(argv=None):
 
 def _run(args, work, base, targets, rates, decimals):
 
-    n_base, rce_added, rce_total = expand_rate_card_entries(
-        work, base, targets, rates, decimals, not args.preserve)
+    n_base, rce_added, rce_total, fields = expand_rate_card_entries(
+        work, base, targets, rates, decimals, not args.preserve, args.engine)
     print(f"  {RCE_FILE:28s} base={n_base:3d}  +{len(rce_added):3d} -> {rce_total:4d} total")
-    for a in rce_added[:4]:
+    for a in islice(_dicts(fields, rce_added), 4):
         print(f"      e.g. {a[list(a)[0]]}  rate={a['Rate'] or '(tier-driven)'}")
     if len(rce_added) > 4:
         print(f"      … {len(rce_added) - 4} more")
 
-    n_base, rabt_added, rabt_total = expand_rate_adjustments(
-        work, base, targets, rates, decimals, not args.preserve)
+    n_base, rabt_added, rabt_total, fields = expand_rate_adjustments(
+        work, base, targets, rates, decimals, not args.preserve, args.engine)
     print(f"  {RABT_FILE:28s} base={n_base:3d}  +{len(rabt_added):3d} -> {rabt_total:4d} total")
-    ovr = [a for a in rabt_added if a["AdjustmentType"] == "Override"]
-    for a in ovr[:3]:
+    ovr = (a for a in _dicts(fields, rabt_added) if a["AdjustmentType"] == "Override")
+    for a in islice(ovr, 3):
         print(f"      e.g. {a[list(a)[0]]}  {a['AdjustmentType']}={a['AdjustmentValue']}")
 
     print(f"Total generated rows: {len(rce_added) + len(rabt_added)}")
@@ -278,4 +530,4 @@ def _run(args, work, base, targets, rates, decimals):
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -38,6 +38,8 @@ sequence without an org.
 import time
 from typing import Any, Callable, Dict, List, Optional
 
+from scripts.sf_transport.composite import batch_for
+
 from ._client import CONNECT_BASE, ExpressionSetClientError, soql_literal
 
 
@@ -216,23 +218,40 @@ class LifecycleEngine:
             vid = section.get("ProcedurePlanVersionId")
             if vid:
                 version_ids.add(vid)
-        deactivated: List[str] = []
+        # The IsActive reads, then the PATCHes, each go out as composite
+        # batches. Every PATCH result is settled before deciding on rollback, so
+        # a failure mid-batch still rolls back all the versions that did flip.
+        patches: List[Any] = []
+        failure: Optional[BaseException] = None
         try:
-            for vid in sorted(version_ids):
-                records = self.t.soql(
-                    "SELECT Id, IsActive FROM ProcedurePlanDefinitionVersion "
-                    f"WHERE Id = '{soql_literal(vid)}'"
-                )
-                if records and records[0].get("IsActive"):
-                    self.t.sobject(
+            with batch_for(self.t) as batch:
+                reads = [
+                    (vid, batch.soql(
+                        "SELECT Id, IsActive FROM ProcedurePlanDefinitionVersion "
+                        f"WHERE Id = '{soql_literal(vid)}'"
+                    ))
+                    for vid in sorted(version_ids)
+                ]
+            active = [vid for vid, call in reads
+                      if (call.result() or [{}])[0].get("IsActive")]
+            with batch_for(self.t) as batch:
+                for vid in active:
+                    patches.append((vid, batch.sobject(
                         "PATCH", "ProcedurePlanDefinitionVersion", vid,
                         {"IsActive": False},
-                    )
-                    self.log(
-                        f"Deactivated ProcedurePlanDefinitionVersion {vid} (cascade)."
-                    )
-                    deactivated.append(vid)
+                    )))
         except Exception as exc:
+            failure = exc
+        deactivated: List[str] = []
+        for vid, call in patches:
+            try:
+                call.result()
+            except Exception as exc:
+                failure = failure or exc
+                continue
+            self.log(f"Deactivated ProcedurePlanDefinitionVersion {vid} (cascade).")
+            deactivated.append(vid)
+        if failure is not None:
             if deactivated and not self.dry_run:
                 try:
                     self.cascade_reactivate_procedure_plans(deactivated)
@@ -241,13 +260,13 @@ class LifecycleEngine:
                         "Cascade deactivation failed after deactivating "
                         f"ProcedurePlanDefinitionVersion(s) {deactivated}, and "
                         f"rollback also failed: {rollback_exc}"
-                    ) from exc
+                    ) from failure
                 raise LifecycleError(
                     "Cascade deactivation failed after deactivating "
                     f"ProcedurePlanDefinitionVersion(s) {deactivated}; rolled them "
                     "back before aborting."
-                ) from exc
-            raise
+                ) from failure
+            raise failure
         return deactivated
 
     def cascade_reactivate_procedure_plans(self, version_ids: List[str]) -> None:
@@ -77,6 +77,14 @@ from scripts.expression_sets._tooling import (  # noqa: E402
     capture_labels,
     restore_labels_after_clobber,
 )
+from scripts.sf_transport.cassette import (  # noqa: E402
+    add_cassette_argument,
+    apply_cassette_argument,
+)
+from scripts.sf_transport.pooled import (  # noqa: E402
+    add_transport_argument,
+    apply_transport_argument,
+)
 
 
 def _report(result, label):
@@ -121,7 +129,11 @@ def main(argv=None) -> int:
     parser.add_argument("--api-version", default=DEFAULT_API_VERSION,
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true", help="Emit a result summary as JSON.")
+    add_transport_argument(parser)
+    add_cassette_argument(parser)
     args = parser.parse_args(argv)
+    apply_transport_argument(args)
+    apply_cassette_argument(args)
 
     overlay_path = Path(args.overlay)
     if not overlay_path.exists():
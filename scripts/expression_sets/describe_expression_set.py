@@ -68,6 +68,10 @@ from scripts.expression_sets._tooling import (  # noqa: E402
     step_labels,
 )
 from scripts.expression_sets.export_expression_set import fetch_definition  # noqa: E402
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 
 def _pick_version(definition: dict, version_api_name: Optional[str]) -> dict:
@@ -211,7 +215,9 @@ def main(argv=None) -> int:
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true",
                         help="Emit the ordered step list as JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     try:
         es_id = args.expression_set_id
@@ -54,6 +54,10 @@ from scripts.expression_sets._resolve import (  # noqa: E402
     resolve_expression_set_id,
 )
 from scripts.expression_sets.export_expression_set import fetch_definition  # noqa: E402
+from scripts.sf_transport.read_cache import (  # noqa: E402
+    add_read_cache_argument,
+    apply_read_cache_argument,
+)
 
 # Step fields whose change is noise, not signal.
 _IGNORE_STEP_FIELDS = {"id"}
@@ -173,7 +177,9 @@ def main(argv=None) -> int:
     parser.add_argument("--api-version", default=DEFAULT_API_VERSION,
                         help=f"API version (default {DEFAULT_API_VERSION}).")
     parser.add_argument("--json", action="store_true", help="Emit the diff as JSON.")
+    add_read_cache_argument(parser)
     args = parser.parse_args(argv)
+    apply_read_cache_argument(args)
 
     if not args.left_file and not (args.developer_name and args.target_org):
         eprint("Error: LEFT side needs --left-file, or --developer-name + --target-org.")
@@ -12,12 +12,21 @@ Key transformations:
   - Composite keys:   Build composite key columns from component fields (individual columns preferred over $$ notation)
   - Diff mode:        Compare extraction against current plan and report deltas
 
+Each object's CSV is streamed once through all transformations (backfill,
+status, ID text, defaults, alignment, #N/A) and written row by row, so memory
+stays flat however large the extraction is. The diff against the plan keeps
+only a key -> row digest per record (scripts/sfdmu_csv_diff.py, which also
+gives row- and column-level detail: sfdmu_csv_diff.py <plan_dir> <output_dir>). Objects are processed in parallel on a
+process pool (--workers, default: CPU count). The CCI extract task calls
+process_extraction() in-process instead of running this script.
+
 Usage:
   python3 scripts/post_process_extraction.py <extraction_dir> <plan_dir> [options]
 
   --output-dir DIR   Write processed CSVs here (default: <extraction_dir>/processed/)
   --diff-only        Only produce a diff report; don't write processed CSVs
   --copy-to-plan     Copy processed CSVs into the plan directory (updates in place)
+  --workers N        Objects processed in parallel (default: CPU count; 1 = in this process)
   --verbose          Print detailed processing info
 """
 import argparse
@@ -26,9 +35,13 @@ import json
 import os
 import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from collections import OrderedDict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import sfdmu_csv_diff as csv_diff  # noqa: E402
+
 
 # Objects whose Status field should be rewritten from Active/Inactive to Draft.
 # Only objects that go through a Draft-then-Activate workflow are listed here.
@@ -171,23 +184,26 @@ def load_extracted_csv(extraction_dir: str, object_name: str) -> tuple:
     return headers, rows
 
 
+def _status_plan(headers: list, object_name: str) -> list:
+    """Column indices whose Active/Inactive values become Draft for this object."""
+    return [headers.index(f) for f in STATUS_REWRITE_MAP.get(object_name, []) if f in headers]
+
+
+def _apply_status(row: list, indices: list) -> None:
+    for idx in indices:
+        if idx < len(row) and row[idx] in ACTIVE_STATUSES:
+            row[idx] = "Draft"
+
+
 def rewrite_status(rows: list, headers: list, object_name: str) -> list:
     """Rewrite Status fields from Active/Inactive to Draft."""
-    fields = STATUS_REWRITE_MAP.get(object_name, [])
-    if not fields:
-        return rows
-    indices = []
-    for field in fields:
-        if field in headers:
-            indices.append(headers.index(field))
+    indices = _status_plan(headers, object_name)
     if not indices:
         return rows
     new_rows = []
     for row in rows:
         row = list(row)
-        for idx in indices:
-            if idx < len(row) and row[idx] in ACTIVE_STATUSES:
-                row[idx] = "Draft"
+        _apply_status(row, indices)
         new_rows.append(row)
     return new_rows
 
@@ -208,6 +224,28 @@ ID_TEXT_FIELD_RESOLUTION = {
 }
 
 
+# Only treat empty and SFDMU's explicit null marker (#N/A) as missing.
+# Do NOT include "N/A" — it is a legitimate business value in several CSVs
+# (e.g. AttributePicklistValue: Rear Storage "N/A", RAID "N/A").
+NA_VALUES = {"", "#N/A"}
+
+
+def _id_text_plan(headers: list, object_name: str) -> list:
+    """(id_idx, traversal_idx, id_field) for each resolvable ID text field of this object."""
+    return [(headers.index(id_field), headers.index(traversal_field), id_field)
+            for id_field, traversal_field, _ in ID_TEXT_FIELD_RESOLUTION.get(object_name, [])
+            if id_field in headers and traversal_field in headers]
+
+
+def _apply_id_text(row: list, plan: list, counts: dict) -> None:
+    for id_idx, trav_idx, id_name in plan:
+        id_val = row[id_idx] if id_idx < len(row) else ""
+        trav_val = row[trav_idx] if trav_idx < len(row) else ""
+        if id_val not in NA_VALUES and trav_val not in NA_VALUES:
+            row[id_idx] = trav_val
+            counts[id_name] = counts.get(id_name, 0) + 1
+
+
 def resolve_id_text_fields(rows: list, headers: list, object_name: str,
                            verbose: bool = False) -> list:
     """Replace raw Salesforce IDs in text fields with portable traversal values.
@@ -217,44 +255,20 @@ def resolve_id_text_fields(rows: list, headers: list, object_name: str,
     as-is. This function substitutes the portable value from the corresponding
     traversal field that was queried in the same row.
     """
-    mappings = ID_TEXT_FIELD_RESOLUTION.get(object_name)
-    if not mappings:
-        return rows
-
-    resolved = []
-    for id_field, traversal_field, desc in mappings:
-        if id_field in headers and traversal_field in headers:
-            resolved.append((
-                headers.index(id_field),
-                headers.index(traversal_field),
-                id_field,
-                traversal_field,
-                desc,
-            ))
-
-    if not resolved:
+    plan = _id_text_plan(headers, object_name)
+    if not plan:
         return rows
 
-    # Only treat empty and SFDMU's explicit null marker (#N/A) as missing.
-    # Do NOT include "N/A" — it is a legitimate business value in several CSVs
-    # (e.g. AttributePicklistValue: Rear Storage "N/A", RAID "N/A").
-    na_values = {"", "#N/A"}
     new_rows = []
-    counts = {r[2]: 0 for r in resolved}
+    counts = {}
     for row in rows:
         row = list(row)
-        for id_idx, trav_idx, id_name, trav_name, desc in resolved:
-            id_val = row[id_idx] if id_idx < len(row) else ""
-            trav_val = row[trav_idx] if trav_idx < len(row) else ""
-            if id_val not in na_values and trav_val not in na_values:
-                row[id_idx] = trav_val
-                counts[id_name] += 1
+        _apply_id_text(row, plan, counts)
         new_rows.append(row)
 
     if verbose:
         for id_name, count in counts.items():
-            if count:
-                print(f"    Resolved {count} {id_name} IDs to portable values")
+            print(f"    Resolved {count} {id_name} IDs to portable values")
 
     return new_rows
 
@@ -272,6 +286,22 @@ FIELD_DEFAULTS = {
 }
 
 
+def _defaults_plan(headers: list, object_name: str) -> list:
+    """(target_idx, source_idx, target_field) for each applicable field default of this object."""
+    return [(headers.index(target), headers.index(source), target)
+            for target, source, _ in FIELD_DEFAULTS.get(object_name, [])
+            if target in headers and source in headers]
+
+
+def _apply_defaults(row: list, plan: list, counts: dict) -> None:
+    for tgt_idx, src_idx, tgt_name in plan:
+        tgt_val = row[tgt_idx] if tgt_idx < len(row) else ""
+        src_val = row[src_idx] if src_idx < len(row) else ""
+        if tgt_val in NA_VALUES and src_val not in NA_VALUES:
+            row[tgt_idx] = src_val
+            counts[tgt_name] = counts.get(tgt_name, 0) + 1
+
+
 def apply_field_defaults(rows: list, headers: list, object_name: str,
                          verbose: bool = False) -> list:
     """Populate empty fields with default values from other fields in the same row.
@@ -281,43 +311,20 @@ def apply_field_defaults(rows: list, headers: list, object_name: str,
     extraction.  This function copies a source field value into the target
     field when the target is empty, ensuring the plan CSV is portable.
     """
-    defaults = FIELD_DEFAULTS.get(object_name)
-    if not defaults:
-        return rows
-
-    resolved = []
-    for target, source, desc in defaults:
-        if target in headers and source in headers:
-            resolved.append((
-                headers.index(target),
-                headers.index(source),
-                target,
-                source,
-                desc,
-            ))
-
-    if not resolved:
+    plan = _defaults_plan(headers, object_name)
+    if not plan:
         return rows
 
-    # Only treat empty and SFDMU's explicit null marker (#N/A) as missing.
-    # Do NOT include "N/A" — it is a legitimate business value in several CSVs.
-    na_values = {"", "#N/A"}
     new_rows = []
-    counts = {r[2]: 0 for r in resolved}
+    counts = {}
     for row in rows:
         row = list(row)
-        for tgt_idx, src_idx, tgt_name, src_name, desc in resolved:
-            tgt_val = row[tgt_idx] if tgt_idx < len(row) else ""
-            src_val = row[src_idx] if src_idx < len(row) else ""
-            if tgt_val in na_values and src_val not in na_values:
-                row[tgt_idx] = src_val
-                counts[tgt_name] += 1
+        _apply_defaults(row, plan, counts)
         new_rows.append(row)
 
     if verbose:
         for tgt_name, count in counts.items():
-            if count:
-                print(f"    Defaulted {count} {tgt_name} values from source field")
+            print(f"    Defaulted {count} {tgt_name} values from source field")
 
     return new_rows
 
@@ -337,6 +344,31 @@ def load_code_map(path: str) -> dict:
         return {}
 
 
+def _backfill_plan(headers: list, obj_map: dict) -> list:
+    """(col_idx, join_idx, column, {Name: Code}) for each backfillable code column."""
+    idx = {h: i for i, h in enumerate(headers)}
+    plan = []
+    for col, name2code in (obj_map or {}).items():
+        if col not in idx or "." not in col:
+            continue
+        # Sibling join column: same relationship path, leaf field replaced with Name.
+        join_col = col.rsplit(".", 1)[0] + ".Name"
+        if join_col in idx:
+            plan.append((idx[col], idx[join_col], col, name2code))
+    return plan
+
+
+def _apply_backfill(row: list, plan: list, fills: dict) -> None:
+    for col_i, join_i, col, name2code in plan:
+        cur = row[col_i] if col_i < len(row) else ""
+        if cur in NA_VALUES:
+            join_val = row[join_i] if join_i < len(row) else ""
+            code = name2code.get(join_val)
+            if code:
+                row[col_i] = code
+                fills[col] = fills.get(col, 0) + 1
+
+
 def backfill_relationship_codes(headers: list, rows: list, object_name: str,
                                 code_map: dict, verbose: bool = False) -> list:
     """Fill blank/#N/A cross-object externalId code components from a Name->Code map.
@@ -351,21 +383,7 @@ def backfill_relationship_codes(headers: list, rows: list, object_name: str,
     Runs on the raw extracted rows BEFORE column alignment so the composite-key
     ($$...) columns are subsequently built from the restored values.
     """
-    obj_map = (code_map or {}).get(object_name)
-    if not obj_map:
-        return rows
-
-    idx = {h: i for i, h in enumerate(headers)}
-    na_values = {"", "#N/A"}
-    plan = []
-    for col, name2code in obj_map.items():
-        if col not in idx or "." not in col:
-            continue
-        # Sibling join column: same relationship path, leaf field replaced with Name.
-        join_col = col.rsplit(".", 1)[0] + ".Name"
-        if join_col in idx:
-            plan.append((idx[col], idx[join_col], col, name2code))
-
+    plan = _backfill_plan(headers, (code_map or {}).get(object_name))
     if not plan:
         return rows
 
@@ -373,14 +391,7 @@ def backfill_relationship_codes(headers: list, rows: list, object_name: str,
     new_rows = []
     for row in rows:
         row = list(row)
-        for col_i, join_i, col, name2code in plan:
-            cur = row[col_i] if col_i < len(row) else ""
-            if cur in na_values:
-                join_val = row[join_i] if join_i < len(row) else ""
-                code = name2code.get(join_val)
-                if code:
-                    row[col_i] = code
-                    fills[col] = fills.get(col, 0) + 1
+        _apply_backfill(row, plan, fills)
         new_rows.append(row)
 
     if verbose and fills:
@@ -449,6 +460,46 @@ def parse_composite_key_header(header: str) -> list:
     return inner.split("$")
 
 
+def _align_plan(extracted_headers: list, plan_headers: list) -> list:
+    """How to fill each plan column: ("copy", idx), ("composite", components) or ("missing", None)."""
+    ext_idx = {h: i for i, h in enumerate(extracted_headers)}
+    plan = []
+    for h in plan_headers:
+        if h in ext_idx:
+            # Column exists in extraction -- use the original value directly.
+            # This preserves SFDMU's composite key formatting (e.g., omitting
+            # trailing empty parts in Parent.$$Field1$Field2 values).
+            plan.append(("copy", ext_idx[h]))
+        elif h.startswith("$$"):
+            # Composite key column not in extraction -- build from components
+            plan.append(("composite", parse_composite_key_header(h)))
+        elif "." in h and "$$" in h:
+            # Nested composite reference not in extraction -- build from
+            # parent relationship + component fields
+            dot_idx = h.index(".")
+            parent = h[:dot_idx]
+            components = parse_composite_key_header(h[dot_idx + 1:])
+            plan.append(("composite", [f"{parent}.{c}" for c in components]))
+        else:
+            plan.append(("missing", None))
+    return plan
+
+
+def _apply_align(row: list, plan: list, ext_idx: dict) -> list:
+    row_dict = None
+    aligned_row = []
+    for kind, arg in plan:
+        if kind == "copy":
+            aligned_row.append(row[arg] if arg < len(row) else "")
+        elif kind == "composite":
+            if row_dict is None:
+                row_dict = {h: (row[i] if i < len(row) else "") for h, i in ext_idx.items()}
+            aligned_row.append(build_composite_key_column(row_dict, arg))
+        else:
+            aligned_row.append("")
+    return aligned_row
+
+
 def align_columns(extracted_headers: list, extracted_rows: list,
                    plan_headers: list, object_name: str, verbose: bool = False) -> tuple:
     """Align extracted CSV columns to match the plan CSV column order.
@@ -461,42 +512,29 @@ def align_columns(extracted_headers: list, extracted_rows: list,
     if plan_headers is None:
         return extracted_headers, extracted_rows
 
-    # Build index map for extracted data
+    plan = _align_plan(extracted_headers, plan_headers)
     ext_idx = {h: i for i, h in enumerate(extracted_headers)}
+    if verbose:
+        for h, (kind, _) in zip(plan_headers, plan):
+            if kind == "missing":
+                print(f"    WARNING: Plan column '{h}' not found in extraction for {object_name}")
+    return list(plan_headers), [_apply_align(row, plan, ext_idx) for row in extracted_rows]
 
-    aligned_headers = list(plan_headers)
-    aligned_rows = []
-
-    for row in extracted_rows:
-        row_dict = {h: (row[i] if i < len(row) else "") for h, i in ext_idx.items()}
-        aligned_row = []
-        for h in plan_headers:
-            if h in ext_idx:
-                # Column exists in extraction -- use the original value directly.
-                # This preserves SFDMU's composite key formatting (e.g., omitting
-                # trailing empty parts in Parent.$$Field1$Field2 values).
-                idx = ext_idx[h]
-                aligned_row.append(row[idx] if idx < len(row) else "")
-            elif h.startswith("$$"):
-                # Composite key column not in extraction -- build from components
-                components = parse_composite_key_header(h)
-                aligned_row.append(build_composite_key_column(row_dict, components))
-            elif "." in h and "$$" in h:
-                # Nested composite reference not in extraction -- build from
-                # parent relationship + component fields
-                dot_idx = h.index(".")
-                parent = h[:dot_idx]
-                composite = h[dot_idx + 1:]
-                components = parse_composite_key_header(composite)
-                full_components = [f"{parent}.{c}" for c in components]
-                aligned_row.append(build_composite_key_column(row_dict, full_components))
-            else:
-                if verbose:
-                    print(f"    WARNING: Plan column '{h}' not found in extraction for {object_name}")
-                aligned_row.append("")
-        aligned_rows.append(aligned_row)
 
-    return aligned_headers, aligned_rows
+def _normalize_na_row(row: list, composite_idx: set) -> list:
+    na_marker = "#N/A"
+    new_row = []
+    for i, v in enumerate(row):
+        if v == na_marker:
+            new_row.append("")
+        elif i in composite_idx and na_marker in v:
+            # Normalize #N/A components within composite key values
+            parts = ["" if p == na_marker else p for p in v.split(";")]
+            # Collapse to empty if all components are empty
+            new_row.append("" if all(p == "" for p in parts) else ";".join(parts))
+        else:
+            new_row.append(v)
+    return new_row
 
 
 def normalize_na_values(rows: list, headers: list) -> list:
@@ -511,27 +549,9 @@ def normalize_na_values(rows: list, headers: list) -> list:
     Also handles #N/A components embedded inside semicolon-delimited composite
     key columns ($$Field1$Field2 notation).
     """
-    na_marker = "#N/A"
     # Pre-compute which columns are composite keys
     composite_idx = {i for i, h in enumerate(headers) if "$$" in h}
-
-    new_rows = []
-    for row in rows:
-        new_row = []
-        for i, v in enumerate(row):
-            if v == na_marker:
-                new_row.append("")
-            elif i in composite_idx and na_marker in v:
-                # Normalize #N/A components within composite key values
-                parts = v.split(";")
-                parts = ["" if p == na_marker else p for p in parts]
-                # Collapse to empty if all components are empty
-                joined = ";".join(parts)
-                new_row.append("" if all(p == "" for p in parts) else joined)
-            else:
-                new_row.append(v)
-        new_rows.append(new_row)
-    return new_rows
+    return [_normalize_na_row(row, composite_idx) for row in rows]
 
 
 def write_csv(path: str, headers: list, rows: list) -> None:
@@ -548,64 +568,6 @@ def write_csv(path: str, headers: list, rows: list) -> None:
         writer.writerows(rows)
 
 
-def diff_csvs(plan_headers: list, plan_rows: list,
-              proc_headers: list, proc_rows: list,
-              object_name: str, key_columns: list) -> dict:
-    """Compare plan CSV against processed extraction and return a diff report.
-
-    Returns dict with:
-      - "new_records": records in extraction but not in plan
-      - "missing_records": records in plan but not in extraction
-      - "changed_records": records with same key but different values
-      - "identical": count of unchanged records
-    """
-    report = {
-        "new_records": [],
-        "missing_records": [],
-        "changed_records": [],
-        "identical": 0,
-    }
-
-    if plan_headers is None or proc_headers is None:
-        if proc_headers and proc_rows:
-            report["new_records"] = proc_rows
-        return report
-
-    # Build key indices based on matching plan_headers
-    plan_key_idx = [plan_headers.index(k) for k in key_columns if k in plan_headers]
-    proc_key_idx = [proc_headers.index(k) for k in key_columns if k in proc_headers]
-
-    if not plan_key_idx or not proc_key_idx:
-        return report
-
-    def make_key(row, indices):
-        return tuple(row[i] if i < len(row) else "" for i in indices)
-
-    plan_map = {}
-    for row in plan_rows:
-        key = make_key(row, plan_key_idx)
-        plan_map[key] = row
-
-    proc_map = {}
-    for row in proc_rows:
-        key = make_key(row, proc_key_idx)
-        proc_map[key] = row
-
-    for key, proc_row in proc_map.items():
-        if key not in plan_map:
-            report["new_records"].append(proc_row)
-        elif proc_row != plan_map[key]:
-            report["changed_records"].append((plan_map[key], proc_row))
-        else:
-            report["identical"] += 1
-
-    for key in plan_map:
-        if key not in proc_map:
-            report["missing_records"].append(plan_map[key])
-
-    return report
-
-
 def get_key_columns(plan_headers: list, external_id: str) -> list:
     """Determine which columns to use as the diff key.
 
@@ -620,24 +582,149 @@ def get_key_columns(plan_headers: list, external_id: str) -> list:
 
     Falls back to all columns if no externalId fields found.
     """
-    if not external_id or external_id == "Id":
-        return list(plan_headers) if plan_headers else []
+    return csv_diff.key_columns(plan_headers, external_id)
 
-    # Split externalId on ";" but be aware that composite key references
-    # (containing $$) are single components even though they contain $
-    parts = external_id.split(";")
-    key_cols = []
-    for p in parts:
-        if plan_headers and p in plan_headers:
-            key_cols.append(p)
 
-    if not key_cols and plan_headers:
-        # Try the full composite $$-prefixed column as a single key
-        composite = "$$" + "$".join(parts)
-        if composite in plan_headers:
-            key_cols.append(composite)
+def read_csv_header(path: str, encoding: str = "utf-8") -> list:
+    """Normalized header row of a CSV, or None when the file is missing or empty."""
+    if not os.path.isfile(path):
+        return None
+    with open(path, "r", newline="", encoding=encoding) as f:
+        headers = next(csv.reader(f), None)
+    return [normalize_header(h) for h in headers] if headers else headers
+
+
+def diff_counts(plan_index: csv_diff.RowIndex, proc_index: csv_diff.RowIndex) -> dict:
+    """Identical / new / changed / missing record counts between the plan's and the processed rows."""
+    result = csv_diff.compare_indexes(plan_index, proc_index)
+    return {"identical": result["identical"], "new": len(result["added"]),
+            "changed": len(result["changed"]), "missing": len(result["removed"])}
+
 
-    return key_cols if key_cols else (list(plan_headers) if plan_headers else [])
+def process_object(job: dict) -> dict:
+    """Stream one extracted object through every transformation into its processed CSV.
+
+    ``job`` carries the object name, the directories, its ``externalId``, its
+    slice of the code map and the diff_only / verbose flags. It is a plain dict,
+    so the job can be sent to a worker process. Returns ``{"object", "messages",
+    "rows", "diff"}``: the log lines are returned rather than printed so that
+    parallel workers do not interleave their output.
+    """
+    obj_name = job["object"]
+    verbose = job.get("verbose", False)
+    messages = [f"  Processing {obj_name}..."]
+    result = {"object": obj_name, "messages": messages, "rows": 0, "diff": None}
+    path = os.path.join(job["extraction_dir"], f"{obj_name}.csv")
+    if not os.path.isfile(path):
+        return result
+    with open(path, "r", newline="", encoding="utf-8-sig") as src:
+        reader = csv.reader(src)
+        ext_headers = next(reader, None)
+        if ext_headers is None:
+            return result
+        ext_headers = [normalize_header(h) for h in ext_headers]
+
+        # The prior state of THIS plan (diff), and the alignment template: the
+        # reference plan's golden schema when there is one, else this plan's CSV.
+        plan_dir, reference_plan_dir = job["plan_dir"], job.get("reference_plan_dir")
+        plan_headers = read_csv_header(os.path.join(plan_dir, f"{obj_name}.csv"))
+        template_headers = plan_headers
+        if reference_plan_dir:
+            ref_headers = read_csv_header(os.path.join(reference_plan_dir, f"{obj_name}.csv"))
+            if ref_headers is not None:
+                template_headers = ref_headers
+                if verbose:
+                    messages.append(f"    Aligning to reference schema from {reference_plan_dir}")
+            elif verbose:
+                messages.append(f"    No reference CSV for {obj_name}; aligning to plan's own schema")
+
+        # Each stage is compiled against the headers once, then applied per row
+        # in the order the whole-table functions above run: backfill codes,
+        # status, ID text fields, defaults, alignment, #N/A normalization.
+        backfill = _backfill_plan(ext_headers, job.get("code_map"))
+        status = _status_plan(ext_headers, obj_name)
+        id_text = _id_text_plan(ext_headers, obj_name)
+        defaults = _defaults_plan(ext_headers, obj_name)
+        align = None
+        proc_headers = ext_headers
+        if template_headers is not None:
+            align = _align_plan(ext_headers, template_headers)
+            proc_headers = list(template_headers)
+            if verbose:
+                for h, (kind, _) in zip(template_headers, align):
+                    if kind == "missing":
+                        messages.append(f"    WARNING: Plan column '{h}' not found in extraction for {obj_name}")
+        ext_idx = {h: i for i, h in enumerate(ext_headers)}
+        composite_idx = {i for i, h in enumerate(proc_headers) if "$$" in h}
+
+        # Diff keys come from the template so the diff keys on the golden schema;
+        # when the prior plan CSV used a different schema the diff degrades to
+        # "all new" (still informative: it signals the schema changed).
+        # Columns are compared by name, so a reordered plan CSV is not a change.
+        proc_index = plan_index = None
+        if plan_headers is not None:
+            key_cols = get_key_columns(template_headers, job.get("external_id", ""))
+            if all(k in proc_headers for k in key_cols):
+                columns = sorted(set(plan_headers) & set(proc_headers))
+                proc_index = csv_diff.RowIndex(proc_headers, key_cols, columns)
+                plan_index = csv_diff.RowIndex(proc_headers, key_cols, columns)
+                if all(k in plan_headers for k in key_cols):
+                    plan_index = csv_diff.index_csv(os.path.join(plan_dir, f"{obj_name}.csv"), key_cols, columns)
+
+        out = None
+        if not job.get("diff_only"):
+            out_path = os.path.join(job["output_dir"], f"{obj_name}.csv")
+            os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+            out = open(out_path, "w", newline="", encoding="utf-8")
+        fills, resolved, defaulted = {}, {}, {}
+        try:
+            writer = csv.writer(out, lineterminator="\n") if out else None
+            if writer:
+                writer.writerow(proc_headers)
+            for row in reader:
+                _apply_backfill(row, backfill, fills)
+                _apply_status(row, status)
+                _apply_id_text(row, id_text, resolved)
+                _apply_defaults(row, defaults, defaulted)
+                if align is not None:
+                    row = _apply_align(row, align, ext_idx)
+                row = _normalize_na_row(row, composite_idx)
+                if writer:
+                    writer.writerow(row)
+                if proc_index is not None:
+                    proc_index.add(row)
+                result["rows"] += 1
+        finally:
+            if out:
+                out.close()
+
+    if verbose:
+        messages += [f"    Backfilled {n} {col} values from org Name->Code map" for col, n in fills.items()]
+        messages += [f"    Resolved {n} {name} IDs to portable values" for name, n in resolved.items()]
+        messages += [f"    Defaulted {n} {name} values from source field" for name, n in defaulted.items()]
+    if plan_headers is not None:
+        report = diff_counts(plan_index, proc_index) if proc_index is not None else \
+            {"identical": 0, "new": 0, "changed": 0, "missing": 0}
+        result["diff"] = report
+        if verbose or report["new"] or report["missing"] or report["changed"]:
+            messages.append(f"    Identical: {report['identical']}, New: {report['new']}, "
+                            f"Changed: {report['changed']}, Missing: {report['missing']}")
+    return result
+
+
+def _map_objects(jobs: list, workers: int):
+    """process_object over jobs, in order; on a process pool when more than one worker."""
+    workers = min(workers, len(jobs))
+    if workers <= 1:
+        yield from map(process_object, jobs)
+        return
+    try:
+        pool = ProcessPoolExecutor(max_workers=workers)
+    except (OSError, NotImplementedError):  # no working multiprocessing (e.g. no /dev/shm)
+        yield from map(process_object, jobs)
+        return
+    with pool:
+        yield from pool.map(process_object, jobs)
 
 
 # CSVs that SFDMU/the run emits but are not part of a plan's tracked data set.
@@ -662,13 +749,16 @@ def clean_incidental_copy(src: str, dst: str) -> None:
     directly to the clean, import-ready format used by the committed plan CSVs.
     """
     with open(src, "r", newline="", encoding="utf-8-sig") as f:
-        rows = list(csv.reader(f))
-    if not rows:
-        open(dst, "w").close()
-        return
-    header = [normalize_header(h) for h in rows[0]]
-    body = [["" if v == "#N/A" else v for v in r] for r in rows[1:]]
-    write_csv(dst, header, body)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            open(dst, "w").close()
+            return
+        with open(dst, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow([normalize_header(h) for h in header])
+            for r in reader:
+                writer.writerow(["" if v == "#N/A" else v for v in r])
 
 
 def header_only_copy(ref_csv: str, dst: str) -> None:
@@ -685,7 +775,7 @@ def header_only_copy(ref_csv: str, dst: str) -> None:
 
 
 def sync_to_plan(plan_dir: str, extraction_dir: str, output_dir: str,
-                 reference_plan_dir: str = None, verbose: bool = False) -> None:
+                 reference_plan_dir: str = None, verbose: bool = False, log=print) -> None:
     """Place a freshly-processed extraction into the plan dir as its tracked CSV set.
 
     The target file set is the reference plan's data CSVs when a reference is given
@@ -736,22 +826,23 @@ def sync_to_plan(plan_dir: str, extraction_dir: str, output_dir: str,
                 if fn.endswith(".csv"):
                     shutil.copy2(os.path.join(root, fn), os.path.join(ddir, fn))
 
-    print(f"  Synced to plan {plan_dir}: {len(from_proc)} processed, "
+    log(f"  Synced to plan {plan_dir}: {len(from_proc)} processed, "
           f"{len(from_raw)} incidental, {len(placeholder)} placeholder")
     if verbose and (from_raw or placeholder):
-        print(f"    incidental (cleaned): {from_raw}")
-        print(f"    header-only placeholders (0-record objects): {placeholder}")
+        log(f"    incidental (cleaned): {from_raw}")
+        log(f"    header-only placeholders (0-record objects): {placeholder}")
     if missing:
-        print(f"    NOT produced by extraction (left as-is): {missing}")
+        log(f"    NOT produced by extraction (left as-is): {missing}")
     # Heads-up on plan CSVs outside the target set (possible stale object-set drift).
     extras = sorted(data_csvs(plan_dir) - target)
     if extras:
-        print(f"    note: plan has CSVs not in the reference set (not refreshed): {extras}")
+        log(f"    note: plan has CSVs not in the reference set (not refreshed): {extras}")
 
 
 def process_extraction(extraction_dir: str, plan_dir: str, output_dir: str,
                         diff_only: bool, copy_to_plan: bool, verbose: bool,
-                        reference_plan_dir: str = None, code_map_file: str = None) -> None:
+                        reference_plan_dir: str = None, code_map_file: str = None,
+                        workers: int = None, log=print) -> dict:
     """Main post-processing logic.
 
     When ``reference_plan_dir`` is given, the extracted CSVs are aligned to the
@@ -762,6 +853,10 @@ def process_extraction(extraction_dir: str, plan_dir: str, output_dir: str,
     Without it the post-process conforms output to whatever CSV already sits in
     the plan dir — which silently propagates a stale schema (e.g. .Name keys
     instead of .Code/.UnitCode).
+
+    Objects run on up to ``workers`` processes (default: CPU count; 1 keeps
+    everything in this process). Output lines go to ``log``. Returns the diff
+    report: ``{object: {"identical", "new", "changed", "missing"}}``.
     """
     export_json = load_export_json(plan_dir)
     plan_structure, all_passes = parse_plan_structure(export_json)
@@ -772,109 +867,69 @@ def process_extraction(extraction_dir: str, plan_dir: str, output_dir: str,
     extracted_objects = {os.path.splitext(f)[0]: f for f in extracted_files}
 
     if not extracted_objects:
-        print("No CSV files found in extraction directory.")
-        return
+        log("No CSV files found in extraction directory.")
+        return {}
 
-    print(f"Found {len(extracted_objects)} extracted CSV files")
-    print(f"Plan has {len(plan_structure)} objects configured")
-    print()
+    log(f"Found {len(extracted_objects)} extracted CSV files")
+    log(f"Plan has {len(plan_structure)} objects configured")
+    log("")
 
     os.makedirs(output_dir, exist_ok=True)
     diff_report = {}
 
+    steps, jobs = [], []
     for obj_name in sorted(extracted_objects.keys()):
         # Skip SFDMU internal files
         if obj_name.startswith("_") or obj_name in ("MissingParentRecordsReport", "CSVIssuesReport"):
             continue
-
         config = plan_structure.get(obj_name)
         if not config:
-            if verbose:
-                print(f"  SKIP {obj_name} (not in export.json)")
+            steps.append(obj_name)
             continue
-
-        print(f"  Processing {obj_name}...")
-
-        # Load extracted data
-        ext_headers, ext_rows = load_extracted_csv(extraction_dir, obj_name)
-        if ext_headers is None:
+        steps.append(None)
+        jobs.append({
+            "object": obj_name,
+            "extraction_dir": extraction_dir,
+            "plan_dir": plan_dir,
+            "output_dir": output_dir,
+            "reference_plan_dir": reference_plan_dir,
+            "external_id": config.get("externalId", ""),
+            # Restores cross-object externalId code components (UsageResource.Code,
+            # RateUnitOfMeasure.UnitCode, ...) that SFDMU blanked to #N/A.
+            "code_map": code_map.get(obj_name) or {},
+            "diff_only": diff_only,
+            "verbose": verbose,
+        })
+
+    results = _map_objects(jobs, workers or os.cpu_count() or 1)
+    for skipped in steps:
+        if skipped:
+            if verbose:
+                log(f"  SKIP {skipped} (not in export.json)")
             continue
-
-        # Restore cross-object externalId code components (UsageResource.Code,
-        # RateUnitOfMeasure.UnitCode, ...) that SFDMU blanked to #N/A, using the
-        # org-derived Name->Code map.  Runs before alignment so composite keys are
-        # rebuilt from the restored values.
-        ext_rows = backfill_relationship_codes(ext_headers, ext_rows, obj_name, code_map, verbose)
-
-        # Load existing plan CSV for diff (the prior state of THIS plan).
-        plan_headers, plan_rows = load_plan_csv(plan_dir, obj_name)
-
-        # Determine the alignment template (the target column schema).  Prefer the
-        # reference plan's golden schema so output is uniform with qb; fall back to
-        # this plan's own CSV when no reference is available for the object.
-        template_headers = plan_headers
-        if reference_plan_dir:
-            ref_headers, _ = load_plan_csv(reference_plan_dir, obj_name)
-            if ref_headers is not None:
-                template_headers = ref_headers
-                if verbose:
-                    print(f"    Aligning to reference schema from {reference_plan_dir}")
-            elif verbose:
-                print(f"    No reference CSV for {obj_name}; aligning to plan's own schema")
-
-        # Rewrite status fields
-        ext_rows = rewrite_status(ext_rows, ext_headers, obj_name)
-
-        # Resolve raw Salesforce IDs in text fields to portable values
-        ext_rows = resolve_id_text_fields(ext_rows, ext_headers, obj_name, verbose)
-
-        # Populate field defaults for portability across org configurations
-        ext_rows = apply_field_defaults(ext_rows, ext_headers, obj_name, verbose)
-
-        # Align columns to the template (golden reference, or plan's own) schema
-        proc_headers, proc_rows = align_columns(
-            ext_headers, ext_rows, template_headers, obj_name, verbose
-        )
-
-        # Normalize #N/A to empty strings for safe, idempotent imports
-        proc_rows = normalize_na_values(proc_rows, proc_headers)
-
-        # Diff the freshly-aligned output against this plan's prior CSV.  Key
-        # columns come from the template so the diff keys on the golden schema;
-        # when the prior plan CSV used a different schema the diff degrades to
-        # "all new" (still informative — it signals the schema changed).
-        if plan_headers is not None:
-            key_cols = get_key_columns(template_headers, config.get("externalId", ""))
-            report = diff_csvs(plan_headers, plan_rows, proc_headers, proc_rows, obj_name, key_cols)
-            diff_report[obj_name] = report
-
-            if verbose or report["new_records"] or report["missing_records"] or report["changed_records"]:
-                print(f"    Identical: {report['identical']}, "
-                      f"New: {len(report['new_records'])}, "
-                      f"Changed: {len(report['changed_records'])}, "
-                      f"Missing: {len(report['missing_records'])}")
-
-        if not diff_only:
-            # Write processed CSV
-            out_path = os.path.join(output_dir, f"{obj_name}.csv")
-            write_csv(out_path, proc_headers, proc_rows)
+        result = next(results)
+        for line in result["messages"]:
+            log(line)
+        if result["diff"] is not None:
+            diff_report[result["object"]] = result["diff"]
 
     # Handle objectset_source for multi-pass plans
     if not diff_only:
         generate_objectset_source(extraction_dir, plan_dir, output_dir, all_passes,
-                                  verbose, reference_plan_dir)
+                                  verbose, reference_plan_dir, log=log)
         # Place the processed extraction into the plan dir as its tracked CSV set
         # (processed plan objects + cleaned incidental + header-only placeholders).
         if copy_to_plan:
-            sync_to_plan(plan_dir, extraction_dir, output_dir, reference_plan_dir, verbose)
+            sync_to_plan(plan_dir, extraction_dir, output_dir, reference_plan_dir, verbose, log=log)
 
     # Print diff summary
-    print_diff_summary(diff_report)
+    print_diff_summary(diff_report, log=log)
+    return diff_report
 
 
 def generate_objectset_source(extraction_dir: str, plan_dir: str, output_dir: str,
                                 all_passes: dict, verbose: bool,
-                                reference_plan_dir: str = None) -> None:
+                                reference_plan_dir: str = None, log=print) -> None:
     """Generate objectset_source CSVs for Pass 2+ objects.
 
     For objects that appear in multiple passes, create stripped-down CSVs
@@ -890,11 +945,11 @@ def generate_objectset_source(extraction_dir: str, plan_dir: str, output_dir: st
         if os.path.isdir(ref_source_dir):
             existing_source_dir = ref_source_dir
             if verbose:
-                print(f"  Using reference objectset_source: {ref_source_dir}")
+                log(f"  Using reference objectset_source: {ref_source_dir}")
     if not os.path.isdir(existing_source_dir):
         return
 
-    print("\n  Generating objectset_source CSVs...")
+    log("\n  Generating objectset_source CSVs...")
     for obj_name, passes in all_passes.items():
         if len(passes) < 2:
             continue
@@ -913,41 +968,40 @@ def generate_objectset_source(extraction_dir: str, plan_dir: str, output_dir: st
             if not source_headers:
                 continue
 
-            # Load extracted data for this object
-            ext_headers, ext_rows = load_extracted_csv(extraction_dir, obj_name)
-            if ext_headers is None:
+            ext_path = os.path.join(extraction_dir, f"{obj_name}.csv")
+            if not os.path.isfile(ext_path):
                 continue
-
-            # Build rows with only the columns needed for this pass
-            ext_idx = {h: i for i, h in enumerate(ext_headers)}
-            source_rows = []
-            for row in ext_rows:
-                source_row = []
-                for h in source_headers:
-                    if h in ext_idx:
-                        idx = ext_idx[h]
-                        source_row.append(row[idx] if idx < len(row) else "")
-                    else:
-                        source_row.append("")
-                source_rows.append(source_row)
-
-            # Write to output objectset_source
-            out_dir = os.path.join(output_dir, "objectset_source", set_name)
-            write_csv(os.path.join(out_dir, f"{obj_name}.csv"), source_headers, source_rows)
+            with open(ext_path, "r", newline="", encoding="utf-8-sig") as src:
+                reader = csv.reader(src)
+                ext_headers = next(reader, None)
+                if ext_headers is None:
+                    continue
+                ext_idx = {normalize_header(h): i for i, h in enumerate(ext_headers)}
+                # Only the columns needed for this pass, streamed row by row
+                columns = [ext_idx.get(h) for h in source_headers]
+                out_path = os.path.join(output_dir, "objectset_source", set_name, f"{obj_name}.csv")
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                count = 0
+                with open(out_path, "w", newline="", encoding="utf-8") as out:
+                    writer = csv.writer(out, lineterminator="\n")
+                    writer.writerow(source_headers)
+                    for row in reader:
+                        writer.writerow([row[i] if i is not None and i < len(row) else "" for i in columns])
+                        count += 1
             if verbose:
-                print(f"    {set_name}/{obj_name}.csv ({len(source_rows)} rows)")
+                log(f"    {set_name}/{obj_name}.csv ({count} rows)")
 
 
-def print_diff_summary(diff_report: dict) -> None:
+def print_diff_summary(diff_report: dict, log=print) -> None:
     """Print a summary of all diffs."""
     if not diff_report:
         return
 
-    print("\n" + "=" * 80)
-    print("DIFF SUMMARY: Extraction vs Current Plan")
-    print("=" * 80)
-    print(f"{'Object':<45} {'Same':>6} {'New':>6} {'Chg':>6} {'Miss':>6}")
-    print("-" * 80)
+    log("\n" + "=" * 80)
+    log("DIFF SUMMARY: Extraction vs Current Plan")
+    log("=" * 80)
+    log(f"{'Object':<45} {'Same':>6} {'New':>6} {'Chg':>6} {'Miss':>6}")
+    log("-" * 80)
 
     total_identical = 0
     total_new = 0
@@ -956,25 +1010,22 @@ def print_diff_summary(diff_report: dict) -> None:
 
     for obj_name in sorted(diff_report.keys()):
         r = diff_report[obj_name]
-        n_id = r["identical"]
-        n_new = len(r["new_records"])
-        n_chg = len(r["changed_records"])
-        n_miss = len(r["missing_records"])
+        n_id, n_new, n_chg, n_miss = r["identical"], r["new"], r["changed"], r["missing"]
         total_identical += n_id
         total_new += n_new
         total_changed += n_chg
         total_missing += n_miss
 
         flag = "" if (n_new == 0 and n_chg == 0 and n_miss == 0) else " *"
-        print(f"{obj_name:<45} {n_id:>6} {n_new:>6} {n_chg:>6} {n_miss:>6}{flag}")
+        log(f"{obj_name:<45} {n_id:>6} {n_new:>6} {n_chg:>6} {n_miss:>6}{flag}")
 
-    print("-" * 80)
-    print(f"{'TOTAL':<45} {total_identical:>6} {total_new:>6} {total_changed:>6} {total_missing:>6}")
-    print()
+    log("-" * 80)
+    log(f"{'TOTAL':<45} {total_identical:>6} {total_new:>6} {total_changed:>6} {total_missing:>6}")
+    log("")
     if total_new or total_changed or total_missing:
-        print("Objects marked with * have differences.")
+        log("Objects marked with * have differences.")
     else:
-        print("Extraction matches current plan exactly.")
+        log("Extraction matches current plan exactly.")
 
 
 def main():
@@ -997,6 +1048,8 @@ def main():
                         help="Only produce a diff report; don't write processed CSVs")
     parser.add_argument("--copy-to-plan", action="store_true",
                         help="Copy processed CSVs into the plan directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Objects processed in parallel (default: CPU count; 1 = no worker processes)")
     parser.add_argument("--verbose", action="store_true",
                         help="Print detailed processing info")
 
@@ -1038,6 +1091,7 @@ def main():
         verbose=args.verbose,
         reference_plan_dir=reference_plan_dir,
         code_map_file=code_map_file,
+        workers=args.workers,
     )
 
     print("\nDone.")
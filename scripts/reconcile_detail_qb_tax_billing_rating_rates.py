@@ -1,59 +1,46 @@
 #!/usr/bin/env python3
 """
 Detailed comparison for qb-tax, qb-billing, qb-rating, qb-rates.
-Uses first column as key; compares by column name (order-independent).
+Keys rows on each object's plan externalId (first column when the plan has
+none) and compares by column name (order-independent), with
+scripts/sfdmu_csv_diff.py. Values are compared with whitespace stripped.
 Reports: row counts, keys only in main, only in extract, only in migrate,
 and keys present in multiple but with different values.
 """
-import csv
+import sys
 from pathlib import Path
-from collections import defaultdict
 
 ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from scripts import sfdmu_csv_diff as csv_diff  # noqa: E402
+
 MAIN = ROOT / "datasets/sfdmu/qb/en-US"
 EXTRACT = ROOT / "datasets/sfdmu/reconcile/qb-extractdata/en-US"
 MIGRATE = ROOT / "datasets/sfdmu/reconcile/qb-migrate/en-US"
 
 PLANS = ["qb-tax", "qb-billing", "qb-rating", "qb-rates"]
-SKIP = {"MissingParentRecordsReport.csv"}
-SKIP_SUBDIRS = {"target", "source", "objectset_source", "reports", "logs"}
-
-
-def root_csvs(plan_path: Path) -> list[str]:
-    if not plan_path.is_dir():
-        return []
-    return sorted(
-        f.name for f in plan_path.iterdir()
-        if f.is_file() and f.suffix.lower() == ".csv" and f.name not in SKIP
-    )
-
-
-def load_csv_by_key(path: Path, key_col: str | None = None) -> tuple[list[str], dict[str, dict]] | None:
-    """Load CSV as dict keyed by first column (or key_col). Returns (headers, {key: row_dict}) or None."""
-    if not path.is_file():
-        return None
-    try:
-        with open(path, newline="", encoding="utf-8", errors="replace") as f:
-            r = csv.DictReader(f)
-            headers = r.fieldnames
-            if not headers:
-                return None
-            key_column = key_col or headers[0]
-            rows = {}
-            for row in r:
-                key = row.get(key_column, "")
-                # Normalize: use same key for comparison (strip, and ensure string)
-                key = str(key).strip() if key else ""
-                rows[key] = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
-        return (headers, rows)
-    except Exception:
-        return None
-
-
-def row_diff(a: dict, b: dict) -> list[str]:
-    """Return list of column names where a and b differ."""
-    all_keys = set(a) | set(b)
-    return [k for k in all_keys if a.get(k) != b.get(k)]
+
+
+def keyed_diff(a: Path, b: Path, external_id: str) -> dict:
+    """csv_diff report for a vs b, keyed on the externalId (first column when the plan has none)."""
+    keys = None
+    if not external_id or external_id == "Id":
+        path = a if a.is_file() else b
+        if path.is_file():
+            with csv_diff.open_csv(str(path)) as (headers, _):
+                keys = (headers or [])[:1] or None
+    return csv_diff.diff_files(str(a), str(b), keys=keys, external_id=external_id, strip=True)
+
+
+def key_set(report: dict, category: str) -> set[str]:
+    return {";".join(entry["key"]) for entry in report.get(category, [])}
+
+
+def unique_keys(report: dict, side: str) -> int:
+    counts = report.get("counts") or {}
+    if report.get("missing") == side or not counts:
+        return 0
+    return counts[f"{side}_rows"] - counts[f"{side}_duplicate_keys"]
 
 
 def run_plan(plan: str, out: list[str]) -> None:
@@ -62,7 +49,7 @@ def run_plan(plan: str, out: list[str]) -> None:
     mig_dir = MIGRATE / plan
     if not main_dir.is_dir():
         return
-    csv_names = root_csvs(main_dir)
+    csv_names = csv_diff.data_csvs(str(main_dir))
     if not csv_names:
         return
 
@@ -71,45 +58,42 @@ def run_plan(plan: str, out: list[str]) -> None:
     out.append(f"PLAN: {plan}")
     out.append("=" * 100)
 
+    external_ids = csv_diff.plan_external_ids(str(main_dir))
     for name in csv_names:
-        main_data = load_csv_by_key(main_dir / name)
-        ext_data = load_csv_by_key(ext_dir / name)
-        mig_data = load_csv_by_key(mig_dir / name)
-
-        if main_data is None and ext_data is None and mig_data is None:
+        external_id = external_ids.get(name[:-4], "")
+        main_ext = keyed_diff(main_dir / name, ext_dir / name, external_id)
+        main_mig = keyed_diff(main_dir / name, mig_dir / name, external_id)
+        ext_mig = keyed_diff(ext_dir / name, mig_dir / name, external_id)
+        if all(r.get("error") for r in (main_ext, main_mig, ext_mig)):
             continue
 
-        _, main_rows = main_data or (None, {})
-        _, ext_rows = ext_data or (None, {})
-        _, mig_rows = mig_data or (None, {})
-
-        main_keys = set(main_rows)
-        ext_keys = set(ext_rows)
-        mig_keys = set(mig_rows)
-
-        n_main, n_ext, n_mig = len(main_keys), len(ext_keys), len(mig_keys)
+        n_main, n_ext = unique_keys(main_ext, "left"), unique_keys(main_ext, "right")
+        n_mig = unique_keys(main_mig, "right")
         out.append("")
         out.append(f"--- {name} ---")
         out.append(f"  Row counts:  main={n_main}  extract={n_ext}  migrate={n_mig}")
+        for label, report in (("extract", main_ext), ("migrate", main_mig), ("extract vs migrate", ext_mig)):
+            if report.get("error") and report["error"] != "missing on both sides":
+                out.append(f"  main vs {label}: {report['error']}" if label != "extract vs migrate"
+                           else f"  {label}: {report['error']}")
 
-        only_main = main_keys - ext_keys - mig_keys
-        only_ext = ext_keys - main_keys
-        only_mig = mig_keys - main_keys
-        in_main_and_ext = main_keys & ext_keys
-        in_main_and_mig = main_keys & mig_keys
-        in_all_three = main_keys & ext_keys & mig_keys
-
+        only_main = key_set(main_ext, "removed") & key_set(main_mig, "removed")
         # Keys in extract or migrate but not in main (need to add to main)
-        only_in_ext = ext_keys - main_keys
-        only_in_mig = mig_keys - main_keys
-        only_in_ext_not_mig = only_in_ext - mig_keys
-        only_in_mig_not_ext = only_in_mig - ext_keys
-        in_both_orgs_not_main = (ext_keys | mig_keys) - main_keys
+        only_in_ext = key_set(main_ext, "added")
+        only_in_mig = key_set(main_mig, "added")
 
         # Value differences: key in both but row content differs
-        main_vs_ext_diff = [k for k in in_main_and_ext if main_rows.get(k) != ext_rows.get(k)]
-        main_vs_mig_diff = [k for k in in_main_and_mig if main_rows.get(k) != mig_rows.get(k)]
-        ext_vs_mig_diff = [k for k in (ext_keys & mig_keys) if ext_rows.get(k) != mig_rows.get(k)]
+        main_vs_ext_diff = main_ext.get("changed", [])
+        main_vs_mig_diff = main_mig.get("changed", [])
+        ext_vs_mig_diff = ext_mig.get("changed", [])
+
+        def changed_lines(changed: list) -> list[str]:
+            lines = []
+            for entry in sorted(changed, key=lambda e: e["key"])[:5]:
+                cols = sorted(entry["columns"])
+                lines.append(f"    Key: {';'.join(entry['key'])}  differing columns: {cols[:8]}"
+                             f"{'...' if len(cols) > 8 else ''}")
+            return lines
 
         if only_main:
             out.append(f"  Keys ONLY in main (not in either org): {len(only_main)}")
@@ -132,7 +116,7 @@ def run_plan(plan: str, out: list[str]) -> None:
                     out.append(f"      mig: {k}")
                 if len(only_in_mig) > 20:
                     out.append(f"      ... and {len(only_in_mig) - 20} more")
-            in_both = (ext_keys & mig_keys) - main_keys
+            in_both = only_in_ext & only_in_mig
             if in_both:
                 out.append(f"    In BOTH extract and migrate (not in main): {len(in_both)}")
                 for k in sorted(in_both)[:15]:
@@ -142,35 +126,25 @@ def run_plan(plan: str, out: list[str]) -> None:
 
         if main_vs_ext_diff:
             out.append(f"  Keys in main and extract but VALUE DIFFERS: {len(main_vs_ext_diff)}")
-            for k in sorted(main_vs_ext_diff)[:5]:
-                cols = row_diff(main_rows[k], ext_rows[k])
-                out.append(f"    Key: {k}  differing columns: {cols[:8]}{'...' if len(cols) > 8 else ''}")
+            out.extend(changed_lines(main_vs_ext_diff))
             if len(main_vs_ext_diff) > 5:
                 out.append(f"    ... and {len(main_vs_ext_diff) - 5} more")
 
         if main_vs_mig_diff:
             out.append(f"  Keys in main and migrate but VALUE DIFFERS: {len(main_vs_mig_diff)}")
-            for k in sorted(main_vs_mig_diff)[:5]:
-                cols = row_diff(main_rows[k], mig_rows[k])
-                out.append(f"    Key: {k}  differing columns: {cols[:8]}{'...' if len(cols) > 8 else ''}")
+            out.extend(changed_lines(main_vs_mig_diff))
             if len(main_vs_mig_diff) > 5:
                 out.append(f"    ... and {len(main_vs_mig_diff) - 5} more")
 
         if ext_vs_mig_diff and not (only_in_ext or only_in_mig or main_vs_ext_diff or main_vs_mig_diff):
             out.append(f"  Extract vs migrate VALUE DIFFERS (same key, different data): {len(ext_vs_mig_diff)}")
-            for k in sorted(ext_vs_mig_diff)[:5]:
-                cols = row_diff(ext_rows[k], mig_rows[k])
-                out.append(f"    Key: {k}  differing columns: {cols[:8]}{'...' if len(cols) > 8 else ''}")
+            out.extend(changed_lines(ext_vs_mig_diff))
 
         if not (only_main or only_in_ext or only_in_mig or main_vs_ext_diff or main_vs_mig_diff or ext_vs_mig_diff):
-            if n_main == n_ext == n_mig and main_keys == ext_keys == mig_keys:
-                same = all(main_rows.get(k) == ext_rows.get(k) == mig_rows.get(k) for k in main_keys)
-                if same:
-                    out.append("  -> Content identical (main = extract = migrate).")
-                else:
-                    out.append("  -> Row counts and keys match but some values differ (see above).")
+            if not any(csv_diff.has_differences(r) for r in (main_ext, main_mig, ext_mig)):
+                out.append("  -> Content identical (main = extract = migrate).")
             else:
-                out.append("  -> No structural diff; check row counts.")
+                out.append("  -> Keys and values match; check row counts, duplicate keys and columns.")
 
     out.append("")
 
@@ -178,7 +152,7 @@ def run_plan(plan: str, out: list[str]) -> None:
 def main():
     out: list[str] = []
     out.append("DETAILED RECONCILIATION: qb-tax, qb-billing, qb-rating, qb-rates")
-    out.append("Key = first column of each CSV. Compare main vs extract vs migrate.")
+    out.append("Key = plan externalId of each object (first column if none). Compare main vs extract vs migrate.")
     out.append("")
 
     for plan in PLANS:
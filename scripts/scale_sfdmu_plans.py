@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Generate a scaled copy of SFDMU plans (N× products, price book entries, rates).
+
+Reads the plans of a scope (``datasets/sfdmu/qb/en-US`` by default) and
+writes the same plans with every product repeated ``--factor`` times. Every
+row that hangs off a product is repeated with it: selling model options,
+bundle components, price book entries, adjustments, cost book entries and
+rate card entries. Copy 1 is the source plan, unchanged. Copy ``k`` suffixes
+each product key (``QB-API`` -> ``QB-API-S002``) and rewrites every
+reference to it, inside ``$$`` composite cells too. Loading the scaled plans
+of a scope in their usual order gives an org ``N`` times the catalog size.
+
+The structure is learned from the plans, not configured per object:
+
+* the seed object (``Product2``) is scaled as a whole, on its externalId
+  fields plus ``Name`` and ``ProductCode``; each field's suffix follows the
+  separator its values already use (``-`` for codes, a space for names);
+* lookup columns and ``$$`` parts are resolved to their parent object the way
+  ``validate_sfdmu_references.py`` does, so ``Product.StockKeepingUnit``,
+  ``RootBundle.StockKeepingUnit`` and
+  ``PricebookEntry.Product2.StockKeepingUnit`` all follow the product;
+* a row that references a scaled record is repeated. If its object's
+  externalId goes through a scaled reference, the key is already unique per
+  copy. If the externalId is made only of the object's own fields
+  (``ProductComponentGroup.Code``), the first of them is suffixed as well, and
+  references to those rows follow in turn. Rows whose key could be made
+  unique neither way are written once and listed as unscaled.
+
+Every written CSV is checked: a key the source did not already repeat must
+not repeat in the output. Files the plans do not read (and ``export.json``)
+are copied as they are, so the output loads with ``load_sfdmu_data``
+(``pathtoexportjson``) and passes the offline validators like the source.
+
+Usage:
+    python scripts/scale_sfdmu_plans.py --factor 100 -o /tmp/qb-x100
+    python scripts/scale_sfdmu_plans.py datasets/sfdmu/qb/en-US --plans qb-pcm qb-pricing qb-rates --factor 1000 -o /tmp/qb-x1000
+    python scripts/scale_sfdmu_plans.py --factor 10 -o /tmp/qb-x10 --json /tmp/qb-x10.json
+
+Exit codes: 0 = written, 1 = written but a key repeats, 2 = bad invocation /
+unreadable plan.
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+from scripts import validate_sfdmu_references as refs  # noqa: E402
+from tasks import rlm_sfdmu_fingerprint as fingerprint  # noqa: E402
+from tasks import rlm_sfdmu_overlay, rlm_sfdmu_plan  # noqa: E402
+from tasks.rlm_sfdmu_native import KeyReader, key_components, lookup_column  # noqa: E402
+
+DEFAULT_SCOPE = REPO_ROOT / "datasets" / "sfdmu" / "qb" / "en-US"
+SEED_OBJECTS = ("Product2",)
+SEED_LABEL_FIELDS = ("Name", "ProductCode")
+SEPARATORS = "-_ ."
+SUFFIX_TAG = "S"
+_NA = "#N/A"
+_MARK = "\ue000"  # private-use character: never in plan data, never quoted by csv
+
+
+class ScaleError(ValueError):
+    """Plans that cannot be scaled (bad factor, a suffix that collides with an existing key)."""
+
+
+def _read(path: str) -> tuple:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        table = [row for row in csv.reader(f) if row]
+    return (table[0], table[1:]) if table else ([], [])
+
+
+def _plan_keys(plan_dir: str) -> dict:
+    """``sobject -> externalId components`` for the objects a plan loads (first object set wins)."""
+    with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+        plan = json.load(f)
+    keys = {}
+    for obj_set in rlm_sfdmu_plan.object_sets(plan):
+        for obj in obj_set.get("objects", []):
+            sobject = rlm_sfdmu_plan.query_sobject(obj.get("query", ""))
+            if sobject and not obj.get("excluded", False) and obj.get("externalId"):
+                keys.setdefault(sobject, key_components(obj["externalId"]))
+    return keys
+
+
+def _key_getter(header: list, components: list):
+    """``row -> key tuple`` (None when blank) on the raw cells, or None if the header lacks the key.
+
+    Copies only ever differ from their source row by suffixes, so comparing
+    cells as written is enough here (and much cheaper than normalizing them).
+    """
+    reader = KeyReader(header, components)
+    if not components or not reader.usable:
+        return None
+    index = {col: i for i, col in enumerate(header)}
+    sources = [(index[col], part) for col, part, _ in reader.sources]
+
+    def key(row):
+        values = []
+        for i, part in sources:
+            cell = row[i] if i < len(row) else ""
+            if part >= 0:
+                parts = cell.split(";")
+                cell = parts[part] if part < len(parts) else ""
+            values.append(cell)
+        return tuple(values) if any(values) else None
+
+    return key
+
+
+def _separator(values) -> str:
+    counts = Counter(ch for value in values for ch in value if ch in SEPARATORS)
+    return counts.most_common(1)[0][0] if counts else "-"
+
+
+class ScopeScaler:
+    """The plans of a scope, read once, and what repeating their seed objects ``factor`` times touches."""
+
+    def __init__(self, scope: str, plans: list = None, seeds=SEED_OBJECTS):
+        self.scope = scope
+        self.plans = fingerprint.find_plans(scope) if plans is None else list(plans)
+        self.seeds = tuple(seeds)
+        self.files = []  # (plan, plan dir, sobject, csv path, header, rows)
+        self.keys = {}  # sobject -> externalId components
+        self.headers = defaultdict(list)
+        for rel in self.plans:
+            plan_dir = rlm_sfdmu_overlay.materialize(os.path.normpath(os.path.join(scope, rel)))
+            for sobject, components in _plan_keys(plan_dir).items():
+                self.keys.setdefault(sobject, components)
+            for sobject, path, _ in refs.plan_files(plan_dir):
+                header, rows = _read(path)
+                if header:
+                    self.files.append((rel, plan_dir, sobject, path, header, rows))
+                    self.headers[sobject].append(header)
+        self._targets = {}
+        self.atoms = self._learn_atoms()
+
+    def target(self, sobject: str, path: str):
+        """``(object, field)`` a component path (``Product.StockKeepingUnit``) reads, relative to ``sobject``."""
+        cache_key = (sobject, path)
+        if cache_key not in self._targets:
+            head, _, rest = path.partition(".")
+            if not rest:
+                found = (sobject, path)
+            else:
+                parent = refs._resolve(head, [rest], sobject, self.headers)[0]
+                found = self.target(parent, rest) if parent else None
+            self._targets[cache_key] = found
+        return self._targets[cache_key]
+
+    def column_targets(self, sobject: str, column: str) -> list:
+        """One ``(object, field)`` (or None) per ``;`` part of the cells of ``column``."""
+        if column.startswith("$$"):
+            return [self.target(sobject, part) for part in key_components(column)]
+        lookup = lookup_column(column)
+        if lookup and column.split(".", 1)[1].startswith("$$"):
+            rel, components = lookup
+            parent = refs._resolve(rel, components, sobject, self.headers)[0]
+            return [self.target(parent, part) if parent else None for part in components]
+        return [self.target(sobject, column)]
+
+    def _own_key(self, sobject: str):
+        """The field suffixed on an object whose externalId is only its own fields, else None."""
+        components = self.keys.get(sobject) or []
+        if components and all("." not in part for part in components):
+            return components[0]
+        return None
+
+    def _keyed_through(self, sobject: str, atoms: dict) -> bool:
+        return any("." in part and self.target(sobject, part) in atoms for part in self.keys.get(sobject) or [])
+
+    def _learn_atoms(self) -> dict:
+        """``(object, field) -> values`` that get a copy suffix: the seeds, then own keys of rows that hang off them."""
+        atoms = defaultdict(set)
+        for _, _, sobject, _, header, rows in self.files:
+            if sobject not in self.seeds:
+                continue
+            fields = [part for part in self.keys.get(sobject) or [] if "." not in part]
+            for field in fields + [f for f in SEED_LABEL_FIELDS if f not in fields]:
+                if field in header:
+                    i = header.index(field)
+                    atoms[(sobject, field)].update(row[i] for row in rows if i < len(row) and row[i])
+        changed = True
+        while changed:
+            changed = False
+            for _, _, sobject, _, header, rows in self.files:
+                own = self._own_key(sobject)
+                if sobject in self.seeds or not own or own not in header or self._keyed_through(sobject, atoms):
+                    continue
+                i = header.index(own)
+                found = atoms[(sobject, own)] if (sobject, own) in atoms else set()
+                for row, _ in self._scaled_rows(sobject, header, rows, atoms):
+                    if i < len(row) and row[i] and row[i] not in found:
+                        found.add(row[i])
+                        changed = True
+                if found:
+                    atoms[(sobject, own)] = found
+        return dict(atoms)
+
+    def _substitutions(self, sobject: str, header: list, atoms: dict) -> list:
+        """``(column index, composite, [(part index, (object, field))])`` for the columns that can carry a scaled value."""
+        subs = []
+        for ci, column in enumerate(header):
+            targets = self.column_targets(sobject, column)
+            parts = [(pi, t) for pi, t in enumerate(targets) if t in atoms]
+            if parts:
+                subs.append((ci, len(targets) > 1, parts))
+        return subs
+
+    def _scaled_rows(self, sobject: str, header: list, rows: list, atoms: dict):
+        """``(row, [(column index, parts, suffix fields)])`` for each row holding a scaled value."""
+        subs = self._substitutions(sobject, header, atoms)
+        if not subs:
+            return
+        for row in rows:
+            hits = []
+            for ci, composite, parts in subs:
+                if ci >= len(row) or not row[ci]:
+                    continue
+                cell_parts = row[ci].split(";") if composite else [row[ci]]
+                fields = [(pi, t) for pi, t in parts if pi < len(cell_parts) and cell_parts[pi] != _NA
+                          and cell_parts[pi] in atoms[t]]
+                if fields:
+                    hits.append((ci, cell_parts, fields))
+            if hits:
+                yield row, hits
+
+    def scalable(self, sobject: str) -> bool:
+        """Whether repeated rows of ``sobject`` get distinct keys (or it has no key to repeat)."""
+        return (sobject in self.seeds or not self.keys.get(sobject) or self._keyed_through(sobject, self.atoms)
+                or (sobject, self._own_key(sobject)) in self.atoms)
+
+    def write(self, out_dir: str, factor: int, log=print) -> dict:
+        """Write the scaled plans under ``out_dir/<plan>``; returns the report."""
+        if factor < 1:
+            raise ScaleError(f"factor must be at least 1 (got {factor})")
+        width = len(str(factor))
+        suffixes = {}
+        for field_key, values in self.atoms.items():
+            sep = _separator(values)
+            suffixes[field_key] = [f"{sep}{SUFFIX_TAG}{k:0{width}d}" for k in range(factor + 1)]
+            clash = next((v + suffixes[field_key][k] for v in values for k in range(2, factor + 1)
+                          if v + suffixes[field_key][k] in values), None)
+            if clash:
+                raise ScaleError(f"{field_key[0]}.{field_key[1]}: generated key {clash!r} already exists")
+
+        report = {"scope": self.scope, "out": out_dir, "factor": factor,
+                  "atoms": {f"{o}.{f}": len(v) for (o, f), v in sorted(self.atoms.items())},
+                  "plans": {}, "unscaled": [], "repeated_keys": []}
+        for rel in self.plans:
+            # export.json and the files the plan does not read are copied as they are
+            plan_dir = rlm_sfdmu_overlay.materialize(os.path.normpath(os.path.join(self.scope, rel)))
+            shutil.copytree(plan_dir, os.path.join(out_dir, rel), ignore=shutil.ignore_patterns(
+                "__pycache__", rlm_sfdmu_overlay.OVERLAY_FILE))
+        for rel, plan_dir, sobject, path, header, rows in self.files:
+            name = os.path.relpath(path, plan_dir).replace(os.sep, "/")
+            scaled = list(self._scaled_rows(sobject, header, rows, self.atoms))
+            if scaled and not self.scalable(sobject):
+                report["unscaled"].append({"plan": rel, "file": name, "object": sobject, "rows": len(scaled)})
+                scaled = []
+            key = _key_getter(header, self.keys.get(sobject) or [])
+            out_rows, repeated = _write_csv(os.path.join(out_dir, rel, *name.split("/")), header, rows, scaled,
+                                            factor, suffixes, key)
+            report["plans"].setdefault(rel, {})[name] = {"object": sobject, "rows": len(rows),
+                                                         "scaled_rows": len(scaled), "output_rows": out_rows}
+            if key is not None:
+                source = Counter(key(row) for row in rows)
+                # a key the source already repeats is repeated once more per copy of its row, at most
+                allowed = factor * sum(n - 1 for value, n in source.items() if value is not None)
+                if repeated > allowed:
+                    report["repeated_keys"].append({"plan": rel, "file": name, "count": repeated - allowed})
+        for rel, files in report["plans"].items():
+            rows_in = sum(item["rows"] for item in files.values())
+            rows_out = sum(item["output_rows"] for item in files.values())
+            log(f"  {rel}: {rows_in} -> {rows_out} rows")
+        return report
+
+
+def _marked(row: list, hits: list) -> list:
+    """``row`` with a numbered marker after every value that takes a suffix."""
+    marked, n = list(row), 0
+    for ci, cell_parts, fields in hits:
+        parts = list(cell_parts)
+        for pi, _ in fields:
+            parts[pi] += f"{_MARK}{n}{_MARK}"
+            n += 1
+        marked[ci] = ";".join(parts)
+    return marked
+
+
+def _template(text: str) -> tuple:
+    """``(%-format, marker numbers in order)`` for a text holding :func:`_marked` markers."""
+    pieces = text.replace("%", "%%").split(_MARK)
+    return "".join(p if i % 2 == 0 else "%s" for i, p in enumerate(pieces)), tuple(int(p) for p in pieces[1::2])
+
+
+def _write_csv(target: str, header: list, rows: list, scaled: list, factor: int, suffixes: dict, key) -> tuple:
+    """Write the source rows, then copies 2..``factor`` of the scaled ones; returns ``(rows, repeated keys)``.
+
+    Each scaled row becomes one %-template of its CSV line, so a copy costs a
+    single format. Keys are compared over copies 1 and 2: later copies only
+    differ from copy 2 in their suffixes, which all have the same width, so
+    they cannot repeat a key unless copy 2 already does.
+    """
+    templates = []
+    for row, hits in scaled:
+        line, order = _template(_csv_line(_marked(row, hits)))
+        fields = [field_key for _, _, found in hits for _, field_key in found]
+        key_format = None
+        if key is not None:
+            marked_key = key(_marked(row, hits))
+            key_format = _template("\x1f".join(marked_key)) if marked_key else None
+        templates.append((line, [fields[n] for n in order], key_format, fields))
+
+    repeated, seen = 0, set()
+    if key is not None:
+        for row in rows:
+            value = key(row)
+            if value is not None:
+                value = "\x1f".join(value)
+                repeated += value in seen
+                seen.add(value)
+    with open(target, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+        for k in range(2, factor + 1):
+            f.write("".join(line % tuple(suffixes[fk][k] for fk in fields) for line, fields, _, _ in templates))
+            if k == 2 and key is not None:
+                for _, _, key_format, fields in templates:
+                    if key_format is None:
+                        continue
+                    fmt, order = key_format
+                    value = fmt % tuple(suffixes[fields[n]][k] for n in order)
+                    repeated += value in seen
+                    seen.add(value)
+    if factor > 2:
+        # a key copy 2 repeats (a scaled row whose key carries no suffix) repeats in every later copy
+        repeated += (factor - 2) * sum(1 for _, _, key_format, _ in templates
+                                       if key_format is not None and not key_format[1])
+    return len(rows) + len(scaled) * (factor - 1), repeated
+
+
+def _csv_line(row: list) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator="\n").writerow(row)
+    return buffer.getvalue()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scope", nargs="?", default=str(DEFAULT_SCOPE),
+                        help="Directory of plans (default: datasets/sfdmu/qb/en-US)")
+    parser.add_argument("--plans", nargs="+", help="Plans of the scope to scale (default: all of them)")
+    parser.add_argument("--factor", type=int, required=True, help="Copies of every product (1 = the source)")
+    parser.add_argument("-o", "--output", required=True, help="Output directory (one subdirectory per plan)")
+    parser.add_argument("--seed", action="append", help="Seed object to repeat (default: Product2; repeatable)")
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON")
+    parser.add_argument("--force", action="store_true", help="Replace an existing output directory")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.scope):
+        print(f"Not a directory: {args.scope}", file=sys.stderr)
+        return 2
+    if os.path.exists(args.output):
+        if not args.force:
+            print(f"Output exists (use --force to replace): {args.output}", file=sys.stderr)
+            return 2
+        shutil.rmtree(args.output)
+    started = time.perf_counter()
+    try:
+        scaler = ScopeScaler(args.scope, args.plans, tuple(args.seed or SEED_OBJECTS))
+        print(f"Scaling {len(scaler.plans)} plan(s) of {args.scope} x{args.factor} -> {args.output}")
+        report = scaler.write(args.output, args.factor)
+    except (ScaleError, rlm_sfdmu_overlay.OverlayError, OSError, ValueError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    print("Scaled keys: " + ", ".join(f"{name} ({n})" for name, n in report["atoms"].items()))
+    for item in report["unscaled"]:
+        print(f"  not scaled (key would repeat): {item['plan']}/{item['file']} ({item['rows']} row(s))")
+    for item in report["repeated_keys"]:
+        print(f"  REPEATED KEYS: {item['plan']}/{item['file']} ({item['count']})")
+    print(f"Done in {report['seconds']} s")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["repeated_keys"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""Local Salesforce REST stand-in for load and scale testing.
+
+A SQLite-backed HTTP server that answers the subset of the REST API the
+tooling in this repo calls — SOQL query with ``nextRecordsUrl`` paging,
+sObject CRUD, sObject Collections, composite / batch / graph, tooling query
+and the Revenue Cloud Connect actions ``scripts/txn_data_harness/lifecycle.py``
+drives — with configurable latency, async-tracker timing and 429/503
+injection. See ``README.md`` in this directory.
+"""
@@ -0,0 +1,207 @@
+"""Bulk API 2.0 jobs for the stand-in org.
+
+Routes ``jobs/query`` and ``jobs/ingest`` under the versioned prefix, enough
+for ``scripts/sf_transport/bulk.py`` and the tasks' copy to run end to end:
+
+* query jobs run against the store when created and land ``JobComplete``
+  after ``async_delay`` (via :meth:`App.defer`); results page by
+  ``maxRecords`` with an ``Sforce-Locator`` header (``null`` on the last);
+* ingest jobs accept one or more CSV ``PUT``s, apply every row on
+  ``UploadComplete`` (``insert`` / ``upsert`` / ``update`` / ``delete`` /
+  ``hardDelete``; each row on its own, like the real API) and serve the
+  three result files.
+
+Result and upload bodies are CSV strings; ``server.py`` writes a ``str`` body
+verbatim and hands ``text/csv`` request bodies through undecoded.
+"""
+
+import csv
+import io
+import itertools
+from typing import Any, Dict, List, Optional
+
+from scripts.sf_standin import soql as _soql
+from scripts.sf_standin.store import StoreError, checksum_suffix
+
+_CSV = {"Content-Type": "text/csv"}
+_QUERY_OPS = ("query", "queryAll")
+_INGEST_OPS = ("insert", "upsert", "update", "delete", "hardDelete")
+
+
+def _csv_text(header: List[str], rows: List[List[Any]]) -> str:
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(["" if v is None else ("true" if v is True else "false" if v is False else v)
+                         for v in row])
+    return buf.getvalue()
+
+
+def _walk(record: Dict[str, Any], path: List[str]) -> Any:
+    node: Any = record
+    for part in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get("Id" if part.lower() == "id" else part)
+    return node
+
+
+class Bulk:
+    def __init__(self, app):
+        self.app = app
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._seq = itertools.count(1)
+
+    def _job_id(self) -> str:
+        base = f"750SI{next(self._seq):010d}"
+        return base + checksum_suffix(base)
+
+    def route(self, method: str, version: str, parts: List[str], params: Dict[str, str],
+              body: Any):
+        from scripts.sf_standin.rest import error
+
+        if parts[:1] != ["jobs"] or len(parts) < 2 or parts[1] not in ("query", "ingest"):
+            return None
+        kind, rest = parts[1], parts[2:]
+        if not rest:
+            if method != "POST" or not isinstance(body, dict):
+                return error(405, "METHOD_NOT_ALLOWED", f"{method} not allowed")
+            return self._create_query(body) if kind == "query" else self._create_ingest(body)
+        job = self.jobs.get(rest[0])
+        if job is None or job["kind"] != kind:
+            return error(404, "NOT_FOUND", "The requested job does not exist")
+        if len(rest) == 1:
+            if method == "GET":
+                return 200, self._info(job), {}
+            if method == "PATCH" and isinstance(body, dict):
+                return self._transition(job, body.get("state"))
+            return error(405, "METHOD_NOT_ALLOWED", f"{method} not allowed")
+        tail = rest[1]
+        if kind == "query" and tail == "results" and method == "GET":
+            return self._results(job, params)
+        if kind == "ingest" and tail == "batches" and method == "PUT":
+            if job["state"] != "Open":
+                return error(400, "INVALIDJOBSTATE", f"Job is {job['state']}, not Open")
+            job["uploads"].append(body if isinstance(body, str) else "")
+            return 201, None, {}
+        if kind == "ingest" and tail in job.get("results", {}) and method == "GET":
+            return 200, job["results"][tail], dict(_CSV)
+        return error(404, "NOT_FOUND", f"The requested resource does not exist: {'/'.join(parts)}")
+
+    @staticmethod
+    def _info(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in job.items() if k not in ("kind", "uploads", "results", "rows", "header")}
+
+    # ----- query -------------------------------------------------------------------
+    def _create_query(self, body: Dict[str, Any]):
+        from scripts.sf_standin.rest import error
+
+        operation = body.get("operation") or "query"
+        if operation not in _QUERY_OPS or not body.get("query"):
+            return error(400, "INVALIDJOB", "query jobs need operation query|queryAll and a query")
+        q = _soql.parse(body["query"])
+        if q.aggregate or q.group_by or q.count_only:
+            return error(400, "INVALIDJOB", "Aggregate queries are not supported by Bulk API")
+        _, records = self.app.store.query(body["query"])
+        header = [".".join(item.path) for item in q.items]
+        job = {"id": self._job_id(), "kind": "query", "operation": operation,
+               "object": q.sobject, "state": "UploadComplete", "numberRecordsProcessed": 0,
+               "header": header, "rows": [[_walk(r, item.path) for item in q.items] for r in records]}
+        self.jobs[job["id"]] = job
+
+        def complete():
+            job["state"] = "JobComplete"
+            job["numberRecordsProcessed"] = len(job["rows"])
+
+        self.app.defer(complete)
+        return 200, self._info(job), {}
+
+    def _results(self, job: Dict[str, Any], params: Dict[str, str]):
+        from scripts.sf_standin.rest import error
+
+        if job["state"] != "JobComplete":
+            return error(400, "INVALIDJOBSTATE", f"Job is {job['state']}, results not ready")
+        start = int(params.get("locator") or 0)
+        size = int(params.get("maxRecords") or 50_000)
+        page = job["rows"][start:start + size]
+        end = start + len(page)
+        headers = dict(_CSV, **{"Sforce-NumberOfRecords": str(len(page)),
+                                "Sforce-Locator": str(end) if end < len(job["rows"]) else "null"})
+        return 200, _csv_text(job["header"], page), headers
+
+    # ----- ingest ------------------------------------------------------------------
+    def _create_ingest(self, body: Dict[str, Any]):
+        from scripts.sf_standin.rest import error
+
+        operation = body.get("operation")
+        if operation not in _INGEST_OPS or not body.get("object"):
+            return error(400, "INVALIDJOB", "ingest jobs need object and a valid operation")
+        if operation == "upsert" and not body.get("externalIdFieldName"):
+            return error(400, "INVALIDJOB", "upsert requires externalIdFieldName")
+        job = {"id": self._job_id(), "kind": "ingest", "operation": operation,
+               "object": body["object"], "externalIdFieldName": body.get("externalIdFieldName"),
+               "contentType": "CSV", "state": "Open", "numberRecordsProcessed": 0,
+               "numberRecordsFailed": 0, "uploads": [], "results": {}}
+        self.jobs[job["id"]] = job
+        return 200, self._info(job), {}
+
+    def _transition(self, job: Dict[str, Any], state: Optional[str]):
+        from scripts.sf_standin.rest import error
+
+        if state == "Aborted" and job["state"] not in ("JobComplete", "Failed"):
+            job["state"] = "Aborted"
+            return 200, self._info(job), {}
+        if state != "UploadComplete" or job["kind"] != "ingest" or job["state"] != "Open":
+            return error(400, "INVALIDJOBSTATE", f"Cannot move a {job['state']} job to {state}")
+        job["state"] = "UploadComplete"
+        self.app.defer(lambda: self._apply(job))
+        return 200, self._info(job), {}
+
+    def _apply(self, job: Dict[str, Any]) -> None:
+        store, op, sobject = self.app.store, job["operation"], job["object"]
+        ok: List[List[Any]] = []
+        failed: List[List[Any]] = []
+        header: List[str] = []
+        for upload in job["uploads"]:
+            reader = csv.reader(io.StringIO(upload))
+            names = next(reader, [])
+            header = header or names
+            for values in reader:
+                row = dict(zip(names, values))
+                fields = {k: (None if v == "#N/A" else v) for k, v in row.items() if v != ""}
+                try:
+                    record_id, created = self._apply_row(store, op, sobject, fields,
+                                                         job.get("externalIdFieldName"))
+                except StoreError as exc:
+                    failed.append([row.get("Id") or "", f"{exc.error_code}:{exc.message}:--"] + values)
+                    continue
+                ok.append([record_id, "true" if created else "false"] + values)
+        job["numberRecordsProcessed"] = len(ok) + len(failed)
+        job["numberRecordsFailed"] = len(failed)
+        job["results"] = {
+            "successfulResults": _csv_text(["sf__Id", "sf__Created"] + header, ok),
+            "failedResults": _csv_text(["sf__Id", "sf__Error"] + header, failed),
+            "unprocessedrecords": _csv_text(header, []),
+        }
+        job["state"] = "JobComplete"
+
+    @staticmethod
+    def _apply_row(store, op: str, sobject: str, fields: Dict[str, Any],
+                   external_id: Optional[str]):
+        if op == "insert":
+            return store.create(sobject, fields), True
+        if op in ("delete", "hardDelete"):
+            store.delete(fields.get("Id") or "", sobject)
+            return fields["Id"], False
+        if op == "update":
+            record_id = fields.pop("Id", None) or ""
+            store.update(record_id, fields, sobject)
+            return record_id, False
+        matches = store.find(sobject, **{external_id: fields.get(external_id)})
+        if len(matches) > 1:
+            raise StoreError("DUPLICATE_EXTERNAL_ID", f"{external_id}: more than one record found")
+        if matches:
+            store.update(matches[0]["Id"], fields, sobject)
+            return matches[0]["Id"], False
+        return store.create(sobject, fields), True
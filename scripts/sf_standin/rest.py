@@ -0,0 +1,410 @@
+"""REST routing for the stand-in org (no sockets; see ``server.py``).
+
+:meth:`App.handle` takes one request — method, path, query parameters,
+headers, decoded JSON body — and returns ``(status, body, headers)``. The
+composite endpoints dispatch their sub-requests back through the same router,
+so a sub-request behaves exactly like the top-level call it stands for.
+
+Endpoints (``/services/data/vXX.X/`` prefix; ``tooling/`` variants share the
+same store):
+
+* ``query`` / ``queryAll`` / ``tooling/query`` with ``nextRecordsUrl`` paging
+  (``Sforce-Query-Options: batchSize=N`` honored, default ``query_batch_size``);
+* ``sobjects/{Object}`` POST, ``sobjects/{Object}/{id}`` GET/PATCH/DELETE,
+  ``sobjects/{Object}/describe`` (fields seen on stored records, plus any
+  :meth:`App.register_schema` entries);
+* ``composite/sobjects`` POST/PATCH/DELETE (``allOrNone``);
+* ``composite`` (``@{ref.field}`` references), ``composite/batch``,
+  ``composite/graph``;
+* ``limits`` and the version list at ``/services/data/``;
+* Bulk API 2.0 ``jobs/query`` / ``jobs/ingest`` in ``bulk.py``;
+* the Revenue Cloud actions in ``revenue.py``.
+
+Faults and latency are applied by the HTTP layer to top-level requests only.
+"""
+
+import heapq
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from scripts.sf_standin import soql as _soql
+from scripts.sf_standin.store import Store, StoreError
+
+API_VERSIONS = ("62.0", "63.0", "64.0", "65.0", "66.0", "67.0")
+DEFAULT_QUERY_BATCH = 2000
+_VERSIONED = re.compile(r"^/services/data/v(\d+\.\d+)(/.*)?$")
+_REFERENCE = re.compile(r"@\{([^}]+)\}")
+
+Response = Tuple[int, Any, Dict[str, str]]
+
+
+def error(status: int, code: str, message: str) -> Response:
+    return status, [{"errorCode": code, "message": message}], {}
+
+
+class App:
+    """The stand-in org: a :class:`Store` plus request routing.
+
+    ``async_delay`` seconds pass before asynchronous effects (activation
+    fan-out, invoice generation, tracker completion) land; they are applied
+    lazily at the start of the next request after they fall due.
+    """
+
+    def __init__(self, store: Optional[Store] = None, *, query_batch_size: int = DEFAULT_QUERY_BATCH,
+                 async_delay: float = 0.0, async_failure_rate: float = 0.0,
+                 rng=None, clock: Callable[[], float] = time.monotonic):
+        import random
+
+        self.store = store or Store()
+        self.query_batch_size = query_batch_size
+        self.async_delay = async_delay
+        self.async_failure_rate = async_failure_rate
+        self.rng = rng or random.Random(0)
+        self.clock = clock
+        self._cursors: Dict[str, Tuple[List[Dict[str, Any]], int, int]] = {}
+        self._pending: List[Tuple[float, int, Callable[[], None]]] = []
+        self._pending_seq = itertools.count()
+        self._lock = threading.RLock()
+        self.requests = 0
+        self.schema: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        from scripts.sf_standin import bulk, revenue
+
+        self.bulk = bulk.Bulk(self)
+        self.revenue = revenue.Revenue(self)
+
+    # ----- async effects ---------------------------------------------------------
+    def defer(self, effect: Callable[[], None]) -> None:
+        """Run ``effect`` once ``async_delay`` has passed (immediately when 0)."""
+        if self.async_delay <= 0:
+            effect()
+            return
+        with self._lock:
+            heapq.heappush(self._pending, (self.clock() + self.async_delay,
+                                           next(self._pending_seq), effect))
+
+    def run_due(self) -> None:
+        with self._lock:
+            now = self.clock()
+            while self._pending and self._pending[0][0] <= now:
+                _, _, effect = heapq.heappop(self._pending)
+                effect()
+
+    def async_fails(self) -> bool:
+        return self.async_failure_rate > 0 and self.rng.random() < self.async_failure_rate
+
+    # ----- dispatch ----------------------------------------------------------------
+    def handle(self, method: str, path: str, params: Optional[Dict[str, str]] = None,
+               headers: Optional[Dict[str, str]] = None, body: Any = None) -> Response:
+        method = method.upper()
+        params = dict(params or {})
+        if "?" in path:
+            split = urlsplit(path)
+            path = split.path
+            params.update({k: v[-1] for k, v in parse_qs(split.query).items()})
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        self.run_due()
+        with self._lock:
+            self.requests += 1
+        if path.rstrip("/") == "/services/data":
+            return 200, [{"version": v, "url": f"/services/data/v{v}", "label": "stand-in"}
+                         for v in API_VERSIONS], {}
+        m = _VERSIONED.match(path)
+        if not m:
+            return error(404, "NOT_FOUND", "The requested resource does not exist")
+        version, rest = m.group(1), (m.group(2) or "/").strip("/")
+        parts = rest.split("/") if rest else []
+        if parts[:1] == ["tooling"]:
+            parts = parts[1:]
+        try:
+            return self._route(method, version, parts, params, headers, body)
+        except StoreError as exc:
+            status = 404 if exc.error_code == "NOT_FOUND" else 400
+            return status, [{"errorCode": exc.error_code, "message": exc.message,
+                             "fields": exc.fields}], {}
+        except _soql.SoqlError as exc:
+            return error(400, "MALFORMED_QUERY", str(exc))
+
+    def _route(self, method, version, parts, params, headers, body) -> Response:
+        head = parts[0] if parts else ""
+        if head in ("query", "queryAll"):
+            if len(parts) == 2:
+                return self._query_more(version, parts[1])
+            if method != "GET" or "q" not in params:
+                return error(400, "MALFORMED_QUERY", "query requires GET with q=")
+            return self._query(version, params["q"], headers)
+        if head == "sobjects" and len(parts) >= 2:
+            return self._sobjects(method, version, parts[1], parts[2] if len(parts) > 2 else None,
+                                  params, body)
+        if head == "composite":
+            sub = parts[1] if len(parts) > 1 else ""
+            if sub == "sobjects":
+                return self._collections(method, params, body)
+            if sub == "batch" and method == "POST":
+                return self._composite_batch(body)
+            if sub == "graph" and method == "POST":
+                return self._composite_graph(body)
+            if sub == "" and method == "POST":
+                return self._composite(body)
+        if head == "limits":
+            return 200, {"DailyApiRequests": {"Max": 5000000,
+                                              "Remaining": 5000000 - self.requests}}, {}
+        handled = self.bulk.route(method, version, parts, params, body)
+        if handled is None:
+            handled = self.revenue.route(method, version, parts, body)
+        if handled is not None:
+            return handled
+        return error(404, "NOT_FOUND", f"The requested resource does not exist: {'/'.join(parts)}")
+
+    # ----- query -------------------------------------------------------------------
+    def _batch_size(self, headers: Dict[str, str]) -> int:
+        m = re.search(r"batchSize=(\d+)", headers.get("sforce-query-options", ""))
+        if m:
+            return max(200, min(int(m.group(1)), 2000))
+        return self.query_batch_size
+
+    def _page(self, version: str, rows: List[Dict[str, Any]], total: int, start: int,
+              size: int) -> Response:
+        end = start + size
+        body: Dict[str, Any] = {"totalSize": total, "done": end >= len(rows),
+                                "records": rows[start:end]}
+        if end < len(rows):
+            locator = f"01g{uuid.uuid4().hex[:12]}"
+            with self._lock:
+                self._cursors[locator] = (rows, end, size)
+            body["nextRecordsUrl"] = f"/services/data/v{version}/query/{locator}-{end}"
+        return 200, body, {}
+
+    def _query(self, version: str, text: str, headers: Dict[str, str]) -> Response:
+        total, rows = self.store.query(text)
+        return self._page(version, rows, total, 0, self._batch_size(headers))
+
+    def _query_more(self, version: str, locator: str) -> Response:
+        key = locator.rsplit("-", 1)[0]
+        with self._lock:
+            cursor = self._cursors.pop(key, None)
+        if cursor is None:
+            return error(400, "INVALID_QUERY_LOCATOR", "invalid query locator")
+        rows, start, size = cursor
+        return self._page(version, rows, len(rows), start, size)
+
+    # ----- sobjects ----------------------------------------------------------------
+    def _sobjects(self, method, version, sobject, record_id, params, body) -> Response:
+        store = self.store
+        if record_id is None:
+            if method != "POST":
+                return error(405, "METHOD_NOT_ALLOWED", f"{method} not allowed")
+            new_id = store.create(sobject, body or {})
+            return 201, {"id": new_id, "success": True, "errors": []}, {}
+        if method == "GET" and record_id == "describe":
+            return self._describe(sobject)
+        if method == "GET":
+            found = store.get(record_id)
+            if found is None or found[0].lower() != sobject.lower():
+                return error(404, "NOT_FOUND", "The requested resource does not exist")
+            record = found[1]
+            if params.get("fields"):
+                wanted = [f.strip() for f in params["fields"].split(",")]
+                record = {"Id": record["Id"], **{f: record.get(f) for f in wanted}}
+            return 200, {"attributes": {"type": found[0],
+                                        "url": f"/services/data/v{version}/sobjects/{found[0]}/{record['Id']}"},
+                         **record}, {}
+        if method == "PATCH":
+            store.update(record_id, body or {}, sobject)
+            return 204, None, {}
+        if method == "DELETE":
+            try:
+                store.delete(record_id, sobject)
+            except StoreError:
+                return error(404, "NOT_FOUND", "The requested resource does not exist")
+            return 204, None, {}
+        return error(405, "METHOD_NOT_ALLOWED", f"{method} not allowed")
+
+    def register_schema(self, sobject: str, fields: List[Dict[str, Any]]) -> None:
+        """Describe entries (``type``, ``referenceTo``, ...) merged into ``sobject``'s describe."""
+        self.schema.setdefault(sobject.lower(), {}).update({f["name"]: dict(f) for f in fields})
+
+    def _describe(self, sobject: str) -> Response:
+        """The fields seen on ``sobject``'s records, plus any registered schema."""
+        records = self.store.find(sobject)
+        registered = self.schema.get(sobject.lower(), {})
+        if not records and not registered:
+            return error(404, "NOT_FOUND", f"The requested resource does not exist: {sobject}")
+        fields: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            fields.update({n: {"name": n} for n in record if n not in fields})
+        fields.update(registered)
+        return 200, {"name": sobject, "fields": list(fields.values())}, {}
+
+    def _collections(self, method, params, body) -> Response:
+        body = body or {}
+        if method == "DELETE":
+            ids = [i for i in (params.get("ids") or "").split(",") if i]
+            all_or_none = str(params.get("allOrNone", "false")).lower() == "true"
+            if len(ids) > 200:
+                return error(400, "EXCEEDED_ID_LIMIT", "record limit reached. cannot submit more than 200 records")
+            return self._each(ids, lambda i: (self.store.delete(i), i)[1], all_or_none)
+        records = body.get("records") or []
+        if len(records) > 200:
+            return error(400, "EXCEEDED_ID_LIMIT", "record limit reached. cannot submit more than 200 records")
+        all_or_none = bool(body.get("allOrNone"))
+        if method == "POST":
+            return self._each(records, lambda r: self.store.create(
+                (r.get("attributes") or {}).get("type") or "", r), all_or_none)
+        if method == "PATCH":
+            return self._each(records, lambda r: (self.store.update(r["Id"], r), r["Id"])[1],
+                              all_or_none)
+        return error(405, "METHOD_NOT_ALLOWED", f"{method} not allowed")
+
+    def _each(self, items, op, all_or_none: bool) -> Response:
+        results = []
+        if all_or_none:
+            try:
+                with self.store.atomic():
+                    for item in items:
+                        results.append({"id": op(item), "success": True, "errors": []})
+            except StoreError as exc:
+                failed = len(results)
+                results = [{"id": None, "success": False, "errors": [
+                    exc.as_error() if i == failed else
+                    {"statusCode": "ALL_OR_NONE_OPERATION_ROLLED_BACK",
+                     "message": "Record rolled back because not all records were valid and the request was using AllOrNone header",
+                     "fields": []}]} for i in range(len(items))]
+            return 200, results, {}
+        for item in items:
+            try:
+                results.append({"id": op(item), "success": True, "errors": []})
+            except StoreError as exc:
+                ref = item if isinstance(item, str) else None
+                results.append({"id": ref, "success": False, "errors": [exc.as_error()]})
+        return 200, results, {}
+
+    # ----- composite ---------------------------------------------------------------
+    def _sub(self, method: str, url: str, body: Any, headers=None) -> Response:
+        return self.handle(method, url, headers=headers, body=body)
+
+    def _composite_batch(self, body) -> Response:
+        requests = (body or {}).get("batchRequests") or []
+        if len(requests) > 25:
+            return error(400, "INVALID_BATCH_REQUEST", "A batch cannot contain more than 25 requests")
+        halt = bool((body or {}).get("haltOnError"))
+        results, has_errors = [], False
+        for req in requests:
+            if halt and has_errors:
+                results.append({"statusCode": 412, "result": [{
+                    "errorCode": "BATCH_PROCESSING_HALTED",
+                    "message": "Batch processing halted per request"}]})
+                continue
+            url = req.get("url", "")
+            if not url.startswith("/services/data"):
+                url = "/services/data/" + url.lstrip("/")
+            status, result, _ = self._sub(req.get("method", "GET"), url, req.get("richInput"))
+            has_errors = has_errors or status >= 400
+            results.append({"statusCode": status, "result": result})
+        return 200, {"hasErrors": has_errors, "results": results}, {}
+
+    @staticmethod
+    def _resolve(value: Any, refs: Dict[str, Any]) -> Any:
+        if isinstance(value, dict):
+            return {k: App._resolve(v, refs) for k, v in value.items()}
+        if isinstance(value, list):
+            return [App._resolve(v, refs) for v in value]
+        if not isinstance(value, str) or "@{" not in value:
+            return value
+
+        def lookup(expr: str) -> Any:
+            ref, _, rest = expr.partition(".")
+            node = refs.get(ref)
+            for part in re.findall(r"[^.\[\]]+", rest):
+                if isinstance(node, list):
+                    node = node[int(part)] if part.isdigit() and int(part) < len(node) else None
+                elif isinstance(node, dict):
+                    node = node.get(part)
+                else:
+                    node = None
+            if node is None:
+                raise StoreError("INVALID_REFERENCE", f"unresolved reference @{{{expr}}}")
+            return node
+
+        whole = _REFERENCE.fullmatch(value)
+        if whole:
+            return lookup(whole.group(1))
+        return _REFERENCE.sub(lambda m: str(lookup(m.group(1))), value)
+
+    def _run_chain(self, subrequests, all_or_none: bool) -> Tuple[List[Dict[str, Any]], bool]:
+        refs: Dict[str, Any] = {}
+        responses: List[Dict[str, Any]] = []
+        failed = False
+        for req in subrequests:
+            ref = req.get("referenceId")
+            if failed and all_or_none:
+                responses.append({"body": [{"errorCode": "PROCESSING_HALTED",
+                                            "message": "The transaction was rolled back since another operation in the same transaction failed."}],
+                                  "httpHeaders": {}, "httpStatusCode": 400, "referenceId": ref})
+                continue
+            try:
+                url = self._resolve(req.get("url", ""), refs)
+                body = self._resolve(req.get("body"), refs)
+                status, result, _ = self._sub(req.get("method", "GET"), url, body)
+            except StoreError as exc:
+                status, result = 400, [{"errorCode": exc.error_code, "message": exc.message}]
+            if status < 300 and ref:
+                refs[ref] = result
+            failed = failed or status >= 400
+            responses.append({"body": result, "httpHeaders": {}, "httpStatusCode": status,
+                              "referenceId": ref})
+        return responses, failed
+
+    def _composite(self, body) -> Response:
+        body = body or {}
+        subrequests = body.get("compositeRequest") or []
+        if len(subrequests) > 25:
+            return error(400, "INVALID_BATCH_REQUEST", "A composite request cannot contain more than 25 subrequests")
+        all_or_none = bool(body.get("allOrNone"))
+        if not all_or_none:
+            responses, _ = self._run_chain(subrequests, False)
+            return 200, {"compositeResponse": responses}, {}
+        try:
+            with self.store.atomic():
+                responses, failed = self._run_chain(subrequests, True)
+                if failed:
+                    raise _RolledBack(responses)
+        except _RolledBack as rb:
+            responses = rb.responses
+        return 200, {"compositeResponse": responses}, {}
+
+    def _composite_graph(self, body) -> Response:
+        graphs = (body or {}).get("graphs") or []
+        out = []
+        for graph in graphs:
+            try:
+                with self.store.atomic():
+                    responses, failed = self._run_chain(graph.get("compositeRequest") or [], True)
+                    if failed:
+                        raise _RolledBack(responses)
+                ok = True
+            except _RolledBack as rb:
+                responses, ok = rb.responses, False
+            out.append({"graphId": graph.get("graphId"), "isSuccessful": ok,
+                        "graphResponse": {"compositeResponse": responses}})
+        return 200, {"graphs": out}, {}
+
+
+class _RolledBack(Exception):
+    def __init__(self, responses):
+        super().__init__("rolled back")
+        self.responses = responses
+
+
+def decode_body(raw: bytes, content_type: str = "") -> Any:
+    """JSON request body, or the raw text of a ``text/csv`` upload (Bulk API)."""
+    if not raw:
+        return None
+    if content_type.split(";")[0].strip().lower() == "text/csv":
+        return raw.decode("utf-8")
+    return json.loads(raw.decode("utf-8"))
@@ -0,0 +1,263 @@
+"""Revenue Cloud endpoints and automation for the stand-in org.
+
+Only the contract ``scripts/txn_data_harness/lifecycle.py`` relies on is
+modelled — the record shapes it writes and the rows it polls for — not
+pricing, tax or the engines behind them:
+
+* ``connect/rev/sales-transaction/actions/place`` inserts the graph (Quote or
+  Order header plus lines, ``@{ref.id}`` references), taking a line's
+  ``UnitPrice`` from its PricebookEntry;
+* ``actions/standard/createOrderFromQuote`` copies a Quote into an Order with
+  an Add ``OrderAction``, one OrderItem per QuoteLineItem and the
+  ``AppUsageAssignment`` that gates assetization;
+* ``Order.Status → 'Activated'`` requires a shipping address and, for an RLM
+  order, later creates per OrderItem a ReadyForInvoicing BillingSchedule and
+  an Asset / AssetAction ('Initial Sale') / AssetActionSource chain;
+* ``commerce/invoicing/invoices/collection/actions/generate`` later creates a
+  Draft Invoice with one InvoiceLine per schedule (no statusURL);
+* ``.../actions/post`` returns an AsyncOperationTracker ``statusURL`` that
+  later reads Completed (or Failed, at ``async_failure_rate``) with the
+  invoice Posted and numbered;
+* ``.../actions/ingest`` inserts an invoice graph (camelCase field names) and
+  returns a tracker per invoice.
+
+"Later" is the app's ``async_delay``.
+"""
+
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+
+from scripts.sf_standin.store import StoreError
+
+_PLACE = ("connect", "rev", "sales-transaction", "actions", "place")
+_CREATE_ORDER = ("actions", "standard", "createOrderFromQuote")
+_INVOICE_ACTIONS = ("commerce", "invoicing", "invoices", "collection", "actions")
+
+
+def _amount(unit_price: Any, quantity: Any) -> float:
+    try:
+        return round(float(unit_price or 0) * float(quantity or 0), 2)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Revenue:
+    """Routes the Revenue Cloud actions for an :class:`~scripts.sf_standin.rest.App`."""
+
+    def __init__(self, app):
+        self.app = app
+        self.store = app.store
+        self.store.on_update(self._on_update)
+
+    def route(self, method: str, version: str, parts: List[str],
+              body: Any) -> Optional[Tuple[int, Any, Dict[str, str]]]:
+        key = tuple(parts)
+        if method != "POST":
+            return None
+        if key == _PLACE:
+            return 200, self.place(body or {}), {}
+        if key == _CREATE_ORDER:
+            return 200, self.create_order_from_quote(body or {}), {}
+        if key[:-1] == _INVOICE_ACTIONS:
+            action = key[-1]
+            if action == "generate":
+                return 200, self.generate(body or {}), {}
+            if action == "post":
+                return 200, self.post(version, body or {}), {}
+            if action == "ingest":
+                return 200, self.ingest(version, body or {}), {}
+        return None
+
+    # ----- helpers ----------------------------------------------------------------
+    def _get(self, record_id: Any) -> Dict[str, Any]:
+        found = self.store.get(record_id) if isinstance(record_id, str) else None
+        if found is None:
+            raise StoreError("INVALID_CROSS_REFERENCE_KEY", f"invalid cross reference id: {record_id}")
+        return found[1]
+
+    def _tracker(self, version: str, on_complete) -> Tuple[str, str]:
+        tracker_id = self.store.create("AsyncOperationTracker", {"Status": "InProgress"})
+
+        def finish():
+            failed = self.app.async_fails()
+            if not failed:
+                on_complete()
+            self.store.update(tracker_id, {"Status": "Failed" if failed else "Completed"})
+
+        self.app.defer(finish)
+        return tracker_id, f"/services/data/v{version}/sobjects/AsyncOperationTracker/{tracker_id}"
+
+    def _insert_graph(self, records: List[Dict[str, Any]], field_name=lambda k: k) -> Dict[str, str]:
+        refs: Dict[str, str] = {}
+        for item in records:
+            record = dict(item.get("record") or {})
+            sobject = (record.pop("attributes", None) or {}).get("type") or ""
+            fields = {}
+            for key, value in record.items():
+                if isinstance(value, str) and value.startswith("@{") and value.endswith(".id}"):
+                    ref = value[2:-4]
+                    if ref not in refs:
+                        raise StoreError("INVALID_REFERENCE", f"unresolved reference {value}")
+                    value = refs[ref]
+                fields[field_name(key)] = value
+            refs[item.get("referenceId") or str(len(refs))] = self._create(sobject, fields)
+        return refs
+
+    def _create(self, sobject: str, fields: Dict[str, Any]) -> str:
+        if sobject == "Quote":
+            if fields.get("QuoteAccountId"):
+                fields.setdefault("AccountId", fields["QuoteAccountId"])
+            fields.setdefault("Status", "Draft")
+        elif sobject == "Order":
+            fields.setdefault("Status", "Draft")
+        elif sobject in ("QuoteLineItem", "OrderItem") and fields.get("PricebookEntryId"):
+            entry = self._get(fields["PricebookEntryId"])
+            fields.setdefault("UnitPrice", entry.get("UnitPrice"))
+            fields.setdefault("Product2Id", entry.get("Product2Id"))
+            fields.setdefault("TotalPrice", _amount(fields.get("UnitPrice"), fields.get("Quantity")))
+        return self.store.create(sobject, fields)
+
+    # ----- sales transactions -------------------------------------------------------
+    def place(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        records = (body.get("graph") or {}).get("records") or []
+        request_id = uuid.uuid4().hex
+        try:
+            with self.store.atomic():
+                refs = self._insert_graph(records)
+        except StoreError as exc:
+            return {"isSuccess": False, "requestIdentifier": request_id,
+                    "errorResponse": [{"errorCode": exc.error_code, "message": exc.message}]}
+        first = next(iter(refs.values()), None)
+        return {"isSuccess": True, "salesTransactionId": first, "requestIdentifier": request_id}
+
+    def create_order_from_quote(self, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        out = []
+        for entry in body.get("inputs") or []:
+            try:
+                with self.store.atomic():
+                    out.append(self._order_from_quote(entry.get("quoteRecordId")))
+            except StoreError as exc:
+                out.append({"actionName": "createOrderFromQuote", "isSuccess": False,
+                            "errors": [{"statusCode": exc.error_code, "message": exc.message}],
+                            "outputValues": None})
+        return out
+
+    def _order_from_quote(self, quote_id: Any) -> Dict[str, Any]:
+        quote = self._get(quote_id)
+        order_id = self.store.create("Order", {
+            "AccountId": quote.get("AccountId") or quote.get("QuoteAccountId"),
+            "Pricebook2Id": quote.get("Pricebook2Id"), "QuoteId": quote["Id"],
+            "Status": "Draft", "EffectiveDate": quote.get("StartDate"),
+            "Description": quote.get("Description"),
+        })
+        action_id = self.store.create("OrderAction", {"OrderId": order_id, "Type": "Add"})
+        for line in self.store.find("QuoteLineItem", QuoteId=quote["Id"]):
+            item = {k: line.get(k) for k in (
+                "Product2Id", "PricebookEntryId", "Quantity", "UnitPrice", "TotalPrice",
+                "EndDate", "SubscriptionTerm", "Discount", "PeriodBoundary", "BillingFrequency",
+            ) if line.get(k) is not None}
+            self.store.create("OrderItem", {**item, "OrderId": order_id, "OrderActionId": action_id,
+                                            "QuoteLineItemId": line["Id"],
+                                            "ServiceDate": line.get("StartDate")})
+        self.store.create("AppUsageAssignment", {"AppUsageType": "RevenueLifecycleManagement",
+                                                 "RecordId": order_id})
+        number = self.store.get(order_id)[1].get("OrderNumber")
+        return {"actionName": "createOrderFromQuote", "isSuccess": True, "errors": None,
+                "outputValues": {"orderId": order_id, "orderNumber": number}}
+
+    # ----- activation -------------------------------------------------------------------
+    def _on_update(self, sobject: str, record_id: str, before: Dict[str, Any],
+                   after: Dict[str, Any]) -> None:
+        if sobject != "Order" or after.get("Status") != "Activated" or before.get("Status") == "Activated":
+            return
+        if not (after.get("ShippingStreet") and after.get("ShippingCity")):
+            raise StoreError("FAILED_ACTIVATION",
+                             "Order can't be activated without a shipping address.",
+                             ["ShippingAddress"])
+        if not self.store.find("AppUsageAssignment", RecordId=record_id):
+            return  # not an RLM order: activation is a silent no-op downstream
+        self.app.defer(lambda: self._assetize(record_id, after.get("AccountId")))
+
+    def _assetize(self, order_id: str, account_id: Any) -> None:
+        with self.store.atomic():
+            for item in self.store.find("OrderItem", OrderId=order_id):
+                self.store.create("BillingSchedule", {
+                    "ReferenceEntityId": order_id, "ReferenceEntityItemId": item["Id"],
+                    "Status": "ReadyForInvoicing",
+                    "TotalAmount": item.get("TotalPrice", _amount(item.get("UnitPrice"),
+                                                                  item.get("Quantity"))),
+                })
+                product = self.store.get(item.get("Product2Id") or "")
+                asset_id = self.store.create("Asset", {
+                    "AccountId": account_id, "Product2Id": item.get("Product2Id"),
+                    "Name": product[1].get("Name") if product else "Asset",
+                    "Quantity": item.get("Quantity"),
+                })
+                action_id = self.store.create("AssetAction", {"AssetId": asset_id,
+                                                              "CategoryEnum": "Initial Sale"})
+                self.store.create("AssetActionSource", {"AssetActionId": action_id,
+                                                        "ReferenceEntityItemId": item["Id"]})
+
+    # ----- invoicing --------------------------------------------------------------------
+    def generate(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        schedule_ids = list(body.get("billingScheduleIds") or [])
+        request_id = uuid.uuid4().hex
+        try:
+            schedules = [self._get(i) for i in schedule_ids]
+        except StoreError as exc:
+            return {"requestIdentifier": request_id, "success": False,
+                    "errors": [{"code": exc.error_code, "message": exc.message}]}
+
+        def create_invoice():
+            with self.store.atomic():
+                invoice_id = self.store.create("Invoice", {
+                    "Status": "Draft", "InvoiceDate": body.get("invoiceDate"),
+                    "TotalAmount": round(sum(float(s.get("TotalAmount") or 0) for s in schedules), 2),
+                })
+                for schedule in schedules:
+                    self.store.create("InvoiceLine", {
+                        "InvoiceId": invoice_id, "BillingScheduleId": schedule["Id"],
+                        "ChargeAmount": schedule.get("TotalAmount"),
+                    })
+                    self.store.update(schedule["Id"], {"Status": "CompletelyBilled"})
+
+        self.app.defer(create_invoice)
+        return {"requestIdentifier": request_id, "success": True, "errors": []}
+
+    def post(self, version: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        invoice_ids = list(body.get("invoiceIds") or [])
+        try:
+            for invoice_id in invoice_ids:
+                if self._get(invoice_id).get("Status") != "Draft":
+                    raise StoreError("INVALID_STATUS", f"invoice {invoice_id} is not Draft")
+        except StoreError as exc:
+            return {"success": False, "errors": [{"code": exc.error_code, "message": exc.message}]}
+
+        def post_all():
+            for invoice_id in invoice_ids:
+                self.store.update(invoice_id, {
+                    "Status": "Posted",
+                    "InvoiceNumber": self.store.next_number("Invoice", "InvoiceNumber", "INV-{:08d}"),
+                })
+
+        _, status_url = self._tracker(version, post_all)
+        return {"success": True, "statusURL": status_url, "errors": []}
+
+    def ingest(self, version: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        out = []
+        for invoice in body.get("invoices") or []:
+            request_id = uuid.uuid4().hex
+            records = (invoice.get("graph") or {}).get("records") or []
+            try:
+                with self.store.atomic():
+                    refs = self._insert_graph(records, lambda k: k[:1].upper() + k[1:])
+            except StoreError as exc:
+                out.append({"invoiceId": None, "requestIdentifier": request_id, "statusURL": None,
+                            "success": False,
+                            "errors": [{"code": exc.error_code, "message": exc.message}]})
+                continue
+            invoice_id = next(iter(refs.values()), None)
+            _, status_url = self._tracker(version, lambda: None)
+            out.append({"invoiceId": invoice_id, "requestIdentifier": request_id,
+                        "statusURL": status_url, "success": True, "errors": []})
+        return {"invoices": out}
@@ -0,0 +1,105 @@
+"""Seed data for the stand-in org.
+
+:func:`seed_demo` loads the minimum catalog and accounts that
+``scripts/txn_data_harness/discovery.py`` resolves before a run: the standard
+Pricebook2, a legal entity, open/closed OpportunityStages, selling models,
+QB-prefixed products with active standard PricebookEntries, billing-ready
+accounts (full billing/shipping address, BillingAccount, Contact) and one
+taxable plus one non-taxable Active TaxTreatment. ``accounts=`` scales the
+account count for volume runs.
+
+:func:`seed_json` loads a file of the form::
+
+    {"records": [{"ref": "acme", "type": "Account", "fields": {"Name": "Acme"}},
+                 {"type": "Contact", "fields": {"AccountId": "@acme", "LastName": "X"}}],
+     "bulk": [{"type": "Asset", "count": 50000,
+               "fields": {"Name": "Asset {n}", "AccountId": "@acme"}}]}
+
+``@ref`` values resolve to earlier record ids; ``{n}`` in a bulk string field
+is the 1-based row number.
+"""
+
+from typing import Any, Dict
+
+from scripts.sf_standin.store import Store
+
+DEMO_PRODUCTS = (
+    # (SKU, name, list price, selling model key)
+    ("QB-BLD", "QuantumBit Builder", 450.0, "term"),
+    ("QB-DB", "QuantumBit Database", 120.0, "evergreen"),
+    ("QB-SETUP", "QuantumBit Onboarding", 1500.0, "onetime"),
+)
+
+_SELLING_MODELS = {
+    "term": {"Name": "Term Annual", "SellingModelType": "TermDefined",
+             "PricingTerm": 1, "PricingTermUnit": "Annual"},
+    "evergreen": {"Name": "Evergreen Monthly", "SellingModelType": "Evergreen",
+                  "PricingTerm": 1, "PricingTermUnit": "Months"},
+    "onetime": {"Name": "One Time", "SellingModelType": "OneTime"},
+}
+
+
+def seed_demo(store: Store, *, accounts: int = 3) -> Dict[str, Any]:
+    """Load the demo org; return the ids a test needs (``pricebook``, ``accounts``...)."""
+    ids: Dict[str, Any] = {"accounts": [], "products": {}}
+    with store.atomic():
+        ids["pricebook"] = store.create("Pricebook2", {"Name": "Standard Price Book",
+                                                       "IsStandard": True, "IsActive": True})
+        ids["legal_entity"] = store.create("LegalEntity", {"Name": "Default Legal Entity - US"})
+        for label, closed in (("Prospecting", False), ("Negotiation", False),
+                              ("Closed Won", True), ("Closed Lost", True)):
+            store.create("OpportunityStage", {"MasterLabel": label, "IsActive": True,
+                                              "IsClosed": closed})
+        models = {key: store.create("ProductSellingModel", {**fields, "Status": "Active"})
+                  for key, fields in _SELLING_MODELS.items()}
+        for sku, name, price, model in DEMO_PRODUCTS:
+            product_id = store.create("Product2", {"Name": name, "StockKeepingUnit": sku,
+                                                   "ProductCode": sku, "IsActive": True})
+            entry_id = store.create("PricebookEntry", {
+                "Pricebook2Id": ids["pricebook"], "Product2Id": product_id,
+                "ProductSellingModelId": models[model], "UnitPrice": price, "IsActive": True,
+            })
+            ids["products"][sku] = {"id": product_id, "pricebook_entry_id": entry_id}
+        ids["tax_taxable"] = store.create("TaxTreatment", {"Name": "Standard Taxable",
+                                                           "IsTaxable": True, "Status": "Active"})
+        ids["tax_exempt"] = store.create("TaxTreatment", {"Name": "Non-Taxable",
+                                                          "IsTaxable": False, "Status": "Active"})
+        for n in range(1, accounts + 1):
+            address = {"Street": f"{n} Market St", "City": "San Francisco", "State": "CA",
+                       "PostalCode": "94105", "Country": "US"}
+            account_id = store.create("Account", {
+                "Name": f"Stand-in Account {n:04d}", "CurrencyIsoCode": "USD",
+                **{f"Billing{k}": v for k, v in address.items()},
+                **{f"Shipping{k}": v for k, v in address.items()},
+            })
+            store.create("BillingAccount", {"Name": f"Stand-in Account {n:04d}",
+                                            "AccountId": account_id})
+            store.create("Contact", {"AccountId": account_id, "LastName": f"Buyer {n}",
+                                     "Email": f"buyer{n}@example.invalid"})
+            ids["accounts"].append(account_id)
+    return ids
+
+
+def _resolve(value: Any, refs: Dict[str, str], n: int = 0) -> Any:
+    if isinstance(value, str):
+        if value.startswith("@") and value[1:] in refs:
+            return refs[value[1:]]
+        if n and "{n}" in value:
+            return value.replace("{n}", str(n))
+    return value
+
+
+def seed_json(store: Store, data: Dict[str, Any]) -> Dict[str, str]:
+    """Load a seed document (see module docstring); return ``ref -> id``."""
+    refs: Dict[str, str] = {}
+    with store.atomic():
+        for item in data.get("records") or []:
+            fields = {k: _resolve(v, refs) for k, v in (item.get("fields") or {}).items()}
+            new_id = store.create(item["type"], fields)
+            if item.get("ref"):
+                refs[item["ref"]] = new_id
+        for item in data.get("bulk") or []:
+            template = item.get("fields") or {}
+            for n in range(1, int(item.get("count", 0)) + 1):
+                store.create(item["type"], {k: _resolve(v, refs, n) for k, v in template.items()})
+    return refs
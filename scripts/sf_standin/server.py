@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""HTTP front end for the Salesforce REST stand-in.
+
+Serves :class:`scripts.sf_standin.rest.App` over HTTP/1.1 keep-alive (one
+thread per connection) and adds the behaviour a load test wants to dial in:
+
+* ``--latency-ms`` / ``--jitter-ms`` — per-request service time;
+* ``--rate-429`` / ``--rate-503`` — fraction of requests refused with
+  ``REQUEST_LIMIT_EXCEEDED`` / ``SERVER_UNAVAILABLE`` before they touch the
+  store (so a retried request is never applied twice);
+* ``--async-delay`` / ``--async-failure-rate`` — when activation, invoice
+  generation and trackers land, and how often a tracker reads Failed;
+* ``--query-batch-size`` — records per query page before ``nextRecordsUrl``.
+
+Every response carries ``Sforce-Limit-Info: api-usage=N/LIMIT``. Any bearer
+token is accepted. ``Content-Encoding: gzip`` request bodies are decompressed.
+
+Usage::
+
+    python scripts/sf_standin/server.py --seed-demo --port 8765
+    RLM_SF_STANDIN_URL=http://127.0.0.1:8765 \\
+        python scripts/txn_data_harness/generate.py --target-org standin ...
+
+In tests, :func:`serve` runs the server on an ephemeral port in a background
+thread and yields the running :class:`StandinServer`.
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from scripts.sf_standin import seed as _seed  # noqa: E402
+from scripts.sf_standin.rest import DEFAULT_QUERY_BATCH, App, decode_body, error  # noqa: E402
+from scripts.sf_standin.store import Store  # noqa: E402
+
+API_LIMIT = 5_000_000
+
+
+@dataclass
+class Faults:
+    """Injected latency and failure rates (fractions in ``[0, 1]``)."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_503: float = 0.0
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, app: App, faults: Optional[Faults] = None,
+                 rng: Optional[random.Random] = None):
+        super().__init__(address, _Handler)
+        self.app = app
+        self.faults = faults or Faults()
+        self.rng = rng or random.Random(0)
+        self.rng_lock = threading.Lock()
+        self.injected = {"429": 0, "503": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def draw(self) -> float:
+        with self.rng_lock:
+            return self.rng.random()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandinServer
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler signature
+        pass
+
+    def _handle(self) -> None:
+        server = self.server
+        faults = server.faults
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if raw and (self.headers.get("Content-Encoding") or "").lower() == "gzip":
+            raw = gzip.decompress(raw)
+        if faults.latency_ms or faults.jitter_ms:
+            delay = faults.latency_ms + (server.draw() * faults.jitter_ms if faults.jitter_ms else 0)
+            time.sleep(delay / 1000.0)
+        roll = server.draw() if (faults.rate_429 or faults.rate_503) else 1.0
+        if roll < faults.rate_429:
+            server.injected["429"] += 1
+            status, body, headers = error(429, "REQUEST_LIMIT_EXCEEDED",
+                                          "TotalRequests Limit exceeded.")
+        elif roll < faults.rate_429 + faults.rate_503:
+            server.injected["503"] += 1
+            status, body, headers = error(503, "SERVER_UNAVAILABLE", "Server is temporarily unavailable")
+        else:
+            split = urlsplit(self.path)
+            params = {k: v[-1] for k, v in parse_qs(split.query).items()}
+            try:
+                payload = decode_body(raw, self.headers.get("Content-Type") or "")
+            except ValueError:
+                status, body, headers = error(400, "JSON_PARSER_ERROR", "malformed JSON body")
+            else:
+                try:
+                    status, body, headers = server.app.handle(self.command, split.path, params,
+                                                              dict(self.headers), payload)
+                except Exception as exc:  # a stand-in bug must not hang the client
+                    status, body, headers = error(500, "UNKNOWN_EXCEPTION", repr(exc))
+        if isinstance(body, str):  # Bulk API CSV, written verbatim
+            data = body.encode("utf-8")
+        else:
+            data = b"" if body is None else json.dumps(body).encode("utf-8")
+        headers = dict(headers)
+        self.send_response(status)
+        self.send_header("Content-Type", headers.pop("Content-Type", "application/json;charset=UTF-8"))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Sforce-Limit-Info", f"api-usage={server.app.requests}/{API_LIMIT}")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = do_PUT = _handle
+
+
+def build_app(db: str = ":memory:", *, query_batch_size: int = DEFAULT_QUERY_BATCH,
+              async_delay: float = 0.0, async_failure_rate: float = 0.0,
+              random_seed: int = 0) -> App:
+    return App(Store(db), query_batch_size=query_batch_size, async_delay=async_delay,
+               async_failure_rate=async_failure_rate, rng=random.Random(random_seed))
+
+
+@contextmanager
+def serve(app: Optional[App] = None, faults: Optional[Faults] = None, *,
+          host: str = "127.0.0.1", port: int = 0, random_seed: int = 0) -> Iterator[StandinServer]:
+    """Run a stand-in server in a background thread for the ``with`` block."""
+    server = StandinServer((host, port), app or build_app(), faults, random.Random(random_seed))
+    thread = threading.Thread(target=server.serve_forever, name="sf-standin", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local Salesforce REST stand-in org.")
+    parser.add_argument("--db", default=":memory:",
+                        help="SQLite file for the records (default: in memory).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed-demo", action="store_true",
+                        help="Load the demo catalog and accounts (see seed.py).")
+    parser.add_argument("--seed-json", action="append", default=[], metavar="PATH",
+                        help="Load records from a seed JSON file (repeatable).")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0,
+                        help="Fraction of requests answered 429 REQUEST_LIMIT_EXCEEDED.")
+    parser.add_argument("--rate-503", type=float, default=0.0,
+                        help="Fraction of requests answered 503 SERVER_UNAVAILABLE.")
+    parser.add_argument("--async-delay", type=float, default=2.0,
+                        help="Seconds before async effects land (default: 2).")
+    parser.add_argument("--async-failure-rate", type=float, default=0.0,
+                        help="Fraction of async trackers that end Failed.")
+    parser.add_argument("--query-batch-size", type=int, default=DEFAULT_QUERY_BATCH)
+    parser.add_argument("--random-seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for name in ("rate_429", "rate_503", "async_failure_rate"):
+        if not 0 <= getattr(args, name) <= 1:
+            parser.error(f"--{name.replace('_', '-')} must be between 0 and 1")
+
+    app = build_app(args.db, query_batch_size=args.query_batch_size,
+                    async_delay=args.async_delay, async_failure_rate=args.async_failure_rate,
+                    random_seed=args.random_seed)
+    if args.seed_demo:
+        _seed.seed_demo(app.store)
+    for path in args.seed_json:
+        _seed.seed_json(app.store, json.loads(Path(path).read_text(encoding="utf-8")))
+    faults = Faults(args.latency_ms, args.jitter_ms, args.rate_429, args.rate_503)
+    server = StandinServer((args.host, args.port), app, faults, random.Random(args.random_seed))
+    print(f"Salesforce stand-in listening on {server.url} (RLM_SF_STANDIN_URL={server.url})",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
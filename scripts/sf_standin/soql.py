@@ -0,0 +1,397 @@
+"""SOQL subset parser for the stand-in org, compiled to SQLite.
+
+Records live in one ``records(id, sobject, seq, data)`` table with the fields
+as a JSON object in ``data``; a SOQL query compiles to a ``SELECT`` over that
+table. Covered, because these tools use it:
+
+* ``SELECT`` fields, dotted relationship fields (``Product2.Name``,
+  ``UsageResource.DefaultUnitOfMeasure.UnitCode``) — ``Rel.Field`` follows the
+  ``RelId`` lookup (``Rel__r`` → ``Rel__c``);
+* aggregates ``COUNT()``, ``COUNT(f)``, ``MIN``/``MAX``/``SUM``/``AVG`` with an
+  optional alias, and ``GROUP BY``;
+* ``WHERE`` with ``AND``/``OR``/``NOT``, parentheses, ``= != <> < <= > >=``,
+  ``LIKE``, ``[NOT] IN (literals)`` and ``[NOT] IN (SELECT f FROM ...)``;
+  string literals, numbers, ``true``/``false``/``null``, ISO dates and
+  ``TODAY``;
+* ``ORDER BY f [ASC|DESC] [NULLS FIRST|LAST], ...``, ``LIMIT``, ``OFFSET``.
+
+Anything else (child subqueries, ``TYPEOF``, ``FIELDS()``, date functions)
+raises :class:`SoqlError`, which the server returns as ``MALFORMED_QUERY``.
+String comparisons are case-insensitive, as in SOQL.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, List, Optional, Tuple
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<str>'(?:\\.|[^'\\])*')
+    | (?P<num>-?\d+(?:\.\d+)?(?![\w:-]))
+    | (?P<dt>\d{4}-\d{2}-\d{2}(?:T[\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?)
+    | (?P<op><=|>=|!=|<>|=|<|>)
+    | (?P<punct>[(),])
+    | (?P<ident>[A-Za-z_][\w.]*)
+    )""", re.VERBOSE)
+
+_AGGREGATES = {"COUNT", "MIN", "MAX", "SUM", "AVG", "COUNT_DISTINCT"}
+_KEYWORDS = {"FROM", "WHERE", "GROUP", "ORDER", "LIMIT", "OFFSET", "BY", "AND", "OR",
+             "NOT", "IN", "LIKE", "ASC", "DESC", "NULLS", "FIRST", "LAST", "SELECT"}
+
+
+class SoqlError(ValueError):
+    """The query is outside the supported subset or malformed."""
+
+
+@dataclass
+class SelectItem:
+    path: List[str] = field(default_factory=list)  # field path; empty for COUNT()
+    func: Optional[str] = None
+    alias: Optional[str] = None
+
+
+@dataclass
+class Query:
+    sobject: str
+    items: List[SelectItem]
+    where: Optional[tuple] = None
+    group_by: List[List[str]] = field(default_factory=list)
+    order_by: List[Tuple[List[str], bool, Optional[bool]]] = field(default_factory=list)
+    limit: Optional[int] = None
+    offset: Optional[int] = None
+
+    @property
+    def aggregate(self) -> bool:
+        return any(i.func for i in self.items)
+
+    @property
+    def count_only(self) -> bool:
+        """``SELECT COUNT() FROM ...`` — Salesforce answers with ``totalSize`` only."""
+        return len(self.items) == 1 and self.items[0].func == "COUNT" and not self.items[0].path
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens, pos, text = [], 0, text.strip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise SoqlError(f"unexpected token near: {text[pos:pos + 30]!r}")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        j = self.i + offset
+        return self.tokens[j] if j < len(self.tokens) else (None, None)
+
+    def kw(self, *words: str) -> bool:
+        kind, value = self.peek()
+        return kind == "ident" and value.upper() in words
+
+    def take(self) -> Tuple[str, str]:
+        tok = self.peek()
+        if tok[0] is None:
+            raise SoqlError("unexpected end of query")
+        self.i += 1
+        return tok
+
+    def expect(self, value: str) -> None:
+        kind, got = self.take()
+        if (got or "").upper() != value.upper():
+            raise SoqlError(f"expected {value}, got {got!r}")
+
+    def ident(self) -> str:
+        kind, value = self.take()
+        if kind != "ident":
+            raise SoqlError(f"expected a field or object name, got {value!r}")
+        return value
+
+    # ----- statement ---------------------------------------------------------
+    def query(self) -> Query:
+        self.expect("SELECT")
+        items = [self.select_item()]
+        while self.peek()[1] == ",":
+            self.take()
+            items.append(self.select_item())
+        self.expect("FROM")
+        sobject = self.ident()
+        q = Query(sobject=sobject, items=items)
+        if self.peek()[0] == "ident" and not self.kw(*_KEYWORDS):
+            self.take()  # object alias: ignored
+        if self.kw("WHERE"):
+            self.take()
+            q.where = self.expr()
+        if self.kw("GROUP"):
+            self.take()
+            self.expect("BY")
+            q.group_by.append(self.ident().split("."))
+            while self.peek()[1] == ",":
+                self.take()
+                q.group_by.append(self.ident().split("."))
+        if self.kw("ORDER"):
+            self.take()
+            self.expect("BY")
+            q.order_by.append(self.order_item())
+            while self.peek()[1] == ",":
+                self.take()
+                q.order_by.append(self.order_item())
+        if self.kw("LIMIT"):
+            self.take()
+            q.limit = self.integer()
+        if self.kw("OFFSET"):
+            self.take()
+            q.offset = self.integer()
+        return q
+
+    def integer(self) -> int:
+        kind, value = self.take()
+        if kind != "num" or not value.isdigit():
+            raise SoqlError(f"expected an integer, got {value!r}")
+        return int(value)
+
+    def select_item(self) -> SelectItem:
+        kind, value = self.peek()
+        if value == "(":
+            raise SoqlError("child relationship subqueries are not supported")
+        name = self.ident()
+        if self.peek()[1] == "(":
+            func = name.upper()
+            if func not in _AGGREGATES:
+                raise SoqlError(f"function {name}() is not supported")
+            self.take()
+            path = [] if self.peek()[1] == ")" else self.ident().split(".")
+            self.expect(")")
+            item = SelectItem(path=path, func=func)
+        else:
+            if name.upper() in ("TYPEOF", "FIELDS"):
+                raise SoqlError(f"{name} is not supported")
+            item = SelectItem(path=name.split("."))
+        if self.peek()[0] == "ident" and not self.kw(*_KEYWORDS):
+            item.alias = self.ident()
+        return item
+
+    def order_item(self) -> Tuple[List[str], bool, Optional[bool]]:
+        path = self.ident().split(".")
+        desc = False
+        nulls_first: Optional[bool] = None
+        if self.kw("ASC", "DESC"):
+            desc = self.take()[1].upper() == "DESC"
+        if self.kw("NULLS"):
+            self.take()
+            nulls_first = self.take()[1].upper() == "FIRST"
+        return path, desc, nulls_first
+
+    # ----- conditions ----------------------------------------------------------
+    def expr(self) -> tuple:
+        node = self.term()
+        while self.kw("OR"):
+            self.take()
+            node = ("or", node, self.term())
+        return node
+
+    def term(self) -> tuple:
+        node = self.factor()
+        while self.kw("AND"):
+            self.take()
+            node = ("and", node, self.factor())
+        return node
+
+    def factor(self) -> tuple:
+        if self.kw("NOT"):
+            self.take()
+            return ("not", self.factor())
+        if self.peek()[1] == "(":
+            self.take()
+            node = self.expr()
+            self.expect(")")
+            return node
+        path = self.ident().split(".")
+        negate = False
+        if self.kw("NOT"):
+            self.take()
+            negate = True
+        if self.kw("IN"):
+            self.take()
+            self.expect("(")
+            if self.kw("SELECT"):
+                sub = self.query()
+                self.expect(")")
+                return ("in_query", path, sub, negate)
+            values = [self.literal()]
+            while self.peek()[1] == ",":
+                self.take()
+                values.append(self.literal())
+            self.expect(")")
+            return ("in", path, values, negate)
+        if negate:
+            raise SoqlError("NOT must be followed by IN here")
+        if self.kw("LIKE"):
+            self.take()
+            return ("like", path, self.literal())
+        kind, op = self.take()
+        if kind != "op":
+            raise SoqlError(f"expected a comparison operator, got {op!r}")
+        return ("cmp", path, "!=" if op == "<>" else op, self.literal())
+
+    def literal(self) -> Any:
+        kind, value = self.take()
+        if kind == "str":
+            return re.sub(r"\\(.)", r"\1", value[1:-1])
+        if kind == "num":
+            return float(value) if "." in value else int(value)
+        if kind == "dt":
+            return value
+        if kind == "ident":
+            word = value.upper()
+            if word == "TRUE":
+                return True
+            if word == "FALSE":
+                return False
+            if word == "NULL":
+                return None
+            if word == "TODAY":
+                return date.today().isoformat()
+        raise SoqlError(f"unsupported literal {value!r}")
+
+
+def parse(text: str) -> Query:
+    parser = _Parser(text)
+    q = parser.query()
+    if parser.peek()[0] is not None:
+        raise SoqlError(f"unexpected trailing input: {parser.peek()[1]!r}")
+    return q
+
+
+# --------------------------------------------------------------------------- #
+# Compilation to SQLite
+# --------------------------------------------------------------------------- #
+
+def lookup_field(relationship: str) -> str:
+    """The lookup field behind a relationship name (``Product2`` → ``Product2Id``)."""
+    if relationship.lower().endswith("__r"):
+        return relationship[:-3] + "__c"
+    return relationship + "Id"
+
+
+def _json_path(name: str) -> str:
+    # Names come from the tokenizer's identifier pattern, so they are safe to
+    # inline; values always travel as parameters.
+    return "'$.\"" + name + "\"'"
+
+
+class Compiler:
+    """Builds SQL text plus positional parameters for one query tree.
+
+    Only literal values become parameters, appended in the order they appear
+    in the SQL text.
+    """
+
+    def __init__(self):
+        self.params: List[Any] = []
+        self._n = 0
+
+    def _alias(self) -> str:
+        self._n += 1
+        return f"t{self._n}"
+
+    def field(self, path: List[str], alias: str) -> str:
+        name = path[0]
+        if len(path) == 1:
+            if name.lower() == "id":
+                return f"{alias}.id"
+            return f"json_extract({alias}.data, {_json_path(name)})"
+        ref = self.field([lookup_field(name)], alias)
+        rel = self._alias()
+        inner = self.field(path[1:], rel)
+        return f"(SELECT {inner} FROM records {rel} WHERE {rel}.id = {ref})"
+
+    def value(self, v: Any) -> str:
+        if isinstance(v, bool):
+            return "1" if v else "0"
+        self.params.append(v)
+        return "?"
+
+    def condition(self, node: tuple, alias: str) -> str:
+        kind = node[0]
+        if kind in ("and", "or"):
+            return f"({self.condition(node[1], alias)} {kind.upper()} {self.condition(node[2], alias)})"
+        if kind == "not":
+            return f"(NOT {self.condition(node[1], alias)})"
+        lhs = self.field(node[1], alias)
+        if kind == "cmp":
+            op, v = node[2], node[3]
+            if v is None:
+                return f"({lhs} IS {'NOT ' if op == '!=' else ''}NULL)"
+            nocase = " COLLATE NOCASE" if isinstance(v, str) else ""
+            if op == "!=":
+                return f"({lhs} IS NULL OR {lhs} != {self.value(v)}{nocase})"
+            return f"({lhs} {op} {self.value(v)}{nocase})"
+        if kind == "like":
+            return f"({lhs} LIKE {self.value(node[2])})"
+        if kind == "in":
+            values = node[2]
+            if not values:
+                return "(0)" if not node[3] else "(1)"
+            placeholders = ", ".join(self.value(v) for v in values)
+            return f"({lhs} {'NOT ' if node[3] else ''}IN ({placeholders}))"
+        if kind == "in_query":
+            sub: Query = node[2]
+            if len(sub.items) != 1 or sub.items[0].func:
+                raise SoqlError("a semi-join subquery selects exactly one field")
+            sa = self._alias()
+            inner = self.field(sub.items[0].path, sa)
+            sql = f"SELECT {inner} FROM records {sa} WHERE {sa}.sobject = ? COLLATE NOCASE"
+            self.params.append(sub.sobject)
+            if sub.where is not None:
+                sql += f" AND {self.condition(sub.where, sa)}"
+            return f"({lhs} {'NOT ' if node[3] else ''}IN ({sql}))"
+        raise SoqlError(f"unsupported condition {kind}")
+
+
+def compile_query(q: Query) -> Tuple[str, List[Any]]:
+    """SQL returning ``id, data`` rows (plain) or one column per item (aggregate)."""
+    c = Compiler()
+    alias = "r"
+    if q.aggregate or q.group_by:
+        cols = []
+        for item in q.items:
+            if item.func is None:
+                cols.append(c.field(item.path, alias))
+            elif not item.path:
+                cols.append("COUNT(*)")
+            elif item.func == "COUNT_DISTINCT":
+                cols.append(f"COUNT(DISTINCT {c.field(item.path, alias)})")
+            else:
+                cols.append(f"{item.func}({c.field(item.path, alias)})")
+        select = ", ".join(cols)
+    else:
+        select = f"{alias}.id, {alias}.data"
+    sql = f"SELECT {select} FROM records {alias} WHERE {alias}.sobject = ? COLLATE NOCASE"
+    c.params.append(q.sobject)
+    if q.where is not None:
+        sql += f" AND {c.condition(q.where, alias)}"
+    if q.group_by:
+        sql += " GROUP BY " + ", ".join(c.field(p, alias) for p in q.group_by)
+    if q.order_by:
+        parts = []
+        for path, desc, nulls_first in q.order_by:
+            expr = c.field(path, alias)
+            if nulls_first is None:
+                nulls_first = not desc  # SOQL default: NULLS FIRST ascending
+            parts.append(f"{expr} {'DESC' if desc else 'ASC'} NULLS {'FIRST' if nulls_first else 'LAST'}")
+        sql += " ORDER BY " + ", ".join(parts)
+    elif not (q.aggregate or q.group_by):
+        sql += f" ORDER BY {alias}.seq"
+    if q.limit is not None or q.offset is not None:
+        sql += f" LIMIT {q.limit if q.limit is not None else -1}"
+        if q.offset:
+            sql += f" OFFSET {q.offset}"
+    return sql, c.params
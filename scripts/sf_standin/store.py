@@ -0,0 +1,325 @@
+"""SQLite record store for the stand-in org.
+
+Every sObject shares one ``records`` table: ``id`` (an 18-character
+Salesforce-shaped id), ``sobject``, an insertion ``seq`` (default query order)
+and the fields as a JSON object. The store is schemaless — any object name and
+field is accepted — except that a field ending in ``Id`` whose value looks like
+a record id must point at an existing record (``INVALID_CROSS_REFERENCE_KEY``),
+so a client that loses track of its own ids fails here as it would in an org.
+
+One connection is shared under a re-entrant lock; :meth:`Store.atomic` opens a
+savepoint so ``allOrNone`` composite calls and graphs roll back as a unit.
+Update and create listeners (:meth:`Store.on_create` / :meth:`Store.on_update`)
+let ``revenue.py`` react to ``Order.Status = 'Activated'`` the way the org's
+own automation does.
+"""
+
+import json
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from scripts.sf_standin import soql as _soql
+
+_BASE62 = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_CHECKSUM = "ABCDEFGHIJKLMNOPQRSTUVWXYZ012345"
+
+# Real key prefixes for the objects these tools touch; others get a stable
+# hash-derived prefix.
+KEY_PREFIXES = {
+    "Account": "001", "Contact": "003", "Opportunity": "006", "Product2": "01t",
+    "Pricebook2": "01s", "PricebookEntry": "01u", "Asset": "02i", "Quote": "0Q0",
+    "QuoteLineItem": "0QL", "Order": "801", "OrderItem": "802",
+}
+
+_AUTONUMBER = {
+    "Order": ("OrderNumber", "{:08d}"),
+    "Quote": ("QuoteNumber", "{:08d}"),
+}
+
+
+class StoreError(Exception):
+    """A record operation failed; carries a Salesforce ``errorCode``."""
+
+    def __init__(self, error_code: str, message: str, fields: Optional[List[str]] = None):
+        super().__init__(message)
+        self.error_code = error_code
+        self.message = message
+        self.fields = fields or []
+
+    def as_error(self) -> Dict[str, Any]:
+        return {"statusCode": self.error_code, "errorCode": self.error_code,
+                "message": self.message, "fields": self.fields}
+
+
+def checksum_suffix(id15: str) -> str:
+    """The 3-character case-safe suffix of an 18-character Salesforce id."""
+    out = ""
+    for chunk in range(3):
+        bits = 0
+        for pos, ch in enumerate(id15[chunk * 5:chunk * 5 + 5]):
+            if "A" <= ch <= "Z":
+                bits |= 1 << pos
+        out += _CHECKSUM[bits]
+    return out
+
+
+def looks_like_id(value: Any) -> bool:
+    return (isinstance(value, str) and len(value) in (15, 18) and value.isalnum()
+            and any(c.isdigit() for c in value))
+
+
+def key_prefix(sobject: str) -> str:
+    if sobject in KEY_PREFIXES:
+        return KEY_PREFIXES[sobject]
+    n = zlib.crc32(sobject.encode("utf-8"))
+    return "a" + _BASE62[n % 62] + _BASE62[(n // 62) % 62]
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+class Store:
+    """The stand-in org's records. ``path`` may be ``:memory:``."""
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self.lock = threading.RLock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA synchronous=OFF")
+        if path != ":memory:":
+            self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS records (
+                id TEXT PRIMARY KEY,
+                sobject TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS records_sobject ON records (sobject COLLATE NOCASE, seq);
+        """)
+        self._counters: Dict[str, int] = {}
+        self._autonumbers: Dict[Tuple[str, str], int] = {}
+        self._seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM records").fetchone()[0]
+        self._savepoints = 0
+        self._create_hooks: List[Callable[[str, str, Dict[str, Any]], None]] = []
+        self._update_hooks: List[Callable[[str, str, Dict[str, Any], Dict[str, Any]], None]] = []
+
+    # ----- hooks ---------------------------------------------------------------
+    def on_create(self, hook: Callable[[str, str, Dict[str, Any]], None]) -> None:
+        """``hook(sobject, id, record)`` after each create, inside its savepoint."""
+        self._create_hooks.append(hook)
+
+    def on_update(self, hook: Callable[[str, str, Dict[str, Any], Dict[str, Any]], None]) -> None:
+        """``hook(sobject, id, before, after)``; raising StoreError vetoes the update."""
+        self._update_hooks.append(hook)
+
+    # ----- transactions ----------------------------------------------------------
+    @contextmanager
+    def atomic(self) -> Iterator[None]:
+        """All-or-none block: any exception rolls back every write inside it."""
+        with self.lock:
+            self._savepoints += 1
+            name = f"sp{self._savepoints}"
+            self.db.execute(f"SAVEPOINT {name}")
+            try:
+                yield
+            except BaseException:
+                self.db.execute(f"ROLLBACK TO {name}")
+                self.db.execute(f"RELEASE {name}")
+                raise
+            else:
+                self.db.execute(f"RELEASE {name}")
+            finally:
+                self._savepoints -= 1
+
+    # ----- ids -------------------------------------------------------------------
+    def _next_id(self, sobject: str) -> str:
+        prefix = key_prefix(sobject)
+        n = self._counters.get(prefix)
+        if n is None:
+            row = self.db.execute(
+                "SELECT id FROM records WHERE id >= ? AND id < ? ORDER BY id DESC LIMIT 1",
+                (prefix + "000", prefix + "001"),
+            ).fetchone()
+            n = 0
+            if row:
+                for ch in row[0][6:15]:
+                    n = n * 62 + _BASE62.index(ch)
+        n += 1
+        self._counters[prefix] = n
+        body, m = "", n
+        for _ in range(9):
+            body = _BASE62[m % 62] + body
+            m //= 62
+        id15 = prefix + "000" + body
+        return id15 + checksum_suffix(id15)
+
+    def _autonumber(self, sobject: str, field: str, fmt: str) -> str:
+        key = (sobject, field)
+        n = self._autonumbers.get(key)
+        if n is None:
+            n = self.db.execute(
+                "SELECT COUNT(*) FROM records WHERE sobject = ? COLLATE NOCASE "
+                "AND json_extract(data, ?) IS NOT NULL", (sobject, f'$."{field}"'),
+            ).fetchone()[0]
+        n += 1
+        self._autonumbers[key] = n
+        return fmt.format(n)
+
+    def next_number(self, sobject: str, field: str, fmt: str = "{:08d}") -> str:
+        """Next value of an auto-number-like field (e.g. ``InvoiceNumber`` at post)."""
+        with self.lock:
+            return self._autonumber(sobject, field, fmt)
+
+    # ----- reads -------------------------------------------------------------------
+    def get(self, record_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """``(sobject, fields)`` for an id (15 or 18 characters), or None."""
+        if len(record_id) == 15:
+            record_id += checksum_suffix(record_id)
+        with self.lock:
+            row = self.db.execute("SELECT sobject, data FROM records WHERE id = ?",
+                                  (record_id,)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def count(self, sobject: str) -> int:
+        with self.lock:
+            return self.db.execute(
+                "SELECT COUNT(*) FROM records WHERE sobject = ? COLLATE NOCASE", (sobject,)
+            ).fetchone()[0]
+
+    def find(self, sobject: str, **equals: Any) -> List[Dict[str, Any]]:
+        """Records of ``sobject`` whose fields equal ``equals`` (insertion order)."""
+        where = "".join(f" AND json_extract(data, '$.\"{k}\"') = ?" for k in equals)
+        with self.lock:
+            rows = self.db.execute(
+                f"SELECT data FROM records WHERE sobject = ? COLLATE NOCASE{where} ORDER BY seq",
+                (sobject, *equals.values()),
+            ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    # ----- writes ------------------------------------------------------------------
+    def _check_references(self, fields: Dict[str, Any]) -> None:
+        for name, value in fields.items():
+            if name != "Id" and name.endswith("Id") and looks_like_id(value):
+                if self.get(value) is None:
+                    raise StoreError(
+                        "INVALID_CROSS_REFERENCE_KEY",
+                        f"invalid cross reference id: {name} = {value}", [name],
+                    )
+
+    def create(self, sobject: str, fields: Dict[str, Any]) -> str:
+        fields = {k: v for k, v in fields.items() if k not in ("attributes", "Id")}
+        with self.lock, self.atomic():
+            self._check_references(fields)
+            record_id = self._next_id(sobject)
+            stamp = now_iso()
+            record = {"Id": record_id, **fields, "CreatedDate": stamp,
+                      "LastModifiedDate": stamp, "SystemModstamp": stamp}
+            auto = _AUTONUMBER.get(sobject)
+            if auto and not record.get(auto[0]):
+                record[auto[0]] = self._autonumber(sobject, *auto)
+            self._seq += 1
+            self.db.execute("INSERT INTO records (id, sobject, seq, data) VALUES (?, ?, ?, ?)",
+                            (record_id, sobject, self._seq, json.dumps(record)))
+            for hook in self._create_hooks:
+                hook(sobject, record_id, record)
+        return record_id
+
+    def update(self, record_id: str, fields: Dict[str, Any],
+               sobject: Optional[str] = None) -> Dict[str, Any]:
+        fields = {k: v for k, v in fields.items() if k not in ("attributes", "Id")}
+        with self.lock, self.atomic():
+            found = self.get(record_id)
+            if found is None or (sobject and found[0].lower() != sobject.lower()):
+                raise StoreError("NOT_FOUND", "The requested resource does not exist")
+            actual, before = found
+            self._check_references(fields)
+            after = {**before, **fields, "LastModifiedDate": now_iso()}
+            after["SystemModstamp"] = after["LastModifiedDate"]
+            for hook in self._update_hooks:
+                hook(actual, before["Id"], before, after)
+            self.db.execute("UPDATE records SET data = ? WHERE id = ?",
+                            (json.dumps(after), before["Id"]))
+        return after
+
+    def delete(self, record_id: str, sobject: Optional[str] = None) -> None:
+        with self.lock:
+            found = self.get(record_id)
+            if found is None or (sobject and found[0].lower() != sobject.lower()):
+                raise StoreError("ENTITY_IS_DELETED", "entity is deleted")
+            self.db.execute("DELETE FROM records WHERE id = ?", (found[1]["Id"],))
+
+    # ----- SOQL --------------------------------------------------------------------
+    def query(self, text: str) -> Tuple[int, List[Dict[str, Any]]]:
+        """Run SOQL; return ``(totalSize, records)`` in REST response shape."""
+        q = _soql.parse(text)
+        sql, params = _soql.compile_query(q)
+        with self.lock:
+            rows = self.db.execute(sql, params).fetchall()
+            if q.count_only:
+                return rows[0][0], []
+            if q.aggregate or q.group_by:
+                return len(rows), [self._aggregate_row(q, row) for row in rows]
+            memo: Dict[str, Optional[Tuple[str, Dict[str, Any]]]] = {}
+            out = [self._project(q, q.sobject, row[0], json.loads(row[1]), memo)
+                   for row in rows]
+        return len(out), out
+
+    @staticmethod
+    def _aggregate_row(q: "_soql.Query", row: tuple) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"attributes": {"type": "AggregateResult"}}
+        expr = 0
+        for item, value in zip(q.items, row):
+            if item.alias:
+                name = item.alias
+            elif item.func:
+                name = f"expr{expr}"
+                expr += 1
+            else:
+                name = item.path[-1]
+            out[name] = value
+        return out
+
+    def _related(self, record_id: Any, memo) -> Optional[Tuple[str, Dict[str, Any]]]:
+        if not isinstance(record_id, str):
+            return None
+        if record_id not in memo:
+            memo[record_id] = self.get(record_id)
+        return memo[record_id]
+
+    def _project(self, q, sobject: str, record_id: str, data: Dict[str, Any], memo) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"attributes": {"type": sobject, "url": f"/sobjects/{sobject}/{record_id}"}}
+        for item in q.items:
+            target, src, path = out, data, item.path
+            while len(path) > 1:
+                rel = path[0]
+                if rel not in target:
+                    found = self._related(src.get(_soql.lookup_field(rel)), memo)
+                    target[rel] = None if found is None else {
+                        "attributes": {"type": found[0],
+                                       "url": f"/sobjects/{found[0]}/{found[1]['Id']}"}}
+                    target[rel + "\0"] = found  # scratch: resolved record
+                found = target[rel + "\0"]
+                if found is None:
+                    break
+                target, src, path = target[rel], found[1], path[1:]
+            else:
+                name = path[0]
+                target["Id" if name.lower() == "id" else name] = (
+                    src.get("Id") if name.lower() == "id" else src.get(name))
+        self._strip_scratch(out)
+        return out
+
+    def _strip_scratch(self, node: Dict[str, Any]) -> None:
+        for key in [k for k in node if k.endswith("\0")]:
+            del node[key]
+        for value in node.values():
+            if isinstance(value, dict) and value is not node.get("attributes"):
+                self._strip_scratch(value)
@@ -0,0 +1,41 @@
+"""Shared Salesforce REST transport backends for the standalone script toolkits.
+
+The Expression Set, Context Service and Decision Table toolkits each own a
+``_client`` module whose ``connect_request`` shells out to ``sf api request
+rest`` for every call. That keeps tokens out of our process, but costs a Node
+process spawn (1-3 s) per request. This package holds the pieces those clients
+can opt into *without* changing their error/dry-run contracts:
+
+- ``pooled`` — an in-process HTTPS backend: the token is resolved once per org
+  through the ``sf`` CLI (``scripts/txn_data_harness/auth.py:resolve_auth``) and
+  each thread keeps one keep-alive ``requests.Session``. Select it with
+  ``RLM_SF_TRANSPORT=http`` or an entry script's ``--transport http``.
+- ``composite`` — ``Transport.batch()``: queues independent (or
+  ``referenceId``-chained) calls into ``/composite/batch`` / ``/composite``
+  requests of up to 25 sub-requests, on either backend.
+- ``read_cache`` — opt-in on-disk cache for GETs (``RLM_SF_READ_CACHE`` or an
+  inspector's ``--read-cache``): TTL plus ``SystemModstamp``/``LastModifiedDate``
+  revalidation, invalidated by mutations sent through the same client.
+- ``metrics`` — opt-in per-request samples (``RLM_SF_METRICS_DIR``): latency,
+  status, bytes and ``sf`` spawn time per templated endpoint, summarized as
+  p50/p95/p99 JSON plus a Prometheus text file. The build harness sets it per
+  step and rolls it into its run report.
+- ``cassette`` — record/replay of whole sessions (``RLM_SF_CASSETTE`` or an
+  entry script's ``--cassette``), so client-side logic can be timed offline
+  with ``bench_replay.py``.
+- ``paging`` — lazy ``nextRecordsUrl`` walks with a one-page prefetch.
+- ``bulk`` — Bulk API 2.0 query (CSV, locator paging) and ingest jobs, which
+  callers switch to at ``RLM_SF_BULK_THRESHOLD`` rows.
+- ``aio`` — asyncio requests (``aiohttp`` if installed, else a ``requests``
+  thread pool) under one ``ApiThrottle`` per org: a concurrency cap plus a
+  token bucket that slows down as ``Sforce-Limit-Info`` nears the daily limit
+  and halves on 429/503. ``Transport.aio()`` returns the toolkit flavour.
+
+Backends return a ``subprocess.CompletedProcess``-shaped result (``returncode``
+0 on 2xx, the raw response body on ``stdout``), so each toolkit's existing
+error-code parsing, dry-run short-circuit and timeout defaults apply unchanged
+whichever backend carried the request.
+
+Entry scripts import these as ``from scripts.sf_transport.<module> import ...``.
+Nothing here imports from ``tasks/``.
+"""
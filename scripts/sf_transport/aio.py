@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""asyncio request layer with an API-limit-aware throttle.
+
+High-fan-out tools (describe sweeps, multi-table refreshes, harness batches)
+want hundreds of requests in flight, but an org has a daily request budget
+and a concurrent long-running-request limit. Every async request here goes
+through one :class:`ApiThrottle` per org (:func:`throttle_for`), which holds:
+
+* a **semaphore** capping requests in flight (``RLM_SF_ASYNC_CONCURRENCY``,
+  default 50);
+* a **token bucket** pacing request starts (``RLM_SF_ASYNC_RATE`` per second,
+  default 100). The bucket reads ``Sforce-Limit-Info: api-usage=N/M`` off
+  every response. Past ``soft_limit`` (80%) of the daily budget it slows
+  linearly toward ``min_rate``. At ``hard_limit`` (95%) it refuses new
+  requests with :class:`ApiLimitError`, leaving the remaining budget to
+  everyone else on the org.
+* **AIMD** on push-back: a 429, a 503 or ``REQUEST_LIMIT_EXCEEDED`` halves the
+  rate; each success adds back 2% of the base rate.
+
+Requests are sent by an :class:`AiohttpSender` when ``aiohttp`` is installed,
+else by a :class:`ThreadedSender` (blocking ``requests`` calls on a bounded
+thread pool). ``RLM_SF_ASYNC_HTTP=aiohttp|threads`` forces either one.
+
+Clients built on this:
+
+* ``scripts/txn_data_harness/auth.py:AsyncSfRestClient`` — async ``SfRestClient``;
+* :class:`AsyncTransport` — async toolkit transport, from each toolkit
+  ``Transport.aio()`` (``http`` backend credentials; no cassette/read cache).
+
+::
+
+    async with _client.Transport(org).aio() as t:
+        tables = await asyncio.gather(*(t.connect("GET", p) for p in paths))
+"""
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (Any, AsyncIterator, Awaitable, Callable, Collection, Dict, List,
+                    Mapping, Optional, Tuple, Type)
+from urllib.parse import quote
+
+from scripts.sf_transport import metrics as _metrics
+from scripts.sf_transport import paging as _paging
+
+CONCURRENCY_ENV_VAR = "RLM_SF_ASYNC_CONCURRENCY"
+RATE_ENV_VAR = "RLM_SF_ASYNC_RATE"
+HTTP_ENV_VAR = "RLM_SF_ASYNC_HTTP"
+DEFAULT_CONCURRENCY = 50
+DEFAULT_RATE = 100.0  # request starts per second
+
+RETRYABLE_STATUS = {429, 502, 503, 504}
+_PUSHBACK_STATUS = {429, 503}
+_LIMIT_INFO = re.compile(r"api-usage=(\d+)/(\d+)")
+_BACKOFF_BASE = 1.0
+
+
+class ApiLimitError(RuntimeError):
+    """The org's API usage reached the throttle's ``hard_limit``."""
+
+
+class SendError(RuntimeError):
+    """The request never produced an HTTP response (connection, timeout)."""
+
+
+@dataclass
+class HttpResult:
+    status: int
+    headers: Mapping[str, str]
+    text: str
+
+
+def parse_limit_info(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """``(used, limit)`` from a ``Sforce-Limit-Info`` header, or None."""
+    m = _LIMIT_INFO.search(value or "")
+    if not m or int(m.group(2)) <= 0:
+        return None
+    return int(m.group(1)), int(m.group(2))
+
+
+def _env_number(name: str, default: float) -> float:
+    raw = os.environ.get(name)
+    return float(raw) if raw not in (None, "") else default
+
+
+# ----- throttle ----------------------------------------------------------------
+class ApiThrottle:
+    """Shared concurrency cap + limit-aware token bucket for one org.
+
+    Safe to share across event loops (each loop gets its own semaphore of the
+    same size) and threads (bucket bookkeeping is under a lock).
+    """
+
+    def __init__(self, *, max_concurrency: Optional[int] = None, rate: Optional[float] = None,
+                 burst: Optional[float] = None, min_rate: float = 0.5,
+                 soft_limit: float = 0.80, hard_limit: float = 0.95,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_concurrency = int(max_concurrency or _env_number(CONCURRENCY_ENV_VAR,
+                                                                  DEFAULT_CONCURRENCY))
+        self.base_rate = float(rate or _env_number(RATE_ENV_VAR, DEFAULT_RATE))
+        self.burst = float(burst or max(1.0, min(self.base_rate, self.max_concurrency)))
+        self.min_rate = min(min_rate, self.base_rate)
+        self.soft_limit = soft_limit
+        self.hard_limit = hard_limit
+        self.rate = self.base_rate
+        self.usage: Optional[Tuple[int, int]] = None
+        self.pushbacks = 0
+        self._ceiling = self.base_rate
+        self._tokens = self.burst
+        self._stamp = clock()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[Any, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary())
+
+    @property
+    def usage_fraction(self) -> float:
+        return self.usage[0] / self.usage[1] if self.usage else 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            sem = self._semaphores.get(loop)
+            if sem is None:
+                sem = asyncio.Semaphore(self.max_concurrency)
+                self._semaphores[loop] = sem
+            return sem
+
+    def _take(self) -> float:
+        """Take a token if one is ready; else return seconds until one is."""
+        with self._lock:
+            if self.usage_fraction >= self.hard_limit:
+                used, limit = self.usage
+                raise ApiLimitError(
+                    f"API usage {used}/{limit} is at or past {self.hard_limit:.0%} of the "
+                    f"daily limit; refusing new requests."
+                )
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    async def acquire(self) -> None:
+        await self._semaphore().acquire()
+        try:
+            while True:
+                wait = self._take()
+                if wait <= 0:
+                    return
+                await asyncio.sleep(wait)
+        except BaseException:
+            self._semaphore().release()
+            raise
+
+    def release(self) -> None:
+        self._semaphore().release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def observe(self, status: int, headers: Mapping[str, str], text: str = "") -> None:
+        """Fold one response into the rate: limit headroom, then AIMD."""
+        info = parse_limit_info(_header(headers, "Sforce-Limit-Info"))
+        with self._lock:
+            if info is not None:
+                self.usage = info
+                frac = info[0] / info[1]
+                if frac <= self.soft_limit:
+                    self._ceiling = self.base_rate
+                else:
+                    span = max(self.hard_limit - self.soft_limit, 1e-9)
+                    scale = max(0.0, (self.hard_limit - frac) / span)
+                    self._ceiling = max(self.min_rate, self.base_rate * scale)
+            pushback = status in _PUSHBACK_STATUS or (
+                status == 403 and "REQUEST_LIMIT_EXCEEDED" in (text or ""))
+            if pushback:
+                self.pushbacks += 1
+                self.rate = max(self.min_rate, self.rate / 2)
+            elif 200 <= status < 300:
+                self.rate = self.rate + self.base_rate * 0.02
+            self.rate = max(self.min_rate, min(self.rate, self._ceiling))
+
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        value = next((v for k, v in headers.items() if k.lower() == lowered), None)
+    return value
+
+
+_THROTTLES: Dict[str, ApiThrottle] = {}
+_THROTTLES_LOCK = threading.Lock()
+
+
+def throttle_for(key: str) -> ApiThrottle:
+    """The process-wide :class:`ApiThrottle` for an org (keyed by instance URL)."""
+    with _THROTTLES_LOCK:
+        throttle = _THROTTLES.get(key)
+        if throttle is None:
+            throttle = ApiThrottle()
+            _THROTTLES[key] = throttle
+        return throttle
+
+
+def register_throttle(key: str, throttle: ApiThrottle) -> None:
+    with _THROTTLES_LOCK:
+        _THROTTLES[key] = throttle
+
+
+def reset_throttles() -> None:
+    with _THROTTLES_LOCK:
+        _THROTTLES.clear()
+
+
+# ----- senders -----------------------------------------------------------------
+class ThreadedSender:
+    """Blocking ``requests`` calls on a bounded thread pool (one Session per thread)."""
+
+    def __init__(self, max_workers: int = DEFAULT_CONCURRENCY):
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="sf-async")
+        self._local = threading.local()
+
+    def _session(self):
+        sess = getattr(self._local, "session", None)
+        if sess is None:
+            import requests
+
+            sess = requests.Session()
+            self._local.session = sess
+        return sess
+
+    def _send(self, method, url, headers, data, timeout) -> HttpResult:
+        import requests
+
+        try:
+            resp = self._session().request(method, url, headers=headers, data=data,
+                                           timeout=timeout)
+        except requests.RequestException as exc:
+            raise SendError(f"{method} {url}: {exc}") from exc
+        return HttpResult(resp.status_code, dict(resp.headers), resp.text or "")
+
+    async def send(self, method: str, url: str, *, headers: Dict[str, str],
+                   data: Optional[bytes], timeout: float) -> HttpResult:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._send, method, url,
+                                          headers, data, timeout)
+
+    async def aclose(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AiohttpSender:
+    """``aiohttp`` client session (created in the running loop on first use)."""
+
+    def __init__(self, max_connections: int = DEFAULT_CONCURRENCY):
+        self.max_connections = max_connections
+        self._session = None
+
+    async def send(self, method: str, url: str, *, headers: Dict[str, str],
+                   data: Optional[bytes], timeout: float) -> HttpResult:
+        import aiohttp
+
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections))
+        try:
+            async with self._session.request(
+                    method, url, headers=headers, data=data,
+                    timeout=aiohttp.ClientTimeout(total=timeout)) as resp:
+                return HttpResult(resp.status, dict(resp.headers), await resp.text())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise SendError(f"{method} {url}: {exc!r}") from exc
+
+    async def aclose(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def make_sender(kind: Optional[str] = None, *, max_connections: int = DEFAULT_CONCURRENCY):
+    """``aiohttp`` if importable (or forced), else the threaded ``requests`` sender."""
+    kind = (kind or os.environ.get(HTTP_ENV_VAR) or "auto").strip().lower()
+    if kind not in ("auto", "aiohttp", "threads"):
+        raise ValueError(f"Unknown async HTTP backend '{kind}' (aiohttp, threads)")
+    if kind != "threads":
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            if kind == "aiohttp":
+                raise
+        else:
+            return AiohttpSender(max_connections)
+    return ThreadedSender(max_connections)
+
+
+async def send_request(sender, throttle: ApiThrottle, method: str, url: str, *,
+                       headers: Dict[str, str], data: Optional[bytes], timeout: float,
+                       retries: int, metrics_path: str,
+                       retry_status: Collection[int] = RETRYABLE_STATUS,
+                       backoff_base: float = _BACKOFF_BASE,
+                       sleep: Callable[[float], Awaitable[None]] = asyncio.sleep) -> HttpResult:
+    """One throttled request; retries ``retry_status`` and send errors up to ``retries`` tries."""
+    attempt = 0
+    while True:
+        try:
+            async with throttle.slot():
+                with _metrics.track("async", method, metrics_path, data) as sample:
+                    result = await sender.send(method, url, headers=headers, data=data,
+                                               timeout=timeout)
+                    sample.status = str(result.status)
+                    sample.bytes_in = len(result.text.encode("utf-8")) if sample.active else 0
+        except SendError:
+            attempt += 1
+            if attempt >= retries:
+                raise
+            await sleep(backoff_base * (2 ** (attempt - 1)))
+            continue
+        throttle.observe(result.status, result.headers, result.text)
+        if result.status in retry_status and attempt < retries - 1:
+            attempt += 1
+            await sleep(backoff_base * (2 ** (attempt - 1)))
+            continue
+        return result
+
+
+async def aiter_records(first_page: Any, fetch: Callable[[str], Awaitable[Any]]
+                        ) -> AsyncIterator[Dict[str, Any]]:
+    """Async :func:`scripts.sf_transport.paging.iter_records` (no prefetch)."""
+    page = first_page
+    while isinstance(page, dict):
+        for record in page.get("records") or []:
+            if isinstance(record, dict):
+                yield record
+        if page.get("done", True) or not page.get("nextRecordsUrl"):
+            return
+        page = await fetch(page["nextRecordsUrl"])
+
+
+# ----- toolkit transport -------------------------------------------------------
+class AsyncTransport:
+    """Async counterpart of a toolkit ``Transport`` (``connect`` / ``soql`` / ``tooling_query``).
+
+    Credentials come from the org's pooled ``http`` backend, so a 401 refreshes
+    the token once, as there. Reads retry on transient statuses; mutations are
+    sent once. Failures raise the toolkit's error via ``error_factory(method,
+    path, text)``; ``error_cls`` wraps transport failures. Dry-run skips
+    mutations exactly like the sync ``connect_request``.
+    """
+
+    def __init__(self, target_org: str, api_version: str, *,
+                 error_factory: Callable[[str, str, str], Exception],
+                 error_cls: Type[Exception] = RuntimeError, dry_run: bool = False,
+                 logger: Optional[Callable[..., None]] = None,
+                 throttle: Optional[ApiThrottle] = None, sender: Any = None,
+                 timeout: float = 120.0, mutation_timeout: float = 600.0):
+        from scripts.sf_transport import pooled
+
+        self.target_org = target_org
+        self.api_version = api_version
+        self.dry_run = dry_run
+        self._error_factory = error_factory
+        self._error_cls = error_cls
+        self._logger = logger
+        self._backend = pooled.get_backend(target_org)
+        self._throttle = throttle
+        self._sender = sender
+        self._timeout = timeout
+        self._mutation_timeout = mutation_timeout
+
+    async def __aenter__(self) -> "AsyncTransport":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._sender is not None:
+            await self._sender.aclose()
+            self._sender = None
+
+    def _ensure(self) -> Tuple[str, str]:
+        token, instance_url = self._backend.credentials(self._error_cls)
+        if self._throttle is None:
+            self._throttle = throttle_for(instance_url)
+        if self._sender is None:
+            self._sender = make_sender(max_connections=self._throttle.max_concurrency)
+        return token, instance_url
+
+    async def connect(self, method: str, path: str, body: Any = None, *,
+                      dry_run: Optional[bool] = None) -> Any:
+        method = method.upper()
+        full_path = f"/services/data/v{self.api_version}/{path.lstrip('/')}"
+        if (self.dry_run if dry_run is None else dry_run) and method not in ("GET", "HEAD"):
+            if self._logger:
+                self._logger(f"[dry-run] {method} {full_path}")
+            return {}
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        read = method in ("GET", "HEAD")
+        reauthed = False
+        while True:
+            token, instance_url = self._ensure()
+            try:
+                result = await send_request(
+                    self._sender, self._throttle, method, f"{instance_url}{full_path}",
+                    headers={"Authorization": f"Bearer {token}",
+                             "Content-Type": "application/json", "Accept": "application/json"},
+                    data=data, timeout=self._timeout if read else self._mutation_timeout,
+                    retries=3 if read else 1, metrics_path=full_path,
+                )
+            except SendError as exc:
+                raise self._error_cls(f"{method} {full_path} failed for org "
+                                      f"'{self.target_org}' (async): {exc}") from exc
+            if result.status == 401 and not reauthed:
+                reauthed = True
+                self._backend._invalidate(token)
+                continue
+            break
+        text = (result.text or "").strip()
+        if not (200 <= result.status < 300):
+            raise self._error_factory(method, path, text)
+        if not text:
+            return {}
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as exc:
+            raise self._error_cls(f"Could not parse JSON from {method} {path}: {exc}") from exc
+
+    async def iter_query(self, soql: str, *, tooling: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        prefix = "tooling/query" if tooling else "query"
+        first = await self.connect("GET", f"{prefix}?q={quote(soql)}")
+        async for record in aiter_records(
+                first, lambda url: self.connect("GET", _paging.relative_next_url(url))):
+            yield record
+
+    async def soql(self, soql: str) -> List[Dict[str, Any]]:
+        return [r async for r in self.iter_query(soql)]
+
+    async def tooling_query(self, soql: str) -> List[Dict[str, Any]]:
+        return [r async for r in self.iter_query(soql, tooling=True)]
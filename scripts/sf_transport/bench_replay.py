@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Time a toolkit command against a recorded cassette, with no org.
+
+Runs the command ``--repeat`` times with ``RLM_SF_CASSETTE`` in replay mode,
+so every Salesforce call is answered from the cassette and the wall time is
+client-side work (plus any recorded latency asked for with ``--latency``).
+With ``--baseline`` the median is compared against a stored result and the
+run fails when it regresses by more than ``--tolerance``::
+
+    python scripts/sf_transport/bench_replay.py --cassette cassettes/overlay.json.gz \\
+        --baseline cassettes/overlay.bench.json -- \\
+        python scripts/expression_sets/apply_expression_set_overlay.py \\
+            --target-org replay --overlay overlays/x.json --confirm
+
+Record the cassette once with ``--cassette-mode record`` on the same command
+against a real org; ``--write-baseline`` stores the current timing.
+
+Exit codes: 0 ok, 1 regression or a failing command, 2 usage error.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from scripts.sf_transport import cassette as _cassette  # noqa: E402
+
+
+def _run_once(command, env) -> float:
+    started = time.perf_counter()
+    proc = subprocess.run(command, env=env, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(f"command exited {proc.returncode}: {proc.stderr.strip()[-2000:]}")
+    return elapsed
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> dict:
+    """Return ``{"regressed", "ratio", "limit_seconds"}`` for median vs baseline."""
+    base = float(baseline.get("median_seconds") or 0)
+    limit = base * (1 + tolerance)
+    ratio = result["median_seconds"] / base if base else 0.0
+    return {"regressed": bool(base) and result["median_seconds"] > limit,
+            "ratio": round(ratio, 3), "limit_seconds": round(limit, 4)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Replay a recorded Salesforce cassette under a command and time it.",
+    )
+    parser.add_argument("--cassette", required=True, help="Cassette recorded from the same command.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs (default: 5).")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs first (default: 1).")
+    parser.add_argument(
+        "--latency", type=float, default=0.0,
+        help="Scale of recorded per-call latency to simulate (0 = none, 1 = as recorded).",
+    )
+    parser.add_argument("--baseline", help="JSON timing to compare against.")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed median slowdown vs --baseline as a fraction (default: 0.25).",
+    )
+    parser.add_argument("--write-baseline", action="store_true",
+                        help="Write this run's timing to --baseline instead of comparing.")
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="Command to time, after '--'.")
+    args = parser.parse_args(argv)
+
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("give the command to time after '--'")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if args.write_baseline and not args.baseline:
+        parser.error("--write-baseline needs --baseline")
+    if not Path(args.cassette).is_file():
+        parser.error(f"cassette not found: {args.cassette}")
+
+    env = {**os.environ,
+           _cassette.ENV_VAR: str(Path(args.cassette).resolve()),
+           _cassette.MODE_ENV_VAR: _cassette.MODE_REPLAY,
+           _cassette.LATENCY_ENV_VAR: str(args.latency)}
+    try:
+        for _ in range(args.warmup):
+            _run_once(command, env)
+        times = [_run_once(command, env) for _ in range(args.repeat)]
+    except RuntimeError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    result = {
+        "command": command,
+        "cassette": args.cassette,
+        "interactions": len(_cassette.Cassette(args.cassette)),
+        "latency": args.latency,
+        "runs": len(times),
+        "min_seconds": round(min(times), 4),
+        "median_seconds": round(statistics.median(times), 4),
+        "max_seconds": round(max(times), 4),
+    }
+    code = 0
+    if args.baseline and args.write_baseline:
+        Path(args.baseline).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    elif args.baseline:
+        verdict = compare(result, json.loads(Path(args.baseline).read_text(encoding="utf-8")),
+                          args.tolerance)
+        result["baseline"] = verdict
+        code = 1 if verdict["regressed"] else 0
+    print(json.dumps(result, indent=2))
+    return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
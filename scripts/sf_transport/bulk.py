@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""Bulk API 2.0 query and ingest jobs for large-volume reads and writes.
+
+The REST paths in this repo move rows 2000 per query page and 200 per
+sObject Collections call; past ~10^5 rows that is thousands of round trips.
+Bulk API 2.0 hands the whole set to Salesforce as one asynchronous job:
+
+* **query** — ``POST jobs/query``, poll until ``JobComplete``, then page the
+  CSV result with ``Sforce-Locator``. :meth:`BulkClient.query_to_csv` streams
+  it to a file (one header row); :meth:`BulkClient.iter_query` yields dicts.
+* **ingest** — ``insert`` / ``upsert`` / ``update`` / ``delete`` /
+  ``hardDelete``: create the job, ``PUT`` the CSV, mark ``UploadComplete``,
+  poll, and download the ``successfulResults`` / ``failedResults`` /
+  ``unprocessedrecords`` files. Uploads over ~100 MB are split across jobs.
+
+Callers keep their REST path for small sets and switch above a row threshold
+(:func:`prefer_bulk`): ``RLM_SF_BULK_THRESHOLD`` (default 10000 rows; ``0``
+turns the switch off)::
+
+    if bulk.prefer_bulk(row_count):
+        client = bulk.BulkClient.from_rest_client(sf_rest_client)
+        result = client.ingest("TransactionJournal", "insert", records)
+
+Bulk CSV carries no types: query values come back as strings, with an empty
+field read as ``None``. ``requests`` is imported lazily, like ``pooled``.
+"""
+
+import csv
+import io
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from scripts.sf_transport import metrics as _metrics
+
+THRESHOLD_ENV_VAR = "RLM_SF_BULK_THRESHOLD"
+DEFAULT_THRESHOLD = 10_000
+OPERATIONS = ("insert", "upsert", "update", "delete", "hardDelete")
+RESULT_KINDS = ("successfulResults", "failedResults", "unprocessedrecords")
+
+_MAX_UPLOAD_BYTES = 100 * 1024 * 1024  # per job; the API's cap is 150 MB base64-encoded
+_RETRYABLE_STATUS = {429, 502, 503, 504}
+_READ_RETRIES = 3
+_BACKOFF_BASE = 1.0
+_TERMINAL = {"JobComplete", "Failed", "Aborted"}
+
+
+class BulkError(RuntimeError):
+    """A Bulk API call failed, or a job ended ``Failed`` / ``Aborted``."""
+
+    def __init__(self, message: str, *, job_id: Optional[str] = None,
+                 state: Optional[str] = None):
+        super().__init__(message)
+        self.job_id = job_id
+        self.state = state
+
+
+def bulk_threshold(value: Any = None) -> int:
+    """Rows at or above which callers switch to Bulk (``0`` = never).
+
+    Explicit ``value`` (a task option, a CLI flag), else ``RLM_SF_BULK_THRESHOLD``,
+    else :data:`DEFAULT_THRESHOLD`.
+    """
+    raw = value if value not in (None, "") else os.environ.get(THRESHOLD_ENV_VAR)
+    if raw in (None, ""):
+        return DEFAULT_THRESHOLD
+    try:
+        threshold = int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"Bulk threshold must be an integer row count, got {raw!r}") from None
+    return max(threshold, 0)
+
+
+def prefer_bulk(row_count: int, threshold: Any = None) -> bool:
+    """True when ``row_count`` rows should go through Bulk API 2.0."""
+    limit = bulk_threshold(threshold)
+    return limit > 0 and row_count >= limit
+
+
+# ----- CSV helpers -------------------------------------------------------------
+def _flatten(record: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Drop ``attributes`` and flatten parent references to ``Parent.Field``."""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        if key == "attributes":
+            continue
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def csv_chunks(records: Iterable[Dict[str, Any]], *, columns: Optional[List[str]] = None,
+               max_bytes: int = _MAX_UPLOAD_BYTES) -> Iterator[str]:
+    """Render records as Bulk ingest CSV, one string per upload of at most ``max_bytes``.
+
+    ``columns`` defaults to the keys of the first record (after flattening);
+    every chunk repeats the header row.
+    """
+    header: Optional[List[str]] = list(columns) if columns else None
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    header_len = 0
+    for record in records:
+        flat = _flatten(record)
+        if header is None:
+            header = list(flat)
+        if buf.tell() == 0:
+            writer.writerow(header)
+            header_len = buf.tell()
+        writer.writerow([_cell(flat.get(name)) for name in header])
+        if buf.tell() >= max_bytes:
+            yield buf.getvalue()
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+    if buf.tell() > header_len:
+        yield buf.getvalue()
+
+
+def read_csv_rows(text: str) -> Iterator[Dict[str, Optional[str]]]:
+    """Parse a Bulk CSV payload, reading empty fields as ``None``."""
+    for row in csv.DictReader(io.StringIO(text)):
+        yield {k: (v if v != "" else None) for k, v in row.items()}
+
+
+# ----- results -----------------------------------------------------------------
+@dataclass
+class IngestResult:
+    """Outcome of one :meth:`BulkClient.ingest` call (possibly several jobs)."""
+
+    sobject: str
+    operation: str
+    job_ids: List[str] = field(default_factory=list)
+    processed: int = 0
+    failed: int = 0
+    results_dir: Optional[Path] = None
+    files: Dict[str, List[Path]] = field(default_factory=lambda: {k: [] for k in RESULT_KINDS})
+
+    @property
+    def succeeded(self) -> int:
+        return self.processed - self.failed
+
+    def rows(self, kind: str = "successfulResults") -> Iterator[Dict[str, Optional[str]]]:
+        """Yield the rows of every job's ``kind`` result file.
+
+        ``successfulResults`` rows carry ``sf__Id`` / ``sf__Created`` plus the
+        uploaded columns; ``failedResults`` rows carry ``sf__Id`` / ``sf__Error``.
+        """
+        for path in self.files.get(kind, []):
+            yield from read_csv_rows(path.read_text(encoding="utf-8"))
+
+
+# ----- client ------------------------------------------------------------------
+class BulkClient:
+    """Bulk API 2.0 jobs against one org.
+
+    ``session`` is a ``requests.Session``-like object (injectable for tests);
+    ``sleep`` / ``clock`` drive job polling. Bulk calls are separate from the
+    REST client that built this one: they are not recorded in a cassette.
+    """
+
+    def __init__(self, instance_url: str, access_token: str, api_version: str, *,
+                 session: Any = None, poll_interval: float = 2.0, max_wait: float = 3600.0,
+                 sleep: Callable[[float], None] = time.sleep,
+                 clock: Callable[[], float] = time.monotonic):
+        self.instance_url = instance_url.rstrip("/")
+        self.access_token = access_token
+        self.api_version = str(api_version).lstrip("v")
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._session = session
+        self._sleep = sleep
+        self._clock = clock
+
+    @classmethod
+    def from_rest_client(cls, client: Any, **kwargs: Any) -> "BulkClient":
+        """Share an ``SfRestClient``'s token, instance URL and API version."""
+        return cls(client.instance_url, client.access_token, client.api_version, **kwargs)
+
+    @classmethod
+    def for_org(cls, target_org: str, api_version: str, **kwargs: Any) -> "BulkClient":
+        """Resolve credentials through the org's pooled backend (see ``pooled``)."""
+        from scripts.sf_transport import pooled
+
+        token, instance_url = pooled.get_backend(target_org).credentials(BulkError)
+        return cls(instance_url, token, api_version, **kwargs)
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        return self._session
+
+    def _path(self, rest: str) -> str:
+        return f"/services/data/v{self.api_version}/{rest}"
+
+    def _request(self, method: str, rest: str, *, json_body: Any = None,
+                 data: Optional[str] = None, content_type: str = "application/json",
+                 accept: str = "application/json",
+                 params: Optional[Dict[str, Any]] = None):
+        import json as _json
+
+        path = self._path(rest)
+        payload = _json.dumps(json_body) if json_body is not None else data
+        headers = {"Authorization": f"Bearer {self.access_token}",
+                   "Content-Type": content_type, "Accept": accept}
+        retries = _READ_RETRIES if method == "GET" else 1
+        for attempt in range(retries):
+            with _metrics.track("bulk", method, path, payload) as sample:
+                resp = self.session.request(
+                    method, f"{self.instance_url}{path}", headers=headers, params=params,
+                    data=payload.encode("utf-8") if payload is not None else None,
+                )
+                sample.status = str(resp.status_code)
+                sample.bytes_in = len(resp.content or b"") if sample.active else 0
+            if resp.status_code in _RETRYABLE_STATUS and attempt < retries - 1:
+                self._sleep(_BACKOFF_BASE * (2 ** attempt))
+                continue
+            break
+        if not (200 <= resp.status_code < 300):
+            raise BulkError(f"{method} {path} failed: HTTP {resp.status_code} {resp.text[:500]}")
+        return resp
+
+    def _json(self, method: str, rest: str, **kwargs: Any) -> Dict[str, Any]:
+        resp = self._request(method, rest, **kwargs)
+        return resp.json() if resp.text.strip() else {}
+
+    def wait(self, kind: str, job_id: str) -> Dict[str, Any]:
+        """Poll ``jobs/{kind}/{job_id}`` until it reaches a terminal state."""
+        deadline = self._clock() + self.max_wait
+        while True:
+            info = self._json("GET", f"jobs/{kind}/{job_id}")
+            state = info.get("state")
+            if state in _TERMINAL:
+                if state != "JobComplete":
+                    raise BulkError(f"Bulk {kind} job {job_id} ended {state}: "
+                                    f"{info.get('errorMessage') or 'no error message'}",
+                                    job_id=job_id, state=state)
+                return info
+            if self._clock() >= deadline:
+                raise BulkError(f"Bulk {kind} job {job_id} still {state} after "
+                                f"{self.max_wait:.0f}s", job_id=job_id, state=state)
+            self._sleep(self.poll_interval)
+
+    # ----- query ---------------------------------------------------------------
+    def run_query(self, soql: str, *, all_rows: bool = False) -> str:
+        """Create a query job, wait for it, and return its id."""
+        job = self._json("POST", "jobs/query", json_body={
+            "operation": "queryAll" if all_rows else "query", "query": soql,
+        })
+        self.wait("query", job["id"])
+        return job["id"]
+
+    def iter_result_pages(self, job_id: str, *, max_records: Optional[int] = None) -> Iterator[str]:
+        """Yield each CSV page of a finished query job (every page has a header row)."""
+        locator = None
+        while True:
+            params: Dict[str, Any] = {}
+            if max_records:
+                params["maxRecords"] = int(max_records)
+            if locator:
+                params["locator"] = locator
+            resp = self._request("GET", f"jobs/query/{job_id}/results",
+                                 params=params or None, accept="text/csv")
+            yield resp.text
+            locator = resp.headers.get("Sforce-Locator")
+            if not locator or locator == "null":
+                return
+
+    def query_to_csv(self, soql: str, path: Any, *, all_rows: bool = False,
+                     max_records: Optional[int] = None) -> int:
+        """Stream a query's result to ``path`` as one CSV; return the row count."""
+        job_id = self.run_query(soql, all_rows=all_rows)
+        rows = 0
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("w", encoding="utf-8", newline="") as fh:
+            for index, page in enumerate(self.iter_result_pages(job_id, max_records=max_records)):
+                lines = page.splitlines(keepends=True)
+                if not lines:
+                    continue
+                body = lines if index == 0 else lines[1:]
+                fh.writelines(body)
+                rows += sum(1 for _ in csv.reader(lines[1:]))
+        return rows
+
+    def iter_query(self, soql: str, *, all_rows: bool = False,
+                   max_records: Optional[int] = None) -> Iterator[Dict[str, Optional[str]]]:
+        """Yield a query's rows as dicts (string values; empty as ``None``)."""
+        job_id = self.run_query(soql, all_rows=all_rows)
+        for page in self.iter_result_pages(job_id, max_records=max_records):
+            yield from read_csv_rows(page)
+
+    # ----- ingest --------------------------------------------------------------
+    def ingest(self, sobject: str, operation: str, records: Iterable[Dict[str, Any]], *,
+               external_id_field: Optional[str] = None, columns: Optional[List[str]] = None,
+               results_dir: Any = None) -> IngestResult:
+        """Run ``operation`` over ``records``; results land in ``results_dir``.
+
+        ``results_dir`` defaults to a fresh temporary directory. A job that
+        ends ``Failed`` / ``Aborted`` raises :class:`BulkError`; per-row
+        failures do not — check :attr:`IngestResult.failed` and
+        ``rows("failedResults")``.
+        """
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown Bulk ingest operation '{operation}' "
+                             f"(one of: {', '.join(OPERATIONS)})")
+        if operation == "upsert" and not external_id_field:
+            raise ValueError("upsert requires external_id_field")
+        out_dir = Path(results_dir) if results_dir else Path(tempfile.mkdtemp(prefix="sf-bulk-"))
+        out_dir.mkdir(parents=True, exist_ok=True)
+        result = IngestResult(sobject=sobject, operation=operation, results_dir=out_dir)
+        for chunk in csv_chunks(records, columns=columns):
+            job_id, info = self._run_ingest_job(sobject, operation, chunk, external_id_field)
+            result.job_ids.append(job_id)
+            result.processed += int(info.get("numberRecordsProcessed") or 0)
+            result.failed += int(info.get("numberRecordsFailed") or 0)
+            for kind in RESULT_KINDS:
+                path = out_dir / f"{sobject}-{operation}-{job_id}-{kind}.csv"
+                resp = self._request("GET", f"jobs/ingest/{job_id}/{kind}", accept="text/csv")
+                path.write_text(resp.text, encoding="utf-8")
+                result.files[kind].append(path)
+        return result
+
+    def _run_ingest_job(self, sobject: str, operation: str, body: str,
+                        external_id_field: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        spec: Dict[str, Any] = {"object": sobject, "operation": operation,
+                                "contentType": "CSV", "lineEnding": "LF"}
+        if external_id_field:
+            spec["externalIdFieldName"] = external_id_field
+        job_id = self._json("POST", "jobs/ingest", json_body=spec)["id"]
+        try:
+            self._request("PUT", f"jobs/ingest/{job_id}/batches", data=body,
+                          content_type="text/csv")
+            self._json("PATCH", f"jobs/ingest/{job_id}", json_body={"state": "UploadComplete"})
+        except BulkError:
+            try:
+                self._json("PATCH", f"jobs/ingest/{job_id}", json_body={"state": "Aborted"})
+            except BulkError:
+                pass
+            raise
+        return job_id, self.wait("ingest", job_id)
+
+    def delete(self, sobject: str, ids: Iterable[str], *, hard: bool = False,
+               results_dir: Any = None) -> IngestResult:
+        """Delete (or hard-delete, bypassing the Recycle Bin) records by Id."""
+        return self.ingest(sobject, "hardDelete" if hard else "delete",
+                           ({"Id": i} for i in ids), columns=["Id"], results_dir=results_dir)
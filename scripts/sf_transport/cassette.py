@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Record/replay cassettes for the Salesforce transports.
+
+A cassette is one recorded session: every request the toolkit ``_client``
+transports (either backend) or ``scripts/txn_data_harness/auth.py:SfRestClient``
+sent, with the response status, body and the wall time the call took. Replaying
+it answers the same requests offline, so ``ContextApplier.apply_plan``, an
+expression-set overlay, a decision-table refresh or a harness lifecycle can be
+timed without an org — the client-side logic runs for real, only the network
+is swapped out.
+
+Selection (off unless ``RLM_SF_CASSETTE`` is set)::
+
+    RLM_SF_CASSETTE=apply.json.gz RLM_SF_CASSETTE_MODE=record python scripts/...
+    RLM_SF_CASSETTE=apply.json.gz python scripts/...            # replay
+    python scripts/expression_sets/apply_expression_set_overlay.py \\
+        --cassette overlay.json.gz --cassette-mode record ...
+
+``RLM_SF_CASSETTE_LATENCY`` (replay only) scales each recorded call time:
+``0`` (default) answers immediately, ``1`` sleeps the recorded time, ``0.5``
+half of it. ``scripts/sf_transport/bench_replay.py`` wraps a command in replay
+mode and compares its wall time against a stored baseline.
+
+File format: ``{"version": 1, "instance_url": ..., "interactions": [...]}`` as
+compact JSON, gzipped when the path ends in ``.gz``. Each interaction is
+``method``, ``path`` (the versioned service path), request ``body`` text,
+``status``, ``returncode``, ``stdout``, ``stderr`` and ``elapsed`` seconds.
+Tokens are never recorded (neither backend puts one in a path or body), but
+responses are real org data — treat a cassette like an org export.
+
+Matching, in order, each consuming the earliest unused interaction:
+
+1. method + path + request body (JSON bodies compared canonically);
+2. method + path (bodies carrying run ids or timestamps);
+3. method + templated endpoint (SOQL carrying run ids:
+   ``query?q=...`` → ``query``; record ids → ``{id}``).
+
+A GET with nothing left to consume replays the last response for its exact
+path (extra polls). Anything else raises :class:`CassetteMiss`, which the
+toolkits surface as their own client error. Replay is order-sensitive for
+tiers 2-3, so record and replay with the same concurrency.
+"""
+
+import atexit
+import gzip
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Type
+
+from scripts.sf_transport.metrics import template_path
+
+ENV_VAR = "RLM_SF_CASSETTE"
+MODE_ENV_VAR = "RLM_SF_CASSETTE_MODE"
+LATENCY_ENV_VAR = "RLM_SF_CASSETTE_LATENCY"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = (MODE_RECORD, MODE_REPLAY)
+FORMAT_VERSION = 1
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no matching recorded interaction."""
+
+
+def _canonical_body(body: Optional[str]) -> str:
+    if not body:
+        return ""
+    try:
+        return json.dumps(json.loads(body), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return body
+
+
+class Cassette:
+    """One cassette file, in ``record`` or ``replay`` mode.
+
+    ``sleep`` is injectable so replay latency can be checked offline.
+    """
+
+    def __init__(self, path: str, mode: str = MODE_REPLAY, *, latency: float = 0.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}' (one of: {', '.join(MODES)}).")
+        self.path = Path(path)
+        self.mode = mode
+        self.latency = max(float(latency), 0.0)
+        self.instance_url: Optional[str] = None
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._interactions: List[Dict[str, Any]] = []
+        self._used: List[bool] = []
+        self._tiers: List[Dict[Tuple[str, ...], Deque[int]]] = [{}, {}, {}]
+        self._last: Dict[Tuple[str, str], int] = {}
+        self._registered = False
+        if mode == MODE_REPLAY:
+            self._load()
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == MODE_REPLAY
+
+    def __len__(self) -> int:
+        return len(self._interactions)
+
+    # ----- file --------------------------------------------------------------
+    def _load(self) -> None:
+        try:
+            if self.path.suffix == ".gz":
+                with gzip.open(self.path, "rt", encoding="utf-8") as fh:
+                    data = json.load(fh)
+            else:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            raise CassetteMiss(f"Cassette '{self.path}' does not exist; record it first "
+                               f"({MODE_ENV_VAR}={MODE_RECORD}).") from None
+        if data.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Cassette '{self.path}' has unsupported version "
+                             f"{data.get('version')!r}.")
+        self.instance_url = data.get("instance_url")
+        for item in data.get("interactions") or []:
+            self._index(item)
+
+    def save(self) -> Optional[Path]:
+        """Write the recorded interactions (record mode); no-op when replaying."""
+        if self.replaying:
+            return None
+        with self._lock:
+            payload = json.dumps({
+                "version": FORMAT_VERSION,
+                "instance_url": self.instance_url,
+                "interactions": self._interactions,
+            }, separators=(",", ":"))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        if self.path.suffix == ".gz":
+            with gzip.open(tmp, "wt", encoding="utf-8") as fh:
+                fh.write(payload)
+        else:
+            tmp.write_text(payload, encoding="utf-8")
+        os.replace(tmp, self.path)
+        return self.path
+
+    # ----- record ------------------------------------------------------------
+    def _index(self, item: Dict[str, Any]) -> None:
+        i = len(self._interactions)
+        self._interactions.append(item)
+        self._used.append(False)
+        method, path = item["method"], item["path"]
+        keys = ((method, path, _canonical_body(item.get("body"))),
+                (method, path),
+                (method, template_path(path)))
+        for tier, key in zip(self._tiers, keys):
+            tier.setdefault(key, deque()).append(i)
+
+    def record(self, method: str, path: str, body: Optional[str], *,
+               status: Optional[int], returncode: int, stdout: str, stderr: str = "",
+               elapsed: float = 0.0) -> None:
+        """Append one interaction; saved at process exit (or :meth:`save`)."""
+        item = {
+            "method": method.upper(), "path": path, "body": body or "",
+            "status": status, "returncode": returncode, "stdout": stdout or "",
+            "stderr": stderr or "", "elapsed": round(elapsed, 4),
+        }
+        with self._lock:
+            self._index(item)
+            if not self._registered:
+                self._registered = True
+                atexit.register(self.save)
+
+    # ----- replay ------------------------------------------------------------
+    def match(self, method: str, path: str, body: Optional[str] = None) -> Dict[str, Any]:
+        """Consume and return the interaction answering this request.
+
+        Sleeps ``elapsed * latency`` first. Raises :class:`CassetteMiss`.
+        """
+        method = method.upper()
+        keys = ((method, path, _canonical_body(body)),
+                (method, path),
+                (method, template_path(path)))
+        with self._lock:
+            found = None
+            for tier, key in zip(self._tiers, keys):
+                queue = tier.get(key)
+                while queue and self._used[queue[0]]:
+                    queue.popleft()
+                if queue:
+                    found = queue.popleft()
+                    self._used[found] = True
+                    break
+            if found is None and method in ("GET", "HEAD"):
+                found = self._last.get((method, path))
+            if found is None:
+                raise CassetteMiss(
+                    f"No recorded interaction for {method} {path} in cassette "
+                    f"'{self.path}' (re-record it if the client's requests changed)."
+                )
+            self._last[(method, path)] = found
+            item = self._interactions[found]
+        if self.latency and item.get("elapsed"):
+            self._sleep(item["elapsed"] * self.latency)
+        return item
+
+    def unused(self) -> int:
+        """Interactions not yet replayed (a shrinking count flags dropped calls)."""
+        with self._lock:
+            return self._used.count(False)
+
+    # ----- CLI-shaped transport ------------------------------------------------
+    def send(self, method: str, full_path: str, input_text: Optional[str],
+             live: Callable[[], subprocess.CompletedProcess], *,
+             error_cls: Type[Exception] = RuntimeError) -> subprocess.CompletedProcess:
+        """Record ``live()`` or replay its recorded result, CLI-shaped either way.
+
+        Used by the toolkit ``_send`` functions, so error-code parsing, dry-run
+        and read-cache handling in ``connect_request`` are unchanged.
+        """
+        if self.replaying:
+            try:
+                item = self.match(method, full_path, input_text)
+            except CassetteMiss as exc:
+                raise error_cls(str(exc)) from exc
+            result = subprocess.CompletedProcess(
+                args=[method, full_path], returncode=item["returncode"],
+                stdout=item["stdout"], stderr=item["stderr"],
+            )
+            if item.get("status") is not None:
+                result.http_status = item["status"]  # read by scripts/sf_transport/metrics.py
+            return result
+        started = time.perf_counter()
+        result = live()
+        self.record(method, full_path, input_text,
+                    status=getattr(result, "http_status", None),
+                    returncode=result.returncode, stdout=result.stdout or "",
+                    stderr=result.stderr or "", elapsed=time.perf_counter() - started)
+        return result
+
+
+_CASSETTES: Dict[Tuple[str, str], Cassette] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def open_cassette(path: str, mode: str = MODE_REPLAY, *, latency: float = 0.0) -> Cassette:
+    """Return the process-wide :class:`Cassette` for ``(path, mode)``."""
+    key = (str(Path(path).resolve()), mode)
+    with _REGISTRY_LOCK:
+        cassette = _CASSETTES.get(key)
+        if cassette is None:
+            cassette = _CASSETTES[key] = Cassette(path, mode, latency=latency)
+        return cassette
+
+
+def active(*, error_cls: Type[Exception] = ValueError) -> Optional[Cassette]:
+    """The cassette selected by ``RLM_SF_CASSETTE``, or None.
+
+    Raises ``error_cls`` for a bad mode/latency or a missing replay file, so
+    each toolkit reports it as its own client error.
+    """
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return None
+    mode = (os.environ.get(MODE_ENV_VAR) or MODE_REPLAY).strip().lower()
+    try:
+        latency = float(os.environ.get(LATENCY_ENV_VAR) or 0)
+        return open_cassette(path, mode, latency=latency)
+    except (CassetteMiss, ValueError) as exc:
+        raise error_cls(str(exc)) from exc
+
+
+def reset_cassettes() -> None:
+    """Drop every open cassette without saving (tests)."""
+    with _REGISTRY_LOCK:
+        for cassette in _CASSETTES.values():
+            atexit.unregister(cassette.save)
+        _CASSETTES.clear()
+
+
+def add_cassette_argument(parser) -> None:
+    """Add the shared ``--cassette`` / ``--cassette-mode`` flags to an entry script."""
+    parser.add_argument(
+        "--cassette", default=None, metavar="PATH",
+        help=f"Record or replay every Salesforce request through this cassette "
+             f"file (.json or .json.gz). Default: ${ENV_VAR}, else off.",
+    )
+    parser.add_argument(
+        "--cassette-mode", choices=MODES, default=None,
+        help=f"'record' calls the org and saves the session; 'replay' answers "
+             f"from the file with no org. Default: ${MODE_ENV_VAR}, else 'replay'.",
+    )
+
+
+def apply_cassette_argument(args) -> None:
+    """Make parsed ``--cassette`` / ``--cassette-mode`` values process-wide."""
+    if getattr(args, "cassette", None):
+        os.environ[ENV_VAR] = args.cassette
+    if getattr(args, "cassette_mode", None):
+        os.environ[MODE_ENV_VAR] = args.cassette_mode
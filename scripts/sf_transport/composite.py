@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""Composite API batching for the toolkit transports.
+
+Orchestrators (context-plan apply, the expression-set procedure-plan cascade,
+Decision Table definition loads) issue many small, independent REST calls one
+after another. :class:`CompositeBatch` queues those calls and sends them as a
+single ``/composite/batch`` (independent sub-requests) or ``/composite``
+(sub-requests chained by ``referenceId``) call of up to 25 sub-requests — one
+round trip, and on the ``cli`` backend one ``sf`` process, instead of 25.
+
+Usage — every queued call returns a :class:`PendingCall`; leaving the ``with``
+block flushes the queue, and ``result()`` returns the parsed body or raises the
+toolkit's own client error built from the sub-response::
+
+    with transport.batch() as batch:
+        calls = [batch.sobject("PATCH", "ContextAttribute", aid, {"IsTransient": True})
+                 for aid in ids]
+    for call in calls:
+        call.result()
+
+Chaining: ``call.ref("id")`` yields ``@{<referenceId>.id}``; a later sub-request
+whose path or body carries it is sent in the same ``/composite`` call (or, if
+the referenced call already completed in an earlier chunk, has the literal value
+substituted before sending).
+
+Contracts preserved from ``connect_request``:
+
+* **Errors** — a sub-response with HTTP status >= 400 becomes the toolkit's
+  client error via the transport-supplied ``error_factory``, with the same
+  ``error_codes`` parsing as a direct call.
+* **Dry-run** — a mutating sub-request is not queued under dry-run; it goes
+  straight to the transport, which logs and skips it. Reads are still batched
+  and always execute.
+* **Tooling** — ``tooling/...`` paths are batched through
+  ``tooling/composite[/batch]``; REST and Tooling sub-requests never share a call.
+* **Read cache** — with ``scripts/sf_transport/read_cache.py`` enabled, a GET
+  answered by the cache is never queued, and batched GET results are stored.
+
+Transports without a ``batch()`` method (the offline fakes used by the unit
+tests) get an :class:`ImmediateBatch` from :func:`batch_for`, which runs each
+call as it is queued — same call surface, original sequential behavior.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote
+
+from scripts.sf_transport import read_cache as _read_cache
+from scripts.sf_transport.paging import relative_next_url
+
+MAX_SUBREQUESTS = 25
+# ``/composite`` allows at most 5 query / sObject-collection sub-requests.
+_MAX_COMPOSITE_QUERIES = 5
+_READ_METHODS = ("GET", "HEAD")
+_REF_PATTERN = re.compile(r"@\{([A-Za-z_][A-Za-z0-9_]*)\.([^}]+)\}")
+_VERSION_PREFIX = "/services/data/"
+
+
+def _surface(path: str) -> str:
+    return "tooling" if path.lstrip("/").startswith("tooling/") else "rest"
+
+
+def _is_query(path: str) -> bool:
+    rel = path.lstrip("/")
+    if rel.startswith("tooling/"):
+        rel = rel[len("tooling/"):]
+    return rel.startswith(("query?", "query/", "queryAll?"))
+
+
+def _lookup(value: Any, expr: str) -> Any:
+    """Evaluate a composite reference expression (``id``, ``records[0].Id``)."""
+    for part in re.findall(r"[^.\[\]]+|\[\d+\]", expr):
+        if part.startswith("["):
+            value = value[int(part[1:-1])]
+        else:
+            value = value[part]
+    return value
+
+
+def _refs_in(obj: Any) -> set:
+    return {m.group(1) for m in _REF_PATTERN.finditer(json.dumps(obj) if obj is not None else "")}
+
+
+class PendingCall:
+    """A queued sub-request; ``result()`` flushes its batch if still pending."""
+
+    def __init__(self, batch: Optional["CompositeBatch"], method: str, path: str,
+                 body: Any = None, *, reference_id: Optional[str] = None,
+                 records: bool = False):
+        self._batch = batch
+        self.method = method
+        self.path = path
+        self.body = body
+        self.reference_id = reference_id
+        self.records = records
+        self.done = False
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+
+    def _resolve(self, value: Any = None, error: Optional[BaseException] = None) -> None:
+        self._value = value
+        self._error = error
+        self.done = True
+
+    def ref(self, expr: str) -> str:
+        """A ``@{referenceId.expr}`` token for chaining a later sub-request."""
+        if not self.reference_id:
+            raise ValueError(f"{self.method} {self.path} was not batched; it has no "
+                             f"referenceId to chain from.")
+        return f"@{{{self.reference_id}.{expr}}}"
+
+    def result(self) -> Any:
+        if not self.done and self._batch is not None:
+            self._batch.flush()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class CompositeBatch:
+    """Queue independent (or ``referenceId``-chained) calls into Composite requests.
+
+    ``send(method, path, body=None, *, dry_run=None)`` is the bound transport's
+    request function (``Transport.request`` / ``Transport.connect``): the
+    composite POST itself travels through it, so backend selection, timeouts
+    and transport-level errors are the transport's. ``error_factory(method,
+    path, body_text)`` builds the toolkit's client error for a failed
+    sub-response. ``cache`` is the transport's active
+    :class:`~scripts.sf_transport.read_cache.OrgCache`, if any.
+    """
+
+    def __init__(self, send: Callable[..., Any], *, api_version: str,
+                 error_factory: Callable[[str, str, str], BaseException],
+                 dry_run: bool = False, logger: Callable[..., None] = None,
+                 max_batch: int = MAX_SUBREQUESTS, cache: Any = None):
+        if not 1 <= max_batch <= MAX_SUBREQUESTS:
+            raise ValueError(f"max_batch must be between 1 and {MAX_SUBREQUESTS}.")
+        self._send = send
+        self.api_version = api_version
+        self._error_factory = error_factory
+        self.dry_run = dry_run
+        self.log = logger or (lambda *a, **k: None)
+        self.max_batch = max_batch
+        self.cache = cache
+        self._queues: Dict[str, List[PendingCall]] = {"rest": [], "tooling": []}
+        self._completed: Dict[str, PendingCall] = {}
+        self._ref_seq = 0
+        self.round_trips = 0
+
+    # ----- context manager ---------------------------------------------------
+    def __enter__(self) -> "CompositeBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            # The block failed before its results were consumed; don't send
+            # half a unit of work behind the caller's back.
+            self._abandon(exc)
+
+    # ----- queueing ----------------------------------------------------------
+    def submit(self, method: str, path: str, body: Any = None, *,
+               reference_id: Optional[str] = None, records: bool = False) -> PendingCall:
+        """Queue one sub-request; ``path`` is relative to ``/services/data/vXX.0/``.
+
+        ``records=True`` marks a SOQL read: the result is the ``records`` list,
+        with ``nextRecordsUrl`` pages followed after the batch returns.
+        """
+        method = method.upper()
+        path = path.lstrip("/")
+        if method not in _READ_METHODS and self.dry_run:
+            # Mutations under dry-run never reach the org: the transport logs
+            # and skips them, exactly as a direct call would.
+            call = PendingCall(None, method, path, body)
+            try:
+                call._resolve(self._send(method, path, body))
+            except Exception as exc:  # surfaced on result(), like a batched call
+                call._resolve(error=exc)
+            return call
+
+        if method == "GET" and self.cache is not None and not _REF_PATTERN.search(path):
+            hit = self.cache.lookup(path)
+            if hit is not _read_cache.MISS:
+                call = PendingCall(None, method, path, body, records=records)
+                try:
+                    call._resolve(self._collect_records(hit) if records else hit)
+                except Exception as exc:
+                    call._resolve(error=exc)
+                return call
+
+        surface = _surface(path)
+        pending_refs = _refs_in(path) | _refs_in(body)
+        for other, queue in self._queues.items():
+            if other != surface and pending_refs & {c.reference_id for c in queue}:
+                raise ValueError(
+                    f"{method} {path} references a pending {other} sub-request; "
+                    f"REST and Tooling calls cannot be chained in one composite."
+                )
+        call = PendingCall(self, method, path, body,
+                           reference_id=reference_id or self._next_ref(),
+                           records=records)
+        queue = self._queues[surface]
+        queue.append(call)
+        if len(queue) >= self.max_batch or self._composite_query_limit_hit(queue):
+            self._flush_surface(surface)
+        return call
+
+    def request(self, method: str, path: str, body: Any = None, **kw) -> PendingCall:
+        return self.submit(method, path, body, **kw)
+
+    connect = request
+
+    def sobject(self, method: str, sobject: str, record_id: Optional[str] = None,
+                body: Any = None, **kw) -> PendingCall:
+        path = f"sobjects/{sobject}"
+        if record_id:
+            path = f"{path}/{record_id}"
+        return self.submit(method, path, body, **kw)
+
+    def tooling_sobject(self, method: str, sobject: str, record_id: Optional[str] = None,
+                        suffix: Optional[str] = None, body: Any = None, **kw) -> PendingCall:
+        path = f"tooling/sobjects/{sobject}"
+        if record_id:
+            path = f"{path}/{record_id}"
+        if suffix:
+            path = f"{path}/{suffix}"
+        return self.submit(method, path, body, **kw)
+
+    def soql(self, query: str, **kw) -> PendingCall:
+        return self.submit("GET", f"query?q={quote(query)}", records=True, **kw)
+
+    def tooling_query(self, query: str, **kw) -> PendingCall:
+        return self.submit("GET", f"tooling/query?q={quote(query)}", records=True, **kw)
+
+    # ----- sending -----------------------------------------------------------
+    def flush(self) -> None:
+        """Send every queued sub-request (REST first, then Tooling)."""
+        for surface in ("rest", "tooling"):
+            self._flush_surface(surface)
+
+    def _flush_surface(self, surface: str) -> None:
+        queue = self._queues[surface]
+        while queue:
+            chunk = self._take_chunk(queue)
+            self._send_chunk(surface, chunk)
+
+    def _take_chunk(self, queue: List[PendingCall]) -> List[PendingCall]:
+        chunk: List[PendingCall] = []
+        queries = 0
+        while queue and len(chunk) < self.max_batch:
+            nxt = queue[0]
+            chained = any(_refs_in(c.path) | _refs_in(c.body) for c in chunk + [nxt])
+            if chained and _is_query(nxt.path) and queries >= _MAX_COMPOSITE_QUERIES:
+                break
+            queries += _is_query(nxt.path)
+            chunk.append(queue.pop(0))
+        return chunk
+
+    def _composite_query_limit_hit(self, queue: List[PendingCall]) -> bool:
+        chained = any(_refs_in(c.path) | _refs_in(c.body) for c in queue)
+        return chained and sum(_is_query(c.path) for c in queue) > _MAX_COMPOSITE_QUERIES
+
+    def _send_chunk(self, surface: str, chunk: List[PendingCall]) -> None:
+        ready: List[PendingCall] = []
+        for call in chunk:
+            # A reference to a call finished in an earlier chunk can no longer be
+            # resolved server-side; substitute its literal value instead. If that
+            # call failed, the dependent fails with the same error unsent.
+            try:
+                call.path = self._substitute(call.path)
+                call.body = self._substitute(call.body)
+            except Exception as exc:
+                self._finish_error(call, exc)
+                continue
+            ready.append(call)
+        if not ready:
+            return
+        chunk = ready
+        in_chunk = {c.reference_id for c in chunk}
+        chained = any((_refs_in(c.path) | _refs_in(c.body)) & in_chunk for c in chunk)
+        prefix = "tooling/" if surface == "tooling" else ""
+        self.round_trips += 1
+        try:
+            if chained:
+                resp = self._send("POST", f"{prefix}composite", {
+                    "allOrNone": False,
+                    "compositeRequest": [
+                        self._composite_item(c) for c in chunk
+                    ],
+                }, dry_run=False)
+                items = [(r.get("httpStatusCode"), r.get("body"))
+                         for r in (resp or {}).get("compositeResponse") or []]
+            else:
+                resp = self._send("POST", f"{prefix}composite/batch", {
+                    "haltOnError": False,
+                    "batchRequests": [self._batch_item(c) for c in chunk],
+                }, dry_run=False)
+                items = [(r.get("statusCode"), r.get("result"))
+                         for r in (resp or {}).get("results") or []]
+        except Exception as exc:
+            for call in chunk:
+                self._finish_error(call, exc)
+            return
+        self.log(f"[composite] {len(chunk)} sub-request(s) in 1 "
+                 f"{'composite' if chained else 'batch'} call.")
+        for index, call in enumerate(chunk):
+            if index >= len(items):
+                self._finish_error(call, self._error_factory(
+                    call.method, call.path,
+                    "Composite response carried no result for this sub-request."))
+                continue
+            status, body = items[index]
+            self._finish(call, status, body)
+
+    def _finish(self, call: PendingCall, status: Any, body: Any) -> None:
+        try:
+            status = int(status)
+        except (TypeError, ValueError):
+            status = 500
+        if status >= 400:
+            text = body if isinstance(body, str) else json.dumps(body)
+            call._resolve(error=self._error_factory(call.method, call.path, text))
+        else:
+            if call.method == "GET" and self.cache is not None:
+                self.cache.store(call.path, body)
+            if call.records:
+                try:
+                    call._resolve(self._collect_records(body))
+                except Exception as exc:
+                    call._resolve(error=exc)
+            else:
+                call._resolve({} if body in (None, "") else body)
+        self._completed[call.reference_id] = call
+
+    def _finish_error(self, call: PendingCall, exc: BaseException) -> None:
+        call._resolve(error=exc)
+        self._completed[call.reference_id] = call
+
+    def _collect_records(self, resp: Any) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        while isinstance(resp, dict):
+            records.extend(r for r in resp.get("records", []) if isinstance(r, dict))
+            if resp.get("done", True) or not resp.get("nextRecordsUrl"):
+                break
+            resp = self._send("GET", relative_next_url(resp["nextRecordsUrl"]))
+        return records
+
+    def _composite_item(self, call: PendingCall) -> Dict[str, Any]:
+        item = {
+            "method": call.method,
+            "url": f"{_VERSION_PREFIX}v{self.api_version}/{call.path}",
+            "referenceId": call.reference_id,
+        }
+        if call.body is not None:
+            item["body"] = call.body
+        return item
+
+    def _batch_item(self, call: PendingCall) -> Dict[str, Any]:
+        item = {"method": call.method, "url": f"v{self.api_version}/{call.path}"}
+        if call.body is not None:
+            item["richInput"] = call.body
+        return item
+
+    def _substitute(self, obj: Any) -> Any:
+        if isinstance(obj, str):
+            whole = _REF_PATTERN.fullmatch(obj)
+            if whole and whole.group(1) in self._completed:
+                return _lookup(self._completed[whole.group(1)].result(), whole.group(2))
+
+            def repl(match):
+                done = self._completed.get(match.group(1))
+                if done is None:
+                    return match.group(0)
+                return str(_lookup(done.result(), match.group(2)))
+
+            return _REF_PATTERN.sub(repl, obj)
+        if isinstance(obj, list):
+            return [self._substitute(v) for v in obj]
+        if isinstance(obj, dict):
+            return {k: self._substitute(v) for k, v in obj.items()}
+        return obj
+
+    def _next_ref(self) -> str:
+        self._ref_seq += 1
+        return f"ref{self._ref_seq}"
+
+    def _abandon(self, exc: BaseException) -> None:
+        for queue in self._queues.values():
+            for call in queue:
+                call._resolve(error=RuntimeError(
+                    f"{call.method} {call.path} was not sent: the batch block "
+                    f"raised {type(exc).__name__} first."))
+            queue.clear()
+
+
+class ImmediateBatch:
+    """``CompositeBatch``'s call surface over a transport with no ``batch()``.
+
+    Each call runs on the wrapped transport as it is queued (errors raise at the
+    call site, exactly as before batching existed) and comes back as an
+    already-resolved :class:`PendingCall`.
+    """
+
+    def __init__(self, transport):
+        self.t = transport
+        self.round_trips = 0
+
+    def __enter__(self) -> "ImmediateBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def flush(self) -> None:
+        return None
+
+    def _done(self, method: str, path: str, value: Any) -> PendingCall:
+        self.round_trips += 1
+        call = PendingCall(None, method, path)
+        call._resolve(value)
+        return call
+
+    def request(self, method: str, path: str, body: Any = None, **_kw) -> PendingCall:
+        send = getattr(self.t, "request", None) or self.t.connect
+        return self._done(method, path, send(method, path, body))
+
+    def connect(self, method: str, path: str, body: Any = None, **_kw) -> PendingCall:
+        send = getattr(self.t, "connect", None) or self.t.request
+        return self._done(method, path, send(method, path, body))
+
+    def sobject(self, method: str, sobject: str, record_id: Optional[str] = None,
+                body: Any = None, **_kw) -> PendingCall:
+        return self._done(method, f"sobjects/{sobject}",
+                          self.t.sobject(method, sobject, record_id, body))
+
+    def tooling_sobject(self, method: str, sobject: str, record_id: Optional[str] = None,
+                        suffix: Optional[str] = None, body: Any = None, **_kw) -> PendingCall:
+        return self._done(method, f"tooling/sobjects/{sobject}",
+                          self.t.tooling_sobject(method, sobject, record_id, suffix, body))
+
+    def soql(self, query: str, **_kw) -> PendingCall:
+        return self._done("GET", "query", self.t.soql(query))
+
+    def tooling_query(self, query: str, **_kw) -> PendingCall:
+        return self._done("GET", "tooling/query", self.t.tooling_query(query))
+
+
+def batch_for(transport, **kwargs):
+    """``transport.batch(**kwargs)`` when supported, else an :class:`ImmediateBatch`."""
+    factory = getattr(transport, "batch", None)
+    if callable(factory):
+        return factory(**kwargs)
+    return ImmediateBatch(transport)
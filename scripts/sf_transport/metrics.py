@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Request-level instrumentation for the Salesforce transports.
+
+Every request through the three toolkit ``_client`` transports (either
+backend) and ``scripts/txn_data_harness/auth.py:SfRestClient`` can be recorded
+as one sample: transport, method, templated path, status, bytes out/in, spawn
+time and total latency. Recording is off unless ``RLM_SF_METRICS_DIR`` names a
+directory; the overhead when off is one environment lookup per request.
+
+At process exit each instrumented process writes its raw samples to
+``<dir>/transport-<pid>.json`` and re-renders the directory's merged run
+summary:
+
+* ``summary.json`` — per endpoint: call count, status counts, bytes, spawn
+  seconds, and p50/p95/p99/max latency;
+* ``metrics.prom`` — the same as Prometheus text exposition
+  (``sf_transport_request_duration_seconds`` histogram, request/byte/spawn
+  counters), ready for a node-exporter textfile collector.
+
+The build harness points each step at its own directory, so
+``scripts/build_harness/harness/reporting.py`` can attribute latency per step.
+
+Path templating keeps label cardinality bounded: the ``/services/data/vXX.0/``
+prefix and query strings are dropped and record ids / query locators become
+``{id}`` / ``{locator}`` (``sobjects/Account/001...`` → ``sobjects/Account/{id}``).
+
+Spawn time: for the ``cli`` backends it is the CPU time the ``sf`` child spent
+(Node boot plus its own JSON work — time not spent waiting on the network),
+read from ``RUSAGE_CHILDREN``; concurrent children in one process blur it. It
+is 0 for in-process HTTP.
+"""
+
+import atexit
+import json
+import math
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+try:  # POSIX only; spawn time reads as 0 elsewhere.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+ENV_VAR = "RLM_SF_METRICS_DIR"
+SUMMARY_JSON = "summary.json"
+SUMMARY_PROM = "metrics.prom"
+_RAW_GLOB = "transport-*.json"
+
+# Histogram upper bounds (seconds) for the Prometheus export.
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+_VERSION_PREFIX = re.compile(r"^/?(services/data/)?v\d+\.\d+/")
+_LOCATOR = re.compile(r"^(tooling/)?query/[^/]+$")
+
+
+def enabled() -> bool:
+    return bool(os.environ.get(ENV_VAR))
+
+
+def _is_record_id(segment: str) -> bool:
+    return (len(segment) in (15, 18) and segment.isalnum()
+            and any(c.isdigit() for c in segment))
+
+
+def template_path(path: str) -> str:
+    """Collapse a request path to a bounded endpoint label."""
+    rel = _VERSION_PREFIX.sub("", unquote(path).split("?", 1)[0].lstrip("/"), count=1)
+    if _LOCATOR.match(rel):
+        return rel.rsplit("/", 1)[0] + "/{locator}"
+    return "/".join("{id}" if _is_record_id(s) else s for s in rel.split("/"))
+
+
+def _child_cpu() -> float:
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+class Sample:
+    """One in-flight request; filled in by the caller inside :func:`track`."""
+
+    def __init__(self, transport: str, method: str, path: str, bytes_out: int = 0):
+        self.transport = transport
+        self.method = method.upper()
+        self.path = path
+        self.bytes_out = bytes_out
+        self.bytes_in = 0
+        self.status: Optional[str] = None
+        self.active = True
+
+    def complete(self, result: Any) -> None:
+        """Read status and size off a CLI-shaped ``CompletedProcess``."""
+        if not self.active:
+            return
+        status = getattr(result, "http_status", None)
+        if status is None:
+            status = "ok" if getattr(result, "returncode", 1) == 0 else "error"
+        self.status = str(status)
+        self.bytes_in = _size(getattr(result, "stdout", "") or "")
+
+
+def _size(payload: Any) -> int:
+    if payload is None:
+        return 0
+    if isinstance(payload, (bytes, bytearray)):
+        return len(payload)
+    return len(str(payload).encode("utf-8"))
+
+
+class track:
+    """Context manager timing one request when recording is enabled::
+
+        with metrics.track("http", method, full_path, body_text) as sample:
+            result = send(...)
+            sample.complete(result)
+
+    An exception leaves ``status`` as ``exception`` and still records.
+    """
+
+    def __init__(self, transport: str, method: str, path: str, body: Any = None, *,
+                 spawn: bool = False):
+        self._on = enabled()
+        self._spawn = spawn
+        self.sample = Sample(transport, method, path)
+        self.sample.active = self._on
+        if self._on:
+            self.sample.bytes_out = _size(body)
+
+    def __enter__(self) -> Sample:
+        if self._on:
+            self._cpu = _child_cpu() if self._spawn else 0.0
+            self._started = time.perf_counter()
+        return self.sample
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not self._on:
+            return
+        latency = time.perf_counter() - self._started
+        spawn = max(_child_cpu() - self._cpu, 0.0) if self._spawn else 0.0
+        sample = self.sample
+        if sample.status is None:
+            sample.status = "exception" if exc_type else "ok"
+        recorder().record(sample, latency=latency, spawn=spawn)
+
+
+class Recorder:
+    """Process-wide sample store, flushed to ``RLM_SF_METRICS_DIR`` at exit."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+        self._registered = False
+
+    def record(self, sample: Sample, *, latency: float, spawn: float) -> None:
+        endpoint = template_path(sample.path)
+        key = (sample.transport, sample.method, endpoint)
+        with self._lock:
+            row = self._series.get(key)
+            if row is None:
+                row = self._series[key] = {
+                    "transport": sample.transport, "method": sample.method,
+                    "endpoint": endpoint, "statuses": {}, "bytes_out": 0,
+                    "bytes_in": 0, "spawn_seconds": 0.0, "latencies": [],
+                }
+            row["statuses"][sample.status] = row["statuses"].get(sample.status, 0) + 1
+            row["bytes_out"] += sample.bytes_out
+            row["bytes_in"] += sample.bytes_in
+            row["spawn_seconds"] += spawn
+            row["latencies"].append(round(latency, 6))
+            if not self._registered:
+                self._registered = True
+                atexit.register(self.flush)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def series(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(row, latencies=list(row["latencies"]),
+                         statuses=dict(row["statuses"])) for row in self._series.values()]
+
+    def flush(self, directory: Optional[str] = None) -> Optional[Path]:
+        """Write this process's raw samples and refresh the merged summary."""
+        directory = directory or os.environ.get(ENV_VAR)
+        series = self.series()
+        if not directory or not series:
+            return None
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+        raw = out / f"transport-{os.getpid()}.json"
+        _write_atomic(raw, json.dumps({"pid": os.getpid(), "series": series}))
+        write_summary(out)
+        return raw
+
+
+_RECORDER = Recorder()
+
+
+def recorder() -> Recorder:
+    return _RECORDER
+
+
+# --------------------------------------------------------------------------- #
+# Summaries
+# --------------------------------------------------------------------------- #
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def merge_series(groups: Iterable[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    merged: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+    for series in groups:
+        for row in series:
+            key = (row["transport"], row["method"], row["endpoint"])
+            into = merged.get(key)
+            if into is None:
+                merged[key] = dict(row, statuses=dict(row["statuses"]),
+                                   latencies=list(row["latencies"]))
+                continue
+            for status, count in row["statuses"].items():
+                into["statuses"][status] = into["statuses"].get(status, 0) + count
+            into["bytes_out"] += row["bytes_out"]
+            into["bytes_in"] += row["bytes_in"]
+            into["spawn_seconds"] += row["spawn_seconds"]
+            into["latencies"].extend(row["latencies"])
+    return list(merged.values())
+
+
+def summarize(series: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Per-endpoint call counts and p50/p95/p99 latency, slowest total first."""
+    endpoints = []
+    for row in series:
+        lat = row["latencies"]
+        endpoints.append({
+            "transport": row["transport"],
+            "method": row["method"],
+            "endpoint": row["endpoint"],
+            "calls": len(lat),
+            "statuses": row["statuses"],
+            "bytes_out": row["bytes_out"],
+            "bytes_in": row["bytes_in"],
+            "spawn_seconds": round(row["spawn_seconds"], 3),
+            "total_seconds": round(sum(lat), 3),
+            "p50_seconds": round(percentile(lat, 50), 4),
+            "p95_seconds": round(percentile(lat, 95), 4),
+            "p99_seconds": round(percentile(lat, 99), 4),
+            "max_seconds": round(max(lat) if lat else 0.0, 4),
+            "buckets": [sum(1 for v in lat if v <= b) for b in BUCKETS],
+        })
+    endpoints.sort(key=lambda e: e["total_seconds"], reverse=True)
+    return {
+        "calls": sum(e["calls"] for e in endpoints),
+        "total_seconds": round(sum(e["total_seconds"] for e in endpoints), 3),
+        "spawn_seconds": round(sum(e["spawn_seconds"] for e in endpoints), 3),
+        "bytes_out": sum(e["bytes_out"] for e in endpoints),
+        "bytes_in": sum(e["bytes_in"] for e in endpoints),
+        "endpoints": endpoints,
+    }
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_prometheus(summary: Dict[str, Any]) -> str:
+    """Prometheus text exposition of a :func:`summarize` result."""
+    lines = [
+        "# HELP sf_transport_request_duration_seconds Salesforce request latency.",
+        "# TYPE sf_transport_request_duration_seconds histogram",
+    ]
+    counters: Dict[str, List[str]] = {"requests": [], "bytes_out": [], "bytes_in": [],
+                                      "spawn": []}
+    for e in summary.get("endpoints", []):
+        base = (f'transport="{_label(e["transport"])}",method="{_label(e["method"])}",'
+                f'endpoint="{_label(e["endpoint"])}"')
+        for bound, count in zip(BUCKETS, e["buckets"]):
+            lines.append(f'sf_transport_request_duration_seconds_bucket{{{base},le="{bound:g}"}} {count}')
+        lines.append(f'sf_transport_request_duration_seconds_bucket{{{base},le="+Inf"}} {e["calls"]}')
+        lines.append(f"sf_transport_request_duration_seconds_sum{{{base}}} {e['total_seconds']}")
+        lines.append(f"sf_transport_request_duration_seconds_count{{{base}}} {e['calls']}")
+        for status, count in sorted(e["statuses"].items()):
+            counters["requests"].append(
+                f'sf_transport_requests_total{{{base},status="{_label(status)}"}} {count}')
+        counters["bytes_out"].append(f"sf_transport_request_bytes_total{{{base}}} {e['bytes_out']}")
+        counters["bytes_in"].append(f"sf_transport_response_bytes_total{{{base}}} {e['bytes_in']}")
+        counters["spawn"].append(f"sf_transport_spawn_seconds_total{{{base}}} {e['spawn_seconds']}")
+    for name, help_text, key in (
+        ("sf_transport_requests_total", "Requests by status.", "requests"),
+        ("sf_transport_request_bytes_total", "Request body bytes sent.", "bytes_out"),
+        ("sf_transport_response_bytes_total", "Response body bytes received.", "bytes_in"),
+        ("sf_transport_spawn_seconds_total", "CPU seconds spent in sf CLI children.", "spawn"),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        lines.extend(counters[key])
+    return "\n".join(lines) + "\n"
+
+
+def load_dir(directory: Path) -> Dict[str, Any]:
+    """Merge every process's raw samples under ``directory`` into a summary."""
+    groups = []
+    for raw in sorted(Path(directory).glob(_RAW_GLOB)):
+        try:
+            groups.append(json.loads(raw.read_text(encoding="utf-8")).get("series") or [])
+        except (OSError, ValueError):
+            continue
+    return summarize(merge_series(groups))
+
+
+def write_summary(directory: Path) -> Dict[str, Any]:
+    """(Re)write ``summary.json`` and ``metrics.prom`` for ``directory``."""
+    directory = Path(directory)
+    summary = load_dir(directory)
+    _write_atomic(directory / SUMMARY_JSON, json.dumps(summary, indent=2) + "\n")
+    _write_atomic(directory / SUMMARY_PROM, render_prometheus(summary))
+    return summary
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Streaming SOQL pagination with a one-page prefetch.
+
+A REST query answers at most one batch (default 2000 records) plus a
+``nextRecordsUrl`` for the rest. :func:`iter_pages` walks those pages lazily;
+with ``prefetch`` on, the request for page N+1 is sent on a background thread
+as soon as page N arrives, so the caller's work on page N overlaps the network
+round trip for the next one. At most two pages are held at once, so a dump,
+delete or key scan over a large object stays memory-bounded.
+
+Shared by the toolkit ``_client`` modules (``iter_soql_query`` and friends)
+and ``scripts/txn_data_harness/auth.py:SfRestClient.iter_query``::
+
+    for record in _client.iter_soql_query("SELECT Id FROM Asset", target_org=org):
+        ...
+
+Abandoning the iterator early (``break``, an exception, ``close()``) leaves at
+most the one in-flight prefetch to finish in the background; its result is
+dropped. An error fetching a page is raised where that page would have been
+yielded, so records already consumed are unaffected.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_VERSION_PREFIX = "/services/data/"
+
+
+def relative_next_url(next_url: str) -> str:
+    """Strip ``/services/data/vXX.0/`` from a ``nextRecordsUrl`` (keeps ``tooling/``)."""
+    if next_url.startswith(_VERSION_PREFIX):
+        return next_url.split("/", 4)[-1]
+    return next_url.lstrip("/")
+
+
+def _next_url(page: Any) -> Optional[str]:
+    if not isinstance(page, dict) or page.get("done", True):
+        return None
+    return page.get("nextRecordsUrl") or None
+
+
+def iter_pages(first_page: Any, fetch: Callable[[str], Any], *,
+               prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield ``first_page`` and every following query page.
+
+    ``fetch(next_records_url)`` returns the next page (the raw ``nextRecordsUrl``
+    is passed through; see :func:`relative_next_url`). A non-dict page ends the
+    walk, mirroring the toolkits' eager helpers.
+    """
+    page = first_page
+    if not isinstance(page, dict):
+        return
+    if not prefetch:
+        while isinstance(page, dict):
+            yield page
+            url = _next_url(page)
+            if url is None:
+                return
+            page = fetch(url)
+        return
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="soql-prefetch")
+    try:
+        while isinstance(page, dict):
+            url = _next_url(page)
+            pending = executor.submit(fetch, url) if url is not None else None
+            yield page
+            if pending is None:
+                return
+            page = pending.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_records(first_page: Any, fetch: Callable[[str], Any], *,
+                 prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+    """Yield each dict record across :func:`iter_pages`."""
+    for page in iter_pages(first_page, fetch, prefetch=prefetch):
+        for record in page.get("records") or []:
+            if isinstance(record, dict):
+                yield record
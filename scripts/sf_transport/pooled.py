@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""In-process pooled HTTPS backend for the toolkit ``_client`` transports.
+
+The default toolkit backend (``cli``) runs ``sf api request rest`` per call —
+a fresh Node process every time, 1-3 s of startup before any network time. The
+``http`` backend here makes the same request from our own process instead:
+
+* the access token + instance URL are resolved **once per org** through the
+  ``sf`` CLI (:func:`scripts.txn_data_harness.auth.resolve_auth` — the token is
+  read *out of* the CLI, held in memory for the run, never logged or written);
+* each thread keeps one keep-alive ``requests.Session`` (sessions are not
+  thread-safe), so a plan apply reuses a single TLS connection;
+* a 401 re-resolves the token once and replays the request (the CLI refreshes an
+  expired token transparently; this keeps that behavior).
+
+:meth:`PooledBackend.send` returns a ``subprocess.CompletedProcess`` exactly
+shaped like the CLI's: ``returncode`` 0 on 2xx and 1 otherwise, the raw
+response body on ``stdout`` (the Salesforce ``[{errorCode, message}]`` array on
+failure). The calling ``connect_request`` therefore keeps its own
+``error_codes`` parsing, dry-run short-circuit and read/mutation timeouts.
+
+Selection (default stays ``cli``)::
+
+    RLM_SF_TRANSPORT=http python scripts/context_service/definition/apply_context_plan.py ...
+    python scripts/expression_sets/apply_expression_set_overlay.py --transport http ...
+
+``requests`` is imported lazily, so the toolkits remain stdlib-only unless the
+``http`` backend is actually selected.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+ENV_VAR = "RLM_SF_TRANSPORT"
+BACKEND_CLI = "cli"
+BACKEND_HTTP = "http"
+BACKENDS = (BACKEND_CLI, BACKEND_HTTP)
+
+# Reads are safe to replay on a transient failure; mutations are not (a retried
+# POST could create twice), so only GET/HEAD retry — mirroring the CLI, which
+# never retries at all.
+_RETRYABLE_STATUS = {429, 502, 503, 504}
+_READ_RETRIES = 3
+_BACKOFF_BASE = 1.0  # seconds; exponential: base * 2**attempt
+
+
+def resolve_backend(backend: Optional[str] = None, *,
+                    error_cls: Type[Exception] = ValueError) -> str:
+    """Return the effective backend name: explicit ``backend``, else the
+    ``RLM_SF_TRANSPORT`` environment variable, else ``cli``.
+
+    Raises ``error_cls`` for an unknown name so each toolkit surfaces it as its
+    own client error.
+    """
+    name = (backend or os.environ.get(ENV_VAR) or BACKEND_CLI).strip().lower()
+    if name not in BACKENDS:
+        raise error_cls(
+            f"Unknown Salesforce transport backend '{name}' "
+            f"(set {ENV_VAR} to one of: {', '.join(BACKENDS)})."
+        )
+    return name
+
+
+def add_transport_argument(parser) -> None:
+    """Add the shared ``--transport {cli,http}`` flag to an entry script's parser."""
+    parser.add_argument(
+        "--transport", choices=BACKENDS, default=None,
+        help=f"Request backend: 'cli' spawns `sf api request rest` per call; "
+             f"'http' resolves the token once and reuses a pooled HTTPS "
+             f"connection. Default: ${ENV_VAR}, else 'cli'.",
+    )
+
+
+def apply_transport_argument(args) -> None:
+    """Make a parsed ``--transport`` value process-wide.
+
+    The toolkits' resolvers call the module-level request functions directly
+    (not only the bound ``Transport``), so the flag is applied through the same
+    environment variable they all consult.
+    """
+    if getattr(args, "transport", None):
+        os.environ[ENV_VAR] = args.transport
+
+
+def _default_auth_resolver(target_org: str) -> Tuple[str, str]:
+    from scripts.txn_data_harness.auth import resolve_auth
+
+    return resolve_auth(target_org)
+
+
+def _new_session():
+    import requests
+
+    session = requests.Session()
+    session.headers.update({
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    })
+    return session
+
+
+class PooledBackend:
+    """One org's in-process HTTPS backend (token resolved once, pooled sessions).
+
+    ``auth_resolver(target_org) -> (access_token, instance_url)`` and
+    ``session_factory() -> requests.Session``-like are injectable so the backend
+    can be exercised offline.
+    """
+
+    def __init__(self, target_org: str, *,
+                 auth_resolver: Callable[[str], Tuple[str, str]] = None,
+                 session_factory: Callable[[], Any] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.target_org = target_org
+        self._auth_resolver = auth_resolver or _default_auth_resolver
+        self._session_factory = session_factory or _new_session
+        self._sleep = sleep
+        self._auth: Optional[Tuple[str, str]] = None
+        self._auth_lock = threading.Lock()
+        self._local = threading.local()
+
+    # ----- auth --------------------------------------------------------------
+    def credentials(self, error_cls: Type[Exception] = RuntimeError) -> Tuple[str, str]:
+        """Return ``(access_token, instance_url)``, resolving on first use."""
+        with self._auth_lock:
+            if self._auth is None:
+                try:
+                    token, instance_url = self._auth_resolver(self.target_org)
+                except Exception as exc:  # SfCliError, FileNotFoundError, ...
+                    raise error_cls(
+                        f"Could not resolve an access token for org "
+                        f"'{self.target_org}' via the sf CLI: {exc}\n"
+                        f"Authenticate first (`sf org login web --alias "
+                        f"{self.target_org}`)."
+                    ) from exc
+                self._auth = (token, instance_url.rstrip("/"))
+            return self._auth
+
+    def _invalidate(self, stale_token: str) -> None:
+        with self._auth_lock:
+            # Another thread may already have refreshed; only drop our stale copy.
+            if self._auth is not None and self._auth[0] == stale_token:
+                self._auth = None
+
+    @property
+    def session(self):
+        """This thread's keep-alive session, created on first use."""
+        sess = getattr(self._local, "session", None)
+        if sess is None:
+            sess = self._session_factory()
+            self._local.session = sess
+        return sess
+
+    # ----- request -----------------------------------------------------------
+    def send(self, method: str, full_path: str, input_text: Optional[str] = None,
+             *, timeout: int, error_cls: Type[Exception] = RuntimeError
+             ) -> subprocess.CompletedProcess:
+        """Send one request; return a CLI-shaped ``CompletedProcess``.
+
+        ``full_path`` is the versioned service path (``/services/data/vXX.0/...``)
+        the toolkit already built for the CLI. Transport failures (timeout,
+        connection refused, unresolvable auth) raise ``error_cls``; HTTP error
+        statuses do NOT raise — they come back as ``returncode=1`` with the body
+        on ``stdout`` so the caller's error-code parsing applies.
+        """
+        import requests
+
+        method = method.upper()
+        data = input_text.encode("utf-8") if input_text else None
+        retries = _READ_RETRIES if method in ("GET", "HEAD") else 1
+        reauthed = False
+        attempt = 0
+        while True:
+            token, instance_url = self.credentials(error_cls)
+            try:
+                resp = self.session.request(
+                    method, f"{instance_url}{full_path}", data=data,
+                    headers={"Authorization": f"Bearer {token}"}, timeout=timeout,
+                )
+            except requests.Timeout as exc:
+                raise error_cls(
+                    f"{method} {full_path} timed out after {timeout}s "
+                    f"(http backend, org '{self.target_org}')."
+                ) from exc
+            except requests.RequestException as exc:
+                attempt += 1
+                if attempt < retries:
+                    self._sleep(_BACKOFF_BASE * (2 ** (attempt - 1)))
+                    continue
+                raise error_cls(
+                    f"{method} {full_path} failed for org '{self.target_org}' "
+                    f"(http backend): {exc}"
+                ) from exc
+
+            if resp.status_code == 401 and not reauthed:
+                reauthed = True
+                self._invalidate(token)
+                continue
+            if resp.status_code in _RETRYABLE_STATUS:
+                attempt += 1
+                if attempt < retries:
+                    self._sleep(_BACKOFF_BASE * (2 ** (attempt - 1)))
+                    continue
+            break
+
+        ok = 200 <= resp.status_code < 300
+        result = subprocess.CompletedProcess(
+            args=[method, full_path],
+            returncode=0 if ok else 1,
+            stdout=resp.text or "",
+            stderr="" if ok else f"HTTP {resp.status_code} {resp.reason or ''}".rstrip(),
+        )
+        result.http_status = resp.status_code  # read by scripts/sf_transport/metrics.py
+        return result
+
+
+_BACKENDS: Dict[str, PooledBackend] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_backend(target_org: str) -> PooledBackend:
+    """Return the process-wide :class:`PooledBackend` for ``target_org``."""
+    with _REGISTRY_LOCK:
+        backend = _BACKENDS.get(target_org)
+        if backend is None:
+            backend = PooledBackend(target_org)
+            _BACKENDS[target_org] = backend
+        return backend
+
+
+def register_backend(backend: PooledBackend) -> None:
+    """Install a pre-built backend for its org (offline tests, alternate auth)."""
+    with _REGISTRY_LOCK:
+        _BACKENDS[backend.target_org] = backend
+
+
+def reset_backends() -> None:
+    """Drop every cached backend (tokens and sessions)."""
+    with _REGISTRY_LOCK:
+        _BACKENDS.clear()
+
+
+def send(method: str, full_path: str, input_text: Optional[str] = None, *,
+         target_org: str, timeout: int,
+         error_cls: Type[Exception] = RuntimeError) -> subprocess.CompletedProcess:
+    """Module-level convenience: :meth:`PooledBackend.send` on the org's backend."""
+    return get_backend(target_org).send(
+        method, full_path, input_text, timeout=timeout, error_cls=error_cls,
+    )
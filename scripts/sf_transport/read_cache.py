@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+"""Persistent, org-scoped read cache for the toolkit ``_client`` transports.
+
+The read-only inspectors (``describe_context.py``, ``trace_context.py``,
+``diff_context.py``, ``describe_expression_set.py``, ``diff_expression_set.py``,
+``describe_decision_table.py``, ``diff_decision_tables.py``) re-fetch the same
+definitions on every run — an expression-set definition alone is 100+ KB. With
+the cache enabled, a GET answered within its TTL comes off local disk, and an
+expired entry is *revalidated* with a one-row stamp query instead of refetched
+when nothing changed.
+
+Opt-in only (default off)::
+
+    RLM_SF_READ_CACHE=1     python scripts/expression_sets/describe_expression_set.py ...
+    RLM_SF_READ_CACHE=900   ...                     # TTL in seconds (1/on = 300 s)
+    python scripts/decision_tables/describe_decision_table.py --read-cache ...
+    python -m scripts.sf_transport.read_cache --clear [--target-org ALIAS]
+
+Semantics:
+
+* **Key** — ``(SF CLI alias, API version, request path)``. The alias is the org
+  handle every toolkit call already carries; an alias re-pointed at a new org is
+  caught by revalidation or ``--clear``.
+* **TTL** — an entry younger than the TTL is served as-is.
+* **Revalidation** — each toolkit declares :class:`Validator` rules for its
+  large resources (a path pattern plus a SOQL/Tooling query selecting
+  ``SystemModstamp``/``LastModifiedDate``). An expired entry whose stamp still
+  matches is renewed in place; a changed or unverifiable stamp refetches.
+  Paths without a rule are simply refetched after the TTL.
+* **Invalidation** — any mutating verb sent through the same client drops the
+  entries it can affect: paths sharing a record id with it, paths in the same
+  declared ``related`` family, and every cached query on the same surface.
+  Composite requests are unpacked, so a read-only ``composite/batch`` never
+  invalidates anything.
+* **Never cached** — query pages that are not ``done`` and ``query/<locator>``
+  continuation paths (server-side cursors expire).
+
+Storage is one SQLite file (``RLM_SF_READ_CACHE_DIR``, default
+``~/.cache/rlm-base-dev``), safe across the threads and processes of one user.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import quote, unquote
+
+ENV_VAR = "RLM_SF_READ_CACHE"
+DIR_ENV_VAR = "RLM_SF_READ_CACHE_DIR"
+DEFAULT_TTL = 300.0
+_DB_NAME = "sf-read-cache.sqlite3"
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+")
+_LOCATOR_PATTERN = re.compile(r"^(tooling/)?query/[^?]+$")
+_VERSION_PREFIX = re.compile(r"^/?(services/data/)?v\d+\.\d+/")
+
+
+class _Miss:
+    def __repr__(self) -> str:
+        return "MISS"
+
+
+MISS = _Miss()
+
+
+class Validator(NamedTuple):
+    """Revalidation rule: ``pattern`` (with an ``id`` group) → stamp ``soql``.
+
+    ``soql`` is formatted with ``id=``; its records (``attributes`` stripped)
+    are the stamp. ``tooling=True`` runs it on ``/tooling/query``.
+    """
+
+    pattern: str
+    soql: str
+    tooling: bool = False
+
+    def match(self, path: str) -> Optional[str]:
+        m = re.match(self.pattern, _bare(path))
+        return m.group("id") if m else None
+
+
+class Rules(NamedTuple):
+    """A toolkit's cache declarations: revalidators and related path families."""
+
+    validators: Tuple[Validator, ...] = ()
+    related: Tuple[Tuple[str, ...], ...] = ()
+
+
+def _bare(path: str) -> str:
+    return path.lstrip("/")
+
+
+def _surface(path: str) -> str:
+    return "tooling" if _bare(path).startswith("tooling/") else "rest"
+
+
+def _is_query(path: str) -> bool:
+    rel = _bare(path)
+    if rel.startswith("tooling/"):
+        rel = rel[len("tooling/"):]
+    return rel.startswith(("query?", "queryAll?", "query/"))
+
+
+def _is_record_id(token: str) -> bool:
+    # 15/18-char Salesforce ids always carry a digit; sObject names never do.
+    return len(token) in (15, 18) and any(c.isdigit() for c in token)
+
+
+def _record_ids(path: str) -> set:
+    return {t for t in _TOKEN_PATTERN.findall(unquote(path)) if _is_record_id(t)}
+
+
+def _resource_root(rel: str) -> str:
+    """The path up to its first record-id segment (``sobjects/Account/001…`` →
+    ``sobjects/Account``): the collection a mutation belongs to."""
+    parts = []
+    for segment in rel.split("/"):
+        if _is_record_id(segment):
+            break
+        parts.append(segment)
+    return "/".join(parts)
+
+
+def _strip_version(url: str) -> str:
+    return _VERSION_PREFIX.sub("", url, count=1)
+
+
+def cacheable(path: str, value: Any) -> bool:
+    """False for cursor pages and locator paths (they expire server-side)."""
+    if _LOCATOR_PATTERN.match(_bare(path)):
+        return False
+    return not (isinstance(value, dict) and value.get("done") is False)
+
+
+def ttl_from_env() -> Optional[float]:
+    """The configured TTL in seconds, or ``None`` when the cache is off."""
+    raw = (os.environ.get(ENV_VAR) or "").strip().lower()
+    if raw in ("", "0", "off", "false", "no"):
+        return None
+    if raw in ("1", "on", "true", "yes"):
+        return DEFAULT_TTL
+    try:
+        return max(float(raw), 0.0)
+    except ValueError:
+        return DEFAULT_TTL
+
+
+def default_path() -> Path:
+    base = os.environ.get(DIR_ENV_VAR) or Path.home() / ".cache" / "rlm-base-dev"
+    return Path(base) / _DB_NAME
+
+
+class _Store:
+    """The SQLite file behind every org scope (one connection per process)."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " scope TEXT NOT NULL, path TEXT NOT NULL, body TEXT NOT NULL,"
+            " stamp TEXT, stored_at REAL NOT NULL, PRIMARY KEY (scope, path))"
+        )
+
+    def get(self, scope: str, path: str) -> Optional[Tuple[str, Optional[str], float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT body, stamp, stored_at FROM entries WHERE scope = ? AND path = ?",
+                (scope, path),
+            ).fetchone()
+
+    def put(self, scope: str, path: str, body: str, stamp: Optional[str],
+            stored_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (scope, path, body, stamp, stored_at),
+            )
+
+    def touch(self, scope: str, path: str, stored_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET stored_at = ? WHERE scope = ? AND path = ?",
+                (stored_at, scope, path),
+            )
+
+    def paths(self, scope: str) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute(
+                "SELECT path FROM entries WHERE scope = ?", (scope,))]
+
+    def delete(self, scope: str, paths: Iterable[str]) -> int:
+        paths = list(paths)
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM entries WHERE scope = ? AND path = ?",
+                [(scope, p) for p in paths],
+            )
+        return len(paths)
+
+    def clear(self, scope_prefix: Optional[str] = None) -> int:
+        with self._lock:
+            if scope_prefix is None:
+                cur = self._conn.execute("DELETE FROM entries")
+            else:
+                cur = self._conn.execute(
+                    "DELETE FROM entries WHERE scope LIKE ? ESCAPE '\\'",
+                    (_like_prefix(scope_prefix),),
+                )
+            return cur.rowcount
+
+
+def _like_prefix(prefix: str) -> str:
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class OrgCache:
+    """One org + API version's view of the cache, bound to a toolkit's rules.
+
+    ``get(path)`` is the toolkit's *uncached* GET (used for stamp queries);
+    ``clock`` is injectable for tests.
+    """
+
+    def __init__(self, store: _Store, target_org: str, api_version: str, *,
+                 ttl: float, rules: Rules, get: Callable[[str], Any],
+                 clock: Callable[[], float] = time.time):
+        self._store = store
+        self.scope = f"{target_org}|v{api_version}"
+        self.ttl = ttl
+        self.rules = rules
+        self._get = get
+        self._clock = clock
+
+    # ----- reads -------------------------------------------------------------
+    def read(self, path: str, fetch: Callable[[], Any]) -> Any:
+        """Serve ``path`` from the cache, revalidating or calling ``fetch()``."""
+        path = _bare(path)
+        value = self.lookup(path)
+        if value is not MISS:
+            return value
+        validator, record_id = self._validator(path)
+        stamp = self._stamp(validator, record_id) if validator else None
+        with bypass():
+            value = fetch()
+        self.store(path, value, stamp=stamp)
+        return value
+
+    def lookup(self, path: str) -> Any:
+        """The cached value for ``path`` (revalidated if expired) or :data:`MISS`."""
+        path = _bare(path)
+        row = self._store.get(self.scope, path)
+        if row is None:
+            return MISS
+        body, stamp, stored_at = row
+        now = self._clock()
+        if now - stored_at < self.ttl:
+            return json.loads(body)
+        validator, record_id = self._validator(path)
+        if validator is None or stamp is None:
+            return MISS
+        current = self._stamp(validator, record_id)
+        if current is None or current != stamp:
+            return MISS
+        self._store.touch(self.scope, path, now)
+        return json.loads(body)
+
+    def store(self, path: str, value: Any, *, stamp: Optional[str] = None) -> None:
+        """Cache ``value``; ``stamp`` defaults to one read off the body itself."""
+        path = _bare(path)
+        if not cacheable(path, value):
+            return
+        if stamp is None:
+            validator, _ = self._validator(path)
+            if validator is not None:
+                stamp = _stamp_from_body(validator, value)
+        self._store.put(self.scope, path, json.dumps(value), stamp, self._clock())
+
+    # ----- invalidation ------------------------------------------------------
+    def invalidate(self, method: str, path: str, body: Any = None) -> int:
+        """Drop what a ``method`` request to ``path`` can change; return the count."""
+        method = method.upper()
+        if method in ("GET", "HEAD"):
+            return 0
+        rel = _bare(path).split("?", 1)[0]
+        if re.match(r"^(tooling/)?composite(/batch)?$", rel):
+            return self._invalidate_composite(rel, body)
+        return self._invalidate_one(rel)
+
+    def _invalidate_composite(self, rel: str, body: Any) -> int:
+        prefix = "tooling/" if rel.startswith("tooling/") else ""
+        items = []
+        if isinstance(body, dict):
+            items = body.get("compositeRequest") or body.get("batchRequests") or []
+        dropped = 0
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            sub = _strip_version(str(item.get("url") or ""))
+            if prefix and not sub.startswith(prefix):
+                sub = prefix + sub
+            dropped += self.invalidate(str(item.get("method") or "GET"), sub,
+                                       item.get("body") or item.get("richInput"))
+        return dropped
+
+    def _invalidate_one(self, rel: str) -> int:
+        ids = _record_ids(rel)
+        surface = _surface(rel)
+        families = [f for f in self.rules.related
+                    if any(rel.startswith(p) for p in f)]
+        root = _resource_root(rel)
+        doomed = []
+        for cached in self._store.paths(self.scope):
+            if _is_query(cached) and _surface(cached) == surface:
+                doomed.append(cached)
+            elif ids & _record_ids(cached):
+                doomed.append(cached)
+            elif root and cached.startswith(root):
+                doomed.append(cached)
+            elif any(cached.startswith(p) for f in families for p in f):
+                doomed.append(cached)
+        return self._store.delete(self.scope, doomed)
+
+    # ----- stamps ------------------------------------------------------------
+    def _validator(self, path: str) -> Tuple[Optional[Validator], Optional[str]]:
+        for validator in self.rules.validators:
+            record_id = validator.match(path)
+            if record_id:
+                return validator, record_id
+        return None, None
+
+    def _stamp(self, validator: Validator, record_id: str) -> Optional[str]:
+        soql = validator.soql.format(id=record_id.replace("'", "\\'"))
+        query_path = f"{'tooling/' if validator.tooling else ''}query?q={quote(soql)}"
+        try:
+            with bypass():
+                resp = self._get(query_path)
+        except Exception:
+            # Unverifiable: treat as changed and refetch (never serve blindly).
+            return None
+        records = resp.get("records") if isinstance(resp, dict) else None
+        if not records:
+            return None
+        return _canonical([_strip_attributes(r) for r in records])
+
+
+def _strip_attributes(record: Any) -> Any:
+    if isinstance(record, dict):
+        return {k: _strip_attributes(v) for k, v in record.items() if k != "attributes"}
+    return record
+
+
+def _canonical(records: List[Any]) -> str:
+    return json.dumps(records, sort_keys=True, separators=(",", ":"))
+
+
+def _stamp_from_body(validator: Validator, value: Any) -> Optional[str]:
+    """Derive the stamp a single-record validator would return from a GET body
+    that already carries the selected fields (Tooling sObject GETs do)."""
+    m = re.match(r"\s*SELECT\s+(.+?)\s+FROM\s", validator.soql, re.IGNORECASE)
+    if not m or not isinstance(value, dict):
+        return None
+    fields = [f.strip() for f in m.group(1).split(",")]
+    if any(f not in value for f in fields):
+        return None
+    return _canonical([{f: value[f] for f in fields}])
+
+
+# --------------------------------------------------------------------------- #
+# Process-wide switch
+# --------------------------------------------------------------------------- #
+
+_STORES: Dict[Path, _Store] = {}
+_STORES_LOCK = threading.Lock()
+_LOCAL = threading.local()
+
+
+class bypass:
+    """Context manager: requests made inside skip the cache on this thread."""
+
+    def __enter__(self) -> "bypass":
+        _LOCAL.depth = getattr(_LOCAL, "depth", 0) + 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _LOCAL.depth -= 1
+
+
+def _store_for(path: Path) -> _Store:
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = _Store(path)
+            _STORES[path] = store
+        return store
+
+
+def for_org(target_org: str, api_version: str, rules: Rules,
+            get: Callable[[str], Any]) -> Optional[OrgCache]:
+    """The active :class:`OrgCache` for a request, or ``None`` when the cache is
+    off (the default) or bypassed on this thread."""
+    if getattr(_LOCAL, "depth", 0):
+        return None
+    ttl = ttl_from_env()
+    if ttl is None:
+        return None
+    return OrgCache(_store_for(default_path()), target_org, api_version,
+                    ttl=ttl, rules=rules, get=get)
+
+
+def clear(target_org: Optional[str] = None) -> int:
+    """Delete cached entries (all, or one alias's); return how many."""
+    prefix = f"{target_org}|" if target_org else None
+    return _store_for(default_path()).clear(prefix)
+
+
+def add_read_cache_argument(parser) -> None:
+    """Add the shared ``--read-cache [TTL]`` flag to an inspector's parser."""
+    parser.add_argument(
+        "--read-cache", nargs="?", const=str(int(DEFAULT_TTL)), default=None,
+        metavar="TTL",
+        help=f"Serve repeated GETs from the on-disk read cache (TTL seconds, "
+             f"default {int(DEFAULT_TTL)}; expired entries are revalidated by "
+             f"SystemModstamp/LastModifiedDate). Default: ${ENV_VAR}, else off.",
+    )
+
+
+def apply_read_cache_argument(args) -> None:
+    """Make a parsed ``--read-cache`` value process-wide (see ``pooled``)."""
+    if getattr(args, "read_cache", None):
+        os.environ[ENV_VAR] = args.read_cache
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the toolkit read cache.")
+    parser.add_argument("--clear", action="store_true", help="Delete cached entries.")
+    parser.add_argument("--target-org", help="Limit --clear to one SF CLI alias.")
+    args = parser.parse_args(argv)
+    if not args.clear:
+        print(default_path())
+        return 0
+    removed = clear(args.target_org)
+    print(f"Removed {removed} cached response(s) from {default_path()}.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Keyed diff of SFDMU CSVs: plan vs extraction, or any two plan directories.
+
+Rows are matched on the plan's externalId columns (or its legacy ``$$``
+composite column) with a hash join, and compared column by column by name,
+so column order does not matter. Each side is streamed. The engine keeps
+one ``key -> row digest`` entry per record, then reads back only the rows
+that differ in a second pass, so memory follows the number of records and
+the size of the diff, not the width of the CSVs.
+
+Reports list added, removed and changed rows, with the old and new value of
+every changed column, plus per-column change counts and columns present on
+one side only. Output is JSON (``--json``) and/or Markdown (``--markdown``).
+``post_process_extraction.py``, ``compare_sfdmu_content.py`` and
+``reconcile_detail_qb_tax_billing_rating_rates.py`` use the same engine.
+
+Usage:
+  python3 scripts/sfdmu_csv_diff.py LEFT RIGHT [options]
+
+  LEFT / RIGHT       Two CSV files, or two directories (every CSV in either)
+  --plan-dir DIR     Plan whose export.json gives each object's externalId
+                     (default: LEFT when it is a directory with export.json)
+  --key COL          Key column (repeatable); overrides the externalId
+  --ignore COL       Column left out of the comparison (repeatable)
+  --strip            Compare values with surrounding whitespace stripped
+  --limit N          Rows listed per category and file (default 100; counts are always complete)
+  --json PATH        Write the JSON report
+  --markdown PATH    Write the Markdown report (default: print it)
+  --benchmark ROWS   Time a diff of two synthetic ROWS-row CSVs and exit
+
+Exit codes: 0 no differences, 1 differences found, 2 usage error.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from operator import itemgetter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tasks import rlm_sfdmu_overlay  # noqa: E402
+
+SKIP_CSVS = {"MissingParentRecordsReport.csv", "CSVIssuesReport.csv"}
+DEFAULT_LIMIT = 100
+
+
+def normalize_header(h: str) -> str:
+    """Header for matching: BOM, whitespace and surrounding quotes stripped (as SFDMU extractions write them)."""
+    s = (h or "").strip().lstrip("\ufeff").strip()
+    if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
+        s = s[1:-1].strip()
+    return s
+
+
+@contextmanager
+def open_csv(path: str):
+    """Yield ``(headers, reader)``; headers are normalized, None for an empty file."""
+    with open(path, "r", newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        headers = next(reader, None)
+        yield ([normalize_header(h) for h in headers] if headers else None), reader
+
+
+def key_columns(headers: list, external_id: str) -> list:
+    """Columns to join on for a plan object.
+
+    The externalId's ``;``-separated components that are columns of the CSV;
+    failing that, the legacy ``$$A$B`` composite column; failing that (or for
+    ``Id``), every column.
+    """
+    if not headers:
+        return []
+    if not external_id or external_id == "Id":
+        return list(headers)
+    parts = external_id.split(";")
+    found = [p for p in parts if p in headers]
+    if not found:
+        composite = "$$" + "$".join(parts)
+        if composite in headers:
+            found = [composite]
+    return found or list(headers)
+
+
+def plan_external_ids(plan_dir: str) -> dict:
+    """``{object: externalId}`` from a plan's export.json (first pass wins); {} without one."""
+    try:
+        with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+            plan = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    sets = plan.get("objectSets") or [{"objects": plan.get("objects", [])}]
+    found = {}
+    for obj_set in sets:
+        for obj in obj_set.get("objects", []):
+            query = obj.get("query", "")
+            idx = query.upper().find(" FROM ")
+            if obj.get("excluded") or idx == -1:
+                continue
+            name = query[idx + 6:].split()[0].strip() if query[idx + 6:].split() else ""
+            if name and name not in found:
+                found[name] = obj.get("externalId", "Id")
+    return found
+
+
+def row_digest(values) -> bytes:
+    """16-byte digest of a sequence of cell values (lengths are part of it)."""
+    return hashlib.blake2b(f"{len(values)}\x00{chr(0).join(values)}".encode("utf-8"), digest_size=16).digest()
+
+
+def _getter(indices: list):
+    """``row -> tuple of the cells at indices`` (itemgetter returns a bare value for one index)."""
+    if len(indices) == 1:
+        only = indices[0]
+        return lambda row: (row[only],)
+    if not indices:
+        return lambda row: ()
+    return itemgetter(*indices)
+
+
+class RowIndex:
+    """``key -> digest of the compared columns`` for one side of a diff.
+
+    Rows are added one at a time, so the side can be a file being read or
+    rows being written. A repeated key keeps its last row, and the repeat is
+    counted in ``duplicates``.
+    """
+
+    def __init__(self, headers: list, keys: list, columns: list, strip: bool = False):
+        position = {h: i for i, h in enumerate(headers)}
+        key_idx = [position[k] for k in keys]
+        self.col_idx = col_idx = [position[c] for c in columns]
+        self.width = max(key_idx + col_idx, default=-1) + 1
+        self._key = _getter(key_idx)
+        self._values = _getter(col_idx)
+        self.strip = strip
+        self.entries = {}
+        self.duplicates = 0
+        self.rows = 0
+
+    def _pad(self, row: list) -> list:
+        return row if len(row) >= self.width else row + [""] * (self.width - len(row))
+
+    def key(self, row: list) -> tuple:
+        found = self._key(self._pad(row))
+        return tuple(v.strip() for v in found) if self.strip else found
+
+    def values(self, row: list) -> tuple:
+        found = self._values(self._pad(row))
+        return tuple(v.strip() for v in found) if self.strip else found
+
+    def add(self, row: list) -> tuple:
+        key = self.key(row)
+        if key in self.entries:
+            self.duplicates += 1
+        self.entries[key] = row_digest(self.values(row))
+        self.rows += 1
+        return key
+
+    def extend(self, rows) -> None:
+        """:meth:`add` for every row, with the per-row work inlined (this is the hot loop)."""
+        key_of, values_of, width, strip, entries = self._key, self._values, self.width, self.strip, self.entries
+        blake2b, prefix, before, count = hashlib.blake2b, f"{len(self.col_idx)}\x00", len(entries), 0
+        for row in rows:
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            key, values = key_of(row), values_of(row)
+            if strip:
+                key, values = tuple(v.strip() for v in key), tuple(v.strip() for v in values)
+            entries[key] = blake2b((prefix + "\x00".join(values)).encode("utf-8"), digest_size=16).digest()
+            count += 1
+        self.rows += count
+        self.duplicates += count - (len(entries) - before)
+
+
+def index_csv(path: str, keys: list, columns: list, strip: bool = False) -> RowIndex:
+    """:class:`RowIndex` of the CSV at ``path``, built in one streaming pass. A missing file has no rows."""
+    if not os.path.isfile(path):
+        return RowIndex(list(dict.fromkeys(list(keys) + list(columns))), keys, columns, strip)
+    with open_csv(path) as (headers, reader):
+        index = RowIndex(headers or [], keys, columns, strip)
+        index.extend(reader)
+    return index
+
+
+def compare_indexes(left: RowIndex, right: RowIndex) -> dict:
+    """Keys added / removed / changed from ``left`` to ``right``, and the identical count."""
+    added, changed, identical = [], [], 0
+    for key, digest in right.entries.items():
+        other = left.entries.get(key)
+        if other is None:
+            added.append(key)
+        elif other != digest:
+            changed.append(key)
+        else:
+            identical += 1
+    removed = [key for key in left.entries if key not in right.entries]
+    return {"added": added, "removed": removed, "changed": changed, "identical": identical}
+
+
+def _keep(index: RowIndex, keys, path: str) -> dict:
+    """``{key: compared values}`` for ``keys``, read back from ``path`` (last row per key)."""
+    wanted = set(keys)
+    found = {}
+    if not wanted or not os.path.isfile(path):
+        return found
+    key_of, width = index._key, index.width
+    with open_csv(path) as (_, reader):
+        for row in reader:
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            key = key_of(row)
+            if index.strip:
+                key = tuple(v.strip() for v in key)
+            if key in wanted:
+                found[key] = index.values(row)
+    return found
+
+
+def diff_files(left_path: str, right_path: str, *, keys: list = None, external_id: str = "",
+               ignore=(), strip: bool = False, limit: int = None) -> dict:
+    """Keyed diff of two CSV files; see the module docstring for the report's shape.
+
+    ``keys`` wins over ``external_id``; both sides must have the key columns.
+    At most ``limit`` rows are listed per category (counts are always complete).
+    """
+    report = {"left": left_path, "right": right_path}
+    sides = {}
+    for name, path in (("left", left_path), ("right", right_path)):
+        sides[name] = None
+        if os.path.isfile(path):
+            with open_csv(path) as (headers, _):
+                sides[name] = headers or []
+    missing = [name for name, headers in sides.items() if headers is None]
+    if len(missing) == 2:
+        report["error"] = "missing on both sides"
+        return report
+    if missing:
+        # A missing CSV is an empty one with the other side's columns: every row is added or removed.
+        report["missing"] = missing[0]
+    left_headers = sides["left"] if sides["left"] is not None else sides["right"]
+    right_headers = sides["right"] if sides["right"] is not None else sides["left"]
+    join = list(keys) if keys else key_columns(left_headers, external_id)
+    absent = [k for k in join if k not in left_headers or k not in right_headers]
+    report["key"] = join
+    if absent or (not join and (left_headers or right_headers)):  # two empty CSVs are equal
+        report["error"] = f"key column(s) not on both sides: {absent or join}"
+        return report
+    right_set = set(right_headers)
+    ignored = set(ignore)
+    columns = sorted(h for h in set(left_headers) if h in right_set and h not in ignored)
+    report["columns"] = {
+        "compared": len(columns),
+        "only_left": [h for h in left_headers if h not in right_set],
+        "only_right": [h for h in right_headers if h not in set(left_headers)],
+    }
+
+    left = index_csv(left_path, join, columns, strip)
+    right = index_csv(right_path, join, columns, strip)
+    result = compare_indexes(left, right)
+    report["counts"] = {
+        "left_rows": left.rows, "right_rows": right.rows,
+        "left_duplicate_keys": left.duplicates, "right_duplicate_keys": right.duplicates,
+        "identical": result["identical"], "added": len(result["added"]),
+        "removed": len(result["removed"]), "changed": len(result["changed"]),
+    }
+
+    # Per-column counts need every changed row; listed rows stop at ``limit``.
+    added, removed = result["added"][:limit], result["removed"][:limit]
+    right_rows = _keep(right, added + result["changed"], right_path)
+    left_rows = _keep(left, removed + result["changed"], left_path)
+    column_changes = {}
+    changed_rows = []
+    for key in result["changed"]:
+        old, new = left_rows[key], right_rows[key]
+        deltas = {col: [a, b] for col, a, b in zip(columns, old, new) if a != b}
+        for col in deltas:
+            column_changes[col] = column_changes.get(col, 0) + 1
+        if limit is None or len(changed_rows) < limit:
+            changed_rows.append({"key": list(key), "columns": deltas})
+    report["column_changes"] = dict(sorted(column_changes.items(), key=lambda kv: (-kv[1], kv[0])))
+    report["added"] = [{"key": list(k), "row": dict(zip(columns, right_rows[k]))} for k in added]
+    report["removed"] = [{"key": list(k), "row": dict(zip(columns, left_rows[k]))} for k in removed]
+    report["changed"] = changed_rows
+    return report
+
+
+def has_differences(report: dict) -> bool:
+    counts = report.get("counts") or {}
+    columns = report.get("columns") or {}
+    return bool(report.get("error") or report.get("missing")
+                or counts.get("added") or counts.get("removed") or counts.get("changed")
+                or columns.get("only_left") or columns.get("only_right"))
+
+
+def data_csvs(directory: str) -> list:
+    if not directory or not os.path.isdir(directory):
+        return []
+    return sorted(f for f in os.listdir(directory)
+                  if f.endswith(".csv") and f not in SKIP_CSVS and not f.startswith("_"))
+
+
+def diff_dirs(left_dir: str, right_dir: str, *, plan_dir: str = None, keys: list = None,
+              ignore=(), strip: bool = False, limit: int = None) -> dict:
+    """:func:`diff_files` for every data CSV in either directory, keyed by each object's externalId.
+
+    A locale overlay plan on either side is compared as its materialized full plan.
+    """
+    left_full, right_full = rlm_sfdmu_overlay.materialize(left_dir), rlm_sfdmu_overlay.materialize(right_dir)
+    external_ids = plan_external_ids(rlm_sfdmu_overlay.materialize(plan_dir) if plan_dir else left_full)
+    names = sorted(set(data_csvs(left_full)) | set(data_csvs(right_full)))
+    files = {}
+    for name in names:
+        files[name] = diff_files(os.path.join(left_full, name), os.path.join(right_full, name), keys=keys,
+                                 external_id=external_ids.get(name[:-4], ""), ignore=ignore, strip=strip,
+                                 limit=limit)
+    totals = {}
+    for report in files.values():
+        for field, value in (report.get("counts") or {}).items():
+            totals[field] = totals.get(field, 0) + value
+    return {"left": left_dir, "right": right_dir, "files": files, "totals": totals}
+
+
+def _cell(value) -> str:
+    text = str(value).replace("|", "\\|").replace("\n", " ")
+    return text if len(text) <= 60 else text[:57] + "..."
+
+
+def render_markdown(report: dict, rows: int = 20) -> str:
+    """Markdown for a :func:`diff_files` or :func:`diff_dirs` report (``rows`` examples per category)."""
+    files = report["files"] if "files" in report else {os.path.basename(report["right"]): report}
+    lines = [f"# CSV diff: `{report['left']}` -> `{report['right']}`", "",
+             "| File | Key | Left | Right | Same | Added | Removed | Changed |",
+             "| --- | --- | ---: | ---: | ---: | ---: | ---: | ---: |"]
+    for name, item in files.items():
+        c = item.get("counts")
+        if c is None:
+            lines.append(f"| {name} | {_cell(';'.join(item.get('key') or []))} | | | | | | {item.get('error', '')} |")
+            continue
+        lines.append(f"| {name} | {_cell(';'.join(item['key']))} | {c['left_rows']} | {c['right_rows']} | "
+                     f"{c['identical']} | {c['added']} | {c['removed']} | {c['changed']} |")
+    for name, item in files.items():
+        if not has_differences(item) or "counts" not in item:
+            continue
+        lines += ["", f"## {name}", ""]
+        columns = item["columns"]
+        if item.get("missing"):
+            lines += [f"No CSV on the {item['missing']} side.", ""]
+        if columns["only_left"] or columns["only_right"]:
+            lines += [f"Columns only left: {columns['only_left'] or '-'}; "
+                      f"only right: {columns['only_right'] or '-'}", ""]
+        if item["column_changes"]:
+            lines.append("Changed columns: " + ", ".join(f"`{col}` ({n})" for col, n in item["column_changes"].items()))
+            lines.append("")
+        for label in ("added", "removed"):
+            if item[label]:
+                lines.append(f"**{label.capitalize()}** ({item['counts'][label]}):")
+                lines += [f"- `{_cell(';'.join(entry['key']))}`" for entry in item[label][:rows]]
+                lines.append("")
+        if item["changed"]:
+            lines += [f"**Changed** ({item['counts']['changed']}):", "", "| Key | Column | Left | Right |",
+                      "| --- | --- | --- | --- |"]
+            for entry in item["changed"][:rows]:
+                for col, (old, new) in entry["columns"].items():
+                    lines.append(f"| {_cell(';'.join(entry['key']))} | {col} | {_cell(old)} | {_cell(new)} |")
+    return "\n".join(lines) + "\n"
+
+
+def _write_synthetic(path: str, rows: int, seed: int, change_every: int = 0) -> None:
+    rng = random.Random(seed)
+    order = list(range(rows))
+    rng.shuffle(order)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        columns = ["Product.StockKeepingUnit", "PricebookEntry.Name", "Status", "UnitPrice", "Description"]
+        writer.writerow(columns if not change_every else list(reversed(columns)))
+        for i in order:
+            if change_every and i % change_every == 0:
+                continue  # removed on the right
+            price = f"{(i * 7919) % 100000 / 100:.2f}"
+            if change_every and i % change_every == 1:
+                price = "0.00"
+            words = "".join(rng.choice(string.ascii_lowercase) for _ in range(24))
+            row = [f"SKU-{i:07d}", f"Entry {i}", "Active", price, words if not change_every else ""]
+            writer.writerow(row if not change_every else list(reversed(row)))
+        if change_every:
+            for i in range(rows, rows + rows // change_every):
+                writer.writerow(["", "0.00", "Draft", f"Entry {i}", f"SKU-{i:07d}"])
+
+
+def benchmark(rows: int, log=print) -> dict:
+    """Diff two synthetic ``rows``-row CSVs (shuffled, reordered columns, 0.1% each removed/changed/added)."""
+    work = tempfile.mkdtemp(prefix="sfdmu_csv_diff_bench_")
+    try:
+        left, right = os.path.join(work, "left.csv"), os.path.join(work, "right.csv")
+        _write_synthetic(left, rows, seed=1)
+        _write_synthetic(right, rows, seed=2, change_every=1000)
+        size = os.path.getsize(left) + os.path.getsize(right)
+        started = time.perf_counter()
+        report = diff_files(left, right, keys=["Product.StockKeepingUnit"], ignore=["Description"], limit=10)
+        seconds = time.perf_counter() - started
+    finally:
+        for name in os.listdir(work):
+            os.remove(os.path.join(work, name))
+        os.rmdir(work)
+    result = {"rows": rows, "seconds": round(seconds, 2), "rows_per_second": round(2 * rows / seconds),
+              "input_mb": round(size / 1e6, 1), "counts": report["counts"]}
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result["peak_rss_mb"] = round(peak / (1e6 if sys.platform == "darwin" else 1e3), 1)
+    except ImportError:  # Windows
+        pass
+    log(json.dumps(result, indent=2))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keyed diff of SFDMU CSV files or plan directories")
+    parser.add_argument("left", nargs="?", help="CSV file or directory (e.g. the plan)")
+    parser.add_argument("right", nargs="?", help="CSV file or directory (e.g. the extraction)")
+    parser.add_argument("--plan-dir", default=None, help="Plan whose export.json gives the externalIds")
+    parser.add_argument("--key", action="append", default=None, help="Key column (repeatable)")
+    parser.add_argument("--ignore", action="append", default=[], help="Column to leave out (repeatable)")
+    parser.add_argument("--strip", action="store_true", help="Strip surrounding whitespace before comparing")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Rows listed per category and file")
+    parser.add_argument("--json", default=None, help="Write the JSON report here")
+    parser.add_argument("--markdown", default=None, help="Write the Markdown report here (default: print)")
+    parser.add_argument("--benchmark", type=int, default=None, metavar="ROWS",
+                        help="Time a diff of two synthetic CSVs of ROWS rows and exit")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark)
+        return 0
+    if not args.left or not args.right:
+        parser.error("LEFT and RIGHT are required")
+    if os.path.isdir(args.left) and os.path.isdir(args.right):
+        report = diff_dirs(args.left, args.right, plan_dir=args.plan_dir, keys=args.key,
+                           ignore=args.ignore, strip=args.strip, limit=args.limit)
+        differs = any(has_differences(item) for item in report["files"].values())
+    elif os.path.isfile(args.left) and os.path.isfile(args.right):
+        obj = os.path.splitext(os.path.basename(args.left))[0]
+        external_id = plan_external_ids(args.plan_dir or os.path.dirname(args.left)).get(obj, "")
+        report = diff_files(args.left, args.right, keys=args.key, external_id=external_id,
+                            ignore=args.ignore, strip=args.strip, limit=args.limit)
+        differs = has_differences(report)
+    else:
+        print("ERROR: LEFT and RIGHT must both be files or both be directories", file=sys.stderr)
+        return 2
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    markdown = render_markdown(report)
+    if args.markdown:
+        with open(args.markdown, "w", encoding="utf-8") as f:
+            f.write(markdown)
+    else:
+        print(markdown)
+    return 1 if differs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
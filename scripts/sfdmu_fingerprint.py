@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Fingerprint SFDMU plans / extractions and compare the fingerprints.
+
+Thin CLI wrapper around ``tasks/rlm_sfdmu_fingerprint.py`` (no org or
+CumulusCI needed). A manifest holds an order-independent hash per CSV, per
+object and per plan. Two manifests are compared top-down, and identical
+plans and objects are skipped without looking at their CSVs.
+
+Usage:
+    python scripts/sfdmu_fingerprint.py build datasets/sfdmu/qb/en-US -o /tmp/qb.json
+    python scripts/sfdmu_fingerprint.py compare /tmp/qb.json datasets/sfdmu/qb/en-US
+    python scripts/sfdmu_fingerprint.py compare datasets/sfdmu/qb/en-US datasets/sfdmu/qb/ja --json
+
+``build`` re-uses the hashes of an existing ``-o`` manifest for CSVs whose
+size and mtime are unchanged. Either side of ``compare`` can be a manifest
+file or a directory (fingerprinted on the fly, through the
+``.cci/sfdmu_fingerprint/`` cache unless ``--no-cache``). In CI, build a
+manifest on the base branch and compare the PR checkout with it.
+
+Exit codes: 0 = fingerprints match (or build succeeded), 1 = differences,
+2 = bad invocation / unreadable input.
+"""
+import argparse
+import json
+import os
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tasks import rlm_sfdmu_fingerprint as fingerprint  # noqa: E402
+
+
+def _manifest(path: str, use_cache: bool) -> dict:
+    if os.path.isdir(path):
+        if use_cache:
+            return fingerprint.cached_manifest(path, os.path.join(REPO_ROOT, fingerprint.DEFAULT_CACHE_DIR))
+        return fingerprint.build_manifest(path)
+    manifest = fingerprint.load_manifest(path)
+    if not manifest:
+        raise ValueError(f"not a directory or a version-{fingerprint.MANIFEST_VERSION} manifest: {path}")
+    return manifest
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Write the manifest of a directory of plans (or one plan).")
+    build.add_argument("directory")
+    build.add_argument("-o", "--output", help="Manifest path (default: print to stdout).")
+    compare = sub.add_parser("compare", help="Compare two manifests or directories.")
+    compare.add_argument("left")
+    compare.add_argument("right")
+    compare.add_argument("--json", action="store_true", help="Print the comparison as JSON.")
+    compare.add_argument("--no-cache", action="store_true", help="Do not use or update the manifest cache.")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        if not os.path.isdir(args.directory):
+            print(f"Not a directory: {args.directory}", file=sys.stderr)
+            return 2
+        previous = fingerprint.load_manifest(args.output) if args.output else {}
+        manifest = fingerprint.build_manifest(args.directory, previous)
+        if args.output:
+            fingerprint.save_manifest(args.output, manifest)
+            print(f"{len(manifest['plans'])} plan(s), root {manifest['root'][:16]} -> {args.output}")
+        else:
+            json.dump(manifest, sys.stdout, indent=1, sort_keys=True)
+            print()
+        return 0
+
+    try:
+        left, right = _manifest(args.left, not args.no_cache), _manifest(args.right, not args.no_cache)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    diff = fingerprint.compare_manifests(left, right)
+    if args.json:
+        json.dump(diff, sys.stdout, indent=2)
+        print()
+    else:
+        print("\n".join(fingerprint.summary_lines(diff)))
+    return 0 if diff["same"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
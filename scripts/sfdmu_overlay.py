@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Store a locale SFDMU plan as an overlay on its base plan, or build one back.
+
+Thin CLI wrapper around ``tasks/rlm_sfdmu_overlay.py`` (no org or
+CumulusCI needed). ``create`` compares a full locale plan with its base. It
+reports what an ``overlay.json`` would inherit, patch or keep, and the
+bytes on disk before and after. With ``--apply``, it writes the overlay and
+deletes the files the overlay now provides. It only does so after
+materializing the overlay into a scratch directory and checking that every
+file comes back byte for byte. ``materialize`` prints the directory holding
+the full plan: the cached build under ``.cci/sfdmu_overlay/``, or the plan
+itself when it is not an overlay.
+
+LoadSFDMUData, the validators, the fingerprints and the CSV diff all
+materialize overlays themselves, so this CLI is only needed to create
+overlays or to look at a built plan.
+
+Usage:
+    python scripts/sfdmu_overlay.py create datasets/sfdmu/qb/ja/qb-pcm --base datasets/sfdmu/qb/en-US/qb-pcm
+    python scripts/sfdmu_overlay.py create datasets/sfdmu/qb/ja/qb-pcm --base datasets/sfdmu/qb/en-US/qb-pcm --apply
+    python scripts/sfdmu_overlay.py materialize datasets/sfdmu/qb/ja/qb-pcm
+
+Exit codes: 0 = success, 1 = the overlay would not rebuild the plan exactly
+(nothing written), 2 = bad invocation / unreadable or invalid plan.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from tasks import rlm_sfdmu_overlay as overlay_mod  # noqa: E402
+
+
+def _size(plan_dir: str, rels) -> int:
+    return sum(os.path.getsize(os.path.join(plan_dir, *rel.split("/"))) for rel in rels)
+
+
+def _mismatches(plan_dir: str, overlay: dict, drop_files: list) -> list:
+    """Files of ``plan_dir`` that the overlay, once written, would not rebuild byte for byte."""
+    scratch = tempfile.mkdtemp(prefix="sfdmu_overlay_")
+    try:
+        trial = os.path.join(scratch, os.path.basename(os.path.normpath(plan_dir)))
+        shutil.copytree(plan_dir, trial, ignore=shutil.ignore_patterns("__pycache__"))
+        overlay = dict(overlay, base=os.path.relpath(os.path.join(plan_dir, overlay["base"]), trial))
+        overlay_mod.write_overlay(trial, overlay, drop_files)
+        built = os.path.join(scratch, "built")
+        overlay_mod.build_plan(trial, built)
+        expected, got = overlay_mod._files(plan_dir), overlay_mod._files(built)
+        bad = sorted(set(expected) ^ set(got))
+        bad += [rel for rel in expected if rel in got and overlay_mod._file_digest(os.path.join(plan_dir, rel))
+                != overlay_mod._file_digest(os.path.join(built, rel))]
+        return bad
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    create = sub.add_parser("create", help="Describe a full locale plan as an overlay on its base plan.")
+    create.add_argument("plan")
+    create.add_argument("--base", required=True, help="The base plan directory (e.g. the en-US plan).")
+    create.add_argument("--apply", action="store_true",
+                        help="Write overlay.json and delete the files it provides (default: report only).")
+    create.add_argument("--json", action="store_true", help="Print the overlay.json content as well.")
+    materialize = sub.add_parser("materialize", help="Print the directory holding a plan in full.")
+    materialize.add_argument("plan")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.plan):
+        print(f"Not a directory: {args.plan}", file=sys.stderr)
+        return 2
+    try:
+        if args.command == "materialize":
+            print(overlay_mod.materialize(args.plan, os.path.join(REPO_ROOT, overlay_mod.DEFAULT_CACHE_DIR)))
+            return 0
+        if overlay_mod.is_overlay(args.plan):
+            print(f"Already an overlay: {args.plan}", file=sys.stderr)
+            return 2
+        if not os.path.isdir(args.base):
+            print(f"Not a directory: {args.base}", file=sys.stderr)
+            return 2
+        result = overlay_mod.build_overlay(args.plan, args.base)
+    except (overlay_mod.OverlayError, OSError) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    overlay = result["overlay"]
+    drop_files = result["inherited"] + result["patched"]
+    before = _size(args.plan, overlay_mod._files(args.plan))
+    after = _size(args.plan, result["owned"]) + len(json.dumps(overlay, indent=2, ensure_ascii=False).encode()) + 1
+    print(f"{args.plan}: {len(result['inherited'])} inherited, {len(result['patched'])} patched, "
+          f"{len(result['owned'])} kept whole; {before} -> {after} bytes")
+    for rel in result["patched"]:
+        print(f"  patched: {rel}")
+    for rel in result["owned"]:
+        print(f"  kept:    {rel}")
+    if args.json:
+        print(json.dumps(overlay, indent=2, ensure_ascii=False))
+    if not args.apply:
+        return 0
+    bad = _mismatches(args.plan, overlay, drop_files)
+    if bad:
+        print(f"Not written: the overlay does not rebuild {', '.join(bad)}", file=sys.stderr)
+        return 1
+    overlay_mod.write_overlay(args.plan, overlay, drop_files)
+    print(f"Wrote {os.path.join(args.plan, overlay_mod.OVERLAY_FILE)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,6 +12,19 @@ endpoint/shape-agnostic. Two transports live behind one interface:
   disappears, at the cost of a process spawn per call. Select with
   ``--transport cli``.
 
+Either transport can be wrapped in a record/replay cassette
+(``--cassette PATH --cassette-mode record|replay`` or ``RLM_SF_CASSETTE``; see
+``scripts/sf_transport/cassette.py``). A replaying client never resolves auth,
+so a recorded lifecycle can be re-run and timed without an org.
+
+``RLM_SF_STANDIN_URL`` points auth at a local stand-in server instead of an
+org (``scripts/sf_standin/server.py``): no ``sf`` call is made and the token is
+a placeholder. Load tests use it to drive ``run_batch`` at volume.
+
+``AsyncSfRestClient`` is the asyncio counterpart of the ``requests`` transport
+for high-fan-out callers: every request passes the org's shared concurrency cap
+and ``Sforce-Limit-Info``-driven token bucket (``scripts/sf_transport/aio.py``).
+
 Token + instance URL come from TWO ``sf`` CLI calls (verified live; see
 CONTRACTS.md "Environment verified"):
 
@@ -26,6 +39,7 @@ it in). The ``cli`` transport passes no token at all.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
@@ -34,10 +48,17 @@ import tempfile
 import threading
 import time
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Iterator, Optional
+from urllib.parse import quote
 
 import requests
 
+from scripts.sf_transport import aio as _aio
+from scripts.sf_transport import bulk as _bulk
+from scripts.sf_transport import cassette as _cassette
+from scripts.sf_transport import metrics as _metrics
+from scripts.sf_transport import paging as _paging
+
 log = logging.getLogger("txn_data_harness.auth")
 
 DEFAULT_API_VERSION = "67.0"  # v262 baseline; do not silently float to latest.
@@ -47,6 +68,8 @@ _RETRYABLE_STATUS = {420, 429, 500, 502, 503, 504}
 _MAX_RETRIES = 4
 _BACKOFF_BASE = 1.5  # seconds; exponential: base * 2**attempt
 
+STANDIN_ENV_VAR = "RLM_SF_STANDIN_URL"
+
 
 class SfCliError(RuntimeError):
     """An ``sf`` CLI invocation failed (auth resolution or cli transport)."""
@@ -89,7 +112,12 @@ def resolve_auth(alias: str) -> tuple[str, str]:
     Two calls, because no single command reliably returns both (CONTRACTS.md):
     the token from ``org auth show-access-token``, the instance URL from
     ``org display`` (non-secret).
+
+    With ``RLM_SF_STANDIN_URL`` set, returns a placeholder token and that URL.
     """
+    standin_url = os.environ.get(STANDIN_ENV_VAR)
+    if standin_url:
+        return "standin", standin_url.rstrip("/")
     token_result = _run_sf(["org", "auth", "show-access-token", "--target-org", alias])
     access_token = token_result.get("accessToken") if isinstance(token_result, dict) else None
     # Some CLI shapes nest under a list/other key; be defensive but explicit.
@@ -125,6 +153,7 @@ class SfRestClient:
     instance_url: str
     api_version: str = DEFAULT_API_VERSION
     transport: str = "requests"  # "requests" | "cli"
+    cassette: Optional[_cassette.Cassette] = None  # record/replay wrapper
     # thread-local session store; one requests.Session per worker thread.
     _local: threading.local = field(default_factory=threading.local, repr=False)
 
@@ -135,14 +164,28 @@ class SfRestClient:
         alias: str,
         api_version: Optional[str] = None,
         transport: str = "requests",
+        cassette: Optional[_cassette.Cassette] = None,
     ) -> "SfRestClient":
-        access_token, instance_url = resolve_auth(alias)
+        """Resolve auth for ``alias`` and build a client.
+
+        ``cassette`` defaults to the one selected by ``RLM_SF_CASSETTE``. In
+        replay mode no ``sf`` call is made; the recorded instance URL is reused.
+        """
+        if cassette is None:
+            cassette = _cassette.active(error_cls=SfCliError)
+        if cassette is not None and cassette.replaying:
+            access_token, instance_url = "", cassette.instance_url or "https://replay.invalid"
+        else:
+            access_token, instance_url = resolve_auth(alias)
+            if cassette is not None:
+                cassette.instance_url = instance_url
         client = cls(
             alias=alias,
             access_token=access_token,
             instance_url=instance_url,
             api_version=api_version or DEFAULT_API_VERSION,
             transport=transport,
+            cassette=cassette,
         )
         if api_version == "latest":
             client.api_version = client._latest_api_version()
@@ -172,9 +215,7 @@ class SfRestClient:
         return sess
 
     def _latest_api_version(self) -> str:
-        resp = self._session.get(f"{self.instance_url}/services/data/")
-        resp.raise_for_status()
-        return resp.json()[-1]["version"]
+        return self._request("GET", "/services/data/")[-1]["version"]
 
     # ----- core verbs --------------------------------------------------------
     def get(self, path: str) -> Any:
@@ -190,21 +231,43 @@ class SfRestClient:
         return self._request("DELETE", path)
 
     def query(self, soql: str) -> list[dict]:
-        """Run a SOQL query and return ``records`` (REST query endpoint).
+        """Run a SOQL query and return every record (REST query endpoint).
+
+        Follows ``nextRecordsUrl`` to the last page. The REST query endpoint
+        does NOT support Apex bind syntax (``:var``); callers interpolate ids
+        into the literal SOQL string. ``requests`` URL-encodes the ``q`` param;
+        the cli transport encodes it inline.
+        """
+        return list(self.iter_query(soql, prefetch=False))
+
+    def iter_query(self, soql: str, *, prefetch: bool = True) -> Iterator[dict]:
+        """Yield a query's records page by page; see ``scripts/sf_transport/paging.py``.
 
-        The REST query endpoint does NOT support Apex bind syntax (``:var``);
-        callers interpolate ids into the literal SOQL string. ``requests``
-        URL-encodes the ``q`` param; the cli transport encodes it inline.
+        With ``prefetch`` the next page is requested on a background thread
+        while the caller works through the current one (that thread gets its
+        own ``requests.Session``, like any worker).
         """
-        from urllib.parse import quote
+        first = self._request("GET", f"/services/data/v{self.api_version}/query?q={quote(soql)}")
+        yield from _paging.iter_records(first, self.get, prefetch=prefetch)
 
-        path = f"/services/data/v{self.api_version}/query?q={quote(soql)}"
-        result = self._request("GET", path)
-        return result.get("records", []) if isinstance(result, dict) else []
+    def bulk(self) -> Optional[_bulk.BulkClient]:
+        """A Bulk API 2.0 client sharing this client's auth, or None.
+
+        Bulk jobs need the token in-process and are not recorded in a cassette,
+        so the ``cli`` transport and cassette sessions stay on REST.
+        """
+        if self.transport != "requests" or self.cassette is not None:
+            return None
+        return _bulk.BulkClient.from_rest_client(self)
 
     # ----- transport dispatch ------------------------------------------------
     def _request(self, method: str, path: str, body: Any = None) -> Any:
         path = self._normalize_path(path)
+        if self.cassette is not None:
+            return self._request_cassette(method, path, body)
+        return self._dispatch(method, path, body)
+
+    def _dispatch(self, method: str, path: str, body: Any) -> Any:
         if self.transport == "cli":
             return self._request_cli(method, path, body)
         return self._request_requests(method, path, body)
@@ -232,7 +295,11 @@ class SfRestClient:
         last_exc: Optional[Exception] = None
         for attempt in range(_MAX_RETRIES):
             try:
-                resp = self._session.request(method, url, data=data)
+                # Each attempt is one sample (RLM_SF_METRICS_DIR), so retries show up.
+                with _metrics.track("requests", method, path, data) as sample:
+                    resp = self._session.request(method, url, data=data)
+                    sample.status = str(resp.status_code)
+                    sample.bytes_in = len(resp.content or b"") if sample.active else 0
             except requests.RequestException as exc:
                 last_exc = exc
                 self._sleep_backoff(attempt, reason=str(exc))
@@ -262,7 +329,10 @@ class SfRestClient:
             tmp.close()
             args += ["--body", f"@{tmp.name}"]
         try:
-            proc = subprocess.run(args, capture_output=True, text=True)
+            payload = None if body is None else json.dumps(body)
+            with _metrics.track("cli", method, path, payload, spawn=True) as sample:
+                proc = subprocess.run(args, capture_output=True, text=True)
+                sample.complete(proc)
         finally:
             if tmp is not None:
                 os.unlink(tmp.name)
@@ -273,6 +343,37 @@ class SfRestClient:
             )
         return self._decode(200, out)
 
+    def _request_cassette(self, method: str, path: str, body: Any) -> Any:
+        """Record the live call's outcome, or replay it from the cassette.
+
+        Outcomes are recorded after retries, as the decoded 2xx body or the
+        final ``SfApiError`` status/body, so replay exercises the caller's
+        logic rather than the backoff loop.
+        """
+        data = json.dumps(body) if body is not None else None
+        if self.cassette.replaying:
+            with _metrics.track("replay", method, path, data) as sample:
+                try:
+                    item = self.cassette.match(method, path, data)
+                except _cassette.CassetteMiss as exc:
+                    raise SfApiError(-1, str(exc), method, path) from exc
+                sample.status = str(item["status"])
+                sample.bytes_in = len(item["stdout"])
+            if not (200 <= (item["status"] or 0) < 300):
+                raise SfApiError(item["status"], item["stdout"], method, path)
+            return self._decode(item["status"], item["stdout"])
+        started = time.perf_counter()
+        try:
+            result = self._dispatch(method, path, body)
+        except SfApiError as exc:
+            self.cassette.record(method, path, data, status=exc.status, returncode=1,
+                                 stdout=exc.body, elapsed=time.perf_counter() - started)
+            raise
+        self.cassette.record(method, path, data, status=200, returncode=0,
+                             stdout="" if result is None else json.dumps(result),
+                             elapsed=time.perf_counter() - started)
+        return result
+
     # ----- helpers -----------------------------------------------------------
     @staticmethod
     def _decode(status: int, text: str) -> Any:
@@ -293,3 +394,89 @@ class SfRestClient:
         delay = _BACKOFF_BASE * (2 ** attempt)
         log.warning("retrying after %.1fs (attempt %d): %s", delay, attempt + 1, reason)
         time.sleep(delay)
+
+
+class AsyncSfRestClient:
+    """asyncio ``SfRestClient``: same verbs, retry policy and ``SfApiError``.
+
+    Every request waits on the org's shared :class:`ApiThrottle` (``throttle``
+    defaults to :func:`scripts.sf_transport.aio.throttle_for` keyed by instance
+    URL), so any number of clients and coroutines stay under one concurrency cap
+    and back off as ``Sforce-Limit-Info`` approaches the daily limit. Cassettes
+    and the ``cli`` transport are sync-only. Use as ``async with`` (or call
+    :meth:`aclose`) to release the HTTP sender.
+    """
+
+    def __init__(self, alias: str, access_token: str, instance_url: str,
+                 api_version: str = DEFAULT_API_VERSION, *,
+                 throttle: Optional[_aio.ApiThrottle] = None, sender: Any = None):
+        self.alias = alias
+        self.access_token = access_token
+        self.instance_url = instance_url.rstrip("/")
+        self.api_version = api_version
+        self.throttle = throttle or _aio.throttle_for(self.instance_url)
+        self._sender = sender or _aio.make_sender(max_connections=self.throttle.max_concurrency)
+
+    @classmethod
+    def from_client(cls, client: SfRestClient, **kwargs: Any) -> "AsyncSfRestClient":
+        """Share a sync client's resolved auth and API version."""
+        return cls(client.alias, client.access_token, client.instance_url,
+                   client.api_version, **kwargs)
+
+    @classmethod
+    def from_alias(cls, alias: str, api_version: Optional[str] = None,
+                   **kwargs: Any) -> "AsyncSfRestClient":
+        access_token, instance_url = resolve_auth(alias)
+        return cls(alias, access_token, instance_url, api_version or DEFAULT_API_VERSION,
+                   **kwargs)
+
+    async def __aenter__(self) -> "AsyncSfRestClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._sender.aclose()
+
+    # ----- core verbs --------------------------------------------------------
+    async def get(self, path: str) -> Any:
+        return await self._request("GET", path)
+
+    async def post(self, path: str, body: Any) -> Any:
+        return await self._request("POST", path, body)
+
+    async def patch(self, path: str, body: Any) -> Any:
+        return await self._request("PATCH", path, body)
+
+    async def delete(self, path: str) -> Any:
+        return await self._request("DELETE", path)
+
+    async def query(self, soql: str) -> list[dict]:
+        return [r async for r in self.iter_query(soql)]
+
+    async def iter_query(self, soql: str) -> AsyncIterator[dict]:
+        first = await self._request("GET", f"/services/data/v{self.api_version}/query?q={quote(soql)}")
+        async for record in _aio.aiter_records(first, self.get):
+            yield record
+
+    async def gather(self, *calls: Any, return_exceptions: bool = False) -> list[Any]:
+        """``asyncio.gather`` over coroutines of this client (throttled per request)."""
+        return await asyncio.gather(*calls, return_exceptions=return_exceptions)
+
+    async def _request(self, method: str, path: str, body: Any = None) -> Any:
+        path = SfRestClient._normalize_path(path)
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        try:
+            result = await _aio.send_request(
+                self._sender, self.throttle, method, f"{self.instance_url}{path}",
+                headers={"Authorization": f"Bearer {self.access_token}",
+                         "Content-Type": "application/json", "Accept": "application/json"},
+                data=data, timeout=120.0, retries=_MAX_RETRIES, metrics_path=path,
+                retry_status=_RETRYABLE_STATUS, backoff_base=_BACKOFF_BASE,
+            )
+        except _aio.SendError as exc:
+            raise SfApiError(-1, f"exhausted retries: {exc}", method, path) from exc
+        if not (200 <= result.status < 300):
+            raise SfApiError(result.status, result.text, method, path)
+        return SfRestClient._decode(result.status, result.text)
@@ -11,6 +11,8 @@ import tempfile
 from pathlib import Path
 from typing import Optional
 
+from scripts.sf_transport.cassette import apply_cassette_argument
+
 from . import generate
 from .auth import SfRestClient
 from .cli_args import add_connection_args, add_generate_args, add_resume_args
@@ -36,7 +38,7 @@ from .steps import StepContext, execute_step
 def _generate_argv(args: argparse.Namespace, *, dry_run: bool = False) -> list[str]:
     argv = ["--org", args.org]
     for flag in ("config", "target_stage", "account", "product", "opportunity_stage",
-                 "api_version", "transport"):
+                 "api_version", "transport", "cassette", "cassette_mode"):
         value = getattr(args, flag, None)
         if value is not None:
             argv += [f"--{flag.replace('_', '-')}", str(value)]
@@ -172,6 +174,7 @@ def _cmd_rate(args: argparse.Namespace) -> int:
 
 
 def _cmd_step(args: argparse.Namespace) -> int:
+    apply_cassette_argument(args)
     client = SfRestClient.from_alias(
         args.org, api_version=args.api_version, transport=args.transport
     )
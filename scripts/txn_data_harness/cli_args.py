@@ -9,6 +9,8 @@ from __future__ import annotations
 
 import argparse
 
+from scripts.sf_transport.cassette import add_cassette_argument
+
 from .auth import DEFAULT_API_VERSION
 from .models import STAGES_QUOTE
 from .runner import DEFAULT_MAX_RETRIES
@@ -32,6 +34,7 @@ def add_connection_args(p: argparse.ArgumentParser) -> None:
         default="requests",
         help="REST transport (default: requests; cli = sf api proxy).",
     )
+    add_cassette_argument(p)
 
 
 def add_scenario_args(p: argparse.ArgumentParser, *, include_target_stage: bool = True) -> None:
@@ -18,6 +18,8 @@ import logging
 import sys
 from typing import Optional
 
+from scripts.sf_transport.cassette import apply_cassette_argument
+
 from .auth import SfApiError, SfCliError, SfRestClient
 from .cli_args import add_generate_args
 from .config import ConfigError, load_scenarios
@@ -202,6 +204,7 @@ def ctx_api(args: argparse.Namespace) -> str:
 def main(argv: Optional[list[str]] = None) -> int:
     args = parse_args(argv)
     _setup_logging(args.verbose)
+    apply_cassette_argument(args)
 
     try:
         client = SfRestClient.from_alias(
@@ -19,12 +19,15 @@ activation hard-fails FAILED_ACTIVATION without it.
 
 from __future__ import annotations
 
+import itertools
 import logging
 import random
 import time
 from datetime import date, datetime, timedelta, timezone
 from typing import Any, Callable, NamedTuple, Optional
 
+from scripts.sf_transport import bulk as _bulk
+
 from .auth import SfRestClient
 from .discovery import Account, PostalAddress, Product
 from .models import LineItem, ResolvedInvoiceLine, ResolvedInvoiceOverrides
@@ -750,7 +753,9 @@ def create_usage_journals(
     manifest converges on the full id set across attempts.
 
     Posts via sObject Collections with ``allOrNone: true`` per chunk -- a bad
-    chunk aborts cleanly and the retry path reuses the same identifiers.
+    chunk aborts cleanly and the retry path reuses the same identifiers. At or
+    above ``RLM_SF_BULK_THRESHOLD`` rows (``scripts/sf_transport/bulk.py``) the
+    pre-flight and the inserts run as Bulk API 2.0 jobs instead.
     """
     spec = line.usage
     if spec is None or not spec.targets:
@@ -787,20 +792,53 @@ def create_usage_journals(
     if not expected:
         return []
 
+    # Above RLM_SF_BULK_THRESHOLD rows, one Bulk API 2.0 query + insert job
+    # replaces the 200-row IN-list queries and collection posts.
+    bulk = client.bulk() if _bulk.prefer_bulk(len(expected)) else None
+
     # Pre-flight: which UniqueIdentifiers already exist? Idempotent retry.
     expected_uids = [uid for uid, _ in expected]
     existing_by_uid: dict[str, str] = {}
-    for i in range(0, len(expected_uids), _TJ_CHUNK):
-        chunk = expected_uids[i:i + _TJ_CHUNK]
-        in_list = ", ".join(f"'{u}'" for u in chunk)
-        rows = client.query(
+    if bulk is not None:
+        wanted = set(expected_uids)
+        prefix = f"txn-harness-{run_id}-{asset_id}-"
+        for r in bulk.iter_query(
             f"SELECT Id, UniqueIdentifier FROM TransactionJournal "
-            f"WHERE UniqueIdentifier IN ({in_list})"
-        )
-        for r in rows:
-            existing_by_uid[r["UniqueIdentifier"]] = r["Id"]
+            f"WHERE UniqueIdentifier LIKE '{prefix}%'"
+        ):
+            if r["UniqueIdentifier"] in wanted:
+                existing_by_uid[r["UniqueIdentifier"]] = r["Id"]
+    else:
+        for i in range(0, len(expected_uids), _TJ_CHUNK):
+            chunk = expected_uids[i:i + _TJ_CHUNK]
+            in_list = ", ".join(f"'{u}'" for u in chunk)
+            rows = client.query(
+                f"SELECT Id, UniqueIdentifier FROM TransactionJournal "
+                f"WHERE UniqueIdentifier IN ({in_list})"
+            )
+            for r in rows:
+                existing_by_uid[r["UniqueIdentifier"]] = r["Id"]
 
     to_create = [p for uid, p in expected if uid not in existing_by_uid]
+    if bulk is not None and to_create:
+        new_ids = _bulk_insert_journals(bulk, to_create)
+    else:
+        new_ids = _post_journals(client, to_create)
+
+    existing_ids = list(existing_by_uid.values())
+    if existing_ids:
+        log.info(
+            "usage: reused %d existing TJ id(s) for asset %s",
+            len(existing_ids), asset_id,
+        )
+    log.info(
+        "usage: wrote %d new TJ row(s) for asset %s across %d target(s)",
+        len(new_ids), asset_id, len(spec.targets),
+    )
+    return existing_ids + new_ids
+
+
+def _post_journals(client: SfRestClient, to_create: list[dict]) -> list[str]:
     new_ids: list[str] = []
     path = f"/services/data/v{client.api_version}/composite/sobjects"
     for i in range(0, len(to_create), _TJ_CHUNK):
@@ -823,18 +861,27 @@ def create_usage_journals(
                 f"TransactionJournal create failures ({len(failures)}/{len(chunk)}): "
                 f"{failures[:3]}",
             )
+    return new_ids
 
-    existing_ids = list(existing_by_uid.values())
-    if existing_ids:
-        log.info(
-            "usage: reused %d existing TJ id(s) for asset %s",
-            len(existing_ids), asset_id,
+
+def _bulk_insert_journals(bulk: _bulk.BulkClient, to_create: list[dict]) -> list[str]:
+    """Insert via one Bulk API 2.0 job (per ~100 MB of CSV).
+
+    Bulk has no allOrNone: rows that succeeded stay. A retry still converges,
+    because the pre-flight finds them by ``UniqueIdentifier``.
+    """
+    try:
+        result = bulk.ingest("TransactionJournal", "insert", to_create)
+    except _bulk.BulkError as exc:
+        raise LifecycleError("usage", f"TransactionJournal bulk insert failed: {exc}") from exc
+    if result.failed:
+        failures = list(itertools.islice(result.rows("failedResults"), 3))
+        raise LifecycleError(
+            "usage",
+            f"TransactionJournal create failures ({result.failed}/{result.processed}, "
+            f"bulk job(s) {', '.join(result.job_ids)}): {failures}",
         )
-    log.info(
-        "usage: wrote %d new TJ row(s) for asset %s across %d target(s)",
-        len(new_ids), asset_id, len(spec.targets),
-    )
-    return existing_ids + new_ids
+    return [row["sf__Id"] for row in result.rows("successfulResults")]
 
 
 # Invoice/BillingSchedule terminal-state sets (CONTRACTS.md picklists).
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Offline referential-integrity check across SFDMU plans.
+
+Every lookup column in a plan CSV (``Product2.StockKeepingUnit``,
+``ProductSellingModel.$$Name$SellingModelType``) must name a row of the
+parent object somewhere in the same set of plans. Otherwise SFDMU only
+finds out mid-load, as a MissingParentRecordsReport.csv row or a failed
+insert. This script reads every CSV of every plan in a scope once. Parent
+rows go into one hash set per (object, key) the scope's lookups use, and each
+lookup cell is then resolved against those sets. Dangling references are
+reported with file, line and column.
+
+A scope is a directory of sibling plans that load into the same org
+(``datasets/sfdmu/qb/en-US``), so a parent may live in another plan
+(qb-pricing -> qb-pcm). By default, every directory that holds plans under
+datasets/sfdmu is its own scope.
+
+The relationship name is resolved to a parent object offline, without a
+describe. The checks, in order:
+
+* the object of that name, ignoring case and a trailing digit (``Product``
+  -> Product2, ``PriceBook`` -> Pricebook2);
+* ``X__r`` -> ``X__c``;
+* ``RELATIONSHIP_OBJECTS`` (tasks/rlm_sfdmu_plan.py) for standard names the rule below misses;
+* among the scope objects whose CSVs carry the lookup's key, one whose
+  CamelCase words end the relationship name (``ChildProduct`` -> Product2,
+  ``ShipToAccount`` -> Account), or whose name ends with the relationship
+  name, with or without a role word such as ``Parent`` (``Catalog`` ->
+  ProductCatalog, ``ParentCategory`` -> ProductCategory). The longest match
+  wins, and the object itself wins a tie.
+
+Lookups whose parent is not loaded by any plan in the scope (``User``,
+``RecordType``, org-only records) are listed as unchecked, not dangling.
+
+Usage:
+  python3 scripts/validate_sfdmu_references.py [SCOPE ...] [--json PATH] [--limit N] [--verbose]
+
+  SCOPE        Directory of plans, or one plan (default: every plan directory's parent under datasets/sfdmu)
+  --json PATH  Write the full report as JSON
+  --limit N    Dangling references printed per scope (default 50; the JSON has them all)
+  --verbose    Also list the lookup columns that were not checked, and why
+
+Exit codes: 0 no dangling references, 1 dangling references found, 2 usage error.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+from scripts import sfdmu_csv_diff as csv_diff  # noqa: E402
+from tasks import rlm_sfdmu_fingerprint as fingerprint  # noqa: E402
+from tasks import rlm_sfdmu_overlay, rlm_sfdmu_plan  # noqa: E402
+from tasks.rlm_sfdmu_native import KeyReader, lookup_column, normalize  # noqa: E402
+
+DEFAULT_BASE = REPO_ROOT / "datasets" / "sfdmu"
+DEFAULT_LIMIT = 50
+_WRITE_OPS = {"insert", "upsert", "update"}
+_NA = "#N/A"
+RELATIONSHIP_OBJECTS = rlm_sfdmu_plan.RELATIONSHIP_OBJECTS
+_match_score = rlm_sfdmu_plan.relationship_score
+
+
+def _key_getter(header: list, components: list):
+    """``row -> key tuple`` (None when the key is blank) for a positional row, or None if the header lacks the key.
+
+    Parts of a ``$$`` cell are read like lookup cells (see :func:`_cell_key`).
+    """
+    reader = KeyReader(header, components)
+    if not reader.usable:
+        return None
+    index = {col: i for i, col in enumerate(header)}
+    sources = [(index[col], part, width) for col, part, width in reader.sources]
+
+    def key(row):
+        values = []
+        for i, part, width in sources:
+            cell = row[i] if i < len(row) else ""
+            if part >= 0:
+                parts = cell.split(";")
+                if len(parts) > width:
+                    return None
+                cell = parts[part] if part < len(parts) else ""
+            values.append(normalize("" if cell == _NA else cell))
+        return tuple(values) if any(values) else None
+
+    return key
+
+
+def plan_files(plan_dir: str) -> list:
+    """``(sobject, csv path, loaded)`` per distinct CSV a plan reads, in plan order.
+
+    ``loaded`` is False for Readonly and Delete objects: their rows still
+    count as parents, but their own lookups are not written. Excluded
+    objects are left out.
+    """
+    with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+        plan = json.load(f)
+    files = {}
+    for set_index, obj_set in enumerate(rlm_sfdmu_plan.object_sets(plan)):
+        for obj in obj_set.get("objects", []):
+            sobject = rlm_sfdmu_plan.query_sobject(obj.get("query", ""))
+            if not sobject or obj.get("excluded", False):
+                continue
+            for path in (os.path.join(plan_dir, "objectset_source", f"object-set-{set_index + 1}",
+                                      f"{sobject}.csv"), os.path.join(plan_dir, f"{sobject}.csv")):
+                if os.path.isfile(path):
+                    break
+            else:
+                continue
+            loaded = obj.get("operation", "Upsert").lower() in _WRITE_OPS
+            previous = files.get(path)
+            files[path] = (sobject, path, loaded or bool(previous and previous[2]))
+    return list(files.values())
+
+
+def default_scopes(base: str) -> dict:
+    """``{directory: [plan names]}`` for every directory under ``base`` that directly holds plans."""
+    scopes = defaultdict(list)
+    for rel in fingerprint.find_plans(base):
+        path = os.path.normpath(os.path.join(base, rel))
+        scopes[os.path.dirname(path)].append(os.path.basename(path))
+    return dict(sorted(scopes.items()))
+
+
+def _keyed(headers: list, components: list) -> bool:
+    return any(KeyReader(header, components).usable for header in headers)
+
+
+def _resolve(rel: str, components: list, child: str, headers: dict) -> tuple:
+    """``(parent object, reason)``: the object a lookup points at, or None and why not.
+
+    ``headers`` maps each object loaded in the scope to the headers of its CSVs.
+    """
+    by_lower = {name.lower().rstrip("0123456789"): name for name in headers}
+    for candidate in (RELATIONSHIP_OBJECTS.get(rel), rel, re.sub(r"__r$", "__c", rel)):
+        name = by_lower.get((candidate or "").lower().rstrip("0123456789"))
+        if name:
+            if not _keyed(headers[name], components):
+                return None, f"{name} CSVs have no {'/'.join(components)} key"
+            return name, None
+        if candidate and candidate == RELATIONSHIP_OBJECTS.get(rel):
+            return None, f"{candidate} is not loaded by any plan in the scope"
+    scored = []
+    for name, object_headers in headers.items():
+        score = _match_score(rel, name)
+        if score and _keyed(object_headers, components):
+            scored.append((score, name))
+    if not scored:
+        return None, "parent not loaded by any plan in the scope"
+    best = max(score for score, _ in scored)
+    names = sorted(name for score, name in scored if score == best)
+    if len(names) == 1:
+        return names[0], None
+    if child in names:
+        return child, None
+    return None, f"ambiguous parent ({', '.join(names)})"
+
+
+def check_scope(scope: str, plans: list = None) -> dict:
+    """Resolve every lookup cell of the plans in ``scope`` against the parent rows in those plans.
+
+    ``plans`` are paths relative to ``scope`` (default: every plan under it).
+    Returns ``{scope, plans, files, lookups, references, dangling[], unchecked[]}``.
+    A dangling entry is ``{plan, file, line, column, parent, key, reason}``; an
+    unchecked one is ``{plan, file, column, reason}``.
+    """
+    plans = fingerprint.find_plans(scope) if plans is None else plans
+    files = []  # (plan, sobject, path, loaded, header)
+    headers = defaultdict(list)  # sobject -> headers of its CSVs
+    shown = {}  # path -> path reported (an overlay plan's CSVs are read from its materialized copy)
+    for rel in plans:
+        plan_dir = os.path.normpath(os.path.join(scope, rel))
+        full_dir = rlm_sfdmu_overlay.materialize(plan_dir)
+        for sobject, path, loaded in plan_files(full_dir):
+            with csv_diff.open_csv(path) as (header, _):
+                if not header:
+                    continue
+            files.append((rel, sobject, path, loaded, header))
+            shown[path] = _rel(os.path.join(plan_dir, os.path.relpath(path, full_dir)), scope)
+            headers[sobject].append(header)
+
+    # Lookup columns -> (parent, components); the parent keys each one needs.
+    report = {"scope": scope, "plans": len(plans), "files": len(files), "lookups": 0, "references": 0,
+              "dangling": [], "unchecked": []}
+    lookups = {}  # path -> [(column index, column, parent, components)]
+    wanted = defaultdict(set)  # parent -> {components tuple}
+    for rel, sobject, path, loaded, header in files:
+        if not loaded:
+            continue
+        for i, column in enumerate(header):
+            parsed = lookup_column(column)
+            if not parsed:
+                continue
+            parent, reason = _resolve(parsed[0], parsed[1], sobject, headers)
+            if not parent:
+                report["unchecked"].append({"plan": rel, "file": shown[path], "column": column,
+                                            "reason": reason})
+                continue
+            lookups.setdefault(path, []).append((i, column, parent, tuple(parsed[1])))
+            wanted[parent].add(tuple(parsed[1]))
+            report["lookups"] += 1
+
+    # One read per CSV: add its parent keys, and collect its lookup cells.
+    keys = defaultdict(set)  # (parent, components) -> {key tuple}
+    cells = []  # (plan, path, line, column, parent, components, cell)
+    for rel, sobject, path, loaded, header in files:
+        getters = [(components, _key_getter(header, list(components))) for components in wanted.get(sobject, ())]
+        getters = [(components, getter) for components, getter in getters if getter]
+        checks = lookups.get(path, [])
+        if not getters and not checks:
+            continue
+        with csv_diff.open_csv(path) as (_, reader):
+            for row in reader:
+                if not any(v.strip() for v in row):
+                    continue
+                for components, getter in getters:
+                    key = getter(row)
+                    if key is not None:
+                        keys[(sobject, components)].add(key)
+                for i, column, parent, components in checks:
+                    cell = row[i] if i < len(row) else ""
+                    if not cell or cell == _NA:
+                        continue
+                    cells.append((rel, path, reader.line_num, column, parent, components, cell))
+
+    for rel, path, line, column, parent, components, cell in cells:
+        key = _cell_key(cell, len(components))
+        if key == ():
+            continue
+        report["references"] += 1
+        if key is None:
+            reason = f"expected {len(components)} ;-separated values"
+        elif key not in keys[(parent, components)]:
+            reason = f"no {parent} row"
+        else:
+            continue
+        report["dangling"].append({"plan": rel, "file": shown[path], "line": line, "column": column,
+                                   "parent": parent, "key": cell, "reason": reason})
+    return report
+
+
+def _cell_key(cell: str, width: int):
+    """Key tuple of a lookup cell; ``()`` for no reference, None if malformed.
+
+    A ``$$`` composite cell is ``;``-joined. Missing trailing parts are blank
+    components, and ``#N/A`` parts count as blank.
+    """
+    parts = cell.split(";") if width > 1 else [cell]
+    if len(parts) > width:
+        return None
+    parts = ["" if part == _NA else part for part in parts] + [""] * (width - len(parts))
+    if not any(part.strip() for part in parts):
+        return ()
+    return tuple(normalize(part) for part in parts)
+
+
+def _rel(path: str, scope: str) -> str:
+    return os.path.relpath(path, scope).replace(os.sep, "/")
+
+
+def summary_lines(report: dict, limit: int = DEFAULT_LIMIT, verbose: bool = False) -> list:
+    """Text summary of one scope's report."""
+    lines = [f"{report['scope']}: {report['plans']} plan(s), {report['files']} CSV(s), "
+             f"{report['lookups']} lookup column(s), {report['references']} reference(s), "
+             f"{len(report['dangling'])} dangling, {len(report['unchecked'])} unchecked"]
+    for entry in report["dangling"][:limit]:
+        lines.append(f"  {entry['file']}:{entry['line']}  {entry['column']} = {entry['key']!r}  "
+                     f"({entry['reason']})")
+    if len(report["dangling"]) > limit:
+        lines.append(f"  ... and {len(report['dangling']) - limit} more")
+    if verbose:
+        for entry in report["unchecked"]:
+            lines.append(f"  unchecked: {entry['file']}  {entry['column']}  ({entry['reason']})")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scopes", nargs="*", help="Plan directories or directories of plans")
+    parser.add_argument("--json", help="Write the full report as JSON")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Dangling references printed per scope")
+    parser.add_argument("--verbose", action="store_true", help="List unchecked lookup columns")
+    args = parser.parse_args(argv)
+
+    if args.scopes:
+        scopes = {scope: fingerprint.find_plans(scope) if os.path.isdir(scope) else [] for scope in args.scopes}
+    else:
+        scopes = default_scopes(os.path.relpath(DEFAULT_BASE))
+    for scope, plans in scopes.items():
+        if not plans:
+            print(f"No SFDMU plans in: {scope}", file=sys.stderr)
+            return 2
+    reports = [check_scope(scope, plans) for scope, plans in scopes.items()]
+    for report in reports:
+        print("\n".join(summary_lines(report, args.limit, args.verbose)))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"scopes": reports}, f, indent=2)
+    return 1 if any(report["dangling"] for report in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,24 +18,41 @@ Options:
     --fix-composite-keys  Add missing composite key columns to CSVs
     --fix-all             Enable all fixes (headers + composite keys)
     --dry-run             Show what would be fixed without making changes
+    --workers N           Datasets validated in parallel (default: CPU count; 1 = in this process)
+    --no-cache            Re-read every file instead of re-using .cci/sfdmu_validate/cache.json
     --help                Show this help message
+
+Results are cached per file content: a re-run only re-reads the export.json and
+CSV files whose size or mtime moved, and only re-validates the datasets whose
+files hash differently from the last run. Editing this script drops the cache.
+Fix runs and --verbose runs validate in this process, one dataset at a time.
 """
 
 import argparse
 import csv
+import hashlib
 import json
+import os
 import re
 import sys
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tasks import rlm_sfdmu_overlay  # noqa: E402
+
 
 # Path segments (relative to the scan root) that mark a directory we never validate:
 # internal SFDMU subdirs, developer-local scratch (test/), and backup dirs (*.bak).
 _SKIP_SEGMENTS = ("objectset_source", "processed", "source", "logs", "test")
 
+# Per-file validation cache (relative to the project root; .cci/ is git-ignored).
+DEFAULT_CACHE_FILE = Path(".cci") / "sfdmu_validate" / "cache.json"
+CACHE_VERSION = 1
+
 
 def _is_skippable_export(export_json: Path, root: Path) -> bool:
     """Return True if an export.json found under ``root`` should be skipped.
@@ -87,6 +104,19 @@ class ValidationResult:
         if issue.severity in (Severity.CRITICAL, Severity.HIGH, Severity.MEDIUM):
             self.passed = False
 
+    def to_dict(self) -> dict:
+        """Plain-JSON form of the result (for the validation cache)."""
+        data = asdict(self)
+        for issue in data["issues"]:
+            issue["severity"] = issue["severity"].value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ValidationResult":
+        """Rebuild a result written by ``to_dict``."""
+        issues = [Issue(**{**issue, "severity": Severity(issue["severity"])}) for issue in data["issues"]]
+        return cls(**{**data, "issues": issues})
+
 
 class SFDMUValidator:
     """Validator for SFDMU v5 datasets."""
@@ -145,7 +175,8 @@ class SFDMUValidator:
     }
 
     def __init__(self, base_dir: str, strict: bool = False, verbose: bool = False,
-                 fix_headers: bool = False, fix_composite_keys: bool = False, dry_run: bool = False):
+                 fix_headers: bool = False, fix_composite_keys: bool = False, dry_run: bool = False,
+                 cache_file: Optional[str] = None):
         """Initialize the validator.
 
         Args:
@@ -155,6 +186,8 @@ class SFDMUValidator:
             fix_headers: If True, add missing headers to empty CSVs
             fix_composite_keys: If True, add missing composite key columns
             dry_run: If True, show what would be fixed without making changes
+            cache_file: Path of the per-file result cache (relative to base_dir), or None
+                for no cache. Ignored when fixing, since fixes rewrite the files.
         """
         self.base_dir = Path(base_dir)
         if not self.base_dir.exists():
@@ -168,6 +201,128 @@ class SFDMUValidator:
         self.sfdmu_base = self.base_dir / "datasets" / "sfdmu"
         self.fixes_applied = {"headers": 0, "composite_keys": 0}
 
+        self.cache_file = None
+        self._cache = None
+        self._fresh_facts = {}
+        self._cache_dirty = False
+        if cache_file and not (fix_headers or fix_composite_keys):
+            self.cache_file = self.base_dir / cache_file
+            self._cache = self._load_cache()
+
+    def _load_cache(self) -> dict:
+        """Load the cache, or start an empty one if it is missing or from other rules."""
+        rules = hashlib.sha256(f"{CACHE_VERSION}\0".encode() + Path(__file__).read_bytes()).hexdigest()
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("rules") == rules:
+                return cache
+        except (OSError, ValueError):
+            pass
+        return {"rules": rules, "files": {}, "csv": {}, "plans": {}}
+
+    def save_cache(self):
+        """Write the cache back (if anything moved), dropping entries for files and datasets that are gone."""
+        if self._cache is None or not self._cache_dirty:
+            return
+        cache = self._cache
+        cache["files"] = {k: v for k, v in cache["files"].items() if os.path.exists(k)}
+        live = {entry["sha256"] for entry in cache["files"].values()}
+        cache["csv"] = {k: v for k, v in cache["csv"].items() if k in live}
+        cache["plans"] = {k: v for k, v in cache["plans"].items() if os.path.isdir(k)}
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        tmp.write_text(json.dumps(cache, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.cache_file)
+        self._cache_dirty = False
+
+    def _file_hash(self, path: Path) -> Optional[str]:
+        """sha256 of a file's bytes, re-read only when its size or mtime moved (None if unreadable)."""
+        key = os.path.abspath(path)
+        try:
+            st = os.stat(key)
+            entry = self._cache["files"].get(key)
+            if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+                return entry["sha256"]
+            with open(key, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        self._cache["files"][key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+        self._cache_dirty = True
+        return digest
+
+    def _dataset_digest(self, dataset_path: Path) -> Optional[str]:
+        """Hash of everything a dataset's result depends on (None if a file cannot be read)."""
+        try:
+            dataset_path = self._full_path(dataset_path)
+        except (rlm_sfdmu_overlay.OverlayError, OSError):
+            return None
+        paths = [dataset_path / "export.json"]
+        paths += sorted(dataset_path.glob("*.csv"))
+        paths += sorted((dataset_path / "objectset_source").glob("object-set-*/*.csv"))
+        parts = [self._cache["rules"]]
+        for path in paths:
+            digest = self._file_hash(path) if path.exists() else "-"
+            if digest is None:
+                return None
+            parts.append(f"{path.relative_to(dataset_path).as_posix()}\0{digest}")
+        return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def validate_datasets(self, datasets: List[Path], workers: Optional[int] = None) -> List[ValidationResult]:
+        """Validate datasets, re-using cached results and spreading the rest over a process pool.
+
+        Args:
+            datasets: Dataset directories, as returned by find_sfdmu_datasets()
+            workers: Datasets validated in parallel (default: CPU count; 1 = in this process)
+
+        Returns:
+            One ValidationResult per dataset, in the order given
+        """
+        results: List[Optional[ValidationResult]] = [None] * len(datasets)
+        pending = []
+        for i, dataset_path in enumerate(datasets):
+            digest = self._dataset_digest(dataset_path) if self._cache is not None else None
+            cached = self._cache["plans"].get(os.path.abspath(dataset_path)) if digest else None
+            if cached and cached["digest"] == digest:
+                self.log(f"Unchanged since the last run: {self.get_dataset_name(dataset_path)}")
+                results[i] = ValidationResult.from_dict(cached["result"])
+            else:
+                pending.append((i, dataset_path, digest))
+
+        if self.fix_headers or self.fix_composite_keys or self.verbose:
+            workers = 1
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        outcomes = self._map_datasets([dataset_path for _, dataset_path, _ in pending], workers)
+        for (i, dataset_path, digest), (result, facts) in zip(pending, outcomes):
+            results[i] = result
+            if self._cache is not None:
+                self._cache["csv"].update(facts)
+                self._cache_dirty = True
+                if digest:
+                    self._cache["plans"][os.path.abspath(dataset_path)] = {"digest": digest,
+                                                                           "result": result.to_dict()}
+        return results
+
+    def _map_datasets(self, datasets: List[Path], workers: int):
+        """(result, new CSV facts) per dataset, in order; on a process pool when more than one worker."""
+        if workers > 1:
+            try:
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,))
+            except (OSError, NotImplementedError):  # no working multiprocessing (e.g. no /dev/shm)
+                pool = None
+            if pool is not None:
+                with pool:
+                    yield from pool.map(_validate_in_worker, datasets)
+                return
+        for dataset_path in datasets:
+            yield self.validate_dataset(dataset_path), {}
+
+    def take_fresh_facts(self) -> dict:
+        """CSV facts read since the last call (sent back to the parent by pool workers)."""
+        facts, self._fresh_facts = self._fresh_facts, {}
+        return facts
+
     def log(self, message: str, level: str = "INFO"):
         """Log a message if verbose mode is enabled."""
         if self.verbose:
@@ -199,17 +354,25 @@ class SFDMUValidator:
         if not self.sfdmu_base.exists():
             return datasets
 
-        # Find all export.json files in SFDMU directory tree
-        for export_json in self.sfdmu_base.rglob("export.json"):
+        # Find all export.json files in SFDMU directory tree, and overlay plans
+        # (which may inherit their export.json from the base plan)
+        markers = list(self.sfdmu_base.rglob("export.json"))
+        markers += self.sfdmu_base.rglob(rlm_sfdmu_overlay.OVERLAY_FILE)
+        for export_json in markers:
             dataset_dir = export_json.parent
             # Skip internal subdirs, developer-local scratch (test/), and backup dirs (*.bak).
             # Filter on the path relative to sfdmu_base so the checkout path can't matter.
-            if _is_skippable_export(export_json, self.sfdmu_base):
+            if _is_skippable_export(export_json, self.sfdmu_base) or dataset_dir in datasets:
                 continue
             datasets.append(dataset_dir)
 
         return sorted(datasets)
 
+    def _full_path(self, dataset_path: Path) -> Path:
+        """The directory holding the dataset in full: its materialized copy for an overlay plan."""
+        cache_dir = self.base_dir / rlm_sfdmu_overlay.DEFAULT_CACHE_DIR
+        return Path(rlm_sfdmu_overlay.materialize(str(dataset_path), str(cache_dir)))
+
     def get_dataset_name(self, dataset_path: Path) -> str:
         """Extract dataset name from path (e.g., qb/en-US/qb-pcm).
 
@@ -254,6 +417,20 @@ class SFDMUValidator:
         self.log(f"Validating dataset: {dataset_name}")
         self.log(f"{'='*60}")
 
+        overlay = rlm_sfdmu_overlay.is_overlay(str(dataset_path))
+        if overlay:
+            try:
+                dataset_path = self._full_path(dataset_path)
+            except rlm_sfdmu_overlay.OverlayError as e:
+                result.add_issue(Issue(
+                    severity=Severity.CRITICAL,
+                    object_name="N/A",
+                    message=f"overlay plan cannot be materialized: {e}",
+                    file_path=self._make_relative_path(dataset_path / rlm_sfdmu_overlay.OVERLAY_FILE)
+                ))
+                return result
+            self.log(f"Overlay plan, validating its materialized copy: {dataset_path}")
+
         export_json_path = dataset_path / "export.json"
         if not export_json_path.exists():
             result.add_issue(Issue(
@@ -276,8 +453,11 @@ class SFDMUValidator:
         # Find per-pass CSV overrides
         objectset_source_overrides = self._find_objectset_source_overrides(dataset_path, export_data)
 
-        # Apply fixes if requested (before validation)
-        if self.fix_headers or self.fix_composite_keys:
+        # Apply fixes if requested (before validation). An overlay plan's CSVs are
+        # built from its base, so fixes belong in the base plan or the overlay's own files.
+        if overlay and (self.fix_headers or self.fix_composite_keys):
+            self.log("Overlay plan: not fixing its materialized copy; fix the base plan instead")
+        elif self.fix_headers or self.fix_composite_keys:
             self.log(f"\n{'='*60}")
             self.log(f"Applying fixes to: {dataset_name}")
             self.log(f"{'='*60}")
@@ -687,66 +867,85 @@ class SFDMUValidator:
             ))
             return
 
-        # Read CSV to check headers and content
-        try:
-            with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
-                reader = csv.reader(f)
-                try:
-                    headers = next(reader)
-                except StopIteration:
-                    # Empty file
-                    if obj_name in self.KNOWN_EMPTY_CSV_OBJECTS:
-                        result.add_issue(Issue(
-                            severity=Severity.HIGH,
-                            object_name=obj_name,
-                            message=f"{pass_prefix}CSV file is completely empty (no header row). Add header row with fields from query.",
-                            file_path=self._make_relative_path(csv_path)
-                        ))
-                    else:
-                        result.add_issue(Issue(
-                            severity=Severity.CRITICAL,
-                            object_name=obj_name,
-                            message=f"{pass_prefix}CSV file is completely empty (no header row)",
-                            file_path=self._make_relative_path(csv_path)
-                        ))
-                    return
-
-                # Normalize headers (strip BOM, quotes, whitespace)
-                headers = [self._normalize_header(h) for h in headers]
+        # Headers and row count (re-used from the cache when the content is unchanged)
+        facts = self._csv_facts(csv_path)
+        if "error" in facts:
+            result.add_issue(Issue(
+                severity=Severity.HIGH,
+                object_name=obj_name,
+                message=f"{pass_prefix}Error reading CSV: {facts['error']}",
+                file_path=self._make_relative_path(csv_path)
+            ))
+            return
 
-                # Count data rows
-                data_row_count = sum(1 for _ in reader)
+        headers = facts["headers"]
+        if headers is None:
+            # Empty file
+            if obj_name in self.KNOWN_EMPTY_CSV_OBJECTS:
+                result.add_issue(Issue(
+                    severity=Severity.HIGH,
+                    object_name=obj_name,
+                    message=f"{pass_prefix}CSV file is completely empty (no header row). Add header row with fields from query.",
+                    file_path=self._make_relative_path(csv_path)
+                ))
+            else:
+                result.add_issue(Issue(
+                    severity=Severity.CRITICAL,
+                    object_name=obj_name,
+                    message=f"{pass_prefix}CSV file is completely empty (no header row)",
+                    file_path=self._make_relative_path(csv_path)
+                ))
+            return
 
-                self.log(f"  CSV has {len(headers)} columns, {data_row_count} data rows", level="DEBUG")
+        data_row_count = facts["rows"]
+        self.log(f"  CSV has {len(headers)} columns, {data_row_count} data rows", level="DEBUG")
 
-                # Check if this is a known empty CSV (0 data rows)
-                if data_row_count == 0 and obj_name in self.KNOWN_EMPTY_CSV_OBJECTS:
-                    self.log(f"  Object {obj_name} has 0 data rows (known placeholder)", level="DEBUG")
+        # Check if this is a known empty CSV (0 data rows)
+        if data_row_count == 0 and obj_name in self.KNOWN_EMPTY_CSV_OBJECTS:
+            self.log(f"  Object {obj_name} has 0 data rows (known placeholder)", level="DEBUG")
 
-                # Validate composite key columns for objects with multi-field externalId
-                # Skip objects with deleteOldData: true (delete-then-insert strategy doesn't need composite key)
-                external_id = obj_config.get("externalId", "")
-                if ";" in external_id and not external_id.startswith("$$") and not obj_config.get("deleteOldData"):
-                    # This is a composite key - check if CSV has the $$ column
-                    expected_composite_col = "$$" + "$".join(external_id.split(";"))
-
-                    if expected_composite_col not in headers:
-                        result.add_issue(Issue(
-                            severity=Severity.HIGH,
-                            object_name=obj_name,
-                            message=f"{pass_prefix}CSV missing composite key column '{expected_composite_col}' for externalId '{external_id}'. This will break re-import idempotency in SFDMU v5.",
-                            file_path=self._make_relative_path(csv_path)
-                        ))
-                    else:
-                        self.log(f"  Composite key column '{expected_composite_col}' found", level="DEBUG")
+        # Validate composite key columns for objects with multi-field externalId
+        # Skip objects with deleteOldData: true (delete-then-insert strategy doesn't need composite key)
+        external_id = obj_config.get("externalId", "")
+        if ";" in external_id and not external_id.startswith("$$") and not obj_config.get("deleteOldData"):
+            # This is a composite key - check if CSV has the $$ column
+            expected_composite_col = "$$" + "$".join(external_id.split(";"))
 
+            if expected_composite_col not in headers:
+                result.add_issue(Issue(
+                    severity=Severity.HIGH,
+                    object_name=obj_name,
+                    message=f"{pass_prefix}CSV missing composite key column '{expected_composite_col}' for externalId '{external_id}'. This will break re-import idempotency in SFDMU v5.",
+                    file_path=self._make_relative_path(csv_path)
+                ))
+            else:
+                self.log(f"  Composite key column '{expected_composite_col}' found", level="DEBUG")
+
+    def _csv_facts(self, csv_path: Path) -> dict:
+        """Headers and row count of a CSV, from the cache when a file with the same content was read before."""
+        if self._cache is None:
+            return self._read_csv_facts(csv_path)
+        digest = self._file_hash(csv_path)
+        facts = self._cache["csv"].get(digest) if digest else None
+        if facts is None:
+            facts = self._read_csv_facts(csv_path)
+            if digest:
+                self._cache["csv"][digest] = self._fresh_facts[digest] = facts
+                self._cache_dirty = True
+        return facts
+
+    def _read_csv_facts(self, csv_path: Path) -> dict:
+        """Read a CSV into {"headers": normalized headers or None if empty, "rows": n} or {"error": ...}."""
+        try:
+            with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+                reader = csv.reader(f)
+                headers = next(reader, None)
+                if headers is None:
+                    return {"headers": None}
+                # Normalize headers (strip BOM, quotes, whitespace)
+                return {"headers": [self._normalize_header(h) for h in headers], "rows": sum(1 for _ in reader)}
         except Exception as e:
-            result.add_issue(Issue(
-                severity=Severity.HIGH,
-                object_name=obj_name,
-                message=f"{pass_prefix}Error reading CSV: {type(e).__name__}: {e}",
-                file_path=self._make_relative_path(csv_path)
-            ))
+            return {"error": f"{type(e).__name__}: {e}"}
 
     def _normalize_header(self, header: str) -> str:
         """Normalize CSV header (strip BOM, quotes, whitespace).
@@ -1056,6 +1255,20 @@ class SFDMUValidator:
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+_WORKER: Optional[SFDMUValidator] = None
+
+
+def _init_worker(validator: SFDMUValidator):
+    """Process pool initializer: one validator (and cache snapshot) per worker."""
+    global _WORKER
+    _WORKER = validator
+
+
+def _validate_in_worker(dataset_path: Path) -> Tuple[ValidationResult, dict]:
+    """Validate one dataset in a pool worker; return its result and the CSV facts it read."""
+    return _WORKER.validate_dataset(dataset_path), _WORKER.take_fresh_facts()
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -1113,6 +1326,17 @@ Examples:
         action="store_true",
         help="Show what would be fixed without making changes"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Datasets validated in parallel (default: CPU count; 1 = in this process)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-read every file instead of re-using {DEFAULT_CACHE_FILE.as_posix()}"
+    )
 
     args = parser.parse_args()
 
@@ -1131,7 +1355,8 @@ Examples:
         verbose=args.verbose,
         fix_headers=args.fix_headers,
         fix_composite_keys=args.fix_composite_keys,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        cache_file=None if args.no_cache else str(DEFAULT_CACHE_FILE)
     )
 
     # Find datasets to validate
@@ -1172,10 +1397,11 @@ Examples:
     print(f"\nFound {len(datasets)} dataset(s) to validate\n")
 
     # Validate all datasets
-    results = []
-    for dataset_path in datasets:
-        result = validator.validate_dataset(dataset_path)
-        results.append(result)
+    results = validator.validate_datasets(datasets, workers=args.workers)
+    try:
+        validator.save_cache()
+    except OSError as e:
+        print(f"Warning: could not write {validator.cache_file}: {e}", file=sys.stderr)
 
     # Generate report
     report = validator.generate_report(results)
@@ -9,8 +9,6 @@ Idempotent: queries only Draft records; no-ops if all are already Active.
 Uses the Composite API (25 records per request) for efficiency.
 """
 
-import requests
-
 try:
     from cumulusci.core.tasks import BaseTask
     from cumulusci.core.exceptions import TaskOptionsError
@@ -18,6 +16,8 @@ except ImportError:
     BaseTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 BATCH_SIZE = 25  # Composite API max sub-requests per call
 
 
@@ -39,10 +39,7 @@ class ActivateRateCardEntries(BaseTask):
         api_version = getattr(self.org_config, "api_version", None) or "67.0"
         api_version = str(api_version).lstrip("v")
 
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(access_token)
         base_url = f"{instance_url}/services/data/v{api_version}"
 
         # Step 1: Query Draft records — follow the query locator across ALL
@@ -51,7 +48,7 @@ class ActivateRateCardEntries(BaseTask):
         # reporting success.
         soql = "SELECT Id FROM RateCardEntry WHERE Status = 'Draft'"
         records = []
-        resp = requests.get(
+        resp = rlm_http.get(
             f"{base_url}/query",
             headers=headers,
             params={"q": soql},
@@ -67,7 +64,7 @@ class ActivateRateCardEntries(BaseTask):
             next_url = page.get("nextRecordsUrl")
             if page.get("done", True) or not next_url:
                 break
-            resp = requests.get(
+            resp = rlm_http.get(
                 f"{instance_url}{next_url}", headers=headers, timeout=30
             )
 
@@ -95,7 +92,7 @@ class ActivateRateCardEntries(BaseTask):
                 }
                 for j, rec_id in enumerate(batch)
             ]
-            composite_resp = requests.post(
+            composite_resp = rlm_http.post(
                 f"{base_url}/composite",
                 headers=headers,
                 json={"allOrNone": False, "compositeRequest": sub_requests},
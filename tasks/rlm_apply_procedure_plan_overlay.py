@@ -11,8 +11,6 @@ import os
 import time
 from typing import Any, Dict, Iterable, List, Optional
 
-import requests
-
 try:
     from cumulusci.core.exceptions import TaskOptionsError
     from cumulusci.tasks.salesforce import BaseSalesforceTask
@@ -20,6 +18,8 @@ except ImportError:
     BaseSalesforceTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 
 class ApplyProcedurePlanOverlay(BaseSalesforceTask):
     """Apply a ProcedurePlan overlay and restore activation state safely."""
@@ -77,10 +77,7 @@ class ApplyProcedurePlanOverlay(BaseSalesforceTask):
 
     @property
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     @staticmethod
     def _bool_option(value: Any, default: bool) -> bool:
@@ -115,7 +112,7 @@ class ApplyProcedurePlanOverlay(BaseSalesforceTask):
         return current == desired
 
     def _query(self, soql: str) -> List[Dict[str, Any]]:
-        response = requests.get(
+        response = rlm_http.get(
             f"{self._base_url}/query",
             headers=self._headers,
             params={"q": soql},
@@ -127,7 +124,7 @@ class ApplyProcedurePlanOverlay(BaseSalesforceTask):
         body = response.json()
         records = body.get("records", [])
         while not body.get("done", True) and body.get("nextRecordsUrl"):
-            response = requests.get(
+            response = rlm_http.get(
                 f"{self.org_config.instance_url}{body['nextRecordsUrl']}",
                 headers=self._headers,
                 timeout=60,
@@ -144,7 +141,7 @@ class ApplyProcedurePlanOverlay(BaseSalesforceTask):
         return records
 
     def _patch_sobject(self, sobject: str, record_id: str, body: Dict[str, Any]):
-        response = requests.patch(
+        response = rlm_http.patch(
             f"{self._base_url}/sobjects/{sobject}/{record_id}",
             headers=self._headers,
             json=body,
@@ -156,7 +153,7 @@ class ApplyProcedurePlanOverlay(BaseSalesforceTask):
             )
 
     def _post_sobject(self, sobject: str, body: Dict[str, Any]) -> str:
-        response = requests.post(
+        response = rlm_http.post(
             f"{self._base_url}/sobjects/{sobject}",
             headers=self._headers,
             json=body,
@@ -63,7 +63,7 @@ class CreateSequencePolicies(BaseSalesforceApiTask):
     }
 
     def _run_task(self) -> None:
-        import requests
+        from tasks import rlm_http
 
         plan_dir = self.options.get("plan_dir", DEFAULT_PLAN_DIR)
         json_path = os.path.join(plan_dir, "SequencePolicies.json")
@@ -108,7 +108,7 @@ class CreateSequencePolicies(BaseSalesforceApiTask):
             body = self._build_body(policy, ref_id_cache)
             self.logger.info(f"  Creating policy: {name}")
 
-            resp = requests.post(base_url, headers=headers, json=body, timeout=30)
+            resp = rlm_http.post(base_url, headers=headers, json=body, timeout=30)
             if resp.status_code in (200, 201):
                 self.logger.info(f"    Created: {name}")
                 created += 1
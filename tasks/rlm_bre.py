@@ -31,8 +31,6 @@ import tempfile
 import zipfile
 from typing import Any, Dict, List, Optional
 
-import requests
-
 try:
     from cumulusci.tasks.salesforce import BaseSalesforceTask
     from cumulusci.core.exceptions import CommandException, TaskOptionsError
@@ -41,6 +39,8 @@ except ImportError:
     TaskOptionsError = Exception
     CommandException = Exception
 
+from tasks import rlm_http
+
 
 # ===================================================================
 # ExportBRE
@@ -105,10 +105,7 @@ class ExportBRE(BaseSalesforceTask):
 
     @property
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self._access_token)
 
     @property
     def _query_url(self) -> str:
@@ -119,7 +116,7 @@ class ExportBRE(BaseSalesforceTask):
     def _soql_query(self, soql: str) -> List[dict]:
         """Execute a SOQL query and return all records (handles pagination)."""
         records: List[dict] = []
-        resp = requests.get(self._query_url, headers=self._headers, params={"q": soql})
+        resp = rlm_http.get(self._query_url, headers=self._headers, params={"q": soql})
         if resp.status_code != 200:
             raise CommandException(
                 f"SOQL query failed ({resp.status_code}): {resp.text}"
@@ -128,7 +125,7 @@ class ExportBRE(BaseSalesforceTask):
         records.extend(body.get("records", []))
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             url = f"{self._instance_url}{body['nextRecordsUrl']}"
-            resp = requests.get(url, headers=self._headers)
+            resp = rlm_http.get(url, headers=self._headers)
             if resp.status_code != 200:
                 raise CommandException(
                     f"SOQL pagination failed ({resp.status_code}): {resp.text}"
@@ -140,7 +137,7 @@ class ExportBRE(BaseSalesforceTask):
     def _describe_object(self, obj_name: str) -> Optional[dict]:
         """Describe an sObject and return the full describe result, or None on failure."""
         url = f"{self._instance_url}/services/data/v{self._api_version}/sobjects/{obj_name}/describe"
-        resp = requests.get(url, headers=self._headers)
+        resp = rlm_http.get(url, headers=self._headers)
         if resp.status_code == 200:
             return resp.json()
         self.logger.warning(f"Describe {obj_name} failed ({resp.status_code}): {resp.text}")
@@ -0,0 +1,189 @@
+"""Bulk API 2.0 helper for CumulusCI tasks that move large record sets.
+
+REST reads page 2000 rows and sObject Collections writes 200, so clearing or
+scanning 10^5+ rows costs thousands of round trips. Above a row threshold the
+tasks switch to Bulk API 2.0 jobs instead:
+
+* :meth:`BulkApi2.iter_query` — one query job, CSV results paged by
+  ``Sforce-Locator`` (values are strings; an empty field reads as ``None``);
+* :meth:`BulkApi2.delete` — one ``delete`` / ``hardDelete`` ingest job per
+  ~100 MB of ids, with the ``failedResults`` rows returned for logging;
+* :meth:`BulkApi2.ingest` — the same for ``insert`` / ``update`` rows.
+
+This is the tasks-side copy of ``scripts/sf_transport/bulk.py`` (``tasks/``
+does not import ``scripts/``); keep the two in step. Calls go through the
+flow's shared org session (``tasks/rlm_http.py``), so large CSV uploads are
+gzipped. The threshold comes from
+a task option, else ``RLM_SF_BULK_THRESHOLD``, else 10000 rows (``0`` = never).
+"""
+import csv
+import io
+import json
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+
+from tasks import rlm_http
+
+THRESHOLD_ENV_VAR = "RLM_SF_BULK_THRESHOLD"
+DEFAULT_THRESHOLD = 10_000
+
+_MAX_UPLOAD_BYTES = 100 * 1024 * 1024
+_TERMINAL = {"JobComplete", "Failed", "Aborted"}
+
+
+class BulkApiError(RuntimeError):
+    """A Bulk API call failed, or a job ended ``Failed`` / ``Aborted``."""
+
+
+def bulk_threshold(value: Any = None) -> int:
+    raw = value if value not in (None, "") else os.environ.get(THRESHOLD_ENV_VAR)
+    if raw in (None, ""):
+        return DEFAULT_THRESHOLD
+    return max(int(raw), 0)
+
+
+def prefer_bulk(row_count: int, threshold: Any = None) -> bool:
+    limit = bulk_threshold(threshold)
+    return limit > 0 and row_count >= limit
+
+
+def _rows(text: str) -> Iterator[Dict[str, Optional[str]]]:
+    for row in csv.DictReader(io.StringIO(text)):
+        yield {k: (v if v != "" else None) for k, v in row.items()}
+
+
+class BulkApi2:
+    """Bulk API 2.0 jobs for one org (``instance_url`` + ``access_token``)."""
+
+    def __init__(self, instance_url: str, access_token: str, api_version: str, *,
+                 poll_interval: float = 2.0, max_wait: float = 3600.0,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.base = f"{instance_url.rstrip('/')}/services/data/v{str(api_version).lstrip('v')}"
+        self.access_token = access_token
+        self.poll_interval = poll_interval
+        self.max_wait = max_wait
+        self._sleep = sleep
+
+    def _call(self, method: str, rest: str, *, body: Any = None, data: Optional[str] = None,
+              content_type: str = "application/json", accept: str = "application/json",
+              params: Optional[Dict[str, Any]] = None) -> requests.Response:
+        payload = json.dumps(body) if body is not None else data
+        resp = rlm_http.request(
+            method, f"{self.base}/{rest}", params=params,
+            data=payload.encode("utf-8") if payload is not None else None,
+            headers=dict(rlm_http.auth_headers(self.access_token, content_type), Accept=accept),
+        )
+        if not (200 <= resp.status_code < 300):
+            raise BulkApiError(f"{method} {rest} failed ({resp.status_code}): {resp.text[:500]}")
+        return resp
+
+    def _wait(self, kind: str, job_id: str) -> Dict[str, Any]:
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            info = self._call("GET", f"jobs/{kind}/{job_id}").json()
+            state = info.get("state")
+            if state in _TERMINAL:
+                if state != "JobComplete":
+                    raise BulkApiError(f"Bulk {kind} job {job_id} ended {state}: "
+                                       f"{info.get('errorMessage') or 'no error message'}")
+                return info
+            if time.monotonic() >= deadline:
+                raise BulkApiError(f"Bulk {kind} job {job_id} still {state} after {self.max_wait:.0f}s")
+            self._sleep(self.poll_interval)
+
+    def iter_query(self, soql: str, *, max_records: Optional[int] = None
+                   ) -> Iterator[Dict[str, Optional[str]]]:
+        """Run a query job and yield its rows."""
+        job_id = self._call("POST", "jobs/query", body={"operation": "query", "query": soql}).json()["id"]
+        self._wait("query", job_id)
+        locator = None
+        while True:
+            params: Dict[str, Any] = {}
+            if max_records:
+                params["maxRecords"] = int(max_records)
+            if locator:
+                params["locator"] = locator
+            resp = self._call("GET", f"jobs/query/{job_id}/results", params=params or None,
+                              accept="text/csv")
+            yield from _rows(resp.text)
+            locator = resp.headers.get("Sforce-Locator")
+            if not locator or locator == "null":
+                return
+
+    def delete(self, sobject: str, ids: Iterable[str], *, hard: bool = False) -> Dict[str, Any]:
+        """Delete records by Id; returns ``{jobs, processed, failed, failures}``.
+
+        ``failures`` holds the ``failedResults`` rows (``sf__Id``, ``sf__Error``).
+        ``hard`` uses ``hardDelete`` (skips the Recycle Bin; needs the
+        "Bulk API Hard Delete" permission).
+        """
+        operation = "hardDelete" if hard else "delete"
+        return self._ingest(sobject, operation, self._id_chunks(ids))
+
+    def ingest(self, sobject: str, operation: str, fields: List[str],
+               records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """``insert`` / ``update`` records (dicts over ``fields``); same summary as :meth:`delete`.
+
+        ``update`` needs ``Id`` among ``fields``. A ``None`` value is sent as
+        ``#N/A``, which clears the field.
+        """
+        return self._ingest(sobject, operation, self._record_chunks(fields, records))
+
+    def _ingest(self, sobject: str, operation: str, chunks: Iterable[str]) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {"jobs": [], "processed": 0, "failed": 0, "failures": []}
+        for chunk in chunks:
+            job_id = self._call("POST", "jobs/ingest", body={
+                "object": sobject, "operation": operation, "contentType": "CSV", "lineEnding": "LF",
+            }).json()["id"]
+            self._call("PUT", f"jobs/ingest/{job_id}/batches", data=chunk, content_type="text/csv")
+            self._call("PATCH", f"jobs/ingest/{job_id}", body={"state": "UploadComplete"})
+            info = self._wait("ingest", job_id)
+            summary["jobs"].append(job_id)
+            summary["processed"] += int(info.get("numberRecordsProcessed") or 0)
+            summary["failed"] += int(info.get("numberRecordsFailed") or 0)
+            if info.get("numberRecordsFailed"):
+                failed = self._call("GET", f"jobs/ingest/{job_id}/failedResults", accept="text/csv")
+                summary["failures"].extend(_rows(failed.text))
+        return summary
+
+    @staticmethod
+    def _record_chunks(fields: List[str], records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+        def line(values: List[Any]) -> str:
+            buf = io.StringIO()
+            csv.writer(buf, lineterminator="\n").writerow(values)
+            return buf.getvalue()
+
+        def cell(value: Any) -> Any:
+            if value is None:
+                return "#N/A"
+            if isinstance(value, bool):
+                return "true" if value else "false"
+            return value
+
+        header = line(fields)
+        lines, size = [header], len(header)
+        for record in records:
+            text = line([cell(record.get(name)) for name in fields])
+            lines.append(text)
+            size += len(text.encode("utf-8"))
+            if size >= _MAX_UPLOAD_BYTES:
+                yield "".join(lines)
+                lines, size = [header], len(header)
+        if len(lines) > 1:
+            yield "".join(lines)
+
+    @staticmethod
+    def _id_chunks(ids: Iterable[str]) -> Iterator[str]:
+        lines: List[str] = ["Id\n"]
+        size = 3
+        for record_id in ids:
+            lines.append(f"{record_id}\n")
+            size += len(record_id) + 1
+            if size >= _MAX_UPLOAD_BYTES:
+                yield "".join(lines)
+                lines, size = ["Id\n"], 3
+        if len(lines) > 1:
+            yield "".join(lines)
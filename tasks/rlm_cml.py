@@ -18,8 +18,6 @@ import os
 import re
 from typing import Any, Dict, List, Optional, Set, Tuple
 
-import requests
-
 try:
     from cumulusci.core.tasks import BaseTask
     from cumulusci.tasks.salesforce import BaseSalesforceTask
@@ -30,6 +28,8 @@ except ImportError:
     CumulusCIFailure = Exception
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 # ---------------------------------------------------------------------------
 # Salesforce object ID prefix -> object name mapping for polymorphic
 # ReferenceObjectId resolution on ExpressionSetConstraintObj
@@ -225,10 +225,7 @@ class CMLBaseTask(BaseSalesforceTask):
 
     @property
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self._access_token)
 
     @property
     def _query_url(self) -> str:
@@ -239,7 +236,7 @@ class CMLBaseTask(BaseSalesforceTask):
     def soql_query(self, soql: str) -> List[dict]:
         """Execute a SOQL query and return all records (handles pagination)."""
         records = []
-        resp = requests.get(self._query_url, headers=self._headers, params={"q": soql})
+        resp = rlm_http.get(self._query_url, headers=self._headers, params={"q": soql})
         if resp.status_code != 200:
             self.logger.error(f"SOQL query failed ({resp.status_code}): {resp.text}")
             return records
@@ -247,7 +244,7 @@ class CMLBaseTask(BaseSalesforceTask):
         records.extend(body.get("records", []))
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             url = f"{self._instance_url}{body['nextRecordsUrl']}"
-            resp = requests.get(url, headers=self._headers)
+            resp = rlm_http.get(url, headers=self._headers)
             if resp.status_code != 200:
                 self.logger.error(f"SOQL pagination failed ({resp.status_code}): {resp.text}")
                 break
@@ -259,7 +256,7 @@ class CMLBaseTask(BaseSalesforceTask):
         """POST a new sObject record. Returns the new record Id or None."""
         url = f"{self._instance_url}/services/data/v{self._api_version}/sobjects/{obj_name}/"
         payload = {k: v for k, v in record.items() if k != "Id"}
-        resp = requests.post(url, headers=self._headers, json=payload)
+        resp = rlm_http.post(url, headers=self._headers, json=payload)
         if resp.status_code == 201:
             new_id = resp.json()["id"]
             self.logger.info(f"Created {obj_name} -> {record.get('Name', record.get('ApiName', new_id))}")
@@ -270,7 +267,7 @@ class CMLBaseTask(BaseSalesforceTask):
     def update_record(self, obj_name: str, record_id: str, data: dict) -> bool:
         """PATCH an existing sObject record. Returns True on success."""
         url = f"{self._instance_url}/services/data/v{self._api_version}/sobjects/{obj_name}/{record_id}"
-        resp = requests.patch(url, headers=self._headers, json=data)
+        resp = rlm_http.patch(url, headers=self._headers, json=data)
         if resp.status_code in (200, 204):
             return True
         self.logger.error(f"Failed to update {obj_name}/{record_id}: {resp.status_code} - {resp.text}")
@@ -279,7 +276,7 @@ class CMLBaseTask(BaseSalesforceTask):
     def delete_record(self, obj_name: str, record_id: str) -> bool:
         """DELETE an sObject record. Returns True on success."""
         url = f"{self._instance_url}/services/data/v{self._api_version}/sobjects/{obj_name}/{record_id}"
-        resp = requests.delete(url, headers=self._headers)
+        resp = rlm_http.delete(url, headers=self._headers)
         if resp.status_code in (200, 204):
             return True
         self.logger.error(f"Failed to delete {obj_name}/{record_id}: {resp.status_code} - {resp.text}")
@@ -290,7 +287,7 @@ class CMLBaseTask(BaseSalesforceTask):
         url = f"{self._instance_url}/services/data/v{self._api_version}/sobjects/{obj_name}/{record_id}"
         with open(blob_path, "rb") as f:
             encoded = base64.b64encode(f.read()).decode("utf-8")
-        resp = requests.patch(url, headers=self._headers, json={field_name: encoded})
+        resp = rlm_http.patch(url, headers=self._headers, json={field_name: encoded})
         if resp.status_code in (200, 204):
             self.logger.info(f"Uploaded blob to {obj_name}/{record_id}.{field_name}")
             return True
@@ -301,7 +298,7 @@ class CMLBaseTask(BaseSalesforceTask):
         """Download a blob from a Salesforce URL to a local file."""
         headers = {"Authorization": f"Bearer {self._access_token}"}
         full_url = blob_url if blob_url.startswith("http") else f"{self._instance_url}{blob_url}"
-        resp = requests.get(full_url, headers=headers)
+        resp = rlm_http.get(full_url, headers=headers)
         if resp.status_code == 200:
             os.makedirs(os.path.dirname(dest_path), exist_ok=True)
             with open(dest_path, "wb") as f:
@@ -3,7 +3,6 @@ Custom CumulusCI tasks for Partner Relationship Management (PRM) community setup
 """
 import os
 import re
-import requests
 
 try:
     from cumulusci.core.tasks import BaseTask
@@ -12,6 +11,8 @@ except ImportError:
     BaseTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 
 class PatchNetworkEmailForDeploy(BaseTask):
     """
@@ -72,14 +73,11 @@ class PatchNetworkEmailForDeploy(BaseTask):
             getattr(self.org_config, "api_version", None)
             or getattr(self.project_config, "project__package__api_version", "67.0")
         )
-        headers = {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(self.org_config.access_token)
         query_url = f"{instance_url}/services/data/v{api_version}/query"
         network_name_escaped = network_name.replace("'", "''")
         soql = f"SELECT EmailSenderAddress FROM Network WHERE Name = '{network_name_escaped}' LIMIT 1"
-        response = requests.get(query_url, headers=headers, params={"q": soql})
+        response = rlm_http.get(query_url, headers=headers, params={"q": soql})
         response.raise_for_status()
         result = response.json()
         if result.get("totalSize", 0) == 0:
@@ -10,8 +10,6 @@ import json
 import os
 from typing import Any, Dict, List, Tuple
 
-import requests
-
 try:
     from cumulusci.tasks.salesforce import BaseSalesforceTask
     from cumulusci.core.exceptions import TaskOptionsError
@@ -19,6 +17,8 @@ except ImportError:
     BaseSalesforceTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 
 OBJECT_NAME = "PricingRecipeTableMapping"
 DEFAULT_INPUT_FILE = "datasets/tooling/PricingRecipeTableMappings/prm_ngp_default.json"
@@ -136,10 +136,7 @@ class ConfigurePricingRecipeTableMappings(BaseSalesforceTask):
         return access_token, instance_url, api_version
 
     def _headers(self, access_token: str) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(access_token)
 
     @staticmethod
     def _soql_escape(value: str) -> str:
@@ -153,7 +150,7 @@ class ConfigurePricingRecipeTableMappings(BaseSalesforceTask):
         soql: str,
     ) -> List[Dict[str, Any]]:
         url = f"{instance_url}/services/data/v{api_version}/tooling/query"
-        response = requests.get(
+        response = rlm_http.get(
             url,
             headers=self._headers(access_token),
             params={"q": soql},
@@ -167,7 +164,7 @@ class ConfigurePricingRecipeTableMappings(BaseSalesforceTask):
         records = body.get("records", [])
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             next_url = f"{instance_url}{body['nextRecordsUrl']}"
-            response = requests.get(
+            response = rlm_http.get(
                 next_url, headers=self._headers(access_token), timeout=30
             )
             if not response.ok:
@@ -189,7 +186,7 @@ class ConfigurePricingRecipeTableMappings(BaseSalesforceTask):
         body: Dict[str, Any],
     ) -> str:
         url = f"{instance_url}/services/data/v{api_version}/tooling/sobjects/{OBJECT_NAME}"
-        response = requests.post(
+        response = rlm_http.post(
             url,
             headers=self._headers(access_token),
             json=body,
@@ -213,7 +210,7 @@ class ConfigurePricingRecipeTableMappings(BaseSalesforceTask):
             f"{instance_url}/services/data/v{api_version}/tooling/sobjects/"
             f"{OBJECT_NAME}/{record_id}"
         )
-        response = requests.patch(
+        response = rlm_http.patch(
             url,
             headers=self._headers(access_token),
             json=body,
@@ -201,6 +201,7 @@ class ConfigureSearchIndex(BaseSalesforceApiTask):
 
     def _run_task(self):
         import requests
+        from tasks import rlm_http
 
         raise_on_failure = process_bool_arg(
             self.options.get("raise_on_failure", True)
@@ -263,7 +264,7 @@ class ConfigureSearchIndex(BaseSalesforceApiTask):
         # --- GET current configuration with metadata ---
         self.logger.info("Retrieving current PCM index configuration...")
         try:
-            get_resp = requests.get(
+            get_resp = rlm_http.get(
                 f"{base_url}/{PCM_INDEX_CONFIG_PATH}?includeMetadata=true",
                 headers=headers,
                 timeout=60,
@@ -350,7 +351,7 @@ class ConfigureSearchIndex(BaseSalesforceApiTask):
         )
 
         try:
-            put_resp = requests.put(
+            put_resp = rlm_http.put(
                 f"{base_url}/{PCM_INDEX_CONFIG_PATH}",
                 headers=headers,
                 json=put_body,
@@ -10,12 +10,12 @@ import os
 from abc import abstractmethod
 from typing import Any, Dict, List, Optional
 
-import requests
-
 from cumulusci.core.keychain import BaseProjectKeychain
 from cumulusci.tasks.sfdx import SFDXBaseTask
 from cumulusci.core.exceptions import TaskOptionsError
 
+from tasks import rlm_http
+
 _REQUEST_TIMEOUT = 30  # seconds — prevents hangs on slow networks or CI
 
 
@@ -475,10 +475,7 @@ class ManageContextDefinition(SFDXBaseTask):
 
     def _build_url_and_headers(self, endpoint: str):
         url = f"{self.instance_url}/services/data/v{self.api_version}/{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(self.access_token)
         return url, headers
 
     def _make_request(self, method, url, dry_run=False, **kwargs) -> Optional[Dict[str, Any]]:
@@ -486,7 +483,7 @@ class ManageContextDefinition(SFDXBaseTask):
             self.logger.info(f"[dry-run] {method.upper()} {url} {kwargs.get('json')}")
             return {}
         kwargs.setdefault("timeout", _REQUEST_TIMEOUT)
-        response = requests.request(method, url, **kwargs)
+        response = rlm_http.request(method, url, **kwargs)
         if response.ok:
             if response.text:
                 return response.json()
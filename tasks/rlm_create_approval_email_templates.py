@@ -16,7 +16,6 @@ skips ApprovalAlertContentDef records that are already linked correctly.
 
 import csv
 import json
-import requests
 from pathlib import Path
 
 try:
@@ -26,6 +25,8 @@ except ImportError:
     BaseSalesforceTask = object  # type: ignore
     TaskOptionsError = Exception  # type: ignore
 
+from tasks import rlm_http
+
 DEFAULT_TEMPLATE_CSV = "datasets/sfdmu/qb/en-US/qb-approvals/EmailTemplate.csv"
 DEFAULT_ALERT_CSV = "datasets/sfdmu/qb/en-US/qb-approvals/ApprovalAlertContentDef.csv"
 
@@ -80,17 +81,15 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
         )
 
         headers, base_url = self._api_headers()
-        session = requests.Session()
-        session.headers.update(headers)
 
-        folder_id = self._get_org_id(base_url, session)
+        folder_id = self._get_org_id(base_url, headers)
 
         self.logger.info("Using org ID as FolderId (Unfiled Public): %s", folder_id)
 
         template_id_by_name = self._create_templates(
-            base_url, session, templates, folder_id
+            base_url, headers, templates, folder_id
         )
-        self._link_alerts(base_url, session, alerts, template_id_by_name)
+        self._link_alerts(base_url, headers, alerts, template_id_by_name)
 
     # ------------------------------------------------------------------
     # Helpers
@@ -107,25 +106,23 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
             getattr(self.project_config, "project__package__api_version", None)
             or "67.0"
         )
-        headers = {
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(access_token)
         base_url = f"{instance_url}/services/data/v{api_version}"
         return headers, base_url
 
     _TIMEOUT = 30  # seconds; prevents indefinite hang if Salesforce stalls
 
-    def _get_org_id(self, base_url, session):
-        resp = session.get(
+    def _get_org_id(self, base_url, headers):
+        resp = rlm_http.get(
             f"{base_url}/query",
+            headers=headers,
             params={"q": "SELECT Id FROM Organization LIMIT 1"},
             timeout=self._TIMEOUT,
         )
         resp.raise_for_status()
         return resp.json()["records"][0]["Id"]
 
-    def _create_templates(self, base_url, session, templates, folder_id):
+    def _create_templates(self, base_url, headers, templates, folder_id):
         if not templates:
             self.logger.info("No template rows in CSV; skipping template creation.")
             return {}
@@ -133,8 +130,9 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
         names = [t["Name"] for t in templates]
         names_soql = ", ".join(f"'{n.replace(chr(39), chr(92) + chr(39))}'" for n in names)
         soql = f"SELECT Id, Name FROM EmailTemplate WHERE Name IN ({names_soql})"
-        resp = session.get(
+        resp = rlm_http.get(
             f"{base_url}/query",
+            headers=headers,
             params={"q": soql},
             timeout=self._TIMEOUT,
         )
@@ -158,8 +156,9 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
                 "UiType": tmpl.get("UiType") or "SFX",
                 "FolderId": folder_id,
             }
-            resp = session.post(
+            resp = rlm_http.post(
                 f"{base_url}/sobjects/EmailTemplate",
+                headers=headers,
                 data=json.dumps(payload),
                 timeout=self._TIMEOUT,
             )
@@ -174,7 +173,7 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
 
         return template_id_by_name
 
-    def _link_alerts(self, base_url, session, alerts, template_id_by_name):
+    def _link_alerts(self, base_url, headers, alerts, template_id_by_name):
         """Link ApprovalAlertContentDef records to their EmailTemplates."""
         # Build alert_name → template_id from the CSV's EmailTemplate.Name column
         alert_to_template_id = {}
@@ -199,8 +198,9 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
             f"SELECT Id, Name, EmailTemplateId FROM ApprovalAlertContentDef"
             f" WHERE Name IN ({alert_names_soql})"
         )
-        resp = session.get(
+        resp = rlm_http.get(
             f"{base_url}/query",
+            headers=headers,
             params={"q": soql},
             timeout=self._TIMEOUT,
         )
@@ -219,8 +219,9 @@ class CreateApprovalEmailTemplates(BaseSalesforceTask):
                 self.logger.info("Already linked: %s", alert_name)
                 continue
 
-            resp = session.patch(
+            resp = rlm_http.patch(
                 f"{base_url}/sobjects/ApprovalAlertContentDef/{alert['Id']}",
+                headers=headers,
                 data=json.dumps({"EmailTemplateId": template_id}),
                 timeout=self._TIMEOUT,
             )
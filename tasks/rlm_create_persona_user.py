@@ -20,9 +20,9 @@ import uuid
 from pathlib import Path
 
 try:
-    import requests
-except ImportError:
-    requests = None
+    from tasks import rlm_http
+except ImportError:  # requests not installed
+    rlm_http = None
 
 try:
     from cumulusci.core.tasks import BaseTask
@@ -190,7 +190,7 @@ class CreatePersonaUser(BaseTask):
         Requires a free user license matching the target profile (the
         RLM Sales Representative profile uses the Salesforce user license).
         """
-        if requests is None:
+        if rlm_http is None:
             raise CommandException(
                 "The 'requests' library is required to create a user on a "
                 "non-scratch org but is not available."
@@ -252,11 +252,8 @@ class CreatePersonaUser(BaseTask):
             f"{self.org_config.instance_url}"
             f"/services/data/v{self._api_version()}/sobjects/User"
         )
-        headers = {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
-        resp = requests.post(
+        headers = rlm_http.auth_headers(self.org_config.access_token)
+        resp = rlm_http.post(
             url, headers=headers, json=record, timeout=self.REQUEST_TIMEOUT_SECONDS
         )
         if not resp.ok:
@@ -334,7 +331,7 @@ class CreatePersonaUser(BaseTask):
         which matters for audit compliance — the value only ever travels in the
         request body and is never written to a log or temp file.
         """
-        if requests is None:
+        if rlm_http is None:
             raise CommandException(
                 "The 'requests' library is required to set a user password but "
                 "is not available."
@@ -343,11 +340,8 @@ class CreatePersonaUser(BaseTask):
             f"{self.org_config.instance_url}"
             f"/services/data/v{self._api_version()}/sobjects/User/{user_id}/password"
         )
-        headers = {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
-        resp = requests.post(
+        headers = rlm_http.auth_headers(self.org_config.access_token)
+        resp = rlm_http.post(
             url,
             headers=headers,
             json={"NewPassword": password},
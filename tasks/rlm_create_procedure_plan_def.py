@@ -22,6 +22,8 @@ except ImportError:
     BaseSalesforceTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 
 _REQUEST_TIMEOUT = 30  # seconds — prevents hangs on unstable networks/CI
 
@@ -120,10 +122,7 @@ class CreateProcedurePlanDefinition(BaseSalesforceTask):
 
     @property
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     @property
     def _base_url(self) -> str:
@@ -134,7 +133,7 @@ class CreateProcedurePlanDefinition(BaseSalesforceTask):
     def _soql_query(self, soql: str) -> list:
         """Execute a SOQL query and return all records."""
         url = f"{self._base_url}/query"
-        resp = requests.get(url, headers=self._headers, params={"q": soql}, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.get(url, headers=self._headers, params={"q": soql}, timeout=_REQUEST_TIMEOUT)
         if resp.status_code != 200:
             self.logger.error(
                 "SOQL query failed (%s): %s", resp.status_code, resp.text
@@ -144,7 +143,7 @@ class CreateProcedurePlanDefinition(BaseSalesforceTask):
         records = body.get("records", [])
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             nurl = f"{self.org_config.instance_url}{body['nextRecordsUrl']}"
-            resp = requests.get(nurl, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+            resp = rlm_http.get(nurl, headers=self._headers, timeout=_REQUEST_TIMEOUT)
             if resp.status_code != 200:
                 break
             body = resp.json()
@@ -238,7 +237,7 @@ class CreateProcedurePlanDefinition(BaseSalesforceTask):
         self.logger.info(
             "Creating ProcedurePlanDefinition '%s' via Connect API ...", dev_name
         )
-        resp = requests.post(url, headers=self._headers, json=body, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.post(url, headers=self._headers, json=body, timeout=_REQUEST_TIMEOUT)
 
         if resp.ok:
             result = resp.json() if resp.content else {}
@@ -296,10 +295,7 @@ class ActivateProcedurePlanVersion(BaseSalesforceTask):
 
     @property
     def _headers(self):
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     def _run_task(self):
         dev_name = self.options["developerName"]
@@ -312,7 +308,7 @@ class ActivateProcedurePlanVersion(BaseSalesforceTask):
             "LIMIT 1"
         )
         url = f"{self._base_url}/query/?q={requests.utils.requote_uri(query)}"
-        resp = requests.get(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.get(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
         resp.raise_for_status()
         records = resp.json().get("records", [])
 
@@ -332,7 +328,7 @@ class ActivateProcedurePlanVersion(BaseSalesforceTask):
             return
 
         patch_url = f"{self._base_url}/sobjects/ProcedurePlanDefinitionVersion/{version_id}"
-        patch_resp = requests.patch(patch_url, headers=self._headers, json={"IsActive": True}, timeout=_REQUEST_TIMEOUT)
+        patch_resp = rlm_http.patch(patch_url, headers=self._headers, json={"IsActive": True}, timeout=_REQUEST_TIMEOUT)
 
         if patch_resp.ok or patch_resp.status_code == 204:
             self.logger.info(
@@ -385,10 +381,7 @@ class DeactivateProcedurePlanVersion(BaseSalesforceTask):
 
     @property
     def _headers(self):
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     def _run_task(self):
         dev_name = self.options["developerName"]
@@ -403,7 +396,7 @@ class DeactivateProcedurePlanVersion(BaseSalesforceTask):
             "LIMIT 1"
         )
         url = f"{self._base_url}/query/?q={requests.utils.requote_uri(query)}"
-        resp = requests.get(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.get(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
         resp.raise_for_status()
         records = resp.json().get("records", [])
 
@@ -423,7 +416,7 @@ class DeactivateProcedurePlanVersion(BaseSalesforceTask):
             return
 
         patch_url = f"{self._base_url}/sobjects/ProcedurePlanDefinitionVersion/{version_id}"
-        patch_resp = requests.patch(patch_url, headers=self._headers, json={"IsActive": False}, timeout=_REQUEST_TIMEOUT)
+        patch_resp = rlm_http.patch(patch_url, headers=self._headers, json={"IsActive": False}, timeout=_REQUEST_TIMEOUT)
 
         if patch_resp.ok or patch_resp.status_code == 204:
             self.logger.info(
@@ -437,7 +430,7 @@ class DeactivateProcedurePlanVersion(BaseSalesforceTask):
             verify_url = f"{self._base_url}/query/?q={requests.utils.requote_uri(verify_query)}"
             waited = 0
             while waited <= max_wait_seconds:
-                verify_resp = requests.get(verify_url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+                verify_resp = rlm_http.get(verify_url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
                 verify_resp.raise_for_status()
                 verify_records = verify_resp.json().get("records", [])
                 if verify_records and not verify_records[0].get("IsActive"):
@@ -54,8 +54,6 @@ from copy import deepcopy
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-import requests
-
 try:
     from cumulusci.tasks.salesforce import BaseSalesforceTask
     from cumulusci.core.tasks import BaseTask
@@ -65,6 +63,7 @@ except ImportError:
     BaseTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
 from tasks.expression_set_schema import (
     RESOURCE_INIT_TYPES,
     detect_kind,
@@ -107,10 +106,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
 
     @property
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     @property
     def _base_url(self) -> str:
@@ -132,7 +128,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
         # POST-create vs PATCH-update; swallowing a 401/500 here would route a
         # transient error into the create path and risk duplicate definitions.
         url = f"{self._base_url}/query"
-        resp = requests.get(
+        resp = rlm_http.get(
             url, headers=self._headers, params={"q": soql}, timeout=_REQUEST_TIMEOUT
         )
         if resp.status_code != 200:
@@ -143,7 +139,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
         records: List[dict] = body.get("records", [])
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             nurl = f"{self.org_config.instance_url}{body['nextRecordsUrl']}"
-            resp = requests.get(nurl, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+            resp = rlm_http.get(nurl, headers=self._headers, timeout=_REQUEST_TIMEOUT)
             if resp.status_code != 200:
                 raise TaskOptionsError(
                     f"SOQL pagination failed ({resp.status_code}): {resp.text}"
@@ -158,7 +154,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
         url = f"{self._base_url}/sobjects/{sobject}/{record_id}"
         max_attempts = 4
         for attempt in range(1, max_attempts + 1):
-            resp = requests.patch(
+            resp = rlm_http.patch(
                 url, headers=self._headers, json=payload, timeout=_REQUEST_TIMEOUT
             )
             if resp.status_code in (200, 204):
@@ -178,7 +174,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
 
     def _delete_sobject(self, sobject: str, record_id: str) -> None:
         url = f"{self._base_url}/sobjects/{sobject}/{record_id}"
-        resp = requests.delete(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.delete(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
         if resp.status_code not in (200, 204):
             raise TaskOptionsError(
                 f"DELETE {sobject}/{record_id} failed "
@@ -356,14 +352,14 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
 
     def _get_expression_set_via_connect(self, es_id: str) -> dict:
         url = f"{self._connect_url}/{es_id}"
-        resp = requests.get(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.get(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
         if not resp.ok:
             raise self._connect_error("GET", es_id, resp)
         return resp.json()
 
     def _patch_expression_set_via_connect(self, es_id: str, payload: dict) -> dict:
         url = f"{self._connect_url}/{es_id}"
-        resp = requests.patch(
+        resp = rlm_http.patch(
             url, headers=self._headers, json=payload, timeout=_REQUEST_TIMEOUT
         )
         if not resp.ok:
@@ -371,7 +367,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
         return resp.json() if resp.content else {}
 
     def _post_expression_set_via_connect(self, payload: dict) -> dict:
-        resp = requests.post(
+        resp = rlm_http.post(
             self._connect_url, headers=self._headers, json=payload,
             timeout=_REQUEST_TIMEOUT,
         )
@@ -381,7 +377,7 @@ class ExpressionSetConnectBase(BaseSalesforceTask):
 
     def _delete_expression_set_via_connect(self, es_id: str) -> None:
         url = f"{self._connect_url}/{es_id}"
-        resp = requests.delete(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
+        resp = rlm_http.delete(url, headers=self._headers, timeout=_REQUEST_TIMEOUT)
         if resp.status_code not in (200, 204):
             raise self._connect_error("DELETE", es_id, resp)
 
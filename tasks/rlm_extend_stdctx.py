@@ -1,12 +1,13 @@
 from abc import abstractmethod
 import json
 import time
-import requests
 from requests.exceptions import ConnectionError, Timeout, ChunkedEncodingError
 
 from cumulusci.core.keychain import BaseProjectKeychain
 from cumulusci.tasks.sfdx import SFDXBaseTask
 
+from tasks import rlm_http
+
 # Network resilience settings for long-running Salesforce APIs
 _CONNECT_TIMEOUT = 30       # seconds to establish TCP connection
 _READ_TIMEOUT = 600         # seconds to wait for response (context APIs can take 5-10 min)
@@ -396,10 +397,7 @@ class ExtendStandardContext(SFDXBaseTask):
     # Helper to construct the request URL and headers for making API calls
     def _build_url_and_headers(self, endpoint):
         url = f"{self.instance_url}/services/data/v{self.project_config.project__package__api_version}/{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(self.access_token)
         return url, headers
 
     # Make an HTTP request with optional retry logic for transient network failures.
@@ -410,6 +408,8 @@ class ExtendStandardContext(SFDXBaseTask):
     #   None (default) = auto: retry GET/PATCH (idempotent), don't retry POST
     #   True  = force retry regardless of method
     #   False = never retry
+    # The loop below owns retries for this task (its backoff is sized for those
+    # long calls), so the shared session is asked for a single attempt.
     def _make_request(self, method, url, retryable=None, **kwargs):
         kwargs.setdefault("timeout", (_CONNECT_TIMEOUT, _READ_TIMEOUT))
         if retryable is None:
@@ -418,7 +418,7 @@ class ExtendStandardContext(SFDXBaseTask):
         last_exc = None
         for attempt in range(1, max_attempts + 1):
             try:
-                response = requests.request(method, url, **kwargs)
+                response = rlm_http.request(method, url, retries=1, **kwargs)
                 if response.ok:
                     if response.status_code == 204 or not response.text.strip():
                         return {}
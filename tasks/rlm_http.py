@@ -0,0 +1,168 @@
+"""Process-wide HTTP sessions for CumulusCI tasks that call Salesforce REST.
+
+Every ``tasks/rlm_*.py`` REST caller sends through :func:`request` (or the
+``get`` / ``post`` / ``patch`` / ``put`` / ``delete`` shorthands), which take
+the same arguments as ``requests.request``. A flow runs many tasks inside one
+``cci`` process, and this registry lets them share connections instead of
+paying a TLS handshake per call:
+
+* **one keep-alive session per org**, keyed by the URL's scheme + host, so
+  every task in the flow reuses the same connection pool
+  (``RLM_SF_HTTP_POOL`` connections, default 16). Sessions hold no
+  credentials. Tokens stay in per-call headers (:func:`auth_headers`), so a
+  refreshed ``org_config.access_token`` takes effect on the next call;
+* **gzip** both ways. Responses are negotiated by ``requests``. POST / PUT /
+  PATCH bodies of 1 KiB or more are sent with ``Content-Encoding: gzip``
+  (``RLM_SF_HTTP_GZIP=0`` turns that off);
+* **uniform retry / backoff**. Any method retries 429 and 503 (the org
+  rejected the call without running it) and connect failures. GET / HEAD /
+  PUT / PATCH / DELETE also retry 500 / 502 / 504, read timeouts and dropped
+  connections. Waits double from 1.5 s and honour ``Retry-After``.
+  ``RLM_SF_HTTP_RETRIES`` sets the total attempts (default 4; ``retries=1``
+  opts a call out). When the attempts run out, the last response is returned,
+  or the last exception re-raised, exactly as a bare ``requests`` call would.
+"""
+import gzip
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+POOL_ENV_VAR = "RLM_SF_HTTP_POOL"
+GZIP_ENV_VAR = "RLM_SF_HTTP_GZIP"
+RETRIES_ENV_VAR = "RLM_SF_HTTP_RETRIES"
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_RETRIES = 4
+GZIP_MIN_BYTES = 1024
+
+_BACKOFF_BASE = 1.5
+_MAX_BACKOFF = 60.0
+_REJECTED_STATUS = {429, 503}
+_TRANSIENT_STATUS = {500, 502, 504}
+_IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "PATCH", "DELETE"}
+_COMPRESSIBLE = {"POST", "PUT", "PATCH"}
+
+_SESSIONS: Dict[str, requests.Session] = {}
+_LOCK = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.environ.get(name)
+    return int(raw) if raw not in (None, "") else default
+
+
+def auth_headers(access_token: str, content_type: Optional[str] = "application/json"
+                 ) -> Dict[str, str]:
+    """``Authorization: Bearer`` (+ ``Content-Type``) for one call."""
+    headers = {"Authorization": f"Bearer {access_token}"}
+    if content_type:
+        headers["Content-Type"] = content_type
+    return headers
+
+
+class _GzipAdapter(HTTPAdapter):
+    """Compresses large request bodies just before they go on the wire."""
+
+    def send(self, request, **kwargs):
+        body = request.body
+        if (isinstance(body, (bytes, str)) and request.method in _COMPRESSIBLE
+                and "Content-Encoding" not in request.headers
+                and os.environ.get(GZIP_ENV_VAR, "1").strip().lower() not in {"0", "false", "no"}):
+            raw = body.encode("utf-8") if isinstance(body, str) else body
+            if len(raw) >= GZIP_MIN_BYTES:
+                request.body = gzip.compress(raw, compresslevel=6)
+                request.headers["Content-Encoding"] = "gzip"
+                request.headers["Content-Length"] = str(len(request.body))
+        return super().send(request, **kwargs)
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def session_for(url: str) -> requests.Session:
+    """The shared session for ``url``'s org (created on first use)."""
+    key = _origin(url)
+    with _LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            size = max(_env_int(POOL_ENV_VAR, DEFAULT_POOL_SIZE), 1)
+            session = requests.Session()
+            adapter = _GzipAdapter(pool_connections=2, pool_maxsize=size, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[key] = session
+        return session
+
+
+def reset_sessions() -> None:
+    """Close and forget every session (tests; long-lived processes after a fork)."""
+    with _LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
+
+
+def _retry_wait(attempt: int, response: Optional[requests.Response]) -> float:
+    if response is not None:
+        after = response.headers.get("Retry-After", "")
+        if after.strip().isdigit():
+            return min(float(after), _MAX_BACKOFF)
+    return min(_BACKOFF_BASE * (2 ** (attempt - 1)), _MAX_BACKOFF)
+
+
+def request(method: str, url: str, *, retries: Optional[int] = None,
+            sleep=time.sleep, **kwargs: Any) -> requests.Response:
+    """``requests.request`` through the org's shared session, with retries."""
+    method = method.upper()
+    attempts = max(retries if retries is not None else _env_int(RETRIES_ENV_VAR, DEFAULT_RETRIES), 1)
+    idempotent = method in _IDEMPOTENT
+    session = session_for(url)
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response = session.request(method, url, **kwargs)
+        except requests.exceptions.ConnectTimeout:
+            if attempt >= attempts:
+                raise
+            sleep(_retry_wait(attempt, None))
+            continue
+        except (requests.ConnectionError, requests.Timeout,
+                requests.exceptions.ChunkedEncodingError):
+            if not idempotent or attempt >= attempts:
+                raise
+            sleep(_retry_wait(attempt, None))
+            continue
+        status = response.status_code
+        retry = status in _REJECTED_STATUS or (idempotent and status in _TRANSIENT_STATUS)
+        if not retry or attempt >= attempts:
+            return response
+        sleep(_retry_wait(attempt, response))
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    return request("POST", url, **kwargs)
+
+
+def patch(url: str, **kwargs: Any) -> requests.Response:
+    return request("PATCH", url, **kwargs)
+
+
+def put(url: str, **kwargs: Any) -> requests.Response:
+    return request("PUT", url, **kwargs)
+
+
+def delete(url: str, **kwargs: Any) -> requests.Response:
+    return request("DELETE", url, **kwargs)
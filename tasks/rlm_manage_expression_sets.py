@@ -156,8 +156,8 @@ class ManageExpressionSets(BaseTask):
             if not hasattr(self, 'org_config') or not self.org_config:
                 raise TaskOptionsError("No org_config available")
             
-            # Use requests library for Tooling API calls
-            import requests
+            # Tooling API calls go through the shared session
+            from tasks import rlm_http
             
             # Get access token and instance URL
             access_token = self.org_config.access_token
@@ -172,7 +172,7 @@ class ManageExpressionSets(BaseTask):
                 "Content-Type": "application/json"
             }
             
-            describe_response = requests.get(describe_url, headers=headers)
+            describe_response = rlm_http.get(describe_url, headers=headers)
             if describe_response.ok:
                 describe_data = describe_response.json()
                 field_names = [f['name'] for f in describe_data.get('fields', [])]
@@ -191,7 +191,7 @@ class ManageExpressionSets(BaseTask):
             }
             params = {"q": soql}
             
-            response = requests.get(url, headers=headers, params=params)
+            response = rlm_http.get(url, headers=headers, params=params)
             
             if not response.ok:
                 self.logger.error(f"Tooling API query failed: {response.status_code} - {response.text}")
@@ -324,8 +324,8 @@ class ManageExpressionSets(BaseTask):
             if not hasattr(self, 'org_config') or not self.org_config:
                 raise TaskOptionsError("No org_config available")
             
-            # Use requests library for Tooling API calls
-            import requests
+            # Tooling API calls go through the shared session
+            from tasks import rlm_http
             
             # Get access token and instance URL
             access_token = self.org_config.access_token
@@ -346,7 +346,7 @@ class ManageExpressionSets(BaseTask):
             }
             params = {"q": soql}
             
-            response = requests.get(url, headers=headers, params=params)
+            response = rlm_http.get(url, headers=headers, params=params)
             
             if not response.ok:
                 self.logger.error(f"Tooling API query failed: {response.status_code} - {response.text}")
@@ -533,8 +533,8 @@ class ManageExpressionSets(BaseTask):
         if not hasattr(self, 'org_config') or not self.org_config:
             raise TaskOptionsError("No org_config available")
         
-        # Use requests library for Tooling API calls
-        import requests
+        # Tooling API calls go through the shared session
+        from tasks import rlm_http
         
         # Get access token and instance URL
         access_token = self.org_config.access_token
@@ -555,7 +555,7 @@ class ManageExpressionSets(BaseTask):
         }
         params = {"q": soql}
         
-        response = requests.get(url, headers=headers, params=params)
+        response = rlm_http.get(url, headers=headers, params=params)
         
         if not response.ok:
             raise TaskOptionsError(f"Failed to query version: {response.text}")
@@ -588,7 +588,7 @@ class ManageExpressionSets(BaseTask):
         try:
             max_attempts = 4
             for attempt in range(1, max_attempts + 1):
-                response = requests.patch(url, headers=headers, json=payload)
+                response = rlm_http.patch(url, headers=headers, json=payload)
                 if response.status_code in [200, 204]:
                     return True
 
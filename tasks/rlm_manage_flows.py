@@ -115,8 +115,8 @@ class ManageFlows(BaseTask):
             if not hasattr(self, 'org_config') or not self.org_config:
                 raise TaskOptionsError("No org_config available")
             
-            # Use requests library for Tooling API calls (like refresh_decision_table task)
-            import requests
+            # Tooling API calls go through the shared session (like refresh_decision_table task)
+            from tasks import rlm_http
             
             # Get access token and instance URL
             access_token = self.org_config.access_token
@@ -131,7 +131,7 @@ class ManageFlows(BaseTask):
                 "Content-Type": "application/json"
             }
             
-            describe_response = requests.get(describe_url, headers=headers)
+            describe_response = rlm_http.get(describe_url, headers=headers)
             if describe_response.ok:
                 describe_data = describe_response.json()
                 field_names = [f['name'] for f in describe_data.get('fields', [])]
@@ -153,7 +153,7 @@ class ManageFlows(BaseTask):
             self.logger.debug(f"Query URL: {url}")
             self.logger.debug(f"Query params: {params}")
             
-            response = requests.get(url, headers=headers, params=params)
+            response = rlm_http.get(url, headers=headers, params=params)
             
             if not response.ok:
                 self.logger.error(f"Tooling API query failed: {response.status_code} - {response.text}")
@@ -334,7 +334,7 @@ class ManageFlows(BaseTask):
             raise TaskOptionsError("No org_config available")
         
         # Use Tooling API REST endpoint to update Flow
-        import requests
+        from tasks import rlm_http
         
         access_token = self.org_config.access_token
         instance_url = self.org_config.instance_url
@@ -349,7 +349,7 @@ class ManageFlows(BaseTask):
         payload = {"Status": status}
         
         try:
-            response = requests.patch(url, headers=headers, json=payload)
+            response = rlm_http.patch(url, headers=headers, json=payload)
             if response.status_code in [200, 204]:
                 return True
             else:
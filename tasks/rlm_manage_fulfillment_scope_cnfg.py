@@ -143,13 +143,13 @@ class ManageFulfillmentScopeCnfg(BaseTask):
     def _describe(
         self, access_token: str, instance_url: str, api_version: str
     ) -> Dict[str, Any]:
-        import requests
+        from tasks import rlm_http
 
         url = (
             f"{instance_url}/services/data/v{api_version}"
             f"/tooling/sobjects/{OBJECT_NAME}/describe"
         )
-        resp = requests.get(url, headers=self._headers(access_token))
+        resp = rlm_http.get(url, headers=self._headers(access_token))
         if not resp.ok:
             raise TaskOptionsError(
                 f"Tooling describe failed for {OBJECT_NAME}: "
@@ -160,10 +160,10 @@ class ManageFulfillmentScopeCnfg(BaseTask):
     def _query(
         self, access_token: str, instance_url: str, api_version: str, soql: str
     ) -> List[Dict[str, Any]]:
-        import requests
+        from tasks import rlm_http
 
         url = f"{instance_url}/services/data/v{api_version}/tooling/query"
-        resp = requests.get(
+        resp = rlm_http.get(
             url, headers=self._headers(access_token), params={"q": soql}
         )
         if not resp.ok:
@@ -175,7 +175,7 @@ class ManageFulfillmentScopeCnfg(BaseTask):
         # Handle pagination — follow nextRecordsUrl until all pages are fetched
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             next_url = f"{instance_url}{body['nextRecordsUrl']}"
-            resp = requests.get(next_url, headers=self._headers(access_token))
+            resp = rlm_http.get(next_url, headers=self._headers(access_token))
             if not resp.ok:
                 self.logger.warning(
                     f"Pagination request failed: {resp.status_code} — {resp.text}; "
@@ -371,13 +371,13 @@ class ManageFulfillmentScopeCnfg(BaseTask):
         api_version: str,
         body: Dict[str, Any],
     ) -> Optional[str]:
-        import requests
+        from tasks import rlm_http
 
         url = (
             f"{instance_url}/services/data/v{api_version}"
             f"/tooling/sobjects/{OBJECT_NAME}"
         )
-        resp = requests.post(url, headers=self._headers(access_token), json=body)
+        resp = rlm_http.post(url, headers=self._headers(access_token), json=body)
         if not resp.ok:
             raise TaskOptionsError(
                 f"Tooling create failed: {resp.status_code} — {resp.text}"
@@ -392,13 +392,13 @@ class ManageFulfillmentScopeCnfg(BaseTask):
         record_id: str,
         body: Dict[str, Any],
     ):
-        import requests
+        from tasks import rlm_http
 
         url = (
             f"{instance_url}/services/data/v{api_version}"
             f"/tooling/sobjects/{OBJECT_NAME}/{record_id}"
         )
-        resp = requests.patch(url, headers=self._headers(access_token), json=body)
+        resp = rlm_http.patch(url, headers=self._headers(access_token), json=body)
         if resp.status_code not in (200, 204):
             raise TaskOptionsError(
                 f"Tooling update failed: {resp.status_code} — {resp.text}"
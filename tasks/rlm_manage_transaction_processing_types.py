@@ -63,10 +63,10 @@ class ManageTransactionProcessingTypes(BaseTask):
         return {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
 
     def _describe(self, access_token: str, instance_url: str, api_version: str) -> Dict[str, Any]:
-        import requests
+        from tasks import rlm_http
 
         url = f"{instance_url}/services/data/v{api_version}/tooling/sobjects/TransactionProcessingType/describe"
-        resp = requests.get(url, headers=self._tooling_headers(access_token))
+        resp = rlm_http.get(url, headers=self._tooling_headers(access_token))
         if not resp.ok:
             raise TaskOptionsError(
                 f"Describe failed for TransactionProcessingType: {resp.status_code} - {resp.text}"
@@ -74,10 +74,10 @@ class ManageTransactionProcessingTypes(BaseTask):
         return resp.json()
 
     def _query(self, access_token: str, instance_url: str, api_version: str, soql: str) -> List[Dict[str, Any]]:
-        import requests
+        from tasks import rlm_http
 
         url = f"{instance_url}/services/data/v{api_version}/tooling/query"
-        resp = requests.get(url, headers=self._tooling_headers(access_token), params={"q": soql})
+        resp = rlm_http.get(url, headers=self._tooling_headers(access_token), params={"q": soql})
         if not resp.ok:
             raise TaskOptionsError(f"Tooling query failed: {resp.status_code} - {resp.text}")
         records = resp.json().get("records", [])
@@ -154,18 +154,18 @@ class ManageTransactionProcessingTypes(BaseTask):
                 self.logger.info(f"Created {key_field}={key_value} ({record_id})")
 
     def _create_record(self, access_token: str, instance_url: str, api_version: str, body: Dict[str, Any]) -> str:
-        import requests
+        from tasks import rlm_http
 
         url = f"{instance_url}/services/data/v{api_version}/tooling/sobjects/TransactionProcessingType"
-        resp = requests.post(url, headers=self._tooling_headers(access_token), json=body)
+        resp = rlm_http.post(url, headers=self._tooling_headers(access_token), json=body)
         if not resp.ok:
             raise TaskOptionsError(f"Create failed: {resp.status_code} - {resp.text}")
         return resp.json().get("id")
 
     def _update_record(self, access_token: str, instance_url: str, api_version: str, record_id: str, body: Dict[str, Any]):
-        import requests
+        from tasks import rlm_http
 
         url = f"{instance_url}/services/data/v{api_version}/tooling/sobjects/TransactionProcessingType/{record_id}"
-        resp = requests.patch(url, headers=self._tooling_headers(access_token), json=body)
+        resp = rlm_http.patch(url, headers=self._tooling_headers(access_token), json=body)
         if resp.status_code not in (200, 204):
             raise TaskOptionsError(f"Update failed: {resp.status_code} - {resp.text}")
@@ -1,10 +1,10 @@
 from abc import abstractmethod
 
-import requests
-
 from cumulusci.core.keychain import BaseProjectKeychain
 from cumulusci.tasks.sfdx import SFDXBaseTask
 
+from tasks import rlm_http
+
 
 # ModifyContextDefinition is a custom task that extends the SFDXBaseTask provided by CumulusCI.
 class ModifyContextDefinition(SFDXBaseTask):
@@ -144,15 +144,12 @@ class ModifyContextDefinition(SFDXBaseTask):
     # Helper to construct the request URL and headers for making API calls
     def _build_url_and_headers(self, endpoint):
         url = f"{self.instance_url}/services/data/v{self.project_config.project__package__api_version}/{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(self.access_token)
         return url, headers
 
-    # Make an HTTP request using the requests library and handle the response
+    # Make an HTTP request through the org's shared session and handle the response
     def _make_request(self, method, url, **kwargs):
-        response = requests.request(method, url, **kwargs)
+        response = rlm_http.request(method, url, **kwargs)
         if response.ok:
             return response.json()
         else:
@@ -0,0 +1,120 @@
+"""Cheap "has this org's data changed?" snapshots for CumulusCI tasks.
+
+An org fingerprint is, per sObject, the record count and the newest
+``SystemModstamp``::
+
+    {"Product2": {"count": 412, "max_modstamp": "2026-10-18T09:12:44.000+0000"}, ...}
+
+Counts alone miss in-place updates. The newest modstamp alone misses deletes.
+Together they catch any insert, update or delete that touches the object.
+
+Each object costs one aggregate SOQL (``SELECT COUNT(Id) cnt,
+MAX(SystemModstamp) lastModstamp FROM X``). The queries go 25 at a time
+through ``composite/batch`` on the flow's shared org session
+(``tasks/rlm_http.py``), so 60 objects take three round trips instead of 60
+``sf data query`` subprocesses. An object without ``SystemModstamp`` is
+re-asked for its count only. One the org cannot query at all is left out and
+logged, as the CLI-based counts did, so callers must treat a missing entry as
+"unknown", never as zero. A batch call that fails, or that answers for fewer
+objects than it was asked about, raises ``CommandException``.
+"""
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from urllib.parse import quote
+
+try:
+    from cumulusci.core.exceptions import CommandException
+except ImportError:
+    CommandException = RuntimeError
+
+from tasks import rlm_http
+
+BATCH_LIMIT = 25  # composite/batch sub-request limit
+
+Fingerprint = Dict[str, Dict[str, Any]]
+
+
+def _query(sobject: str, with_modstamp: bool) -> str:
+    select = "COUNT(Id) cnt, MAX(SystemModstamp) lastModstamp" if with_modstamp else "COUNT(Id) cnt"
+    return f"SELECT {select} FROM {sobject}"
+
+
+def _error_text(result: Any) -> str:
+    if isinstance(result, list) and result and isinstance(result[0], dict):
+        return f"{result[0].get('errorCode', '')}: {result[0].get('message', '')}".strip(": ")
+    return str(result)[:300]
+
+
+def _batch(instance_url: str, api_version: str, headers: Dict[str, str],
+           queries: List[str]) -> List[Dict[str, Any]]:
+    """Run up to 25 queries in one composite/batch call; one result dict per query.
+
+    Raises ``CommandException`` when the call fails or a result is missing.
+    """
+    body = {"batchRequests": [
+        {"method": "GET", "url": f"v{api_version}/query?q={quote(q)}"} for q in queries
+    ]}
+    resp = rlm_http.post(
+        f"{instance_url}/services/data/v{api_version}/composite/batch",
+        headers=headers, json=body,
+    )
+    if resp.status_code != 200:
+        raise CommandException(f"Org fingerprint: composite/batch failed ({resp.status_code}): {resp.text[:300]}")
+    results = resp.json().get("results") or []
+    if len(results) != len(queries):
+        raise CommandException(f"Org fingerprint: composite/batch returned {len(results)} result(s) "
+                               f"for {len(queries)} query(ies)")
+    return results
+
+
+def org_fingerprint(instance_url: str, access_token: str, sobjects: Iterable[str], *,
+                    api_version: str = "67.0",
+                    logger: Optional[logging.Logger] = None) -> Fingerprint:
+    """Counts + newest SystemModstamp for each of ``sobjects`` (duplicates collapse).
+
+    Objects the org cannot query are logged and left out of the result.
+    """
+    log = logger or logging.getLogger(__name__)
+    instance_url = instance_url.rstrip("/")
+    headers = rlm_http.auth_headers(access_token)
+    names = list(dict.fromkeys(sobjects))
+    fingerprint: Fingerprint = {}
+    retry_count_only: List[str] = []
+    for with_modstamp, pending in ((True, names), (False, retry_count_only)):
+        for start in range(0, len(pending), BATCH_LIMIT):
+            chunk = pending[start : start + BATCH_LIMIT]
+            results = _batch(instance_url, api_version, headers,
+                             [_query(name, with_modstamp) for name in chunk])
+            for name, result in zip(chunk, results):
+                body = result.get("result")
+                if result.get("statusCode") == 200:
+                    row = (body.get("records") or [{}])[0]
+                    fingerprint[name] = {
+                        "count": int(row.get("cnt") or 0),
+                        "max_modstamp": row.get("lastModstamp"),
+                    }
+                elif with_modstamp and "SystemModstamp" in _error_text(body):
+                    retry_count_only.append(name)
+                else:
+                    log.warning(f"Count query for {name} failed "
+                                f"({result.get('statusCode')}): {_error_text(body)}; skipping")
+    return {name: fingerprint[name] for name in names if name in fingerprint}
+
+
+def counts(fingerprint: Mapping[str, Mapping[str, Any]]) -> Dict[str, int]:
+    return {name: int(entry["count"]) for name, entry in fingerprint.items()}
+
+
+def changed_sobjects(before: Mapping[str, Mapping[str, Any]],
+                     after: Mapping[str, Mapping[str, Any]]) -> List[str]:
+    """Objects whose count or newest modstamp differs (or that appear in only one side)."""
+    names = list(dict.fromkeys([*before, *after]))
+    return [name for name in names if dict(before.get(name) or {}) != dict(after.get(name) or {})]
+
+
+def fingerprint_digest(fingerprint: Mapping[str, Mapping[str, Any]]) -> str:
+    """Stable sha256 of a fingerprint, for storing or comparing a whole org state."""
+    canonical = json.dumps(fingerprint, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
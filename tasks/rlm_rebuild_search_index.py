@@ -64,6 +64,7 @@ class RebuildSearchIndex(BaseSalesforceApiTask):
 
     def _run_task(self):
         import requests
+        from tasks import rlm_http
 
         build_type = self.options.get("build_type") or "FULL"
         activation_type = self.options.get("activation_type") or "IMMEDIATE"
@@ -90,7 +91,7 @@ class RebuildSearchIndex(BaseSalesforceApiTask):
             f"(buildType={build_type}, activationType={activation_type})..."
         )
         try:
-            resp = requests.post(url, headers=headers, json=body, timeout=60)
+            resp = rlm_http.post(url, headers=headers, json=body, timeout=60)
         except requests.RequestException as e:
             return self._handle_failure(str(e), raise_on_failure)
 
@@ -9,7 +9,6 @@ many orgs for the platform to actually start recalc and move status to Updating.
 """
 import time
 from typing import List
-import requests
 
 try:
     from cumulusci.core.tasks import BaseTask
@@ -18,6 +17,8 @@ except ImportError:
     BaseTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 
 class RecalculatePermissionSetGroups(BaseTask):
     """Ensure PSGs are in Updated status before assignment."""
@@ -243,14 +244,11 @@ class RecalculatePermissionSetGroups(BaseTask):
         )
 
     def _headers(self):
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     def _query(self, soql: str):
         url = f"{self.org_config.instance_url}/services/data/v{self._api_version()}/query"
-        response = requests.get(url, headers=self._headers(), params={"q": soql})
+        response = rlm_http.get(url, headers=self._headers(), params={"q": soql})
         if not response.ok:
             raise TaskOptionsError(f"SOQL query failed: {response.status_code} {response.text}")
         return response.json().get("records", [])
@@ -261,7 +259,7 @@ class RecalculatePermissionSetGroups(BaseTask):
             f"{self.org_config.instance_url}/services/data/"
             f"v{self._api_version()}/{base}/PermissionSetGroup/{record_id}"
         )
-        response = requests.patch(url, headers=self._headers(), json=payload)
+        response = rlm_http.patch(url, headers=self._headers(), json=payload)
         if response.status_code not in (200, 204):
             raise TaskOptionsError(
                 f"PermissionSetGroup update failed: {response.status_code} {response.text}"
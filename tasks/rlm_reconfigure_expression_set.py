@@ -13,8 +13,6 @@ context definition, rank, and start date it logs a message and skips.
 import time
 from typing import Any, Dict, List, Optional
 
-import requests
-
 try:
     from cumulusci.tasks.salesforce import BaseSalesforceTask
     from cumulusci.core.exceptions import TaskOptionsError
@@ -22,6 +20,8 @@ except ImportError:
     BaseSalesforceTask = object
     TaskOptionsError = Exception
 
+from tasks import rlm_http
+
 
 class ReconfigureExpressionSet(BaseSalesforceTask):
     """Reconfigure an auto-provisioned Expression Set in a scratch org.
@@ -88,10 +88,7 @@ class ReconfigureExpressionSet(BaseSalesforceTask):
 
     @property
     def _headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self.org_config.access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self.org_config.access_token)
 
     @property
     def _base_url(self) -> str:
@@ -102,7 +99,7 @@ class ReconfigureExpressionSet(BaseSalesforceTask):
     def _soql_query(self, soql: str) -> List[dict]:
         """Execute a SOQL query and return all records."""
         url = f"{self._base_url}/query"
-        resp = requests.get(url, headers=self._headers, params={"q": soql})
+        resp = rlm_http.get(url, headers=self._headers, params={"q": soql})
         if resp.status_code != 200:
             self.logger.error(
                 "SOQL query failed (%s): %s", resp.status_code, resp.text
@@ -112,7 +109,7 @@ class ReconfigureExpressionSet(BaseSalesforceTask):
         records: List[dict] = body.get("records", [])
         while not body.get("done", True) and body.get("nextRecordsUrl"):
             nurl = f"{self.org_config.instance_url}{body['nextRecordsUrl']}"
-            resp = requests.get(nurl, headers=self._headers)
+            resp = rlm_http.get(nurl, headers=self._headers)
             if resp.status_code != 200:
                 break
             body = resp.json()
@@ -128,7 +125,7 @@ class ReconfigureExpressionSet(BaseSalesforceTask):
         url = f"{self._base_url}/sobjects/{sobject}/{record_id}"
         max_attempts = 4
         for attempt in range(1, max_attempts + 1):
-            resp = requests.patch(url, headers=self._headers, json=payload)
+            resp = rlm_http.patch(url, headers=self._headers, json=payload)
             if resp.status_code in (200, 204):
                 return True
             resp_text = resp.text or ""
@@ -156,7 +153,7 @@ class ReconfigureExpressionSet(BaseSalesforceTask):
     def _create_record(self, sobject: str, payload: dict) -> Optional[str]:
         """POST a new sObject record. Returns the new Id or None."""
         url = f"{self._base_url}/sobjects/{sobject}/"
-        resp = requests.post(url, headers=self._headers, json=payload)
+        resp = rlm_http.post(url, headers=self._headers, json=payload)
         if resp.status_code == 201:
             return resp.json()["id"]
         self.logger.error(
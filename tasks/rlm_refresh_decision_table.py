@@ -7,12 +7,10 @@ from abc import abstractmethod
 # while its docstring claimed no CumulusCI install was needed. The sibling
 # rlm_manage_decision_tables.py already degraded this way; only this file did not.
 try:
-    import requests
     from cumulusci.tasks.sfdx import SFDXBaseTask
     from cumulusci.core.keychain import BaseProjectKeychain
     from cumulusci.core.utils import process_bool_arg
 except ImportError:  # pragma: no cover - exercised only in the offline test environment
-    requests = None
     SFDXBaseTask = object
     BaseProjectKeychain = object
 
@@ -32,6 +30,8 @@ except ImportError:  # pragma: no cover - exercised only in the offline test env
                 return False
         raise TypeError(f"Cannot interpret as boolean: `{arg}`")
 
+from tasks import rlm_http
+
 # ExtendStandardContext is a custom task that extends the SFDXBaseTask provided by CumulusCI.
 class RefreshDecisionTable(SFDXBaseTask):
 
@@ -226,15 +226,12 @@ class RefreshDecisionTable(SFDXBaseTask):
     # Helper to construct the request URL and headers for making API calls
     def _build_url_and_headers(self, endpoint):
         url = f"{self.instance_url}/services/data/v{self.project_config.project__package__api_version}/{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(self.access_token)
         return url, headers
 
-    # Make an HTTP request using the requests library and handle the response
+    # Make an HTTP request through the org's shared session and handle the response
     def _make_request(self, method, url, **kwargs):
-        response = requests.request(method, url, **kwargs)
+        response = rlm_http.request(method, url, **kwargs)
         if response.ok:
             return response.json()
         else:
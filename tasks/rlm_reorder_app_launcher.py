@@ -14,8 +14,6 @@ import subprocess
 import sys
 from pathlib import Path
 
-import requests
-
 try:
     from cumulusci.core.tasks import BaseTask
     from cumulusci.core.exceptions import TaskOptionsError
@@ -23,6 +21,7 @@ except ImportError:
     BaseTask = object  # type: ignore
     TaskOptionsError = Exception  # type: ignore
 
+from tasks import rlm_http
 from tasks.robot_utils import check_urllib3_for_robot
 
 DEFAULT_SUITE = "robot/rlm-base/tests/setup/reorder_app_launcher.robot"
@@ -85,7 +84,7 @@ class ReorderAppLauncher(BaseTask):
             "WHERE IsVisible=true "
             "ORDER BY SortOrder"
         )
-        resp = requests.get(
+        resp = rlm_http.get(
             f"{instance_url}/services/data/v{api_version}/query",
             params={"q": soql},
             headers={"Authorization": f"Bearer {access_token}"},
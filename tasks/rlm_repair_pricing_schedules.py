@@ -142,7 +142,7 @@ class EnsurePricingSchedules(BaseTask):
         if not hasattr(self, "org_config") or not self.org_config:
             raise TaskOptionsError("No org_config available")
 
-        import requests
+        from tasks import rlm_http
 
         access_token = self.org_config.access_token
         instance_url = self.org_config.instance_url
@@ -161,7 +161,7 @@ class EnsurePricingSchedules(BaseTask):
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
-        response = requests.get(url, headers=headers, params={"q": soql})
+        response = rlm_http.get(url, headers=headers, params={"q": soql})
         if not response.ok:
             raise TaskOptionsError(
                 f"Failed to query PriceAdjustmentSchedule: {response.text}"
@@ -241,7 +241,7 @@ class EnsurePricingSchedules(BaseTask):
         if not hasattr(self, "org_config") or not self.org_config:
             raise TaskOptionsError("No org_config available")
 
-        import requests
+        from tasks import rlm_http
 
         access_token = self.org_config.access_token
         instance_url = self.org_config.instance_url
@@ -261,7 +261,7 @@ class EnsurePricingSchedules(BaseTask):
             "Authorization": f"Bearer {access_token}",
             "Content-Type": "application/json",
         }
-        response = requests.get(url, headers=headers, params={"q": soql})
+        response = rlm_http.get(url, headers=headers, params={"q": soql})
         if not response.ok:
             raise TaskOptionsError(
                 f"Failed to query DecisionTable: {response.text}"
@@ -1,14 +1,17 @@
+import importlib
+import importlib.util
 import json
 import os
 import re
-import requests
-import shlex
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 from abc import abstractmethod
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 
 # ANSI escape code pattern for stripping color codes from subprocess output.
 # SFDMU and other CLI tools emit color codes; stripping them improves log readability.
@@ -16,11 +19,12 @@ ANSI_ESCAPE_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
 
 # Note: If CumulusCI is not installed, you'll need to install it or mock these imports for development.
 try:
-    from cumulusci.core.config import ScratchOrgConfig
+    from cumulusci.core.config import ScratchOrgConfig, TaskConfig
     from cumulusci.tasks.salesforce import BaseSalesforceTask
     from cumulusci.tasks.sfdx import SFDXBaseTask
     from cumulusci.core.exceptions import TaskOptionsError, CommandException
     from cumulusci.core.keychain import BaseProjectKeychain
+    from cumulusci.core.utils import import_global, process_list_arg
 except ImportError:
     print("CumulusCI not found. Please install it or mock these imports for development.")
     # For development without CumulusCI, you can use:
@@ -30,6 +34,12 @@ except ImportError:
     # CommandException = Exception
     # BaseProjectKeychain = object
 
+from tasks import rlm_http
+from tasks.rlm_bulk import BulkApi2, BulkApiError, prefer_bulk
+from tasks import (rlm_org_fingerprint, rlm_sfdmu_codemap, rlm_sfdmu_fingerprint, rlm_sfdmu_ledger, rlm_sfdmu_overlay,
+                   rlm_sfdmu_plan, rlm_sfdmu_profile, rlm_sfdmu_schedule)
+from tasks.rlm_sfdmu_native import NativeLoadError, NativeSfdmuLoader, summary_lines
+
 # Constants
 LOAD_COMMAND = "sf sfdmu run --sourceusername CSVFILE --targetusername {targetusername} -p {pathtoexportjson} --canmodify {instanceurl} --noprompt --verbose"
 SCRATCHORG_LOAD_COMMAND = "sf sfdmu run --sourceusername CSVFILE --targetusername {targetusername} -p {pathtoexportjson} --canmodify {instanceurl} --noprompt --verbose"
@@ -44,6 +54,39 @@ def strip_ansi_codes(text: str) -> str:
     return ANSI_ESCAPE_PATTERN.sub('', text)
 
 
+def stream_command(cmd: str, cwd: Optional[str], logger) -> Tuple[int, List[Tuple[float, str]], str]:
+    """Run a shell command, logging stdout lines as they arrive.
+
+    Returns the exit code, the stdout lines with the time each was read (for
+    ``rlm_sfdmu_profile``) and the whole of stderr.
+    """
+    proc = subprocess.Popen(cmd, shell=True, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, bufsize=1)
+    stderr: List[str] = []
+    reader = threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True)
+    reader.start()
+    lines: List[Tuple[float, str]] = []
+    for raw in proc.stdout:
+        line = raw.rstrip("\n")
+        lines.append((time.time(), line))
+        logger.info(strip_ansi_codes(line))
+    proc.wait()
+    reader.join()
+    return proc.returncode, lines, "".join(stderr)
+
+
+def write_sfdmu_profile(profile: Dict[str, Any], plan_dir: str, logger) -> None:
+    """Write ``sfdmu_profile.json`` beside the plan (and into RLM_SF_METRICS_DIR) and log the slowest objects."""
+    try:
+        paths = rlm_sfdmu_profile.write_profile(profile, plan_dir)
+    except OSError as e:
+        logger.warning(f"Could not write the SFDMU profile: {e}")
+        return
+    for line in rlm_sfdmu_profile.summary_lines(profile):
+        logger.info(line)
+    logger.info(f"SFDMU profile written to {paths[0]}")
+
+
 def derive_qb_reference_plan_dir(plan_dir: str) -> Optional[str]:
     """Derive the qb/en-US 'golden' sibling of a variant plan directory.
 
@@ -74,6 +117,29 @@ def derive_qb_reference_plan_dir(plan_dir: str) -> Optional[str]:
     return reference
 
 
+def _import_post_process(script: str) -> Tuple[Any, bool]:
+    """``scripts/post_process_extraction.py`` as a module, and whether worker processes can import it.
+
+    Imported as ``scripts.post_process_extraction`` from the script's repo root
+    so a process pool can re-import it in its workers. A different ``scripts``
+    package shadowing it falls back to loading the file directly, without workers.
+    """
+    script = os.path.abspath(script)
+    root = os.path.dirname(os.path.dirname(script))
+    if root not in sys.path:
+        sys.path.append(root)
+    try:
+        module = importlib.import_module("scripts.post_process_extraction")
+        if os.path.abspath(module.__file__) == script:
+            return module, True
+    except ImportError:
+        pass
+    spec = importlib.util.spec_from_file_location("rlm_post_process_extraction", script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module, False
+
+
 def run_post_process_script(
     extraction_dir: str,
     plan_dir: str,
@@ -83,43 +149,51 @@ def run_post_process_script(
     reference_plan_dir: Optional[str] = None,
     code_map_file: Optional[str] = None,
     copy_to_plan: bool = False,
+    workers: Optional[int] = None,
 ) -> None:
     """Run post_process_extraction.py to make extracted CSVs v5 import-ready ($$ columns, header normalization).
     Shared by ExtractSFDMUData and TestSFDMUIdempotency.
 
-    When ``reference_plan_dir`` is given it is passed as ``--reference-plan-dir`` so
-    the processed CSVs are aligned to that reference plan's (golden) column schema
-    rather than to the target plan's own (possibly stale) CSVs.
+    Calls the script's ``process_extraction()`` in this process; its objects run
+    on a pool of ``workers`` processes (default: CPU count). Relative paths
+    resolve against ``cwd``, as they did for the old subprocess.
+
+    When ``reference_plan_dir`` is given the processed CSVs are aligned to that
+    reference plan's (golden) column schema rather than to the target plan's own
+    (possibly stale) CSVs.
 
-    When ``code_map_file`` is given it is passed as ``--code-map-file`` so the
-    post-process can backfill cross-object externalId code components (e.g.
-    UsageResource.Code) that SFDMU blanked to #N/A during extraction.
+    When ``code_map_file`` is given the post-process backfills cross-object
+    externalId code components (e.g. UsageResource.Code) that SFDMU blanked to
+    #N/A during extraction.
     """
     cwd = cwd or os.getcwd()
     script = os.path.join(cwd, "scripts", "post_process_extraction.py")
     if not os.path.isfile(script):
         raise FileNotFoundError(f"Post-process script not found: {script}")
-    cmd = [sys.executable, script, extraction_dir, plan_dir, "--output-dir", output_dir]
-    if reference_plan_dir:
-        cmd += ["--reference-plan-dir", reference_plan_dir]
-    if code_map_file:
-        cmd += ["--code-map-file", code_map_file]
-    if copy_to_plan:
-        cmd += ["--copy-to-plan"]
-    if logger:
-        logger.info(f"Running post-process: {shlex.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True, cwd=cwd)
+    post_process, poolable = _import_post_process(script)
+
+    def resolve(path: Optional[str]) -> Optional[str]:
+        return os.path.abspath(os.path.join(cwd, path)) if path else path
+
     if logger:
-        for line in (result.stdout or "").splitlines():
-            logger.info(strip_ansi_codes(line))
-    if result.returncode != 0:
+        logger.info(f"Running post-process: {extraction_dir} -> {output_dir}")
+    try:
+        post_process.process_extraction(
+            extraction_dir=resolve(extraction_dir),
+            plan_dir=resolve(plan_dir),
+            output_dir=resolve(output_dir),
+            diff_only=False,
+            copy_to_plan=copy_to_plan,
+            verbose=False,
+            reference_plan_dir=resolve(reference_plan_dir),
+            code_map_file=resolve(code_map_file),
+            workers=workers if poolable else 1,
+            log=(lambda line: logger.info(strip_ansi_codes(line))) if logger else print,
+        )
+    except Exception as e:
         if logger:
-            for line in (result.stderr or "").splitlines():
-                logger.error(strip_ansi_codes(line))
-        raise CommandException(f"Post-process failed with exit code {result.returncode}")
-    if logger and result.stderr:
-        for line in result.stderr.splitlines():
-            logger.warning(strip_ansi_codes(line))
+            logger.error(f"Post-process failed: {e}")
+        raise CommandException(f"Post-process failed: {e}") from e
 
 
 class LoadSFDMUData(SFDXBaseTask):
@@ -164,6 +238,55 @@ class LoadSFDMUData(SFDXBaseTask):
         "simulation": {
             "description": "If true, run SFDMU in simulation mode (dry run without writing to the target org).",
             "required": False
+        },
+        "engine": {
+            "description": (
+                "'sfdmu' (default) runs `sf sfdmu run`. 'native' loads the same export.json and CSVs "
+                "in-process (tasks/rlm_sfdmu_native.py): IN-query lookup maps, unchanged rows "
+                "skipped, independent objects in parallel."
+            ),
+            "required": False
+        },
+        "parallel_objects": {
+            "description": "engine=native: objects of one dependency level loaded at once. Default 4.",
+            "required": False
+        },
+        "parallel_batches": {
+            "description": "engine=native: 200-record collection calls in flight per object. Default 4.",
+            "required": False
+        },
+        "bulk_threshold": {
+            "description": (
+                "engine=native: row count at which writes and reads switch to Bulk API 2.0. "
+                "Defaults to RLM_SF_BULK_THRESHOLD, else 10000 (0 = never)."
+            ),
+            "required": False
+        },
+        "native_report": {
+            "description": "engine=native: path for the JSON load report (per-object counts, timings, API calls).",
+            "required": False
+        },
+        "differential": {
+            "description": (
+                "If true (default), load only CSV rows that are new or changed since the last successful "
+                "load into this org, per the load ledger (tasks/rlm_sfdmu_ledger.py). False disables the ledger."
+            ),
+            "required": False
+        },
+        "force": {
+            "description": "If true, ignore the load ledger and load every row; the ledger is rewritten afterwards.",
+            "required": False
+        },
+        "ledger_dir": {
+            "description": "Directory for per-org load ledgers. Default .cci/sfdmu_ledger under the repo root.",
+            "required": False
+        },
+        "profile": {
+            "description": (
+                "If true (default), write sfdmu_profile.json beside the plan: per-pass, per-object phase "
+                "timings, row counts and rows/s (tasks/rlm_sfdmu_profile.py)."
+            ),
+            "required": False
         }
     }
 
@@ -371,10 +494,20 @@ class LoadSFDMUData(SFDXBaseTask):
             self.project_config.keychain = self.keychain
 
     def _prep_runtime(self) -> None:
+        engine = str(self.options.get("engine") or "sfdmu").strip().lower()
+        if engine not in ("sfdmu", "native"):
+            raise TaskOptionsError(f"engine must be 'sfdmu' or 'native', got '{engine}'")
+        self._native = engine == "native"
         if "org" not in self.options or not self.options["org"]:
             self._load_keychain()
         
         self.pathtoexportjson = self.options.get("pathtoexportjson", "datasets/sfdmu/")
+        if rlm_sfdmu_overlay.is_overlay(self.pathtoexportjson):
+            # A locale overlay loads from its materialized copy (cached under .cci/)
+            root = getattr(self.project_config, "repo_root", None) or os.getcwd()
+            self.pathtoexportjson = rlm_sfdmu_overlay.materialize(
+                self.pathtoexportjson, os.path.join(root, rlm_sfdmu_overlay.DEFAULT_CACHE_DIR))
+            self.logger.info(f"Overlay plan materialized to {self.pathtoexportjson}")
         self._temp_plan_dir = None
 
         if isinstance(self.org_config, ScratchOrgConfig):
@@ -387,39 +520,171 @@ class LoadSFDMUData(SFDXBaseTask):
 
         if self.options.get("dynamic_assigned_to_user"):
             self._apply_dynamic_assigned_to_user()
+        self._ledger = None
+        self._ledger_plan_dir = None
+        self._nothing_to_load = False
+        if self._option_true("differential", default=True):
+            self._apply_ledger()
         if self.options.get("sync_objectset_source_to_source"):
             self._sync_objectset_source_to_source()
-        self._prepare_export_json_file()
-    
+        if not self._native:
+            self._prepare_export_json_file()
+
+    def _option_true(self, name: str, default: bool = False) -> bool:
+        value = self.options.get(name)
+        if value is None or value == "":
+            return default
+        return str(value).strip().lower() in {"1", "true", "yes"}
+
+    def _object_set_indices(self) -> Optional[List[int]]:
+        object_sets = self.options.get("object_sets")
+        if isinstance(object_sets, str):
+            object_sets = json.loads(object_sets)
+        return [int(i) for i in object_sets] if object_sets is not None else None
+
+    def _ledger_file(self) -> str:
+        ledger_dir = self.options.get("ledger_dir") or rlm_sfdmu_ledger.DEFAULT_LEDGER_DIR
+        if not os.path.isabs(ledger_dir):
+            root = getattr(self.project_config, "repo_root", None) or os.getcwd()
+            ledger_dir = os.path.join(root, ledger_dir)
+        org_key = rlm_sfdmu_ledger.org_key(getattr(self.org_config, "org_id", None), self.instanceurl,
+                                           getattr(self.org_config, "username", None) or "")
+        return rlm_sfdmu_ledger.ledger_path(ledger_dir, org_key, self.options.get("pathtoexportjson") or "")
+
+    def _fingerprint(self, sobjects: List[str]) -> Dict[str, Dict[str, Any]]:
+        return rlm_org_fingerprint.org_fingerprint(
+            self.instanceurl, self.accesstoken, sobjects,
+            api_version=getattr(self.project_config, "project__package__api_version", None) or "67.0",
+            logger=self.logger,
+        )
+
+    def _apply_ledger(self) -> None:
+        """Point the run at a copy of the plan holding only rows changed since the last load."""
+        path = self._ledger_file()
+        force = self._option_true("force")
+        previous = {} if force else rlm_sfdmu_ledger.load_ledger(path)
+        scan = rlm_sfdmu_ledger.scan_plan(self.pathtoexportjson, self._object_set_indices())
+        self._ledger = {"path": path, "previous": previous, "scan": scan}
+        if not previous:
+            reason = "force: true" if force else "no ledger for this org yet"
+            self.logger.info(f"Differential load: full load ({reason}).")
+            return
+        try:
+            fingerprint = self._fingerprint(scan["sobjects"])
+        except CommandException as e:
+            self.logger.warning(f"Differential load: full load (org fingerprint failed: {e}).")
+            return
+        self._ledger_plan_dir = tempfile.mkdtemp(prefix="sfdmu_delta_")
+        decided = rlm_sfdmu_ledger.build_differential_plan(
+            self.pathtoexportjson, self._ledger_plan_dir, scan, previous,
+            fingerprint, lookups_from_org=self._native,
+        )
+        for obj in decided["objects"]:
+            detail = obj["status"] if not obj["reason"] else f"{obj['status']} ({obj['reason']})"
+            self.logger.info(f"  set {obj['set'] + 1} {obj['sobject']}: {detail}, "
+                             f"{obj['changed_rows']}/{obj['rows']} row(s) new or changed")
+        self.logger.info(f"Differential load: {decided['rows_loaded']} of {decided['rows_total']} "
+                         f"row(s) to load.")
+        if not decided["changed"]:
+            self._nothing_to_load = True
+        else:
+            self.pathtoexportjson = self._ledger_plan_dir
+
+    def _record_ledger(self, run_started: Optional[float] = None) -> None:
+        """Record the load; ``run_started`` (SFDMU CLI runs) leaves out objects its reports show as not loaded."""
+        if not self._ledger or self._option_true("simulation"):
+            return
+        try:
+            scan = self._ledger["scan"]
+            failed = set()
+            if run_started is not None:
+                failed = rlm_sfdmu_ledger.failed_sobjects(self.pathtoexportjson, scan["sobjects"], run_started)
+            if failed:
+                self.logger.warning(f"SFDMU left rows of {', '.join(sorted(failed))} unresolved or failed; "
+                                    f"the ledger leaves them out, so the next run loads them in full.")
+            rlm_sfdmu_ledger.record_load(self._ledger["path"], scan, self._fingerprint(scan["sobjects"]),
+                                         previous=self._ledger["previous"], failed=failed)
+            self.logger.info(f"Load ledger updated: {self._ledger['path']}")
+        except Exception as e:
+            # The load itself succeeded; a missing ledger only costs a full load next time.
+            self.logger.warning(f"Could not update the load ledger: {e}")
+
+    def _run_native(self) -> None:
+        """Load the plan in-process instead of through the SFDMU CLI."""
+        object_sets = self._object_set_indices()
+        simulation = str(self.options.get("simulation", "")).strip().lower() in {"1", "true", "yes"}
+        try:
+            loader = NativeSfdmuLoader(
+                self.pathtoexportjson, self.instanceurl, self.accesstoken,
+                api_version=getattr(self.project_config, "project__package__api_version", None),
+                object_sets=object_sets,
+                parallel_objects=int(self.options.get("parallel_objects") or 4),
+                parallel_batches=int(self.options.get("parallel_batches") or 4),
+                bulk_threshold=self.options.get("bulk_threshold"),
+                simulation=simulation,
+                logger=self.logger,
+            )
+            report = loader.run()
+        except NativeLoadError as e:
+            raise CommandException(str(e)) from e
+        for line in summary_lines(report):
+            self.logger.info(line)
+        if self._option_true("profile", default=True):
+            plan_dir = self.options.get("pathtoexportjson") or self.pathtoexportjson
+            write_sfdmu_profile(rlm_sfdmu_profile.profile_from_native(report, plan=plan_dir), plan_dir, self.logger)
+        report_path = self.options.get("native_report")
+        if report_path:
+            os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+            with open(report_path, "w") as f:
+                json.dump(report, f, indent=2)
+            self.logger.info(f"Native load report written to {report_path}")
+        failed = report["totals"].get("failed", 0)
+        if failed:
+            raise CommandException(f"Native load: {failed} record(s) failed; see the errors above.")
+
     def _run_task(self) -> None:
+        self._native = None  # set by _prep_runtime once the engine option is valid
         try:
             self._prep_runtime()
+            if self._nothing_to_load:
+                self.logger.info("Differential load: nothing changed since the last load; skipping. "
+                                 "Use force: true for a full load.")
+                return
+            if self._native:
+                self.logger.info(f'Target Path: {self.pathtoexportjson} (native engine)')
+                self._run_native()
+                self._record_ledger()
+                return
             
             self.logger.info(f'Target Path: {self.pathtoexportjson}')
             self.logger.info(f'Current Working Directory: {self.options.get("dir")}')
             
             cmd = self._get_command()
             self.logger.info(f'Executing command: {cmd}')  # Log the command being executed
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, cwd=self.options.get("dir"))
-            
-            if result.returncode != 0:
-                self.logger.error(f"Command failed with exit code {result.returncode}")
-                self.logger.error(f"STDOUT: {strip_ansi_codes(result.stdout)}")
-                self.logger.error(f"STDERR: {strip_ansi_codes(result.stderr)}")
-                raise CommandException(f"Command failed with exit code {result.returncode}")
-
-            for line in result.stdout.splitlines():
-                self.logger.info(strip_ansi_codes(line))
+            run_started = time.time()
+            returncode, lines, stderr = stream_command(cmd, self.options.get("dir"), self.logger)
+            if self._option_true("profile", default=True):
+                plan_dir = self.options.get("pathtoexportjson") or self.pathtoexportjson
+                write_sfdmu_profile(rlm_sfdmu_profile.parse_sfdmu_output(lines, plan=plan_dir),
+                                    plan_dir, self.logger)
+
+            if returncode != 0:
+                self.logger.error(f"Command failed with exit code {returncode}")
+                self.logger.error(f"STDERR: {strip_ansi_codes(stderr)}")
+                raise CommandException(f"Command failed with exit code {returncode}")
+            self._record_ledger(run_started)
             
         except Exception as e:
             self.logger.error(f"An error occurred: {str(e)}")
             raise
         finally:
-            self.logger.info('Cleaning up export.json...')
-            self._cleanup_export_json_file()
-            if getattr(self, "_temp_plan_dir", None) and os.path.isdir(self._temp_plan_dir):
-                shutil.rmtree(self._temp_plan_dir, ignore_errors=True)
-                self.logger.info("Removed temp plan directory.")
+            if self._native is False:
+                self.logger.info('Cleaning up export.json...')
+                self._cleanup_export_json_file()
+            for temp_dir in (getattr(self, "_ledger_plan_dir", None), getattr(self, "_temp_plan_dir", None)):
+                if temp_dir and os.path.isdir(temp_dir):
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    self.logger.info("Removed temp plan directory.")
     def _get_command(self) -> str:
         trimmed_instance_url = self._trim_instance_url(self.instanceurl)
         if not isinstance(self.org_config, ScratchOrgConfig):
@@ -442,6 +707,98 @@ class LoadSFDMUData(SFDXBaseTask):
         return url.replace("https://", "").replace("http://", "")
 
 
+class LoadSFDMUPlans(BaseSalesforceTask):
+    """Run several SFDMU load tasks, overlapping the ones whose plans do not conflict.
+
+    Dependencies come from each plan's export.json (tasks/rlm_sfdmu_schedule.py).
+    A plan waits for an earlier one only when they share an object and at least
+    one of them creates it, both update it, or one updates the fields the other
+    matches on. The list order is the serial fallback. Ends with a Gantt-style
+    timing table; ``report`` writes it as JSON.
+    """
+
+    task_options: Dict[str, Dict[str, Any]] = {
+        "tasks": {
+            "description": (
+                "Load tasks to run, in the order a flow would run them serially "
+                "(e.g. insert_quantumbit_pcm_data, insert_quantumbit_pricing_data, insert_tax_data)."
+            ),
+            "required": True
+        },
+        "max_parallel": {
+            "description": "Most loads (SFDMU processes or native loaders) running at once. Default 3.",
+            "required": False
+        },
+        "concurrent_updates": {
+            "description": (
+                "If true, two plans that update the same object run concurrently when they update "
+                "disjoint fields. Default false: every shared Update waits."
+            ),
+            "required": False
+        },
+        "task_options": {
+            "description": "Options applied to every load task (e.g. {engine: native}).",
+            "required": False
+        },
+        "report": {
+            "description": "Path for the JSON schedule report (dependencies, start/end per plan).",
+            "required": False
+        },
+    }
+
+    def _init_options(self, kwargs: Dict[str, Any]) -> None:
+        super()._init_options(kwargs)
+        self.task_names = process_list_arg(self.options.get("tasks")) or []
+        if not self.task_names:
+            raise TaskOptionsError("tasks must list at least one load task")
+        try:
+            self.max_parallel = int(self.options.get("max_parallel") or 3)
+        except (TypeError, ValueError):
+            raise TaskOptionsError(f"max_parallel must be an integer, got {self.options.get('max_parallel')!r}")
+        self.concurrent_updates = str(self.options.get("concurrent_updates", "")).strip().lower() in {
+            "1", "true", "yes"}
+        shared = self.options.get("task_options") or {}
+        if isinstance(shared, str):
+            shared = json.loads(shared)
+        self.shared_options = dict(shared)
+
+    def _task_config(self, name: str) -> "TaskConfig":
+        task_config = self.project_config.get_task(name)
+        options = {**(task_config.options or {}), **self.shared_options}
+        if not options.get("pathtoexportjson"):
+            raise TaskOptionsError(f"{name} has no pathtoexportjson; only SFDMU load tasks can be scheduled")
+        return TaskConfig({**task_config.config, "options": options})
+
+    def _run_task(self) -> None:
+        configs = {name: self._task_config(name) for name in self.task_names}
+        plans = [(name, configs[name].options["pathtoexportjson"]) for name in self.task_names]
+        deps = rlm_sfdmu_schedule.plan_dependencies(plans, concurrent_updates=self.concurrent_updates)
+        for name in self.task_names:
+            waits = "; ".join(f"{dep} ({', '.join(objs)})" for dep, objs in deps[name].items())
+            self.logger.info(f"{name}: " + (f"after {waits}" if waits else "no dependency"))
+
+        def run_one(name: str) -> None:
+            task_class = import_global(configs[name].class_path)
+            task_class(self.project_config, configs[name], org_config=self.org_config, name=name)()
+
+        timings = rlm_sfdmu_schedule.run_schedule(
+            self.task_names, deps, run_one, max_parallel=self.max_parallel, log=self.logger.info,
+        )
+        for line in rlm_sfdmu_schedule.gantt_lines(timings):
+            self.logger.info(line)
+        report_path = self.options.get("report")
+        if report_path:
+            os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+            with open(report_path, "w") as f:
+                json.dump({"max_parallel": self.max_parallel, "plans": [
+                    {**t, "plan": configs[t["name"]].options["pathtoexportjson"],
+                     "waits_on": deps[t["name"]]} for t in timings]}, f, indent=2)
+            self.logger.info(f"Schedule report written to {report_path}")
+        failed = [t["name"] for t in timings if t["status"] != "ok"]
+        if failed:
+            raise CommandException(f"{len(failed)} load(s) did not complete: {', '.join(failed)}")
+
+
 def _sobjects_from_export_json(export_path: str) -> list:
     """Parse export.json and return list of sobject API names (excluding excluded objects).
 
@@ -473,8 +830,13 @@ class DeleteSFDMUData(BaseSalesforceTask):
 
     Reads the plan's export.json, identifies all non-excluded objects with
     operation=Insert (in array order), and deletes ALL records of those types
-    in REVERSE array order — children first, matching SFDMU's deleteOldData
-    deletion sequence.
+    children first. The order starts as REVERSE array order, matching SFDMU's
+    deleteOldData sequence. It is then grouped into dependency levels
+    (tasks/rlm_sfdmu_plan.py): each object's plan lookups are resolved by a
+    describe, and objects that reference nothing still pending are deleted
+    concurrently (``parallel_objects``). Within an object, up to
+    ``parallel_batches`` 200-id DELETE calls are in flight at once. An object
+    whose describe fails keeps its serial plan-order position.
 
     Shape-agnostic: no WHERE-clause filtering is applied. The full type is
     cleared regardless of which data shape populated it. The plan file is the
@@ -483,6 +845,9 @@ class DeleteSFDMUData(BaseSalesforceTask):
     Intended as the cleanup step before running LoadSFDMUData on a plan that
     uses operation=Insert (without deleteOldData) to support layered data
     shapes: run DeleteSFDMUData once, then run each layered plan in sequence.
+
+    Objects with at least ``bulk_threshold`` records are cleared with a Bulk
+    API 2.0 query + delete job (tasks/rlm_bulk.py) instead of 200-id REST calls.
     """
 
     keychain_class = BaseProjectKeychain
@@ -506,9 +871,36 @@ class DeleteSFDMUData(BaseSalesforceTask):
             ),
             "required": False,
         },
+        "bulk_threshold": {
+            "description": (
+                "Record count at or above which an object is deleted through Bulk API 2.0 "
+                "instead of REST. 0 disables Bulk. Defaults to $RLM_SF_BULK_THRESHOLD, else 10000."
+            ),
+            "required": False,
+        },
+        "hard_delete": {
+            "description": (
+                "If true, Bulk deletions use hardDelete (records skip the Recycle Bin; needs the "
+                "'Bulk API Hard Delete' permission). REST deletions are unaffected. Default false."
+            ),
+            "required": False,
+        },
+        "parallel_objects": {
+            "description": (
+                "Objects in the same dependency level deleted at once. 1 deletes one object at a "
+                "time (still in dependency order). Default 4."
+            ),
+            "required": False,
+        },
+        "parallel_batches": {
+            "description": "200-id REST DELETE calls in flight per object. Default 4.",
+            "required": False,
+        },
     }
 
     _BATCH_SIZE = 200  # REST composite sobjects delete limit
+    _DEFAULT_PARALLEL_OBJECTS = 4
+    _DEFAULT_PARALLEL_BATCHES = 4
 
     @property
     def _access_token(self) -> str:
@@ -529,10 +921,11 @@ class DeleteSFDMUData(BaseSalesforceTask):
 
     @property
     def _auth_headers(self) -> Dict[str, str]:
-        return {
-            "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json",
-        }
+        return rlm_http.auth_headers(self._access_token)
+
+    def _int_option(self, name: str, default: int) -> int:
+        raw = self.options.get(name)
+        return max(int(raw), 1) if raw not in (None, "") else default
 
     def _run_task(self) -> None:
         plan_dir = self.options.get("pathtoexportjson", "datasets/sfdmu/")
@@ -541,36 +934,23 @@ class DeleteSFDMUData(BaseSalesforceTask):
         with open(export_json_path) as f:
             plan = json.load(f)
 
-        object_sets = plan.get("objectSets", [])
-        if not object_sets and "objects" in plan:
-            object_sets = [{"objects": plan["objects"]}]
-
         selected = self.options.get("object_sets")
         if selected is not None:
             if isinstance(selected, str):
                 selected = json.loads(selected)
             selected = [int(i) for i in selected]
-            object_sets = [object_sets[i] for i in selected if 0 <= i < len(object_sets)]
-
-        # Collect Insert-operation objects in plan array order.
-        # Duplicates are preserved so that the deletion order mirrors the plan exactly.
-        insert_sobjects: List[str] = []
-        for obj_set in object_sets:
-            for obj in obj_set.get("objects", []):
-                if obj.get("excluded", False):
-                    continue
-                if obj.get("operation", "").lower() != "insert":
-                    continue
-                m = re.search(r"\s+FROM\s+(\w+)(?:\s|$)", obj.get("query", ""), re.IGNORECASE)
-                if m:
-                    insert_sobjects.append(m.group(1))
+        insert_objects = rlm_sfdmu_plan.insert_objects(rlm_sfdmu_plan.object_sets(plan, selected))
 
-        if not insert_sobjects:
+        if not insert_objects:
             self.logger.info("No Insert-operation objects found in plan. Nothing to delete.")
             return
 
         # Reverse = children first, matching SFDMU's deleteOldData sequence.
-        deletion_order = list(reversed(insert_sobjects))
+        # Duplicates collapse onto their first (child-most) position.
+        by_sobject: Dict[str, List[dict]] = {}
+        for obj in reversed(insert_objects):
+            by_sobject.setdefault(rlm_sfdmu_plan.query_sobject(obj["query"]), []).append(obj)
+        deletion_order = list(by_sobject)
         self.logger.info(
             f"Deleting {len(deletion_order)} Insert-operation object type(s) "
             f"in reverse plan order:"
@@ -578,26 +958,107 @@ class DeleteSFDMUData(BaseSalesforceTask):
         for i, name in enumerate(deletion_order, 1):
             self.logger.info(f"  {i}. {name}")
 
+        parallel_objects = self._int_option("parallel_objects", self._DEFAULT_PARALLEL_OBJECTS)
+        parents = self._plan_parents(by_sobject, parallel_objects)
+        levels = rlm_sfdmu_plan.dependency_levels(deletion_order, parents)
+        self.logger.info(
+            f"Dependency levels ({len(levels)}; up to {parallel_objects} object(s) at once):"
+        )
+        for i, level in enumerate(levels, 1):
+            self.logger.info(f"  L{i}: {', '.join(level)}")
+
+        self._stats: Dict[str, Dict[str, float]] = {}
+        started = time.monotonic()
         total_deleted = 0
-        for sobject_name in deletion_order:
-            total_deleted += self._delete_all_records(sobject_name)
+        with ThreadPoolExecutor(max_workers=parallel_objects,
+                                thread_name_prefix="sfdmu-delete") as pool:
+            for i, level in enumerate(levels, 1):
+                self.logger.info(f"Level {i}/{len(levels)}: {', '.join(level)}")
+                total_deleted += sum(pool.map(self._timed_delete, level))
+
+        elapsed = time.monotonic() - started
+        self._log_throughput(deletion_order)
+        self.logger.info(
+            f"Done. Total records deleted: {total_deleted} in {elapsed:.1f}s"
+            f" ({total_deleted / elapsed if elapsed else 0:.0f} rec/s)"
+        )
 
-        self.logger.info(f"Done. Total records deleted: {total_deleted}")
+    def _plan_parents(self, by_sobject: Dict[str, List[dict]], workers: int
+                      ) -> Dict[str, Optional[set]]:
+        """Describe each object once (concurrently) and resolve its plan lookups.
+
+        A failed describe maps to None, which keeps that object serial.
+        """
+        def resolve(sobject_name: str) -> Optional[set]:
+            resp = rlm_http.get(
+                f"{self._instance_url}/services/data/v{self._api_version}"
+                f"/sobjects/{sobject_name}/describe",
+                headers=self._auth_headers,
+            )
+            if resp.status_code != 200:
+                self.logger.warning(
+                    f"{sobject_name}: describe failed ({resp.status_code}); "
+                    f"deleting it in plan order."
+                )
+                return None
+            describe = resp.json()
+            found: set = set()
+            for obj in by_sobject[sobject_name]:
+                found |= rlm_sfdmu_plan.parent_sobjects(obj, describe)
+            return found
+
+        names = list(by_sobject)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(names, pool.map(resolve, names)))
+
+    def _timed_delete(self, sobject_name: str) -> int:
+        started = time.monotonic()
+        deleted = self._delete_all_records(sobject_name)
+        self._stats[sobject_name] = {"deleted": deleted, "seconds": time.monotonic() - started}
+        return deleted
+
+    def _log_throughput(self, deletion_order: List[str]) -> None:
+        self.logger.info("Per-object throughput:")
+        for name in deletion_order:
+            stat = self._stats.get(name)
+            if not stat:
+                continue
+            rate = stat["deleted"] / stat["seconds"] if stat["seconds"] else 0
+            self.logger.info(
+                f"  {name:<40} {int(stat['deleted']):>8} deleted  "
+                f"{stat['seconds']:>7.1f}s  {rate:>8.0f} rec/s"
+            )
+
+    def _count_records(self, sobject_name: str) -> Optional[int]:
+        """SELECT COUNT() for sobject_name, or None if the count query fails."""
+        resp = rlm_http.get(
+            f"{self._instance_url}/services/data/v{self._api_version}/query",
+            headers=self._auth_headers,
+            params={"q": f"SELECT COUNT() FROM {sobject_name}"},
+        )
+        if resp.status_code != 200:
+            return None
+        return resp.json().get("totalSize")
 
     def _delete_all_records(self, sobject_name: str) -> int:
         """Query all records of sobject_name and delete via REST composite endpoint.
 
         Uses allOrNone=false for partial-success semantics: individual failures
         are logged as errors but do not abort deletion of remaining records.
-        Returns the count of successfully deleted records.
+        Returns the count of successfully deleted records. Objects at or above
+        the bulk threshold go through _bulk_delete_all_records instead.
         """
+        total = self._count_records(sobject_name)
+        if total and prefer_bulk(total, self.options.get("bulk_threshold")):
+            return self._bulk_delete_all_records(sobject_name, total)
+
         query_url = f"{self._instance_url}/services/data/v{self._api_version}/query"
         records: List[dict] = []
         url = query_url
         params: Optional[Dict] = {"q": f"SELECT Id FROM {sobject_name}"}
 
         while True:
-            resp = requests.get(url, headers=self._auth_headers, params=params)
+            resp = rlm_http.get(url, headers=self._auth_headers, params=params)
             if resp.status_code != 200:
                 self.logger.error(
                     f"{sobject_name}: SOQL query failed ({resp.status_code}): {resp.text}"
@@ -622,38 +1083,84 @@ class DeleteSFDMUData(BaseSalesforceTask):
         delete_url = (
             f"{self._instance_url}/services/data/v{self._api_version}/composite/sobjects"
         )
-        deleted = 0
-        failed = 0
+        batches = [ids[i : i + self._BATCH_SIZE] for i in range(0, len(ids), self._BATCH_SIZE)]
+        progress = {"deleted": 0, "failed": 0, "batches": 0}
+        lock = threading.Lock()
+        report_every = max(len(batches) // 10, 1)
 
-        for i in range(0, len(ids), self._BATCH_SIZE):
-            batch = ids[i : i + self._BATCH_SIZE]
-            resp = requests.delete(
+        def delete_batch(batch: List[str]) -> None:
+            resp = rlm_http.delete(
                 delete_url,
                 headers=self._auth_headers,
                 params={"ids": ",".join(batch), "allOrNone": "false"},
             )
+            ok = bad = 0
             if resp.status_code != 200:
                 self.logger.error(
                     f"{sobject_name}: Batch delete failed ({resp.status_code}): {resp.text}"
                 )
-                failed += len(batch)
-                continue
+                bad = len(batch)
+            else:
+                for result in resp.json():
+                    if result.get("success"):
+                        ok += 1
+                    else:
+                        bad += 1
+                        for err in result.get("errors", []):
+                            self.logger.error(
+                                f"{sobject_name}: Failed to delete {result.get('id', '?')}: "
+                                f"{err.get('message', err)}"
+                            )
+            with lock:
+                progress["deleted"] += ok
+                progress["failed"] += bad
+                progress["batches"] += 1
+                if len(batches) > 1 and progress["batches"] % report_every == 0:
+                    self.logger.info(
+                        f"{sobject_name}: {progress['deleted'] + progress['failed']}/{count} "
+                        f"processed ({progress['batches']}/{len(batches)} batches)"
+                    )
 
-            for result in resp.json():
-                if result.get("success"):
-                    deleted += 1
-                else:
-                    failed += 1
-                    for err in result.get("errors", []):
-                        self.logger.error(
-                            f"{sobject_name}: Failed to delete {result.get('id', '?')}: "
-                            f"{err.get('message', err)}"
-                        )
+        workers = min(self._int_option("parallel_batches", self._DEFAULT_PARALLEL_BATCHES),
+                      len(batches))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(delete_batch, batches))
+        deleted, failed = progress["deleted"], progress["failed"]
 
         suffix = f" ({failed} failed)" if failed else ""
         self.logger.info(f"{sobject_name}: Deleted {deleted}/{count}{suffix}")
         return deleted
 
+    def _bulk_delete_all_records(self, sobject_name: str, count: int) -> int:
+        """Delete every sobject_name record with a Bulk API 2.0 query + delete job.
+
+        Same partial-success semantics as the REST path: per-record failures
+        are logged and the rest are deleted. Returns the count deleted.
+        """
+        hard = str(self.options.get("hard_delete", "")).strip().lower() in {"1", "true", "yes"}
+        operation = "hardDelete" if hard else "delete"
+        self.logger.info(f"{sobject_name}: Deleting {count} record(s) via Bulk API 2.0 ({operation})...")
+        bulk = BulkApi2(self._instance_url, self._access_token, self._api_version)
+        try:
+            ids = (r["Id"] for r in bulk.iter_query(f"SELECT Id FROM {sobject_name}"))
+            result = bulk.delete(sobject_name, ids, hard=hard)
+        except BulkApiError as exc:
+            self.logger.error(f"{sobject_name}: Bulk delete failed: {exc}")
+            return 0
+
+        for row in result["failures"]:
+            self.logger.error(
+                f"{sobject_name}: Failed to delete {row.get('sf__Id') or row.get('Id') or '?'}: "
+                f"{row.get('sf__Error')}"
+            )
+        deleted = result["processed"] - result["failed"]
+        suffix = f" ({result['failed']} failed)" if result["failed"] else ""
+        self.logger.info(
+            f"{sobject_name}: Deleted {deleted}/{result['processed']}{suffix} "
+            f"(bulk job(s) {', '.join(result['jobs'])})"
+        )
+        return deleted
+
 
 class TestSFDMUIdempotency(SFDXBaseTask):
     """Run an SFDMU load twice and assert record counts do not increase (idempotency).
@@ -661,6 +1168,16 @@ class TestSFDMUIdempotency(SFDXBaseTask):
     Use this to verify that a data plan uses SFDMU v5 composite key notation correctly:
     objects with multi-component externalIds must have a $$ column in the CSV so the
     second run matches existing records instead of inserting duplicates.
+
+    Counts come from an org fingerprint (tasks/rlm_org_fingerprint.py): one
+    COUNT + MAX(SystemModstamp) query per sobject, batched 25 to a
+    composite/batch call. Objects the second run updated in place are logged.
+    An object the org could not count after either run fails the check; it is
+    never read as zero.
+
+    With ``skip_unchanged``, a passing run is recorded with the plan's content
+    fingerprint (tasks/rlm_sfdmu_fingerprint.py) and the org fingerprint. A
+    later run whose plan and org still match that record is skipped.
     """
 
     keychain_class = BaseProjectKeychain
@@ -687,6 +1204,14 @@ class TestSFDMUIdempotency(SFDXBaseTask):
             ),
             "required": False,
         },
+        "skip_unchanged": {
+            "description": (
+                "If true, skip the test when the plan's content fingerprint and the org fingerprint of its "
+                "objects are unchanged since the last passing run against this org (recorded under "
+                ".cci/sfdmu_idempotency/). Default false."
+            ),
+            "required": False,
+        },
         "run_after_each_load_apex": {
             "description": (
                 "Optional path to an Apex script to run after each load, for deduplication only. "
@@ -746,34 +1271,19 @@ class TestSFDMUIdempotency(SFDXBaseTask):
             )
         return org_alias
 
-    def _get_record_counts(self, sobjects: list) -> Dict[str, int]:
-        org_alias = self._get_org_for_cli()
-        counts = {}
-        for sobject in sobjects:
-            try:
-                result = subprocess.run(
-                    ["sf", "data", "query", "-q", f"SELECT COUNT(Id) cnt FROM {sobject}", "-o", org_alias, "--json"],
-                    capture_output=True,
-                    text=True,
-                    timeout=60,
-                    cwd=self.options.get("dir"),
-                )
-            except subprocess.TimeoutExpired:
-                self.logger.warning(f"Timeout querying {sobject}, skipping")
-                continue
-            if result.returncode != 0:
-                self.logger.warning(f"Query {sobject} failed: {strip_ansi_codes(result.stderr or result.stdout)}, skipping")
-                continue
-            try:
-                out = json.loads(result.stdout)
-                records = out.get("result", {}).get("records") or []
-                if records and "cnt" in records[0]:
-                    counts[sobject] = int(records[0]["cnt"])
-                else:
-                    counts[sobject] = 0
-            except (json.JSONDecodeError, KeyError, IndexError):
-                self.logger.warning(f"Could not parse count for {sobject}, skipping")
-        return counts
+    def _org_fingerprint(self, sobjects: list) -> Dict[str, Dict[str, Any]]:
+        """Counts + newest SystemModstamp per sobject, 25 objects per composite/batch call."""
+        return rlm_org_fingerprint.org_fingerprint(
+            self.instanceurl, self.accesstoken, sobjects,
+            api_version=getattr(self.project_config, "project__package__api_version", None) or "67.0",
+            logger=self.logger,
+        )
+
+    def _runs_file(self) -> str:
+        root = getattr(self.project_config, "repo_root", None) or os.getcwd()
+        org_key = rlm_sfdmu_ledger.org_key(getattr(self.org_config, "org_id", None), self.instanceurl,
+                                           getattr(self.org_config, "username", None) or "")
+        return os.path.join(root, rlm_sfdmu_fingerprint.DEFAULT_RUNS_DIR, f"{org_key}.json")
 
     def _run_load_once(self, plan_dir: Optional[str] = None) -> None:
         plan_dir = plan_dir or self.options.get("pathtoexportjson", "datasets/sfdmu/")
@@ -871,10 +1381,20 @@ class TestSFDMUIdempotency(SFDXBaseTask):
         sobjects = _sobjects_from_export_json(plan_dir)
         if not sobjects:
             raise TaskOptionsError("No sobjects found in export.json")
+        skip_unchanged = str(self.options.get("skip_unchanged", "")).lower() in {"1", "true", "yes"}
+        run_context = {"use_extraction_roundtrip": str(self.options.get("use_extraction_roundtrip", "")).lower()
+                       in {"1", "true", "yes"}}
+        plan_fingerprint = rlm_sfdmu_fingerprint.fingerprint_plan(plan_dir) if skip_unchanged else None
+        if skip_unchanged and rlm_sfdmu_fingerprint.unchanged_since_run(
+                self._runs_file(), plan_dir, plan_fingerprint,
+                rlm_org_fingerprint.fingerprint_digest(self._org_fingerprint(sobjects)), run_context):
+            self.logger.info("Plan and org unchanged since the last passing idempotency run; skipping.")
+            return
         self.logger.info("First run: load data into org")
         self._run_load_once()
         self._run_post_load_apex_if_configured()
-        counts_after_first = self._get_record_counts(sobjects)
+        fingerprint_after_first = self._org_fingerprint(sobjects)
+        counts_after_first = rlm_org_fingerprint.counts(fingerprint_after_first)
         use_roundtrip = str(self.options.get("use_extraction_roundtrip", "")).lower() in {"1", "true", "yes"}
         if use_roundtrip:
             self.logger.info("Extraction roundtrip: extract -> post-process -> load from processed (validates v5 re-import)")
@@ -950,11 +1470,23 @@ class TestSFDMUIdempotency(SFDXBaseTask):
             self.logger.info("Second run: idempotent re-run from source (should not add records)")
             self._run_load_once()
             self._run_post_load_apex_if_configured()
-        counts_after_second = self._get_record_counts(sobjects)
+        fingerprint_after_second = self._org_fingerprint(sobjects)
+        counts_after_second = rlm_org_fingerprint.counts(fingerprint_after_second)
+        touched = rlm_org_fingerprint.changed_sobjects(fingerprint_after_first, fingerprint_after_second)
+        if touched:
+            self.logger.info(f"Second run modified records in: {', '.join(touched)}")
         failures = []
+        uncounted = []
         for sobject in sobjects:
-            c1 = counts_after_first.get(sobject, 0)
-            c2 = counts_after_second.get(sobject, 0)
+            if sobject not in counts_after_first or sobject not in counts_after_second:
+                uncounted.append(sobject)
+                runs = [run for run, counts in (("first", counts_after_first), ("second", counts_after_second))
+                        if sobject not in counts]
+                failures.append(f"{sobject}: no record count after the {' and '.join(runs)} run"
+                                f"{'s' if len(runs) > 1 else ''} (count query failed)")
+                continue
+            c1 = counts_after_first[sobject]
+            c2 = counts_after_second[sobject]
             if c2 > c1:
                 failures.append(f"{sobject}: count increased from {c1} to {c2} (not idempotent)")
             else:
@@ -963,8 +1495,17 @@ class TestSFDMUIdempotency(SFDXBaseTask):
             self.logger.error("Idempotency check failed:")
             for msg in failures:
                 self.logger.error(f"  {msg}")
+            if len(uncounted) == len(failures):
+                raise CommandException(f"Could not count {', '.join(uncounted)}; idempotency is unverified.")
             raise CommandException("Re-run added records. Ensure composite-key objects have a $$ column in the CSV (SFDMU v5).")
         self.logger.info("Idempotency check passed: no record count increase on second run.")
+        if skip_unchanged:
+            try:
+                rlm_sfdmu_fingerprint.record_run(self._runs_file(), plan_dir, plan_fingerprint,
+                                                 rlm_org_fingerprint.fingerprint_digest(fingerprint_after_second),
+                                                 run_context)
+            except OSError as e:
+                self.logger.warning(f"Could not record the passing run: {e}")
 
 
 class ExtractSFDMUData(SFDXBaseTask):
@@ -1039,6 +1580,32 @@ class ExtractSFDMUData(SFDXBaseTask):
                 "<output_dir>/processed/)."
             ),
             "required": False
+        },
+        "profile": {
+            "description": (
+                "If true (default), write sfdmu_profile.json beside the plan with per-object query "
+                "timings and row counts from SFDMU's verbose output."
+            ),
+            "required": False
+        },
+        "code_map_workers": {
+            "description": "Concurrent source-org queries when building the code backfill map (default 4).",
+            "required": False
+        },
+        "code_map_cache": {
+            "description": (
+                "If true (default), reuse code backfill maps from earlier extractions of the same org "
+                "while the queried objects are unchanged (org fingerprint). False always re-queries."
+            ),
+            "required": False
+        },
+        "code_map_cache_dir": {
+            "description": "Directory for the per-org code map cache (default .cci/sfdmu_code_map).",
+            "required": False
+        },
+        "post_process_workers": {
+            "description": "Processes the post-process spreads objects across (default: CPU count; 1 = in the task process).",
+            "required": False
         }
     }
 
@@ -1157,131 +1724,40 @@ class ExtractSFDMUData(SFDXBaseTask):
         self.logger.info(f"Collected {csv_count} CSV files to {output_dir}")
         return output_dir
 
-    def _cli_org(self) -> Optional[str]:
-        """CLI-safe org identifier for `sf` commands (alias or username).
-
-        The SFDMU extract may use the access_token (SFDMU keeps it in the orgs block),
-        so ``self.sourceusername`` can be an access_token for a non-scratch org with no
-        explicit sourceusername. ``sf data query --target-org`` requires a locally
-        authorized alias/username and rejects a bearer token (failing CLI auth and
-        leaking the secret), so resolve a real alias/username here: the explicit
-        sourceusername option, else org_config.username. Never the access_token.
-        """
-        return self.options.get("sourceusername") or getattr(self.org_config, "username", None)
-
-    def _sf_query_records(self, soql: str) -> List[dict]:
-        """Run a read-only SOQL query against the source org and return records.
-
-        Returns [] on any error (the backfill is best-effort: a failed map query
-        simply leaves the affected code components blank, the prior behaviour).
-        """
-        org = self._cli_org()
-        if not org:
-            self.logger.warning("No CLI-safe org alias/username for code-map query; skipping backfill")
-            return []
-        cmd = ["sf", "data", "query", "--target-org", org, "-q", soql, "--json"]
-        try:
-            res = subprocess.run(cmd, capture_output=True, text=True)
-        except Exception as e:  # pragma: no cover - subprocess failure
-            self.logger.warning(f"Code-map query error: {e}")
-            return []
-        if res.returncode != 0:
-            self.logger.warning(
-                f"Code-map query failed ({soql}): {strip_ansi_codes((res.stderr or '')[:200])}"
-            )
-            return []
-        try:
-            return json.loads(res.stdout).get("result", {}).get("records", []) or []
-        except (ValueError, AttributeError) as e:
-            self.logger.warning(f"Code-map parse failed: {e}")
-            return []
-
-    def _extracted_column_all_blank(self, output_dir: str, objname: str, col: str) -> bool:
-        """True iff the extracted CSV for objname has column col present with rows,
-        and every value is empty or SFDMU's #N/A null marker (i.e. needs backfill)."""
-        path = os.path.join(output_dir, f"{objname}.csv")
-        if not os.path.isfile(path):
-            return False
-        import csv as _csv
-        with open(path, newline="", encoding="utf-8-sig") as f:
-            reader = _csv.reader(f)
-            header = next(reader, None)
-            if not header:
-                return False
-            header = [h.strip().lstrip("﻿").strip().strip('"') for h in header]
-            if col not in header:
-                return False
-            ci = header.index(col)
-            saw_row = False
-            for row in reader:
-                saw_row = True
-                val = row[ci] if ci < len(row) else ""
-                if val not in ("", "#N/A"):
-                    return False
-            return saw_row
+    def _code_map_cache_file(self) -> str:
+        cache_dir = self.options.get("code_map_cache_dir") or rlm_sfdmu_codemap.DEFAULT_CACHE_DIR
+        if not os.path.isabs(cache_dir):
+            root = getattr(self.project_config, "repo_root", None) or os.getcwd()
+            cache_dir = os.path.join(root, cache_dir)
+        org_key = rlm_sfdmu_ledger.org_key(getattr(self.org_config, "org_id", None), self.instanceurl,
+                                           getattr(self.org_config, "username", None) or "")
+        return os.path.join(cache_dir, f"{org_key}.json")
 
     def _build_code_backfill_map(self, plan_dir: str, output_dir: str) -> dict:
         """Query the source org for Name->Code maps to fill externalId code
         components that SFDMU blanks to #N/A during extraction.
 
-        For each plan object, each single-hop externalId component ``Rel.Field``
-        (Field != Name) whose extracted column came back entirely #N/A is resolved
-        via ``SELECT Rel.Name, Rel.Field FROM Object`` on the source org.  Returns
-        ``{Object: {"Rel.Field": {Name: Code}}}``; empty when nothing needs it.
+        See ``tasks/rlm_sfdmu_codemap.py``: one scan per extracted CSV, the map
+        queries run concurrently on the shared org session, and results are
+        cached per source org until the queried objects' fingerprints move.
+        Returns ``{Object: {"Rel.Field": {Name: Code}}}``; empty when nothing needs it.
         """
-        try:
-            with open(os.path.join(plan_dir, EXPORT_JSON_FILENAME), "r", encoding="utf-8") as f:
-                export_json = json.load(f)
-        except (OSError, ValueError):
-            return {}
-
-        object_sets = export_json.get("objectSets") or [{"objects": export_json.get("objects", [])}]
-        code_map: Dict[str, Dict[str, dict]] = {}
-        seen = set()
-        for oset in object_sets:
-            for obj in oset.get("objects", []):
-                if obj.get("excluded"):
-                    continue
-                query = obj.get("query", "")
-                objname = query.split("FROM")[1].strip().split()[0] if "FROM" in query else None
-                external_id = obj.get("externalId", "")
-                if not objname or not external_id:
-                    continue
-                for comp in external_id.split(";"):
-                    comp = comp.strip()
-                    if comp.count(".") != 1:
-                        continue  # only single-hop Rel.Field; nested resolve via fallback
-                    rel, field = comp.split(".")
-                    if field == "Name":
-                        continue
-                    key = (objname, comp)
-                    if key in seen:
-                        continue
-                    seen.add(key)
-                    if not self._extracted_column_all_blank(output_dir, objname, comp):
-                        continue  # SFDMU resolved it (or target is a plan object)
-                    recs = self._sf_query_records(
-                        f"SELECT {rel}.Name, {rel}.{field} FROM {objname} WHERE {rel}.{field} != null"
-                    )
-                    mapping: Dict[str, str] = {}
-                    ambiguous = set()
-                    for r in recs:
-                        nested = r.get(rel) or {}
-                        name_val = nested.get("Name")
-                        code_val = nested.get(field)
-                        if name_val is None or code_val is None:
-                            continue
-                        if name_val in mapping and mapping[name_val] != code_val:
-                            ambiguous.add(name_val)
-                        else:
-                            mapping[name_val] = code_val
-                    for a in ambiguous:
-                        mapping.pop(a, None)  # don't guess when a Name maps to >1 Code
-                    if mapping:
-                        code_map.setdefault(objname, {})[comp] = mapping
-                        self.logger.info(
-                            f"Code-map: {objname}.{comp} <- {len(mapping)} {rel}.Name->{field} entries"
-                        )
+        api_version = getattr(self.project_config, "project__package__api_version", None) or "67.0"
+        use_cache = str(self.options.get("code_map_cache", True)).strip().lower() not in {"0", "false", "no"}
+        cache_file = self._code_map_cache_file() if use_cache else None
+        cache = rlm_sfdmu_codemap.load_cache(cache_file) if cache_file else None
+        code_map = rlm_sfdmu_codemap.build_code_map(
+            plan_dir, output_dir,
+            lambda soql: rlm_sfdmu_codemap.query_records(
+                self.instanceurl, self.accesstoken, soql, api_version=api_version),
+            max_workers=int(self.options.get("code_map_workers") or rlm_sfdmu_codemap.DEFAULT_WORKERS),
+            cache=cache,
+            fingerprint=lambda sobjects: rlm_org_fingerprint.org_fingerprint(
+                self.instanceurl, self.accesstoken, sobjects, api_version=api_version, logger=self.logger),
+            log=self.logger,
+        )
+        if cache_file and cache.get("queries"):
+            rlm_sfdmu_codemap.save_cache(cache_file, cache)
         return code_map
 
     def _resolve_reference_plan_dir(self, plan_dir: str) -> Optional[str]:
@@ -1344,19 +1820,18 @@ class ExtractSFDMUData(SFDXBaseTask):
                 pathtoexportjson=work_dir,
             )
             self.logger.info(f"Executing extraction: {cmd}")
-            result = subprocess.run(
-                cmd, shell=True, capture_output=True, text=True,
-                cwd=self.options.get("dir"),
-            )
-
-            for line in result.stdout.splitlines():
-                self.logger.info(strip_ansi_codes(line))
+            returncode, lines, stderr = stream_command(cmd, self.options.get("dir"), self.logger)
+            if str(self.options.get("profile", True)).strip().lower() not in {"0", "false", "no"}:
+                write_sfdmu_profile(
+                    rlm_sfdmu_profile.parse_sfdmu_output(lines, plan=plan_dir, operation="extract"),
+                    plan_dir, self.logger,
+                )
 
-            if result.returncode != 0:
-                self.logger.error(f"SFDMU extraction failed (exit {result.returncode})")
-                self.logger.error(f"STDERR: {strip_ansi_codes(result.stderr)}")
+            if returncode != 0:
+                self.logger.error(f"SFDMU extraction failed (exit {returncode})")
+                self.logger.error(f"STDERR: {strip_ansi_codes(stderr)}")
                 raise CommandException(
-                    f"SFDMU extraction failed with exit code {result.returncode}"
+                    f"SFDMU extraction failed with exit code {returncode}"
                 )
 
             # Move CSVs to final destination
@@ -1390,6 +1865,7 @@ class ExtractSFDMUData(SFDXBaseTask):
                     reference_plan_dir=reference_plan_dir,
                     code_map_file=code_map_file,
                     copy_to_plan=copy_to_plan,
+                    workers=int(self.options.get("post_process_workers") or 0) or None,
                 )
                 if copy_to_plan:
                     self.logger.info(f"Synced processed extraction into plan dir: {plan_dir}")
@@ -0,0 +1,252 @@
+"""Name->Code backfill maps for SFDMU extractions.
+
+SFDMU blanks some externalId code components to ``#N/A`` on extraction. These
+are the single-hop ``Rel.Field`` components (``Field`` other than ``Name``)
+of objects whose parent is not itself in the plan. ``ExtractSFDMUData``
+restores them from the source org, and :func:`build_code_map` produces the
+``{Object: {"Rel.Field": {Name: Code}}}`` map that
+``scripts/post_process_extraction.py --code-map-file`` consumes:
+
+* each extracted CSV is read once for all of its candidate columns
+  (:func:`blank_columns`);
+* the ``SELECT Rel.Name, Rel.Field FROM Object`` queries run concurrently
+  (``max_workers``). The task sends them through the flow's shared org session
+  (:func:`query_records`, ``tasks/rlm_http.py``), not one ``sf data query``
+  process each;
+* with a ``cache``, each query's map is kept per source org together with the
+  org fingerprint (``tasks/rlm_org_fingerprint.py``) of the queried object and
+  of the parent object the records name. The next extraction from that org
+  reuses the map while both fingerprints are unchanged, so a re-extract of an
+  untouched org runs no map queries. Failed and empty results are never
+  cached.
+
+The backfill is best-effort. A failed query leaves its components blank, as
+an unresolved extraction always did. A failed fingerprint runs every query
+uncached: nothing is read from or written to the cache.
+"""
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple
+
+from tasks import rlm_http, rlm_sfdmu_plan
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(".cci", "sfdmu_code_map")
+DEFAULT_WORKERS = 4
+BLANK_VALUES = ("", "#N/A")  # #N/A is SFDMU's null marker
+
+Fingerprint = Dict[str, Dict[str, Any]]
+
+
+def backfill_candidates(plan: Mapping[str, Any]) -> List[Tuple[str, str]]:
+    """``(object, "Rel.Field")`` externalId components a code map could fill, in plan order."""
+    found: Dict[Tuple[str, str], None] = {}
+    for obj_set in rlm_sfdmu_plan.object_sets(plan):
+        for obj in obj_set.get("objects", []):
+            if obj.get("excluded"):
+                continue
+            objname = rlm_sfdmu_plan.query_sobject(obj.get("query", ""))
+            external_id = obj.get("externalId", "")
+            if not objname or not external_id:
+                continue
+            for comp in external_id.split(";"):
+                comp = comp.strip()
+                if comp.count(".") != 1 or comp.split(".")[1] == "Name":
+                    continue  # only single-hop Rel.Field; nested resolve via fallback
+                found[(objname, comp)] = None
+    return list(found)
+
+
+def blank_columns(path: str, columns: Iterable[str]) -> Set[str]:
+    """Columns of the CSV at ``path`` that are present, have rows, and are all blank / ``#N/A``.
+
+    One pass over the file, whatever the number of columns.
+    """
+    if not os.path.isfile(path):
+        return set()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return set()
+        header = [h.strip().lstrip("﻿").strip().strip('"') for h in header]
+        open_cols = {col: header.index(col) for col in columns if col in header}
+        saw_row = False
+        for row in reader:
+            saw_row = True
+            for col, ci in list(open_cols.items()):
+                if (row[ci] if ci < len(row) else "") not in BLANK_VALUES:
+                    del open_cols[col]
+            if not open_cols:
+                break
+    return set(open_cols) if saw_row else set()
+
+
+def code_map_query(objname: str, comp: str) -> str:
+    rel, field = comp.split(".")
+    return f"SELECT {rel}.Name, {rel}.{field} FROM {objname} WHERE {rel}.{field} != null"
+
+
+def mapping_from_records(records: Iterable[Mapping[str, Any]], comp: str) -> Tuple[Dict[str, str], Optional[str]]:
+    """``({Name: Code}, parent sObject type)``. Names that map to more than one code are dropped."""
+    rel, field = comp.split(".")
+    mapping: Dict[str, str] = {}
+    ambiguous = set()
+    parent_type = None
+    for record in records:
+        nested = record.get(rel) or {}
+        parent_type = parent_type or (nested.get("attributes") or {}).get("type")
+        name_val = nested.get("Name")
+        code_val = nested.get(field)
+        if name_val is None or code_val is None:
+            continue
+        if name_val in mapping and mapping[name_val] != code_val:
+            ambiguous.add(name_val)
+        else:
+            mapping[name_val] = code_val
+    for name in ambiguous:
+        mapping.pop(name, None)  # don't guess when a Name maps to >1 Code
+    return mapping, parent_type
+
+
+def query_records(instance_url: str, access_token: str, soql: str, *, api_version: str = "67.0") -> List[dict]:
+    """All records of a SOQL query over REST, following ``nextRecordsUrl``. Raises on an HTTP error."""
+    base = instance_url.rstrip("/")
+    headers = rlm_http.auth_headers(access_token)
+    resp = rlm_http.get(f"{base}/services/data/v{api_version}/query", headers=headers, params={"q": soql})
+    records: List[dict] = []
+    while True:
+        if resp.status_code != 200:
+            raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+        body = resp.json()
+        records.extend(body.get("records") or [])
+        next_url = body.get("nextRecordsUrl")
+        if not next_url:
+            return records
+        resp = rlm_http.get(f"{base}{next_url}", headers=headers)
+
+
+def load_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("version") != CACHE_VERSION:
+        cache = {"version": CACHE_VERSION, "queries": {}}
+    return cache
+
+
+def save_cache(path: str, cache: Mapping[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**cache, "updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")},
+                  f, separators=(",", ":"), ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _entry_fingerprint(sobjects: Iterable[str], fingerprint: Mapping[str, Any]) -> Optional[Fingerprint]:
+    names = list(sobjects)
+    if any(name not in fingerprint for name in names):
+        return None
+    return {name: dict(fingerprint[name]) for name in names}
+
+
+def build_code_map(plan_dir: str, output_dir: str, query: Callable[[str], List[dict]], *,
+                   max_workers: int = DEFAULT_WORKERS,
+                   cache: Optional[MutableMapping[str, Any]] = None,
+                   fingerprint: Optional[Callable[[List[str]], Fingerprint]] = None,
+                   log: Optional[logging.Logger] = None) -> Dict[str, Dict[str, Dict[str, str]]]:
+    """Code map for the extraction in ``output_dir`` of the plan in ``plan_dir``.
+
+    ``query(soql)`` returns the records (it is called from worker threads).
+    ``cache`` (from :func:`load_cache`) is read and updated in place when
+    ``fingerprint(sobjects)`` is given as well; the caller saves it.
+    """
+    log = log or logging.getLogger(__name__)
+    try:
+        with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+            plan = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    by_object: Dict[str, List[str]] = {}
+    for objname, comp in backfill_candidates(plan):
+        by_object.setdefault(objname, []).append(comp)
+    needed: List[Tuple[str, str, str]] = []
+    for objname, comps in by_object.items():
+        blank = blank_columns(os.path.join(output_dir, f"{objname}.csv"), comps)
+        # Columns SFDMU resolved (or whose target is a plan object) are left alone.
+        needed += [(objname, comp, code_map_query(objname, comp)) for comp in comps if comp in blank]
+    if not needed:
+        return {}
+
+    use_cache = cache is not None and fingerprint is not None
+    entries = cache.setdefault("queries", {}) if use_cache else {}
+    current: Fingerprint = {}
+    if use_cache:
+        watched = {objname for objname, _, _ in needed}
+        watched |= {s for _, _, soql in needed for s in (entries.get(soql) or {}).get("sobjects", [])}
+        try:
+            current = dict(fingerprint(sorted(watched)))
+        except Exception as e:  # best-effort: query everything, cache nothing
+            log.warning(f"Code-map: org fingerprint failed ({e}); running every query uncached")
+            use_cache, entries = False, {}
+
+    results: Dict[str, Tuple[Dict[str, str], Optional[str]]] = {}
+    to_query = []
+    for objname, comp, soql in needed:
+        entry = entries.get(soql)
+        if entry and entry.get("fingerprint") == _entry_fingerprint(entry.get("sobjects", []), current):
+            results[soql] = (entry["mapping"], None)
+        else:
+            to_query.append((objname, comp, soql))
+
+    def run(item: Tuple[str, str, str]) -> Tuple[str, Optional[List[dict]], str]:
+        try:
+            return item[2], query(item[2]), ""
+        except Exception as e:  # best-effort: the components stay blank
+            return item[2], None, str(e)
+
+    started = time.monotonic()
+    fresh: Dict[str, Tuple[str, Dict[str, str], Optional[str]]] = {}
+    if to_query:
+        with ThreadPoolExecutor(max_workers=max(1, min(int(max_workers), len(to_query)))) as pool:
+            for (objname, comp, _), (soql, records, error) in zip(to_query, pool.map(run, to_query)):
+                if records is None:
+                    log.warning(f"Code-map query failed ({soql}): {error}")
+                    continue
+                mapping, parent_type = mapping_from_records(records, comp)
+                results[soql] = (mapping, parent_type)
+                fresh[soql] = (objname, mapping, parent_type)
+
+    if use_cache and fresh:
+        parents = sorted({p for _, _, p in fresh.values() if p and p not in current})
+        try:
+            if parents:
+                current.update(fingerprint(parents))
+        except Exception as e:
+            log.warning(f"Code-map: org fingerprint failed ({e}); new maps are not cached")
+            fresh = {}
+        for soql, (objname, mapping, parent_type) in fresh.items():
+            sobjects = [objname] + ([parent_type] if parent_type and parent_type != objname else [])
+            entry_fp = _entry_fingerprint(sobjects, current)
+            if mapping and entry_fp is not None:
+                entries[soql] = {"sobjects": sobjects, "fingerprint": entry_fp, "mapping": mapping}
+
+    code_map: Dict[str, Dict[str, Dict[str, str]]] = {}
+    for objname, comp, soql in needed:
+        mapping = results.get(soql, ({}, None))[0]
+        if mapping:
+            code_map.setdefault(objname, {})[comp] = mapping
+            rel, field = comp.split(".")
+            log.info(f"Code-map: {objname}.{comp} <- {len(mapping)} {rel}.Name->{field} entries")
+    log.info(f"Code-map: {len(to_query)} quer{'y' if len(to_query) == 1 else 'ies'} "
+             f"({len(needed) - len(to_query)} cached) in {time.monotonic() - started:.1f}s")
+    return code_map
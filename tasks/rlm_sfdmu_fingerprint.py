@@ -0,0 +1,299 @@
+"""Content fingerprints of SFDMU plans and extractions, as Merkle manifests.
+
+A manifest describes every plan under a directory (a directory holding an
+``export.json`` or data CSVs) in three levels:
+
+* each CSV: an order-independent multiset hash of its rows, the row count,
+  and a digest of its column names. Cells are put in column-name order
+  before hashing and the row digests are summed mod 2**256, so neither row
+  order nor column order changes the hash, while a duplicated row does;
+* each object: a hash over its CSVs (the root CSV plus any
+  ``objectset_source/object-set-N/`` copy);
+* each plan: a root hash over its objects. ``export.json`` (without the
+  ``orgs`` block) is hashed on its own, so an extraction and its plan can
+  match on data alone.
+
+:func:`compare_manifests` walks two manifests top-down and only descends
+where hashes differ, so comparing two trees costs O(changed objects) once
+their manifests exist. :func:`cached_manifest` keeps a manifest per
+directory under ``.cci/sfdmu_fingerprint/`` (git-ignored) and only re-reads
+CSVs whose size or mtime moved.
+
+:func:`record_run` / :func:`unchanged_since_run` let ``TestSFDMUIdempotency``
+skip a plan whose content and target org state are exactly what its last
+passing run saw (``.cci/sfdmu_idempotency/<org>.json``).
+"""
+import csv
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from tasks import rlm_sfdmu_overlay
+
+MANIFEST_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(".cci", "sfdmu_fingerprint")
+DEFAULT_RUNS_DIR = os.path.join(".cci", "sfdmu_idempotency")
+SKIP_CSVS = {"MissingParentRecordsReport.csv", "CSVIssuesReport.csv"}
+OBJECTSET_DIR = "objectset_source"
+
+_MODULUS = 1 << 256
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _combine(children: Iterable[Tuple[str, str]]) -> str:
+    """Merkle node: sha256 over the sorted ``(name, child hash)`` pairs."""
+    return _sha256("".join(f"{name}\x00{digest}\n" for name, digest in sorted(children)))
+
+
+def _header(cell: str) -> str:
+    return cell.strip().lstrip("\ufeff").strip().strip('"')
+
+
+def csv_fingerprint(path: str) -> Dict[str, Any]:
+    """``{"rows", "columns", "hash"}`` for one CSV, in one streaming pass. Blank lines are skipped."""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        reader = csv.reader(f)
+        header = [_header(h) for h in next(reader, None) or []]
+        order = sorted(range(len(header)), key=lambda i: header[i])
+        width = len(header)
+        total = rows = 0
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row = row + [""] * (width - len(row))
+            cells = "\x00".join(row[i] for i in order)
+            total += int.from_bytes(hashlib.blake2b(cells.encode("utf-8"), digest_size=32).digest(), "big")
+            rows += 1
+    columns = _sha256("\x00".join(sorted(header)))
+    return {"rows": rows, "columns": columns,
+            "hash": _sha256(f"{columns}\x00{rows}\x00{total % _MODULUS:064x}")}
+
+
+def plan_csvs(plan_dir: str) -> List[str]:
+    """Data CSVs of a plan (``/``-separated, relative): root CSVs, then ``objectset_source`` copies."""
+    found = []
+    if not os.path.isdir(plan_dir):
+        return found
+    for name in sorted(os.listdir(plan_dir)):
+        if name.endswith(".csv") and name not in SKIP_CSVS and os.path.isfile(os.path.join(plan_dir, name)):
+            found.append(name)
+    source = os.path.join(plan_dir, OBJECTSET_DIR)
+    if os.path.isdir(source):
+        for set_dir in sorted(os.listdir(source)):
+            set_path = os.path.join(source, set_dir)
+            if not os.path.isdir(set_path):
+                continue
+            found += [f"{OBJECTSET_DIR}/{set_dir}/{name}" for name in sorted(os.listdir(set_path))
+                      if name.endswith(".csv") and name not in SKIP_CSVS]
+    return found
+
+
+def export_json_hash(plan_dir: str) -> Optional[str]:
+    """sha256 of the plan's export.json without its ``orgs`` block; None without one (or unreadable)."""
+    try:
+        with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+            plan = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return _sha256(json.dumps({k: v for k, v in plan.items() if k != "orgs"}, sort_keys=True))
+
+
+def fingerprint_plan(plan_dir: str, previous: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Manifest entry for one plan directory.
+
+    CSVs whose size and mtime match their entry in ``previous`` (an earlier
+    result for the same directory) are not read again. An overlay plan is
+    fingerprinted as the full plan it materializes to.
+    """
+    plan_dir = rlm_sfdmu_overlay.materialize(plan_dir)
+    old_files: Dict[str, Any] = {}
+    for obj in ((previous or {}).get("objects") or {}).values():
+        old_files.update(obj.get("files") or {})
+    objects: Dict[str, Dict[str, Any]] = {}
+    for rel in plan_csvs(plan_dir):
+        stat = os.stat(os.path.join(plan_dir, *rel.split("/")))
+        old = old_files.get(rel)
+        if old and old.get("size") == stat.st_size and old.get("mtime_ns") == stat.st_mtime_ns:
+            entry = dict(old)
+        else:
+            entry = {**csv_fingerprint(os.path.join(plan_dir, *rel.split("/"))),
+                     "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        objects.setdefault(rel.rsplit("/", 1)[-1][:-4], {"files": {}})["files"][rel] = entry
+    for obj in objects.values():
+        obj["hash"] = _combine((rel, f["hash"]) for rel, f in obj["files"].items())
+        obj["rows"] = sum(f["rows"] for f in obj["files"].values())
+    return {
+        "root": _combine((name, obj["hash"]) for name, obj in objects.items()),
+        "export_json": export_json_hash(plan_dir),
+        "objects": dict(sorted(objects.items())),
+    }
+
+
+def is_plan_dir(path: str) -> bool:
+    if os.path.isfile(os.path.join(path, "export.json")) or rlm_sfdmu_overlay.is_overlay(path):
+        return True
+    return any(name.endswith(".csv") and name not in SKIP_CSVS for name in os.listdir(path))
+
+
+def find_plans(base_dir: str) -> List[str]:
+    """Plan directories under ``base_dir`` (``/``-separated, relative; ``.`` for base_dir itself)."""
+    if is_plan_dir(base_dir):
+        return ["."]
+    found = []
+    for root, dirs, _ in os.walk(base_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith((".", "_")))
+        keep = []
+        for d in dirs:
+            path = os.path.join(root, d)
+            if is_plan_dir(path):
+                found.append(os.path.relpath(path, base_dir).replace(os.sep, "/"))
+            else:
+                keep.append(d)  # plans do not nest; only descend into the rest
+        dirs[:] = keep
+    return sorted(found)
+
+
+def build_manifest(base_dir: str, previous: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Manifest of every plan under ``base_dir``; see :func:`fingerprint_plan` for ``previous``."""
+    old_plans = (previous or {}).get("plans") or {}
+    plans = {rel: fingerprint_plan(os.path.join(base_dir, rel), old_plans.get(rel)) for rel in find_plans(base_dir)}
+    return {
+        "version": MANIFEST_VERSION,
+        "base": os.path.normpath(base_dir).replace(os.sep, "/"),
+        "root": _combine((rel, plan["root"]) for rel, plan in plans.items()),
+        "plans": plans,
+    }
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """The manifest at ``path``; {} when missing, unreadable or of another version."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def save_manifest(path: str, manifest: Mapping[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**manifest, "updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")},
+                  f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def cache_path(cache_dir: str, base_dir: str) -> str:
+    slug = os.path.abspath(base_dir).replace(os.sep, "__").replace(":", "").strip("._") or "root"
+    return os.path.join(cache_dir, f"{slug}.json")
+
+
+def cached_manifest(base_dir: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Dict[str, Any]:
+    """:func:`build_manifest` re-using (and refreshing) the cached manifest of ``base_dir``."""
+    path = cache_path(cache_dir, base_dir)
+    manifest = build_manifest(base_dir, load_manifest(path))
+    try:
+        save_manifest(path, manifest)
+    except OSError:
+        pass  # a read-only checkout only loses the cache
+    return manifest
+
+
+def plan_state(plan: Mapping[str, Any]) -> str:
+    """One hash for a plan's data and export.json, from a :func:`fingerprint_plan` result."""
+    return _sha256(f"{plan['root']}\x00{plan.get('export_json') or ''}")
+
+
+def load_runs(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            runs = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return runs if runs.get("version") == MANIFEST_VERSION else {}
+
+
+def unchanged_since_run(path: str, plan_dir: str, plan: Mapping[str, Any], org_state: str,
+                        context: Mapping[str, Any]) -> bool:
+    """Whether the run recorded for ``plan_dir`` saw the same plan, org state and context."""
+    entry = (load_runs(path).get("plans") or {}).get(os.path.normpath(plan_dir))
+    return bool(entry) and entry.get("plan") == plan_state(plan) and entry.get("org") == org_state \
+        and entry.get("context") == dict(context)
+
+
+def record_run(path: str, plan_dir: str, plan: Mapping[str, Any], org_state: str,
+               context: Mapping[str, Any]) -> None:
+    """Remember a passing run of ``plan_dir`` (see :func:`unchanged_since_run`)."""
+    runs = load_runs(path) or {"version": MANIFEST_VERSION, "plans": {}}
+    runs.setdefault("plans", {})[os.path.normpath(plan_dir)] = {
+        "plan": plan_state(plan), "org": org_state, "context": dict(context),
+        "passed": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+    save_manifest(path, runs)
+
+
+def _compare_objects(left: Mapping[str, Any], right: Mapping[str, Any]) -> Dict[str, Any]:
+    changed: Dict[str, Any] = {}
+    for name in sorted(set(left) | set(right)):
+        a, b = left.get(name), right.get(name)
+        if a is not None and b is not None and a["hash"] == b["hash"]:
+            continue
+        entry: Dict[str, Any] = {"status": "added" if a is None else "removed" if b is None else "changed",
+                                 "rows": [a["rows"] if a else None, b["rows"] if b else None]}
+        if a is not None and b is not None:
+            files = {}
+            for rel in sorted(set(a["files"]) | set(b["files"])):
+                fa, fb = a["files"].get(rel), b["files"].get(rel)
+                if fa is None or fb is None:
+                    files[rel] = "added" if fa is None else "removed"
+                elif fa["hash"] != fb["hash"]:
+                    files[rel] = "columns" if fa["columns"] != fb["columns"] else "rows"
+            entry["files"] = files
+        changed[name] = entry
+    return changed
+
+
+def compare_manifests(left: Mapping[str, Any], right: Mapping[str, Any]) -> Dict[str, Any]:
+    """What differs from ``left`` to ``right``, descending only into plans and objects whose hash moved.
+
+    ``{"same", "plans": {plan: {"status", "export_json", "objects"}}, "unchanged_plans"}``.
+    A plan counts as changed when its data or its export.json differs.
+    """
+    left_plans, right_plans = left.get("plans") or {}, right.get("plans") or {}
+    same_root = left.get("root") == right.get("root")
+    plans: Dict[str, Any] = {}
+    unchanged = 0
+    for rel in sorted(set(left_plans) | set(right_plans)):
+        a, b = left_plans.get(rel), right_plans.get(rel)
+        if a is None or b is None:
+            plans[rel] = {"status": "added" if a is None else "removed"}
+            continue
+        export_changed = bool(a.get("export_json") and b.get("export_json")
+                              and a["export_json"] != b["export_json"])
+        if a["root"] == b["root"] and not export_changed:
+            unchanged += 1
+            continue
+        plans[rel] = {"status": "changed", "export_json": export_changed,
+                      "objects": _compare_objects(a["objects"], b["objects"]) if a["root"] != b["root"] else {}}
+    return {"same": same_root and not plans, "plans": plans, "unchanged_plans": unchanged}
+
+
+def summary_lines(diff: Mapping[str, Any]) -> List[str]:
+    """Human-readable lines for a :func:`compare_manifests` result."""
+    if diff["same"]:
+        return [f"Fingerprints match ({diff['unchanged_plans']} plan(s))."]
+    lines = [f"{len(diff['plans'])} plan(s) differ, {diff['unchanged_plans']} unchanged."]
+    for rel, plan in diff["plans"].items():
+        lines.append(f"  {rel}: {plan['status']}" + (" (export.json changed)" if plan.get("export_json") else ""))
+        for name, obj in (plan.get("objects") or {}).items():
+            rows = " -> ".join("-" if n is None else str(n) for n in obj["rows"])
+            files = ", ".join(f"{rel_path} ({what})" for rel_path, what in (obj.get("files") or {}).items())
+            lines.append(f"    {name}: {obj['status']}, rows {rows}" + (f"; {files}" if files else ""))
+    return lines
@@ -0,0 +1,326 @@
+"""Per-org load ledger for change-only SFDMU reloads.
+
+After a successful ``LoadSFDMUData`` run the task records, per org and plan,
+a content hash for every CSV row it loaded, keyed by the row's externalId
+(composite keys included, read as in ``tasks/rlm_sfdmu_native.py``). It also
+records the org fingerprint of the plan's objects (``tasks/rlm_org_fingerprint.py``).
+The next run writes a filtered copy of the plan (:func:`build_differential_plan`):
+
+* an object with no new or changed rows becomes ``Readonly``. Its CSV stays
+  complete, so SFDMU can still resolve lookups into it;
+* an object with changes keeps only the new and changed rows. The exceptions
+  load their full CSV: ``deleteOldData`` objects (a partial file would delete
+  the rest), and objects that a changed object in the same set looks up,
+  wherever the plan lists them (SFDMU resolves lookups through the source CSV);
+* an object whose fingerprint moved since the ledger was written (someone
+  edited or deleted data in the org), or is missing on either side (the
+  count failed, so the org state is unknown), a CSV the ledger has never
+  seen, and any change to export.json all mean a full load.
+
+The native engine resolves lookups in the org, so there every changed object
+is filtered.
+
+SFDMU can exit 0 and still leave rows unloaded: a lookup it could not resolve
+goes to MissingParentRecordsReport.csv, and a rejected row gets an ``Errors``
+cell in ``target/<Object>_<Operation>_target.csv``. :func:`failed_sobjects`
+reads those reports after a CLI run. The rows of the objects they name are
+left out of the ledger, so the next run loads them in full again. Ledgers live under ``.cci/sfdmu_ledger/<org>/`` (git-ignored).
+``force: true`` on the task ignores the ledger for one run and rewrites it.
+"""
+import csv
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple
+
+from tasks import rlm_sfdmu_plan
+from tasks.rlm_sfdmu_native import KeyReader, csv_path, key_components
+
+LEDGER_VERSION = 1
+DEFAULT_LEDGER_DIR = os.path.join(".cci", "sfdmu_ledger")
+
+_WRITE_OPS = {"insert", "upsert", "update"}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _keyed_rows(path: str, external_id: str) -> Iterator[Tuple[str, str, List[str]]]:
+    """``(row key, content hash, raw cells)`` per non-blank data row of one CSV.
+
+    Cells are read as ``read_csv`` reads them. A row without a usable key is
+    keyed by its own hash, so an edit to it shows up as one new row.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().strip('"') for h in next(reader, [])]
+        key_of = KeyReader(header, key_components(external_id)) if external_id else None
+        for values in reader:
+            if not any(v.strip() for v in values):
+                continue
+            row = dict(zip(header, ("" if v == "#N/A" else v for v in values)))
+            content = _digest(json.dumps(sorted(row.items()), separators=(",", ":")))[:24]
+            key = key_of(row) if key_of and key_of.usable else None
+            yield ("\x1f".join(key) if key else f"#{content}"), content, values
+
+
+def row_hashes(path: str, external_id: str) -> Dict[str, str]:
+    """``row key -> content hash`` for one CSV."""
+    return {key: content for key, content, _ in _keyed_rows(path, external_id)}
+
+
+def plan_hash(plan: Mapping[str, Any]) -> str:
+    return _digest(json.dumps({k: v for k, v in plan.items() if k != "orgs"}, sort_keys=True))
+
+
+def ledger_path(ledger_dir: str, org_key: str, plan_dir: str) -> str:
+    slug = os.path.normpath(plan_dir).replace(os.sep, "__").strip("._") or "plan"
+    return os.path.join(ledger_dir, org_key, f"{slug}.json")
+
+
+def load_ledger(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            ledger = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return ledger if ledger.get("version") == LEDGER_VERSION else {}
+
+
+def _write_entries(plan: Mapping[str, Any], plan_dir: str, selected: Optional[Sequence[int]]):
+    """``(set_index, object dict, csv relpath)`` for each write object that has a CSV."""
+    sets = rlm_sfdmu_plan.object_sets(plan)
+    indices = range(len(sets)) if selected is None else [i for i in selected if 0 <= i < len(sets)]
+    for set_index in indices:
+        for obj in sets[set_index].get("objects", []):
+            if obj.get("excluded"):
+                continue
+            if str(obj.get("operation") or "Upsert").lower() not in _WRITE_OPS:
+                continue
+            sobject = rlm_sfdmu_plan.query_sobject(obj.get("query", ""))
+            path = csv_path(plan_dir, set_index, sobject) if sobject else None
+            if path:
+                yield set_index, obj, os.path.relpath(path, plan_dir)
+
+
+def scan_plan(plan_dir: str, selected: Optional[Sequence[int]] = None) -> Dict[str, Any]:
+    """What a load of ``plan_dir`` would write, for comparing with and updating a ledger.
+
+    ``plan_hash`` and ``sobjects`` cover the whole plan and the write objects of
+    the selected sets. ``current`` maps each selected write CSV (relative path)
+    to its row hashes. Take it before the task rewrites export.json for the run.
+    """
+    with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+        plan = json.load(f)
+    entries = list(_write_entries(plan, plan_dir, selected))
+    return {
+        "plan": plan,
+        "plan_hash": plan_hash(plan),
+        "entries": entries,
+        "sobjects": list(dict.fromkeys(rlm_sfdmu_plan.query_sobject(obj["query"]) for _, obj, _ in entries)),
+        "current": {rel: row_hashes(os.path.join(plan_dir, rel), obj.get("externalId") or "")
+                    for _, obj, rel in entries},
+    }
+
+
+def _lookup_parents(obj: Mapping[str, Any], sobject: str, sobjects: Set[str]) -> Set[str]:
+    """Objects of ``sobjects`` that the plan object's lookups point at.
+
+    Lookup paths (``Family__r.Code``) and lookup fields (``Product2Id``,
+    ``Family__c``) both count. A relationship the names do not settle counts
+    every object it could mean.
+    """
+    found: Set[str] = set()
+    paths = rlm_sfdmu_plan.query_fields(obj.get("query", ""))
+    paths += (obj.get("externalId") or "").replace("$", ";").split(";")
+    for field in [p.strip() for p in paths if "." not in p]:
+        if len(field) > 2 and field.endswith("Id"):
+            paths.append(f"{field[:-2]}.Id")
+        elif field.endswith("__c"):
+            paths.append(f"{field[:-3]}__r.Id")
+    for path in paths:
+        current = sobject
+        for rel in [part.strip() for part in path.split(".")[:-1]]:
+            target = rlm_sfdmu_plan.relationship_sobject(rel, sobjects, current)
+            if not target:
+                found |= {name for name in sobjects if rlm_sfdmu_plan.relationship_score(rel, name)}
+                break
+            found.add(target)
+            current = target
+    return found
+
+
+def build_differential_plan(plan_dir: str, out_dir: str, scan: Mapping[str, Any],
+                            ledger: Mapping[str, Any], fingerprint: Mapping[str, Mapping[str, Any]], *,
+                            lookups_from_org: bool = False) -> Dict[str, Any]:
+    """Write the change-only copy of ``plan_dir`` (as scanned by :func:`scan_plan`) to ``out_dir``.
+
+    Returns ``changed`` (False when nothing needs loading, in which case
+    ``out_dir`` is not written), per-object ``objects`` statuses
+    (``unchanged`` / ``partial`` / ``full`` with a reason) and row totals.
+    """
+    plan, current = scan["plan"], scan["current"]
+    known_files = ledger.get("files") or {}
+    known_prints = ledger.get("fingerprint") or {}
+    plan_changed = ledger.get("plan_hash") != scan["plan_hash"]
+
+    decisions: List[Dict[str, Any]] = []
+    for set_index, obj, rel in scan["entries"]:
+        sobject = rlm_sfdmu_plan.query_sobject(obj["query"])
+        previous = known_files.get(rel)
+        changed = [k for k, h in current[rel].items() if previous is None or previous.get(k) != h]
+        if plan_changed:
+            status, reason = "full", "export.json changed"
+        elif previous is None:
+            status, reason = "full", "not in ledger"
+        elif not known_prints.get(sobject) or not fingerprint.get(sobject):
+            status, reason = "full", "org state unknown"
+        elif dict(known_prints[sobject]) != dict(fingerprint[sobject]):
+            status, reason = "full", "org data changed since last load"
+        elif not changed:
+            status, reason = "unchanged", ""
+        elif obj.get("deleteOldData"):
+            status, reason = "full", "deleteOldData"
+        else:
+            status, reason = "partial", ""
+        decisions.append({"set": set_index, "sobject": sobject, "file": rel, "obj": obj,
+                          "status": status, "reason": reason, "changed": set(changed),
+                          "rows": len(current[rel])})
+
+    if not lookups_from_org:
+        # SFDMU maps lookups through the source CSV: a parent that a changed object
+        # in the same set references, before or after it in the plan, must keep every row.
+        set_objects: Dict[int, Set[str]] = {}
+        for decision in decisions:
+            set_objects.setdefault(decision["set"], set()).add(decision["sobject"])
+        parents = [_lookup_parents(d["obj"], d["sobject"], set_objects[d["set"]]) for d in decisions]
+        for decision in decisions:
+            if decision["status"] != "partial":
+                continue
+            if any(other["set"] == decision["set"] and other["status"] != "unchanged"
+                   and decision["sobject"] in targets for other, targets in zip(decisions, parents)):
+                decision["status"], decision["reason"] = "full", "parent of a changed object"
+
+    # Several objects can share one CSV: the widest need wins.
+    by_file: Dict[str, Dict[str, Any]] = {}
+    for decision in decisions:
+        need = by_file.setdefault(decision["file"], {"full": False, "keys": set(),
+                                                     "external_id": decision["obj"].get("externalId") or ""})
+        need["full"] |= decision["status"] == "full"
+        need["keys"] |= decision["changed"] if decision["status"] == "partial" else set()
+
+    summary = {
+        "changed": any(d["status"] != "unchanged" for d in decisions),
+        "objects": [{k: d[k] for k in ("set", "sobject", "file", "status", "reason", "rows")}
+                    | {"changed_rows": len(d["changed"])} for d in decisions],
+        "rows_total": sum(d["rows"] for d in decisions),
+        "rows_loaded": sum(d["rows"] if d["status"] == "full" else
+                           len(d["changed"]) if d["status"] == "partial" else 0 for d in decisions),
+    }
+    if not summary["changed"]:
+        return summary
+
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    shutil.copytree(plan_dir, out_dir)
+    for rel, need in by_file.items():
+        if need["full"] or not need["keys"]:
+            continue
+        _filter_csv(os.path.join(out_dir, rel), need["external_id"], need["keys"])
+
+    unchanged = {(d["set"], id(d["obj"])) for d in decisions if d["status"] == "unchanged"}
+    new_plan = json.loads(json.dumps(plan))
+    for set_index, obj_set in enumerate(rlm_sfdmu_plan.object_sets(plan)):
+        targets = rlm_sfdmu_plan.object_sets(new_plan)[set_index].get("objects", [])
+        for original, copy in zip(obj_set.get("objects", []), targets):
+            if (set_index, id(original)) in unchanged:
+                copy["operation"] = "Readonly"
+                copy.pop("deleteOldData", None)
+    with open(os.path.join(out_dir, "export.json"), "w", encoding="utf-8") as f:
+        json.dump(new_plan, f, indent=2)
+    return summary
+
+
+def _filter_csv(path: str, external_id: str, keep: Set[str]) -> None:
+    """Rewrite ``path`` with its header and only the rows whose key is in ``keep``."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    kept = [values for key, _, values in _keyed_rows(path, external_id) if key in keep]
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(kept)
+
+
+def _report_rows(path: str, since: float) -> Iterator[Dict[str, str]]:
+    """Data rows of an SFDMU report CSV written at or after ``since`` (none for an older or missing file)."""
+    try:
+        if os.path.getmtime(path) < since:
+            return
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [h.strip().strip('"') for h in next(reader, [])]
+            for values in reader:
+                if any(v.strip() for v in values):
+                    yield dict(zip(header, values))
+    except OSError:
+        return
+
+
+def failed_sobjects(run_dir: str, sobjects: Sequence[str], since: float) -> Set[str]:
+    """Objects of ``sobjects`` with rows an SFDMU run in ``run_dir`` (started at ``since``) did not load.
+
+    A MissingParentRecordsReport.csv row counts against its child object, or
+    against every object when the report does not say which. A target CSV
+    row with an ``Errors`` cell counts against the target's object.
+    """
+    failed: Set[str] = set()
+    wanted = set(sobjects)
+    for row in _report_rows(os.path.join(run_dir, "MissingParentRecordsReport.csv"), since):
+        child = next((v for k, v in row.items() if "child" in k.lower() and "object" in k.lower()), "").strip()
+        failed |= {child} if child in wanted else wanted
+    target_dir = os.path.join(run_dir, "target")
+    names = sorted(os.listdir(target_dir)) if os.path.isdir(target_dir) else []
+    for name in names:
+        if not name.endswith("_target.csv"):
+            continue
+        sobject = name[:-len("_target.csv")].rsplit("_", 1)[0]
+        if sobject in wanted and any(v.strip() for row in _report_rows(os.path.join(target_dir, name), since)
+                                     for k, v in row.items() if k.lower() == "errors"):
+            failed.add(sobject)
+    return failed
+
+
+def record_load(path: str, scan: Mapping[str, Any], fingerprint: Mapping[str, Mapping[str, Any]], *,
+                previous: Mapping[str, Any], failed: Iterable[str] = ()) -> None:
+    """Store the rows just loaded and the org fingerprint taken after the load.
+
+    The CSVs of ``failed`` objects are dropped from the ledger, so the next
+    run loads them in full.
+    """
+    failed = set(failed)
+    skipped = {rel for _, obj, rel in scan["entries"] if rlm_sfdmu_plan.query_sobject(obj["query"]) in failed}
+    files = dict(previous.get("files") or {}) if previous.get("plan_hash") == scan["plan_hash"] else {}
+    files.update({rel: dict(rows) for rel, rows in scan["current"].items()})
+    files = {rel: rows for rel, rows in files.items() if rel not in skipped}
+    ledger = {
+        "version": LEDGER_VERSION,
+        "plan_hash": scan["plan_hash"],
+        "updated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "files": files,
+        "fingerprint": {**(previous.get("fingerprint") or {}),
+                        **{k: dict(v) for k, v in fingerprint.items()}},
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def org_key(org_id: Optional[str], instance_url: str, username: str = "") -> str:
+    """Ledger directory name: the org id when known, else a digest of instance URL + user."""
+    return org_id or _digest(f"{instance_url.rstrip('/')}|{username}")[:16]
@@ -0,0 +1,767 @@
+"""In-process loader for SFDMU plans: the same export.json and CSVs, no Node.
+
+``LoadSFDMUData`` with ``engine: native`` runs :class:`NativeSfdmuLoader`
+instead of ``sf sfdmu run``. It covers the plan features the
+``datasets/sfdmu`` plans use:
+
+* ``objectSets`` in order (a flat ``objects`` plan is one set), with the
+  task's ``object_sets`` selection. Set N reads
+  ``objectset_source/object-set-N/<Object>.csv`` when that file exists,
+  else the plan-root CSV;
+* ``Insert`` / ``Upsert`` / ``Update`` with ``skipExistingRecords`` and
+  ``deleteOldData``. ``Readonly`` objects are not written. Their records are
+  looked up in the org like any other parent. A missing operation means
+  ``Upsert``, as in ``scripts/post_process_extraction.py``;
+* ``externalId`` keys, composite ones included (``A;B.C``). The key is read
+  from the ``$$A$B.C`` column, or from the component columns;
+* lookup columns ``Rel.Field`` and ``Rel.$$A$B``. Each column costs one
+  IN-query on the parent (chunked), whose rows land in a key -> Id map.
+  SFDMU instead resolves keys record by record on every run.
+
+Only fields named in the object's SELECT are written, and the describe's
+``createable`` / ``updateable`` flags are honoured. Matched rows whose values
+already equal the org's are skipped, so a re-run of an unchanged plan writes
+nothing. Writes go through sObject Collections (200 per call,
+``parallel_batches`` calls in flight), or through Bulk API 2.0 at or above
+the bulk threshold (``tasks/rlm_bulk.py``). Within a set, objects that do not
+look each other up load concurrently (``parallel_objects``), level by level
+(:func:`tasks.rlm_sfdmu_plan.dependency_levels`).
+
+:meth:`NativeSfdmuLoader.run` returns a JSON-ready report: per-object row
+counts and timings, plus API calls by kind.
+"""
+import csv
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from tasks import rlm_http, rlm_sfdmu_plan
+from tasks.rlm_bulk import BulkApi2, BulkApiError, bulk_threshold, prefer_bulk
+
+BATCH_SIZE = 200  # sObject Collections limit
+IN_CHUNK_CHARS = 4000  # literal text per IN (...) clause; keeps GET URLs short
+DEFAULT_PARALLEL_OBJECTS = 4
+DEFAULT_PARALLEL_BATCHES = 4
+
+_NA = "#N/A"
+_WRITE_OPS = {"insert", "upsert", "update"}
+_WHERE_RE = re.compile(r"\sFROM\s+\w+\s+WHERE\s+(.*?)(?:\s+ORDER\s+BY\s.*|\s+LIMIT\s.*)?$",
+                       re.IGNORECASE | re.DOTALL)
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+_INT_TYPES = {"int", "long"}
+_FLOAT_TYPES = {"double", "currency", "percent"}
+_TEXT_TYPES = {"string", "picklist", "multipicklist", "combobox", "email", "phone", "url",
+               "textarea", "id", "reference"}
+_MAX_LOGGED_ERRORS = 10
+
+
+class NativeLoadError(RuntimeError):
+    """The plan cannot be loaded as written (bad selection, describe or query failure)."""
+
+
+# ----- values and keys ----------------------------------------------------------------
+
+def normalize(value: Any) -> str:
+    """One text form for comparing CSV cells with org values (``25.0`` == ``25``, ``TRUE`` == ``true``)."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    text = str(value)
+    if text.lower() in ("true", "false"):
+        return text.lower()
+    if isinstance(value, (int, float)) or _NUMBER_RE.match(text):
+        try:
+            return format(Decimal(text).normalize(), "f")
+        except InvalidOperation:
+            return text
+    return text
+
+
+def key_components(spec: str) -> List[str]:
+    """``A;B.C`` (externalId) or ``$$A$B.C`` (CSV header) -> ``["A", "B.C"]``."""
+    spec = spec.strip()
+    if spec.startswith("$$"):
+        return [part for part in spec[2:].split("$") if part]
+    return [part.strip() for part in spec.split(";") if part.strip()]
+
+
+def lookup_column(column: str) -> Optional[Tuple[str, List[str]]]:
+    """``Rel.Field`` / ``Rel.$$A$B`` -> ``("Rel", components)``; None for plain columns."""
+    if column.startswith("$$") or "." not in column:
+        return None
+    rel, rest = column.split(".", 1)
+    return rel, (key_components(rest) if rest.startswith("$$") else [rest])
+
+
+def record_value(record: Dict[str, Any], path: str) -> Any:
+    """Walk ``A.B.C`` through a REST record (nested dicts) or a Bulk row (flat keys)."""
+    if path in record:
+        return record[path]
+    node: Any = record
+    for part in path.split("."):
+        if not isinstance(node, dict):
+            return None
+        if part in node:
+            node = node[part]
+            continue
+        lowered = part.lower()
+        node = next((v for k, v in node.items() if k.lower() == lowered), None)
+    return node
+
+
+def where_clause(query: str) -> str:
+    m = _WHERE_RE.search(query or "")
+    return m.group(1).strip() if m else ""
+
+
+def soql_literal(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def read_csv(path: str) -> Tuple[List[str], List[Dict[str, str]]]:
+    """Header + rows; ``#N/A`` cells read as empty, blank lines are dropped."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().strip('"') for h in next(reader, [])]
+        rows = [dict(zip(header, ("" if v == _NA else v for v in values)))
+                for values in reader if any(v.strip() for v in values)]
+    return header, rows
+
+
+def csv_path(plan_dir: str, set_index: int, sobject: str) -> Optional[str]:
+    """``objectset_source/object-set-<N>/`` override for 0-based ``set_index``, else the plan root."""
+    for candidate in (
+        os.path.join(plan_dir, "objectset_source", f"object-set-{set_index + 1}", f"{sobject}.csv"),
+        os.path.join(plan_dir, f"{sobject}.csv"),
+    ):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+class KeyReader:
+    """Reads a key (a list of component paths) off CSV rows.
+
+    A ``$$`` column with exactly those components wins. Otherwise each
+    component comes from its own column, or from its position inside any
+    ``$$`` column that carries it.
+    """
+
+    def __init__(self, header: Sequence[str], components: Sequence[str]):
+        self.components = list(components)
+        wanted = [c.lower() for c in components]
+        composites = {col: [c.lower() for c in key_components(col)]
+                      for col in header if col.startswith("$$")}
+        direct = {col.lower(): col for col in header if not col.startswith("$$")}
+        self.sources: Optional[List[Tuple[str, int, int]]] = []
+        for col, parts in composites.items():
+            if parts == wanted:
+                self.sources = [(col, i, len(parts)) for i in range(len(parts))]
+                return
+        for comp in wanted:
+            if comp in direct:
+                self.sources.append((direct[comp], -1, 0))
+                continue
+            found = next(((col, parts.index(comp), len(parts))
+                          for col, parts in composites.items() if comp in parts), None)
+            if found is None:
+                self.sources = None
+                return
+            self.sources.append(found)
+
+    @property
+    def usable(self) -> bool:
+        return bool(self.sources)
+
+    def __call__(self, row: Dict[str, str]) -> Optional[Tuple[str, ...]]:
+        if not self.sources:
+            return None
+        values = []
+        for col, index, width in self.sources:
+            cell = row.get(col, "")
+            if index >= 0:
+                parts = cell.split(";")
+                if len(parts) != width:
+                    return None
+                cell = parts[index]
+            values.append(normalize(cell))
+        return tuple(values) if any(values) else None
+
+
+# ----- org access -----------------------------------------------------------------------
+
+class _Fields:
+    """Describe lookups; a describe without types (the stand-in) allows everything."""
+
+    def __init__(self, describe: Dict[str, Any]):
+        fields = describe.get("fields") or []
+        self.by_name = {str(f.get("name", "")).lower(): f for f in fields}
+        self.by_relationship = {str(f["relationshipName"]).lower(): f for f in fields
+                                if f.get("relationshipName")}
+        self.typed = any("type" in f for f in fields)
+
+    def name(self, field: str) -> str:
+        return (self.by_name.get(field.lower()) or {}).get("name") or field
+
+    def reference(self, relationship: str) -> Optional[Dict[str, Any]]:
+        found = self.by_relationship.get(relationship.lower())
+        if found:
+            return found
+        lowered = relationship.lower()
+        guess = relationship[:-3] + "__c" if lowered.endswith("__r") else relationship + "Id"
+        found = self.by_name.get(guess.lower())
+        if found or self.typed:
+            return found
+        return {"name": guess}
+
+    def writable(self, field: str, creating: bool) -> bool:
+        found = self.by_name.get(field.lower())
+        if found is None:
+            return not self.typed
+        return bool(found.get("createable" if creating else "updateable", True))
+
+    def is_text(self, field: str) -> bool:
+        found = self.by_name.get(field.lower())
+        return found is None or "type" not in found or found["type"] in _TEXT_TYPES
+
+    def convert(self, field: str, text: str) -> Any:
+        if text == "":
+            return None
+        kind = (self.by_name.get(field.lower()) or {}).get("type")
+        try:
+            if kind == "boolean":
+                return text.strip().lower() == "true"
+            if kind in _INT_TYPES:
+                return int(Decimal(text))
+            if kind in _FLOAT_TYPES:
+                return float(text)
+        except (ValueError, InvalidOperation):
+            return text
+        return text
+
+
+class _Org:
+    """REST calls for one load, counted by kind for the report."""
+
+    def __init__(self, instance_url: str, access_token: str, api_version: str):
+        self.instance_url = instance_url.rstrip("/")
+        self.access_token = access_token
+        self.api_version = str(api_version).lstrip("v")
+        self.base = f"{self.instance_url}/services/data/v{self.api_version}"
+        self.headers = rlm_http.auth_headers(access_token)
+        self.calls: Counter = Counter()
+        self._lock = threading.Lock()
+        self._describes: Dict[str, Any] = {}
+
+    def _count(self, kind: str) -> None:
+        with self._lock:
+            self.calls[kind] += 1
+
+    def describe(self, sobject: str) -> _Fields:
+        key = sobject.lower()
+        with self._lock:
+            cached = self._describes.get(key)
+        if cached is None:
+            self._count("describe")
+            resp = rlm_http.get(f"{self.base}/sobjects/{sobject}/describe", headers=self.headers)
+            if resp.status_code != 200:
+                raise NativeLoadError(f"Describe {sobject} failed ({resp.status_code}): {resp.text[:300]}")
+            cached = _Fields(resp.json())
+            with self._lock:
+                self._describes[key] = cached
+        return cached
+
+    def query(self, soql: str) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        url, params = f"{self.base}/query", {"q": soql}
+        while url:
+            self._count("query")
+            resp = rlm_http.get(url, headers=self.headers, params=params)
+            if resp.status_code != 200:
+                raise NativeLoadError(f"Query failed ({resp.status_code}): {resp.text[:300]} [{soql[:200]}]")
+            body = resp.json()
+            records.extend(body.get("records") or [])
+            next_url = body.get("nextRecordsUrl")
+            url, params = (f"{self.instance_url}{next_url}" if next_url else None), None
+        return records
+
+    def collection(self, method: str, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One sObject Collections call; returns one result per record."""
+        self._count(f"collection_{method.lower()}")
+        url = f"{self.base}/composite/sobjects"
+        if method == "DELETE":
+            resp = rlm_http.delete(url, headers=self.headers, params={
+                "ids": ",".join(r["Id"] for r in records), "allOrNone": "false"})
+        else:
+            resp = rlm_http.request(method, url, headers=self.headers,
+                                    json={"allOrNone": False, "records": records})
+        if resp.status_code != 200:
+            error = [{"message": f"{method} composite/sobjects failed ({resp.status_code}): {resp.text[:300]}"}]
+            return [{"success": False, "errors": error} for _ in records]
+        return resp.json()
+
+    def bulk(self) -> BulkApi2:
+        self._count("bulk_job")
+        return BulkApi2(self.instance_url, self.access_token, self.api_version)
+
+
+# ----- one plan object ------------------------------------------------------------------
+
+class _ObjectLoad:
+    """One write object of one object set: CSV rows -> org records."""
+
+    def __init__(self, loader: "NativeSfdmuLoader", set_index: int, spec: Dict[str, Any]):
+        self.loader = loader
+        self.org = loader.org
+        self.log = loader.log
+        self.set_index = set_index
+        self.query = spec.get("query", "")
+        self.sobject = rlm_sfdmu_plan.query_sobject(self.query) or ""
+        self.operation = str(spec.get("operation") or "Upsert").lower()
+        self.external_id = key_components(spec.get("externalId") or "")
+        self.skip_existing = bool(spec.get("skipExistingRecords"))
+        self.delete_old = bool(spec.get("deleteOldData"))
+        self.where = where_clause(self.query)
+        select = [f.lower() for f in rlm_sfdmu_plan.query_fields(self.query)]
+        self.select_all = bool({"all", "readonly_false"} & set(select))
+        self.select = set(select)
+        self.path = csv_path(loader.plan_dir, set_index, self.sobject)
+        self.header: List[str] = []
+        self.rows: List[Dict[str, str]] = []
+        self.fields: Optional[_Fields] = None
+        self.lookups: Dict[str, Tuple[str, List[str], str, str]] = {}  # rel -> column, comps, field, target
+        self.stats: Dict[str, Any] = {
+            "set": set_index, "sobject": self.sobject, "operation": spec.get("operation") or "Upsert",
+            "rows": 0, "created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "failed": 0,
+            "unresolved_lookups": 0, "deleted": 0, "seconds": 0.0,
+        }
+        self._errors = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.sobject} [{self.stats['operation']}]"
+
+    # -- preparation (concurrent across the set) --
+    def prepare(self, set_sobjects: Set[str]) -> None:
+        if self.path is None:
+            self.log.warning(f"{self.label}: no CSV found; nothing to load.")
+            return
+        self.header, self.rows = read_csv(self.path)
+        self.stats["rows"] = len(self.rows)
+        self.fields = self.org.describe(self.sobject)
+        for column in self.header:
+            parsed = lookup_column(column)
+            if parsed is None:
+                continue
+            rel, comps = parsed
+            if rel.lower() in self.lookups:
+                # Prefer the composite column when a relationship appears twice.
+                if not column.split(".", 1)[1].startswith("$$"):
+                    continue
+            ref = self.fields.reference(rel)
+            if ref is None:
+                continue
+            field = ref["name"]
+            if not (self.select_all or field.lower() in self.select):
+                continue
+            targets = list(ref.get("referenceTo") or [])
+            target = next((t for t in targets if t in set_sobjects), targets[0] if targets else None)
+            if target is None:
+                raise NativeLoadError(f"{self.label}: cannot tell which object {column} points at "
+                                      f"(describe has no referenceTo for {field})")
+            self.lookups[rel.lower()] = (column, comps, field, target)
+
+    def parents(self) -> Set[str]:
+        return {target for _, _, _, target in self.lookups.values() if target != self.sobject}
+
+    # -- lookups --
+    @staticmethod
+    def _lookup_key(raw: str, comps: List[str]) -> Optional[Tuple[str, ...]]:
+        if len(comps) == 1:
+            return (normalize(raw),)
+        parts = tuple(normalize(p) for p in raw.split(";"))
+        return parts if len(parts) == len(comps) else None
+
+    def _lookup_maps(self, self_refs: bool) -> Dict[str, Dict[Tuple[str, ...], str]]:
+        """One key -> Id map per lookup column (into the object itself, or into others)."""
+        maps = {}
+        for rel, (column, comps, field, target) in self.lookups.items():
+            if (target == self.sobject) != self_refs:
+                continue
+            keys = {self._lookup_key(row[column], comps) for row in self.rows if row.get(column)}
+            keys.discard(None)
+            maps[rel] = self.loader.key_map(target, comps, keys) if keys else {}
+        return maps
+
+    def _row_lookups(self, row: Dict[str, str], maps: Dict[str, Dict[Tuple[str, ...], str]]
+                     ) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for rel, key_map in maps.items():
+            column, comps, field, target = self.lookups[rel]
+            raw = row.get(column, "")
+            if raw == "":
+                out[field] = None
+                continue
+            found = key_map.get(self._lookup_key(raw, comps))
+            if found:
+                out[field] = found
+            else:
+                self.stats["unresolved_lookups"] += 1
+                if self.stats["unresolved_lookups"] <= _MAX_LOGGED_ERRORS:
+                    self.log.warning(f"{self.label}: no {target} matches {column} = {raw!r}")
+        return out
+
+    # -- main --
+    def run(self) -> None:
+        started = time.monotonic()
+        try:
+            if self.path is not None and self.rows:
+                self._load()
+        finally:
+            self.stats["seconds"] = round(time.monotonic() - started, 3)
+        s = self.stats
+        rate = s["rows"] / s["seconds"] if s["seconds"] else 0
+        self.log.info(
+            f"{self.label}: {s['rows']} rows -> {s['created']} created, {s['updated']} updated, "
+            f"{s['unchanged']} unchanged, {s['skipped']} skipped, {s['failed']} failed"
+            + (f", {s['unresolved_lookups']} unresolved lookups" if s["unresolved_lookups"] else "")
+            + f" ({s['seconds']:.1f}s, {rate:.0f} rows/s)"
+        )
+
+    def _direct_fields(self, creating: bool) -> List[Tuple[str, str]]:
+        out = []
+        for column in self.header:
+            if column.startswith("$$") or "." in column or column.lower() == "id":
+                continue
+            if not (self.select_all or column.lower() in self.select):
+                continue
+            if self.fields.writable(column, creating):
+                out.append((column, self.fields.name(column)))
+        return out
+
+    def _load(self) -> None:
+        maps = self._lookup_maps(self_refs=False)
+        create_cols = self._direct_fields(creating=True)
+        update_cols = self._direct_fields(creating=False)
+        lookup_fields = {field for _, _, field, _ in self.lookups.values()}
+
+        existing: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        if self.operation != "insert":
+            existing = self._existing([name for _, name in update_cols] + sorted(lookup_fields))
+        key_of = KeyReader(self.header, self.external_id) if self.external_id else None
+
+        creates: List[Tuple[int, Dict[str, Any]]] = []
+        updates: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        row_ids: Dict[int, str] = {}
+        matched: Dict[int, Dict[str, Any]] = {}
+        for index, row in enumerate(self.rows):
+            links = self._row_lookups(row, maps)
+            key = key_of(row) if key_of and key_of.usable else None
+            match = existing.get(key) if key else None
+            if match is None:
+                if self.operation == "update":
+                    self.stats["skipped"] += 1
+                    continue
+                record = {name: self.fields.convert(name, row.get(col, "")) for col, name in create_cols}
+                record.update({k: v for k, v in links.items() if self.fields.writable(k, True)})
+                creates.append((index, {k: v for k, v in record.items() if v is not None}))
+                continue
+            row_ids[index] = match["Id"]
+            matched[index] = match
+            if self.skip_existing:
+                self.stats["skipped"] += 1
+                continue
+            record = {name: self.fields.convert(name, row.get(col, "")) for col, name in update_cols}
+            record.update({k: v for k, v in links.items() if self.fields.writable(k, False)})
+            changed = {k: v for k, v in record.items() if normalize(v) != normalize(record_value(match, k))}
+            if not changed:
+                self.stats["unchanged"] += 1
+                continue
+            if match["Id"] in updates:
+                self.log.warning(f"{self.label}: key {key} appears more than once in the CSV; last row wins")
+                self.stats["skipped"] += 1
+            updates[match["Id"]] = (index, dict(changed, Id=match["Id"]))
+
+        if self.loader.simulation:
+            self.stats["created"] += len(creates)
+            self.stats["updated"] += len(updates)
+            return
+        for index, new_id in zip([i for i, _ in creates], self._write("insert", [r for _, r in creates])):
+            if new_id:
+                row_ids[index] = new_id
+        self._write("update", [r for _, r in updates.values()])
+        self._link_self_references(row_ids, matched)
+
+    def _existing(self, compare_fields: List[str]) -> Dict[Tuple[str, ...], Dict[str, Any]]:
+        if not self.external_id:
+            return {}
+        fields = list(dict.fromkeys(["Id", *self.external_id, *compare_fields]))
+        soql = f"SELECT {', '.join(fields)} FROM {self.sobject}"
+        if self.where:
+            soql += f" WHERE {self.where}"
+        out: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        duplicates = 0
+        for record in self.loader.fetch(soql, self.sobject):
+            key = tuple(normalize(record_value(record, c)) for c in self.external_id)
+            if key in out:
+                duplicates += 1
+                continue
+            out[key] = record
+        if duplicates:
+            self.log.warning(f"{self.label}: {duplicates} org record(s) share an externalId "
+                             f"with another; the first one is matched")
+        return out
+
+    def _write(self, operation: str, records: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Insert or update ``records``; returns the Id per record (None on failure)."""
+        if not records:
+            return []
+        if prefer_bulk(len(records), self.loader.bulk_threshold):
+            return self._bulk_write(operation, records)
+        typed = [dict(r, attributes={"type": self.sobject}) for r in records]
+        batches = [typed[i : i + BATCH_SIZE] for i in range(0, len(typed), BATCH_SIZE)]
+        method = "POST" if operation == "insert" else "PATCH"
+        with ThreadPoolExecutor(max_workers=min(self.loader.parallel_batches, len(batches))) as pool:
+            results = [r for batch in pool.map(lambda b: self.org.collection(method, b), batches) for r in batch]
+        ids: List[Optional[str]] = []
+        for record, result in zip(records, results):
+            if result.get("success"):
+                self.stats["created" if operation == "insert" else "updated"] += 1
+                ids.append(result.get("id") or record.get("Id"))
+            else:
+                ids.append(None)
+                self._failed(result.get("errors") or [], record)
+        return ids
+
+    def _bulk_write(self, operation: str, records: List[Dict[str, Any]]) -> List[Optional[str]]:
+        fields = list(dict.fromkeys(name for r in records for name in r))
+        try:
+            summary = self.org.bulk().ingest(self.sobject, operation, fields, records)
+        except BulkApiError as exc:
+            raise NativeLoadError(f"{self.label}: Bulk {operation} failed: {exc}") from exc
+        ok = summary["processed"] - summary["failed"]
+        self.stats["created" if operation == "insert" else "updated"] += ok
+        for failure in summary["failures"]:
+            self._failed([{"message": failure.get("sf__Error")}], failure)
+        # Bulk results do not come back in request order; the self-reference pass
+        # finds rows without an Id again by key.
+        return [record.get("Id") for record in records]
+
+    def _failed(self, errors: List[Dict[str, Any]], record: Dict[str, Any]) -> None:
+        self.stats["failed"] += 1
+        self._errors += 1
+        if self._errors <= _MAX_LOGGED_ERRORS:
+            message = "; ".join(str(e.get("message", e)) for e in errors) or "unknown error"
+            shown = {k: v for k, v in record.items() if k != "attributes"}
+            self.log.error(f"{self.label}: {message} {json.dumps(shown, default=str)[:300]}")
+
+    def _link_self_references(self, row_ids: Dict[int, str], matched: Dict[int, Dict[str, Any]]
+                              ) -> None:
+        """Second pass for lookups into the object itself, once every row exists."""
+        maps = self._lookup_maps(self_refs=True)
+        if not maps:
+            return
+        if len(row_ids) < len(self.rows) and self.external_id:
+            key_of = KeyReader(self.header, self.external_id)
+            by_key = {k: r["Id"] for k, r in self._existing([]).items()}
+            for index, row in enumerate(self.rows):
+                if index not in row_ids and by_key.get(key_of(row)):
+                    row_ids[index] = by_key[key_of(row)]
+        patches = []
+        for index, row in enumerate(self.rows):
+            if index not in row_ids:
+                continue
+            current = matched.get(index, {})
+            links = {k: v for k, v in self._row_lookups(row, maps).items()
+                     if v and v != record_value(current, k)}
+            if links:
+                patches.append(dict(links, Id=row_ids[index]))
+        updated_before = self.stats["updated"]
+        self._write("update", patches)
+        self.stats["updated"] = updated_before  # re-links are not new updates
+        self.stats["self_links"] = len(patches)
+
+    def delete_old_data(self) -> None:
+        soql = f"SELECT Id FROM {self.sobject}" + (f" WHERE {self.where}" if self.where else "")
+        ids = [r["Id"] for r in self.loader.fetch(soql, self.sobject)]
+        if not ids or self.loader.simulation:
+            self.stats["deleted"] = len(ids)
+            return
+        if prefer_bulk(len(ids), self.loader.bulk_threshold):
+            try:
+                summary = self.org.bulk().delete(self.sobject, ids)
+            except BulkApiError as exc:
+                raise NativeLoadError(f"{self.label}: Bulk delete failed: {exc}") from exc
+            self.stats["deleted"] = summary["processed"] - summary["failed"]
+            self.stats["failed"] += summary["failed"]
+        else:
+            batches = [[{"Id": i} for i in ids[n : n + BATCH_SIZE]] for n in range(0, len(ids), BATCH_SIZE)]
+            with ThreadPoolExecutor(max_workers=min(self.loader.parallel_batches, len(batches))) as pool:
+                for batch, results in zip(batches, pool.map(lambda b: self.org.collection("DELETE", b), batches)):
+                    for record, result in zip(batch, results):
+                        if result.get("success"):
+                            self.stats["deleted"] += 1
+                        else:
+                            self._failed(result.get("errors") or [], record)
+        self.log.info(f"{self.label}: deleteOldData removed {self.stats['deleted']} record(s)")
+
+
+# ----- the plan ------------------------------------------------------------------------
+
+class NativeSfdmuLoader:
+    """Load one SFDMU plan directory into an org without the SFDMU CLI."""
+
+    def __init__(self, plan_dir: str, instance_url: str, access_token: str, *,
+                 api_version: Optional[str] = None, object_sets: Optional[Iterable[int]] = None,
+                 parallel_objects: int = DEFAULT_PARALLEL_OBJECTS,
+                 parallel_batches: int = DEFAULT_PARALLEL_BATCHES,
+                 bulk_threshold: Any = None, simulation: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        self.plan_dir = plan_dir
+        with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+            self.plan = json.load(f)
+        version = api_version or self.plan.get("apiVersion") or "67.0"
+        self.org = _Org(instance_url, access_token, version)
+        self.selected = None if object_sets is None else [int(i) for i in object_sets]
+        self.parallel_objects = max(int(parallel_objects), 1)
+        self.parallel_batches = max(int(parallel_batches), 1)
+        self.bulk_threshold = bulk_threshold
+        self.simulation = simulation
+        self.log = logger or logging.getLogger(__name__)
+
+    def fetch(self, soql: str, sobject: str) -> List[Dict[str, Any]]:
+        """All rows of ``soql``: REST paging, or a Bulk query job for large objects."""
+        if bulk_threshold(self.bulk_threshold) > 0 and prefer_bulk(self._count(sobject), self.bulk_threshold):
+            try:
+                return list(self.org.bulk().iter_query(soql))
+            except BulkApiError as exc:
+                raise NativeLoadError(f"Bulk query failed: {exc} [{soql[:200]}]") from exc
+        return self.org.query(soql)
+
+    def _count(self, sobject: str) -> int:
+        rows = self.org.query(f"SELECT COUNT(Id) cnt FROM {sobject}")
+        return int((rows[0] if rows else {}).get("cnt") or 0)
+
+    def key_map(self, target: str, comps: List[str], keys: Set[Tuple[str, ...]]
+                ) -> Dict[Tuple[str, ...], str]:
+        """``key tuple -> Id`` on ``target`` for the wanted keys, by IN-queries where possible."""
+        fields = self.org.describe(target)
+        select = f"SELECT Id, {', '.join(dict.fromkeys(comps))} FROM {target}"
+        column = next((i for i, comp in enumerate(comps)
+                       if ("." in comp or fields.is_text(comp))
+                       and all(k[i] and not _NUMBER_RE.match(k[i]) and k[i] not in ("true", "false")
+                               and not _DATE_RE.match(k[i]) for k in keys)), None)
+        if column is None:
+            records = self.fetch(select, target)
+        else:
+            records = []
+            chunk: List[str] = []
+            size = 0
+            for value in sorted({k[column] for k in keys}):
+                literal = soql_literal(value)
+                if chunk and size + len(literal) > IN_CHUNK_CHARS:
+                    records += self.org.query(f"{select} WHERE {comps[column]} IN ({', '.join(chunk)})")
+                    chunk, size = [], 0
+                chunk.append(literal)
+                size += len(literal) + 2
+            if chunk:
+                records += self.org.query(f"{select} WHERE {comps[column]} IN ({', '.join(chunk)})")
+        out: Dict[Tuple[str, ...], str] = {}
+        for record in records:
+            key = tuple(normalize(record_value(record, c)) for c in comps)
+            out.setdefault(key, record["Id"])
+        return out
+
+    def _selected_sets(self) -> List[Tuple[int, Dict[str, Any]]]:
+        sets = rlm_sfdmu_plan.object_sets(self.plan)
+        if self.selected is None:
+            return list(enumerate(sets))
+        bad = [i for i in self.selected if not 0 <= i < len(sets)]
+        if bad:
+            raise NativeLoadError(f"object_sets {self.selected} out of range for {len(sets)} object sets")
+        return [(i, sets[i]) for i in self.selected]
+
+    def run(self) -> Dict[str, Any]:
+        started = time.monotonic()
+        report: Dict[str, Any] = {"plan": self.plan_dir, "engine": "native",
+                                  "simulation": self.simulation, "sets": []}
+        for set_index, obj_set in self._selected_sets():
+            report["sets"].append(self._run_set(set_index, obj_set))
+        objects = [o for s in report["sets"] for o in s["objects"]]
+        totals = Counter()
+        for entry in objects:
+            for key in ("rows", "created", "updated", "unchanged", "skipped", "failed",
+                        "unresolved_lookups", "deleted"):
+                totals[key] += entry[key]
+        report["totals"] = dict(totals)
+        report["api_calls"] = dict(self.org.calls)
+        report["seconds"] = round(time.monotonic() - started, 3)
+        return report
+
+    def _run_set(self, set_index: int, obj_set: Dict[str, Any]) -> Dict[str, Any]:
+        name = obj_set.get("name") or f"object set {set_index + 1}"
+        specs = [o for o in obj_set.get("objects", [])
+                 if not o.get("excluded") and rlm_sfdmu_plan.query_sobject(o.get("query", ""))]
+        jobs = [_ObjectLoad(self, set_index, o) for o in specs
+                if str(o.get("operation") or "Upsert").lower() in _WRITE_OPS]
+        self.log.info(f"Object set {set_index + 1} ({name}): {len(jobs)} object(s) to write, "
+                      f"{len(specs) - len(jobs)} read-only")
+        started = time.monotonic()
+        set_sobjects = {job.sobject for job in jobs}
+        with ThreadPoolExecutor(max_workers=self.parallel_objects) as pool:
+            list(pool.map(lambda job: job.prepare(set_sobjects), jobs))
+
+        by_sobject: Dict[str, List[_ObjectLoad]] = {}
+        for job in jobs:
+            by_sobject.setdefault(job.sobject, []).append(job)
+        order = list(by_sobject)
+        followers: Dict[str, Set[str]] = {s: set() for s in order}
+        for job in jobs:
+            for parent in job.parents():
+                if parent in followers and parent != job.sobject:
+                    followers[parent].add(job.sobject)
+        levels = rlm_sfdmu_plan.dependency_levels(order, followers)
+        for i, level in enumerate(levels, 1):
+            self.log.info(f"  L{i}: {', '.join(level)}")
+
+        doomed = [job for level in reversed(levels) for s in level for job in by_sobject[s]
+                  if job.delete_old]
+        for job in doomed:
+            job.delete_old_data()
+
+        def run_group(sobject: str) -> None:
+            for job in by_sobject[sobject]:
+                job.run()
+
+        with ThreadPoolExecutor(max_workers=self.parallel_objects) as pool:
+            for level in levels:
+                list(pool.map(run_group, level))
+        return {"index": set_index, "name": name, "levels": levels,
+                "seconds": round(time.monotonic() - started, 3),
+                "objects": [job.stats for job in jobs]}
+
+
+def summary_lines(report: Dict[str, Any]) -> List[str]:
+    """Fixed-width per-object table plus a totals line, for task logs."""
+    lines = [f"{'set':>3}  {'object':<36} {'op':<8} {'rows':>6} {'new':>6} {'upd':>6} "
+             f"{'same':>6} {'skip':>6} {'fail':>5} {'secs':>7}"]
+    for obj_set in report["sets"]:
+        for o in obj_set["objects"]:
+            lines.append(f"{o['set'] + 1:>3}  {o['sobject']:<36} {o['operation']:<8} {o['rows']:>6} "
+                         f"{o['created']:>6} {o['updated']:>6} {o['unchanged']:>6} {o['skipped']:>6} "
+                         f"{o['failed']:>5} {o['seconds']:>7.1f}")
+    t = report["totals"]
+    calls = ", ".join(f"{k}={v}" for k, v in sorted(report["api_calls"].items()))
+    lines.append(f"Total: {t.get('rows', 0)} rows, {t.get('created', 0)} created, "
+                 f"{t.get('updated', 0)} updated, {t.get('unchanged', 0)} unchanged, "
+                 f"{t.get('failed', 0)} failed in {report['seconds']:.1f}s ({calls})")
+    return lines
@@ -0,0 +1,370 @@
+"""Locale SFDMU plans stored as overlays on their base plan.
+
+A locale plan such as ``datasets/sfdmu/qb/ja/qb-pcm`` repeats most of its
+en-US base. Stored as an overlay, its directory holds an ``overlay.json``
+plus only the files it really owns:
+
+.. code-block:: json
+
+    {
+      "version": 1,
+      "base": "../../en-US/qb-pcm",
+      "remove": ["ProductRampSegment.csv"],
+      "files": {
+        "AttributeCategory.csv": {
+          "key": ["Code"],
+          "columns": ["Code", "Name", "..."],
+          "set": {"QB-CAT-1": {"Name": "..."}},
+          "drop": ["QB-CAT-9"],
+          "add": [{"Code": "QB-CAT-JA", "Name": "..."}],
+          "order": ["QB-CAT-1", "QB-CAT-JA"]
+        }
+      }
+    }
+
+* ``base`` is relative to the overlay directory and may itself be an overlay.
+* Every other file in the overlay directory (``export.json`` included)
+  replaces the base copy whole; ``remove`` lists base files the locale does
+  not have; every remaining base file is inherited as is.
+* A ``files`` entry rebuilds one CSV from the base copy. Rows are matched on
+  ``key`` (columns present and unique in both; a composite key is its values
+  joined with ``;``). ``columns`` is the locale header when it differs, ``set``
+  patches cells, ``drop`` removes base rows and ``add`` appends rows (cells
+  left out are blank). Rows keep the base order, adds last, unless ``order``
+  lists every key.
+
+:func:`materialize` builds the full plan under ``.cci/sfdmu_overlay/``
+(git-ignored), keyed by a hash of the overlay and every input file, so only
+the first load or validation after an edit pays for it; a plain plan comes
+back unchanged. :func:`build_overlay` derives an overlay from a full locale
+plan, keeping a file whole wherever a patch would not reproduce it byte for
+byte or would not be smaller.
+"""
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+OVERLAY_FILE = "overlay.json"
+OVERLAY_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(".cci", "sfdmu_overlay")
+KEY_SEPARATOR = ";"
+
+
+class OverlayError(ValueError):
+    """An overlay that cannot be applied to its base plan."""
+
+
+def is_overlay(plan_dir: str) -> bool:
+    return os.path.isfile(os.path.join(plan_dir, OVERLAY_FILE))
+
+
+def load_overlay(plan_dir: str) -> Dict[str, Any]:
+    path = os.path.join(plan_dir, OVERLAY_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            overlay = json.load(f)
+    except (OSError, ValueError) as e:
+        raise OverlayError(f"{path}: unreadable ({e})") from e
+    if overlay.get("version") != OVERLAY_VERSION or not overlay.get("base"):
+        raise OverlayError(f"{path}: expected version {OVERLAY_VERSION} and a base plan")
+    return overlay
+
+
+def base_dir(plan_dir: str, overlay: Mapping[str, Any]) -> str:
+    return os.path.normpath(os.path.join(plan_dir, overlay["base"]))
+
+
+def _files(plan_dir: str) -> List[str]:
+    """Every file of a plan (``/``-separated, relative), without the overlay itself."""
+    found = []
+    for root, dirs, names in os.walk(plan_dir):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        rel_root = os.path.relpath(root, plan_dir)
+        for name in sorted(names):
+            rel = name if rel_root == "." else f"{rel_root}/{name}".replace(os.sep, "/")
+            if rel != OVERLAY_FILE:
+                found.append(rel)
+    return found
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_text(path: str) -> str:
+    with open(path, newline="", encoding="utf-8") as f:
+        return f.read()
+
+
+def _rows(text: str) -> List[List[str]]:
+    return [row for row in csv.reader(io.StringIO(text, newline="")) if row]
+
+
+def _write_rows(rows: List[List[str]]) -> str:
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows(rows)
+    return buf.getvalue()
+
+
+def _key_index(header: List[str], rows: List[List[str]], key: List[str], what: str) -> Dict[str, int]:
+    """Row position by key; raises if a key column is missing or a key repeats."""
+    missing = [col for col in key if col not in header]
+    if missing:
+        raise OverlayError(f"{what}: no key column(s) {missing}")
+    positions = [header.index(col) for col in key]
+    index: Dict[str, int] = {}
+    for i, row in enumerate(rows):
+        value = KEY_SEPARATOR.join(row[p] if p < len(row) else "" for p in positions)
+        if value in index:
+            raise OverlayError(f"{what}: key {value!r} is not unique")
+        index[value] = i
+    return index
+
+
+def apply_patch(base_text: str, patch: Mapping[str, Any], what: str = "CSV") -> str:
+    """The locale CSV a ``files`` entry describes, built from the base CSV's text."""
+    table = _rows(base_text)
+    if not table:
+        raise OverlayError(f"{what}: the base CSV is empty")
+    header, rows = table[0], table[1:]
+    key = list(patch["key"])
+    columns = list(patch.get("columns") or header)
+    index = _key_index(header, rows, key, f"{what} (base)")
+    dropped = set(patch.get("drop") or ())
+    patches = patch.get("set") or {}
+    unknown = sorted((dropped | set(patches)) - set(index))
+    if unknown:
+        raise OverlayError(f"{what}: {len(unknown)} key(s) not in the base, e.g. {unknown[0]!r}")
+
+    built: Dict[str, List[str]] = {}
+    for value, i in index.items():
+        if value in dropped:
+            continue
+        cells = dict(zip(header, rows[i]))
+        cells.update(patches.get(value) or {})
+        built[value] = [cells.get(col, "") for col in columns]
+    for cells in patch.get("add") or ():
+        value = KEY_SEPARATOR.join(cells.get(col, "") for col in key)
+        if value in built:
+            raise OverlayError(f"{what}: added key {value!r} is already a row")
+        built[value] = [cells.get(col, "") for col in columns]
+
+    order = patch.get("order")
+    if order is not None:
+        if len(order) != len(built) or set(order) != set(built):
+            raise OverlayError(f"{what}: order does not list every key exactly once")
+        built = {value: built[value] for value in order}
+    return _write_rows([columns] + list(built.values()))
+
+
+def _digest_inputs(plan_dir: str, seen: Tuple[str, ...] = ()) -> str:
+    """Hash of everything an overlay plan is built from, following base overlays."""
+    real = os.path.realpath(plan_dir)
+    if real in seen:
+        raise OverlayError(f"{plan_dir}: overlay bases form a cycle")
+    digest = hashlib.sha256(f"v{OVERLAY_VERSION}\n".encode())
+    for rel in _files(plan_dir) + ([OVERLAY_FILE] if is_overlay(plan_dir) else []):
+        digest.update(f"{rel}\x00{_file_digest(os.path.join(plan_dir, rel))}\n".encode())
+    if is_overlay(plan_dir):
+        base = base_dir(plan_dir, load_overlay(plan_dir))
+        if not os.path.isdir(base):
+            raise OverlayError(f"{plan_dir}: base plan {base} not found")
+        digest.update(f"base\x00{_digest_inputs(base, seen + (real,))}\n".encode())
+    return digest.hexdigest()
+
+
+def build_plan(plan_dir: str, out_dir: str, seen: Tuple[str, ...] = ()) -> None:
+    """Write the full plan an overlay describes into ``out_dir`` (which must not exist yet)."""
+    real = os.path.realpath(plan_dir)
+    if real in seen:
+        raise OverlayError(f"{plan_dir}: overlay bases form a cycle")
+    overlay = load_overlay(plan_dir)
+    base = base_dir(plan_dir, overlay)
+    if not os.path.isdir(base):
+        raise OverlayError(f"{plan_dir}: base plan {base} not found")
+    if is_overlay(base):
+        staging = tempfile.mkdtemp(prefix="sfdmu_overlay_")
+        try:
+            build_plan(base, os.path.join(staging, "plan"), seen + (real,))
+            _build_on(plan_dir, overlay, os.path.join(staging, "plan"), out_dir)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    else:
+        _build_on(plan_dir, overlay, base, out_dir)
+
+
+def _build_on(plan_dir: str, overlay: Mapping[str, Any], base: str, out_dir: str) -> None:
+    os.makedirs(out_dir)
+    owned = set(_files(plan_dir))
+    removed = set(overlay.get("remove") or ())
+    patched = overlay.get("files") or {}
+    clash = sorted(owned & set(patched))
+    if clash:
+        raise OverlayError(f"{plan_dir}: {clash[0]} is both a file of the overlay and patched")
+    base_files = set(_files(base))
+    missing = sorted((removed | set(patched)) - base_files)
+    if missing:
+        raise OverlayError(f"{plan_dir}: {missing[0]} is not a file of the base plan {base}")
+    for rel in sorted(base_files | owned):
+        target = os.path.join(out_dir, *rel.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if rel in owned:
+            shutil.copyfile(os.path.join(plan_dir, rel), target)
+        elif rel in patched:
+            text = apply_patch(_read_text(os.path.join(base, rel)), patched[rel], f"{plan_dir}/{rel}")
+            with open(target, "w", newline="", encoding="utf-8") as f:
+                f.write(text)
+        elif rel not in removed:
+            shutil.copyfile(os.path.join(base, rel), target)
+
+
+def _cache_slot(plan_dir: str) -> str:
+    """Cache entry prefix for a plan: its path, made file-name safe."""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", os.path.relpath(os.path.abspath(plan_dir)).strip("./\\")) or "plan"
+
+
+def materialize(plan_dir: str, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    """The directory holding ``plan_dir`` in full: ``plan_dir`` itself unless it is an overlay.
+
+    An overlay is built once per distinct input under ``cache_dir`` and reused
+    until the overlay, one of its files or its base changes; older builds of
+    the same plan are removed.
+    """
+    if not is_overlay(plan_dir):
+        return plan_dir
+    slot = _cache_slot(plan_dir)
+    out = os.path.join(cache_dir, f"{slot}-{_digest_inputs(plan_dir)[:16]}")
+    if os.path.isdir(out):
+        return out
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".building-", dir=cache_dir)
+    try:
+        build_plan(plan_dir, os.path.join(staging, "plan"))
+        try:
+            os.replace(os.path.join(staging, "plan"), out)
+        except OSError:
+            if not os.path.isdir(out):  # a concurrent build that got there first is just as good
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    for name in os.listdir(cache_dir):
+        if name.startswith(f"{slot}-") and len(name) == len(slot) + 17 and os.path.join(cache_dir, name) != out:
+            shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+    return out
+
+
+def _best_key(base_header: List[str], base_rows: List[List[str]], header: List[str],
+              rows: List[List[str]]) -> Optional[List[str]]:
+    """The shared column, unique in both CSVs, that matches the most rows (first column on a tie)."""
+    best, best_common = None, -1
+    for col in header:
+        if col not in base_header:
+            continue
+        try:
+            base_keys = _key_index(base_header, base_rows, [col], "base")
+            keys = _key_index(header, rows, [col], "locale")
+        except OverlayError:
+            continue
+        common = len(base_keys.keys() & keys.keys())
+        if common > best_common:
+            best, best_common = [col], common
+    return best
+
+
+def make_patch(base_text: str, text: str) -> Optional[Dict[str, Any]]:
+    """A ``files`` entry that rebuilds ``text`` from ``base_text`` exactly, or None if there is none."""
+    base_table, table = _rows(base_text), _rows(text)
+    if not base_table or not table:
+        return None
+    base_header, base_rows = base_table[0], base_table[1:]
+    header, rows = table[0], table[1:]
+    key = _best_key(base_header, base_rows, header, rows)
+    if key is None:
+        return None
+    base_index = _key_index(base_header, base_rows, key, "base")
+    index = _key_index(header, rows, key, "locale")
+    patch: Dict[str, Any] = {"key": key}
+    if header != base_header:
+        patch["columns"] = header
+    patches, added = {}, []
+    for value, i in index.items():
+        cells = dict(zip(header, rows[i]))
+        if value not in base_index:
+            added.append({col: cell for col, cell in cells.items() if cell != "" or col in key})
+            continue
+        base_cells = dict(zip(base_header, base_rows[base_index[value]]))
+        changed = {col: cell for col, cell in cells.items() if base_cells.get(col, "") != cell}
+        if changed:
+            patches[value] = changed
+    if patches:
+        patch["set"] = patches
+    dropped = [value for value in base_index if value not in index]
+    if dropped:
+        patch["drop"] = dropped
+    if added:
+        patch["add"] = added
+    natural = [value for value in base_index if value in index] + [
+        KEY_SEPARATOR.join(cells.get(col, "") for col in key) for cells in added]
+    if natural != list(index):
+        patch["order"] = list(index)
+    try:
+        rebuilt = apply_patch(base_text, patch)
+    except OverlayError:
+        return None
+    return patch if rebuilt == text else None
+
+
+def build_overlay(plan_dir: str, base: str) -> Dict[str, Any]:
+    """Describe the full plan ``plan_dir`` as an overlay on ``base``.
+
+    Returns ``{"overlay", "inherited", "patched", "owned"}``: the overlay.json
+    content and the files it inherits, rebuilds from a patch, or keeps whole.
+    """
+    overlay: Dict[str, Any] = {"version": OVERLAY_VERSION,
+                               "base": os.path.relpath(base, plan_dir).replace(os.sep, "/")}
+    base_files = set(_files(base))
+    files = _files(plan_dir)
+    removed = sorted(base_files - set(files))
+    if removed:
+        overlay["remove"] = removed
+    inherited, patched, owned = [], {}, []
+    for rel in files:
+        path, base_path = os.path.join(plan_dir, rel), os.path.join(base, rel)
+        if rel in base_files and _file_digest(path) == _file_digest(base_path):
+            inherited.append(rel)
+            continue
+        patch = None
+        if rel in base_files and rel.endswith(".csv"):
+            text = _read_text(path)
+            patch = make_patch(_read_text(base_path), text)
+            if patch is not None and len(json.dumps(patch, ensure_ascii=False)) >= len(text):
+                patch = None
+        if patch is None:
+            owned.append(rel)
+        else:
+            patched[rel] = patch
+    if patched:
+        overlay["files"] = patched
+    return {"overlay": overlay, "inherited": inherited, "patched": sorted(patched), "owned": owned}
+
+
+def write_overlay(plan_dir: str, overlay: Mapping[str, Any], drop_files: List[str]) -> None:
+    """Write ``overlay.json`` and delete the files it now provides."""
+    with open(os.path.join(plan_dir, OVERLAY_FILE), "w", encoding="utf-8") as f:
+        json.dump(overlay, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    for rel in drop_files:
+        os.remove(os.path.join(plan_dir, *rel.split("/")))
+    for root, dirs, names in os.walk(plan_dir, topdown=False):
+        if root != plan_dir and not os.listdir(root):
+            os.rmdir(root)
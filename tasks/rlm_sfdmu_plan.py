@@ -0,0 +1,188 @@
+"""Pure helpers over an SFDMU plan (export.json): object sets, queries, dependencies.
+
+Kept free of CumulusCI so the plan logic the SFDMU tasks share can be checked
+offline (``tests/test_sfdmu_plan.py``).
+
+Dependencies come from the plan itself. Each object's SELECT list and
+``externalId`` name the lookups it sets (``Product2Id``,
+``PriceAdjustmentSchedule.Name``, ``RLM_Parent__r.Code__c``). A REST describe
+of the object resolves those names to the objects they point at
+(:func:`parent_sobjects`). :func:`dependency_levels` then groups a deletion
+order into levels. Every object in a level can go at once, and each level
+only references objects in later levels. An object whose parents are unknown
+(describe failed) keeps its plan-order position against everything, so the
+result is never less safe than walking the plan serially.
+
+Without a describe, :func:`relationship_sobject` resolves a relationship name
+from the names of the objects the plans load (``PriceBook`` -> Pricebook2,
+``ParentProduct`` -> Product2). It returns None rather than guess.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+_FROM_RE = re.compile(r"\s+FROM\s+(\w+)(?:\s|$)", re.IGNORECASE)
+_SELECT_RE = re.compile(r"^\s*SELECT\s+(.*?)\s+FROM\s", re.IGNORECASE | re.DOTALL)
+_CAMEL_RE = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# Leading words of a relationship name that say which record, not which object.
+ROLE_WORDS = {"active", "child", "default", "destination", "original", "overridden", "parent", "related",
+              "root", "source"}
+
+# Standard relationship names whose object the name rules cannot find (or would get wrong).
+RELATIONSHIP_OBJECTS = {
+    "BasedOn": "ProductClassification",
+    "FulfillmentStepDefnGroup": "FulfillmentStepDefinitionGroup",
+    "Partner": "Account",
+    "ProductClassificationAttribute": "ProductClassificationAttr",
+    "RootBundle": "Product2",
+    "TokenResource": "UsageResource",
+}
+
+
+def object_sets(plan: Mapping[str, Any], selected: Optional[Iterable[int]] = None
+                ) -> List[Dict[str, Any]]:
+    """The plan's objectSets (a flat ``objects`` plan counts as one set).
+
+    ``selected`` keeps only those 0-based indices; out-of-range ones are ignored.
+    """
+    sets = list(plan.get("objectSets", []))
+    if not sets and "objects" in plan:
+        sets = [{"objects": plan["objects"]}]
+    if selected is not None:
+        sets = [sets[i] for i in selected if 0 <= i < len(sets)]
+    return sets
+
+
+def query_sobject(query: str) -> Optional[str]:
+    m = _FROM_RE.search(query or "")
+    return m.group(1) if m else None
+
+
+def query_fields(query: str) -> List[str]:
+    """Field paths in the SELECT list (``all`` / ``readonly_false`` markers included)."""
+    m = _SELECT_RE.search(query or "")
+    if not m:
+        return []
+    return [f.strip() for f in m.group(1).split(",") if f.strip()]
+
+
+def insert_objects(sets: Sequence[Mapping[str, Any]]) -> List[Dict[str, Any]]:
+    """Non-excluded ``operation: Insert`` objects, in plan array order."""
+    found = []
+    for obj_set in sets:
+        for obj in obj_set.get("objects", []):
+            if obj.get("excluded", False) or obj.get("operation", "").lower() != "insert":
+                continue
+            if query_sobject(obj.get("query", "")):
+                found.append(obj)
+    return found
+
+
+def reference_names(obj: Mapping[str, Any]) -> Set[str]:
+    """Lower-cased field / relationship names the plan object sets or matches on."""
+    names: Set[str] = set()
+    paths = query_fields(obj.get("query", ""))
+    paths += [p for p in re.split(r"[;$]+", obj.get("externalId") or "") if p]
+    for path in paths:
+        head = path.split(".", 1)[0].strip()
+        if head:
+            names.add(head.lower())
+    return names
+
+
+def _name_tokens(name: str) -> List[str]:
+    """Lower-cased CamelCase words of an object or relationship name, digits and ``__c`` / ``__r`` dropped."""
+    base = re.sub(r"__[cr]$", "", name)
+    return [t.lower() for t in _CAMEL_RE.findall(base.replace("_", " ")) if not t.isdigit()]
+
+
+def relationship_score(rel: str, sobject: str) -> int:
+    """Words matched when ``sobject`` ends ``rel``, or ``rel`` (less a role word) ends ``sobject``; else 0."""
+    r, o = _name_tokens(rel), _name_tokens(sobject)
+    if len(r) > 1 and r[0] in ROLE_WORDS and o[-len(r) + 1:] == r[1:]:
+        return len(r) - 1
+    n = min(len(r), len(o))
+    return n if n and r[-n:] == o[-n:] else 0
+
+
+def relationship_sobject(rel: str, sobjects: Iterable[str], child: Optional[str] = None) -> Optional[str]:
+    """The object relationship ``rel`` of ``child`` points at, by name alone, or None when unsure.
+
+    ``RELATIONSHIP_OBJECTS`` first, then the object of that name among
+    ``sobjects`` (ignoring case and a trailing digit, ``X__r`` -> ``X__c``),
+    then the best :func:`relationship_score`. A tie goes to ``child``, then
+    to the one object whose whole name the relationship ends with
+    (``ChildProduct`` -> Product2, not ProductCategoryProduct).
+    """
+    if rel in RELATIONSHIP_OBJECTS:
+        return RELATIONSHIP_OBJECTS[rel]
+    sobjects = set(sobjects)
+    by_lower = {name.lower().rstrip("0123456789"): name for name in sobjects}
+    for candidate in (rel, re.sub(r"__r$", "__c", rel)):
+        name = by_lower.get(candidate.lower().rstrip("0123456789"))
+        if name:
+            return name
+    scored = [(relationship_score(rel, name), name) for name in sobjects]
+    scored = [(score, name) for score, name in scored if score]
+    if not scored:
+        return None
+    best = max(score for score, _ in scored)
+    names = sorted(name for score, name in scored if score == best)
+    if len(names) == 1:
+        return names[0]
+    if child in names:
+        return child
+    whole = [name for name in names if len(_name_tokens(name)) == best]
+    return whole[0] if len(whole) == 1 else None
+
+
+def parent_sobjects(obj: Mapping[str, Any], describe: Mapping[str, Any]) -> Set[str]:
+    """Objects the plan object's lookups point at, resolved through its describe."""
+    wanted = reference_names(obj)
+    parents: Set[str] = set()
+    for field in describe.get("fields") or []:
+        if field.get("type") != "reference":
+            continue
+        keys = {str(field.get("name") or "").lower(), str(field.get("relationshipName") or "").lower()}
+        if keys & wanted:
+            parents.update(field.get("referenceTo") or [])
+    return parents
+
+
+def dependency_levels(order: Sequence[str], parents: Mapping[str, Optional[Set[str]]]
+                      ) -> List[List[str]]:
+    """Group ``order`` (children-first) into levels that can each run concurrently.
+
+    ``parents[x]`` is the set of objects ``x`` references. Those must be
+    deleted after ``x``. ``None`` means unknown, so ``x`` stays serial at its
+    position in ``order``. Self-references are ignored. A cycle is broken by
+    releasing its earliest member in ``order``. Duplicates in ``order`` collapse
+    onto their first position.
+    """
+    nodes = list(dict.fromkeys(order))
+    index = {name: i for i, name in enumerate(nodes)}
+    before: Dict[str, Set[str]] = {name: set() for name in nodes}  # x -> must go first
+    for name in nodes:
+        known = parents.get(name, set())
+        if known is None:
+            for other in nodes:
+                if other == name:
+                    continue
+                if index[other] < index[name]:
+                    before[name].add(other)
+                else:
+                    before[other].add(name)
+            continue
+        for parent in known:
+            if parent in index and parent != name:
+                before[parent].add(name)
+
+    levels: List[List[str]] = []
+    remaining = set(nodes)
+    while remaining:
+        ready = [n for n in nodes if n in remaining and not (before[n] & remaining)]
+        if not ready:
+            ready = [min(remaining, key=index.__getitem__)]
+        levels.append(ready)
+        remaining.difference_update(ready)
+    return levels
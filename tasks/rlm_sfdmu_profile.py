@@ -0,0 +1,221 @@
+"""Per-object timing profile of an SFDMU run, rebuilt from its ``--verbose`` output.
+
+SFDMU prints one line per step, prefixed with a clock time and tagged with
+the object it concerns::
+
+    [09:12:44.120] {Product2} Querying the target org: SELECT Id, ... FROM Product2
+    [09:12:45.302] {Product2} Retrieved 412 records.
+    [09:12:51.877] {PricebookEntry} Inserting 1200 records ...
+
+:func:`parse_sfdmu_output` groups those lines into phases per object set
+(pass) and object:
+
+* ``query``: querying / retrieving / fetching;
+* ``resolve``: lookup, mapping and parent/child record resolution;
+* ``insert``, ``update``, ``delete``: the DML.
+
+A phase runs from its first line until the next line that belongs to a
+different phase or object, which is when SFDMU moved on. Each phase gets the
+largest record count its lines mention, and rows per second. The exact SFDMU
+wording varies between versions, so matching is by keyword. Lines that match
+nothing are ignored. Lines without a clock prefix use the time they were
+read, when the caller streams them as ``(epoch_seconds, line)`` pairs.
+
+``LoadSFDMUData`` / ``ExtractSFDMUData`` write the profile to
+``sfdmu_profile.json`` beside the plan. When ``RLM_SF_METRICS_DIR`` is set
+(the build harness sets it per step), they also write it there, and
+``scripts/build_harness`` rolls it into ``sfdmu_profile_summary.json`` and
+the report.
+"""
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+PROFILE_FILENAME = "sfdmu_profile.json"
+METRICS_ENV_VAR = "RLM_SF_METRICS_DIR"  # same directory scripts/sf_transport/metrics.py records into
+METRICS_PREFIX = "sfdmu_profile-"
+
+PHASES = ("query", "resolve", "insert", "update", "delete")
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+_CLOCK = re.compile(r"^\s*\[(\d{1,2}):(\d{2}):(\d{2})(?:[.,](\d{1,3}))?\]\s*")
+_OBJECT = re.compile(r"\{([A-Za-z_][A-Za-z0-9_]*)\}")
+_OBJECT_SET = re.compile(r"object\s*set\s*#?\s*(\d+)", re.IGNORECASE)
+_SOQL = re.compile(r"\bSELECT\s", re.IGNORECASE)
+_COUNT = re.compile(r"(\d[\d,]*)\s+(?:records?|rows?)\b", re.IGNORECASE)
+_PHASE_WORDS = (
+    ("delete", re.compile(r"\bdelet", re.IGNORECASE)),
+    ("insert", re.compile(r"\binsert", re.IGNORECASE)),
+    ("update", re.compile(r"\b(?:updat|upsert)", re.IGNORECASE)),
+    ("resolve", re.compile(r"\b(?:lookup|mapping|resolv|parent|child)", re.IGNORECASE)),
+    ("query", re.compile(r"\b(?:quer|retriev|fetch|select)", re.IGNORECASE)),
+)
+
+Line = Union[str, Tuple[float, str]]
+
+
+def classify(text: str) -> Optional[str]:
+    """Phase a log line belongs to, or None. A SOQL statement in the line only means ``query``."""
+    soql = _SOQL.search(text)
+    head = text[:soql.start()] if soql else text
+    for phase, pattern in _PHASE_WORDS:
+        if pattern.search(head):
+            return phase
+    return "query" if soql else None
+
+
+def _clock_seconds(match: "re.Match[str]") -> float:
+    hours, minutes, seconds, millis = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + int(seconds) + int((millis or "0").ljust(3, "0")) / 1000
+
+
+def parse_sfdmu_output(lines: Iterable[Line], *, plan: str = "", operation: str = "load") -> Dict[str, Any]:
+    """Profile dict for one SFDMU run; see the module docstring."""
+    events: List[Tuple[float, int, str, str, int]] = []  # (t, pass, object, phase, rows)
+    pass_index, day_offset, last_clock, first_epoch = 1, 0.0, None, None
+    origin: Optional[float] = None
+    last_seen = 0.0
+    for item in lines:
+        received, raw = item if isinstance(item, tuple) else (None, item)
+        text = _ANSI.sub("", raw).rstrip()
+        clock = _CLOCK.match(text)
+        if clock:
+            t = _clock_seconds(clock)
+            if last_clock is not None and t + day_offset < last_clock - 43200:
+                day_offset += 86400  # crossed midnight
+            t += day_offset
+            last_clock = t
+            text = text[clock.end():]
+        elif received is not None:
+            first_epoch = received if first_epoch is None else first_epoch
+            t = received
+        else:
+            continue
+        origin = t if origin is None else origin
+        last_seen = t - origin
+        set_match = _OBJECT_SET.search(text)
+        if set_match:
+            pass_index = int(set_match.group(1))
+            events.append((t - origin, pass_index, "", "", 0))  # a new pass closes the open phase
+        obj = _OBJECT.search(text)
+        phase = classify(text) if obj else None
+        if not obj or not phase:
+            continue
+        counts = [int(c.replace(",", "")) for c in _COUNT.findall(text)]
+        events.append((t - origin, pass_index, obj.group(1), phase, max(counts) if counts else 0))
+
+    # A run of consecutive lines with the same (pass, object, phase) is one
+    # segment; it lasts until the first line of the next segment, the next
+    # object-set header, or the last line of the output.
+    events.append((last_seen, 0, "", "", 0))
+    phases: Dict[Tuple[int, str, str], Dict[str, Any]] = {}
+    i = 0
+    while i < len(events):
+        key = events[i][1:4]
+        if not key[1]:
+            i += 1
+            continue
+        j = i
+        while j + 1 < len(events) and events[j + 1][1:4] == key:
+            j += 1
+        start = events[i][0]
+        end = events[j + 1][0] if j + 1 < len(events) else events[j][0]
+        entry = phases.setdefault(key, {"start": round(start, 3), "end": 0.0, "seconds": 0.0, "rows": 0})
+        entry["end"] = round(end, 3)
+        entry["seconds"] = round(entry["seconds"] + end - start, 3)
+        entry["rows"] = max([entry["rows"]] + [e[4] for e in events[i:j + 1]])
+        i = j + 1
+
+    passes: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    for (pass_no, sobject, phase), entry in phases.items():
+        seconds = entry["seconds"]
+        entry["rows_per_second"] = round(entry["rows"] / seconds, 1) if seconds and entry["rows"] else None
+        passes.setdefault(pass_no, {}).setdefault(sobject, {})[phase] = entry
+
+    profile_passes = []
+    for pass_no in sorted(passes):
+        objects = []
+        for sobject, object_phases in passes[pass_no].items():
+            seconds = round(sum(p["seconds"] for p in object_phases.values()), 3)
+            written = [p["rows"] for name, p in object_phases.items() if name in ("insert", "update", "delete")]
+            rows = max(written or [object_phases.get("query", {}).get("rows", 0)])
+            objects.append({"sobject": sobject, "seconds": seconds, "rows": rows,
+                            "start": min(p["start"] for p in object_phases.values()),
+                            "phases": {name: object_phases[name] for name in PHASES if name in object_phases}})
+        objects.sort(key=lambda o: o["start"])
+        profile_passes.append({"index": pass_no, "objects": objects,
+                               "seconds": round(sum(o["seconds"] for o in objects), 3)})
+    total = round(last_seen, 3)
+    ranked = sorted((dict(o, **{"pass": p["index"]}) for p in profile_passes for o in p["objects"]),
+                    key=lambda o: o["seconds"], reverse=True)
+    return {
+        "plan": plan,
+        "engine": "sfdmu",
+        "operation": operation,
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamps": "sfdmu" if last_clock is not None else ("received" if first_epoch is not None else "none"),
+        "seconds": total,
+        "passes": profile_passes,
+        "top_objects": [{k: o[k] for k in ("pass", "sobject", "seconds", "rows")} for o in ranked[:10]],
+    }
+
+
+def profile_from_native(report: Mapping[str, Any], *, plan: str = "") -> Dict[str, Any]:
+    """Same shape from a ``NativeSfdmuLoader`` report (one ``load`` figure per object)."""
+    passes = []
+    for obj_set in report.get("sets") or []:
+        objects = []
+        for stats in obj_set.get("objects") or []:
+            seconds = float(stats.get("seconds") or 0)
+            rows = int(stats.get("rows") or 0)
+            objects.append({"sobject": stats["sobject"], "seconds": round(seconds, 3), "rows": rows,
+                            "start": None,
+                            "phases": {"load": {"seconds": round(seconds, 3), "rows": rows,
+                                                "rows_per_second": round(rows / seconds, 1) if seconds and rows else None}}})
+        passes.append({"index": int(obj_set.get("index", len(passes))) + 1, "objects": objects,
+                       "seconds": round(float(obj_set.get("seconds") or 0), 3)})
+    ranked = sorted((dict(o, **{"pass": p["index"]}) for p in passes for o in p["objects"]),
+                    key=lambda o: o["seconds"], reverse=True)
+    return {
+        "plan": plan or report.get("plan", ""),
+        "engine": "native",
+        "operation": "load",
+        "generated_at": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "timestamps": "native",
+        "seconds": round(float(report.get("seconds") or 0), 3),
+        "passes": passes,
+        "top_objects": [{k: o[k] for k in ("pass", "sobject", "seconds", "rows")} for o in ranked[:10]],
+    }
+
+
+def summary_lines(profile: Mapping[str, Any], top: int = 5) -> List[str]:
+    """Log lines: the slowest objects with their phase split."""
+    lines = [f"SFDMU profile ({profile.get('operation')}, {profile.get('seconds', 0):.1f}s): "
+             f"{sum(len(p['objects']) for p in profile.get('passes') or [])} object(s) in "
+             f"{len(profile.get('passes') or [])} pass(es)"]
+    objects = {(p["index"], o["sobject"]): o for p in profile.get("passes") or [] for o in p["objects"]}
+    for row in (profile.get("top_objects") or [])[:top]:
+        obj = objects.get((row["pass"], row["sobject"]), {})
+        split = ", ".join(f"{name} {phase['seconds']:.1f}s"
+                          + (f" ({phase['rows_per_second']:.0f} rows/s)" if phase.get("rows_per_second") else "")
+                          for name, phase in (obj.get("phases") or {}).items())
+        lines.append(f"  pass {row['pass']} {row['sobject']}: {row['seconds']:.1f}s, {row['rows']} rows [{split}]")
+    return lines
+
+
+def write_profile(profile: Mapping[str, Any], plan_dir: str, *, metrics_dir: Optional[str] = None) -> List[str]:
+    """Write ``sfdmu_profile.json`` beside the plan, plus a copy into the metrics dir if set."""
+    written = []
+    targets = [os.path.join(plan_dir, PROFILE_FILENAME)]
+    metrics_dir = metrics_dir if metrics_dir is not None else os.environ.get(METRICS_ENV_VAR)
+    if metrics_dir:
+        slug = os.path.normpath(plan_dir).replace(os.sep, "__").strip("._") or "plan"
+        targets.append(os.path.join(metrics_dir, f"{METRICS_PREFIX}{slug}-{os.getpid()}.json"))
+    for path in targets:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+        written.append(path)
+    return written
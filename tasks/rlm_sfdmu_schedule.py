@@ -0,0 +1,218 @@
+"""Cross-plan scheduling for SFDMU loads: which plans can run at the same time.
+
+The flows load ``qb-pcm``, ``qb-pricing``, ``qb-tax``, ``qb-billing`` … one
+after another. Most of those plans only meet on a few objects. Each plan
+declares every object it touches in its export.json, and the lookup columns
+name the rest. So a plan needs to wait for an earlier plan (list order is
+the serial order the flows already use) only when they share an object and
+at least one of these holds:
+
+* either plan creates the object (Insert / Upsert, or ``deleteOldData``). The
+  other plan reads, links to or updates those records;
+* both plans update it. By default this always counts. With
+  ``concurrent_updates`` it counts only if the updated field sets overlap,
+  since different fields of the same rows do not conflict except for row locks;
+* one plan updates fields the other matches records on (its ``externalId``).
+
+Lookup paths name relationships, not objects (``PriceBook.Name``,
+``ParentProduct.StockKeepingUnit``). Each hop is resolved to the object it
+points at among the objects the scheduled plans load
+(:func:`rlm_sfdmu_plan.relationship_sobject`). A plan with a relationship that
+cannot be resolved waits for every earlier plan.
+
+Everything else, such as two plans that both look up ``Product2`` by SKU, runs
+concurrently. :func:`plan_dependencies` builds that DAG. :func:`run_schedule`
+runs it with at most ``max_parallel`` loads in flight. When a plan fails, the
+plans that depend on it are skipped, and independent ones finish.
+:func:`gantt_lines` renders the timing report.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Set, Tuple
+
+from tasks import rlm_sfdmu_plan
+
+_CREATE_OPS = {"insert", "upsert"}
+_UPDATE_OPS = {"update"}
+ALL_FIELDS = "*"  # an Update whose SELECT uses the ``all`` / ``readonly_false`` markers
+
+
+def _key_fields(obj: Mapping[str, Any]) -> Set[str]:
+    return {c.split(".", 1)[0].lower() for c in (obj.get("externalId") or "").replace("$", ";").split(";") if c}
+
+
+def _updated_fields(obj: Mapping[str, Any]) -> Set[str]:
+    fields = {f.split(".", 1)[0].lower() for f in rlm_sfdmu_plan.query_fields(obj.get("query", ""))}
+    if fields & {"all", "readonly_false"}:
+        return {ALL_FIELDS}
+    return fields - _key_fields(obj) - {"id"}
+
+
+def _load_plan(plan_dir: str) -> Dict[str, Any]:
+    with open(os.path.join(plan_dir, "export.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _plan_objects(plan: Mapping[str, Any]) -> List[Tuple[str, Mapping[str, Any]]]:
+    """``(sobject, plan object)`` for every non-excluded object of the plan."""
+    found = []
+    for obj_set in rlm_sfdmu_plan.object_sets(plan):
+        for obj in obj_set.get("objects", []):
+            sobject = rlm_sfdmu_plan.query_sobject(obj.get("query", ""))
+            if sobject and not obj.get("excluded"):
+                found.append((sobject, obj))
+    return found
+
+
+def plan_access(plan_dir: str, sobjects: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """How one plan touches each object.
+
+    Returns ``creates``, ``reads`` (declared objects plus the objects its
+    lookup paths go through), ``updates`` (object -> updated field names),
+    ``keys`` (object -> fields records are matched on) and ``unresolved``
+    (``Object.Relationship`` hops whose object is unknown). Relationships are
+    resolved among ``sobjects`` (default: the objects the plan declares).
+    """
+    objects = _plan_objects(_load_plan(plan_dir))
+    known = set(sobjects or ()) | {sobject for sobject, _ in objects}
+    creates: Set[str] = set()
+    reads: Set[str] = set()
+    updates: Dict[str, Set[str]] = {}
+    keys: Dict[str, Set[str]] = {}
+    unresolved: Set[str] = set()
+    for sobject, obj in objects:
+        op = str(obj.get("operation") or "Upsert").lower()
+        reads.add(sobject)
+        keys.setdefault(sobject, set()).update(_key_fields(obj))
+        if op in _CREATE_OPS or obj.get("deleteOldData"):
+            creates.add(sobject)
+        elif op in _UPDATE_OPS:
+            updates.setdefault(sobject, set()).update(_updated_fields(obj))
+        paths = rlm_sfdmu_plan.query_fields(obj.get("query", ""))
+        paths += (obj.get("externalId") or "").replace("$", ";").split(";")
+        for path in paths:
+            current = sobject
+            for rel in [part.strip() for part in path.split(".")[:-1]]:
+                target = rlm_sfdmu_plan.relationship_sobject(rel, known, current)
+                if not target:
+                    unresolved.add(f"{current}.{rel}")
+                    break
+                reads.add(target)
+                current = target
+    return {"creates": creates, "reads": reads, "updates": updates, "keys": keys, "unresolved": unresolved}
+
+
+def _conflicts(a: Mapping[str, Any], b: Mapping[str, Any], concurrent_updates: bool) -> Set[str]:
+    """Objects on which plans ``a`` and ``b`` must not run at the same time."""
+    found: Set[str] = set()
+    touched_a = a["reads"] | a["creates"] | set(a["updates"])
+    touched_b = b["reads"] | b["creates"] | set(b["updates"])
+    found |= (a["creates"] & touched_b) | (b["creates"] & touched_a)
+    for sobject in set(a["updates"]) & set(b["updates"]):
+        fa, fb = a["updates"][sobject], b["updates"][sobject]
+        if not concurrent_updates or ALL_FIELDS in fa | fb or fa & fb:
+            found.add(sobject)
+    for writer, reader in ((a, b), (b, a)):
+        for sobject, fields in writer["updates"].items():
+            if sobject in reader["reads"] and (ALL_FIELDS in fields or fields & reader["keys"].get(sobject, set())):
+                found.add(sobject)
+    return found
+
+
+def plan_dependencies(plans: Sequence[Tuple[str, str]], *, concurrent_updates: bool = False
+                      ) -> Dict[str, Dict[str, List[str]]]:
+    """``name -> {earlier plan name: [objects]}`` for ``plans`` given as ``(name, plan_dir)`` in serial order.
+
+    Only direct conflicts are listed; waits through a chain come for free. A
+    plan with unresolved relationships waits for every earlier plan, listed
+    with its shared objects or else the unresolved ``Object.Relationship`` hops.
+    """
+    known = {sobject for _, plan_dir in plans for sobject, _ in _plan_objects(_load_plan(plan_dir))}
+    access = {name: plan_access(plan_dir, known) for name, plan_dir in plans}
+    names = [name for name, _ in plans]
+    deps: Dict[str, Dict[str, List[str]]] = {name: {} for name in names}
+    for i, later in enumerate(names):
+        for earlier in names[:i]:
+            shared = _conflicts(access[earlier], access[later], concurrent_updates)
+            if shared or access[later]["unresolved"]:
+                deps[later][earlier] = sorted(shared) or sorted(access[later]["unresolved"])
+    return deps
+
+
+def run_schedule(names: Sequence[str], deps: Mapping[str, Mapping[str, Any]],
+                 run_one: Callable[[str], None], *, max_parallel: int = 3,
+                 log: Optional[Callable[[str], None]] = None,
+                 clock: Callable[[], float] = time.monotonic) -> List[Dict[str, Any]]:
+    """Run ``run_one(name)`` for every plan, each once all of its ``deps`` succeeded.
+
+    Returns one timing entry per plan in ``names`` order: ``status``
+    (``ok`` / ``failed`` / ``skipped``), ``start`` / ``end`` seconds from the
+    schedule start, ``after`` (its dependencies) and ``error``.
+    """
+    log = log or (lambda msg: None)
+    origin = clock()
+    entries = {name: {"name": name, "status": "pending", "start": None, "end": None,
+                      "after": list(deps.get(name, {})), "error": None} for name in names}
+    lock = threading.Lock()
+
+    def run(name: str) -> None:
+        with lock:
+            entries[name]["start"] = round(clock() - origin, 3)
+        try:
+            run_one(name)
+            status, error = "ok", None
+        except Exception as e:  # recorded; dependents are skipped, the rest continue
+            status, error = "failed", str(e)
+        with lock:
+            entries[name].update(status=status, error=error, end=round(clock() - origin, 3))
+
+    pending = list(names)
+    running: Dict[Any, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, int(max_parallel))) as pool:
+        while pending or running:
+            for name in list(pending):
+                states = [entries[d]["status"] for d in entries[name]["after"] if d in entries]
+                if any(s in ("failed", "skipped") for s in states):
+                    entries[name]["status"] = "skipped"
+                    entries[name]["error"] = "dependency did not load"
+                    pending.remove(name)
+                    log(f"{name}: skipped (a plan it depends on did not load)")
+                elif all(s == "ok" for s in states) and len(running) < max(1, int(max_parallel)):
+                    entries[name]["status"] = "running"
+                    pending.remove(name)
+                    log(f"{name}: started")
+                    running[pool.submit(run, name)] = name
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                entry = entries[name]
+                log(f"{name}: {entry['status']} in {entry['end'] - entry['start']:.1f}s"
+                    + (f" ({entry['error']})" if entry["error"] else ""))
+    return [entries[name] for name in names]
+
+
+def gantt_lines(timings: Sequence[Mapping[str, Any]], width: int = 50) -> List[str]:
+    """Text Gantt chart: one bar per plan over the schedule's wall time."""
+    ends = [t["end"] for t in timings if t.get("end") is not None]
+    total = max(ends) if ends else 0.0
+    label = max([len(t["name"]) for t in timings] + [4])
+    lines = [f"{'plan'.ljust(label)}  {'start':>7} {'secs':>7}  |{'timeline'.ljust(width)}|"]
+    for t in timings:
+        if t.get("start") is None or t.get("end") is None:
+            lines.append(f"{t['name'].ljust(label)}  {'-':>7} {'-':>7}  |{' ' * width}| {t['status']}")
+            continue
+        scale = width / total if total else 0
+        left = min(width - 1, int(t["start"] * scale))
+        bar = max(1, int(round(t["end"] * scale)) - left)
+        char = "#" if t["status"] == "ok" else "x"
+        row = (" " * left + char * bar).ljust(width)[:width]
+        lines.append(f"{t['name'].ljust(label)}  {t['start']:7.1f} {t['end'] - t['start']:7.1f}  |{row}|"
+                     + ("" if t["status"] == "ok" else f" {t['status']}"))
+    serial = sum(t["end"] - t["start"] for t in timings if t.get("end") is not None)
+    lines.append(f"wall {total:.1f}s vs {serial:.1f}s serial")
+    return lines
@@ -1,8 +1,9 @@
-import requests
 from cumulusci.tasks.sfdx import SFDXBaseTask
 from cumulusci.core.keychain import BaseProjectKeychain
 from abc import abstractmethod
 
+from tasks import rlm_http
+
 # ExtendStandardContext is a custom task that extends the SFDXBaseTask provided by CumulusCI.
 class SyncPricingData(SFDXBaseTask):
     
@@ -51,15 +52,12 @@ class SyncPricingData(SFDXBaseTask):
     # Helper to construct the request URL and headers for making API calls
     def _build_url_and_headers(self, endpoint):
         url = f"{self.instance_url}/services/data/v{self.project_config.project__package__api_version}/{endpoint}"
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-        }
+        headers = rlm_http.auth_headers(self.access_token)
         return url, headers
 
-    # Make an HTTP request using the requests library and handle the response
+    # Make an HTTP request through the org's shared session and handle the response
     def _make_request(self, method, url, **kwargs):
-        response = requests.request(method, url, **kwargs)
+        response = rlm_http.request(method, url, **kwargs)
         if response.ok:
             return response.json()
         else:
@@ -67,6 +67,18 @@ def test_run_command_stream_honors_stop_event(tmp_path) -> None:
     assert result["exit_code"] != 0
 
 
+def test_run_command_layers_env_over_current_environment(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("HARNESS_INHERITED", "kept")
+    lines = []
+    run_command_stream(
+        [sys.executable, "-c", "import os; print(os.environ['HARNESS_INHERITED'], os.environ['HARNESS_EXTRA'])"],
+        cwd=tmp_path,
+        on_line=lines.append,
+        env={"HARNESS_EXTRA": "added"},
+    )
+    assert "kept added" in lines
+
+
 def test_run_command_can_suppress_stdout(tmp_path, capsys) -> None:
     log_path = tmp_path / "scenario.log"
     run_command(
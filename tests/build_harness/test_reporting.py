@@ -12,6 +12,8 @@ import pytest
 from scripts.build_harness.harness.reporting import (
     build_run_analysis,
     estimate_optimization_heuristics,
+    render_report,
+    write_analysis_artifacts,
 )
 
 
@@ -144,3 +146,63 @@ class TestBuildRunAnalysis:
         run_dir = self._make_run_dir(tmp_path, sr, step_events_by_scenario={"s1": events})
         result = build_run_analysis(run_dir, {"scenario_results": sr})
         assert result["dependency_summary"]["failure_dependencies"] == []
+
+    def test_transport_metrics_are_attributed_per_step(self, tmp_path) -> None:
+        sr = [{"scenario_id": "s1", "status": "success", "failed_step": None, "failed_target": None, "failure_signature": "", "failure_class": "none", "org_alias": "a1"}]
+        transport = {"calls": 3, "total_seconds": 4.5, "spawn_seconds": 2.0, "summary_path": "transport_metrics/step-002/summary.json"}
+        events = [
+            {"phase": "prepare_step", "status": "success", "step_number": 2, "target_type": "task", "target_name": "refresh_decision_tables", "duration_seconds": 9, "failure_signature": "", "transport_metrics": transport},
+        ]
+        run_dir = self._make_run_dir(tmp_path, sr, step_events_by_scenario={"s1": events})
+        metrics_dir = run_dir / "scenarios" / "s1" / "transport_metrics" / "step-002"
+        metrics_dir.mkdir(parents=True)
+        endpoint = {"transport": "cli", "method": "GET", "endpoint": "tooling/query", "calls": 3, "p50_seconds": 1.5, "p95_seconds": 1.9, "p99_seconds": 1.9, "buckets": [0, 1]}
+        (metrics_dir / "summary.json").write_text(json.dumps({"calls": 3, "endpoints": [endpoint]}))
+        run_summary = {"run_id": "run-test", "scenario_results": [dict(sr[0], can_resume=False)]}
+
+        result = write_analysis_artifacts(run_dir, run_summary)
+
+        step_row = result["dependency_summary"]["step_outcomes"][0]
+        assert step_row["transport_calls"] == 3
+        assert step_row["transport_spawn_seconds"] == 2.0
+        step = result["transport_summary"]["steps"][0]
+        assert step["target"] == "task:refresh_decision_tables"
+        assert step["top_endpoints"][0]["endpoint"] == "tooling/query"
+        assert "buckets" not in step["top_endpoints"][0]
+        assert (run_dir / "transport_summary.json").exists()
+        report = render_report(run_dir, run_summary)
+        assert "## Salesforce Request Latency" in report
+        assert "`GET tooling/query` (cli) x3 p50 `1.5`s" in report
+
+    def test_sfdmu_profiles_rank_objects_across_plans(self, tmp_path) -> None:
+        sr = [{"scenario_id": "s1", "status": "success", "failed_step": None, "failed_target": None, "failure_signature": "", "failure_class": "none", "org_alias": "a1"}]
+        profiles = ["transport_metrics/step-004/sfdmu_profile-pcm.json", "transport_metrics/step-004/sfdmu_profile-pricing.json"]
+        events = [
+            {"phase": "prepare_step", "status": "success", "step_number": 4, "target_type": "flow", "target_name": "prepare_product_data", "duration_seconds": 90, "failure_signature": "", "sfdmu_profiles": profiles},
+        ]
+        run_dir = self._make_run_dir(tmp_path, sr, step_events_by_scenario={"s1": events})
+        metrics_dir = run_dir / "scenarios" / "s1" / "transport_metrics" / "step-004"
+        metrics_dir.mkdir(parents=True)
+
+        def profile(plan, objects):
+            return {"plan": plan, "engine": "sfdmu", "operation": "load", "seconds": 60, "passes": [{"index": 1, "objects": objects}]}
+
+        insert = {"seconds": 40.0, "rows": 2000, "rows_per_second": 50.0}
+        (metrics_dir / "sfdmu_profile-pcm.json").write_text(json.dumps(profile("qb-pcm", [
+            {"sobject": "Product2", "seconds": 12.5, "rows": 400, "phases": {"query": {"seconds": 2.5, "rows": 400}}},
+        ])))
+        (metrics_dir / "sfdmu_profile-pricing.json").write_text(json.dumps(profile("qb-pricing", [
+            {"sobject": "PricebookEntry", "seconds": 41.0, "rows": 2000, "phases": {"insert": insert}},
+        ])))
+        run_summary = {"run_id": "run-test", "scenario_results": [dict(sr[0], can_resume=False)]}
+
+        result = write_analysis_artifacts(run_dir, run_summary)
+
+        summary = result["sfdmu_profile_summary"]
+        assert [row["sobject"] for row in summary["top_objects"]] == ["PricebookEntry", "Product2"]
+        assert summary["steps"][0]["plans"][1] == {"plan": "qb-pricing", "engine": "sfdmu", "operation": "load", "seconds": 60}
+        assert summary["top_objects"][0]["phases"]["insert"] == insert
+        assert (run_dir / "sfdmu_profile_summary.json").exists()
+        report = render_report(run_dir, run_summary)
+        assert "## SFDMU Object Timings" in report
+        assert "`qb-pricing` pass 1 `PricebookEntry`: `41.0`s, 2000 row(s) — insert `40.0`s (50.0 rows/s)" in report
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for the two expansion engines of
+scripts/expand_currency_pricing_data.py and scripts/expand_currency_rates_data.py.
+
+    python tests/test_expand_currency_data.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+The columnar engine is only worth having if nobody can tell its output from
+the row-at-a-time original, so the properties worth pinning are:
+
+* both engines write the same bytes for the shipped qb plans, for every
+  target set and in both rate modes (regenerate / preserve);
+* the same holds for cells the plans do not exercise yet: delimiters, quotes
+  and ``%`` in values, blank / zero / non-converted amounts, short composite
+  keys, duplicate base keys and rows in currencies that are neither base nor
+  target;
+* a composite cell whose currency segment is wrong is refused by both;
+* the synthetic ``--benchmark`` inputs come out identical too.
+"""
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from scripts import expand_currency_pricing_data as pricing  # noqa: E402
+from scripts import expand_currency_rates_data as rates_mod  # noqa: E402
+
+PRICING_PLAN = ROOT / "datasets" / "sfdmu" / "qb" / "en-US" / "qb-pricing"
+RATES_PLAN = ROOT / "datasets" / "sfdmu" / "qb" / "en-US" / "qb-rates"
+TARGETS = ["GBP", "EUR", "AUD", "CAD", "CHF", "JPY"]
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def csv_text(header, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(header)
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+def expand_both(text, fname, targets, rates, whole):
+    money_col, pred = pricing.CONFIG[fname]
+    args = (text, money_col, pred, "USD", targets, rates, whole, Decimal("0.5"), fname)
+    return pricing.expand_columns(*args), pricing.expand_rows(*args)
+
+
+def test_pricing_plan():
+    print("test_pricing_plan")
+    rates, whole = pricing.load_currency_table(str(PRICING_PLAN))
+    differ = []
+    for targets in (TARGETS, ["JPY", "GBP"], []):
+        for fname in pricing.CONFIG:
+            text = (PRICING_PLAN / fname).read_text()
+            columns, rows = expand_both(text, fname, targets, rates, whole)
+            if columns != rows:
+                differ.append((fname, targets))
+    check("both engines write the same bytes for every qb-pricing file", not differ, differ)
+    text = (PRICING_PLAN / "PricebookEntry.csv").read_text()
+    check("a full regeneration reproduces the shipped file",
+          expand_both(text, "PricebookEntry.csv", TARGETS, rates, whole)[0][0] == text)
+
+
+def test_pricing_edge_cells():
+    print("test_pricing_edge_cells")
+    rates = {"USD": Decimal(1), "GBP": Decimal("0.75"), "JPY": Decimal("150.123")}
+    whole = {"JPY"}
+    header = ["$$Name$CurrencyIsoCode$EffectiveFrom", "AdjustmentType", "AdjustmentValue", "CurrencyIsoCode",
+              "Description", "PriceAdjustmentSchedule.$$Name$CurrencyIsoCode"]
+    text = csv_text(header, [
+        ["Tier, \"A\";USD;2024", "Amount", "10.25", "USD", "50% off, \"today\"", "Sched;USD"],
+        [";USD;2024", "Percentage", "15", "USD", "", ""],
+        ["B;USD;2024", "Override", "0", "USD", "x", "Sched;USD"],
+        ["C;USD;2024", "Amount", "", "USD", "y", "Sched;USD"],
+        ["C;GBP;2024", "Amount", "99", "GBP", "stale", "Sched;GBP"],
+        ["D;EUR;2024", "Amount", "5", "EUR", "kept", "Sched;EUR"],
+        ["E;USD;2024", "Amount", "10.25", "USD", "same amount", "Sched;USD"],
+    ])
+    columns, rows = expand_both(text, "AttributeBasedAdjustment.csv", ["GBP", "JPY"], rates, whole)
+    check("quoted, %, blank, zero and non-target cells come out the same", columns == rows,
+          (columns[0], rows[0]))
+    lines = columns[0].splitlines()
+    check("stale targets are dropped and other currencies kept",
+          "stale" not in columns[0] and any(line.startswith("D;EUR") for line in lines))
+    check("only amount-type values are converted",
+          '"Tier, ""A"";GBP;2024",Amount,7.5,GBP' in columns[0] and ";JPY;2024,Percentage,15,JPY" in columns[0],
+          lines)
+    check("counts agree", columns[1:3] == rows[1:3] == (5, 6 + 10), (columns[1:3], rows[1:3]))
+
+    broken = csv_text(header, [["A;GBP;2024", "Amount", "1", "USD", "", "Sched;USD"]])
+    errors = []
+    for engine in (pricing.expand_columns, pricing.expand_rows):
+        try:
+            engine(broken, "AdjustmentValue", pricing._amount_adj, "USD", ["GBP"], rates, whole,
+                   Decimal("0.5"), "AttributeBasedAdjustment.csv")
+        except ValueError as exc:
+            errors.append("currency segment not found" in str(exc))
+    check("a misplaced currency segment is refused by both engines", errors == [True, True], errors)
+
+
+def expand_rates_both(plan, targets, rates, decimals, regenerate):
+    """Run both engines on copies of ``plan``; return (files, counts, example rows) per engine."""
+    results = []
+    for engine in ("columns", "rows"):
+        work = tempfile.mkdtemp(prefix="expand_rates_")
+        try:
+            copy = os.path.join(work, "plan")
+            shutil.copytree(plan, copy)
+            outcome = []
+            for expand in (rates_mod.expand_rate_card_entries, rates_mod.expand_rate_adjustments):
+                n_base, added, total, fields = expand(copy, "USD", targets, rates, decimals, regenerate, engine)
+                outcome.append((n_base, total, list(rates_mod._dicts(fields, added))))
+            files = [Path(copy, name).read_text() for name in (rates_mod.RCE_FILE, rates_mod.RABT_FILE)]
+            results.append((files, outcome))
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+    return results
+
+
+def test_rates_plan():
+    print("test_rates_plan")
+    rates, decimals = rates_mod.load_currency_table(str(PRICING_PLAN))
+    differ = []
+    for targets in (TARGETS, ["JPY"], []):
+        for regenerate in (True, False):
+            columns, rows = expand_rates_both(str(RATES_PLAN), targets, rates, decimals, regenerate)
+            if columns != rows:
+                differ.append((targets, regenerate))
+    check("both engines write the same files and report the same rows for qb-rates", not differ, differ)
+    columns, _ = expand_rates_both(str(RATES_PLAN), TARGETS, rates, decimals, True)
+    shipped = [(RATES_PLAN / name).read_text() for name in (rates_mod.RCE_FILE, rates_mod.RABT_FILE)]
+    check("a full regeneration reproduces the shipped files", columns[0] == shipped)
+
+
+def test_rates_edge_cells():
+    print("test_rates_edge_cells")
+    rates = {"USD": Decimal(1), "GBP": Decimal("0.75"), "JPY": Decimal("150.123")}
+    decimals = {"USD": 2, "GBP": 2, "JPY": 0}
+    root = tempfile.mkdtemp(prefix="expand_rates_")
+    try:
+        rce = ["$$Product.StockKeepingUnit$RateCard.Name$UsageResource.Code$RateUnitOfMeasure.UnitCode",
+               "Note", "Rate", "RateUnitOfMeasure.Name", "RateUnitOfMeasure.UnitCode"]
+        with open(os.path.join(root, rates_mod.RCE_FILE), "w", newline="") as fh:
+            fh.write(csv_text(rce, [
+                ["S1;Card, \"x\";R1;USD", "100% \"ok\"", "0.004", "USD", "USD"],
+                ["S1;Card, \"x\";R1;USD", "duplicate key", "9", "USD", "USD"],
+                ["S2;Card;R1", "short key", "1", "USD", "USD"],
+                ["S3;Card;R1;USD", "multi\nline", "", "USD", "USD"],
+                ["S3;Card;R1;GBP", "old", "1", "GBP", "GBP"],
+                ["S0;Card;R1;TOKEN", "tokens", "2", "TOKEN", "TOKEN"],
+            ]))
+            fh.write("S4;Card;R1;USD,,3\n")  # short row
+        rabt = ["$$Product$RateCard$Unit$Resource$LB$UB", "AdjustmentType", "AdjustmentValue", "c3", "c4",
+                "c5", "c6", "c7", "RateCardEntry.$$Product$RateCard$Resource$Unit", "RateUnitOfMeasure.Name",
+                "RateUnitOfMeasureName"]
+        with open(os.path.join(root, rates_mod.RABT_FILE), "w", newline="") as fh:
+            fh.write(csv_text(rabt, [
+                ["S1;Card;USD;R1;0;10", "Override", "1.5", "", "", "", "", "", "S1;Card;R1;USD", "USD", "USD"],
+                ["S1;Card;USD;R1;10;", "Percentage", "20", "", "", "", "", "", "S1;Card;R1;USD", "USD", "USD"],
+            ]))
+        regenerated, regenerated_rows = expand_rates_both(root, ["GBP", "JPY"], rates, decimals, True)
+        preserved, preserved_rows = expand_rates_both(root, ["GBP", "JPY"], rates, decimals, False)
+
+        with open(os.path.join(root, rates_mod.RABT_FILE), "a", newline="") as fh:
+            fh.write("S9;Card;USD;R1;0;1,Override,1,,,,,,S9;Card;R1;USD,USD,USD,extra\n")
+        errors = []
+        for engine in ("columns", "rows"):
+            try:
+                rates_mod.expand_rate_adjustments(root, "USD", ["GBP"], rates, decimals, True, engine)
+            except ValueError as exc:
+                errors.append(str(exc))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("quotes, %, line breaks, short rows and short or duplicate keys come out the same",
+          regenerated == regenerated_rows, regenerated[0][0])
+    check("preserve mode comes out the same", preserved == preserved_rows, preserved[0][0])
+    card = regenerated[0][0]
+    check("the first duplicate wins, short keys and token rows are not expanded",
+          card.count("GBP,GBP") == 2 and '"100% ""ok""",0.003,GBP' in card and "S2;Card;R1," in card and "TOKEN" in card and "old" not in card, card)
+    check("a row with extra fields is refused by both engines", len(errors) == 2 and errors[0] == errors[1],
+          errors)
+
+
+def test_benchmarks():
+    print("test_benchmarks")
+    quiet = []
+    price = pricing.benchmark(2000, 12, log=quiet.append)
+    rate = rates_mod.benchmark(2000, 12, log=quiet.append)
+    check("the synthetic pricing input expands identically", price["identical"] and price["output_rows"] > 1900,
+          price)
+    check("the synthetic rate inputs expand identically", rate["identical"] and rate["output_rows"] > 1900, rate)
+
+
+def main():
+    for test in (
+        test_pricing_plan,
+        test_pricing_edge_cells,
+        test_rates_plan,
+        test_rates_edge_cells,
+        test_benchmarks,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_org_fingerprint.py, the batched count +
+SystemModstamp snapshot behind TestSFDMUIdempotency.
+
+    python tests/test_org_fingerprint.py
+
+No org and no CumulusCI install required. Runs against the local REST
+stand-in (scripts/sf_standin) on an ephemeral port.
+
+Two things are worth pinning. First, 25 objects per composite/batch call,
+because that is the whole speed-up over one CLI call per object. Second, an
+in-place update must change the fingerprint even though the count does not,
+or "nothing changed" would be a lie for upsert-only plans. A batch call that
+fails, or answers for fewer objects than asked, must raise rather than leave
+objects out, since a missing count must never pass as "unchanged".
+"""
+import json
+import sys
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.sf_standin import store as standin_store  # noqa: E402
+from scripts.sf_standin.server import build_app, serve  # noqa: E402
+from tasks import rlm_http, rlm_org_fingerprint as fp  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+class CountingPost:
+    def __init__(self):
+        self.original = rlm_http.post
+        self.calls = 0
+
+    def __call__(self, url, **kwargs):
+        self.calls += 1
+        return self.original(url, **kwargs)
+
+
+def test_batched_fingerprint_against_standin():
+    print("test_batched_fingerprint_against_standin")
+    rlm_http.reset_sessions()
+    app = build_app()
+    names = [f"Obj{i:02d}__c" for i in range(30)]
+    ids = {name: app.store.create(name, {"Name": "x"}) for name in names[:5]}
+    poster = CountingPost()
+    rlm_http.post, original = poster, rlm_http.post
+    try:
+        with serve(app) as server:
+            first = fp.org_fingerprint(server.url, "standin", names + names[:3])
+            check("30 objects take two composite/batch calls", poster.calls == 2, poster.calls)
+            check("every object is fingerprinted once", list(first) == names, list(first)[:5])
+            check("counts are read", first["Obj00__c"]["count"] == 1 and first["Obj29__c"]["count"] == 0,
+                  first["Obj00__c"])
+            check("empty objects have no modstamp", first["Obj29__c"]["max_modstamp"] is None)
+            # The stand-in stamps to the second; pin a later one so the update shows.
+            now_iso, standin_store.now_iso = standin_store.now_iso, lambda: "2099-01-01T00:00:00.000+0000"
+            try:
+                app.store.update(ids["Obj01__c"], {"Name": "y"})
+            finally:
+                standin_store.now_iso = now_iso
+            app.store.create("Obj02__c", {"Name": "z"})
+            second = fp.org_fingerprint(server.url, "standin", names)
+    finally:
+        rlm_http.post = original
+        rlm_http.reset_sessions()
+    check("an in-place update changes the fingerprint, not the count",
+          fp.counts(second)["Obj01__c"] == 1 and "Obj01__c" in fp.changed_sobjects(first, second))
+    check("an insert is reported", "Obj02__c" in fp.changed_sobjects(first, second))
+    check("untouched objects are not reported",
+          fp.changed_sobjects(first, second) == ["Obj01__c", "Obj02__c"],
+          fp.changed_sobjects(first, second))
+    check("digest is order-independent and change-sensitive",
+          fp.fingerprint_digest(first) == fp.fingerprint_digest(dict(reversed(list(first.items()))))
+          and fp.fingerprint_digest(first) != fp.fingerprint_digest(second))
+
+
+def _batch_response(results):
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = json.dumps(
+        {"hasErrors": True, "results": results}).encode()
+    return resp
+
+
+def test_modstamp_fallback_and_skips():
+    print("test_modstamp_fallback_and_skips")
+    sent = []
+
+    def scripted_post(url, **kwargs):
+        queries = [r["url"] for r in kwargs["json"]["batchRequests"]]
+        sent.append(queries)
+        if len(sent) == 1:
+            return _batch_response([
+                {"statusCode": 200, "result": {"records": [{"cnt": 4, "lastModstamp": "t"}]}},
+                {"statusCode": 400, "result": [{"errorCode": "INVALID_FIELD",
+                                                "message": "No such column 'SystemModstamp'"}]},
+                {"statusCode": 400, "result": [{"errorCode": "INVALID_TYPE",
+                                                "message": "sObject type 'Gone' is not supported"}]},
+            ])
+        return _batch_response([{"statusCode": 200, "result": {"records": [{"cnt": 9}]}}])
+
+    warnings = []
+
+    class Log:
+        def warning(self, msg):
+            warnings.append(msg)
+
+    rlm_http.post, original = scripted_post, rlm_http.post
+    try:
+        result = fp.org_fingerprint("https://org.example.com", "t", ["A", "NoStamp", "Gone"],
+                                    logger=Log())
+    finally:
+        rlm_http.post = original
+    check("objects without SystemModstamp are re-asked for a count only",
+          len(sent) == 2 and "SystemModstamp" not in sent[1][0] and "NoStamp" in sent[1][0], sent)
+    check("fallback count is kept, with no modstamp",
+          result.get("NoStamp") == {"count": 9, "max_modstamp": None}, result)
+    check("unqueryable objects are skipped and logged",
+          "Gone" not in result and any("Gone" in w for w in warnings), warnings)
+    check("plan order is kept", list(result) == ["A", "NoStamp"], list(result))
+
+
+def test_batch_failures_raise():
+    print("test_batch_failures_raise")
+    failed = requests.Response()
+    failed.status_code = 503
+    failed._content = b"Service Unavailable"
+    errors = []
+    for response in (failed, _batch_response([
+            {"statusCode": 200, "result": {"records": [{"cnt": 4, "lastModstamp": "t"}]}}])):
+        rlm_http.post, original = (lambda url, response=response, **kwargs: response), rlm_http.post
+        try:
+            errors.append(fp.org_fingerprint("https://org.example.com", "t", ["A", "B"]))
+        except fp.CommandException as e:
+            errors.append(str(e))
+        finally:
+            rlm_http.post = original
+    check("a failed composite/batch call raises instead of skipping every object",
+          "503" in str(errors[0]), errors[0])
+    check("a result missing from the batch response raises instead of dropping the object",
+          "1 result(s) for 2" in str(errors[1]), errors[1])
+
+
+def main():
+    for test in (
+        test_batched_fingerprint_against_standin,
+        test_modstamp_fallback_and_skips,
+        test_batch_failures_raise,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
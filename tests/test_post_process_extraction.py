@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for scripts/post_process_extraction.py, the streaming
+per-object pipeline that turns raw SFDMU extraction CSVs into plan CSVs.
+
+    python tests/test_post_process_extraction.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+The processed CSVs are committed back into the plans, so the property worth
+pinning is that the fused streaming pass writes exactly what the whole-table
+stage functions produce when chained. That covers backfill, status rewrite,
+ID text resolution, defaults, alignment (with composite keys) and #N/A
+clean-up, and it must hold with or without worker processes. The key-digest
+diff (scripts/sfdmu_csv_diff.py) must count what a full-row comparison would.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import post_process_extraction as ppe  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+PLAN = {"objectSets": [
+    {"objects": [
+        {"query": "SELECT Name, Status, Product.StockKeepingUnit, Unit.UnitCode FROM RateCard",
+         "externalId": "Name"},
+        {"query": "SELECT Name, Code FROM AttributePicklist", "externalId": "Name"},
+        {"query": "SELECT Name FROM NotExtracted", "externalId": "Name"},
+    ]},
+    {"objects": [{"query": "SELECT Name, Status FROM RateCard", "externalId": "Name", "operation": "Update"}]},
+]}
+
+EXTRACTED = {
+    "RateCard": ['﻿"Name"', "Status", "Product.StockKeepingUnit", "Unit.UnitCode", "Unit.Name"],
+    "AttributePicklist": ["Name", "Code"],
+}
+PLAN_CSVS = {
+    "RateCard": (["Name", "Status", "$$Product.StockKeepingUnit$Unit.UnitCode", "Unit.UnitCode", "Extra"],
+                 [["rc0", "Draft", "SKU0;EA", "EA", ""], ["rc1", "Draft", "old", "HR", ""], ["gone", "", "", "", ""]]),
+    "AttributePicklist": (["Name", "Code"], [["Color", "Color"]]),
+}
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_fixture(root):
+    ext, plan = os.path.join(root, "ext"), os.path.join(root, "plan")
+    rate_rows = []
+    for i in range(40):
+        status = ("Active", "Inactive", "Draft")[i % 3]
+        code = "#N/A" if i % 4 else "EA"
+        sku = "#N/A" if i % 10 == 9 else f"SKU{i}"
+        rate_rows.append([f"rc{i}", status, sku, code, ("Each", "Hour")[i % 2]])
+    write(os.path.join(ext, "RateCard.csv"), EXTRACTED["RateCard"], rate_rows)
+    write(os.path.join(ext, "AttributePicklist.csv"), EXTRACTED["AttributePicklist"],
+          [["Color", "#N/A"], ["Size", ""], ["Fit", "FIT"]])
+    write(os.path.join(ext, "Unrelated.csv"), ["Name"], [["x"]])
+    write(os.path.join(ext, "CSVIssuesReport.csv"), ["Issue"], [["y"]])
+    for obj, (header, rows) in PLAN_CSVS.items():
+        write(os.path.join(plan, f"{obj}.csv"), header, rows)
+    write(os.path.join(plan, "objectset_source", "object-set-2", "RateCard.csv"), ["Name", "Status", "Missing"], [])
+    with open(os.path.join(plan, "export.json"), "w") as f:
+        json.dump(PLAN, f)
+    code_map_file = os.path.join(root, "code_map.json")
+    with open(code_map_file, "w") as f:
+        json.dump({"RateCard": {"Unit.UnitCode": {"Each": "EA", "Hour": "HR"}}}, f)
+    return ext, plan, code_map_file
+
+
+def chained(ext, plan, obj, code_map):
+    """The whole-table stage functions, run one after another."""
+    headers, rows = ppe.load_extracted_csv(ext, obj)
+    rows = ppe.backfill_relationship_codes(headers, rows, obj, code_map)
+    rows = ppe.rewrite_status(rows, headers, obj)
+    rows = ppe.resolve_id_text_fields(rows, headers, obj)
+    rows = ppe.apply_field_defaults(rows, headers, obj)
+    plan_headers, _ = ppe.load_plan_csv(plan, obj)
+    out_headers, out_rows = ppe.align_columns(headers, rows, plan_headers, obj)
+    return [out_headers] + ppe.normalize_na_values(out_rows, out_headers)
+
+
+def read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_streaming_matches_stages():
+    print("test_streaming_matches_stages")
+    root = tempfile.mkdtemp(prefix="ppe_")
+    try:
+        ext, plan, code_map_file = make_fixture(root)
+        code_map = ppe.load_code_map(code_map_file)
+        expected = {obj: chained(ext, plan, obj, code_map) for obj in EXTRACTED}
+        lines = {1: [], 2: []}
+        reports = {}
+        for workers in (1, 2):
+            out = os.path.join(root, f"out{workers}")
+            reports[workers] = ppe.process_extraction(ext, plan, out, diff_only=False, copy_to_plan=False,
+                                                      verbose=False, code_map_file=code_map_file,
+                                                      workers=workers, log=lines[workers].append)
+        got = {obj: read(os.path.join(root, "out1", f"{obj}.csv")) for obj in EXTRACTED}
+        bytes_equal = all(
+            open(os.path.join(root, "out1", name), "rb").read() == open(os.path.join(root, "out2", name), "rb").read()
+            for name in ("RateCard.csv", "AttributePicklist.csv", "objectset_source/object-set-2/RateCard.csv"))
+        written = sorted(os.listdir(os.path.join(root, "out1")))
+        source = read(os.path.join(root, "out1", "objectset_source", "object-set-2", "RateCard.csv"))
+        diff_only_out = os.path.join(root, "diff_only")
+        ppe.process_extraction(ext, plan, diff_only_out, diff_only=True, copy_to_plan=False,
+                               verbose=False, workers=1, log=lambda line: None)
+        diff_only_files = os.listdir(diff_only_out)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("the streamed CSVs equal the chained stage functions", got == expected, (got, expected))
+    check("codes are backfilled before the composite key is built",
+          got["RateCard"][2][2] == "SKU1;HR" and got["RateCard"][2][1] == "Draft", got["RateCard"][2])
+    check("#N/A parts of a composite key are blanked", got["RateCard"][10][2] == ";HR", got["RateCard"][10])
+    check("field defaults fill Code from Name", [r[1] for r in got["AttributePicklist"][1:]] == ["Color", "Size", "FIT"])
+    check("worker processes write the same bytes", bytes_equal)
+    check("worker processes log the same lines in the same order", lines[1] == lines[2], (lines[1], lines[2]))
+    check("only plan objects are processed", written == ["AttributePicklist.csv", "RateCard.csv", "objectset_source"],
+          written)
+    check("objectset_source keeps its own columns",
+          source[0] == ["Name", "Status", "Missing"] and source[1] == ["rc0", "Active", ""], source[:2])
+    check("diff_only writes no CSVs", diff_only_files == [], diff_only_files)
+    rate = reports[1]["RateCard"]
+    check("the digest diff counts identical, new, changed and missing records",
+          rate == {"identical": 1, "new": 38, "changed": 1, "missing": 1}
+          and reports[1]["AttributePicklist"] == {"identical": 1, "new": 2, "changed": 0, "missing": 0}
+          and reports[1] == reports[2], reports[1])
+
+
+def test_digest_diff():
+    print("test_digest_diff")
+    plan = ppe.csv_diff.RowIndex(["K", "V"], ["K"], ["K", "V"])
+    proc = ppe.csv_diff.RowIndex(["V", "K"], ["K"], ["K", "V"])
+    for row in (["a", "1"], ["b", ""], ["c", "x"]):
+        plan.add(row)
+    for row in (["2", "a"], ["", "b"], ["y", "d"]):
+        proc.add(row)
+    check("columns are matched by name", ppe.diff_counts(plan, proc) ==
+          {"identical": 1, "new": 1, "changed": 1, "missing": 1}, ppe.diff_counts(plan, proc))
+    root = tempfile.mkdtemp(prefix="ppe_")
+    try:
+        src, dst = os.path.join(root, "src.csv"), os.path.join(root, "dst.csv")
+        with open(src, "w", encoding="utf-8") as f:
+            f.write('﻿"A",B\r\n#N/A,x\r\n')
+        ppe.clean_incidental_copy(src, dst)
+        cleaned = open(dst, "rb").read()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("incidental copies are cleaned while streaming", cleaned == b"A,B\n,x\n", cleaned)
+
+
+def main():
+    for test in (
+        test_streaming_matches_stages,
+        test_digest_diff,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_http.py, the shared org session registry.
+
+    python tests/test_rlm_http.py
+
+No org and no CumulusCI install required. The retry rules are checked against
+scripted responses; pooling, gzip and 429 recovery against the local REST
+stand-in (scripts/sf_standin) on an ephemeral port.
+
+The retry rules are the part worth pinning. A POST that reached the org and
+failed with 500/502/504 may already have created its record, so it must not be
+sent again. A 429/503 means the org refused the call without running it, so
+every method may retry. A regression in either direction reads as "working"
+(duplicates, or a flow step failing on a throttle blip).
+"""
+import json
+import sys
+from pathlib import Path
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.sf_standin.server import Faults, build_app, serve  # noqa: E402
+from tasks import rlm_http  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+V = "/services/data/v67.0"
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+class FakeSession:
+    """Answers from a script of status codes (or exceptions) and counts calls."""
+
+    def __init__(self, script, headers=None):
+        self.script = list(script)
+        self.headers = headers or {}
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        resp = requests.Response()
+        resp.status_code = step
+        resp.headers.update(self.headers)
+        resp._content = b"{}"
+        return resp
+
+
+def scripted(method, script, headers=None, **kwargs):
+    session = FakeSession(script, headers)
+    waits = []
+    original = rlm_http.session_for
+    rlm_http.session_for = lambda url: session
+    try:
+        try:
+            result = rlm_http.request(method, "https://org.example.com/x",
+                                      sleep=waits.append, **kwargs).status_code
+        except requests.RequestException as exc:
+            result = type(exc).__name__
+    finally:
+        rlm_http.session_for = original
+    return result, session.calls, waits
+
+
+def test_retry_rules():
+    print("test_retry_rules")
+    status, calls, waits = scripted("GET", [502, 504, 200])
+    check("GET retries transient 5xx", status == 200 and calls == 3, (status, calls))
+    check("waits double from the base", waits == [1.5, 3.0], waits)
+    status, calls, _ = scripted("POST", [500, 200])
+    check("POST is not re-sent after a 500", status == 500 and calls == 1, (status, calls))
+    status, calls, _ = scripted("POST", [429, 503, 201])
+    check("POST retries 429/503 (never executed)", status == 201 and calls == 3, (status, calls))
+    status, calls, waits = scripted("PATCH", [503, 204], headers={"Retry-After": "7"})
+    check("Retry-After is honoured", status == 204 and waits == [7.0], waits)
+    status, calls, _ = scripted("GET", [503] * 6)
+    check("exhausted retries return the last response", status == 503 and calls == 4,
+          (status, calls))
+    status, calls, _ = scripted("GET", [503, 200], retries=1)
+    check("retries=1 opts out", status == 503 and calls == 1, (status, calls))
+    status, calls, _ = scripted("POST", [requests.exceptions.ReadTimeout("slow"), 201])
+    check("POST read timeout is re-raised, not re-sent",
+          status == "ReadTimeout" and calls == 1, (status, calls))
+    status, calls, _ = scripted("POST", [requests.exceptions.ConnectTimeout("no route"), 201])
+    check("POST connect timeout is retried", status == 201 and calls == 2, (status, calls))
+    status, calls, _ = scripted("GET", [requests.ConnectionError("reset"), 200])
+    check("GET retries a dropped connection", status == 200 and calls == 2, (status, calls))
+    check("auth headers carry the bearer token",
+          rlm_http.auth_headers("tok") == {"Authorization": "Bearer tok",
+                                           "Content-Type": "application/json"})
+
+
+def test_shared_sessions_against_standin():
+    print("test_shared_sessions_against_standin")
+    rlm_http.reset_sessions()
+    app = build_app()
+    with serve(app, Faults(rate_429=0.3), random_seed=3) as server:
+        check("one session per org origin",
+              rlm_http.session_for(f"{server.url}{V}/query")
+              is rlm_http.session_for(server.url.upper() + "/x"))
+        headers = rlm_http.auth_headers("standin")
+        big = {"Name": "Gzip", "Description": "x" * 4000}
+        resp = rlm_http.post(f"{server.url}{V}/sobjects/Account", headers=headers,
+                             data=json.dumps(big), sleep=lambda s: None)
+        check("large POST body is gzipped", resp.request.headers.get("Content-Encoding") == "gzip",
+              dict(resp.request.headers))
+        stored = app.store.find("Account", Name="Gzip")
+        check("stand-in decodes the gzipped body",
+              resp.status_code == 201 and stored and stored[0]["Description"] == "x" * 4000,
+              resp.text[:200])
+        small = rlm_http.post(f"{server.url}{V}/sobjects/Account", headers=headers,
+                              json={"Name": "Small"}, sleep=lambda s: None)
+        check("small POST body is sent as is", "Content-Encoding" not in small.request.headers)
+        statuses = [rlm_http.get(f"{server.url}{V}/limits", headers=headers, retries=8,
+                                 sleep=lambda s: None).status_code for _ in range(40)]
+        check("injected 429s are absorbed by retries", set(statuses) == {200},
+              statuses.count(429))
+        check("429s really were injected", server.injected["429"] > 0, server.injected)
+    rlm_http.reset_sessions()
+    check("reset forgets every session", not rlm_http._SESSIONS)
+
+
+def main():
+    for test in (
+        test_retry_rules,
+        test_shared_sessions_against_standin,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for scripts/scale_sfdmu_plans.py, the generator of
+N× copies of SFDMU plans for scale benchmarks.
+
+    python tests/test_scale_sfdmu_plans.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+A scaled plan is only a fair benchmark if it loads like the source, so the
+properties worth pinning are:
+
+* factor 1 writes the source rows back, and copy 1 of any factor is the
+  source;
+* the shipped qb-pcm / qb-pricing / qb-rates plans scale by N: products,
+  price book entries and rate card entries are N×, no key repeats, every
+  reference still resolves, and the dataset validator reports the same
+  issues;
+* references follow their copy inside ``$$`` cells, multi-level paths and
+  own keys learned from the plan (component groups), while blank / ``#N/A``
+  cells, quotes, commas and ``%`` are left as they were;
+* a key that would repeat is caught: by leaving the rows unscaled, by the
+  output check (exit 1), or by refusing a suffix that already exists.
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from scripts import scale_sfdmu_plans as scale  # noqa: E402
+from scripts import validate_sfdmu_references as refs  # noqa: E402
+from scripts import validate_sfdmu_v5_datasets as validator_mod  # noqa: E402
+
+QB = ROOT / "datasets" / "sfdmu" / "qb" / "en-US"
+PLANS = ["qb-pcm", "qb-pricing", "qb-rates"]
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_plan(plan_dir, objects):
+    os.makedirs(plan_dir, exist_ok=True)
+    with open(os.path.join(plan_dir, "export.json"), "w") as f:
+        json.dump({"objects": [dict({"query": f"SELECT Id FROM {name}", "operation": "Upsert"}, **opts)
+                               for name, opts in objects]}, f)
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [row for row in csv.reader(f) if row]
+
+
+def run(scope, out, factor, plans=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return scale.ScopeScaler(scope, plans).write(out, factor)
+
+
+def issues(root):
+    validator = validator_mod.SFDMUValidator(root)
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = validator.validate_datasets(validator.find_sfdmu_datasets())
+    return {r.dataset_name: sorted((i.severity.value, i.object_name, i.message) for i in r.issues) for r in results}
+
+
+def test_shipped_plans():
+    print("test_shipped_plans")
+    root = tempfile.mkdtemp(prefix="sfdmu_scale_")
+    try:
+        same = os.path.join(root, "x1")
+        run(str(QB), same, 1, PLANS)
+        unchanged = [f"{plan}/{name}" for plan in PLANS for name in os.listdir(QB / plan)
+                     if name.endswith(".csv") and read_rows(QB / plan / name) != read_rows(os.path.join(same, plan, name))]
+        repo = os.path.join(root, "repo")
+        scaled = os.path.join(repo, "datasets", "sfdmu", "qb", "en-US")
+        report = run(str(QB), scaled, 3, PLANS)
+        count = {name: len(read_rows(os.path.join(scaled, *name.split("/")))) - 1
+                 for name in ("qb-pcm/Product2.csv", "qb-pricing/PricebookEntry.csv", "qb-rates/RateCardEntry.csv")}
+        source = {name: len(read_rows(QB / name)) - 1 for name in count}
+        first_copy = read_rows(os.path.join(scaled, "qb-pcm", "Product2.csv"))[:len(read_rows(QB / "qb-pcm" / "Product2.csv"))]
+        everything = os.path.join(root, "all")
+        run(str(QB), everything, 2)
+        source_refs, scaled_refs = refs.check_scope(str(QB)), refs.check_scope(everything)
+        for plan in PLANS:
+            shutil.copytree(QB / plan, os.path.join(root, "source", "datasets", "sfdmu", "qb", "en-US", plan))
+        validated = issues(repo), issues(os.path.join(root, "source"))
+        export_same = all((QB / plan / "export.json").read_bytes() == Path(scaled, plan, "export.json").read_bytes()
+                          for plan in PLANS)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("factor 1 writes the source rows back", not unchanged, unchanged)
+    check("copy 1 is the source and export.json is copied as is",
+          first_copy == read_rows(QB / "qb-pcm" / "Product2.csv") and export_same)
+    check("products, price book entries and rate card entries are 3x", count == {k: 3 * v for k, v in source.items()},
+          (count, source))
+    check("no key repeats and nothing is left unscaled", not report["repeated_keys"] and not report["unscaled"],
+          report["repeated_keys"] + report["unscaled"])
+    check("every reference of the scaled qb scope still resolves",
+          not source_refs["dangling"] and not scaled_refs["dangling"]
+          and scaled_refs["references"] > source_refs["references"], scaled_refs["dangling"][:5])
+    check("the dataset validator reports the same issues", validated[0] == validated[1],
+          (validated[0], validated[1]))
+
+
+def make_scope(scope):
+    pcm, pricing = os.path.join(scope, "pcm"), os.path.join(scope, "pricing")
+    write_plan(pcm, [("Product2", {"externalId": "StockKeepingUnit"}),
+                     ("ProductSellingModel", {"externalId": "Name;SellingModelType"}),
+                     ("ProductComponentGroup", {"externalId": "Code"}),
+                     ("ProductRelatedComponent", {"externalId": "ChildProduct.StockKeepingUnit;"
+                                                                "ParentProduct.StockKeepingUnit;"
+                                                                "ProductComponentGroup.Code"}),
+                     ("ProductNote", {"externalId": "ProductSellingModel.Name;Kind"})])
+    write(os.path.join(pcm, "Product2.csv"), ["Name", "ProductCode", "StockKeepingUnit", "Description"],
+          [["Big Bundle", "QB-BDL", "QB-BDL", 'Says "hi", 50% off'], ["Small Part", "QB-PRT", "QB-PRT", ""]])
+    write(os.path.join(pcm, "ProductSellingModel.csv"), ["$$Name$SellingModelType", "Name", "SellingModelType"],
+          [["Term;TermDefined", "Term", "TermDefined"]])
+    write(os.path.join(pcm, "ProductComponentGroup.csv"), ["Code", "Name", "ParentGroup.Code",
+                                                           "ParentProduct.StockKeepingUnit"],
+          [["PCG-A", "Root group", "", "QB-BDL"], ["PCG-B", "Sub group", "PCG-A", ""]])
+    write(os.path.join(pcm, "ProductRelatedComponent.csv"),
+          ["$$ChildProduct.StockKeepingUnit$ParentProduct.StockKeepingUnit$ProductComponentGroup.Code",
+           "ChildProduct.StockKeepingUnit", "ParentProduct.StockKeepingUnit", "ProductComponentGroup.Code"],
+          [["QB-PRT;QB-BDL;PCG-B", "QB-PRT", "QB-BDL", "PCG-B"], ["#N/A;QB-BDL;PCG-A", "#N/A", "QB-BDL", "PCG-A"]])
+    write(os.path.join(pcm, "ProductNote.csv"), ["ProductSellingModel.Name", "Kind", "Product.StockKeepingUnit"],
+          [["Term", "note", "QB-PRT"]])
+    write_plan(pricing, [("Product2", {"operation": "Readonly", "externalId": "StockKeepingUnit"}),
+                         ("PricebookEntry", {"operation": "Insert", "externalId":
+                                             "Product2.StockKeepingUnit;ProductSellingModel.Name;CurrencyIsoCode"}),
+                         ("PricebookEntryDerivedPrice", {"operation": "Insert", "externalId":
+                                                         "PricebookEntry.Product2.StockKeepingUnit;CurrencyIsoCode"})])
+    write(os.path.join(pricing, "Product2.csv"), ["StockKeepingUnit"], [["QB-BDL"], ["QB-PRT"]])
+    write(os.path.join(pricing, "PricebookEntry.csv"),
+          ["$$Product2.StockKeepingUnit$ProductSellingModel.Name$CurrencyIsoCode", "CurrencyIsoCode",
+           "Product2.StockKeepingUnit", "ProductSellingModel.$$Name$SellingModelType", "UnitPrice"],
+          [["QB-BDL;Term;USD", "USD", "QB-BDL", "Term;TermDefined", "10"],
+           ["QB-PRT;Term;USD", "USD", "QB-PRT", "Term;TermDefined", "2"]])
+    write(os.path.join(pricing, "PricebookEntryDerivedPrice.csv"),
+          ["PricebookEntry.Product2.StockKeepingUnit", "CurrencyIsoCode", "Product.StockKeepingUnit"],
+          [["QB-BDL", "USD", "QB-PRT"]])
+
+
+def test_lookup_structure():
+    print("test_lookup_structure")
+    root = tempfile.mkdtemp(prefix="sfdmu_scale_")
+    try:
+        scope, out = os.path.join(root, "scope"), os.path.join(root, "out")
+        make_scope(scope)
+        report = run(scope, out, 2)
+        products = read_rows(os.path.join(out, "pcm", "Product2.csv"))
+        groups = read_rows(os.path.join(out, "pcm", "ProductComponentGroup.csv"))
+        components = read_rows(os.path.join(out, "pcm", "ProductRelatedComponent.csv"))
+        entries = read_rows(os.path.join(out, "pricing", "PricebookEntry.csv"))
+        derived = read_rows(os.path.join(out, "pricing", "PricebookEntryDerivedPrice.csv"))
+        notes = read_rows(os.path.join(out, "pcm", "ProductNote.csv"))
+        dangling = refs.check_scope(out)["dangling"]
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("products get a suffix in the separator each field uses, other cells are kept",
+          products[3] == ["Big Bundle S2", "QB-BDL-S2", "QB-BDL-S2", 'Says "hi", 50% off'], products)
+    check("own keys of rows that hang off a product are learned, and self references follow",
+          groups[3:] == [["PCG-A-S2", "Root group", "", "QB-BDL-S2"], ["PCG-B-S2", "Sub group", "PCG-A-S2", ""]],
+          groups)
+    check("$$ cells follow by position; #N/A and unscaled parents are left alone",
+          components[3:] == [["QB-PRT-S2;QB-BDL-S2;PCG-B-S2", "QB-PRT-S2", "QB-BDL-S2", "PCG-B-S2"],
+                             ["#N/A;QB-BDL-S2;PCG-A-S2", "#N/A", "QB-BDL-S2", "PCG-A-S2"]]
+          and entries[3] == ["QB-BDL-S2;Term;USD", "USD", "QB-BDL-S2", "Term;TermDefined", "10"],
+          (components, entries))
+    check("multi-level paths follow their product", derived[2] == ["QB-BDL-S2", "USD", "QB-PRT-S2"], derived)
+    check("a key no copy could make unique leaves the rows unscaled, and says so",
+          len(notes) == 2 and [item["object"] for item in report["unscaled"]] == ["ProductNote"], report["unscaled"])
+    check("the scaled scope has no dangling reference", not dangling, dangling)
+
+
+def test_repeated_keys():
+    print("test_repeated_keys")
+    root = tempfile.mkdtemp(prefix="sfdmu_scale_")
+    try:
+        scope = os.path.join(root, "scope")
+        make_scope(scope)
+        pricing = os.path.join(scope, "pricing")
+        write(os.path.join(pricing, "PricebookEntryDerivedPrice.csv"),
+              ["PricebookEntry.Product2.StockKeepingUnit", "CurrencyIsoCode", "Product.StockKeepingUnit"],
+              [["", "USD", "QB-PRT"]])
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            code = scale.main([scope, "--factor", "3", "-o", os.path.join(root, "out")])
+            again = scale.main([scope, "--factor", "3", "-o", os.path.join(root, "out")])
+        write(os.path.join(scope, "pcm", "Product2.csv"), ["Name", "ProductCode", "StockKeepingUnit"],
+              [["Bundle", "QB-BDL", "QB-BDL"], ["Bundle 2", "QB-BDL-S2", "QB-BDL-S2"]])
+        try:
+            run(scope, os.path.join(root, "clash"), 2)
+            clash = None
+        except scale.ScaleError as e:
+            clash = str(e)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("a row copied without a suffix in its key fails the output check", code == 1, code)
+    check("an existing output is not overwritten without --force", again == 2, again)
+    check("a suffix that already exists as a key is refused", clash is not None and "QB-BDL-S2" in clash, clash)
+
+
+def main():
+    for test in (
+        test_shipped_plans,
+        test_lookup_structure,
+        test_repeated_keys,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
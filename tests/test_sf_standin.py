@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""Offline suite for the local Salesforce REST stand-in (scripts/sf_standin).
+
+Run: ``python tests/test_sf_standin.py``.
+Each test starts an in-process server on an ephemeral port; no org is contacted.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.decision_tables import _client as dt_client  # noqa: E402
+from scripts.sf_standin import seed, soql  # noqa: E402
+from scripts.sf_standin.server import Faults, build_app, serve  # noqa: E402
+from scripts.decision_tables.dump_decision_table_data import dump_data  # noqa: E402
+from scripts.sf_transport import aio, bulk, pooled  # noqa: E402
+from scripts.txn_data_harness import auth, discovery, lifecycle  # noqa: E402
+from scripts.txn_data_harness.models import LineItem  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+V = "/services/data/v67.0"
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def _client(server) -> auth.SfRestClient:
+    os.environ[auth.STANDIN_ENV_VAR] = server.url
+    try:
+        return auth.SfRestClient.from_alias("standin", cassette=None)
+    finally:
+        os.environ.pop(auth.STANDIN_ENV_VAR, None)
+
+
+def test_soql_compile():
+    print("test_soql_compile")
+    q = soql.parse("SELECT Id, Account.Name FROM Contact WHERE Account.Name = 'A' "
+                   "AND Email != null ORDER BY CreatedDate DESC LIMIT 5")
+    sql, params = soql.compile_query(q)
+    check("relationship filter compiles to a correlated lookup", "AccountId" in sql, sql)
+    check("only literal values become parameters", params == ["Contact", "A"], params)
+    check("COUNT() is count-only", soql.parse("SELECT COUNT() FROM Account").count_only)
+    try:
+        soql.parse("SELECT Id FROM Account WITH SECURITY_ENFORCED")
+        check("unsupported clause raises", False, "parsed")
+    except soql.SoqlError:
+        check("unsupported clause raises SoqlError", True)
+
+
+def test_query_paging_and_crud():
+    print("test_query_paging_and_crud")
+    app = build_app(query_batch_size=200)
+    seed.seed_json(app.store, {"records": [{"ref": "a", "type": "Account", "fields": {"Name": "Acme"}}],
+                               "bulk": [{"type": "Contact", "count": 450,
+                                         "fields": {"LastName": "C{n}", "AccountId": "@a"}}]})
+    with serve(app) as server:
+        client = _client(server)
+        first = client.get(f"{V}/query?q={quote('SELECT Id, LastName, Account.Name FROM Contact')}")
+        check("totalSize counts every row", first["totalSize"] == 450, first["totalSize"])
+        check("first page is one batch", len(first["records"]) == 200 and not first["done"])
+        check("parent relationship is nested",
+              first["records"][0]["Account"]["Name"] == "Acme", first["records"][0])
+        seen = list(first["records"])
+        page = first
+        while not page["done"]:
+            page = client.get(page["nextRecordsUrl"])
+            seen.extend(page["records"])
+        check("nextRecordsUrl walks every row once",
+              [r["LastName"] for r in seen] == [f"C{n}" for n in range(1, 451)], len(seen))
+        check("SfRestClient.query follows every page",
+              len(client.query("SELECT Id FROM Contact")) == 450)
+        streamed = [r["LastName"] for r in client.iter_query("SELECT LastName FROM Contact")]
+        check("iter_query streams every page in order",
+              streamed == [f"C{n}" for n in range(1, 451)], len(streamed))
+
+        created = client.post(f"{V}/sobjects/Account", {"Name": "Globex"})
+        check("create returns an 18-char id", created["success"] and len(created["id"]) == 18, created)
+        client.patch(f"{V}/sobjects/Account/{created['id']}", {"Industry": "Energy"})
+        record = client.get(f"{V}/sobjects/Account/{created['id']}")
+        check("PATCH merges fields", record["Industry"] == "Energy" and record["Name"] == "Globex", record)
+        check("COUNT(Id) alias", client.query("SELECT COUNT(Id) total FROM Account")[0]["total"] == 2)
+        client.delete(f"{V}/sobjects/Account/{created['id']}")
+        try:
+            client.get(f"{V}/sobjects/Account/{created['id']}")
+            check("deleted record is gone", False, "still readable")
+        except auth.SfApiError as exc:
+            check("deleted record reads 404", exc.status == 404, exc.status)
+        try:
+            client.get(f"{V}/query?q={quote('SELECT Id FROM Account WHERE')}")
+            check("bad SOQL raises", False, "no error")
+        except auth.SfApiError as exc:
+            check("bad SOQL is MALFORMED_QUERY", "MALFORMED_QUERY" in exc.body, exc.body)
+
+
+def test_composite_endpoints():
+    print("test_composite_endpoints")
+    app = build_app()
+    with serve(app) as server:
+        client = _client(server)
+        ok = client.post(f"{V}/composite/sobjects", {"allOrNone": True, "records": [
+            {"attributes": {"type": "Account"}, "Name": f"A{i}"} for i in range(3)]})
+        check("collection create succeeds", all(r["success"] for r in ok), ok)
+        bad = client.post(f"{V}/composite/sobjects", {"allOrNone": True, "records": [
+            {"attributes": {"type": "Account"}, "Name": "kept?"},
+            {"attributes": {"type": "Contact"}, "AccountId": "001000000009999AAA"}]})
+        check("allOrNone failure fails every row", not any(r["success"] for r in bad), bad)
+        check("allOrNone rolls back earlier rows", app.store.count("Account") == 3,
+              app.store.count("Account"))
+        ids = ",".join(r["id"] for r in ok[:2]) + ",001000000008888AAA"
+        deleted = client.delete(f"{V}/composite/sobjects?ids={ids}&allOrNone=false")
+        check("partial delete reports per-row results",
+              [r["success"] for r in deleted] == [True, True, False], deleted)
+
+        chained = client.post(f"{V}/composite", {"allOrNone": True, "compositeRequest": [
+            {"method": "POST", "url": f"{V}/sobjects/Account", "referenceId": "acct",
+             "body": {"Name": "Chain"}},
+            {"method": "POST", "url": f"{V}/sobjects/Contact", "referenceId": "ct",
+             "body": {"LastName": "Ref", "AccountId": "@{acct.id}"}},
+            {"method": "GET", "url": f"{V}/sobjects/Contact/@{{ct.id}}", "referenceId": "read"},
+        ]})
+        statuses = [r["httpStatusCode"] for r in chained["compositeResponse"]]
+        check("composite resolves @{ref.id}", statuses == [201, 201, 200], statuses)
+
+        batch = client.post(f"{V}/composite/batch", {"batchRequests": [
+            {"method": "GET", "url": "v67.0/query?q=SELECT+COUNT()+FROM+Account"},
+            {"method": "GET", "url": "v67.0/sobjects/Account/001000000007777AAA"}]})
+        check("batch reports sub-request errors",
+              batch["hasErrors"] and batch["results"][0]["result"]["totalSize"] == 2, batch)
+
+        graph = client.post(f"{V}/composite/graph", {"graphs": [
+            {"graphId": "good", "compositeRequest": [
+                {"method": "POST", "url": f"{V}/sobjects/Account", "referenceId": "g1",
+                 "body": {"Name": "Graph"}}]},
+            {"graphId": "bad", "compositeRequest": [
+                {"method": "POST", "url": f"{V}/sobjects/Account", "referenceId": "g2",
+                 "body": {"Name": "Rolled back"}},
+                {"method": "PATCH", "url": f"{V}/sobjects/Account/001000000006666AAA",
+                 "referenceId": "g3", "body": {"Name": "x"}}]}]})
+        check("graphs succeed or roll back independently",
+              [g["isSuccessful"] for g in graph["graphs"]] == [True, False], graph)
+        names = {r["Name"] for r in client.query("SELECT Name FROM Account")}
+        check("failed graph leaves no rows", "Rolled back" not in names and "Graph" in names, names)
+        tooling = client.get(f"{V}/tooling/query?q={quote('SELECT COUNT() FROM Account')}")
+        check("tooling query shares the store", tooling["totalSize"] == len(names), tooling)
+
+
+def test_revenue_lifecycle_end_to_end():
+    print("test_revenue_lifecycle_end_to_end")
+    app = build_app()
+    seed.seed_demo(app.store, accounts=1)
+    saved_interval = lifecycle._POLL_INTERVAL
+    lifecycle._POLL_INTERVAL = 0
+    try:
+        with serve(app) as server:
+            client = _client(server)
+            ctx = discovery.discover(client, sku="QB-DB")
+            account = ctx.billing_ready_accounts[0]
+            product = ctx.products[0]
+            check("discovery resolves the seeded org",
+                  account.is_billing_ready and product.sku == "QB-DB" and ctx.legal_entity_id,
+                  ctx)
+            quote_id = lifecycle.place_sales_transaction(
+                client, account, [LineItem(product=product, quantity=2)], ctx.pricebook_id, "RUN1")
+            order_id, number = lifecycle.create_order_from_quote(client, quote_id)
+            check("createOrderFromQuote numbers the order", number == "00000001", number)
+            try:
+                lifecycle.activate_order(client, order_id)
+                check("activation without shipping fails", False, "activated")
+            except auth.SfApiError as exc:
+                check("activation without shipping is FAILED_ACTIVATION",
+                      "FAILED_ACTIVATION" in exc.body, exc.body)
+            lifecycle.set_shipping_address(client, order_id, account)
+            lifecycle.activate_order(client, order_id)
+            expected = lifecycle.count_order_items(client, order_id)
+            schedules = lifecycle.poll_billing_schedules(client, order_id, expected, timeout=5)
+            assets = lifecycle.poll_assets(client, order_id, timeout=5)
+            check("one schedule and asset per order item",
+                  len(schedules) == expected == 1 and len(assets.asset_ids) == 1, (schedules, assets))
+            invoice_id, _ = lifecycle.generate_invoice(client, schedules, "RUN1", timeout=5)
+            number = lifecycle.post_invoice(client, invoice_id, "RUN1", timeout=5)
+            check("posted invoice is numbered", number == "INV-00000001", number)
+            total = client.query(f"SELECT TotalAmount FROM Invoice WHERE Id = '{invoice_id}'")
+            check("invoice total is the PBE price x quantity",
+                  total[0]["TotalAmount"] == 240.0, total)
+    finally:
+        lifecycle._POLL_INTERVAL = saved_interval
+
+
+def test_async_delay_and_tracker_failure():
+    print("test_async_delay_and_tracker_failure")
+    now = [0.0]
+    app = build_app(async_delay=10, async_failure_rate=1.0)
+    app.clock = lambda: now[0]
+    invoice = app.store.create("Invoice", {"Status": "Draft"})
+    status, body, _ = app.handle("POST", f"{V}/commerce/invoicing/invoices/collection/actions/post",
+                                 body={"invoiceIds": [invoice]})
+    tracker_url = body["statusURL"]
+    check("post answers with a tracker", status == 200 and "AsyncOperationTracker" in tracker_url, body)
+    check("tracker starts InProgress", app.handle("GET", tracker_url)[1]["Status"] == "InProgress")
+    now[0] = 11
+    check("tracker lands after async_delay", app.handle("GET", tracker_url)[1]["Status"] == "Failed")
+    check("failed post leaves the invoice Draft", app.store.get(invoice)[1]["Status"] == "Draft")
+
+
+def test_fault_injection_and_limit_header():
+    print("test_fault_injection_and_limit_header")
+    import requests
+
+    with serve(build_app(), Faults(rate_429=0.5, rate_503=0.2), random_seed=7) as server:
+        session = requests.Session()
+        statuses = [session.get(f"{server.url}{V}/limits").status_code for _ in range(200)]
+        header = session.get(f"{server.url}{V}/limits").headers.get("Sforce-Limit-Info", "")
+        check("429s injected at roughly the rate", 70 < statuses.count(429) < 130, statuses.count(429))
+        check("503s injected at roughly the rate", 20 < statuses.count(503) < 60, statuses.count(503))
+        check("injected faults never reach the app",
+              server.app.requests + sum(server.injected.values()) == 201,
+              (server.app.requests, server.injected))
+        check("Sforce-Limit-Info header present", header.startswith("api-usage="), header)
+
+
+def test_toolkit_http_backend_against_standin():
+    print("test_toolkit_http_backend_against_standin")
+    app = build_app()
+    app.store.create("DecisionTable", {"DeveloperName": "Pricing", "Status": "Active"})
+    with serve(app) as server:
+        pooled.reset_backends()
+        pooled.register_backend(pooled.PooledBackend(
+            "standin", auth_resolver=lambda org: ("standin", server.url)))
+        os.environ[pooled.ENV_VAR] = "http"
+        try:
+            result = dt_client.connect_request(
+                "GET", "tooling/query?q=" + quote("SELECT Id, DeveloperName FROM DecisionTable"),
+                target_org="standin")
+        finally:
+            os.environ.pop(pooled.ENV_VAR, None)
+            pooled.reset_backends()
+    check("toolkit http backend reads the stand-in",
+          result["records"][0]["DeveloperName"] == "Pricing", json.dumps(result)[:200])
+
+
+def test_bulk_jobs_against_standin():
+    print("test_bulk_jobs_against_standin")
+    path = Path(__file__).resolve().parents[1] / "tasks" / "rlm_bulk.py"
+    spec = importlib.util.spec_from_file_location("_rlm_bulk", path)
+    tasks_bulk = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(tasks_bulk)
+
+    app = build_app()
+    for i in range(30):
+        app.store.create("Product2", {"Name": f"P{i}", "StockKeepingUnit": f"SKU-{i}"})
+    with serve(app) as server:
+        client = bulk.BulkClient(server.url, "standin", "67.0", poll_interval=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "p.csv"
+            n = client.query_to_csv("SELECT Id, Name FROM Product2", out, max_records=7)
+            lines = out.read_text().splitlines()
+            check("bulk query pages into one CSV", n == 30 and len(lines) == 31
+                  and lines[0] == "Id,Name", (n, lines[:2]))
+            result = client.ingest("Product2", "upsert", [
+                {"StockKeepingUnit": "SKU-1", "Name": "Renamed"},
+                {"StockKeepingUnit": "SKU-NEW", "Name": "New"},
+            ], external_id_field="StockKeepingUnit", results_dir=tmp)
+            created = sorted(r["sf__Created"] for r in result.rows())
+            check("bulk upsert updates and creates", result.processed == 2 and result.failed == 0
+                  and created == ["false", "true"], created)
+            check("bulk result files written",
+                  all(len(result.files[k]) == 1 and result.files[k][0].exists()
+                      for k in bulk.RESULT_KINDS))
+
+        tasks_client = tasks_bulk.BulkApi2(server.url, "standin", "67.0", poll_interval=0)
+        ids = [r["Id"] for r in tasks_client.iter_query("SELECT Id FROM Product2", max_records=8)]
+        summary = tasks_client.delete("Product2", ids[:10] + ["01t000000000BADAAA"], hard=True)
+        check("tasks bulk delete reports per-row failures",
+              summary["processed"] == 11 and summary["failed"] == 1
+              and summary["failures"][0]["sf__Id"] == "01t000000000BADAAA", summary)
+        check("tasks bulk delete removed the rows", app.store.count("Product2") == 21)
+        ops = [j["operation"] for j in app.bulk.jobs.values() if j["kind"] == "ingest"]
+        check("hard delete submitted as hardDelete", ops[-1] == "hardDelete", ops)
+
+        pooled.reset_backends()
+        pooled.register_backend(pooled.PooledBackend(
+            "standin", auth_resolver=lambda org: ("standin", server.url)))
+        os.environ[pooled.ENV_VAR] = "http"
+        try:
+            transport = dt_client.Transport("standin")
+            defn = {"table": {"DeveloperName": "T", "SourceObject": "Product2"},
+                    "metadata": {"dataSourceType": "SingleSobject"},
+                    "parameters": [{"FieldName": "Name"}]}
+            before = len(app.bulk.jobs)
+            dump = dump_data(transport, defn, 25, bulk_threshold=20)
+            rows = dump["samples"]["Product2"]
+            check("dump reads through bulk above the threshold",
+                  len(rows) == 21 and len(app.bulk.jobs) == before + 1, (len(rows), dump["notes"]))
+            dump = dump_data(transport, defn, 5, bulk_threshold=20)
+            check("dump stays on REST below the threshold",
+                  len(dump["samples"]["Product2"]) == 5 and len(app.bulk.jobs) == before + 1)
+        finally:
+            os.environ.pop(pooled.ENV_VAR, None)
+            pooled.reset_backends()
+
+
+def test_async_clients_against_standin():
+    print("test_async_clients_against_standin")
+    from scripts.erd import cleanup_orphan_erd_fields as erd
+
+    class CountingSender(aio.ThreadedSender):
+        in_flight = peak = 0
+
+        async def send(self, *args, **kwargs):
+            type(self).in_flight += 1
+            type(self).peak = max(type(self).peak, type(self).in_flight)
+            try:
+                return await super().send(*args, **kwargs)
+            finally:
+                type(self).in_flight -= 1
+
+    app = build_app()
+    with serve(app, Faults(latency_ms=2)) as server:
+        throttle = aio.ApiThrottle(max_concurrency=12, rate=5000)
+
+        async def run():
+            async with auth.AsyncSfRestClient.from_client(
+                    _client(server), throttle=throttle, sender=CountingSender(32)) as client:
+                created = await client.gather(*(
+                    client.post(f"{V}/sobjects/Account", {"Name": f"Async {i}"})
+                    for i in range(300)))
+                rows = await client.query("SELECT Id FROM Account WHERE Name LIKE 'Async%'")
+                return created, rows
+
+        created, rows = asyncio.run(run())
+        check("300 concurrent creates all land", len(created) == 300
+              and app.store.count("Account") == 300, app.store.count("Account"))
+        check("in-flight requests stay under the throttle cap", 1 < CountingSender.peak <= 12,
+              CountingSender.peak)
+        check("async query pages every record", len(rows) == 300, len(rows))
+        check("limit header tracked", throttle.usage is not None and throttle.usage[0] > 300,
+              throttle.usage)
+
+        pooled.reset_backends()
+        pooled.register_backend(pooled.PooledBackend(
+            "standin", auth_resolver=lambda org: ("standin", server.url)))
+        aio.reset_throttles()
+        try:
+            fields = erd.collect_org_fields(["standin"], ["Account", "Nope__x"],
+                                            concurrency=4, transport="http")
+        finally:
+            pooled.reset_backends()
+            aio.reset_throttles()
+        check("http describe sweep reads fields", "Name" in (fields["standin"]["Account"] or ()),
+              fields)
+        check("unknown object maps to None", fields["standin"]["Nope__x"] is None, fields)
+
+
+def main():
+    for test in (
+        test_soql_compile,
+        test_query_paging_and_crud,
+        test_composite_endpoints,
+        test_revenue_lifecycle_end_to_end,
+        test_async_delay_and_tracker_failure,
+        test_fault_injection_and_limit_header,
+        test_toolkit_http_backend_against_standin,
+        test_bulk_jobs_against_standin,
+        test_async_clients_against_standin,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,1047 @@
+#!/usr/bin/env python3
+"""Offline contract suite for the shared toolkit transport backends.
+
+Run: ``python tests/test_sf_transport.py``.
+No org is contacted: auth resolution and the HTTP session are replaced with fakes.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts.context_service import _client as cs_client  # noqa: E402
+from scripts.decision_tables import _client as dt_client  # noqa: E402
+from scripts.expression_sets import _client as es_client  # noqa: E402
+from scripts.sf_transport import aio, bulk, cassette, composite, metrics, paging, pooled, read_cache  # noqa: E402
+from scripts.sf_transport.bench_replay import compare as bench_compare  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", reason="OK"):
+        self.status_code = status_code
+        self.text = text
+        self.reason = reason
+
+
+class FakeSession:
+    """Records every request and answers from a scripted response queue."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def request(self, method, url, data=None, headers=None, timeout=None):
+        self.calls.append({"method": method, "url": url, "data": data,
+                           "headers": dict(headers or {}), "timeout": timeout})
+        item = self.responses.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+
+def _install(responses, *, tokens=None, org="rlm-base__test"):
+    """Register a fake-backed PooledBackend for ``org``; return (session, auth calls)."""
+    session = FakeSession(responses)
+    auth_calls = []
+    token_queue = list(tokens or ["tok-1"])
+
+    def resolver(alias):
+        auth_calls.append(alias)
+        token = token_queue.pop(0) if len(token_queue) > 1 else token_queue[0]
+        return token, "https://example.my.salesforce.com/"
+
+    pooled.register_backend(pooled.PooledBackend(
+        org, auth_resolver=resolver, session_factory=lambda: session,
+        sleep=lambda _s: None,
+    ))
+    return session, auth_calls
+
+
+def test_backend_selection():
+    print("test_backend_selection")
+    saved = os.environ.pop(pooled.ENV_VAR, None)
+    try:
+        check("default backend is the sf CLI", pooled.resolve_backend() == "cli")
+        os.environ[pooled.ENV_VAR] = "HTTP"
+        check("env var selects the http backend (case-insensitive)",
+              pooled.resolve_backend() == "http")
+        check("explicit name wins over the env var",
+              pooled.resolve_backend("cli") == "cli")
+        os.environ[pooled.ENV_VAR] = "carrier-pigeon"
+        try:
+            es_client.connect_request("GET", "limits", target_org="x")
+            check("unknown backend raises", False, "no exception")
+        except es_client.ExpressionSetClientError as exc:
+            check("unknown backend raises the toolkit's own error",
+                  "carrier-pigeon" in str(exc), exc)
+    finally:
+        os.environ.pop(pooled.ENV_VAR, None)
+        if saved is not None:
+            os.environ[pooled.ENV_VAR] = saved
+
+
+def test_http_backend_request_shape_and_pooling():
+    print("test_http_backend_request_shape_and_pooling")
+    pooled.reset_backends()
+    session, auth_calls = _install([
+        FakeResponse(200, '{"ok": true}'),
+        FakeResponse(204, ""),
+    ])
+    os.environ[pooled.ENV_VAR] = "http"
+    try:
+        read = cs_client.connect_request(
+            "GET", "connect/context-definitions", target_org="rlm-base__test",
+        )
+        empty = cs_client.connect_request(
+            "POST", "connect/context-definitions", {"name": "café"},
+            target_org="rlm-base__test",
+        )
+    finally:
+        os.environ.pop(pooled.ENV_VAR, None)
+
+    get_call, post_call = session.calls
+    check("read parses JSON through the shared path", read == {"ok": True}, read)
+    check("204 normalizes to an empty object", empty == {}, empty)
+    check("URL is instance + versioned path",
+          get_call["url"] == "https://example.my.salesforce.com"
+          "/services/data/v67.0/connect/context-definitions", get_call["url"])
+    check("bearer token is sent as a header",
+          get_call["headers"].get("Authorization") == "Bearer tok-1", get_call)
+    check("reads keep the read timeout", get_call["timeout"] == 120, get_call)
+    check("mutations keep the mutation timeout", post_call["timeout"] == 600, post_call)
+    check("body is UTF-8 JSON",
+          post_call["data"] == '{"name": "caf\\u00e9"}'.encode("utf-8"), post_call["data"])
+    check("token is resolved once for both calls", auth_calls == ["rlm-base__test"],
+          auth_calls)
+
+
+def test_http_backend_error_codes_and_dry_run():
+    print("test_http_backend_error_codes_and_dry_run")
+    pooled.reset_backends()
+    session, _ = _install([
+        FakeResponse(400, '[{"message":"bad field","errorCode":"INVALID_FIELD"}]',
+                     reason="Bad Request"),
+    ])
+    logs = []
+    os.environ[pooled.ENV_VAR] = "http"
+    try:
+        skipped = dt_client.connect_request(
+            "PATCH", "tooling/sobjects/DecisionTable/0lDxx", {"Metadata": {}},
+            target_org="rlm-base__test", dry_run=True, logger=logs.append,
+        )
+        try:
+            dt_client.connect_request("GET", "query?q=bad", target_org="rlm-base__test")
+            check("HTTP 400 raises", False, "no exception")
+        except dt_client.DecisionTableClientError as exc:
+            check("Salesforce error code survives the http backend",
+                  exc.error_codes == ["INVALID_FIELD"], exc.error_codes)
+            check("structured error message is unchanged",
+                  str(exc) == '[{"message":"bad field","errorCode":"INVALID_FIELD"}]', exc)
+    finally:
+        os.environ.pop(pooled.ENV_VAR, None)
+    check("dry-run mutation never reaches the session",
+          skipped == {} and len(session.calls) == 1, session.calls)
+    check("dry-run still logs the skipped call", logs and "PATCH" in logs[0], logs)
+
+
+def test_http_backend_reauth_retry_and_timeout():
+    print("test_http_backend_reauth_retry_and_timeout")
+    import requests
+
+    pooled.reset_backends()
+    session, auth_calls = _install([
+        FakeResponse(401, '[{"errorCode":"INVALID_SESSION_ID"}]'),
+        FakeResponse(503, "busy"),
+        FakeResponse(200, '{"done": true}'),
+        requests.Timeout("slow"),
+        FakeResponse(503, "busy"),
+    ], tokens=["stale", "fresh"])
+    os.environ[pooled.ENV_VAR] = "http"
+    try:
+        ok = es_client.connect_request("GET", "limits", target_org="rlm-base__test")
+        try:
+            es_client.connect_request("GET", "limits", target_org="rlm-base__test",
+                                      timeout=7)
+            check("timeout raises", False, "no exception")
+        except es_client.ExpressionSetClientError as exc:
+            check("timeout surfaces as the toolkit error",
+                  "timed out after 7s" in str(exc), exc)
+        try:
+            es_client.connect_request("PATCH", "sobjects/ExpressionSetVersion/9QMxx",
+                                      {"IsActive": False}, target_org="rlm-base__test")
+            check("mutation 503 raises", False, "no exception")
+        except es_client.ExpressionSetClientError as exc:
+            check("mutations are never replayed on a transient status",
+                  exc.body == "busy", exc.body)
+    finally:
+        os.environ.pop(pooled.ENV_VAR, None)
+    check("401 re-resolves the token and replays", ok == {"done": True}, ok)
+    check("token resolved twice (initial + refresh)", len(auth_calls) == 2, auth_calls)
+    check("replayed request carries the fresh token",
+          session.calls[1]["headers"]["Authorization"] == "Bearer fresh", session.calls[1])
+    check("transient 503 on a read is retried", len(session.calls) == 5, len(session.calls))
+
+
+def test_sessions_are_per_thread():
+    print("test_sessions_are_per_thread")
+    made = []
+
+    def factory():
+        made.append(object())
+        return made[-1]
+
+    backend = pooled.PooledBackend("x", auth_resolver=lambda a: ("t", "https://h"),
+                                   session_factory=factory)
+    seen = []
+    first = backend.session
+    check("same thread reuses its session", backend.session is first)
+    worker = threading.Thread(target=lambda: seen.append(backend.session))
+    worker.start()
+    worker.join()
+    check("another thread gets its own session", seen and seen[0] is not first, made)
+
+
+class ScriptedSend:
+    """A bound-transport ``send`` that records calls and answers in order."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def __call__(self, method, path, body=None, *, dry_run=None):
+        self.calls.append((method, path, body, dry_run))
+        return self.responses.pop(0)
+
+
+def _error(method, path, text):
+    return dt_client.DecisionTableClientError(f"{method} {path}: {text}", body=text)
+
+
+def test_composite_batch_over_http_backend():
+    print("test_composite_batch_over_http_backend")
+    pooled.reset_backends()
+    session, _ = _install([FakeResponse(200, json.dumps({"hasErrors": True, "results": [
+        {"statusCode": 204, "result": None},
+        {"statusCode": 400, "result": [{"message": "no", "errorCode": "FIELD_INTEGRITY_EXCEPTION"}]},
+        {"statusCode": 200, "result": {"totalSize": 1, "done": True, "records": [{"Id": "a"}]}},
+    ]}))])
+    os.environ[pooled.ENV_VAR] = "http"
+    try:
+        t = es_client.Transport("rlm-base__test", logger=lambda *_a: None)
+        with t.batch() as batch:
+            ok = batch.sobject("PATCH", "ContextAttribute", "1", {"IsTransient": True})
+            bad = batch.sobject("PATCH", "ContextAttribute", "2", {"IsTransient": True})
+            rows = batch.soql("SELECT Id FROM Account")
+    finally:
+        os.environ.pop(pooled.ENV_VAR, None)
+    check("three sub-requests travel in one round trip", len(session.calls) == 1, session.calls)
+    call = session.calls[0]
+    check("independent calls use composite/batch",
+          call["url"].endswith("/services/data/v67.0/composite/batch"), call["url"])
+    payload = json.loads(call["data"])
+    check("batch items carry versioned relative urls and richInput",
+          payload["batchRequests"][0] == {"method": "PATCH",
+                                          "url": "v67.0/sobjects/ContextAttribute/1",
+                                          "richInput": {"IsTransient": True}},
+          payload["batchRequests"][0])
+    check("haltOnError is off so every sub-request reports", payload["haltOnError"] is False)
+    check("204 sub-response normalizes to an empty object", ok.result() == {})
+    check("SOQL sub-response returns the records list", rows.result() == [{"Id": "a"}])
+    try:
+        bad.result()
+        check("failed sub-response raises", False, "no exception")
+    except es_client.ExpressionSetClientError as exc:
+        check("sub-response error codes parse like a direct call",
+              exc.error_codes == ["FIELD_INTEGRITY_EXCEPTION"], exc.error_codes)
+
+
+def test_composite_chaining_and_pagination():
+    print("test_composite_chaining_and_pagination")
+    send = ScriptedSend([
+        {"compositeResponse": [
+            {"httpStatusCode": 201, "body": {"id": "001A"}, "referenceId": "acct"},
+            {"httpStatusCode": 201, "body": {"id": "003C"}, "referenceId": "ref1"},
+        ]},
+        {"results": [{"statusCode": 200, "result": {
+            "done": False, "nextRecordsUrl": "/services/data/v67.0/query/01g-2000",
+            "records": [{"Id": "1"}]}}]},
+        {"done": True, "records": [{"Id": "2"}]},
+        {"results": [{"statusCode": 204, "result": None}]},
+    ])
+    batch = composite.CompositeBatch(send, api_version="67.0", error_factory=_error)
+    acct = batch.sobject("POST", "Account", body={"Name": "A"}, reference_id="acct")
+    contact = batch.sobject("POST", "Contact", body={"AccountId": acct.ref("id")})
+    batch.flush()
+    method, path, body, dry_run = send.calls[0]
+    check("chained sub-requests use /composite", path == "composite", path)
+    check("composite carries referenceIds and full urls",
+          body["compositeRequest"][1]["url"] == "/services/data/v67.0/sobjects/Contact"
+          and body["compositeRequest"][1]["body"] == {"AccountId": "@{acct.id}"},
+          body["compositeRequest"][1])
+    check("allOrNone is off (per-call results, like sequential calls)",
+          body["allOrNone"] is False)
+    check("the composite POST itself is never dry-run skipped", dry_run is False)
+    check("chained results map back by position",
+          acct.result() == {"id": "001A"} and contact.result() == {"id": "003C"})
+    rows = batch.soql("SELECT Id FROM Contact")
+    check("records follow nextRecordsUrl after the batch",
+          rows.result() == [{"Id": "1"}, {"Id": "2"}], rows.result())
+    check("next page is requested relative to the api version",
+          send.calls[2][:2] == ("GET", "query/01g-2000"), send.calls[2])
+    late = batch.sobject("PATCH", "Contact", contact.ref("id"), {"Title": "x"})
+    late.result()
+    check("a reference to an earlier chunk is substituted literally",
+          send.calls[3][2]["batchRequests"][0]["url"] == "v67.0/sobjects/Contact/003C",
+          send.calls[3][2])
+    check("round trips are counted", batch.round_trips == 3, batch.round_trips)
+
+
+def test_composite_dry_run_tooling_and_chunking():
+    print("test_composite_dry_run_tooling_and_chunking")
+    send = ScriptedSend([
+        {},  # the dry-run PATCH, "skipped" by the transport
+        {"results": [{"statusCode": 200, "result": {"done": True, "records": []}}] * 2},
+        {"results": [{"statusCode": 200, "result": {"Id": "0lD"}}]},
+    ])
+    batch = composite.CompositeBatch(send, api_version="67.0", error_factory=_error,
+                                     dry_run=True, max_batch=2)
+    patch = batch.tooling_sobject("PATCH", "DecisionTable", "0lD", body={"Metadata": {}})
+    check("dry-run mutation goes straight to the transport, unbatched",
+          send.calls[0][:2] == ("PATCH", "tooling/sobjects/DecisionTable/0lD")
+          and send.calls[0][3] is None, send.calls[0])
+    check("dry-run mutation resolves immediately", patch.result() == {})
+    q1 = batch.tooling_query("SELECT Id FROM DecisionTableParameter")
+    q2 = batch.tooling_query("SELECT Id FROM DecisionTableDatasetLink")
+    check("a full queue flushes on its own", len(send.calls) == 2 and q1.done and q2.done)
+    check("tooling reads go through tooling/composite/batch",
+          send.calls[1][1] == "tooling/composite/batch", send.calls[1][1])
+    with batch:
+        get = batch.tooling_sobject("GET", "DecisionTable", "0lD")
+    check("leaving the block flushes the rest", get.done and get.result() == {"Id": "0lD"})
+
+    abandoned = composite.CompositeBatch(ScriptedSend([]), api_version="67.0",
+                                         error_factory=_error)
+    try:
+        with abandoned:
+            never = abandoned.soql("SELECT Id FROM Account")
+            raise KeyError("boom")
+    except KeyError:
+        pass
+    try:
+        never.result()
+        check("abandoned call raises", False, "no exception")
+    except RuntimeError as exc:
+        check("a failed block does not send its queue", "was not sent" in str(exc), exc)
+
+
+def test_immediate_batch_fallback():
+    print("test_immediate_batch_fallback")
+
+    class FakeTransport:
+        def __init__(self):
+            self.calls = []
+
+        def sobject(self, method, sobject, record_id=None, body=None):
+            self.calls.append((method, sobject, record_id))
+            return {"ok": record_id}
+
+        def soql(self, query):
+            self.calls.append(("SOQL", query))
+            return [{"Id": "x"}]
+
+    fake = FakeTransport()
+    batch = composite.batch_for(fake)
+    check("transports without batch() get the immediate fallback",
+          isinstance(batch, composite.ImmediateBatch), type(batch))
+    with batch:
+        call = batch.sobject("PATCH", "Account", "001", {"Name": "n"})
+        check("immediate calls run at the call site", fake.calls == [("PATCH", "Account", "001")])
+    check("immediate call result is the transport's return",
+          call.result() == {"ok": "001"} and batch.soql("q").result() == [{"Id": "x"}])
+    real = composite.batch_for(cs_client.Transport("x"))
+    check("toolkit transports batch through the Composite API",
+          isinstance(real, composite.CompositeBatch), type(real))
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _org_cache(tmp, get, *, ttl=60, rules=read_cache.Rules(), clock=None):
+    store = read_cache._store_for(Path(tmp) / "cache.sqlite3")
+    return read_cache.OrgCache(store, "rlm-base__test", "67.0", ttl=ttl, rules=rules,
+                               get=get, clock=clock or Clock())
+
+
+def test_read_cache_through_client():
+    print("test_read_cache_through_client")
+    pooled.reset_backends()
+    definition = json.dumps({"id": "9QL000000000001", "versions": [{"steps": []}]})
+    session, _ = _install([
+        FakeResponse(200, json.dumps({"done": True, "records": [
+            {"attributes": {}, "Id": "9QM000000000001", "SystemModstamp": "t1"}]})),
+        FakeResponse(200, definition),
+        FakeResponse(204, ""),
+        FakeResponse(200, json.dumps({"done": True, "records": [
+            {"Id": "9QM000000000001", "SystemModstamp": "t2"}]})),
+        FakeResponse(200, definition),
+    ])
+    path = "connect/business-rules/expression-set/9QL000000000001"
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({pooled.ENV_VAR: "http", read_cache.ENV_VAR: "60",
+                           read_cache.DIR_ENV_VAR: tmp})
+        try:
+            first = es_client.connect_get(path, "rlm-base__test")
+            second = es_client.connect_get(path, "rlm-base__test")
+            check("a cached GET never reaches the org",
+                  second == first and len(session.calls) == 2, len(session.calls))
+            check("the first fetch records a version stamp first",
+                  "ExpressionSetVersion" in session.calls[0]["url"], session.calls[0]["url"])
+            es_client.sobjects_request("PATCH", "ExpressionSetVersion", "9QM000000000001",
+                                       {"IsActive": False}, target_org="rlm-base__test")
+            third = es_client.connect_get(path, "rlm-base__test")
+            check("a related mutation invalidates the definition",
+                  third == first and len(session.calls) == 5, len(session.calls))
+            os.environ[read_cache.ENV_VAR] = "0"
+            session.responses.append(FakeResponse(200, definition))
+            es_client.connect_get(path, "rlm-base__test")
+            check("the cache is off unless enabled", len(session.calls) == 6, len(session.calls))
+        finally:
+            for var in (pooled.ENV_VAR, read_cache.ENV_VAR, read_cache.DIR_ENV_VAR):
+                os.environ.pop(var, None)
+
+
+def test_read_cache_ttl_and_revalidation():
+    print("test_read_cache_ttl_and_revalidation")
+    stamps = [{"records": [{"LastModifiedDate": "a"}]}, {"records": [{"LastModifiedDate": "a"}]},
+              {"records": [{"LastModifiedDate": "b"}]}]
+    queries = []
+
+    def get(path):
+        queries.append(path)
+        return stamps.pop(0)
+
+    rules = read_cache.Rules(validators=(read_cache.Validator(
+        r"^tooling/sobjects/DecisionTable/(?P<id>\w+)$",
+        "SELECT LastModifiedDate FROM DecisionTable WHERE Id = '{id}'", tooling=True),))
+    clock = Clock()
+    fetched = []
+
+    def fetch():
+        fetched.append(1)
+        return {"Id": "0lD", "Metadata": {"n": len(fetched)}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _org_cache(tmp, get, rules=rules, clock=clock)
+        path = "tooling/sobjects/DecisionTable/0lD000000000001"
+        cache.read(path, fetch)
+        check("stamp query runs on the tooling surface",
+              queries and queries[0].startswith("tooling/query?q="), queries)
+        cache.read(path, fetch)
+        check("fresh entry is served without any request",
+              len(fetched) == 1 and len(queries) == 1, (fetched, queries))
+        clock.now += 120
+        value = cache.read(path, fetch)
+        check("expired entry with an unchanged stamp is renewed, not refetched",
+              len(fetched) == 1 and value["Metadata"] == {"n": 1}, fetched)
+        clock.now += 120
+        value = cache.read(path, fetch)
+        check("a moved stamp refetches", len(fetched) == 2 and value["Metadata"] == {"n": 2})
+
+        cache.store("tooling/query?q=x", {"done": False, "records": []})
+        cache.store("tooling/query/01g-2000", {"done": True, "records": []})
+        check("cursor pages and locators are never cached",
+              cache.lookup("tooling/query?q=x") is read_cache.MISS
+              and cache.lookup("tooling/query/01g-2000") is read_cache.MISS)
+        cache.store("tooling/sobjects/DecisionTable/0lD000000000002",
+                    {"Id": "0lD2", "LastModifiedDate": "z"})
+        check("a Tooling GET body supplies its own stamp",
+              cache._store.get(cache.scope, "tooling/sobjects/DecisionTable/0lD000000000002")[1]
+              == '[{"LastModifiedDate":"z"}]')
+
+
+def test_read_cache_invalidation_rules():
+    print("test_read_cache_invalidation_rules")
+    rules = read_cache.Rules(related=(("connect/context-", "sobjects/Context"),))
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = _org_cache(tmp, lambda p: {}, rules=rules)
+        for path in ("connect/context-definitions/11O000000000001",
+                     "connect/context-definitions/11O000000000002",
+                     "query?q=SELECT+Id+FROM+Account",
+                     "tooling/query?q=SELECT+Id+FROM+DecisionTable",
+                     "sobjects/Account/001000000000001"):
+            cache.store(path, {"ok": True})
+        dropped = cache.invalidate("POST", "composite/batch", {"batchRequests": [
+            {"method": "GET", "url": "v67.0/sobjects/Account/001000000000001"}]})
+        check("a read-only composite batch invalidates nothing", dropped == 0, dropped)
+        cache.invalidate("PATCH", "sobjects/ContextAttribute/0Zz000000000001", {"IsTransient": True})
+        check("a related-family mutation drops the context definitions",
+              cache.lookup("connect/context-definitions/11O000000000001") is read_cache.MISS
+              and cache.lookup("connect/context-definitions/11O000000000002") is read_cache.MISS)
+        check("queries on the mutated surface are dropped",
+              cache.lookup("query?q=SELECT+Id+FROM+Account") is read_cache.MISS)
+        check("other surfaces and unrelated records survive",
+              cache.lookup("tooling/query?q=SELECT+Id+FROM+DecisionTable") == {"ok": True}
+              and cache.lookup("sobjects/Account/001000000000001") == {"ok": True})
+        cache.invalidate("POST", "composite", {"compositeRequest": [
+            {"method": "DELETE", "url": "/services/data/v67.0/sobjects/Account/001000000000001"}]})
+        check("mutating composite sub-requests invalidate their record",
+              cache.lookup("sobjects/Account/001000000000001") is read_cache.MISS)
+
+        cache.store("tooling/sobjects/DecisionTable/0lD000000000001", {"Id": "0lD"})
+        send = ScriptedSend([])
+        batch = composite.CompositeBatch(send, api_version="67.0", error_factory=_error,
+                                         cache=cache)
+        hit = batch.tooling_sobject("GET", "DecisionTable", "0lD000000000001")
+        batch.flush()
+        check("a cached GET is answered without a composite round trip",
+              hit.result() == {"Id": "0lD"} and send.calls == [], send.calls)
+
+
+def test_metrics_path_templating():
+    print("test_metrics_path_templating")
+    check("version prefix, query string and record ids are collapsed",
+          metrics.template_path("/services/data/v67.0/sobjects/Account/001000000000001AAA?fields=Id")
+          == "sobjects/Account/{id}")
+    check("query locators collapse to one label",
+          metrics.template_path("v67.0/tooling/query/01g000000000001-2000")
+          == "tooling/query/{locator}")
+    check("plain names are kept",
+          metrics.template_path("connect/context-definitions/RLM_SalesTransactionContext")
+          == "connect/context-definitions/RLM_SalesTransactionContext")
+
+
+def test_metrics_recorded_through_client():
+    print("test_metrics_recorded_through_client")
+    pooled.reset_backends()
+    metrics.recorder().reset()
+    _install([
+        FakeResponse(200, json.dumps({"ok": True})),
+        FakeResponse(200, json.dumps({"ok": True})),
+        FakeResponse(404, json.dumps([{"errorCode": "NOT_FOUND", "message": "gone"}])),
+    ])
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update({pooled.ENV_VAR: "http", metrics.ENV_VAR: tmp})
+        try:
+            for rid in ("9QL000000000001", "9QL000000000002"):
+                es_client.connect_get(f"connect/business-rules/expression-set/{rid}",
+                                      "rlm-base__test")
+            try:
+                es_client.connect_get("connect/business-rules/expression-set/9QL000000000003",
+                                      "rlm-base__test")
+            except Exception:
+                pass
+            series = metrics.recorder().series()
+            check("calls to different records share one endpoint series",
+                  len(series) == 1 and len(series[0]["latencies"]) == 3, series)
+            row = series[0]
+            check("series is keyed by transport, method and template",
+                  (row["transport"], row["method"], row["endpoint"])
+                  == ("http", "GET", "connect/business-rules/expression-set/{id}"), row)
+            check("HTTP statuses are counted",
+                  row["statuses"] == {"200": 2, "404": 1}, row["statuses"])
+            check("response bytes are counted", row["bytes_in"] > 0, row)
+            check("in-process HTTP has no spawn time", row["spawn_seconds"] == 0.0, row)
+
+            raw = metrics.recorder().flush()
+            written = sorted(p.name for p in Path(tmp).iterdir())
+            check("flush writes raw samples plus the merged summaries",
+                  raw is not None and written == sorted(
+                      [raw.name, metrics.SUMMARY_JSON, metrics.SUMMARY_PROM]), written)
+            summary = json.loads((Path(tmp) / metrics.SUMMARY_JSON).read_text())
+            check("summary totals every call", summary["calls"] == 3, summary)
+        finally:
+            for var in (pooled.ENV_VAR, metrics.ENV_VAR):
+                os.environ.pop(var, None)
+    metrics.recorder().reset()
+    pooled.reset_backends()
+    check("recording is off without the env var",
+          metrics.track("cli", "GET", "x").sample.active is False)
+
+
+def test_metrics_summary_and_prometheus():
+    print("test_metrics_summary_and_prometheus")
+    check("nearest-rank percentiles",
+          (metrics.percentile([1, 2, 3, 4], 50), metrics.percentile([1, 2, 3, 4], 99),
+           metrics.percentile([], 50)) == (2, 4, 0.0))
+    row = {"transport": "cli", "method": "GET", "endpoint": "tooling/query",
+           "statuses": {"ok": 2}, "bytes_out": 0, "bytes_in": 10,
+           "spawn_seconds": 1.5, "latencies": [0.2, 3.0]}
+    other = dict(row, statuses={"error": 1}, latencies=[0.4], spawn_seconds=0.5)
+    summary = metrics.summarize(metrics.merge_series([[row], [other]]))
+    endpoint = summary["endpoints"][0]
+    check("series from several processes merge per endpoint",
+          endpoint["calls"] == 3 and endpoint["statuses"] == {"ok": 2, "error": 1}, endpoint)
+    check("spawn seconds add up", summary["spawn_seconds"] == 2.0, summary)
+    check("p50/p95 come from the merged latencies",
+          (endpoint["p50_seconds"], endpoint["p95_seconds"]) == (0.4, 3.0), endpoint)
+    prom = metrics.render_prometheus(summary)
+    labels = 'transport="cli",method="GET",endpoint="tooling/query"'
+    check("histogram buckets are cumulative",
+          f'sf_transport_request_duration_seconds_bucket{{{labels},le="0.25"}} 1' in prom
+          and f'sf_transport_request_duration_seconds_bucket{{{labels},le="+Inf"}} 3' in prom, prom)
+    check("request counter is split by status",
+          f'sf_transport_requests_total{{{labels},status="error"}} 1' in prom, prom)
+    check("counters are declared once",
+          prom.count("# TYPE sf_transport_spawn_seconds_total counter") == 1)
+
+
+def test_cassette_record_and_replay_through_client():
+    print("test_cassette_record_and_replay_through_client")
+    pooled.reset_backends()
+    cassette.reset_cassettes()
+    session, _ = _install([
+        FakeResponse(200, json.dumps({"id": "9QL000000000001", "versions": []})),
+        FakeResponse(204, ""),
+        FakeResponse(400, json.dumps([{"errorCode": "INVALID_INPUT", "message": "bad"}])),
+    ])
+    path = "connect/business-rules/expression-set/9QL000000000001"
+    with tempfile.TemporaryDirectory() as tmp:
+        tape = os.path.join(tmp, "overlay.json.gz")
+        os.environ.update({pooled.ENV_VAR: "http", cassette.ENV_VAR: tape,
+                           cassette.MODE_ENV_VAR: cassette.MODE_RECORD})
+        try:
+            live = es_client.connect_get(path, "rlm-base__test")
+            es_client.sobjects_request("PATCH", "ExpressionSetVersion", "9QM000000000001",
+                                       {"IsActive": False}, target_org="rlm-base__test")
+            try:
+                es_client.sobjects_request("PATCH", "ExpressionSetVersion", "9QM000000000002",
+                                           {"IsActive": True}, target_org="rlm-base__test")
+            except es_client.ExpressionSetClientError as exc:
+                live_error = str(exc)
+            cassette.active().save()
+            check("record mode still calls the org", len(session.calls) == 3, len(session.calls))
+
+            # Replay: no backend registered and the cli backend selected, so any
+            # request that escaped the cassette would try to spawn `sf`.
+            pooled.reset_backends()
+            cassette.reset_cassettes()
+            os.environ.update({pooled.ENV_VAR: "cli", cassette.MODE_ENV_VAR: cassette.MODE_REPLAY})
+            replayed = es_client.connect_get(path, "rlm-base__test")
+            check("a replayed GET returns the recorded body", replayed == live, replayed)
+            es_client.sobjects_request("PATCH", "ExpressionSetVersion", "9QM000000000001",
+                                       {"IsActive": False}, target_org="rlm-base__test")
+            try:
+                es_client.sobjects_request("PATCH", "ExpressionSetVersion", "9QM000000000002",
+                                           {"IsActive": True}, target_org="rlm-base__test")
+                replay_error = None
+            except es_client.ExpressionSetClientError as exc:
+                replay_error = str(exc)
+            check("a recorded error replays through the same error parsing",
+                  replay_error == live_error, replay_error)
+            try:
+                es_client.sobjects_request("DELETE", "ExpressionSetVersion", "9QM000000000001",
+                                           target_org="rlm-base__test")
+                missed = None
+            except es_client.ExpressionSetClientError as exc:
+                missed = str(exc)
+            check("an unrecorded mutation is a client error",
+                  missed is not None and "No recorded interaction" in missed, missed)
+            check("every recorded interaction was used", cassette.active().unused() == 0)
+        finally:
+            for var in (pooled.ENV_VAR, cassette.ENV_VAR, cassette.MODE_ENV_VAR):
+                os.environ.pop(var, None)
+            cassette.reset_cassettes()
+    pooled.reset_backends()
+
+
+def test_cassette_matching_and_latency():
+    print("test_cassette_matching_and_latency")
+    with tempfile.TemporaryDirectory() as tmp:
+        tape = os.path.join(tmp, "tape.json")
+        rec = cassette.Cassette(tape, cassette.MODE_RECORD)
+        for body, out, elapsed in (('{"a": 1, "b": 2}', "first", 0.5),
+                                   ('{"a": 9}', "second", 1.0)):
+            rec.record("POST", "/services/data/v67.0/sobjects/Order", body, status=201,
+                       returncode=0, stdout=out, elapsed=elapsed)
+        rec.record("GET", "/services/data/v67.0/query?q=SELECT+Id+FROM+Order+WHERE+Name='R1'",
+                   None, status=200, returncode=0, stdout="rows")
+        rec.save()
+
+        slept = []
+        play = cassette.Cassette(tape, cassette.MODE_REPLAY, latency=2.0, sleep=slept.append)
+        second = play.match("POST", "/services/data/v67.0/sobjects/Order", '{"a":9}')
+        first = play.match("POST", "/services/data/v67.0/sobjects/Order", '{"b": 2, "a": 1}')
+        check("bodies match canonically, out of recorded order",
+              (first["stdout"], second["stdout"]) == ("first", "second"))
+        check("recorded latency is scaled on replay", slept == [2.0, 1.0], slept)
+        rows = play.match("GET", "/services/data/v67.0/query?q=SELECT+Id+FROM+Order+WHERE+Name='R2'")
+        check("queries differing only in literals match by endpoint", rows["stdout"] == "rows")
+        again = play.match("GET", "/services/data/v67.0/query?q=SELECT+Id+FROM+Order+WHERE+Name='R2'")
+        check("an exhausted GET repeats its last response", again["stdout"] == "rows")
+        try:
+            play.match("POST", "/services/data/v67.0/sobjects/Order", '{"a": 1}')
+            exhausted = False
+        except cassette.CassetteMiss:
+            exhausted = True
+        check("an exhausted mutation does not repeat", exhausted)
+        check("plain .json cassettes are readable text",
+              json.loads(Path(tape).read_text())["version"] == cassette.FORMAT_VERSION)
+
+    check("bench flags a median beyond the tolerance",
+          bench_compare({"median_seconds": 1.3}, {"median_seconds": 1.0}, 0.25)["regressed"])
+    check("bench accepts a median within the tolerance",
+          not bench_compare({"median_seconds": 1.2}, {"median_seconds": 1.0}, 0.25)["regressed"])
+
+
+def _pages(n, per_page=2):
+    return [{"done": i == n - 1, "records": [{"Id": f"{i}-{j}"} for j in range(per_page)],
+             **({} if i == n - 1 else {"nextRecordsUrl": f"/services/data/v67.0/query/01g-{i + 1}"})}
+            for i in range(n)]
+
+
+def test_paging_prefetch_and_early_close():
+    print("test_paging_prefetch_and_early_close")
+    pages = _pages(3)
+    started = threading.Event()
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        started.set()
+        return pages[int(url.rsplit("-", 1)[1])]
+
+    stream = paging.iter_pages(pages[0], fetch)
+    first = next(stream)
+    check("next page is requested while the caller holds the current one",
+          started.wait(2) and first is pages[0], fetched)
+    rest = list(stream)
+    check("every page is yielded once, in order", rest == pages[1:], rest)
+
+    started.clear()
+    fetched.clear()
+    sequential = paging.iter_pages(pages[0], fetch, prefetch=False)
+    next(sequential)
+    check("prefetch=False fetches only on demand", not started.wait(0.05), fetched)
+    sequential.close()
+
+    fetched.clear()
+    many = _pages(50)
+    records = paging.iter_records(many[0], lambda url: fetched.append(url) or many[int(url.rsplit("-", 1)[1])])
+    check("records are flattened across pages", next(records) == {"Id": "0-0"})
+    records.close()
+    check("abandoning the stream stops after one page of read-ahead", len(fetched) <= 1, fetched)
+
+    def failing(url):
+        raise RuntimeError("page 2 failed")
+
+    got = []
+    try:
+        for record in paging.iter_records(pages[0], failing):
+            got.append(record["Id"])
+        check("a failed page raises", False, got)
+    except RuntimeError as exc:
+        check("a failed page raises after the earlier records",
+              got == ["0-0", "0-1"] and "page 2" in str(exc), (got, exc))
+    check("nextRecordsUrl is made relative (tooling kept)",
+          paging.relative_next_url("/services/data/v67.0/tooling/query/01g-2")
+          == "tooling/query/01g-2")
+
+
+def test_paging_through_clients():
+    print("test_paging_through_clients")
+    pooled.reset_backends()
+    pages = _pages(3)
+    pages[1]["nextRecordsUrl"] = "/services/data/v67.0/tooling/query/01g-2"
+    pages[0]["nextRecordsUrl"] = "/services/data/v67.0/tooling/query/01g-1"
+    session, _ = _install([FakeResponse(200, json.dumps(p)) for p in pages])
+    os.environ[pooled.ENV_VAR] = "http"
+    try:
+        streamed = [r["Id"] for r in dt_client.Transport("rlm-base__test").iter_tooling_query(
+            "SELECT Id FROM DecisionTable")]
+        check("decision-table stream follows tooling pages",
+              streamed == ["0-0", "0-1", "1-0", "1-1", "2-0", "2-1"], streamed)
+        check("next pages keep the tooling/ segment",
+              session.calls[1]["url"].endswith("/services/data/v67.0/tooling/query/01g-1"),
+              session.calls[1]["url"])
+        session.responses.extend(FakeResponse(200, json.dumps(p)) for p in _pages(2))
+        rows = cs_client.soql_query("SELECT Id FROM ContextDefinition", target_org="rlm-base__test")
+        check("context-service soql_query now follows nextRecordsUrl", len(rows) == 4, rows)
+        session.responses.extend(FakeResponse(200, json.dumps(p)) for p in _pages(2))
+        rows = list(es_client.iter_soql_query("SELECT Id FROM ExpressionSet",
+                                              target_org="rlm-base__test"))
+        check("expression-set stream yields every record", len(rows) == 4, rows)
+    finally:
+        os.environ.pop(pooled.ENV_VAR, None)
+        pooled.reset_backends()
+
+
+class _BulkResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _BulkSession:
+    """Answers Bulk API calls by (method, path suffix); records each call."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.calls = []
+
+    def request(self, method, url, headers=None, params=None, data=None):
+        rest = url.split("/services/data/v67.0/", 1)[1]
+        self.calls.append((method, rest, dict(params or {}), data, dict(headers or {})))
+        answers = self.routes[(method, rest)]
+        return answers.pop(0) if len(answers) > 1 else answers[0]
+
+
+def test_bulk_threshold_and_csv():
+    os.environ.pop(bulk.THRESHOLD_ENV_VAR, None)
+    check("bulk threshold defaults", bulk.bulk_threshold() == bulk.DEFAULT_THRESHOLD)
+    check("explicit threshold wins", bulk.bulk_threshold("50") == 50)
+    os.environ[bulk.THRESHOLD_ENV_VAR] = "7"
+    try:
+        check("env threshold applies", bulk.bulk_threshold() == 7 and bulk.prefer_bulk(7)
+              and not bulk.prefer_bulk(6))
+        check("threshold 0 never switches", not bulk.prefer_bulk(10 ** 9, 0))
+    finally:
+        os.environ.pop(bulk.THRESHOLD_ENV_VAR, None)
+    try:
+        bulk.bulk_threshold("lots")
+        check("non-integer threshold rejected", False)
+    except ValueError:
+        check("non-integer threshold rejected", True)
+
+    records = [{"attributes": {"type": "Account"}, "Name": "A, Inc", "Active__c": True,
+                "Parent": {"attributes": {}, "Code__c": "P1"}, "Note": None},
+               {"Name": "B", "Active__c": False, "Parent": {"Code__c": "P2"}, "Note": "x"}]
+    chunks = list(bulk.csv_chunks(records))
+    check("one chunk with header + rows", len(chunks) == 1 and chunks[0].splitlines() == [
+        "Name,Active__c,Parent.Code__c,Note", '"A, Inc",true,P1,', "B,false,P2,x"], chunks)
+    chunks = list(bulk.csv_chunks(({"Id": f"00{i}"} for i in range(5)), max_bytes=10))
+    check("chunks split by size, each with a header",
+          len(chunks) > 1 and all(c.startswith("Id\n") for c in chunks)
+          and sum(len(c.splitlines()) - 1 for c in chunks) == 5, chunks)
+    check("no rows, no chunks", list(bulk.csv_chunks([])) == [])
+    rows = list(bulk.read_csv_rows("Id,Name\n001,\n002,B\n"))
+    check("empty CSV fields read as None", rows == [{"Id": "001", "Name": None},
+                                                    {"Id": "002", "Name": "B"}], rows)
+
+
+def test_bulk_client_job_flow():
+    job = "750000000000001AAA"
+    session = _BulkSession({
+        ("POST", "jobs/query"): [_BulkResponse(200, json.dumps({"id": job}))],
+        ("GET", f"jobs/query/{job}"): [
+            _BulkResponse(200, json.dumps({"state": "InProgress"})),
+            _BulkResponse(503, "busy"),
+            _BulkResponse(200, json.dumps({"state": "JobComplete"})),
+        ],
+        ("GET", f"jobs/query/{job}/results"): [
+            _BulkResponse(200, "Id,Name\n1,a\n2,b\n", {"Sforce-Locator": "L2"}),
+            _BulkResponse(200, "Id,Name\n3,\n", {"Sforce-Locator": "null"}),
+        ],
+    })
+    sleeps = []
+    client = bulk.BulkClient("https://x.my.salesforce.com/", "tok", "67.0", session=session,
+                             sleep=sleeps.append, poll_interval=0.5)
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp) / "rows.csv"
+        count = client.query_to_csv("SELECT Id, Name FROM Account", out, max_records=2)
+        check("query streamed to one CSV", count == 3
+              and out.read_text() == "Id,Name\n1,a\n2,b\n3,\n", out.read_text())
+    check("job polled until complete (503 retried)", sleeps == [0.5, 1.0], sleeps)
+    result_calls = [c for c in session.calls if c[1].endswith("/results")]
+    check("locator paging", [c[2] for c in result_calls] == [
+        {"maxRecords": 2}, {"maxRecords": 2, "locator": "L2"}], result_calls)
+    check("bearer token and CSV accept sent",
+          result_calls[0][4]["Authorization"] == "Bearer tok"
+          and result_calls[0][4]["Accept"] == "text/csv")
+
+    ingest = "750000000000002AAA"
+    session = _BulkSession({
+        ("POST", "jobs/ingest"): [_BulkResponse(200, json.dumps({"id": ingest}))],
+        ("PUT", f"jobs/ingest/{ingest}/batches"): [_BulkResponse(400, '[{"errorCode":"X"}]')],
+        ("PATCH", f"jobs/ingest/{ingest}"): [_BulkResponse(200, json.dumps({"state": "Aborted"}))],
+    })
+    client = bulk.BulkClient("https://x", "tok", "67.0", session=session, sleep=lambda _s: None)
+    try:
+        client.delete("Account", ["001A"], results_dir=tempfile.mkdtemp())
+        check("failed upload raises", False)
+    except bulk.BulkError:
+        check("failed upload raises", True)
+    spec = json.loads(session.calls[0][3])
+    check("hard=False submits a delete job", spec["operation"] == "delete"
+          and spec["contentType"] == "CSV", spec)
+    check("failed upload aborts the job",
+          json.loads(session.calls[-1][3]) == {"state": "Aborted"}, session.calls[-1])
+    for bad in (("Account", "merge"), ("Account", "upsert")):
+        try:
+            client.ingest(bad[0], bad[1], [{"Id": "1"}])
+            check(f"{bad[1]} rejected up front", False)
+        except ValueError:
+            check(f"{bad[1]} rejected up front", True)
+
+
+def test_aio_throttle_limits_and_aimd():
+    print("test_aio_throttle_limits_and_aimd")
+    check("limit header parsed", aio.parse_limit_info("api-usage=18/15000") == (18, 15000))
+    check("malformed limit header ignored", aio.parse_limit_info("per-app-api-usage=x") is None)
+
+    now = [0.0]
+    throttle = aio.ApiThrottle(max_concurrency=4, rate=10, burst=2, clock=lambda: now[0])
+    check("burst tokens are free", throttle._take() == 0 and throttle._take() == 0)
+    check("empty bucket waits one token", abs(throttle._take() - 0.1) < 1e-9)
+    now[0] += 0.1
+    check("bucket refills at the rate", throttle._take() == 0)
+
+    throttle.observe(200, {"sforce-limit-info": "api-usage=875/1000"})
+    check("past the soft limit the ceiling falls linearly", abs(throttle.rate - 5.0) < 1e-9,
+          throttle.rate)
+    throttle.observe(429, {}, "")
+    check("429 halves the rate", abs(throttle.rate - 2.5) < 1e-9 and throttle.pushbacks == 1)
+    throttle.observe(403, {}, '[{"errorCode":"REQUEST_LIMIT_EXCEEDED"}]')
+    check("403 REQUEST_LIMIT_EXCEEDED is push-back too", throttle.pushbacks == 2)
+    throttle.observe(403, {}, '[{"errorCode":"INSUFFICIENT_ACCESS"}]')
+    check("other 403s are not push-back", throttle.pushbacks == 2)
+    for _ in range(100):
+        throttle.observe(200, {"Sforce-Limit-Info": "api-usage=100/1000"})
+    check("successes recover additively up to the base rate", throttle.rate == 10, throttle.rate)
+    throttle.observe(200, {"Sforce-Limit-Info": "api-usage=950/1000"})
+    try:
+        throttle._take()
+        check("hard limit refuses requests", False, "took a token")
+    except aio.ApiLimitError as exc:
+        check("hard limit refuses requests", "950/1000" in str(exc), str(exc))
+
+    throttle = aio.ApiThrottle(max_concurrency=3, rate=1000)
+    state = {"now": 0, "peak": 0}
+
+    async def work():
+        async with throttle.slot():
+            state["now"] += 1
+            state["peak"] = max(state["peak"], state["now"])
+            await asyncio.sleep(0.001)
+            state["now"] -= 1
+
+    async def fan_out():
+        await asyncio.gather(*(work() for _ in range(30)))
+
+    asyncio.run(fan_out())
+    asyncio.run(fan_out())
+    check("semaphore caps in-flight work on every loop", state["peak"] == 3, state)
+
+    aio.reset_throttles()
+    check("throttles shared per org", aio.throttle_for("https://a") is aio.throttle_for("https://a")
+          and aio.throttle_for("https://a") is not aio.throttle_for("https://b"))
+    aio.reset_throttles()
+    try:
+        aio.make_sender("curl")
+        check("unknown async backend rejected", False)
+    except ValueError:
+        check("unknown async backend rejected", True)
+
+
+class _AsyncSender:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def send(self, method, url, *, headers, data, timeout):
+        self.calls.append((method, url, headers["Authorization"]))
+        status, text = self.replies.pop(0)
+        return aio.HttpResult(status, {}, text)
+
+    async def aclose(self):
+        pass
+
+
+def test_aio_toolkit_transport():
+    print("test_aio_toolkit_transport")
+    tokens = iter(["tok-1", "tok-2"])
+    pooled.reset_backends()
+    pooled.register_backend(pooled.PooledBackend(
+        "async-org", auth_resolver=lambda org: (next(tokens), "https://async.example.com")))
+    sender = _AsyncSender([
+        (401, '[{"errorCode":"INVALID_SESSION_ID"}]'),
+        (200, json.dumps({"done": False, "nextRecordsUrl": "/services/data/v66.0/query/01g-2",
+                          "records": [{"Id": "1"}]})),
+        (200, json.dumps({"done": True, "records": [{"Id": "2"}]})),
+        (400, '[{"errorCode":"MALFORMED_QUERY","message":"bad"}]'),
+    ])
+    transport = dt_client.Transport("async-org", dry_run=True)
+
+    async def run():
+        async with transport.aio(sender=sender, throttle=aio.ApiThrottle(rate=1000)) as t:
+            rows = await t.soql("SELECT Id FROM DecisionTable")
+            skipped = await t.connect("POST", "sobjects/DecisionTable", {"x": 1})
+            try:
+                await t.soql("SELECT")
+                error = None
+            except dt_client.DecisionTableClientError as exc:
+                error = exc
+            return rows, skipped, error
+
+    rows, skipped, error = asyncio.run(run())
+    pooled.reset_backends()
+    check("async transport pages every record", [r["Id"] for r in rows] == ["1", "2"], rows)
+    check("401 re-authenticates once", [c[2] for c in sender.calls[:2]]
+          == ["Bearer tok-1", "Bearer tok-2"], sender.calls)
+    check("dry-run skips async mutations", skipped == {} and len(sender.calls) == 4)
+    check("async errors use the toolkit error", error is not None and "MALFORMED_QUERY" in str(error),
+          error)
+    check("every toolkit exposes aio()",
+          all(callable(getattr(m.Transport, "aio", None)) for m in (dt_client, cs_client, es_client)))
+
+
+def main():
+    for test in (
+        test_backend_selection,
+        test_http_backend_request_shape_and_pooling,
+        test_http_backend_error_codes_and_dry_run,
+        test_http_backend_reauth_retry_and_timeout,
+        test_sessions_are_per_thread,
+        test_composite_batch_over_http_backend,
+        test_composite_chaining_and_pagination,
+        test_composite_dry_run_tooling_and_chunking,
+        test_immediate_batch_fallback,
+        test_read_cache_through_client,
+        test_read_cache_ttl_and_revalidation,
+        test_read_cache_invalidation_rules,
+        test_metrics_path_templating,
+        test_metrics_recorded_through_client,
+        test_metrics_summary_and_prometheus,
+        test_cassette_record_and_replay_through_client,
+        test_cassette_matching_and_latency,
+        test_paging_prefetch_and_early_close,
+        test_paging_through_clients,
+        test_bulk_threshold_and_csv,
+        test_bulk_client_job_flow,
+        test_aio_throttle_limits_and_aimd,
+        test_aio_toolkit_transport,
+    ):
+        test()
+    pooled.reset_backends()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
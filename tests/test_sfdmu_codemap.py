@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_codemap.py, the Name->Code backfill map
+``ExtractSFDMUData`` builds after an extraction.
+
+    python tests/test_sfdmu_codemap.py
+
+No org, no SFDMU and no CumulusCI install required: queries and org
+fingerprints are plain callables here.
+
+Worth pinning, because each would silently change extracted CSVs:
+
+* only all-blank / ``#N/A`` columns are backfilled, and each CSV is read once;
+* concurrency must not change the map or its order;
+* a cached map is reused only while the fingerprints of both the queried
+  object and the parent object are unchanged;
+* failed and empty queries leave the components blank and are not cached;
+* a failed org fingerprint costs the cache, never the map: every query runs
+  and nothing is cached.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tasks import rlm_sfdmu_codemap as codemap  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+PLAN = {"objectSets": [{"objects": [
+    {"query": "SELECT Name, Product.StockKeepingUnit, Unit.UnitCode FROM ProductRelatedComponent",
+     "externalId": "Name;Product.StockKeepingUnit;Unit.UnitCode;Group.Code"},
+    {"query": "SELECT Name, Policy.Code FROM AttributeDefinition", "externalId": "Policy.Code;Parent.Name"},
+    {"query": "SELECT Name, Tier.Code FROM Skipped", "externalId": "Tier.Code", "excluded": True},
+    {"query": "SELECT Name, Deep.Parent.Code FROM Nested", "externalId": "Deep.Parent.Code"},
+]}]}
+
+
+def write_csv(path, header, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_extract(root):
+    plan_dir, out_dir = os.path.join(root, "plan"), os.path.join(root, "out")
+    os.makedirs(plan_dir)
+    os.makedirs(out_dir)
+    with open(os.path.join(plan_dir, "export.json"), "w") as f:
+        json.dump(PLAN, f)
+    write_csv(os.path.join(out_dir, "ProductRelatedComponent.csv"),
+              ["Name", "Product.StockKeepingUnit", "Unit.UnitCode", "Group.Code"],
+              [["a", "SKU-1", "#N/A", ""], ["b", "SKU-2", "", "#N/A"]])
+    write_csv(os.path.join(out_dir, "AttributeDefinition.csv"), ["Name", "Policy.Code"], [["x", "#N/A"]])
+    return plan_dir, out_dir
+
+
+def records(rel, field, pairs, parent_type):
+    return [{rel: {"attributes": {"type": parent_type}, "Name": n, field: c}} for n, c in pairs]
+
+
+class FakeOrg:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls, self.running, self.peak = [], 0, 0
+        self.fp = {"ProductRelatedComponent": {"count": 2}, "AttributeDefinition": {"count": 1},
+                   "UnitOfMeasure": {"count": 5}, "ProductGroup": {"count": 3}, "Policy": {"count": 1}}
+        self.fail = set()
+
+    def query(self, soql):
+        with self.lock:
+            self.calls.append(soql)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.05)
+        with self.lock:
+            self.running -= 1
+        if any(word in soql for word in self.fail):
+            raise RuntimeError("INVALID_FIELD")
+        if "Unit.UnitCode" in soql:
+            return records("Unit", "UnitCode", [("Each", "EA"), ("Hour", "HR")], "UnitOfMeasure")
+        if "Group.Code" in soql:
+            return records("Group", "Code", [("Core", "C1"), ("Dup", "D1"), ("Dup", "D2")], "ProductGroup")
+        return []
+
+    def fingerprint(self, sobjects):
+        return {s: dict(self.fp[s]) for s in sobjects if s in self.fp}
+
+
+def test_candidates_and_blanks():
+    print("test_candidates_and_blanks")
+    check("single-hop non-Name components of included objects",
+          codemap.backfill_candidates(PLAN) == [
+              ("ProductRelatedComponent", "Product.StockKeepingUnit"),
+              ("ProductRelatedComponent", "Unit.UnitCode"),
+              ("ProductRelatedComponent", "Group.Code"),
+              ("AttributeDefinition", "Policy.Code")], codemap.backfill_candidates(PLAN))
+    root = tempfile.mkdtemp(prefix="sfdmu_codemap_")
+    try:
+        path = os.path.join(root, "X.csv")
+        write_csv(path, ["﻿A", '"B"', "C"], [["#N/A", "", "v"], ["", "#N/A", ""]])
+        blank = codemap.blank_columns(path, ["A", "B", "C", "Missing"])
+        write_csv(path, ["A"], [])
+        header_only = codemap.blank_columns(path, ["A"])
+        missing = codemap.blank_columns(os.path.join(root, "none.csv"), ["A"])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("blank and #N/A columns are found in one pass; BOM and quotes are stripped",
+          blank == {"A", "B"}, blank)
+    check("a header-only CSV needs no backfill", header_only == set())
+    check("a missing CSV needs no backfill", missing == set())
+
+
+def test_concurrent_build():
+    print("test_concurrent_build")
+    root = tempfile.mkdtemp(prefix="sfdmu_codemap_")
+    try:
+        plan_dir, out_dir = make_extract(root)
+        org = FakeOrg()
+        started = time.monotonic()
+        code_map = codemap.build_code_map(plan_dir, out_dir, org.query, max_workers=4)
+        elapsed = time.monotonic() - started
+        serial = codemap.build_code_map(plan_dir, out_dir, FakeOrg().query, max_workers=1)
+        calls = list(org.calls)
+        org.fail = {"Group"}
+        partial = codemap.build_code_map(plan_dir, out_dir, org.query)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("only the blank columns are queried",
+          len(calls) == 3 and not any("StockKeepingUnit" in c for c in calls), calls)
+    check("the queries overlap", org.peak == 3 and elapsed < 0.05 * 3, (org.peak, elapsed))
+    check("maps match the serial run, including order",
+          json.dumps(code_map) == json.dumps(serial)
+          and list(code_map["ProductRelatedComponent"]) == ["Unit.UnitCode", "Group.Code"], code_map)
+    check("ambiguous names are dropped", code_map["ProductRelatedComponent"]["Group.Code"] == {"Core": "C1"})
+    check("empty results add nothing", "AttributeDefinition" not in code_map)
+    check("a failed query leaves only its components blank",
+          list(partial["ProductRelatedComponent"]) == ["Unit.UnitCode"], partial)
+
+
+def test_cache():
+    print("test_cache")
+    root = tempfile.mkdtemp(prefix="sfdmu_codemap_")
+    try:
+        plan_dir, out_dir = make_extract(root)
+        cache_file = os.path.join(root, "cache", "org.json")
+        org = FakeOrg()
+
+        def run():
+            cache = codemap.load_cache(cache_file)
+            before = len(org.calls)
+            result = codemap.build_code_map(plan_dir, out_dir, org.query, cache=cache, fingerprint=org.fingerprint)
+            codemap.save_cache(cache_file, cache)
+            return result, org.calls[before:]
+
+        first, first_calls = run()
+        saved = codemap.load_cache(cache_file)["queries"]
+        second, second_calls = run()
+        org.fp["UnitOfMeasure"]["count"] = 6
+        _, parent_moved = run()
+        org.fp["ProductRelatedComponent"]["count"] = 3
+        _, object_moved = run()
+        with open(cache_file, "w") as f:
+            f.write("{not json")
+        _, corrupt = run()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("the first extraction queries everything", len(first_calls) == 3, first_calls)
+    check("only non-empty results are cached, with both objects' fingerprints",
+          len(saved) == 2 and all(len(e["sobjects"]) == 2 for e in saved.values())
+          and any(e["sobjects"] == ["ProductRelatedComponent", "UnitOfMeasure"] for e in saved.values()), saved)
+    check("an unchanged org re-uses every cached map", second == first and
+          second_calls == [c for c in first_calls if "Policy" in c], second_calls)
+    check("a moved parent fingerprint re-queries only its map",
+          len(parent_moved) == 2 and any("Unit.UnitCode" in c for c in parent_moved), parent_moved)
+    check("a moved object fingerprint re-queries all of its maps", len(object_moved) == 3, object_moved)
+    check("a corrupt cache is ignored", len(corrupt) == 3, corrupt)
+
+
+def test_fingerprint_failure():
+    print("test_fingerprint_failure")
+    root = tempfile.mkdtemp(prefix="sfdmu_codemap_")
+    warnings = []
+
+    class Log:
+        def info(self, msg):
+            pass
+
+        def warning(self, msg):
+            warnings.append(msg)
+
+    try:
+        plan_dir, out_dir = make_extract(root)
+        expected = codemap.build_code_map(plan_dir, out_dir, FakeOrg().query)
+        outcomes = []
+        for fail_on in (1, 2):  # the watched objects' fingerprint, then the parents'
+            org, calls = FakeOrg(), []
+
+            def fingerprint(sobjects, org=org, calls=calls, fail_on=fail_on):
+                calls.append(sobjects)
+                if len(calls) == fail_on:
+                    raise RuntimeError("composite/batch failed (503)")
+                return org.fingerprint(sobjects)
+
+            cache = {}
+            try:
+                result = codemap.build_code_map(plan_dir, out_dir, org.query, cache=cache,
+                                                fingerprint=fingerprint, log=Log())
+            except Exception as e:
+                result = e
+            outcomes.append((result, len(org.calls), cache.get("queries")))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("a failed fingerprint still returns the full map, querying everything",
+          all(result == expected and queried == 3 for result, queried, _ in outcomes), outcomes)
+    check("nothing is cached when a fingerprint fails", all(not entries for _, _, entries in outcomes), outcomes)
+    check("the failure is logged", len(warnings) == 2 and all("fingerprint failed" in w for w in warnings), warnings)
+
+
+def main():
+    for test in (
+        test_candidates_and_blanks,
+        test_concurrent_build,
+        test_cache,
+        test_fingerprint_failure,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
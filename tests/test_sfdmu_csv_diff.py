@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for scripts/sfdmu_csv_diff.py, the keyed hash-join diff
+behind post_process_extraction.py, compare_sfdmu_content.py and the
+qb-tax/billing/rating/rates reconcile report.
+
+    python tests/test_sfdmu_csv_diff.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+Worth pinning, because each would make a diff report lie:
+
+* rows join on the plan externalId (or its ``$$`` composite column), and
+  neither row order nor column order is a difference;
+* a repeated key keeps its last row, on either side;
+* counts and per-column change counts stay complete when ``limit`` trims
+  the listed rows;
+* a CSV missing on one side is all added / removed, not an error.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import sfdmu_csv_diff as csv_diff  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def test_key_columns():
+    print("test_key_columns")
+    headers = ["Name", "Product.StockKeepingUnit", "$$Rate$Unit", "Price"]
+    check("externalId components that are columns",
+          csv_diff.key_columns(headers, "Name;Product.StockKeepingUnit;Missing") == ["Name", "Product.StockKeepingUnit"])
+    check("the legacy $$ composite column", csv_diff.key_columns(headers, "Rate;Unit") == ["$$Rate$Unit"])
+    check("Id and no externalId key on every column",
+          csv_diff.key_columns(headers, "Id") == headers and csv_diff.key_columns(headers, "") == headers)
+
+
+def test_diff_files():
+    print("test_diff_files")
+    root = tempfile.mkdtemp(prefix="csv_diff_")
+    try:
+        left, right = os.path.join(root, "l", "RateCard.csv"), os.path.join(root, "r", "RateCard.csv")
+        write(left, ["Name", "Status", "Price", "Old"],
+              [["a", "Draft", "1", ""], ["b", "Draft", "2", ""], ["c", "Draft", "3", ""], ["d", "Draft", "4", ""],
+               ["d", "Draft", "5", ""]])
+        write(right, ["Price", "New", "Name", "Status"],
+              [["5", "", "d", "Draft"], ["9", "", "b", "Active"], ["1", "", "a", "Draft"], ["7", "", "e", "Draft"],
+               ["3", "", "c", " Draft "]])
+        report = csv_diff.diff_files(left, right, keys=["Name"])
+        trimmed = csv_diff.diff_files(left, right, keys=["Name"], limit=0)
+        stripped = csv_diff.diff_files(left, right, keys=["Name"], strip=True, ignore=["Price"])
+        write(os.path.join(root, "r", "Same.csv"), ["Status", "Name"], [["x", "2"], ["y", "1"]])
+        write(os.path.join(root, "l", "Same.csv"), ["Name", "Status"], [["1", "y"], ["2", "x"]])
+        same = csv_diff.diff_files(os.path.join(root, "l", "Same.csv"), os.path.join(root, "r", "Same.csv"),
+                                   external_id="Name")
+        only_right = csv_diff.diff_files(os.path.join(root, "l", "None.csv"), right, keys=["Name"])
+        no_key = csv_diff.diff_files(left, right, keys=["Code"])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("row and column order are not differences", not csv_diff.has_differences(same), same)
+    check("added, removed, changed and identical are counted",
+          {k: report["counts"][k] for k in ("identical", "added", "removed", "changed")}
+          == {"identical": 2, "added": 1, "removed": 0, "changed": 2}, report["counts"])
+    check("a repeated key keeps its last row", report["counts"]["left_duplicate_keys"] == 1
+          and not any(e["key"] == ["d"] for e in report["changed"]), report["changed"])
+    deltas = {e["key"][0]: e["columns"] for e in report["changed"]}
+    check("changed rows carry old and new values per column",
+          deltas == {"b": {"Price": ["2", "9"], "Status": ["Draft", "Active"]}, "c": {"Status": ["Draft", " Draft "]}},
+          deltas)
+    check("columns on one side only are reported, not compared",
+          report["columns"] == {"compared": 3, "only_left": ["Old"], "only_right": ["New"]}, report["columns"])
+    check("added rows list their values", report["added"] == [{"key": ["e"], "row": {"Name": "e", "Price": "7",
+                                                                                    "Status": "Draft"}}])
+    check("limit trims the listed rows but not the counts",
+          trimmed["changed"] == [] and trimmed["counts"] == report["counts"]
+          and trimmed["column_changes"] == {"Status": 2, "Price": 1}, trimmed)
+    check("strip and ignore narrow what counts as a change",
+          stripped["counts"]["changed"] == 1 and list(stripped["column_changes"]) == ["Status"], stripped)
+    check("a CSV missing on one side is all added",
+          only_right.get("missing") == "left" and only_right["counts"]["added"] == 5, only_right)
+    check("a key column absent from a side is an error", "error" in no_key and "counts" not in no_key, no_key)
+
+
+def test_dirs_and_reports():
+    print("test_dirs_and_reports")
+    root = tempfile.mkdtemp(prefix="csv_diff_")
+    try:
+        plan, ext = os.path.join(root, "plan"), os.path.join(root, "ext")
+        write(os.path.join(plan, "Product2.csv"), ["StockKeepingUnit", "Name"], [["S1", "One"], ["S2", "Two"]])
+        write(os.path.join(ext, "Product2.csv"), ["Name", "StockKeepingUnit"], [["Uno", "S1"], ["Two", "S2"]])
+        write(os.path.join(ext, "Catalog.csv"), ["Name"], [["Main"]])
+        write(os.path.join(ext, "CSVIssuesReport.csv"), ["Issue"], [["x"]])
+        with open(os.path.join(plan, "export.json"), "w") as f:
+            json.dump({"objects": [{"query": "SELECT Name, StockKeepingUnit FROM Product2",
+                                    "externalId": "StockKeepingUnit"}]}, f)
+        report = csv_diff.diff_dirs(plan, ext)
+        markdown = csv_diff.render_markdown(report)
+        encoded = json.dumps(report)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("every data CSV in either directory is diffed, reports skipped",
+          sorted(report["files"]) == ["Catalog.csv", "Product2.csv"], sorted(report["files"]))
+    product = report["files"]["Product2.csv"]
+    check("the plan's externalId is the join key",
+          product["key"] == ["StockKeepingUnit"] and product["counts"]["changed"] == 1, product)
+    check("totals add up across files", report["totals"]["added"] == 1 and report["totals"]["changed"] == 1,
+          report["totals"])
+    check("the report is plain JSON", '"Uno"' in encoded)
+    check("the Markdown has the summary table and the column delta",
+          "| Product2.csv | StockKeepingUnit | 2 | 2 | 1 | 0 | 0 | 1 |" in markdown and "| S1 | Name | One | Uno |"
+          in markdown, markdown)
+
+
+def main():
+    for test in (
+        test_key_columns,
+        test_diff_files,
+        test_dirs_and_reports,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_fingerprint.py, the Merkle manifests
+of SFDMU plans behind scripts/sfdmu_fingerprint.py, compare_sfdmu_extractions.py
+and the idempotency task's ``skip_unchanged``.
+
+    python tests/test_sfdmu_fingerprint.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+A fingerprint that misses a change would let a drift check or an idempotency
+run skip work it should have done, so the properties worth pinning are:
+
+* row order and column order do not change a CSV's hash, but any cell, a
+  duplicated row or a renamed column does;
+* the orgs block of export.json is not part of the plan;
+* a comparison only reports the plans, objects and files that moved;
+* re-using a previous manifest never hides an edited CSV;
+* a recorded run only matches the same plan, org state and options.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tasks import rlm_sfdmu_fingerprint as fingerprint  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_tree(root):
+    for plan in ("qb-pcm", "qb-rating"):
+        plan_dir = os.path.join(root, plan)
+        write(os.path.join(plan_dir, "Product2.csv"), ["Name", "StockKeepingUnit"], [["A", "S1"], ["B", "S2"]])
+        write(os.path.join(plan_dir, "Unit.csv"), ["Code"], [["EA"]])
+        write(os.path.join(plan_dir, "objectset_source", "object-set-2", "Product2.csv"), ["Name"], [["A"]])
+        write(os.path.join(plan_dir, "MissingParentRecordsReport.csv"), ["x"], [["y"]])
+        with open(os.path.join(plan_dir, "export.json"), "w") as f:
+            json.dump({"objects": [{"query": "SELECT Name FROM Product2"}], "orgs": []}, f)
+
+
+def test_csv_hash():
+    print("test_csv_hash")
+    root = tempfile.mkdtemp(prefix="sfdmu_fp_")
+    try:
+        def fp(header, rows):
+            path = os.path.join(root, "X.csv")
+            write(path, header, rows)
+            return fingerprint.csv_fingerprint(path)
+
+        base = fp(["Name", "Code"], [["a", "1"], ["b", "2"]])
+        shuffled = fp(["Code", "Name"], [["2", "b"], ["1", "a"]])
+        edited = fp(["Name", "Code"], [["a", "1"], ["b", "3"]])
+        doubled = fp(["Name", "Code"], [["a", "1"], ["a", "1"], ["b", "2"]])
+        renamed = fp(["Name", "Code2"], [["a", "1"], ["b", "2"]])
+        swapped = fp(["Name", "Code"], [["a", "2"], ["b", "1"]])
+        blank_line = os.path.join(root, "Y.csv")
+        with open(blank_line, "w", encoding="utf-8") as f:
+            f.write("\ufeffName,Code\r\na,1\r\n\r\nb,2\r\n")
+        with_bom = fingerprint.csv_fingerprint(blank_line)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("row and column order do not change the hash", base == shuffled, (base, shuffled))
+    check("an edited cell changes the hash", edited["hash"] != base["hash"])
+    check("a duplicated row changes the hash and the count", doubled["hash"] != base["hash"] and doubled["rows"] == 3)
+    check("a renamed column changes the column digest", renamed["columns"] != base["columns"])
+    check("values moved between rows change the hash", swapped["hash"] != base["hash"])
+    check("BOM, CRLF and blank lines are ignored", with_bom == base, with_bom)
+
+
+def test_manifest_and_compare():
+    print("test_manifest_and_compare")
+    root = tempfile.mkdtemp(prefix="sfdmu_fp_")
+    try:
+        left, right = os.path.join(root, "en-US"), os.path.join(root, "ja")
+        make_tree(left)
+        make_tree(right)
+        with open(os.path.join(right, "qb-pcm", "export.json"), "w") as f:
+            json.dump({"objects": [{"query": "SELECT Name FROM Product2"}], "orgs": [{"name": "x"}]}, f)
+        same = fingerprint.compare_manifests(fingerprint.build_manifest(left), fingerprint.build_manifest(right))
+        write(os.path.join(right, "qb-rating", "objectset_source", "object-set-2", "Product2.csv"), ["Name"], [["B"]])
+        write(os.path.join(right, "qb-rating", "Tax.csv"), ["Code"], [])
+        os.makedirs(os.path.join(right, "qb-new"))
+        with open(os.path.join(right, "qb-new", "export.json"), "w") as f:
+            f.write("{}")
+        manifest = fingerprint.build_manifest(left)
+        diff = fingerprint.compare_manifests(manifest, fingerprint.build_manifest(right))
+        single = fingerprint.build_manifest(os.path.join(left, "qb-pcm"))
+        lines = fingerprint.summary_lines(diff)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("plans are found under the base directory", sorted(manifest["plans"]) == ["qb-pcm", "qb-rating"],
+          list(manifest["plans"]))
+    pcm = manifest["plans"]["qb-pcm"]
+    check("objectset_source copies belong to their object; reports are skipped",
+          list(pcm["objects"]) == ["Product2", "Unit"]
+          and sorted(pcm["objects"]["Product2"]["files"]) == ["Product2.csv",
+                                                               "objectset_source/object-set-2/Product2.csv"]
+          and pcm["objects"]["Product2"]["rows"] == 3, pcm["objects"])
+    check("the orgs block is not part of the plan", same["same"] and same["unchanged_plans"] == 2, same)
+    check("a plan directory is a manifest of one plan", list(single["plans"]) == ["."])
+    check("only moved plans are reported", sorted(diff["plans"]) == ["qb-new", "qb-rating"]
+          and diff["unchanged_plans"] == 1 and diff["plans"]["qb-new"]["status"] == "added", diff)
+    objects = diff["plans"]["qb-rating"]["objects"]
+    check("only moved objects and files are reported",
+          objects == {"Product2": {"status": "changed", "rows": [3, 3],
+                                   "files": {"objectset_source/object-set-2/Product2.csv": "rows"}},
+                      "Tax": {"status": "added", "rows": [None, 0]}}, objects)
+    check("the summary names the moved object", any("Tax: added" in line for line in lines), lines)
+
+
+def test_reuse_and_runs():
+    print("test_reuse_and_runs")
+    root = tempfile.mkdtemp(prefix="sfdmu_fp_")
+    try:
+        make_tree(root)
+        cache = os.path.join(root, ".cache")
+        first = fingerprint.cached_manifest(root, cache)
+        path = os.path.join(root, "qb-pcm", "Unit.csv")
+        stat = os.stat(path)
+        write(path, ["Code"], [["HR"]])  # same size; bump mtime so the cache sees it
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        edited = fingerprint.cached_manifest(root, cache)
+        stale = json.loads(json.dumps(first))
+        stale["plans"]["qb-rating"]["objects"]["Unit"]["files"]["Unit.csv"]["hash"] = "poisoned"
+        reused = fingerprint.build_manifest(root, stale)
+
+        runs = os.path.join(root, ".runs", "org.json")
+        plan = edited["plans"]["qb-pcm"]
+        before = fingerprint.unchanged_since_run(runs, "qb-pcm", plan, "org1", {"roundtrip": False})
+        fingerprint.record_run(runs, "qb-pcm", plan, "org1", {"roundtrip": False})
+        matched = fingerprint.unchanged_since_run(runs, "./qb-pcm", plan, "org1", {"roundtrip": False})
+        org_moved = fingerprint.unchanged_since_run(runs, "qb-pcm", plan, "org2", {"roundtrip": False})
+        options_moved = fingerprint.unchanged_since_run(runs, "qb-pcm", plan, "org1", {"roundtrip": True})
+        plan_moved = fingerprint.unchanged_since_run(runs, "qb-pcm", first["plans"]["qb-pcm"], "org1",
+                                                     {"roundtrip": False})
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("an edited CSV is re-read even at the same size",
+          edited["plans"]["qb-pcm"]["root"] != first["plans"]["qb-pcm"]["root"])
+    check("unchanged CSVs are taken from the previous manifest",
+          reused["plans"]["qb-rating"]["objects"]["Unit"]["files"]["Unit.csv"]["hash"] == "poisoned")
+    check("no record, no skip", not before)
+    check("the same plan, org state and options match the recorded run", matched)
+    check("a moved org, other options or an edited plan do not match",
+          not org_moved and not options_moved and not plan_moved)
+
+
+def main():
+    for test in (
+        test_csv_hash,
+        test_manifest_and_compare,
+        test_reuse_and_runs,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
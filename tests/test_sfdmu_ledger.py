@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_ledger.py, the per-org load ledger
+behind ``LoadSFDMUData`` differential reloads.
+
+    python tests/test_sfdmu_ledger.py
+
+No org, no SFDMU and no CumulusCI install required. Plans are written to a
+temp dir. The round trip loads them with the native engine into the local
+REST stand-in (scripts/sf_standin).
+
+The properties worth pinning are the ones that would silently lose data if
+they broke:
+
+* a ``deleteOldData`` object must never get a partial CSV;
+* under SFDMU, an object that another changed object looks up must keep
+  every row, whether the plan lists it before or after that object;
+* a change in the org behind the ledger's back, or a count that failed (org
+  state unknown), must force a full load of that object;
+* an unchanged object must stay in the plan as ``Readonly``, not vanish;
+* rows SFDMU reported as unresolved or failed, on an exit code of 0, must
+  not be recorded, or no plain rerun would load them again.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.sf_standin.server import build_app, serve  # noqa: E402
+from tasks import rlm_http  # noqa: E402
+from tasks import rlm_sfdmu_ledger as ledger  # noqa: E402
+from tasks import rlm_sfdmu_native as native  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+PLAN = {
+    "objectSets": [
+        {"name": "Pass 1", "objects": [
+            {"query": "SELECT Name FROM Catalog", "operation": "Readonly", "externalId": "Name"},
+            {"query": "SELECT Name, Code FROM Family__c", "operation": "Upsert", "externalId": "Code"},
+            {"query": "SELECT Name, StockKeepingUnit, Family__c FROM Product2",
+             "operation": "Upsert", "externalId": "StockKeepingUnit"},
+            {"query": "SELECT Tag, Product2Id FROM ProductTag__c", "operation": "Insert",
+             "deleteOldData": True, "externalId": "Product2.StockKeepingUnit;Tag"},
+        ]},
+    ],
+}
+
+CSVS = {
+    "Family__c.csv": [["Code", "Name"], ["F1", "Hardware"], ["F2", "Software"]],
+    "Product2.csv": [["Family__r.Code", "Name", "StockKeepingUnit"],
+                     ["F1", "Laptop", "SKU-1"], ["F1", "Dock", "SKU-2"], ["F2", "Suite", "SKU-3"]],
+    "ProductTag__c.csv": [["$$Product2.StockKeepingUnit$Tag", "Product2.StockKeepingUnit", "Tag"],
+                          ["SKU-1;new", "SKU-1", "new"], ["SKU-2;sale", "SKU-2", "sale"]],
+}
+
+# The same plan with the child listed before its parent (as in qb-rating and qb-tax).
+CHILD_FIRST = {"objectSets": [{"name": "Pass 1",
+                                "objects": [PLAN["objectSets"][0]["objects"][i] for i in (0, 2, 1, 3)]}]}
+
+FINGERPRINT = {"Family__c": {"count": 2, "max_modstamp": "t1"},
+               "Product2": {"count": 3, "max_modstamp": "t1"},
+               "ProductTag__c": {"count": 2, "max_modstamp": "t1"}}
+
+
+def write_plan(root, plan=PLAN, csvs=CSVS):
+    with open(os.path.join(root, "export.json"), "w") as f:
+        json.dump(plan, f)
+    for name, rows in csvs.items():
+        with open(os.path.join(root, name), "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+
+def edit_csv(root, name, rows):
+    with open(os.path.join(root, name), "w", newline="") as f:
+        csv.writer(f).writerows(rows)
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def statuses(decided):
+    return {o["sobject"]: o["status"] for o in decided["objects"]}
+
+
+def differential(root, out, fingerprint=FINGERPRINT, recorded=FINGERPRINT, **kwargs):
+    """Record a load of the plan as first written, then apply ``kwargs['edit']`` and decide."""
+    scan = ledger.scan_plan(root)
+    path = os.path.join(out, "ledger.json")
+    ledger.record_load(path, scan, recorded, previous={})
+    for name, rows in kwargs.pop("edit", {}).items():
+        edit_csv(root, name, rows)
+    plan_dir = os.path.join(out, "plan")
+    decided = ledger.build_differential_plan(root, plan_dir, ledger.scan_plan(root),
+                                             ledger.load_ledger(path), fingerprint, **kwargs)
+    return decided, plan_dir
+
+
+def test_row_keys():
+    print("test_row_keys")
+    root = tempfile.mkdtemp(prefix="sfdmu_ledger_")
+    try:
+        write_plan(root)
+        tags = ledger.row_hashes(os.path.join(root, "ProductTag__c.csv"), "Product2.StockKeepingUnit;Tag")
+        products = ledger.row_hashes(os.path.join(root, "Product2.csv"), "StockKeepingUnit")
+        keyless = ledger.row_hashes(os.path.join(root, "Product2.csv"), "Missing__c")
+        edit_csv(root, "Product2.csv", [["StockKeepingUnit", "Name", "Family__r.Code"],
+                                        ["SKU-1", "Laptop", "F1"], ["SKU-2", "Dock", "F1"],
+                                        ["SKU-3", "Suite", "F2"]])
+        reordered = ledger.row_hashes(os.path.join(root, "Product2.csv"), "StockKeepingUnit")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("composite keys come out of the $$ column", "SKU-2\x1fsale" in tags, list(tags))
+    check("externalId keys the row", sorted(products) == ["SKU-1", "SKU-2", "SKU-3"], list(products))
+    check("rows without a usable key are keyed by content", all(k.startswith("#") for k in keyless))
+    check("column order does not change a row's hash", reordered == products)
+
+
+def test_decisions():
+    print("test_decisions")
+    cases = {}
+    for name, kwargs in {
+        "unchanged": {},
+        "leaf": {"edit": {"ProductTag__c.csv": CSVS["ProductTag__c.csv"] + [["SKU-3;new", "SKU-3", "new"]]}},
+        "product": {"edit": {"Product2.csv": CSVS["Product2.csv"][:3] + [["F2", "Suite Pro", "SKU-3"]]}},
+        "family": {"edit": {"Family__c.csv": [["Code", "Name"], ["F1", "Hardware"], ["F2", "Apps"]],
+                            "Product2.csv": CSVS["Product2.csv"][:3] + [["F2", "Suite Pro", "SKU-3"]]}},
+        "family_native": {"edit": {"Family__c.csv": [["Code", "Name"], ["F1", "Hardware"], ["F2", "Apps"]],
+                                   "Product2.csv": CSVS["Product2.csv"][:3] + [["F2", "Suite Pro", "SKU-3"]]},
+                          "lookups_from_org": True},
+        "child_first": {"edit": {"Family__c.csv": [["Code", "Name"], ["F1", "Hardware"], ["F2", "Apps"]],
+                                 "Product2.csv": CSVS["Product2.csv"][:3] + [["F2", "Suite Pro", "SKU-3"]]},
+                        "plan": CHILD_FIRST},
+        "org_moved": {"fingerprint": {**FINGERPRINT, "Product2": {"count": 2, "max_modstamp": "t9"}}},
+        "count_failed": {"fingerprint": {k: v for k, v in FINGERPRINT.items() if k != "Product2"},
+                         "recorded": {k: v for k, v in FINGERPRINT.items() if k != "Product2"}},
+    }.items():
+        root, out = tempfile.mkdtemp(prefix="sfdmu_ledger_"), tempfile.mkdtemp(prefix="sfdmu_ledger_")
+        try:
+            write_plan(root, plan=kwargs.pop("plan", PLAN))
+            decided, plan_dir = differential(root, out, **kwargs)
+            files = {n: read_rows(os.path.join(plan_dir, n)) for n in CSVS} if decided["changed"] else {}
+            plan = json.load(open(os.path.join(plan_dir, "export.json"))) if decided["changed"] else {}
+            cases[name] = (decided, files, plan)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.rmtree(out, ignore_errors=True)
+
+    decided, _, _ = cases["unchanged"]
+    check("an unchanged plan needs no load", not decided["changed"] and decided["rows_loaded"] == 0, decided)
+
+    decided, files, plan = cases["leaf"]
+    check("a new row in a deleteOldData object reloads the whole CSV",
+          statuses(decided)["ProductTag__c"] == "full" and len(files["ProductTag__c.csv"]) == 4, decided)
+    ops = {o["query"].split(" FROM ")[1]: o for o in plan["objectSets"][0]["objects"]}
+    check("unchanged objects stay in the plan as Readonly with every row",
+          ops["Product2"]["operation"] == "Readonly" and ops["Family__c"]["operation"] == "Readonly"
+          and len(files["Product2.csv"]) == 4, ops)
+    check("Readonly objects from the plan are untouched", ops["Catalog"]["operation"] == "Readonly")
+
+    decided, files, plan = cases["product"]
+    ops = {o["query"].split(" FROM ")[1]: o for o in plan["objectSets"][0]["objects"]}
+    check("a changed leaf object keeps only its changed rows",
+          statuses(decided)["Product2"] == "partial"
+          and files["Product2.csv"] == [CSVS["Product2.csv"][0], ["F2", "Suite Pro", "SKU-3"]], files["Product2.csv"])
+    check("an unchanged deleteOldData object is neither deleted nor reinserted",
+          ops["ProductTag__c"]["operation"] == "Readonly" and "deleteOldData" not in ops["ProductTag__c"], ops)
+    check("row totals are reported", decided["rows_total"] == 7 and decided["rows_loaded"] == 1, decided)
+
+    decided, files, _ = cases["family"]
+    check("SFDMU: a parent of a later changed object keeps every row",
+          statuses(decided)["Family__c"] == "full" and len(files["Family__c.csv"]) == 3, decided["objects"])
+    decided, files, _ = cases["child_first"]
+    check("SFDMU: a parent listed after its changed child keeps every row, and the child is filtered",
+          statuses(decided)["Family__c"] == "full" and len(files["Family__c.csv"]) == 3
+          and statuses(decided)["Product2"] == "partial" and len(files["Product2.csv"]) == 2, decided["objects"])
+    decided, files, _ = cases["family_native"]
+    check("native: lookups resolve in the org, so the parent is filtered too",
+          statuses(decided)["Family__c"] == "partial" and len(files["Family__c.csv"]) == 2, decided["objects"])
+
+    decided, _, _ = cases["org_moved"]
+    check("an object changed in the org since the last load loads in full",
+          statuses(decided) == {"Family__c": "unchanged", "Product2": "full", "ProductTag__c": "unchanged"},
+          decided["objects"])
+    decided, _, _ = cases["count_failed"]
+    reasons = {o["sobject"]: o["reason"] for o in decided["objects"]}
+    check("an object with no count on either side loads in full, not as unchanged",
+          statuses(decided)["Product2"] == "full" and reasons["Product2"] == "org state unknown",
+          decided["objects"])
+
+
+def test_plan_edits_and_selection():
+    print("test_plan_edits_and_selection")
+    root, out = tempfile.mkdtemp(prefix="sfdmu_ledger_"), tempfile.mkdtemp(prefix="sfdmu_ledger_")
+    try:
+        write_plan(root)
+        path = os.path.join(out, "ledger.json")
+        ledger.record_load(path, ledger.scan_plan(root), FINGERPRINT, previous={})
+        recorded = ledger.load_ledger(path)
+        plan = json.loads(json.dumps(PLAN))
+        plan["objectSets"][0]["objects"][2]["query"] += " WHERE IsActive = true"
+        with open(os.path.join(root, "export.json"), "w") as f:
+            json.dump(plan, f)
+        decided = ledger.build_differential_plan(root, os.path.join(out, "plan"), ledger.scan_plan(root),
+                                                 recorded, FINGERPRINT)
+        only_first = ledger.scan_plan(root, selected=[0, 5])
+        with open(os.path.join(root, "export.json"), "w") as f:
+            json.dump({**PLAN, "orgs": [{"name": "x"}]}, f)
+        with_orgs = ledger.scan_plan(root)
+        with open(path + ".broken", "w") as f:
+            f.write("{")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    try:
+        broken = ledger.load_ledger(path + ".broken")
+    finally:
+        shutil.rmtree(out, ignore_errors=True)
+    check("an edited export.json loads everything",
+          set(statuses(decided).values()) == {"full"}, decided["objects"])
+    check("orgs injected at run time do not count as a plan edit",
+          with_orgs["plan_hash"] == recorded["plan_hash"])
+    check("out-of-range set indices are ignored", only_first["sobjects"] == ["Family__c", "Product2", "ProductTag__c"])
+    check("an unreadable ledger means a full load", broken == {})
+    check("ledger paths are per org and per plan",
+          ledger.ledger_path(".cci/l", "00D1", "datasets/sfdmu/qb/en-US/qb-pcm")
+          == os.path.join(".cci/l", "00D1", "datasets__sfdmu__qb__en-US__qb-pcm.json")
+          and ledger.org_key(None, "https://a.example.com/") == ledger.org_key(None, "https://a.example.com"))
+
+
+def test_sfdmu_reports():
+    print("test_sfdmu_reports")
+    root, out = tempfile.mkdtemp(prefix="sfdmu_ledger_"), tempfile.mkdtemp(prefix="sfdmu_ledger_")
+    sobjects = ["Family__c", "Product2", "ProductTag__c"]
+    try:
+        write_plan(root)
+        os.makedirs(os.path.join(root, "target"))
+        stale = os.path.join(root, "target", "Family__c_Upsert_target.csv")
+        edit_csv(root, stale, [["Code", "Errors"], ["F1", "DUPLICATE_VALUE"]])
+        os.utime(stale, (1000, 1000))  # left over from an earlier run
+        since = time.time() - 1
+        clean = ledger.failed_sobjects(root, sobjects, since)
+        edit_csv(root, "target/Product2_Upsert_target.csv",
+                 [["StockKeepingUnit", "Errors"], ["SKU-1", ""], ["SKU-2", "REQUIRED_FIELD_MISSING"]])
+        edit_csv(root, "target/ProductTag__c_Insert_target.csv", [["Tag", "Errors"], ["new", ""]])
+        edit_csv(root, "MissingParentRecordsReport.csv",
+                 [["Child sObject", "Child lookup field", "Missing parent external Id value"],
+                  ["ProductTag__c", "Product2Id", "SKU-9"]])
+        failed = ledger.failed_sobjects(root, sobjects, since)
+        edit_csv(root, "MissingParentRecordsReport.csv", [["Record"], ["a9F000"]])
+        unattributed = ledger.failed_sobjects(root, sobjects, since)
+
+        path = os.path.join(out, "ledger.json")
+        ledger.record_load(path, ledger.scan_plan(root), FINGERPRINT, previous={}, failed=failed)
+        recorded = ledger.load_ledger(path)
+        decided = ledger.build_differential_plan(root, os.path.join(out, "plan"), ledger.scan_plan(root),
+                                                 recorded, FINGERPRINT)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(out, ignore_errors=True)
+    check("a clean run, or an older report, fails nothing", clean == set(), clean)
+    check("Errors cells and missing parents name the objects SFDMU did not load",
+          failed == {"Product2", "ProductTag__c"}, failed)
+    check("a missing-parent report that names no object fails every object", unattributed == set(sobjects),
+          unattributed)
+    check("failed objects are left out of the ledger and load in full on the next run",
+          sorted(recorded["files"]) == ["Family__c.csv"]
+          and statuses(decided) == {"Family__c": "unchanged", "Product2": "full", "ProductTag__c": "full"},
+          decided["objects"])
+
+
+def field(name, kind="string", **extra):
+    return {"name": name, "type": kind, "createable": True, "updateable": True, **extra}
+
+
+def test_native_round_trip():
+    print("test_native_round_trip")
+    rlm_http.reset_sessions()
+    app = build_app()
+    app.register_schema("Family__c", [field("Name"), field("Code")])
+    app.register_schema("Product2", [field("Name"), field("StockKeepingUnit"),
+                                     field("Family__c", "reference", relationshipName="Family__r",
+                                           referenceTo=["Family__c"])])
+    plan = {"objectSets": [{"objects": PLAN["objectSets"][0]["objects"][1:3]}]}
+    csvs = {k: v for k, v in CSVS.items() if k != "ProductTag__c.csv"}
+    root, out = tempfile.mkdtemp(prefix="sfdmu_ledger_"), tempfile.mkdtemp(prefix="sfdmu_ledger_")
+    path = os.path.join(out, "ledger.json")
+    try:
+        write_plan(root, plan, csvs)
+        with serve(app) as server:
+            def load(plan_dir):
+                return native.NativeSfdmuLoader(plan_dir, server.url, "standin", bulk_threshold=0).run()
+
+            load(root)
+            ledger.record_load(path, ledger.scan_plan(root), FINGERPRINT, previous={})
+            edit_csv(root, "Product2.csv", csvs["Product2.csv"] + [["F2", "Backup", "SKU-4"]])
+            decided = ledger.build_differential_plan(root, os.path.join(out, "plan"), ledger.scan_plan(root),
+                                                     ledger.load_ledger(path), FINGERPRINT,
+                                                     lookups_from_org=True)
+            report = load(os.path.join(out, "plan"))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        shutil.rmtree(out, ignore_errors=True)
+        rlm_http.reset_sessions()
+    objects = {o["sobject"]: o for o in report["sets"][0]["objects"]}
+    check("only the new row is read and written",
+          objects["Product2"]["rows"] == 1 and objects["Product2"]["created"] == 1
+          and "Family__c" not in objects, objects)
+    families = {f["Code"]: f["Id"] for f in app.store.find("Family__c")}
+    backup = app.store.find("Product2", StockKeepingUnit="SKU-4")
+    check("the new row's lookup resolves through the org",
+          len(backup) == 1 and backup[0].get("Family__c") == families["F2"], backup)
+    check("nothing else is duplicated", len(app.store.find("Product2")) == 4 and decided["rows_loaded"] == 1)
+
+
+def main():
+    for test in (
+        test_row_keys,
+        test_decisions,
+        test_plan_edits_and_selection,
+        test_sfdmu_reports,
+        test_native_round_trip,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_native.py, the in-process SFDMU plan
+loader behind ``LoadSFDMUData`` ``engine: native``.
+
+    python tests/test_sfdmu_native.py
+
+No org, no SFDMU and no CumulusCI install required. A small two-set plan is
+written to a temp dir and loaded into the local REST stand-in
+(scripts/sf_standin), with a registered schema standing in for the org's
+describes.
+
+The properties worth pinning are the ones SFDMU users rely on without
+thinking. A composite ``$$`` key must match the same record a second time,
+and a lookup through a parent's composite key must land on the right parent.
+A re-run of an unchanged plan must write nothing. ``deleteOldData`` must
+replace rows rather than add to them. Set 2 must read its
+``objectset_source`` CSV.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from scripts.sf_standin.server import build_app, serve  # noqa: E402
+from tasks import rlm_http  # noqa: E402
+from tasks import rlm_sfdmu_native as native  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def field(name, kind="string", **extra):
+    return {"name": name, "type": kind, "createable": True, "updateable": True, **extra}
+
+
+def ref(name, relationship, target):
+    return field(name, "reference", relationshipName=relationship, referenceTo=[target])
+
+
+SCHEMA = {
+    "Catalog": [field("Name")],
+    "Product2": [field("Name"), field("StockKeepingUnit"), field("IsActive", "boolean"),
+                 ref("CatalogId", "Catalog", "Catalog"),
+                 ref("ParentProductId", "ParentProduct", "Product2")],
+    "ProductSellingModel": [field("Name"), field("SellingModelType", "picklist")],
+    "PricebookEntry": [field("Name", createable=False, updateable=False),
+                       field("UnitPrice", "currency"), field("CurrencyIsoCode", "picklist"),
+                       ref("Product2Id", "Product2", "Product2"),
+                       ref("ProductSellingModelId", "ProductSellingModel", "ProductSellingModel")],
+}
+
+PLAN = {
+    "apiVersion": "67.0",
+    "objectSets": [
+        {"name": "Pass 1", "objects": [
+            {"query": "SELECT Name FROM Catalog", "operation": "Readonly", "externalId": "Name"},
+            {"query": "SELECT Name, StockKeepingUnit, IsActive, CatalogId, ParentProductId FROM Product2",
+             "operation": "Upsert", "externalId": "StockKeepingUnit"},
+            {"query": "SELECT Name, SellingModelType FROM ProductSellingModel",
+             "operation": "Upsert", "externalId": "Name;SellingModelType"},
+            {"query": "SELECT Name, UnitPrice, CurrencyIsoCode, Product2Id, ProductSellingModelId "
+                      "FROM PricebookEntry",
+             "operation": "Insert", "deleteOldData": True,
+             "externalId": "Product2.StockKeepingUnit;ProductSellingModel.Name;CurrencyIsoCode"},
+        ]},
+        {"name": "Pass 2", "objects": [
+            {"query": "SELECT StockKeepingUnit, IsActive FROM Product2 WHERE IsActive = true",
+             "operation": "Update", "externalId": "StockKeepingUnit"},
+        ]},
+    ],
+}
+
+CSVS = {
+    "Product2.csv": [
+        ["Catalog.Name", "IsActive", "Name", "ParentProduct.StockKeepingUnit", "StockKeepingUnit"],
+        ["Main", "true", "Bundle", "", "SKU-B"],
+        ["Main", "TRUE", "Child", "SKU-B", "SKU-C"],
+        ["Gone", "true", "Orphan", "", "SKU-O"],
+    ],
+    "ProductSellingModel.csv": [
+        ["$$Name$SellingModelType", "Name", "SellingModelType"],
+        ["Monthly;Evergreen", "Monthly", "Evergreen"],
+        ["Annual;TermDefined", "Annual", "TermDefined"],
+    ],
+    "PricebookEntry.csv": [
+        ["$$Product2.StockKeepingUnit$ProductSellingModel.Name$CurrencyIsoCode", "CurrencyIsoCode",
+         "Name", "Product2.StockKeepingUnit", "ProductSellingModel.$$Name$SellingModelType", "UnitPrice"],
+        ["SKU-B;Monthly;USD", "USD", "ignored", "SKU-B", "Monthly;Evergreen", "10.0"],
+        ["SKU-C;Annual;USD", "USD", "ignored", "SKU-C", "Annual;TermDefined", "120"],
+    ],
+    os.path.join("objectset_source", "object-set-2", "Product2.csv"): [
+        ["IsActive", "StockKeepingUnit"],
+        ["false", "SKU-C"],
+    ],
+}
+
+
+def write_plan(root):
+    with open(os.path.join(root, "export.json"), "w") as f:
+        json.dump(PLAN, f)
+    for name, rows in CSVS.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+
+class Log:
+    def __init__(self):
+        self.lines = []
+
+    def info(self, msg):
+        self.lines.append(("info", msg))
+
+    warning = error = info
+
+
+def by_object(report, set_index=0):
+    return {o["sobject"]: o for o in report["sets"][set_index]["objects"]}
+
+
+def test_helpers():
+    print("test_helpers")
+    check("numbers and booleans compare by value",
+          native.normalize("10.0") == native.normalize(10) == "10" and native.normalize("TRUE") == "true")
+    check("externalId and $$ header split alike",
+          native.key_components("A;B.C") == native.key_components("$$A$B.C") == ["A", "B.C"])
+    check("lookup columns parse",
+          native.lookup_column("Rel.$$A$B") == ("Rel", ["A", "B"])
+          and native.lookup_column("Rel.X.Y") == ("Rel", ["X.Y"]) and native.lookup_column("$$A$B") is None)
+    check("WHERE survives ORDER BY",
+          native.where_clause("SELECT Id FROM X WHERE Status = 'Draft' ORDER BY Name") == "Status = 'Draft'")
+    reader = native.KeyReader(["$$A$B", "C"], ["B", "C"])
+    check("key components come from inside a $$ column",
+          reader({"$$A$B": "a;b", "C": "c"}) == ("b", "c"))
+    check("SOQL literals are escaped", native.soql_literal("O'Brien") == "'O\\'Brien'")
+
+
+def test_load_rerun_and_sets():
+    print("test_load_rerun_and_sets")
+    rlm_http.reset_sessions()
+    app = build_app()
+    for sobject, fields in SCHEMA.items():
+        app.register_schema(sobject, fields)
+    app.store.create("Catalog", {"Name": "Main"})
+    stale = app.store.create("PricebookEntry", {"UnitPrice": "1", "CurrencyIsoCode": "USD"})
+    root = tempfile.mkdtemp(prefix="sfdmu_native_")
+    try:
+        write_plan(root)
+        with serve(app) as server:
+            def load(**kwargs):
+                return native.NativeSfdmuLoader(root, server.url, "standin", logger=Log(),
+                                                bulk_threshold=0, **kwargs).run()
+
+            first = load(object_sets=[0])
+            second = load(object_sets=[0])
+            sku = {p["StockKeepingUnit"]: p for p in app.store.find("Product2")}
+            third = load(object_sets=[1])
+            simulated = load(simulation=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        rlm_http.reset_sessions()
+
+    levels = first["sets"][0]["levels"]
+    check("parents load in an earlier level than PricebookEntry",
+          levels == [["Product2", "ProductSellingModel"], ["PricebookEntry"]], levels)
+    objs = by_object(first)
+    check("first run creates every row",
+          objs["Product2"]["created"] == 3 and objs["ProductSellingModel"]["created"] == 2
+          and objs["PricebookEntry"]["created"] == 2, objs)
+    check("unknown parent is counted, not fatal", objs["Product2"]["unresolved_lookups"] == 1, objs["Product2"])
+    check("deleteOldData removed the stale entry",
+          objs["PricebookEntry"]["deleted"] == 1 and app.store.get(stale) is None)
+
+    psm = {m["Name"]: m["Id"] for m in app.store.find("ProductSellingModel")}
+    entries = {(e["Product2Id"], e["ProductSellingModelId"]): e for e in app.store.find("PricebookEntry")}
+    check("composite parent key resolves the right selling model",
+          (sku["SKU-C"]["Id"], psm["Annual"]) in entries and (sku["SKU-B"]["Id"], psm["Monthly"]) in entries,
+          list(entries))
+    check("self-lookup is linked in a second pass", sku["SKU-C"].get("ParentProductId") == sku["SKU-B"]["Id"])
+    check("non-createable fields are not sent", all("Name" not in e for e in entries.values()))
+    check("values are typed from the describe",
+          sku["SKU-B"]["IsActive"] is True and entries[(sku["SKU-B"]["Id"], psm["Monthly"])]["UnitPrice"] == 10.0)
+
+    pass2 = by_object(third)["Product2"]
+    check("set 2 reads its objectset_source CSV",
+          pass2["set"] == 1 and pass2["rows"] == 1 and pass2["updated"] == 1
+          and app.store.find("Product2", StockKeepingUnit="SKU-C")[0]["IsActive"] is False, pass2)
+
+    objs2 = by_object(second)
+    check("re-run writes nothing for matched, unchanged rows",
+          objs2["Product2"]["unchanged"] == 3 and objs2["Product2"]["updated"] == 0
+          and objs2["Product2"].get("self_links") == 0
+          and objs2["ProductSellingModel"]["unchanged"] == 2, objs2)
+    check("re-run never inserts duplicates",
+          len(app.store.find("Product2")) == 3 and len(app.store.find("PricebookEntry")) == 2)
+    check("object_sets selection is honoured", len(second["sets"]) == 1 and len(simulated["sets"]) == 2)
+    check("API calls are reported; the re-run patches nothing",
+          second["api_calls"].get("query", 0) > 0 and "collection_patch" not in second["api_calls"],
+          second["api_calls"])
+    check("simulation writes nothing",
+          len(app.store.find("PricebookEntry")) == 2 and simulated["totals"]["created"] == 2,
+          simulated["totals"])
+    check("summary has one line per object plus totals",
+          len(native.summary_lines(simulated)) == 1 + 4 + 1, native.summary_lines(simulated))
+
+
+def test_bulk_path():
+    print("test_bulk_path")
+    rlm_http.reset_sessions()
+    app = build_app()
+    for sobject, fields in SCHEMA.items():
+        app.register_schema(sobject, fields)
+    app.store.create("Catalog", {"Name": "Main"})
+    root = tempfile.mkdtemp(prefix="sfdmu_native_")
+    try:
+        write_plan(root)
+        with serve(app) as server:
+            report = native.NativeSfdmuLoader(root, server.url, "standin", logger=Log(),
+                                              bulk_threshold=1, object_sets=[0]).run()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        rlm_http.reset_sessions()
+    objs = by_object(report)
+    check("writes above the threshold go through Bulk ingest jobs",
+          report["api_calls"].get("bulk_job", 0) > 0 and "collection_post" not in report["api_calls"],
+          report["api_calls"])
+    check("bulk-loaded rows all land", objs["PricebookEntry"]["created"] == 2
+          and len(app.store.find("PricebookEntry")) == 2, objs["PricebookEntry"])
+    child = app.store.find("Product2", StockKeepingUnit="SKU-C")[0]
+    parent = app.store.find("Product2", StockKeepingUnit="SKU-B")[0]
+    check("self-lookups still link after a bulk insert", child.get("ParentProductId") == parent["Id"], child)
+
+
+def main():
+    for test in (
+        test_helpers,
+        test_load_rerun_and_sets,
+        test_bulk_path,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_overlay.py, locale plans stored as
+overlays on their base plan.
+
+    python tests/test_sfdmu_overlay.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+An overlay is only safe to load if nobody can tell its materialized plan
+from the full plan it replaced, so the properties worth pinning are:
+
+* the shipped ja plans, stored as overlays on en-US, materialize byte for
+  byte, and the overlay is smaller on disk;
+* ``set`` / ``drop`` / ``add`` / ``order`` / ``columns`` / ``remove`` and
+  composite keys do what the format says, and bad patches are refused;
+* a build is cached until the overlay, one of its files or its base
+  changes; an overlay may sit on another overlay, but not in a cycle;
+* the fingerprints, the reference check and the dataset validator see an
+  overlay plan as the full plan, and report it under its own path.
+"""
+import contextlib
+import csv
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+from scripts import sfdmu_overlay as overlay_cli  # noqa: E402
+from scripts import validate_sfdmu_references as refs  # noqa: E402
+from scripts import validate_sfdmu_v5_datasets as validator_mod  # noqa: E402
+from tasks import rlm_sfdmu_fingerprint as fingerprint  # noqa: E402
+from tasks import rlm_sfdmu_overlay as overlay_mod  # noqa: E402
+
+QB = ROOT / "datasets" / "sfdmu" / "qb"
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_overlay(plan_dir, overlay):
+    os.makedirs(plan_dir, exist_ok=True)
+    with open(os.path.join(plan_dir, overlay_mod.OVERLAY_FILE), "w", encoding="utf-8") as f:
+        json.dump(dict({"version": overlay_mod.OVERLAY_VERSION}, **overlay), f)
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def same_tree(left, right):
+    files = overlay_mod._files(left)
+    return files == overlay_mod._files(right) and all(
+        Path(left, rel).read_bytes() == Path(right, rel).read_bytes() for rel in files)
+
+
+def make_base(plan_dir):
+    with open(os.path.join(plan_dir, "export.json"), "w") as f:
+        json.dump({"objects": [{"query": "SELECT Name, Code FROM Unit", "externalId": "Name;Code"},
+                               {"query": "SELECT Code FROM Product2", "externalId": "Code"}]}, f)
+    write(os.path.join(plan_dir, "Unit.csv"), ["$$Name$Code", "Name", "Code", "Label"],
+          [["Each;EA", "Each", "EA", "Each"], ["Hour;HR", "Hour", "HR", "Hour"], ["Day;DY", "Day", "DY", "Day"]])
+    write(os.path.join(plan_dir, "Product2.csv"), ["Code", "Name", "Unit.$$Name$Code"],
+          [["P1", "One", "Each;EA"], ["P2", "Two", "Hour;HR"]])
+    write(os.path.join(plan_dir, "Legacy.csv"), ["Code"], [["L1"]])
+
+
+def test_shipped_round_trip():
+    print("test_shipped_round_trip")
+    root = tempfile.mkdtemp(prefix="sfdmu_overlay_")
+    try:
+        outcome = {}
+        for plan in ("qb-pcm", "qb-pricing"):
+            base = os.path.join(root, "en-US", plan)
+            locale = os.path.join(root, "ja", plan)
+            shutil.copytree(QB / "en-US" / plan, base)
+            shutil.copytree(QB / "ja" / plan, locale)
+            before = sum(os.path.getsize(os.path.join(locale, rel)) for rel in overlay_mod._files(locale))
+            with contextlib.redirect_stdout(io.StringIO()):
+                code = overlay_cli.main(["create", locale, "--base", base, "--apply"])
+            after = sum(os.path.getsize(os.path.join(locale, rel))
+                        for rel in overlay_mod._files(locale) + [overlay_mod.OVERLAY_FILE])
+            built = overlay_mod.materialize(locale, os.path.join(root, "cache"))
+            outcome[plan] = (code, same_tree(built, str(QB / "ja" / plan)), after < before)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("ja plans become overlays and materialize byte for byte",
+          all(code == 0 and same for code, same, _ in outcome.values()), outcome)
+    check("the overlays take less disk than the full plans", all(smaller for _, _, smaller in outcome.values()),
+          outcome)
+
+
+def test_patch_semantics():
+    print("test_patch_semantics")
+    base_text = "Code,Name,Note\nA,Alpha,x\nB,Beta,\"y, z\"\nC,Gamma,w\n"
+    patch = {"key": ["Code"], "columns": ["Code", "Note", "Name"], "set": {"A": {"Name": "アルファ"}},
+             "drop": ["C"], "add": [{"Code": "D", "Name": "Delta"}], "order": ["D", "A", "B"]}
+    check("set / drop / add / order / columns build the locale CSV",
+          overlay_mod.apply_patch(base_text, patch) == "Code,Note,Name\nD,,Delta\nA,x,アルファ\nB,\"y, z\",Beta\n",
+          overlay_mod.apply_patch(base_text, patch))
+    composite = overlay_mod.apply_patch(base_text, {"key": ["Code", "Name"], "set": {"B;Beta": {"Note": "q"}}})
+    check("composite keys are their values joined with ';'", "B,Beta,q" in composite, composite)
+    errors = []
+    for bad in ({"key": ["Code"], "set": {"Z": {"Name": "?"}}},
+                {"key": ["Missing"]},
+                {"key": ["Code"], "add": [{"Code": "A"}]},
+                {"key": ["Code"], "order": ["A", "B"]}):
+        try:
+            overlay_mod.apply_patch(base_text, bad)
+        except overlay_mod.OverlayError as e:
+            errors.append(str(e))
+    check("unknown keys, key columns, duplicate adds and partial orders are refused", len(errors) == 4, errors)
+    locale = "Code,Name,Note\nB,Beta,\"y, z\"\nA,Alfa,x\nE,Epsilon,v\n"
+    derived = overlay_mod.make_patch(base_text, locale)
+    check("make_patch derives a patch that rebuilds the CSV exactly",
+          derived is not None and overlay_mod.apply_patch(base_text, derived) == locale, derived)
+
+
+def test_cache_and_chains():
+    print("test_cache_and_chains")
+    root = tempfile.mkdtemp(prefix="sfdmu_overlay_")
+    try:
+        base, ja, ja_jp = (os.path.join(root, name) for name in ("en-US", "ja", "ja-JP"))
+        cache = os.path.join(root, "cache")
+        os.makedirs(base)
+        make_base(base)
+        write_overlay(ja, {"base": "../en-US", "remove": ["Legacy.csv"],
+                           "files": {"Unit.csv": {"key": ["$$Name$Code"], "set": {"Hour;HR": {"Label": "時間"}}}}})
+        write(os.path.join(ja, "Product2.csv"), ["Code", "Name", "Unit.$$Name$Code"], [["P1", "一", "Each;EA"]])
+        write_overlay(ja_jp, {"base": "../ja",
+                              "files": {"Unit.csv": {"key": ["Code"], "drop": ["DY"]}}})
+
+        plain = overlay_mod.materialize(base, cache)
+        first = overlay_mod.materialize(ja, cache)
+        stamp = os.stat(os.path.join(first, "Unit.csv")).st_mtime_ns
+        again = overlay_mod.materialize(ja, cache)
+        unit = read_rows(os.path.join(first, "Unit.csv"))
+        files = sorted(os.listdir(first))
+        chained = read_rows(os.path.join(overlay_mod.materialize(ja_jp, cache), "Unit.csv"))
+        reused = again == first and os.stat(os.path.join(again, "Unit.csv")).st_mtime_ns == stamp
+
+        write(os.path.join(base, "Legacy.csv"), ["Code"], [["L2"]])
+        after_base_edit = overlay_mod.materialize(ja, cache)
+        pruned = not os.path.isdir(first)
+
+        write_overlay(base, {"base": "../ja-JP"})
+        errors = []
+        for plan in (ja_jp, os.path.join(root, "nowhere")):
+            if plan.endswith("nowhere"):
+                write_overlay(plan, {"base": "../missing"})
+            try:
+                overlay_mod.materialize(plan, cache)
+            except overlay_mod.OverlayError as e:
+                errors.append(str(e))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("a plain plan is returned unchanged", plain == base)
+    check("an overlay builds patched, owned, inherited and removed files",
+          unit[2] == ["Hour;HR", "Hour", "HR", "時間"] and files == ["Product2.csv", "Unit.csv", "export.json"],
+          (unit, files))
+    check("a second materialize reuses the cached build", reused)
+    check("editing the base invalidates the build and prunes the old one", after_base_edit != first and pruned)
+    check("an overlay on an overlay applies both", [row[0] for row in chained] == [
+        "$$Name$Code", "Each;EA", "Hour;HR"] and chained[2][3] == "時間", chained)
+    check("cycles and missing bases are refused",
+          len(errors) == 2 and "cycle" in errors[0] and "not found" in errors[1], errors)
+
+
+def test_tools_see_full_plan():
+    print("test_tools_see_full_plan")
+    root = tempfile.mkdtemp(prefix="sfdmu_overlay_")
+    cwd = os.getcwd()
+    try:
+        scope = os.path.join(root, "datasets", "sfdmu", "qb")
+        base, ja = os.path.join(scope, "en-US", "qb-units"), os.path.join(scope, "ja", "qb-units")
+        os.makedirs(base)
+        make_base(base)
+        write_overlay(ja, {"base": "../../en-US/qb-units", "files": {
+            "Product2.csv": {"key": ["Code"], "add": [{"Code": "P3", "Unit.$$Name$Code": "Week;WK"}]}}})
+        os.chdir(root)  # the default cache lives under the working directory's .cci/
+        full = overlay_mod.materialize(ja)
+        same_fingerprint = fingerprint.fingerprint_plan(ja) == fingerprint.fingerprint_plan(full)
+        plans = fingerprint.find_plans(os.path.join(scope, "ja"))
+        report = refs.check_scope(os.path.join(scope, "ja"))
+        validator = validator_mod.SFDMUValidator(root)
+        found = [validator._make_relative_path(path) for path in validator.find_sfdmu_datasets()]
+        results = {r.dataset_name: [i.message for i in r.issues]
+                   for r in validator.validate_datasets(validator.find_sfdmu_datasets())}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(root, ignore_errors=True)
+    check("an overlay fingerprints as its full plan", same_fingerprint)
+    check("an overlay directory is a plan", plans == ["qb-units"], plans)
+    check("dangling references are reported under the overlay's own path",
+          [(d["file"], d["key"]) for d in report["dangling"]] == [("qb-units/Product2.csv", "Week;WK")],
+          report["dangling"])
+    check("the dataset validator finds and validates the overlay plan",
+          os.path.join("datasets", "sfdmu", "qb", "ja", "qb-units") in found
+          and results.get("qb/ja/qb-units") == results.get("qb/en-US/qb-units"), (found, results))
+
+
+def main():
+    for test in (
+        test_shipped_round_trip,
+        test_patch_semantics,
+        test_cache_and_chains,
+        test_tools_see_full_plan,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_plan.py, the plan helpers behind
+DeleteSFDMUData's dependency-level deletion.
+
+    python tests/test_sfdmu_plan.py
+
+No org and no CumulusCI install required. The describes are hand-made
+stand-ins for the few reference fields that matter.
+
+The ordering is the part worth pinning. A level that deletes a parent
+alongside (or before) a child that still points at it fails with
+DELETE_FAILED / ENTITY_IS_DELETED on a real org. It only shows up once data
+exists, so a regression passes every empty-org run.
+"""
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from tasks import rlm_sfdmu_plan as plan_mod  # noqa: E402
+
+QB_PRICING = REPO_ROOT / "datasets" / "sfdmu" / "qb" / "en-US" / "qb-pricing" / "export.json"
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def ref(name, relationship, *targets):
+    return {"name": name, "relationshipName": relationship, "type": "reference",
+            "referenceTo": list(targets)}
+
+
+DESCRIBES = {
+    "PricebookEntryDerivedPrice": [
+        ref("PricebookEntryId", "PricebookEntry", "PricebookEntry"),
+        ref("ProductId", "Product", "Product2"),
+        ref("PricebookId", "Pricebook", "Pricebook2"),
+    ],
+    "PricebookEntry": [
+        ref("Product2Id", "Product2", "Product2"),
+        ref("ProductSellingModelId", "ProductSellingModel", "ProductSellingModel"),
+    ],
+    "PriceAdjustmentTier": [
+        ref("PriceAdjustmentScheduleId", "PriceAdjustmentSchedule", "PriceAdjustmentSchedule"),
+    ],
+}
+
+
+def test_reference_names_and_parents():
+    print("test_reference_names_and_parents")
+    obj = {"query": "SELECT Name, PicklistId, RLM_Parent__r.Code__c FROM AttributePicklistValue",
+           "externalId": "Picklist.Name;Code$Name"}
+    names = plan_mod.reference_names(obj)
+    check("select heads and externalId parts are collected",
+          {"name", "picklistid", "rlm_parent__r", "picklist", "code"} <= names, sorted(names))
+    describe = {"fields": [
+        ref("PicklistId", "Picklist", "AttributePicklist"),
+        ref("OwnerId", "Owner", "User", "Group"),
+        {"name": "Name", "type": "string"},
+    ]}
+    check("lookup resolves through the describe, not the field name",
+          plan_mod.parent_sobjects(obj, describe) == {"AttributePicklist"},
+          plan_mod.parent_sobjects(obj, describe))
+    check("SELECT fields parse", plan_mod.query_fields("SELECT Id, Name FROM Account") == ["Id", "Name"])
+    check("FROM parses", plan_mod.query_sobject("SELECT Id FROM Product2 WHERE X = 1") == "Product2")
+
+
+def test_object_sets_selection():
+    print("test_object_sets_selection")
+    plan = {"objectSets": [{"objects": [{"query": "SELECT Id FROM A", "operation": "Insert"}]},
+                           {"objects": [{"query": "SELECT Id FROM B", "operation": "Upsert"},
+                                        {"query": "SELECT Id FROM C", "operation": "Insert",
+                                         "excluded": True}]}]}
+    check("selected indices filter, out-of-range ignored",
+          len(plan_mod.object_sets(plan, [1, 9])) == 1)
+    check("only non-excluded Insert objects are kept",
+          [plan_mod.query_sobject(o["query"]) for o in
+           plan_mod.insert_objects(plan_mod.object_sets(plan))] == ["A"])
+    flat = {"objects": [{"query": "SELECT Id FROM A", "operation": "Insert"}]}
+    check("flat plan counts as one set", len(plan_mod.object_sets(flat)) == 1)
+
+
+def test_qb_pricing_levels():
+    print("test_qb_pricing_levels")
+    plan = json.loads(QB_PRICING.read_text())
+    objects = plan_mod.insert_objects(plan_mod.object_sets(plan))
+    order = list(dict.fromkeys(plan_mod.query_sobject(o["query"]) for o in reversed(objects)))
+    parents = {}
+    for obj in objects:
+        name = plan_mod.query_sobject(obj["query"])
+        parents[name] = plan_mod.parent_sobjects(obj, {"fields": DESCRIBES.get(name, [])})
+    levels = plan_mod.dependency_levels(order, parents)
+    position = {name: i for i, level in enumerate(levels) for name in level}
+    check("every object is scheduled once",
+          sorted(position) == sorted(order) and sum(map(len, levels)) == len(order), levels)
+    check("derived price goes before its PricebookEntry",
+          position["PricebookEntryDerivedPrice"] < position["PricebookEntry"], levels)
+    check("independent objects share the first level", len(levels[0]) > 1, levels)
+
+
+def test_unknown_and_cycles():
+    print("test_unknown_and_cycles")
+    levels = plan_mod.dependency_levels(["A", "B", "C", "D"],
+                                        {"A": set(), "B": None, "C": set(), "D": set()})
+    check("unknown parents keep the object serial at its plan position",
+          levels == [["A"], ["B"], ["C", "D"]], levels)
+    levels = plan_mod.dependency_levels(["X", "Y", "Z"], {"X": {"Y"}, "Y": {"X"}, "Z": {"Z"}})
+    flat = [n for level in levels for n in level]
+    check("a cycle is broken, not dropped", sorted(flat) == ["X", "Y", "Z"], levels)
+    check("self-references are ignored", "Z" in levels[0], levels)
+    check("duplicates collapse", plan_mod.dependency_levels(["A", "A"], {}) == [["A"]])
+
+
+def main():
+    for test in (
+        test_reference_names_and_parents,
+        test_object_sets_selection,
+        test_qb_pricing_levels,
+        test_unknown_and_cycles,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
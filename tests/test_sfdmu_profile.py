@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_profile.py, the parser that turns
+SFDMU ``--verbose`` output into per-pass, per-object phase timings.
+
+    python tests/test_sfdmu_profile.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+SFDMU's wording changes between releases, so the log below is made up in its
+shape: a clock prefix, a ``{Object}`` tag, record counts and object-set
+headers. The properties worth pinning are the ones that would make the
+profile lie:
+
+* a SOQL statement inside a line must not change its phase (``ParentId`` in
+  a SELECT list is not lookup resolution);
+* a phase must end when SFDMU moves on, not at its own last line;
+* a run across midnight must not produce negative durations;
+* without clock prefixes, receive times must still give timings.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tasks import rlm_sfdmu_profile as profiler  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+LOG = """\
+[09:00:00.000] Data migration process has been started.
+[09:00:00.500] Processing object set #1 ...
+[09:00:01.000] {Product2} Querying the target org: SELECT Id, ParentId, StockKeepingUnit FROM Product2
+[09:00:03.000] {Product2} Retrieved 1,200 records from the target.
+[09:00:04.000] {PricebookEntry} Querying the target org: SELECT Id FROM PricebookEntry
+[09:00:05.000] {PricebookEntry} Retrieved 0 records.
+[09:00:05.000] {PricebookEntry} Mapping lookup fields to parent records ...
+[09:00:07.000] {Product2} \x1b[32mUpdating 300 records\x1b[0m
+[09:00:09.000] {Product2} Updated 300 records.
+[09:00:10.000] {PricebookEntry} Inserting 2400 records ...
+[09:00:16.000] {PricebookEntry} Inserted 2400 records.
+[09:00:16.000] Processing object set #2 ...
+[09:00:17.000] {Product2} Updating 10 records ...
+[09:00:18.000] Data migration process has been completed.
+"""
+
+
+def by_object(profile, pass_index=1):
+    found = [p for p in profile["passes"] if p["index"] == pass_index]
+    return {o["sobject"]: o for o in found[0]["objects"]} if found else {}
+
+
+def test_phases():
+    print("test_phases")
+    check("SOQL text does not pick the phase",
+          profiler.classify("{X} Querying: SELECT ParentId, Upserted__c FROM X") == "query"
+          and profiler.classify("{X} Mapping parent lookups") == "resolve"
+          and profiler.classify("{X} Process started") is None)
+    profile = profiler.parse_sfdmu_output(LOG.splitlines(), plan="qb-pricing")
+    first = by_object(profile)
+    product = first["Product2"]["phases"]
+    entry = first["PricebookEntry"]["phases"]
+    check("phases are found per object", set(product) == {"query", "update"}
+          and set(entry) == {"query", "resolve", "insert"}, (product, entry))
+    check("a phase lasts until SFDMU moves on",
+          product["query"]["seconds"] == 3.0 and entry["resolve"]["seconds"] == 2.0, product["query"])
+    check("counts with thousands separators are read", product["query"]["rows"] == 1200)
+    check("rows per second come from the phase's count and time",
+          entry["insert"]["rows"] == 2400 and entry["insert"]["rows_per_second"] == 400.0, entry["insert"])
+    check("ANSI colour codes are stripped", product["update"]["rows"] == 300)
+    check("an object's rows are what it wrote", first["PricebookEntry"]["rows"] == 2400)
+    check("object sets become passes",
+          [p["index"] for p in profile["passes"]] == [1, 2] and by_object(profile, 2)["Product2"]["rows"] == 10)
+    check("the slowest object leads the ranking",
+          profile["top_objects"][0]["sobject"] == "PricebookEntry" and profile["top_objects"][0]["pass"] == 1,
+          profile["top_objects"])
+    check("clock prefixes are used and the total runs from the first line to the last",
+          profile["timestamps"] == "sfdmu" and profile["seconds"] == 18.0, profile["seconds"])
+    check("an object-set header closes the open phase", entry["insert"]["end"] == 16.0, entry["insert"])
+    check("summary lines name the slowest objects",
+          "PricebookEntry" in profiler.summary_lines(profile)[1], profiler.summary_lines(profile))
+
+
+def test_clock_edge_cases():
+    print("test_clock_edge_cases")
+    midnight = profiler.parse_sfdmu_output([
+        "[23:59:58.000] {Account} Querying records",
+        "[00:00:02.000] {Account} Inserting 40 records",
+        "[00:00:04.000] {Account} Inserted 40 records",
+    ])
+    account = by_object(midnight)["Account"]["phases"]
+    check("midnight does not make durations negative",
+          account["query"]["seconds"] == 4.0 and midnight["seconds"] == 6.0, midnight)
+    received = profiler.parse_sfdmu_output([
+        (1000.0, "{Account} Querying records"),
+        (1002.5, "{Account} Inserting 50 records"),
+        (1007.5, "{Account} Done: inserted 50 records"),
+    ])
+    account = by_object(received)["Account"]["phases"]
+    check("receive times stand in for a missing clock prefix",
+          received["timestamps"] == "received" and account["query"]["seconds"] == 2.5
+          and account["insert"]["rows_per_second"] == 10.0, received)
+    untimed = profiler.parse_sfdmu_output(["{Account} Inserting 5 records"])
+    check("untimed lines without receive times are skipped", untimed["passes"] == [], untimed)
+
+
+def test_native_and_write():
+    print("test_native_and_write")
+    report = {"plan": "p", "seconds": 3.0, "sets": [
+        {"index": 0, "seconds": 3.0, "objects": [{"sobject": "Product2", "rows": 300, "seconds": 1.5},
+                                                 {"sobject": "Catalog", "rows": 0, "seconds": 0.0}]}]}
+    native = profiler.profile_from_native(report)
+    check("native reports map onto the same shape",
+          native["engine"] == "native" and native["passes"][0]["index"] == 1
+          and native["top_objects"][0]["sobject"] == "Product2"
+          and native["passes"][0]["objects"][0]["phases"]["load"]["rows_per_second"] == 200.0, native)
+    root = tempfile.mkdtemp(prefix="sfdmu_profile_")
+    try:
+        plan_dir, metrics = os.path.join(root, "plan"), os.path.join(root, "metrics")
+        os.makedirs(plan_dir)
+        paths = profiler.write_profile(native, plan_dir, metrics_dir=metrics)
+        beside = json.load(open(os.path.join(plan_dir, profiler.PROFILE_FILENAME)))
+        copies = os.listdir(metrics)
+        only_plan = profiler.write_profile(native, plan_dir, metrics_dir="")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("the profile is written beside the plan", beside["engine"] == "native" and len(paths) == 2)
+    check("a copy lands in the metrics dir under the harness prefix",
+          len(copies) == 1 and copies[0].startswith(profiler.METRICS_PREFIX), copies)
+    check("no metrics dir, no copy", len(only_plan) == 1)
+
+
+def main():
+    for test in (
+        test_phases,
+        test_clock_edge_cases,
+        test_native_and_write,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for tasks/rlm_sfdmu_schedule.py, the cross-plan scheduler
+behind the ``load_sfdmu_plans`` task.
+
+    python tests/test_sfdmu_schedule.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+The risky part is a missing edge, because two plans that really conflict
+would then race. So the dependency rules are pinned on small synthetic plans
+and on the repo's own QuantumBit plans. The pricing plan reads what pcm
+creates, qb-rates reads the Pricebook2 that qb-pricing loads (through the
+``PriceBook`` relationship), and tax and approvals share nothing with
+pricing. Relationship names resolve to their objects (``ParentProduct`` ->
+Product2), and a plan with one that does not resolve waits for every
+earlier plan. The executor is
+pinned on three things: the parallelism cap, never starting a plan before
+its dependencies finish, and skipping only the dependents of a failed plan.
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tasks import rlm_sfdmu_schedule as schedule  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def obj(query, operation, external_id="Name", **extra):
+    return {"query": query, "operation": operation, "externalId": external_id, **extra}
+
+
+PLANS = {
+    "catalog": [obj("SELECT Name, StockKeepingUnit FROM Product2", "Upsert", "StockKeepingUnit")],
+    "prices": [obj("SELECT Name FROM Product2", "Readonly", "StockKeepingUnit"),
+               obj("SELECT Name FROM Pricebook2", "Upsert"),
+               obj("SELECT UnitPrice, Product2.StockKeepingUnit FROM PricebookEntry", "Insert",
+                   "Product2.StockKeepingUnit", deleteOldData=True)],
+    "tax": [obj("SELECT StockKeepingUnit, TaxPolicyId FROM Product2", "Update", "StockKeepingUnit"),
+            obj("SELECT Name FROM TaxPolicy", "Upsert")],
+    "billing": [obj("SELECT StockKeepingUnit, BillingPolicyId FROM Product2", "Update", "StockKeepingUnit")],
+    "rename": [obj("SELECT Id, StockKeepingUnit FROM Product2", "Update", "Name")],
+    "links": [obj("SELECT Name, Account__r.Code__c FROM Link__c", "Upsert")],
+    "accounts": [obj("SELECT Name, Code__c FROM Account__c", "Upsert", "Code__c")],
+}
+
+
+def write_plans(root):
+    dirs = []
+    for name, objects in PLANS.items():
+        path = os.path.join(root, name)
+        os.makedirs(path)
+        with open(os.path.join(path, "export.json"), "w") as f:
+            json.dump({"objectSets": [{"objects": objects}]}, f)
+        dirs.append((name, path))
+    return dirs
+
+
+def test_dependencies():
+    print("test_dependencies")
+    root = tempfile.mkdtemp(prefix="sfdmu_schedule_")
+    try:
+        plans = write_plans(root)
+        strict = schedule.plan_dependencies(plans)
+        relaxed = schedule.plan_dependencies(plans, concurrent_updates=True)
+        reversed_order = schedule.plan_dependencies([plans[6], plans[5]])
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("readers and updaters wait for the plan that creates the object",
+          all("catalog" in strict[n] for n in ("prices", "tax", "billing", "rename")), strict)
+    check("a reader does not wait for updates of non-key fields",
+          "prices" not in strict["tax"] and "prices" not in strict["billing"], strict)
+    check("shared Updates wait by default", "tax" in strict["billing"], strict["billing"])
+    check("concurrent_updates lets disjoint field updates overlap",
+          "tax" not in relaxed["billing"] and relaxed["billing"] == {"catalog": ["Product2"]}, relaxed["billing"])
+    check("updating a field another plan matches on still waits",
+          "prices" in relaxed["rename"] and "tax" in relaxed["rename"], relaxed["rename"])
+    check("lookup paths count as reads of the parent (__r -> __c)",
+          reversed_order == {"accounts": {}, "links": {"accounts": ["Account__c"]}}, reversed_order)
+    check("unrelated plans have no edge",
+          strict["links"] == {} and strict["accounts"] == {"links": ["Account__c"]}, strict)
+
+
+def test_repo_plans():
+    print("test_repo_plans")
+    base = ROOT / "datasets" / "sfdmu" / "qb" / "en-US"
+    names = ["qb-pcm", "qb-pricing", "qb-tax", "qb-approvals"]
+    deps = schedule.plan_dependencies([(n, str(base / n)) for n in names])
+    check("qb-pricing waits for qb-pcm (it reads Product2 and selling models)",
+          "Product2" in deps["qb-pricing"].get("qb-pcm", []), deps["qb-pricing"])
+    check("qb-tax does not wait for qb-pricing", "qb-pricing" not in deps["qb-tax"], deps["qb-tax"])
+    check("qb-approvals shares nothing with the catalog plans", deps["qb-approvals"] == {}, deps["qb-approvals"])
+
+
+def test_relationships():
+    print("test_relationships")
+    root = tempfile.mkdtemp(prefix="sfdmu_schedule_")
+    plans = {
+        "catalog": [obj("SELECT Name, StockKeepingUnit FROM Product2", "Upsert", "StockKeepingUnit")],
+        "categories": [obj("SELECT Name, Product.StockKeepingUnit FROM ProductCategoryProduct", "Upsert",
+                           "Name")],
+        "taxes": [obj("SELECT Name FROM TaxPolicy", "Upsert")],
+        "units": [obj("SELECT UnitCode FROM UnitOfMeasure", "Upsert", "UnitCode")],
+        "bundles": [obj("SELECT ParentProduct.StockKeepingUnit, ChildProduct.StockKeepingUnit, "
+                        "ParentProduct.DefaultUnitOfMeasure.UnitCode FROM ProductRelatedComponent", "Upsert",
+                        "ParentProduct.StockKeepingUnit;ChildProduct.StockKeepingUnit")],
+        "widgets": [obj("SELECT Name, Mystery.Code FROM Widget__c", "Upsert")],
+    }
+    try:
+        dirs = []
+        for name, objects in plans.items():
+            os.makedirs(os.path.join(root, name))
+            with open(os.path.join(root, name, "export.json"), "w") as f:
+                json.dump({"objectSets": [{"objects": objects}]}, f)
+            dirs.append((name, os.path.join(root, name)))
+        deps = schedule.plan_dependencies(dirs)
+        bundles = schedule.plan_access(os.path.join(root, "bundles"), {"Product2", "ProductCategoryProduct"})
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    check("role-word relationships resolve to the whole object name",
+          deps["bundles"] == {"catalog": ["Product2"], "units": ["UnitOfMeasure"]}
+          and "ProductCategoryProduct" not in bundles["reads"],
+          (deps["bundles"], bundles["reads"]))
+    check("each hop of a path is resolved, and one to an object no plan loads is reported",
+          bundles["unresolved"] == {"Product2.DefaultUnitOfMeasure"}, bundles["unresolved"])
+    check("a plan with an unresolved relationship waits for every earlier plan",
+          deps["widgets"] == {name: ["Widget__c.Mystery"] for name, _ in dirs[:-1]}, deps["widgets"])
+
+    base = ROOT / "datasets" / "sfdmu" / "qb" / "en-US"
+    access = schedule.plan_access(str(base / "qb-rates"), {"Pricebook2"})
+    real = schedule.plan_dependencies([(n, str(base / n)) for n in ("qb-pricing", "qb-rates")])
+    check("qb-rates reads Pricebook2 through PriceBook, not an object named PriceBook",
+          "Pricebook2" in access["reads"] and "PriceBook" not in access["reads"], sorted(access["reads"]))
+    check("qb-rates waits for qb-pricing on Pricebook2",
+          "Pricebook2" in real["qb-rates"].get("qb-pricing", []), real["qb-rates"])
+
+
+def test_executor():
+    print("test_executor")
+    names = ["a", "b", "c", "d", "e", "f"]
+    deps = {"a": {}, "b": {}, "c": {"a": ["X"]}, "d": {}, "e": {"c": ["Y"]}, "f": {"b": ["Z"]}}
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0, "finished": set(), "early": []}
+
+    def run_one(name):
+        with lock:
+            if any(d not in state["finished"] for d in deps[name]):
+                state["early"].append(name)
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.05)
+        with lock:
+            state["running"] -= 1
+            state["finished"].add(name)
+        if name == "b":
+            raise RuntimeError("boom")
+
+    logged = []
+    started = time.monotonic()
+    timings = schedule.run_schedule(names, deps, run_one, max_parallel=2, log=logged.append)
+    elapsed = time.monotonic() - started
+    by_name = {t["name"]: t for t in timings}
+    check("never more than max_parallel loads at once", state["peak"] == 2, state["peak"])
+    check("no plan starts before its dependencies finish", state["early"] == [], state["early"])
+    check("a failure skips only its dependents",
+          by_name["b"]["status"] == "failed" and by_name["f"]["status"] == "skipped"
+          and all(by_name[n]["status"] == "ok" for n in "acde"), timings)
+    check("the error is recorded", by_name["b"]["error"] == "boom")
+    check("independent plans overlap (wall time under the serial sum)", elapsed < 0.05 * 5, elapsed)
+    check("timings keep list order and carry their dependencies",
+          [t["name"] for t in timings] == names and by_name["e"]["after"] == ["c"])
+    check("progress is logged", any("f: skipped" in line for line in logged), logged)
+
+    chart = schedule.gantt_lines(timings, width=20)
+    check("one Gantt row per plan plus header and totals", len(chart) == len(names) + 2, chart)
+    check("skipped plans have no bar", chart[6].endswith("skipped") and "#" not in chart[6], chart[6])
+    check("the last plan to finish ends at the right edge",
+          any(row.rstrip().endswith("#|") for row in chart[1:-1]), chart)
+
+
+def main():
+    for test in (
+        test_dependencies,
+        test_repo_plans,
+        test_relationships,
+        test_executor,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for scripts/validate_sfdmu_references.py, the
+referential-integrity check across the plans of a scope.
+
+    python tests/test_validate_sfdmu_references.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+A false "dangling" trains people to ignore the check, and a missed one
+costs a failed org load. So the properties worth pinning are:
+
+* a lookup resolves against parent rows in any plan of the scope, through
+  a ``$$`` composite column or the key's own columns;
+* relationship names map to the right object (role words, digits,
+  ``__r``, the object itself on a tie), and unknown parents are unchecked;
+* blank / ``#N/A`` references are not references, and short composite
+  cells mean blank trailing parts;
+* excluded objects are not parents, and Readonly rows are;
+* dangling cells are reported with their file and line.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import validate_sfdmu_references as refs  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def write_plan(plan_dir, objects):
+    os.makedirs(plan_dir, exist_ok=True)
+    with open(os.path.join(plan_dir, "export.json"), "w") as f:
+        json.dump({"objects": [dict({"query": f"SELECT Id FROM {name}"}, **opts) for name, opts in objects]}, f)
+
+
+def test_resolve():
+    print("test_resolve")
+    headers = {
+        "Product2": [["StockKeepingUnit", "Name"]],
+        "ProductCategory": [["Code", "Name"]],
+        "AttributeCategory": [["Code"]],
+        "ProductCatalog": [["Code"]],
+        "Pricebook2": [["Name"]],
+        "RLM_Page__c": [["Name"]],
+        "Group": [["Name"]],
+    }
+    cases = {
+        ("ChildProduct", "StockKeepingUnit", "X"): "Product2",
+        ("Product", "StockKeepingUnit", "X"): "Product2",
+        ("PriceBook", "Name", "X"): "Pricebook2",
+        ("RLM_Page__r", "Name", "X"): "RLM_Page__c",
+        ("Catalog", "Code", "X"): "ProductCatalog",
+        ("ParentCategory", "Code", "ProductCategory"): "ProductCategory",
+    }
+    got = {case: refs._resolve(case[0], [case[1]], case[2], headers)[0] for case in cases}
+    check("relationship names resolve to their objects", got == cases, got)
+    check("a tie without the object itself is not guessed",
+          refs._resolve("ParentCategory", ["Code"], "Catalog", headers)[0] is None)
+    check("a parent without the lookup's key columns is not a match",
+          refs._resolve("ChildProduct", ["ProductCode"], "X", headers)[0] is None)
+    check("a mapped standard name never falls back to a look-alike",
+          refs._resolve("FulfillmentStepDefnGroup", ["Name"], "X", headers)[0] is None)
+    check("composite cells: short means blank parts, #N/A is blank, all-blank is no reference",
+          refs._cell_key("A;B", 3) == ("A", "B", "") and refs._cell_key("#N/A;#N/A", 2) == ()
+          and refs._cell_key("A;B;C", 2) is None)
+
+
+def test_scope():
+    print("test_scope")
+    root = tempfile.mkdtemp(prefix="sfdmu_refs_")
+    try:
+        pcm, pricing = os.path.join(root, "qb-pcm"), os.path.join(root, "qb-pricing")
+        write_plan(pcm, [("Product2", {"externalId": "StockKeepingUnit"}),
+                         ("ProductSellingModel", {"externalId": "Name;SellingModelType"}),
+                         ("ProductRelatedComponent", {}),
+                         ("Legacy", {"excluded": True})])
+        write(os.path.join(pcm, "Product2.csv"), ["Name", "StockKeepingUnit"], [["A", "SKU-A"], ["B", "SKU-B"]])
+        write(os.path.join(pcm, "ProductSellingModel.csv"), ["$$Name$SellingModelType", "Name", "SellingModelType"],
+              [["Term;TermDefined", "Term", "TermDefined"], ["One;OneTime", "One", "OneTime"]])
+        write(os.path.join(pcm, "ProductRelatedComponent.csv"),
+              ["ChildProduct.StockKeepingUnit", "ParentProduct.StockKeepingUnit", "Owner.Name"],
+              [["SKU-A", "SKU-B", "x"], ["SKU-Z", "SKU-B", "y"], ["", "#N/A", ""]])
+        write(os.path.join(pcm, "Legacy.csv"), ["Code"], [["L1"]])
+        write_plan(pricing, [("Pricebook2", {"operation": "Readonly", "externalId": "Name"}),
+                             ("PricebookEntry", {}),
+                             ("Discount", {})])
+        write(os.path.join(pricing, "Pricebook2.csv"), ["Name"], [["Standard Price Book"]])
+        write(os.path.join(pricing, "PricebookEntry.csv"),
+              ["Pricebook2.Name", "Product2.StockKeepingUnit", "ProductSellingModel.$$Name$SellingModelType"],
+              [["Standard Price Book", "SKU-A", "Term;TermDefined"],
+               ["Standard Price Book", "SKU-B", "One;Evergreen"],
+               ["Other Book", "SKU-B", "#N/A;#N/A"]])
+        write(os.path.join(pricing, "Discount.csv"), ["Legacy.Code"], [["L1"]])
+        report = refs.check_scope(root)
+        lines = refs.summary_lines(report, verbose=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    dangling = {(d["file"], d["line"], d["column"]): d["key"] for d in report["dangling"]}
+    check("dangling cells are reported with file, line and column", dangling == {
+        ("qb-pcm/ProductRelatedComponent.csv", 3, "ChildProduct.StockKeepingUnit"): "SKU-Z",
+        ("qb-pricing/PricebookEntry.csv", 3, "ProductSellingModel.$$Name$SellingModelType"): "One;Evergreen",
+        ("qb-pricing/PricebookEntry.csv", 4, "Pricebook2.Name"): "Other Book",
+    }, report["dangling"])
+    check("parents in another plan and Readonly rows resolve; blanks are not references",
+          report["references"] == 12 and report["lookups"] == 5, report)
+    unchecked = {entry["column"]: entry["reason"] for entry in report["unchecked"]}
+    check("parents no plan loads (or excluded ones) are unchecked, not dangling",
+          sorted(unchecked) == ["Legacy.Code", "Owner.Name"], unchecked)
+    check("the summary lists the dangling cell",
+          any("qb-pcm/ProductRelatedComponent.csv:3" in line and "SKU-Z" in line for line in lines), lines)
+
+
+def main():
+    for test in (
+        test_resolve,
+        test_scope,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Offline invariants for the cached, parallel path of
+scripts/validate_sfdmu_v5_datasets.py.
+
+    python tests/test_validate_sfdmu_v5_datasets.py
+
+No org, no SFDMU and no CumulusCI install required.
+
+The cache and the process pool must never change a report, so the
+properties worth pinning are:
+
+* pool, serial and cached runs return the same issues, in dataset order;
+* an edited CSV or export.json is re-validated on the next run;
+* a file whose mtime moved but whose bytes did not is still a cache hit;
+* fix runs never read or write the cache.
+"""
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scripts import validate_sfdmu_v5_datasets as validator_mod  # noqa: E402
+
+_PASS = 0
+_FAIL = 0
+
+
+def check(label, condition, detail=""):
+    global _PASS, _FAIL
+    if condition:
+        _PASS += 1
+    else:
+        _FAIL += 1
+        print(f"  FAIL: {label}" + (f"  ({detail})" if detail else ""))
+
+
+def write(path, header, rows):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def make_repo(root):
+    """Three plans under datasets/sfdmu: one clean, one missing a $$ column, one with an empty CSV."""
+    for plan in ("qb-a", "qb-b", "qb-c"):
+        plan_dir = os.path.join(root, "datasets", "sfdmu", "qb", plan)
+        os.makedirs(plan_dir)
+        with open(os.path.join(plan_dir, "export.json"), "w") as f:
+            json.dump({"apiVersion": "65.0", "objects": [
+                {"query": "SELECT Name, Code FROM Unit", "externalId": "Name;Code"},
+                {"query": "SELECT Name FROM Tag", "externalId": "Name"},
+            ]}, f)
+        if plan == "qb-b":
+            write(os.path.join(plan_dir, "Unit.csv"), ["Name", "Code"], [["a", "1"]])
+        else:
+            write(os.path.join(plan_dir, "Unit.csv"), ["$$Name$Code", "Name", "Code"], [["a;1", "a", "1"]])
+        if plan == "qb-c":
+            open(os.path.join(plan_dir, "Tag.csv"), "w").close()
+        else:
+            write(os.path.join(plan_dir, "Tag.csv"), ["Name"], [["t"]])
+
+
+def issues(results):
+    return [(r.dataset_name, [(i.severity.value, i.object_name, i.message) for i in r.issues]) for r in results]
+
+
+class CountingValidator(validator_mod.SFDMUValidator):
+    """Counts the datasets actually validated in this process (i.e. not served from the cache)."""
+
+    validated = 0
+
+    def validate_dataset(self, dataset_path):
+        self.validated += 1
+        return super().validate_dataset(dataset_path)
+
+
+def run(root, workers=1, cache=True, **kwargs):
+    cache_file = str(validator_mod.DEFAULT_CACHE_FILE) if cache else None
+    validator = CountingValidator(root, cache_file=cache_file, **kwargs)
+    results = validator.validate_datasets(validator.find_sfdmu_datasets(), workers=workers)
+    validator.save_cache()
+    return validator, results
+
+
+def test_same_results():
+    print("test_same_results")
+    root = tempfile.mkdtemp(prefix="sfdmu_validate_")
+    try:
+        make_repo(root)
+        _, plain = run(root, cache=False)
+        _, pooled = run(root, workers=2, cache=False)
+        _, cold = run(root, workers=2)
+        warm_validator, warm = run(root)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    expected = issues(plain)
+    check("issues are found", [name for name, found in expected if found] == ["qb/qb-b", "qb/qb-c"], expected)
+    check("the pool returns the serial results in order", issues(pooled) == expected, issues(pooled))
+    check("a cold and a warm cache return the same results", issues(cold) == expected and issues(warm) == expected,
+          issues(warm))
+    check("a warm run validates nothing and does not rewrite the cache",
+          warm_validator.validated == 0 and not warm_validator._cache_dirty)
+
+
+def test_invalidation():
+    print("test_invalidation")
+    root = tempfile.mkdtemp(prefix="sfdmu_validate_")
+    try:
+        make_repo(root)
+        run(root)
+        plan_b = os.path.join(root, "datasets", "sfdmu", "qb", "qb-b")
+        write(os.path.join(plan_b, "Unit.csv"), ["$$Name$Code", "Name", "Code"], [["a;1", "a", "1"]])
+        fixed_validator, fixed_csv = run(root)
+        export = os.path.join(root, "datasets", "sfdmu", "qb", "qb-a", "export.json")
+        with open(export) as f:
+            data = json.load(f)
+        data["objects"][1]["externalId"] = "Name;Missing"
+        with open(export, "w") as f:
+            json.dump(data, f)
+        _, edited_export = run(root)
+        touched = os.path.join(plan_b, "Tag.csv")
+        stat = os.stat(touched)
+        os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        touched_validator, _ = run(root)
+        fixing_validator, fixing = run(root, fix_headers=True, dry_run=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    by_name = dict(issues(fixed_csv))
+    check("only the plan with an edited CSV is re-validated", by_name["qb/qb-b"] == [] and fixed_validator.validated == 1,
+          by_name)
+    by_name = dict(issues(edited_export))
+    check("an edited export.json is re-validated",
+          any("Missing" in message for _, _, message in by_name["qb/qb-a"]), by_name)
+    check("a moved mtime with the same bytes re-uses the result", touched_validator.validated == 0)
+    check("fix runs do not use the cache", fixing_validator._cache is None and fixing_validator.validated == 3
+          and dict(issues(fixing))["qb/qb-c"] != [])
+
+
+def main():
+    for test in (
+        test_same_results,
+        test_invalidation,
+    ):
+        test()
+    print(f"\n{_PASS} passed, {_FAIL} failed.")
+    return 1 if _FAIL else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
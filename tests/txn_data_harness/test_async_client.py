@@ -0,0 +1,106 @@
+"""AsyncSfRestClient: shared concurrency cap, limit-aware throttling, retries."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from scripts.sf_transport import aio
+from scripts.txn_data_harness import auth
+from scripts.txn_data_harness.auth import AsyncSfRestClient, SfApiError
+
+
+class _Sender:
+    """Answers from ``handler(method, url, data)``; records the peak in flight."""
+
+    def __init__(self, handler, usage: str = "api-usage=10/1000") -> None:
+        self.handler = handler
+        self.usage = usage
+        self.in_flight = 0
+        self.peak = 0
+        self.calls: list[tuple[str, str]] = []
+
+    async def send(self, method, url, *, headers, data, timeout):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        self.calls.append((method, url))
+        try:
+            await asyncio.sleep(0.001)
+            status, body = self.handler(method, url, data)
+        finally:
+            self.in_flight -= 1
+        return aio.HttpResult(status, {"Sforce-Limit-Info": self.usage},
+                              body if isinstance(body, str) else json.dumps(body))
+
+    async def aclose(self) -> None:
+        pass
+
+
+V = "/services/data/v67.0"
+
+
+def _client(sender: _Sender, **throttle) -> AsyncSfRestClient:
+    throttle.setdefault("rate", 10_000)
+    return AsyncSfRestClient("a", "t", "https://org.example.com",
+                             throttle=aio.ApiThrottle(**throttle), sender=sender)
+
+
+def test_gather_stays_under_the_concurrency_cap() -> None:
+    sender = _Sender(lambda m, u, d: (201, {"id": "a0x", "success": True}))
+
+    async def run():
+        async with _client(sender, max_concurrency=8) as client:
+            return await client.gather(*(client.post(f"{V}/sobjects/Account", {"Name": f"A{i}"})
+                                         for i in range(100)))
+
+    results = asyncio.run(run())
+    assert len(results) == 100 and all(r["success"] for r in results)
+    assert sender.peak <= 8
+    assert sender.calls[0] == ("POST", f"https://org.example.com{V}/sobjects/Account")
+
+
+def test_iter_query_follows_next_records_url() -> None:
+    def handler(method, url, data):
+        if "/query/" in url:
+            return 200, {"done": True, "records": [{"Id": "2"}]}
+        return 200, {"done": False, "nextRecordsUrl": f"{V}/query/01g-1",
+                     "records": [{"Id": "1"}]}
+
+    rows = asyncio.run(_client(_Sender(handler)).query("SELECT Id FROM Asset"))
+    assert [r["Id"] for r in rows] == ["1", "2"]
+
+
+def test_pushback_is_retried_and_halves_the_rate(monkeypatch) -> None:
+    monkeypatch.setattr(auth, "_BACKOFF_BASE", 0.0)
+    statuses = iter([429, 503, 200])
+
+    def handler(method, url, data):
+        status = next(statuses)
+        return status, ({"ok": True} if status == 200 else [{"errorCode": "REQUEST_LIMIT_EXCEEDED"}])
+
+    client = _client(_Sender(handler), rate=100, min_rate=1)
+    assert asyncio.run(client.get(f"{V}/limits")) == {"ok": True}
+    assert client.throttle.pushbacks == 2
+    assert client.throttle.rate == pytest.approx(25 + 2)
+
+
+def test_hard_limit_refuses_new_requests() -> None:
+    sender = _Sender(lambda m, u, d: (200, {}), usage="api-usage=960/1000")
+    client = _client(sender)
+
+    async def run():
+        await client.get(f"{V}/limits")
+        await client.get(f"{V}/limits")
+
+    with pytest.raises(aio.ApiLimitError):
+        asyncio.run(run())
+    assert len(sender.calls) == 1
+
+
+def test_error_status_raises_sf_api_error() -> None:
+    sender = _Sender(lambda m, u, d: (400, [{"errorCode": "INVALID_FIELD", "message": "bad"}]))
+    with pytest.raises(SfApiError) as info:
+        asyncio.run(_client(sender).post(f"{V}/sobjects/Account", {"Bogus__c": 1}))
+    assert info.value.status == 400 and "INVALID_FIELD" in info.value.body
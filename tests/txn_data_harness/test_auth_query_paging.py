@@ -0,0 +1,73 @@
+"""SfRestClient.query / iter_query follow ``nextRecordsUrl`` across pages."""
+
+from __future__ import annotations
+
+import json
+import threading
+
+from scripts.txn_data_harness.auth import SfRestClient
+
+
+class _Response:
+    def __init__(self, body: dict) -> None:
+        self.status_code = 200
+        self.text = json.dumps(body)
+        self.content = self.text.encode("utf-8")
+
+
+class _Session:
+    """Shared by every thread; answers each page by its locator."""
+
+    def __init__(self, pages: list[dict]) -> None:
+        self.pages = pages
+        self.urls: list[str] = []
+        self.threads: set[str] = set()
+
+    def request(self, method, url, data=None):
+        self.urls.append(url)
+        self.threads.add(threading.current_thread().name)
+        index = int(url.rsplit("-", 1)[1]) if "/query/" in url else 0
+        return _Response(self.pages[index])
+
+
+def _pages(count: int) -> list[dict]:
+    pages = []
+    for i in range(count):
+        page = {"totalSize": count * 2, "done": i == count - 1,
+                "records": [{"Id": f"{i}a"}, {"Id": f"{i}b"}]}
+        if i < count - 1:
+            page["nextRecordsUrl"] = f"/services/data/v67.0/query/01gxx-{i + 1}"
+        pages.append(page)
+    return pages
+
+
+def test_query_returns_every_page(monkeypatch) -> None:
+    monkeypatch.setattr(SfRestClient, "_session", property(lambda self: self._fake))
+    session = _Session(_pages(3))
+    client = SfRestClient(alias="a", access_token="t", instance_url="https://org.example.com")
+    client._fake = session
+    rows = client.query("SELECT Id FROM Asset")
+    assert [r["Id"] for r in rows] == ["0a", "0b", "1a", "1b", "2a", "2b"]
+    assert session.urls[1] == "https://org.example.com/services/data/v67.0/query/01gxx-1"
+
+
+def test_iter_query_prefetches_on_a_worker_thread(monkeypatch) -> None:
+    monkeypatch.setattr(SfRestClient, "_session", property(lambda self: self._fake))
+    session = _Session(_pages(4))
+    client = SfRestClient(alias="a", access_token="t", instance_url="https://org.example.com")
+    client._fake = session
+    stream = client.iter_query("SELECT Id FROM Asset")
+    assert next(stream)["Id"] == "0a"
+    assert [r["Id"] for r in stream] == ["0b", "1a", "1b", "2a", "2b", "3a", "3b"]
+    assert any(name.startswith("soql-prefetch") for name in session.threads)
+
+
+def test_abandoned_stream_reads_at_most_one_page_ahead(monkeypatch) -> None:
+    monkeypatch.setattr(SfRestClient, "_session", property(lambda self: self._fake))
+    session = _Session(_pages(10))
+    client = SfRestClient(alias="a", access_token="t", instance_url="https://org.example.com")
+    client._fake = session
+    stream = client.iter_query("SELECT Id FROM Asset")
+    next(stream)
+    stream.close()
+    assert len(session.urls) <= 2
@@ -0,0 +1,70 @@
+"""SfRestClient cassette mode: record a session, replay it without an org."""
+
+from __future__ import annotations
+
+import pytest
+
+from scripts.sf_transport.cassette import MODE_RECORD, MODE_REPLAY, Cassette
+from scripts.txn_data_harness import auth
+from scripts.txn_data_harness.auth import SfApiError, SfRestClient
+
+
+class _Response:
+    def __init__(self, status_code: int, text: str = "") -> None:
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+
+
+class _Session:
+    def __init__(self, responses: list[_Response]) -> None:
+        self.responses = responses
+        self.calls: list[tuple[str, str]] = []
+
+    def request(self, method, url, data=None):
+        self.calls.append((method, url))
+        return self.responses.pop(0)
+
+
+def _recording_client(tmp_path, monkeypatch, responses) -> tuple[SfRestClient, Cassette]:
+    monkeypatch.setattr(auth, "resolve_auth", lambda _alias: ("tok", "https://org.example.com"))
+    cassette = Cassette(str(tmp_path / "run.json.gz"), MODE_RECORD)
+    client = SfRestClient.from_alias("sf-alias", cassette=cassette)
+    client._local.session = _Session(responses)
+    return client, cassette
+
+
+def test_recorded_session_replays_without_auth(tmp_path, monkeypatch) -> None:
+    client, cassette = _recording_client(tmp_path, monkeypatch, [
+        _Response(200, '{"records": [{"Id": "0Q0000000000001"}], "done": true}'),
+        _Response(201, '{"id": "801000000000001", "success": true}'),
+        _Response(204, ""),
+        _Response(404, '[{"errorCode": "NOT_FOUND"}]'),
+    ])
+    assert client.query("SELECT Id FROM Quote WHERE Name = 'RUN-1'") == [{"Id": "0Q0000000000001"}]
+    created = client.post("/services/data/v67.0/sobjects/Order", {"Name": "RUN-1"})
+    assert client.patch(f"/services/data/v67.0/sobjects/Order/{created['id']}", {"Status": "Activated"}) is None
+    with pytest.raises(SfApiError):
+        client.get("/services/data/v67.0/sobjects/Order/801000000000002")
+    cassette.save()
+
+    monkeypatch.setattr(auth, "resolve_auth", lambda _alias: pytest.fail("replay must not resolve auth"))
+    replayed = SfRestClient.from_alias("sf-alias", cassette=Cassette(cassette.path, MODE_REPLAY))
+    assert replayed.instance_url == "https://org.example.com"
+    # A different run id in the SOQL still matches the recorded query by endpoint.
+    assert replayed.query("SELECT Id FROM Quote WHERE Name = 'RUN-2'") == [{"Id": "0Q0000000000001"}]
+    assert replayed.post("/services/data/v67.0/sobjects/Order", {"Name": "RUN-2"})["id"] == "801000000000001"
+    assert replayed.patch("/services/data/v67.0/sobjects/Order/801000000000001", {"Status": "Activated"}) is None
+    with pytest.raises(SfApiError) as err:
+        replayed.get("/services/data/v67.0/sobjects/Order/801000000000002")
+    assert err.value.status == 404
+
+
+def test_replay_miss_raises_api_error(tmp_path, monkeypatch) -> None:
+    client, cassette = _recording_client(tmp_path, monkeypatch, [_Response(200, "{}")])
+    client.get("/services/data/v67.0/limits")
+    cassette.save()
+
+    replayed = SfRestClient.from_alias("sf-alias", cassette=Cassette(cassette.path, MODE_REPLAY))
+    with pytest.raises(SfApiError, match="No recorded interaction"):
+        replayed.delete("/services/data/v67.0/sobjects/Order/801000000000001")
@@ -225,3 +225,32 @@ def test_fetch_assets_product_ids_returns_mapping(fake_client) -> None:
 def test_fetch_assets_product_ids_empty_input_short_circuits(fake_client) -> None:
     assert fetch_assets_product_ids(fake_client, []) == {}
     assert fake_client.queries == []
+
+
+def test_create_usage_journals_switches_to_bulk_above_threshold(
+    monkeypatch, term_product
+) -> None:
+    """At or above RLM_SF_BULK_THRESHOLD rows, the pre-flight and the insert run
+    as Bulk API 2.0 jobs (against the local stand-in), and a retry converges."""
+    from scripts.sf_standin.server import build_app, serve
+    from scripts.txn_data_harness.auth import SfRestClient
+
+    monkeypatch.setenv("RLM_SF_BULK_THRESHOLD", "4")
+    app = build_app()
+    line = _line(term_product, targets=[_target("CPU", "hr"), _target("DB", "TB")],
+                 records=(2, 2))
+    now = datetime(2026, 6, 22, tzinfo=timezone.utc)
+    with serve(app) as server:
+        client = SfRestClient(alias="standin", access_token="x", instance_url=server.url)
+        ids = create_usage_journals(client, "02iASSET", "001ACC", line, "DEMO-1", now=now)
+        again = create_usage_journals(client, "02iASSET", "001ACC", line, "DEMO-1", now=now)
+
+    assert len(ids) == 4
+    assert sorted(again) == sorted(ids)
+    assert app.store.count("TransactionJournal") == 4
+    ingest = [j for j in app.bulk.jobs.values() if j["kind"] == "ingest"]
+    assert [j["operation"] for j in ingest] == ["insert"]
+    assert sum(j["kind"] == "query" for j in app.bulk.jobs.values()) == 2
+    uids = sorted(r["UniqueIdentifier"] for r in app.store.find("TransactionJournal"))
+    assert uids[0] == "txn-harness-DEMO-1-02iASSET-0-0"
+    assert uids[-1] == "txn-harness-DEMO-1-02iASSET-1-1"